@@ -21,22 +21,26 @@ AI_GUIDELINES:
 
 # pyright: reportMissingImports=false
 # pyright: reportMissingModuleSource=false
-# Vanilla Django backup/restore using only dumpdata/loaddata/flush
+# Django backup/restore: chunked per-table JSON archives; legacy dumpdata archives restore via loaddata
 import datetime
 import gzip
 import importlib
 import io
 import json
 import os
+import queue
+import re
 import shutil
 import tarfile
 import tempfile
+import threading
 import time
 import uuid
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, nullcontext
 from functools import lru_cache
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Any
 from urllib.parse import unquote, urlparse
 
@@ -44,10 +48,12 @@ from core.services.ocr_preview_storage import get_ocr_preview_storage_prefix
 from core.storage import get_media_store_adapter
 from django.apps import apps
 from django.conf import settings
+from django.core import serializers
 from django.core.cache import caches
 from django.core.files import File
 from django.core.files.storage import FileSystemStorage, default_storage
 from django.core.management import call_command
+from django.core.management.color import no_style
 from django.db import connections
 from django.db.models import CharField, JSONField, TextField
 from django.db.models.fields.files import FileField
@@ -62,7 +68,12 @@ except Exception:  # pragma: no cover - optional import fallback
 
 BACKUPS_DIR = getattr(settings, "BACKUPS_ROOT", os.path.join(settings.BASE_DIR, "backups"))
 USER_RELATED_MODELS = {"core.userprofile", "core.usersettings", "core.webpushsubscription"}
+SYSTEM_APP_LABELS = {"auth", "admin", "sessions", "contenttypes"}
+# Chunked archives start with this header member, then data/<model>/<n>.json chunks, media/ files, manifest.json.
+BACKUP_FORMAT_VERSION = 2
+BACKUP_HEADER_MEMBER = "backup.json"
 _MISSING = object()
+_CHUNK_DONE = object()
 _LEGACY_FIELD_RENAMES: dict[str, dict[str, str]] = {
     # products.DocumentType.has_ocr_check -> products.DocumentType.ai_validation
     "products.documenttype": {"has_ocr_check": "ai_validation"},
@@ -698,29 +709,21 @@ def _normalize_legacy_natural_key_fixture(fixture_path: str) -> tuple[str | None
     return normalized_path, assigned_pk_count, converted_ref_count, unresolved_ref_count, ambiguous_ref_count
 
 
-def _sanitize_fixture_model_fields(
-    fixture_path: str,
-) -> tuple[str | None, int, int, dict[str, int]]:
+def _sanitize_fixture_objects(
+    objects: list, valid_field_cache: dict[str, set[str]] | None = None
+) -> tuple[bool, int, int, dict[str, int]]:
     """
-    Sanitize fixture field payloads to match the current Django schema.
+    Sanitize fixture objects in place to match the current Django schema.
 
     - Applies known legacy field renames.
     - Drops unknown fields to prevent loaddata hard-failures after refactors.
     """
-    try:
-        with open(fixture_path, "r", encoding="utf-8") as handle:
-            objects = json.load(handle)
-    except Exception:
-        return None, 0, 0, {}
-
-    if not isinstance(objects, list):
-        return None, 0, 0, {}
-
     changed = False
     renamed_count = 0
     dropped_count = 0
     dropped_by_model: dict[str, int] = {}
-    valid_field_cache: dict[str, set[str]] = {}
+    if valid_field_cache is None:
+        valid_field_cache = {}
 
     for obj in objects:
         if not isinstance(obj, dict):
@@ -774,6 +777,23 @@ def _sanitize_fixture_model_fields(
             dropped_by_model[model_label] = dropped_by_model.get(model_label, 0) + 1
             changed = True
 
+    return changed, renamed_count, dropped_count, dropped_by_model
+
+
+def _sanitize_fixture_model_fields(
+    fixture_path: str,
+) -> tuple[str | None, int, int, dict[str, int]]:
+    """Sanitize a fixture file with ``_sanitize_fixture_objects`` and write the result to a temp file."""
+    try:
+        with open(fixture_path, "r", encoding="utf-8") as handle:
+            objects = json.load(handle)
+    except Exception:
+        return None, 0, 0, {}
+
+    if not isinstance(objects, list):
+        return None, 0, 0, {}
+
+    changed, renamed_count, dropped_count, dropped_by_model = _sanitize_fixture_objects(objects)
     if not changed:
         return None, 0, 0, {}
 
@@ -851,8 +871,173 @@ def _temporarily_disable_postgres_server_side_cursors(database_alias: str = "def
             connection.settings_dict["DISABLE_SERVER_SIDE_CURSORS"] = previous_value
 
 
+def _backup_models(include_users: bool) -> list:
+    """Concrete models to dump, sorted so that FK targets come before the models referencing them."""
+    by_app: dict = {}
+    for model in apps.get_models():
+        meta = model._meta
+        if meta.proxy or not meta.managed:
+            continue
+        if not include_users and (meta.app_label in SYSTEM_APP_LABELS or meta.label_lower in USER_RELATED_MODELS):
+            continue
+        by_app.setdefault(meta.app_config, []).append(model)
+    return serializers.sort_dependencies(list(by_app.items()), allow_cycles=True)
+
+
+@contextmanager
+def _shared_dump_snapshot(workers: int):
+    """
+    Yield an exported PostgreSQL snapshot id so parallel dump workers read one consistent database state.
+
+    The snapshot stays valid while this context holds its REPEATABLE READ transaction open; single-worker
+    dumps (and non-PostgreSQL databases) get ``None`` and read inside their own transaction instead.
+    """
+    connection = connections["default"]
+    if workers <= 1 or connection.vendor != "postgresql":
+        yield None
+        return
+
+    from django.db import transaction
+
+    with transaction.atomic(using="default"):
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            cursor.execute("SELECT pg_export_snapshot()")
+            snapshot_id = str(cursor.fetchone()[0])
+        if not re.fullmatch(r"[0-9A-Fa-f-]+", snapshot_id):
+            raise RuntimeError(f"Unexpected PostgreSQL snapshot id: {snapshot_id!r}")
+        yield snapshot_id
+
+
+def _iter_model_chunks(model, chunk_size: int, snapshot_id: str | None = None):
+    """Yield ``(member_name, json_bytes, row_count)`` for ``model`` in pk-ordered chunks of ``chunk_size`` rows."""
+    from django.db import connection, transaction
+
+    label = model._meta.label_lower
+    m2m_names = [
+        field.name for field in model._meta.many_to_many if field.remote_field.through._meta.auto_created
+    ]
+    queryset = model._base_manager.order_by("pk")
+    if m2m_names:
+        queryset = queryset.prefetch_related(*m2m_names)
+
+    with transaction.atomic():
+        if snapshot_id:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                cursor.execute(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+
+        last_pk = _MISSING
+        index = 0
+        while True:
+            page = queryset if last_pk is _MISSING else queryset.filter(pk__gt=last_pk)
+            rows = list(page[:chunk_size])
+            if not rows:
+                return
+            index += 1
+            payload = serializers.serialize("json", rows).encode("utf-8")
+            yield f"data/{label}/{index:06d}.json", payload, len(rows)
+            if len(rows) < chunk_size:
+                return
+            last_pk = rows[-1].pk
+
+
+class _DumpCancelled(Exception):
+    pass
+
+
+def _dump_model_into_queue(model, chunk_size: int, snapshot_id, chunk_queue: queue.Queue, cancelled: threading.Event):
+    """Worker body: feed ``chunk_queue`` with the model's chunks, then ``_CHUNK_DONE`` (or the raised exception)."""
+
+    def _put(item) -> None:
+        while True:
+            try:
+                chunk_queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if cancelled.is_set():
+                    raise _DumpCancelled() from None
+
+    try:
+        for chunk in _iter_model_chunks(model, chunk_size, snapshot_id):
+            _put(chunk)
+        _put(_CHUNK_DONE)
+    except _DumpCancelled:
+        pass
+    except Exception as exc:
+        try:
+            _put(exc)
+        except _DumpCancelled:
+            pass
+    finally:
+        connections.close_all()
+
+
+def _add_tar_bytes(tar: tarfile.TarFile, name: str, payload: bytes) -> None:
+    info = tarfile.TarInfo(name=name)
+    info.size = len(payload)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(payload))
+
+
+def _write_chunked_data(tar: tarfile.TarFile, models: list, *, chunk_size: int, workers: int, snapshot_id):
+    """
+    Stream every model's chunks into ``tar`` in dependency order; returns ``(rows_by_model, payload_bytes)``.
+
+    With several workers, models are dumped concurrently into small bounded queues that this (single tar
+    writer) thread drains model by model, so memory stays at a few chunks regardless of database size.
+    """
+    rows_by_model: dict[str, int] = {}
+    payload_bytes = 0
+    chunk_queues = [queue.Queue(maxsize=2) for _ in models]
+    cancelled = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backup-dump") if workers > 1 else None
+
+    try:
+        if executor is not None:
+            for model, chunk_queue in zip(models, chunk_queues):
+                executor.submit(_dump_model_into_queue, model, chunk_size, snapshot_id, chunk_queue, cancelled)
+
+        for index, (model, chunk_queue) in enumerate(zip(models, chunk_queues), start=1):
+            label = model._meta.label_lower
+            if executor is None:
+                chunks = _iter_model_chunks(model, chunk_size)
+            else:
+                chunks = iter(chunk_queue.get, _CHUNK_DONE)
+
+            row_count = 0
+            chunk_count = 0
+            try:
+                for chunk in chunks:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    name, payload, count = chunk
+                    _add_tar_bytes(tar, name, payload)
+                    payload_bytes += len(payload)
+                    row_count += count
+                    chunk_count += 1
+            except Exception as exc:
+                if label == "core.userprofile" and _is_missing_userprofile_cache_enabled_column_error(exc):
+                    yield (
+                        "Warning: detected schema drift (missing core_userprofile.cache_enabled). "
+                        "Continuing backup without core.userprofile."
+                    )
+                    continue
+                raise
+
+            rows_by_model[label] = row_count
+            if row_count:
+                yield f"Dumped {label}: {row_count} rows in {chunk_count} chunk(s) ({index}/{len(models)})"
+    finally:
+        cancelled.set()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return rows_by_model, payload_bytes
+
+
 def backup_all(include_users=False):
-    """Backup all Django model data using dumpdata, compress to gzipped JSON.
+    """Backup all Django model data as per-table JSON chunks streamed into a zstd (or gzip) tar.
     If include_users is False, exclude system/user tables.
     Returns a generator of progress messages. Final yielding is the path.
     """
@@ -864,83 +1049,69 @@ def backup_all(include_users=False):
     archive_mode = "w:zst" if use_zst_archive else "w:gz"
     filename = f"backup-{ts}{suffix}.{archive_ext}"
     out_path = os.path.join(BACKUPS_DIR, filename)
+    chunk_size = max(1, int(getattr(settings, "ADMIN_BACKUP_CHUNK_SIZE", 5000)))
+    workers = 1
+    if connections["default"].vendor == "postgresql":
+        workers = max(1, int(getattr(settings, "ADMIN_BACKUP_DUMP_WORKERS", 4)))
 
-    yield "Starting Django dumpdata backup..."
+    yield "Starting chunked database backup..."
 
-    # Build dumpdata args
-    tmp_path = os.path.join(BACKUPS_DIR, f"tmp-{ts}.json")
-    # Use PK-based dumpdata for compatibility:
+    # Use PK-based serialization for compatibility:
     # some legacy model natural_key() implementations are not loaddata-safe.
-    dump_args = ["dumpdata"]
-    excluded_prefixes = ("auth", "admin", "sessions", "contenttypes")
-    if not include_users:
-        for prefix in excluded_prefixes:
-            dump_args.append(f"--exclude={prefix}")
-        for model_label in USER_RELATED_MODELS:
-            dump_args.append(f"--exclude={model_label}")
-    with open(tmp_path, "w+") as tmpf:
-        try:
-            with _temporarily_disable_postgres_server_side_cursors("default"):
-                call_command(*dump_args, stdout=tmpf)
-        except Exception as exc:
-            if include_users and _is_missing_userprofile_cache_enabled_column_error(exc):
-                yield (
-                    "Warning: detected schema drift (missing core_userprofile.cache_enabled). "
-                    "Retrying backup while excluding core.userprofile."
-                )
-                tmpf.seek(0)
-                tmpf.truncate(0)
-                fallback_args = [*dump_args, "--exclude=core.userprofile"]
-                with _temporarily_disable_postgres_server_side_cursors("default"):
-                    call_command(*fallback_args, stdout=tmpf)
-            else:
-                raise
-    try:
-        json_size = os.path.getsize(tmp_path)
-        yield f"DB dump JSON size (uncompressed): {_format_bytes(json_size)}"
-    except Exception:
-        pass
-    try:
-        for idx, (table_name, total_bytes) in enumerate(_top_postgres_table_sizes(limit=10), start=1):
-            yield f"Top table {idx}: {table_name} ({_format_bytes(total_bytes)})"
-    except Exception as e:
-        yield f"Warning: could not compute top PostgreSQL table sizes: {e}"
+    models = _backup_models(include_users)
+    filepaths = _collect_referenced_filepaths()
+    uses_external_media_storage = _is_external_object_storage(default_storage)
+    storage_descriptor = _build_storage_descriptor(default_storage)
 
-    # Build a temporary directory to assemble our tar
-    temp_dir = tempfile.mkdtemp(prefix=f"backup-{ts}-")
     try:
-        # Copy JSON dump into temp dir
-        temp_json = os.path.join(temp_dir, "data.json")
-        shutil.copy(tmp_path, temp_json)
-
-        filepaths = _collect_referenced_filepaths()
-        uses_external_media_storage = _is_external_object_storage(default_storage)
-        storage_descriptor = _build_storage_descriptor(default_storage)
-
-        yield f"Found {len(filepaths)} media files referenced in DB"
-        if uses_external_media_storage:
+        with tarfile.open(out_path, archive_mode) as tar:
+            header = {
+                "format": BACKUP_FORMAT_VERSION,
+                "timestamp": ts,
+                "include_users": bool(include_users),
+                "chunk_size": chunk_size,
+                "models": [model._meta.label_lower for model in models],
+                "embedded_media_count": 0 if uses_external_media_storage else len(filepaths),
+            }
+            _add_tar_bytes(tar, BACKUP_HEADER_MEMBER, json.dumps(header).encode("utf-8"))
+
+            yield f"Dumping {len(models)} tables in chunks of {chunk_size} rows with {workers} worker(s)..."
+            with (
+                _temporarily_disable_postgres_server_side_cursors("default"),
+                _shared_dump_snapshot(workers) as snapshot_id,
+            ):
+                rows_by_model, payload_bytes = yield from _write_chunked_data(
+                    tar, models, chunk_size=chunk_size, workers=workers, snapshot_id=snapshot_id
+                )
             yield (
-                "Media storage is external object storage "
-                f"({storage_descriptor.get('provider')}:{storage_descriptor.get('bucket')}); "
-                "skipping media file embedding in backup archive."
+                f"DB dump size (uncompressed): {_format_bytes(payload_bytes)} "
+                f"in {sum(rows_by_model.values())} rows"
             )
-        else:
-            yield "Media storage is local filesystem; embedding media files in backup archive."
+            try:
+                for idx, (table_name, total_bytes) in enumerate(_top_postgres_table_sizes(limit=10), start=1):
+                    yield f"Top table {idx}: {table_name} ({_format_bytes(total_bytes)})"
+            except Exception as e:
+                yield f"Warning: could not compute top PostgreSQL table sizes: {e}"
 
-        # Create tar archive with JSON, manifest and files under 'media/' prefix.
-        with tarfile.open(out_path, archive_mode) as tar:
-            tar.add(temp_json, arcname="data.json")
+            yield f"Found {len(filepaths)} media files referenced in DB"
+            if uses_external_media_storage:
+                yield (
+                    "Media storage is external object storage "
+                    f"({storage_descriptor.get('provider')}:{storage_descriptor.get('bucket')}); "
+                    "skipping media file embedding in backup archive."
+                )
+            else:
+                yield "Media storage is local filesystem; embedding media files in backup archive."
 
+            # Media files are stored under 'media/' so restore can put them back at the same storage keys.
             embedded_file_count = 0
+            embedded_sizes: dict[str, int | None] = {}
             if not uses_external_media_storage:
                 for i, rel_path in enumerate(filepaths):
-                    # store under media/relative_path so we can restore to MEDIA_ROOT
                     arcname = os.path.join("media", rel_path)
-                    # open via default_storage and add as fileobj
                     try:
                         with default_storage.open(rel_path, "rb") as f:
                             info = tarfile.TarInfo(name=arcname)
-                            # Get size from fileobj if possible
                             try:
                                 f.seek(0, os.SEEK_END)
                                 size = f.tell()
@@ -948,13 +1119,13 @@ def backup_all(include_users=False):
                             except Exception:
                                 size = None
                             if size is None:
-                                # read to memory
                                 data = f.read()
                                 info.size = len(data)
                                 tar.addfile(info, io.BytesIO(data))
                             else:
                                 info.size = size
                                 tar.addfile(info, f)
+                            embedded_sizes[rel_path] = info.size
                             embedded_file_count += 1
                     except Exception:
                         yield f"Warning: could not include file: {rel_path}"
@@ -962,22 +1133,20 @@ def backup_all(include_users=False):
                     if (i + 1) % 10 == 0 or (i + 1) == len(filepaths):
                         yield f"Included {i + 1}/{len(filepaths)} media files in backup"
 
-            # write a manifest.json with included files metadata
             manifest_files = []
             for rel_path in filepaths:
                 manifest_entry: dict[str, Any] = {"path": rel_path}
                 # Preserve sizes only when we embed media in backup archive.
                 if not uses_external_media_storage:
-                    try:
-                        manifest_entry["size"] = default_storage.size(rel_path)
-                    except Exception:
-                        manifest_entry["size"] = None
+                    manifest_entry["size"] = embedded_sizes.get(rel_path)
                 manifest_files.append(manifest_entry)
 
             manifest = {
                 "timestamp": ts,
+                "format": BACKUP_FORMAT_VERSION,
                 "included_files_count": embedded_file_count,
                 "referenced_files_count": len(filepaths),
+                "data": {"chunk_size": chunk_size, "rows_by_model": rows_by_model},
                 "media": {
                     "included_in_archive": not uses_external_media_storage,
                     "mode": "embedded" if not uses_external_media_storage else "external_storage_reference",
@@ -985,28 +1154,13 @@ def backup_all(include_users=False):
                 },
                 "files": manifest_files,
             }
-
-            manifest_bytes = json.dumps(manifest).encode("utf-8")
-            manifest_info = tarfile.TarInfo(name="manifest.json")
-            manifest_info.size = len(manifest_bytes)
-            tar.addfile(manifest_info, fileobj=io.BytesIO(manifest_bytes))
-    finally:
-        shutil.rmtree(temp_dir)
-
-    # List all models included in the backup
-    from django.apps import apps
-
-    included_models = []
-    for model in apps.get_models():
-        label = model._meta.label_lower
-        if include_users or not label.startswith(excluded_prefixes):
-            included_models.append(label)
-    included_models.sort()
-
-    try:
-        os.unlink(tmp_path)
-    except Exception:
-        pass
+            _add_tar_bytes(tar, "manifest.json", json.dumps(manifest).encode("utf-8"))
+    except BaseException:
+        try:
+            os.unlink(out_path)
+        except Exception:
+            pass
+        raise
 
     try:
         archive_size = os.path.getsize(out_path)
@@ -1019,29 +1173,475 @@ def backup_all(include_users=False):
     yield f"RESULT_PATH:{out_path}"
 
 
+@contextmanager
+def _open_archive_stream(path: str, comp: str):
+    """Open a backup tar for sequential reads, without extracting it, falling back to a zstd module."""
+    if comp != "zst":
+        with tarfile.open(path, f"r|{comp}") as tar:  # type: ignore[arg-type]
+            yield tar
+        return
+
+    try:
+        native_tar = tarfile.open(path, "r|zst")  # type: ignore[arg-type]
+    except (tarfile.CompressionError, tarfile.ReadError, ValueError):
+        native_tar = None
+    if native_tar is not None:
+        with native_tar:
+            yield native_tar
+        return
+
+    zstd = _get_zstd_module()
+    if not zstd:
+        raise RuntimeError(
+            "Cannot read .tar.zst backup: no zstd support available. "
+            "Install 'backports-zstd' (or 'zstandard') or restore from .tar.gz."
+        )
+    with zstd.open(path, "rb") as stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+        yield tar
+
+
+def _read_chunked_backup_header(path: str, comp: str) -> dict | None:
+    """Return the header of a chunked backup archive, or None for legacy ``data.json`` archives."""
+    try:
+        with _open_archive_stream(path, comp) as tar:
+            member = tar.next()
+            if member is None or member.name != BACKUP_HEADER_MEMBER or not member.isfile():
+                return None
+            handle = tar.extractfile(member)
+            header = json.load(handle) if handle else None
+    except Exception:
+        # Unreadable archives go through the legacy path, which reports extraction errors in detail.
+        return None
+
+    if not isinstance(header, dict):
+        return None
+    if header.get("format") != BACKUP_FORMAT_VERSION:
+        raise RuntimeError(f"Unsupported backup archive format: {header.get('format')!r}")
+    return header
+
+
+def _validate_stream_member(member: tarfile.TarInfo) -> str:
+    """Apply the ``_safe_extract_tar`` rules to a streamed member and return its normalized name."""
+    name = member.name.replace("\\", "/")
+    if member.issym() or member.islnk():
+        raise RuntimeError(f"Unsafe backup archive link entry detected: {member.name!r}")
+    if not (member.isdir() or member.isfile()):
+        raise RuntimeError(f"Unsafe backup archive member type detected: {member.name!r}")
+    if name.startswith("/") or ".." in PurePosixPath(name).parts:
+        raise RuntimeError(f"Unsafe backup archive member path detected: {member.name!r}")
+    return name
+
+
+def _raw_insert(model, objs: list, batch_size: int = 1000) -> None:
+    """Insert rows as stored, like loaddata's raw saves: bulk_create would re-stamp auto_now/auto_now_add columns."""
+    fields = [field for field in model._meta.local_concrete_fields if not getattr(field, "generated", False)]
+    for start in range(0, len(objs), batch_size):
+        model._base_manager._insert(objs[start : start + batch_size], fields=fields, raw=True)
+
+
+def _load_backup_chunk(payload: bytes, *, field_cache: dict, loaded_models: set, stats: dict) -> tuple[str, int]:
+    """Raw-insert one chunk (serialized objects of a single model) plus its auto-created m2m rows."""
+    objects = json.loads(payload)
+    if not isinstance(objects, list) or not objects:
+        return "", 0
+
+    label = str(objects[0].get("model") or "")
+    try:
+        model = apps.get_model(label)
+    except (LookupError, ValueError):
+        stats["skipped_unknown_models"].add(label)
+        return label, 0
+
+    _changed, renamed, dropped, _dropped_by_model = _sanitize_fixture_objects(objects, field_cache)
+    stats["renamed_fields"] += renamed
+    stats["dropped_fields"] += dropped
+
+    deserialized = list(serializers.deserialize("python", objects, ignorenonexistent=True))
+    loaded_models.add(model)
+    if model._meta.parents:
+        # bulk_create cannot write multi-table inherited models; fall back to loaddata-style raw saves.
+        for item in deserialized:
+            item.save()
+        return label, len(deserialized)
+
+    _raw_insert(model, [item.object for item in deserialized])
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            continue
+        source_attname = f"{field.m2m_field_name()}_id"
+        target_attname = f"{field.m2m_reverse_field_name()}_id"
+        rows = [
+            through(**{source_attname: item.object.pk, target_attname: target_pk})
+            for item in deserialized
+            for target_pk in item.m2m_data.get(field.name, [])
+        ]
+        if rows:
+            through._base_manager.bulk_create(rows, batch_size=1000)
+            loaded_models.add(through)
+    return label, len(deserialized)
+
+
+def _sync_apply_context():
+    try:
+        # Prevent local sync capture signals from writing to SyncChangeLog while fixtures load.
+        from core.services.sync_service import sync_apply_context
+
+        return sync_apply_context
+    except Exception:
+        return nullcontext
+
+
+def _set_foreign_key_checks(connection, enabled: bool) -> None:
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"PRAGMA foreign_keys = {'ON' if enabled else 'OFF'};")
+        elif connection.vendor == "mysql":
+            cursor.execute(f"SET foreign_key_checks = {1 if enabled else 0};")
+        elif connection.vendor == "postgresql":
+            cursor.execute(f"SET session_replication_role = {'DEFAULT' if enabled else 'replica'};")
+
+
+def _set_user_signals_connected(connected: bool) -> None:
+    """Connect or disconnect the per-user auto-create/save signals that would duplicate restored rows."""
+    from core.models.user_profile import create_user_profile, save_user_profile
+    from core.models.user_settings import create_user_settings, save_user_settings
+    from django.contrib.auth.models import User
+    from django.db.models.signals import post_save
+
+    handler = post_save.connect if connected else post_save.disconnect
+    for receiver in (create_user_profile, save_user_profile, create_user_settings, save_user_settings):
+        handler(receiver, sender=User)
+
+
+def _flush_tables_for_restore(connection, includes_users: bool):
+    """Generator: empty the tables a restore replaces; returns whether the user signals were disconnected."""
+    if includes_users:
+        yield "Flushing database (all tables, including users/groups/permissions)..."
+    else:
+        yield "Flushing database (only data tables, users/groups/permissions preserved)..."
+
+    if not includes_users:
+        # Only flush non-system tables
+        excluded_prefixes = ("auth", "admin", "sessions", "contenttypes")
+        tables_to_flush = []
+        existing_tables = set(connection.introspection.table_names())
+        for model in apps.get_models():
+            label = model._meta.label_lower
+            if not label.startswith(excluded_prefixes) and label not in USER_RELATED_MODELS:
+                table_name = model._meta.db_table
+                if table_name in existing_tables:
+                    tables_to_flush.append(table_name)
+        if tables_to_flush:
+            with connection.cursor() as cursor:
+                for table in tables_to_flush:
+                    if connection.vendor == "sqlite":
+                        # SQLite does not support TRUNCATE; use DELETE
+                        cursor.execute(f'DELETE FROM "{table}";')
+                        # Reset sqlite sequence if present
+                        try:
+                            cursor.execute(
+                                "DELETE FROM sqlite_sequence WHERE name = ?;",
+                                (table,),
+                            )
+                        except Exception:
+                            pass
+                    else:
+                        cursor.execute(f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE;')
+        return False
+
+    from core.models.user_profile import UserProfile
+
+    call_command("flush", "--noinput")
+    try:
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Permission
+        from django.contrib.contenttypes.models import ContentType
+
+        yield "Clearing content types, permissions, users, and profiles..."
+        # Delete in order to respect FK constraints. Guard each delete by
+        # table existence to avoid breaking the transaction on partially
+        # migrated/test databases.
+        existing_tables = set(connection.introspection.table_names())
+        user_model = get_user_model()
+
+        if UserProfile._meta.db_table in existing_tables:
+            UserProfile.objects.all().delete()
+        if Permission._meta.db_table in existing_tables:
+            Permission.objects.all().delete()
+        if user_model._meta.db_table in existing_tables:
+            user_model.objects.all().delete()
+        if ContentType._meta.db_table in existing_tables:
+            ContentType.objects.all().delete()
+    except Exception as e:
+        yield f"Warning: Could not clear content types/permissions/users: {e}"
+
+    # Disconnect per-user auto-create/save signals to prevent duplicates while loading data.
+    yield "Disconnecting UserProfile/UserSettings signals for clean restore..."
+    _set_user_signals_connected(False)
+    return True
+
+
+def _restore_media_file(rel: str, fileobj, media_summary: dict, saved_path_map: dict) -> None:
+    if default_storage.exists(rel):
+        media_summary["skipped_existing"] += 1
+        return
+    saved_path = default_storage.save(rel, File(fileobj))
+    if saved_path != rel:
+        saved_path_map[rel] = saved_path
+    media_summary["copied"] += 1
+
+
+def _restore_external_media(manifest: dict, media_summary: dict, saved_path_map: dict, embedded_media_present: bool):
+    """Generator: copy media that was intentionally not embedded (cloud/object storage) from source storage."""
+    media_meta = manifest.get("media", {}) if isinstance(manifest, dict) else {}
+    manifest_filepaths = _manifest_filepaths(manifest)
+    uses_external_reference = bool(
+        manifest_filepaths
+        and (
+            not media_meta
+            or media_meta.get("mode") == "external_storage_reference"
+            or not media_meta.get("included_in_archive", True)
+        )
+    )
+    if not uses_external_reference or embedded_media_present:
+        return
+
+    source_storage_info = media_meta.get("storage", {}) if isinstance(media_meta, dict) else {}
+    target_storage_info = _build_storage_descriptor(default_storage)
+    if _storage_descriptors_match(source_storage_info, target_storage_info):
+        existing_count = 0
+        missing_count = 0
+        for rel in manifest_filepaths:
+            try:
+                if default_storage.exists(rel):
+                    existing_count += 1
+                else:
+                    missing_count += 1
+            except Exception:
+                missing_count += 1
+        yield (
+            "Source and target object storage are identical; "
+            "skipping media copy to avoid destructive self-overwrite "
+            f"(existing={existing_count}, missing={missing_count})."
+        )
+        media_summary["skipped_existing"] += existing_count
+        media_summary["missing_source"] += missing_count
+        return
+
+    source_storage, storage_error = _build_source_storage_from_manifest(manifest)
+    if source_storage is None:
+        yield f"Warning: cannot restore external media files: {storage_error}"
+        return
+
+    source_provider = source_storage_info.get("provider", "unknown")
+    source_bucket = source_storage_info.get("bucket", "unknown")
+    total_files = len(manifest_filepaths)
+    yield (
+        f"Restoring {total_files} media files from source object storage "
+        f"(provider={source_provider}, bucket={source_bucket})..."
+    )
+    for i, rel in enumerate(manifest_filepaths):
+        try:
+            if default_storage.exists(rel):
+                media_summary["skipped_existing"] += 1
+            else:
+                with source_storage.open(rel, "rb") as source_handle:
+                    _restore_media_file(rel, source_handle, media_summary, saved_path_map)
+
+            if (i + 1) % 10 == 0 or (i + 1) == total_files:
+                progress = int(((i + 1) / total_files) * 100)
+                yield f"PROGRESS:{progress}"
+                yield f"Processed {i + 1}/{total_files} files..."
+        except Exception as e:
+            if _is_missing_source_error(e):
+                media_summary["missing_source"] += 1
+            yield f"Warning: could not copy media file {rel} from source storage: {e}"
+
+
+def _sync_renamed_media_paths(saved_path_map: dict):
+    """Generator: point FileFields at the keys storage assigned when a restored media name was taken."""
+    if not saved_path_map:
+        return
+
+    from django.db import transaction
+
+    try:
+        yield f"Syncing {len(saved_path_map)} renamed media paths..."
+        with transaction.atomic():
+            for model in apps.get_models():
+                for field in model._meta.get_fields():
+                    if isinstance(field, FileField):
+                        field_name = field.name
+                        old_paths = list(saved_path_map.keys())
+                        try:
+                            qs = model.objects.filter(**{f"{field_name}__in": old_paths})
+                        except Exception:
+                            continue
+                        for obj in qs:
+                            current_value = getattr(obj, field_name)
+                            if not current_value:
+                                continue
+                            old_path = current_value.name
+                            new_path = saved_path_map.get(old_path)
+                            if new_path and new_path != old_path:
+                                setattr(obj, field_name, new_path)
+                                obj.save(update_fields=[field_name])
+    except Exception as e:
+        yield f"Warning: could not sync renamed media paths: {e}"
+
+
+def _media_restore_summary(media_summary: dict) -> str:
+    return (
+        "RESTORE_SUMMARY: "
+        f"copied={media_summary['copied']} "
+        f"skipped_existing={media_summary['skipped_existing']} "
+        f"missing_source={media_summary['missing_source']}"
+    )
+
+
+def _restore_chunked_backup(path: str, comp: str, header: dict):
+    """
+    Generator: restore a chunked archive in one streaming pass.
+
+    Chunks are bulk-inserted in archive (dependency) order with constraint checks deferred to a single
+    check at the end, so memory is bounded by one chunk; media members are copied straight from the stream.
+    """
+    from django.db import connection, transaction
+
+    includes_users = bool(header.get("include_users"))
+    total_models = max(1, len(header.get("models") or []))
+    total_media = int(header.get("embedded_media_count") or 0)
+    manifest: dict = {}
+    saved_path_map: dict = {}
+    media_summary = {"copied": 0, "skipped_existing": 0, "missing_source": 0}
+    stats: dict = {"renamed_fields": 0, "dropped_fields": 0, "skipped_unknown_models": set()}
+    field_cache: dict[str, set[str]] = {}
+    loaded_models: set = set()
+    signals_disconnected = False
+    embedded_media_present = False
+
+    try:
+        with _open_archive_stream(path, comp) as tar:
+            tar.next()  # header, already parsed by _read_chunked_backup_header
+            member = tar.next()
+
+            yield "Disabling foreign key checks..."
+            _set_foreign_key_checks(connection, enabled=False)
+            with transaction.atomic():
+                try:
+                    signals_disconnected = yield from _flush_tables_for_restore(connection, includes_users)
+                    yield "Streaming table chunks into the database..."
+                    total_rows = 0
+                    current_label = ""
+                    finished_models = 0
+                    with _sync_apply_context()(), connection.constraint_checks_disabled():
+                        while member is not None and member.name.startswith("data/"):
+                            _validate_stream_member(member)
+                            handle = tar.extractfile(member)
+                            label, count = _load_backup_chunk(
+                                handle.read() if handle else b"[]",
+                                field_cache=field_cache,
+                                loaded_models=loaded_models,
+                                stats=stats,
+                            )
+                            total_rows += count
+                            if label and label != current_label:
+                                if current_label:
+                                    finished_models += 1
+                                    yield f"Loaded {current_label} ({finished_models}/{total_models})"
+                                current_label = label
+                            member = tar.next()
+                    if current_label:
+                        yield f"Loaded {current_label} ({finished_models + 1}/{total_models})"
+
+                    if loaded_models:
+                        yield "Checking constraints and resetting sequences..."
+                        connection.check_constraints(table_names=[model._meta.db_table for model in loaded_models])
+                        sequence_sql = connection.ops.sequence_reset_sql(no_style(), list(loaded_models))
+                        if sequence_sql:
+                            with connection.cursor() as cursor:
+                                for sql in sequence_sql:
+                                    cursor.execute(sql)
+                    if stats["renamed_fields"] or stats["dropped_fields"]:
+                        yield (
+                            "Sanitized chunk fields for current schema: "
+                            f"renamed_fields={stats['renamed_fields']}, "
+                            f"dropped_unknown_fields={stats['dropped_fields']}"
+                        )
+                    if stats["skipped_unknown_models"]:
+                        skipped = ", ".join(sorted(stats["skipped_unknown_models"]))
+                        yield f"Warning: skipped chunks for models missing from the current schema: {skipped}"
+                    yield f"Data loading complete ({total_rows} rows)."
+                except Exception as e:
+                    yield f"Error during restore, rolling back: {e}"
+                    raise
+                finally:
+                    if signals_disconnected:
+                        yield "Reconnecting UserProfile/UserSettings signals..."
+                        _set_user_signals_connected(True)
+
+            # Never delete destination files during restore: copy only missing objects.
+            restored_media = 0
+            if total_media:
+                yield f"Restoring {total_media} media files from backup archive..."
+            while member is not None:
+                name = _validate_stream_member(member)
+                if name == "manifest.json":
+                    handle = tar.extractfile(member)
+                    manifest = json.load(handle) if handle else {}
+                elif name.startswith("media/") and member.isfile():
+                    embedded_media_present = True
+                    restored_media += 1
+                    rel = name[len("media/") :]
+                    try:
+                        if default_storage.exists(rel):
+                            media_summary["skipped_existing"] += 1
+                        else:
+                            with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+                                shutil.copyfileobj(tar.extractfile(member), spool)
+                                spool.seek(0)
+                                _restore_media_file(rel, spool, media_summary, saved_path_map)
+                    except Exception as e:
+                        if _is_missing_source_error(e):
+                            media_summary["missing_source"] += 1
+                        yield f"Warning: could not restore media file {rel}: {e}"
+                    if restored_media % 10 == 0 or restored_media == total_media:
+                        yield f"PROGRESS:{int(min(restored_media / max(total_media, 1), 1) * 100)}"
+                        yield f"Processed {restored_media}/{total_media} files..."
+                member = tar.next()
+
+        yield from _restore_external_media(manifest, media_summary, saved_path_map, embedded_media_present)
+        yield _media_restore_summary(media_summary)
+        yield from _sync_renamed_media_paths(saved_path_map)
+        yield "Restore completed successfully."
+        return True
+    finally:
+        try:
+            _set_foreign_key_checks(connection, enabled=True)
+        except Exception:
+            pass
+
+
 def restore_from_file(path, include_users=False):
-    """Restore DB from a gzipped dumpdata file (Django JSON). If include_users is False, do not flush system/user tables.
+    """Restore DB from a backup archive or a gzipped dumpdata file (Django JSON).
+    Chunked archives stream straight into the database; legacy archives go through loaddata.
+    If include_users is False, do not flush system/user tables.
     Returns a generator of progress messages. Wrapped in atomic transaction with rollback on error.
     """
     if not os.path.exists(path):
         raise FileNotFoundError(path)
 
-    # Import the signal handlers so we can disconnect them
-    from core.models.user_profile import UserProfile, create_user_profile, save_user_profile
-    from core.models.user_settings import create_user_settings, save_user_settings
-    from django.apps import apps
-    from django.contrib.auth.models import User
-    from django.db import connection, transaction
-    from django.db.models.signals import post_save
+    if path.endswith((".tar.gz", ".tar.zst")):
+        comp = "zst" if path.endswith(".tar.zst") else "gz"
+        header = _read_chunked_backup_header(path, comp)
+        if header is not None:
+            yield "Streaming chunked backup archive..."
+            return (yield from _restore_chunked_backup(path, comp, header))
 
-    sync_apply_ctx = nullcontext
-    try:
-        # Prevent local sync capture signals from writing to SyncChangeLog while fixtures load.
-        from core.services.sync_service import sync_apply_context
+    from django.db import connection, transaction
 
-        sync_apply_ctx = sync_apply_context
-    except Exception:
-        pass
+    sync_apply_ctx = _sync_apply_context()
 
     tmp_path = None
     extracted_tmp = None
@@ -1151,86 +1751,14 @@ def restore_from_file(path, include_users=False):
                 yield f"Skipped {removed_count} user-related records from fixture for partial restore."
 
         # Disable foreign key checks
-        engine = connection.vendor
         yield "Disabling foreign key checks..."
-        with connection.cursor() as cursor:
-            if engine == "sqlite":
-                cursor.execute("PRAGMA foreign_keys = OFF;")
-            elif engine == "mysql":
-                cursor.execute("SET foreign_key_checks = 0;")
-            elif engine == "postgresql":
-                cursor.execute("SET session_replication_role = replica;")
-
-        # Only flush the right tables
-        if includes_users:
-            yield "Flushing database (all tables, including users/groups/permissions)..."
-        else:
-            yield "Flushing database (only data tables, users/groups/permissions preserved)..."
-
-        excluded_prefixes = ("auth", "admin", "sessions", "contenttypes")
+        _set_foreign_key_checks(connection, enabled=False)
 
         # Ensure flush + loaddata are atomic so failed restores cannot leave DB half-empty.
         with transaction.atomic():
             sid = transaction.savepoint()
             try:
-                if includes_users:
-                    call_command("flush", "--noinput")
-                    try:
-                        from django.contrib.auth import get_user_model
-                        from django.contrib.auth.models import Permission
-                        from django.contrib.contenttypes.models import ContentType
-
-                        yield "Clearing content types, permissions, users, and profiles..."
-                        # Delete in order to respect FK constraints. Guard each delete by
-                        # table existence to avoid breaking the transaction on partially
-                        # migrated/test databases.
-                        existing_tables = set(connection.introspection.table_names())
-                        user_model = get_user_model()
-
-                        if UserProfile._meta.db_table in existing_tables:
-                            UserProfile.objects.all().delete()
-                        if Permission._meta.db_table in existing_tables:
-                            Permission.objects.all().delete()
-                        if user_model._meta.db_table in existing_tables:
-                            user_model.objects.all().delete()
-                        if ContentType._meta.db_table in existing_tables:
-                            ContentType.objects.all().delete()
-                    except Exception as e:
-                        yield f"Warning: Could not clear content types/permissions/users: {e}"
-
-                    # Disconnect per-user auto-create/save signals to prevent duplicates during loaddata.
-                    yield "Disconnecting UserProfile/UserSettings signals for clean restore..."
-                    post_save.disconnect(create_user_profile, sender=User)
-                    post_save.disconnect(save_user_profile, sender=User)
-                    post_save.disconnect(create_user_settings, sender=User)
-                    post_save.disconnect(save_user_settings, sender=User)
-                    signals_disconnected = True
-                else:
-                    # Only flush non-system tables
-                    tables_to_flush = []
-                    existing_tables = set(connection.introspection.table_names())
-                    for model in apps.get_models():
-                        label = model._meta.label_lower
-                        if not label.startswith(excluded_prefixes) and label not in USER_RELATED_MODELS:
-                            table_name = model._meta.db_table
-                            if table_name in existing_tables:
-                                tables_to_flush.append(table_name)
-                    if tables_to_flush:
-                        with connection.cursor() as cursor:
-                            for table in tables_to_flush:
-                                if engine == "sqlite":
-                                    # SQLite does not support TRUNCATE; use DELETE
-                                    cursor.execute(f'DELETE FROM "{table}";')
-                                    # Reset sqlite sequence if present
-                                    try:
-                                        cursor.execute(
-                                            "DELETE FROM sqlite_sequence WHERE name = ?;",
-                                            (table,),
-                                        )
-                                    except Exception:
-                                        pass
-                                else:
-                                    cursor.execute(f'TRUNCATE TABLE "{table}" RESTART IDENTITY CASCADE;')
+                signals_disconnected = yield from _flush_tables_for_restore(connection, includes_users)
 
                 yield "Loading data via loaddata (this may take a few minutes)..."
                 with sync_apply_ctx():
@@ -1250,10 +1778,7 @@ def restore_from_file(path, include_users=False):
                 # Reconnect signals regardless of success/failure
                 if signals_disconnected:
                     yield "Reconnecting UserProfile/UserSettings signals..."
-                    post_save.connect(create_user_profile, sender=User)
-                    post_save.connect(save_user_profile, sender=User)
-                    post_save.connect(create_user_settings, sender=User)
-                    post_save.connect(save_user_settings, sender=User)
+                    _set_user_signals_connected(True)
 
         saved_path_map = {}
         media_summary = {
@@ -1279,20 +1804,8 @@ def restore_from_file(path, include_users=False):
                 for i, src in enumerate(embedded_files):
                     rel = os.path.relpath(src, extracted_media_tmpdir)
                     try:
-                        if default_storage.exists(rel):
-                            media_summary["skipped_existing"] += 1
-                            if (i + 1) % 10 == 0 or (i + 1) == total_files:
-                                progress = int(((i + 1) / total_files) * 100)
-                                yield f"PROGRESS:{progress}"
-                                yield f"Processed {i + 1}/{total_files} files..."
-                            continue
-
                         with open(src, "rb") as fsrc:
-                            django_file = File(fsrc)
-                            saved_path = default_storage.save(rel, django_file)
-                            if saved_path != rel:
-                                saved_path_map[rel] = saved_path
-                            media_summary["copied"] += 1
+                            _restore_media_file(rel, fsrc, media_summary, saved_path_map)
 
                         if (i + 1) % 10 == 0 or (i + 1) == total_files:
                             progress = int(((i + 1) / total_files) * 100)
@@ -1303,122 +1816,16 @@ def restore_from_file(path, include_users=False):
                             media_summary["missing_source"] += 1
                         yield f"Warning: could not restore media file {rel}: {e}"
 
-        # If media was intentionally not embedded (cloud/object storage), copy it from source storage.
-        media_meta = manifest.get("media", {}) if isinstance(manifest, dict) else {}
-        manifest_filepaths = _manifest_filepaths(manifest)
-        uses_external_reference = bool(
-            manifest_filepaths
-            and (
-                not media_meta
-                or media_meta.get("mode") == "external_storage_reference"
-                or not media_meta.get("included_in_archive", True)
-            )
-        )
-        if uses_external_reference and not embedded_media_present:
-            source_storage_info = media_meta.get("storage", {}) if isinstance(media_meta, dict) else {}
-            target_storage_info = _build_storage_descriptor(default_storage)
-            if _storage_descriptors_match(source_storage_info, target_storage_info):
-                existing_count = 0
-                missing_count = 0
-                for rel in manifest_filepaths:
-                    try:
-                        if default_storage.exists(rel):
-                            existing_count += 1
-                        else:
-                            missing_count += 1
-                    except Exception:
-                        missing_count += 1
-                yield (
-                    "Source and target object storage are identical; "
-                    "skipping media copy to avoid destructive self-overwrite "
-                    f"(existing={existing_count}, missing={missing_count})."
-                )
-                media_summary["skipped_existing"] += existing_count
-                media_summary["missing_source"] += missing_count
-            else:
-                source_storage, storage_error = _build_source_storage_from_manifest(manifest)
-                if source_storage is None:
-                    yield f"Warning: cannot restore external media files: {storage_error}"
-                else:
-                    source_provider = source_storage_info.get("provider", "unknown")
-                    source_bucket = source_storage_info.get("bucket", "unknown")
-                    total_files = len(manifest_filepaths)
-                    yield (
-                        f"Restoring {total_files} media files from source object storage "
-                        f"(provider={source_provider}, bucket={source_bucket})..."
-                    )
-                    for i, rel in enumerate(manifest_filepaths):
-                        try:
-                            if default_storage.exists(rel):
-                                media_summary["skipped_existing"] += 1
-                                if (i + 1) % 10 == 0 or (i + 1) == total_files:
-                                    progress = int(((i + 1) / total_files) * 100)
-                                    yield f"PROGRESS:{progress}"
-                                    yield f"Processed {i + 1}/{total_files} files..."
-                                continue
-
-                            with source_storage.open(rel, "rb") as source_handle:
-                                django_file = File(source_handle)
-                                saved_path = default_storage.save(rel, django_file)
-                                if saved_path != rel:
-                                    saved_path_map[rel] = saved_path
-                                media_summary["copied"] += 1
-
-                            if (i + 1) % 10 == 0 or (i + 1) == total_files:
-                                progress = int(((i + 1) / total_files) * 100)
-                                yield f"PROGRESS:{progress}"
-                                yield f"Processed {i + 1}/{total_files} files..."
-                        except Exception as e:
-                            if _is_missing_source_error(e):
-                                media_summary["missing_source"] += 1
-                            yield f"Warning: could not copy media file {rel} from source storage: {e}"
-
-        yield (
-            "RESTORE_SUMMARY: "
-            f"copied={media_summary['copied']} "
-            f"skipped_existing={media_summary['skipped_existing']} "
-            f"missing_source={media_summary['missing_source']}"
-        )
-
-        # Sync renamed media paths in DB
-        if saved_path_map:
-            try:
-                yield f"Syncing {len(saved_path_map)} renamed media paths..."
-                with transaction.atomic():
-                    for model in apps.get_models():
-                        for field in model._meta.get_fields():
-                            if isinstance(field, FileField):
-                                field_name = field.name
-                                old_paths = list(saved_path_map.keys())
-                                try:
-                                    qs = model.objects.filter(**{f"{field_name}__in": old_paths})
-                                except Exception:
-                                    continue
-                                for obj in qs:
-                                    current_value = getattr(obj, field_name)
-                                    if not current_value:
-                                        continue
-                                    old_path = current_value.name
-                                    new_path = saved_path_map.get(old_path)
-                                    if new_path and new_path != old_path:
-                                        setattr(obj, field_name, new_path)
-                                        obj.save(update_fields=[field_name])
-            except Exception as e:
-                yield f"Warning: could not sync renamed media paths: {e}"
+        yield from _restore_external_media(manifest, media_summary, saved_path_map, embedded_media_present)
+        yield _media_restore_summary(media_summary)
+        yield from _sync_renamed_media_paths(saved_path_map)
 
         yield "Restore completed successfully."
         return True
     finally:
         # Re-enable foreign key checks
         try:
-            with connection.cursor() as cursor:
-                engine = connection.vendor
-                if engine == "sqlite":
-                    cursor.execute("PRAGMA foreign_keys = ON;")
-                elif engine == "mysql":
-                    cursor.execute("SET foreign_key_checks = 1;")
-                elif engine == "postgresql":
-                    cursor.execute("SET session_replication_role = DEFAULT;")
+            _set_foreign_key_checks(connection, enabled=True)
         except Exception:
             pass
         if tmp_path and os.path.exists(tmp_path):
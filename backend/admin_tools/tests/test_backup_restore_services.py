@@ -5,6 +5,7 @@ KEY_COMPONENTS:
 - _build_archive: Private helper.
 - _build_zst_archive: Private helper.
 - BackupSerializationTests: Module symbol.
+- ChunkedBackupRoundTripTests: Module symbol.
 - RestoreFixtureSanitizationUnitTests: Module symbol.
 - RestoreCompatibilityTests: Module symbol.
 
@@ -16,8 +17,10 @@ AI_GUIDELINES:
 - Preserve existing runtime contracts for app routing, model behavior, and service boundaries.
 """
 
+import datetime
 import io
 import json
+import os
 import shutil
 import tarfile
 import tempfile
@@ -25,8 +28,10 @@ from pathlib import Path
 from unittest.mock import patch
 
 from admin_tools import services
+from core.models.user_profile import UserProfile
 from customers.models import Customer
-from django.test import SimpleTestCase, TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 from invoices.models.invoice import Invoice
 from products.models.product import Product
 from products.models.task import Task
@@ -79,28 +84,6 @@ def _build_zst_archive(base_dir: str, objects: list[dict], manifest: dict | None
 
 
 class BackupSerializationTests(SimpleTestCase):
-    def test_backup_uses_pk_based_dumpdata(self):
-        class _StopBackup(Exception):
-            pass
-
-        def _stop_after_args(*args, **kwargs):
-            raise _StopBackup(args)
-
-        with tempfile.TemporaryDirectory() as tmpdir, patch.object(services, "BACKUPS_DIR", tmpdir), patch(
-            "admin_tools.services.call_command", side_effect=_stop_after_args
-        ):
-            gen = services.backup_all(include_users=False)
-            self.assertEqual(next(gen), "Starting Django dumpdata backup...")
-            with self.assertRaises(_StopBackup) as raised:
-                next(gen)
-
-        dump_args = raised.exception.args[0]
-        obsolete_exclusion = "--exclude=" + "_".join(("debug", "toolbar"))
-        self.assertEqual(dump_args[0], "dumpdata")
-        self.assertNotIn("--natural-foreign", dump_args)
-        self.assertNotIn("--natural-primary", dump_args)
-        self.assertNotIn(obsolete_exclusion, dump_args)
-
     def test_backup_disables_postgres_server_side_cursors_while_dumping(self):
         class _StopBackup(Exception):
             pass
@@ -119,40 +102,82 @@ class BackupSerializationTests(SimpleTestCase):
 
         with tempfile.TemporaryDirectory() as tmpdir, patch.object(services, "BACKUPS_DIR", tmpdir), patch(
             "admin_tools.services.connections", {"default": fake_connection}
-        ), patch("admin_tools.services.call_command", side_effect=_assert_cursor_setting_during_dump):
+        ), patch.object(services, "_backup_models", return_value=[]), patch.object(
+            services, "_collect_referenced_filepaths", return_value=[]
+        ), patch.object(
+            services, "_write_chunked_data", side_effect=_assert_cursor_setting_during_dump
+        ), override_settings(ADMIN_BACKUP_DUMP_WORKERS=1):
             gen = services.backup_all(include_users=False)
-            self.assertEqual(next(gen), "Starting Django dumpdata backup...")
+            self.assertEqual(next(gen), "Starting chunked database backup...")
+            self.assertIn("with 1 worker(s)", next(gen))
             with self.assertRaises(_StopBackup):
                 next(gen)
+            self.assertEqual(os.listdir(tmpdir), [])
 
         self.assertNotIn("DISABLE_SERVER_SIDE_CURSORS", fake_connection.settings_dict)
 
-    def test_backup_retries_without_userprofile_on_missing_cache_enabled_column(self):
-        class _StopBackup(Exception):
-            pass
-
-        attempts: list[tuple] = []
-
-        def _call_command(*args, **kwargs):
-            attempts.append(args)
-            if len(attempts) == 1:
+    def test_backup_skips_userprofile_on_missing_cache_enabled_column(self):
+        def _iter_model_chunks(model, chunk_size, snapshot_id=None):
+            if model is UserProfile:
                 raise Exception("Unable to serialize database: column core_userprofile.cache_enabled does not exist")
-            raise _StopBackup(args)
+            return iter([("data/customers.customer/000001.json", b'[{"model": "customers.customer"}]', 1)])
 
-        with tempfile.TemporaryDirectory() as tmpdir, patch.object(services, "BACKUPS_DIR", tmpdir), patch(
-            "admin_tools.services.call_command", side_effect=_call_command
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(services, "BACKUPS_DIR", tmpdir), patch.object(
+            services, "_backup_models", return_value=[UserProfile, Customer]
+        ), patch.object(services, "_collect_referenced_filepaths", return_value=[]), patch.object(
+            services, "_iter_model_chunks", side_effect=_iter_model_chunks
         ):
-            gen = services.backup_all(include_users=True)
-            self.assertEqual(next(gen), "Starting Django dumpdata backup...")
-            warning_message = next(gen)
-            self.assertIn("excluding core.userprofile", warning_message)
-            with self.assertRaises(_StopBackup):
-                next(gen)
+            messages = list(services.backup_all(include_users=True))
+            archive_path = messages[-1].split(":", 1)[1]
+            with tarfile.open(archive_path, "r:*") as tar:
+                names = tar.getnames()
+                manifest = json.load(tar.extractfile("manifest.json"))
+
+        self.assertTrue(any("without core.userprofile" in message for message in messages))
+        self.assertEqual(names, ["backup.json", "data/customers.customer/000001.json", "manifest.json"])
+        self.assertEqual(manifest["data"]["rows_by_model"], {"customers.customer": 1})
+
+
+class ChunkedBackupRoundTripTests(TestCase):
+    @override_settings(ADMIN_BACKUP_CHUNK_SIZE=2)
+    def test_backup_streams_pk_based_chunks_and_restore_bulk_loads_them(self):
+        customers = [Customer.objects.create(first_name=f"Chunk {index}", last_name="Backup") for index in range(3)]
+        stamped = timezone.now() - datetime.timedelta(days=400)
+        Customer.objects.filter(pk=customers[0].pk).update(created_at=stamped, updated_at=stamped)
+        original_timestamps = {
+            pk: (created_at, updated_at)
+            for pk, created_at, updated_at in Customer.objects.values_list("pk", "created_at", "updated_at")
+        }
 
-        self.assertEqual(attempts[0][0], "dumpdata")
-        self.assertNotIn("--exclude=core.userprofile", attempts[0])
-        self.assertEqual(attempts[1][0], "dumpdata")
-        self.assertIn("--exclude=core.userprofile", attempts[1])
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(services, "BACKUPS_DIR", tmpdir):
+            messages = list(services.backup_all(include_users=False))
+            archive_path = messages[-1].split(":", 1)[1]
+            with tarfile.open(archive_path, "r:*") as tar:
+                names = tar.getnames()
+                header = json.load(tar.extractfile("backup.json"))
+                first_chunk = json.load(tar.extractfile("data/customers.customer/000001.json"))
+
+            Customer.objects.all().delete()
+            restore_messages = list(services.restore_from_file(archive_path, include_users=False))
+
+        self.assertEqual(names[0], "backup.json")
+        self.assertEqual(names[-1], "manifest.json")
+        self.assertIn("data/customers.customer/000002.json", names)
+        self.assertNotIn("auth.user", header["models"])
+        self.assertEqual([obj["pk"] for obj in first_chunk], [customers[0].pk, customers[1].pk])
+
+        self.assertTrue(any("Streaming chunked backup archive" in message for message in restore_messages))
+        self.assertTrue(any("Restore completed successfully." in message for message in restore_messages))
+        self.assertEqual(
+            list(Customer.objects.order_by("pk").values_list("first_name", flat=True)),
+            ["Chunk 0", "Chunk 1", "Chunk 2"],
+        )
+        restored_timestamps = {
+            pk: (created_at, updated_at)
+            for pk, created_at, updated_at in Customer.objects.values_list("pk", "created_at", "updated_at")
+        }
+        self.assertEqual(restored_timestamps, original_timestamps)
+        self.assertEqual(restored_timestamps[customers[0].pk], (stamped, stamped))
 
 
 class RestoreFixtureSanitizationUnitTests(SimpleTestCase):
@@ -512,7 +537,7 @@ class RestoreCompatibilityTests(TestCase):
 
         with tempfile.TemporaryDirectory() as tmpdir:
             archive_path = _build_archive(tmpdir, objects)
-            with patch("core.sync_signals.capture_model_upsert") as capture_model_upsert_mock:
+            with patch("core.sync_signals.capture_model_upserts_on_commit") as capture_model_upsert_mock:
                 messages = list(services.restore_from_file(archive_path, include_users=False))
 
         capture_model_upsert_mock.assert_not_called()
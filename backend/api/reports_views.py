@@ -10,6 +10,8 @@ KEY_COMPONENTS:
 - InvoiceStatusDashboardApiView: Module symbol.
 - MonthlyInvoiceDetailApiView: Module symbol.
 - CashFlowAnalysisApiView: Module symbol.
+- ReportExportStartApiView: Queues a report Excel export as an AsyncJob (progress over the async-job SSE).
+- ReportExportDownloadApiView: Serves the finished export artifact.
 
 INTERACTIONS:
 - Depends on: nearby API/core services and DRF helpers used in this module.
@@ -26,12 +28,24 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
 
+from api.async_controls import release_enqueue_guard
 from api.permissions import IsAdminOrManagerGroup
-from core.models.ai_request_usage import AIRequestUsage
-from django.db.models import Count, Q, Sum, Value
-from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear, TruncDate
+from api.utils.idempotency import (
+    build_request_idempotency_fingerprint,
+    resolve_request_idempotent_job,
+    store_request_idempotent_job,
+)
+from api.utils.stream_payloads import build_async_job_links, build_async_job_start_payload
+from api.views_shared import ASYNC_JOB_INFLIGHT_STATUSES, ApiErrorHandlingMixin, prepare_async_enqueue
+from core.models import AsyncJob
+from core.models.ai_usage_rollup import AIUsageRollup
+from core.services.ai_usage_rollup_service import AIUsageRollupService
+from django.core.files.storage import default_storage
+from django.db.models.functions import ExtractYear, TruncDate, TruncMonth, TruncYear
+from django.http import FileResponse
 from django.utils import timezone
-from reports.services import build_invoice_status_dashboard_context
+from reports.services import REPORT_EXPORTS, build_invoice_status_dashboard_context
+from reports.services.excel_export import XLSX_CONTENT_TYPE
 from reports.views.application_pipeline_view import ApplicationPipelineView
 from reports.views.cash_flow_analysis_view import CashFlowAnalysisView
 from reports.views.customer_ltv_view import CustomerLifetimeValueView
@@ -41,8 +55,10 @@ from reports.views.product_demand_forecast_view import ProductDemandForecastView
 from reports.views.product_revenue_analysis_view import ProductRevenueAnalysisView
 from reports.views.reports_index_view import ReportsIndexView
 from reports.views.revenue_report_view import RevenueReportView
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, UserRateThrottle
 from rest_framework.views import APIView
 
 
@@ -196,6 +212,122 @@ class MonthlyInvoiceDetailApiView(_BaseReportAPIView):
         return Response(payload)
 
 
+REPORT_EXPORT_NAMESPACE = "reports_export_excel"
+
+
+class ReportExportStartApiView(ApiErrorHandlingMixin, _BaseReportAPIView):
+    """Queue an Excel export; same-parameter requests already in flight share one job."""
+
+    throttle_scope = "reports_export_start"
+    throttle_classes = [AnonRateThrottle, UserRateThrottle, ScopedRateThrottle]
+
+    def post(self, request, report: str):
+        from reports.tasks import run_report_export_job
+
+        export = REPORT_EXPORTS.get(report)
+        if export is None:
+            return self.error_response("Unknown report export", status.HTTP_404_NOT_FOUND)
+        try:
+            params = export.clean_params(request.data or request.query_params)
+        except ValueError as exc:
+            return self.error_response(str(exc), status.HTTP_400_BAD_REQUEST)
+
+        # One namespace per report and parameter set, so exporting another month is never deduplicated
+        # onto a job that is still building a different month.
+        namespace = ":".join([REPORT_EXPORT_NAMESPACE, report, *(f"{key}={params[key]}" for key in sorted(params))])
+        request_fingerprint = build_request_idempotency_fingerprint(request)
+
+        def _start_response(job, *, queued: bool, deduplicated: bool):
+            return Response(
+                build_async_job_start_payload(
+                    job_id=job.id,
+                    status=job.status,
+                    progress=job.progress,
+                    queued=queued,
+                    deduplicated=deduplicated,
+                    links=build_async_job_links(
+                        request,
+                        job.id,
+                        stream_route="api-async-job-status-sse",
+                        download_route="api-report-export-download",
+                    ),
+                ),
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        idempotency_cache_key, cached_job = resolve_request_idempotent_job(
+            request=request,
+            namespace=namespace,
+            user_id=request.user.id,
+            queryset=AsyncJob.objects.filter(task_name=namespace, created_by=request.user),
+            fingerprint=request_fingerprint,
+        )
+        if cached_job is not None:
+            return _start_response(cached_job, queued=False, deduplicated=True)
+
+        guard = prepare_async_enqueue(
+            namespace=namespace,
+            user=request.user,
+            inflight_queryset=AsyncJob.objects.filter(task_name=namespace, created_by=request.user),
+            inflight_statuses=ASYNC_JOB_INFLIGHT_STATUSES,
+            busy_message="This report export is already being processed. Please retry in a moment.",
+            deduplicated_response_builder=lambda existing_job: _start_response(
+                existing_job, queued=False, deduplicated=True
+            ),
+            error_response_builder=self.error_response,
+        )
+        if guard.response is not None:
+            return guard.response
+
+        lock_key = guard.lock_key
+        lock_token = guard.lock_token
+        try:
+            job = AsyncJob.objects.create(
+                task_name=namespace,
+                status=AsyncJob.STATUS_PENDING,
+                progress=0,
+                message="Queued report export...",
+                created_by=request.user,
+            )
+
+            run_report_export_job(str(job.id), report, params)
+            store_request_idempotent_job(
+                cache_key=idempotency_cache_key,
+                job_id=job.id,
+                fingerprint=request_fingerprint,
+            )
+        finally:
+            if lock_key and lock_token:
+                release_enqueue_guard(lock_key, lock_token)
+
+        return _start_response(job, queued=True, deduplicated=False)
+
+
+class ReportExportDownloadApiView(ApiErrorHandlingMixin, _BaseReportAPIView):
+    def get(self, request, job_id):
+        try:
+            job = AsyncJob.objects.get(
+                id=job_id, task_name__startswith=f"{REPORT_EXPORT_NAMESPACE}:", created_by=request.user
+            )
+        except AsyncJob.DoesNotExist:
+            return self.error_response("Job not found", status.HTTP_404_NOT_FOUND)
+
+        if job.status != AsyncJob.STATUS_COMPLETED:
+            return self.error_response("Job not completed yet", status.HTTP_400_BAD_REQUEST)
+
+        result = job.result or {}
+        file_path = result.get("file_path")
+        filename = result.get("filename") or "report.xlsx"
+        if not file_path:
+            return self.error_response("Export file not available", status.HTTP_400_BAD_REQUEST)
+        if not default_storage.exists(file_path):
+            return self.error_response("Export file not found", status.HTTP_404_NOT_FOUND)
+
+        response = FileResponse(default_storage.open(file_path, "rb"), content_type=XLSX_CONTENT_TYPE)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
 class CashFlowAnalysisApiView(_BaseReportAPIView):
     report_view_cls = CashFlowAnalysisView
 
@@ -337,9 +469,12 @@ class AICostingReportApiView(APIView):
         selected_month = self._parse_int(request.GET.get("month"), now.month)
         selected_month = min(max(selected_month, 1), 12)
 
-        base_qs = AIRequestUsage.objects.all()
+        # Hourly rollups are summed over local-time ranges; see core.services.ai_usage_rollup_service.
         available_years = (
-            base_qs.annotate(year=ExtractYear("created_at")).values_list("year", flat=True).order_by("year").distinct()
+            AIUsageRollup.objects.annotate(year=ExtractYear("bucket_start"))
+            .values_list("year", flat=True)
+            .order_by("year")
+            .distinct()
         )
         available_years = [int(year) for year in available_years if year is not None]
         if not available_years:
@@ -348,22 +483,18 @@ class AICostingReportApiView(APIView):
         if selected_year not in available_years:
             selected_year = max(available_years)
 
-        yearly_rows = (
-            base_qs.annotate(year=ExtractYear("created_at"))
-            .values("year")
-            .annotate(
-                request_count=Count("id"),
-                success_count=Count("id", filter=Q(success=True)),
-                failed_count=Count("id", filter=Q(success=False)),
-                total_tokens=Coalesce(Sum("total_tokens"), 0),
-                total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
-            )
-            .order_by("year")
-        )
+        def _bounds(year: int, month: int | None = None) -> tuple[datetime, datetime]:
+            anchor = timezone.make_aware(datetime(year, month or 1, 1))
+            return AIUsageRollupService.period_bounds(anchor, month=month is not None)
 
+        history_start, history_end = _bounds(min(available_years))[0], _bounds(max(available_years))[1]
+        year_start, year_end = _bounds(selected_year)
+        month_start, month_end = _bounds(selected_year, selected_month)
+
+        yearly_rows = AIUsageRollupService.series(TruncYear("bucket_start"), history_start, history_end)
         yearly_data = [
             {
-                "year": int(row["year"]),
+                "year": row["period"].year,
                 "requestCount": int(row["request_count"]),
                 "successCount": int(row["success_count"]),
                 "failedCount": int(row["failed_count"]),
@@ -371,23 +502,11 @@ class AICostingReportApiView(APIView):
                 "totalCost": self._as_float(row["total_cost"]),
             }
             for row in yearly_rows
-            if row.get("year") is not None
+            if row.get("period") is not None
         ]
 
-        monthly_qs = (
-            base_qs.filter(created_at__year=selected_year)
-            .annotate(month=ExtractMonth("created_at"))
-            .values("month")
-            .annotate(
-                request_count=Count("id"),
-                success_count=Count("id", filter=Q(success=True)),
-                failed_count=Count("id", filter=Q(success=False)),
-                total_tokens=Coalesce(Sum("total_tokens"), 0),
-                total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
-            )
-            .order_by("month")
-        )
-        monthly_map = {int(row["month"]): row for row in monthly_qs if row.get("month") is not None}
+        monthly_rows = AIUsageRollupService.series(TruncMonth("bucket_start"), year_start, year_end)
+        monthly_map = {row["period"].month: row for row in monthly_rows if row.get("period") is not None}
         monthly_data: list[dict[str, Any]] = []
         for month_num in range(1, 13):
             row = monthly_map.get(month_num, {})
@@ -403,20 +522,8 @@ class AICostingReportApiView(APIView):
                 }
             )
 
-        month_qs = base_qs.filter(created_at__year=selected_year, created_at__month=selected_month)
-        daily_qs = (
-            month_qs.annotate(day=TruncDate("created_at"))
-            .values("day")
-            .annotate(
-                request_count=Count("id"),
-                success_count=Count("id", filter=Q(success=True)),
-                failed_count=Count("id", filter=Q(success=False)),
-                total_tokens=Coalesce(Sum("total_tokens"), 0),
-                total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
-            )
-            .order_by("day")
-        )
-        daily_map = {row["day"]: row for row in daily_qs if row.get("day")}
+        daily_rows = AIUsageRollupService.series(TruncDate("bucket_start"), month_start, month_end)
+        daily_map = {row["period"]: row for row in daily_rows if row.get("period")}
         days_in_month = calendar.monthrange(selected_year, selected_month)[1]
         daily_data: list[dict[str, Any]] = []
         for day_num in range(1, days_in_month + 1):
@@ -434,18 +541,8 @@ class AICostingReportApiView(APIView):
                 }
             )
 
-        def _group_breakdown(qs, group_field: str, key_name: str) -> list[dict[str, Any]]:
-            rows = (
-                qs.values(group_field)
-                .annotate(
-                    request_count=Count("id"),
-                    success_count=Count("id", filter=Q(success=True)),
-                    failed_count=Count("id", filter=Q(success=False)),
-                    total_tokens=Coalesce(Sum("total_tokens"), 0),
-                    total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
-                )
-                .order_by("-total_cost", "-request_count")
-            )
+        def _group_breakdown(group_field: str, key_name: str) -> list[dict[str, Any]]:
+            rows = AIUsageRollupService.breakdown(group_field, month_start, month_end)
             payload: list[dict[str, Any]] = []
             for row in rows:
                 payload.append(
@@ -460,24 +557,12 @@ class AICostingReportApiView(APIView):
                 )
             return payload
 
-        feature_breakdown_month = _group_breakdown(month_qs, "feature", "feature")
-        provider_breakdown_month = _group_breakdown(month_qs, "provider", "provider")
-        model_breakdown_month = _group_breakdown(month_qs, "model", "model")
+        feature_breakdown_month = _group_breakdown("feature", "feature")
+        provider_breakdown_month = _group_breakdown("provider", "provider")
+        model_breakdown_month = _group_breakdown("model", "model")
 
-        year_summary_row = base_qs.filter(created_at__year=selected_year).aggregate(
-            request_count=Count("id"),
-            success_count=Count("id", filter=Q(success=True)),
-            failed_count=Count("id", filter=Q(success=False)),
-            total_tokens=Coalesce(Sum("total_tokens"), 0),
-            total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
-        )
-        month_summary_row = month_qs.aggregate(
-            request_count=Count("id"),
-            success_count=Count("id", filter=Q(success=True)),
-            failed_count=Count("id", filter=Q(success=False)),
-            total_tokens=Coalesce(Sum("total_tokens"), 0),
-            total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
-        )
+        year_summary_row = AIUsageRollupService.totals(year_start, year_end)
+        month_summary_row = AIUsageRollupService.totals(month_start, month_end)
 
         return Response(
             {
@@ -7,8 +7,10 @@ from api.serializers.doc_workflow_serializer import DocWorkflowSerializer, TaskS
 from api.serializers.document_serializer import DocumentSerializer
 from api.serializers.product_serializer import ProductSerializer
 from customer_applications.models import DocApplication
+from customer_applications.services.application_list_context import DocApplicationListContext
 from customer_applications.services.stay_permit_submission_window_service import StayPermitSubmissionWindowService
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
 from invoices.models.invoice import InvoiceApplication
 from products.models.document_type import DocumentType
 from rest_framework import serializers
@@ -81,6 +83,18 @@ class CustomerMinimalSerializer(serializers.ModelSerializer):
         fields = ["id", "first_name", "last_name", "full_name"]
 
 
+class DocApplicationListPageSerializer(serializers.ListSerializer):
+    """Precomputes invoice links, permissions and submission windows for the whole page before rendering rows."""
+
+    def to_representation(self, data):
+        applications = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        request = self.context.get("request")
+        self._context[DocApplicationListContext.CONTEXT_KEY] = DocApplicationListContext.build(
+            applications, user=getattr(request, "user", None)
+        )
+        return super().to_representation(applications)
+
+
 class DocApplicationListSerializer(serializers.ModelSerializer):
     customer = CustomerMinimalSerializer(read_only=True)  # type: ignore[call-arg]
     product = ProductMinimalSerializer(read_only=True)  # type: ignore[call-arg]
@@ -92,6 +106,7 @@ class DocApplicationListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DocApplication
+        list_serializer_class = DocApplicationListPageSerializer
         fields = [
             "id",
             "customer",
@@ -108,10 +123,23 @@ class DocApplicationListSerializer(serializers.ModelSerializer):
             "submission_window_last_date",
         ]
 
+    def _row_fields(self, instance):
+        list_context = self.context.get(DocApplicationListContext.CONTEXT_KEY)
+        row = list_context.get(instance) if list_context is not None else None
+        if row is None:
+            # Serialized on its own (not through the page serializer): build a one-row context.
+            request = self.context.get("request")
+            row = DocApplicationListContext.build([instance], user=getattr(request, "user", None)).get(instance)
+        return row
+
     def get_has_invoice(self, instance) -> bool:
-        return instance.has_invoice()
+        row = self._row_fields(instance)
+        return row.has_invoice if row else instance.has_invoice()
 
     def get_invoice_id(self, instance) -> int | None:
+        row = self._row_fields(instance)
+        if row:
+            return row.invoice_id
         invoice = instance.get_invoice()
         return invoice.id if invoice else None
 
@@ -119,22 +147,13 @@ class DocApplicationListSerializer(serializers.ModelSerializer):
         return is_ready_for_invoice(instance)
 
     def get_can_force_close(self, instance) -> bool:
-        request = self.context.get("request") if hasattr(self, "context") else None
-        user = getattr(request, "user", None) if request is not None else None
-        if user is not None and getattr(user, "is_authenticated", False):
-            # pyre-ignore[16]
-            return user.has_perm("customer_applications.change_docapplication") and instance.status not in (
-                DocApplication.STATUS_COMPLETED,
-                DocApplication.STATUS_REJECTED,
-            )
-        return False
+        row = self._row_fields(instance)
+        return row.can_force_close if row else False
 
     def get_submission_window_last_date(self, instance) -> str | None:
-        window = StayPermitSubmissionWindowService().get_submission_window(
-            product=getattr(instance, "product", None),
-            application=instance,
-        )
-        return window.last_date.isoformat() if window else None
+        row = self._row_fields(instance)
+        last_date = row.submission_window_last_date if row else None
+        return last_date.isoformat() if last_date else None
 
 
 class DocApplicationSerializerWithRelations(serializers.ModelSerializer):
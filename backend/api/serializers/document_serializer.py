@@ -78,6 +78,7 @@ class DocumentSerializer(serializers.ModelSerializer):
             "file",
             "file_link",
             "thumbnail_link",
+            "thumbnail_status",
             "details",
             "completed",
             "metadata",
@@ -100,6 +101,7 @@ class DocumentSerializer(serializers.ModelSerializer):
             "doc_type",
             "file_link",
             "thumbnail_link",
+            "thumbnail_status",
             "completed",
             "ai_validation",
             "ai_validation_status",
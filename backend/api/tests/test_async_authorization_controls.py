@@ -462,7 +462,7 @@ class ExpensiveAsyncEnqueueIdempotencyTests(TestCase):
         storage_url_mock.assert_called_once()
 
     @patch("api.views.default_storage.save", return_value="tmpfiles/invoice_imports/mock.pdf")
-    @patch("invoices.tasks.import_jobs.run_invoice_import_item")
+    @patch("invoices.tasks.import_jobs.run_invoice_import_parse_item")
     def test_invoice_import_batch_reuses_existing_inflight_job(self, enqueue_mock, storage_save_mock):
         file_one = SimpleUploadedFile("invoice-one.pdf", b"pdf-bytes", content_type="application/pdf")
         first = self.client.post(
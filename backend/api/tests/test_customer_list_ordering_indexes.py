@@ -0,0 +1,69 @@
+"""Query-plan regression tests for the indexed customer list orderings."""
+
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+User = get_user_model()
+
+NAME_ORDERING = ("sort_last_name", "sort_first_name", "sort_company_name")
+
+
+class CustomerListOrderingIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("ordering-user", "ordering@example.com", "pass")
+        Customer.objects.create(customer_type="person", first_name="Stefano", last_name="GALASSI")
+        Customer.objects.create(customer_type="person", first_name="anna", last_name="")
+        Customer.objects.create(customer_type="company", company_name="Bali Trading", first_name="", last_name=None)
+        Customer.objects.create(customer_type="person", first_name="Disabled", last_name="Zed", active=False)
+
+    def _sqlite_query_plan(self, queryset):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plan assertions are specific to SQLite test runs.")
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+    def test_generated_sort_keys_are_case_insensitive_with_fallbacks(self):
+        keys = dict(Customer.objects.values_list("first_name", "sort_last_name"))
+
+        self.assertEqual(keys["Stefano"], "galassi")
+        self.assertEqual(keys["anna"], "anna")
+        self.assertEqual(keys[""], "bali trading")
+        self.assertEqual(
+            Customer.objects.get(company_name="Bali Trading").sort_first_name,
+            "bali trading",
+        )
+
+    def test_name_ordering_first_page_scans_sort_key_index(self):
+        queryset = Customer.objects.filter(active=True).order_by(*NAME_ORDERING)[:50]
+        plan = self._sqlite_query_plan(queryset)
+
+        self.assertIn("customer_sort_name_idx", plan, plan)
+        self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan, plan)
+
+        descending = Customer.objects.order_by(*(f"-{field}" for field in NAME_ORDERING))[:50]
+        plan = self._sqlite_query_plan(descending)
+        self.assertIn("customer_sort_name_idx", plan, plan)
+        self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan, plan)
+
+    def test_default_ordering_first_page_scans_created_at_index(self):
+        plan = self._sqlite_query_plan(Customer.objects.filter(active=True)[:50])
+
+        self.assertIn("customer_created_at_idx", plan, plan)
+        self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan, plan)
+
+    def test_list_orders_by_generated_sort_keys(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("customers-list"), {"ordering": ",".join(NAME_ORDERING)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["firstName"] or row["companyName"] for row in response.json()["results"]],
+            ["anna", "Bali Trading", "Stefano"],
+        )
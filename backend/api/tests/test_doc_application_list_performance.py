@@ -0,0 +1,126 @@
+"""Query-count regression tests for the customer application list serializer."""
+
+from datetime import date
+from decimal import Decimal
+
+from customer_applications.models import DocApplication, Document
+from customer_applications.services.application_list_context import DocApplicationListContext
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from invoices.models import Invoice
+from invoices.models.invoice import InvoiceApplication
+from products.models import DocumentType, Product
+
+User = get_user_model()
+
+
+class DocApplicationListQueryCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("list-perf-user", "list-perf@example.com", "pass")
+        self.user.user_permissions.add(
+            Permission.objects.get(codename="change_docapplication", content_type__app_label="customer_applications")
+        )
+        self.client.force_login(self.user)
+
+        self.customer = Customer.objects.create(customer_type="person", first_name="List", last_name="Perf")
+        self.stay_doc_type = DocumentType.objects.create(name="ITAS", is_stay_permit=True, has_file=True)
+        self.products = [
+            Product.objects.create(
+                name=f"Stay Permit Visa {index}",
+                code=f"LIST-PERF-{index}",
+                product_type="visa",
+                required_documents="ITAS",
+                application_window_days=30,
+            )
+            for index in range(2)
+        ]
+        self.invoice_no = 202600100
+
+    def _create_applications(self, count: int) -> list[DocApplication]:
+        applications = []
+        for index in range(count):
+            application = DocApplication.objects.create(
+                customer=self.customer,
+                product=self.products[index % len(self.products)],
+                doc_date=date(2026, 1, 5),
+                created_by=self.user,
+                status=DocApplication.STATUS_COMPLETED if index % 3 == 0 else DocApplication.STATUS_PENDING,
+            )
+            Document.objects.create(
+                doc_application=application,
+                doc_type=self.stay_doc_type,
+                expiration_date=date(2026, 6, 1 + index),
+                required=True,
+                created_by=self.user,
+            )
+            if index % 2 == 0:
+                self.invoice_no += 1
+                invoice = Invoice.objects.create(
+                    customer=self.customer,
+                    invoice_no=self.invoice_no,
+                    invoice_date=date(2026, 1, 10),
+                    due_date=date(2026, 1, 24),
+                    created_by=self.user,
+                )
+                InvoiceApplication.objects.create(
+                    invoice=invoice,
+                    product=application.product,
+                    customer_application=application,
+                    amount=Decimal("100.00"),
+                )
+            applications.append(application)
+        return applications
+
+    def _list_query_count(self) -> tuple[int, list[dict]]:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("customer-applications-list"), {"page_size": 50})
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()["results"]
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        self._create_applications(3)
+        small_count, small_rows = self._list_query_count()
+
+        self._create_applications(17)
+        large_count, large_rows = self._list_query_count()
+
+        self.assertEqual(len(small_rows), 3)
+        self.assertEqual(len(large_rows), 20)
+        self.assertEqual(large_count, small_count)
+
+    def test_precomputed_fields_match_single_instance_helpers(self):
+        applications = self._create_applications(4)
+        _, rows = self._list_query_count()
+        rows_by_id = {row["id"]: row for row in rows}
+
+        for application in applications:
+            application = DocApplication.objects.get(pk=application.pk)
+            invoice = application.get_invoice()
+            row = rows_by_id[application.pk]
+            self.assertEqual(row["hasInvoice"], application.has_invoice())
+            self.assertEqual(row["invoiceId"], invoice.id if invoice else None)
+            self.assertEqual(
+                row["canForceClose"],
+                application.status not in (DocApplication.STATUS_COMPLETED, DocApplication.STATUS_REJECTED),
+            )
+            self.assertEqual(row["submissionWindowLastDate"], application.documents.get().expiration_date.isoformat())
+
+    def test_context_build_uses_fixed_queries_per_distinct_product(self):
+        applications = list(
+            DocApplication.objects.select_related("product", "product__product_category").filter(
+                pk__in=[application.pk for application in self._create_applications(10)]
+            )
+        )
+        user = User.objects.get(pk=self.user.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            context = DocApplicationListContext.build(applications, user=user)
+
+        # Invoice links, user + group permissions, stay-permit expirations, one document-type load per product.
+        self.assertLessEqual(len(queries), 4 + len(self.products))
+        self.assertEqual(sum(1 for application in applications if context.get(application).has_invoice), 5)
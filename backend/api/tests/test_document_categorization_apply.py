@@ -4,6 +4,7 @@ import json
 from datetime import date
 from unittest.mock import call, patch
 
+from core.storage import FileSystemMediaStoreAdapter
 from customer_applications.models import DocApplication, Document, DocumentCategorizationItem, DocumentCategorizationJob
 from customers.models import Customer
 from django.contrib.auth import get_user_model
@@ -79,17 +80,19 @@ class DocumentCategorizationApplyTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir", return_value=([], []))
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_apply_persists_extracted_expiration_date(
         self,
-        storage_open_mock,
-        _storage_save_mock,
+        _media_move_mock,
         _storage_exists_mock,
         _storage_delete_mock,
         _storage_listdir_mock,
     ):
-        storage_open_mock.return_value.__enter__.return_value.read.return_value = b"file-bytes"
 
         url = reverse("api-categorization-apply", kwargs={"job_id": str(self.job.id)})
         payload = {
@@ -244,19 +247,21 @@ class TransientFileCleanupTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir", return_value=([], []))
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_apply_deletes_all_transient_files_including_unapplied(
         self,
-        storage_open_mock,
-        _storage_save_mock,
+        _media_move_mock,
         storage_exists_mock,
         storage_delete_mock,
         _storage_listdir_mock,
     ):
         """After applying only the matched item, all three transient files
         (matched, no-slot, error) must be deleted from storage."""
-        storage_open_mock.return_value.__enter__.return_value.read.return_value = b"file-bytes"
 
         payload = {
             "mappings": [
@@ -281,18 +286,20 @@ class TransientFileCleanupTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir", return_value=([], []))
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_apply_cleans_temp_folder_directory(
         self,
-        storage_open_mock,
-        _storage_save_mock,
+        _media_move_mock,
         storage_exists_mock,
         storage_delete_mock,
         _storage_listdir_mock,
     ):
         """The temp folder tmp/categorization/{job_id} should be deleted after apply."""
-        storage_open_mock.return_value.__enter__.return_value.read.return_value = b"file-bytes"
 
         payload = {
             "mappings": [
@@ -314,18 +321,20 @@ class TransientFileCleanupTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir")
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_apply_cleans_untracked_leftover_files_in_temp_folder(
         self,
-        storage_open_mock,
-        _storage_save_mock,
+        _media_move_mock,
         storage_exists_mock,
         storage_delete_mock,
         storage_listdir_mock,
     ):
         """Files in the temp folder but not tracked by any item are also cleaned."""
-        storage_open_mock.return_value.__enter__.return_value.read.return_value = b"file-bytes"
 
         temp_dir = f"tmp/categorization/{self.job.id}"
         # listdir returns an untracked leftover file
@@ -349,12 +358,15 @@ class TransientFileCleanupTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir", return_value=([], []))
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_apply_with_empty_mappings_still_cleans_all_transient_files(
         self,
-        storage_open_mock,
-        _storage_save_mock,
+        _media_move_mock,
         storage_exists_mock,
         storage_delete_mock,
         _storage_listdir_mock,
@@ -377,18 +389,20 @@ class TransientFileCleanupTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir", return_value=([], []))
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_cleanup_is_resilient_to_individual_file_delete_failure(
         self,
-        storage_open_mock,
-        _storage_save_mock,
+        _media_move_mock,
         storage_exists_mock,
         storage_delete_mock,
         _storage_listdir_mock,
     ):
         """If one file delete fails, other files should still be cleaned up."""
-        storage_open_mock.return_value.__enter__.return_value.read.return_value = b"file-bytes"
 
         # Make delete raise for the first item but succeed for others
         def selective_delete(path):
@@ -418,19 +432,21 @@ class TransientFileCleanupTests(TestCase):
     @patch("api.views_categorization.default_storage.listdir", return_value=([], []))
     @patch("api.views_categorization.default_storage.delete")
     @patch("api.views_categorization.default_storage.exists", return_value=True)
-    @patch("api.views_categorization.default_storage.save", side_effect=lambda path, _content: path)
-    @patch("api.views_categorization.default_storage.open")
+    @patch.object(
+        FileSystemMediaStoreAdapter,
+        "move",
+        autospec=True,
+        side_effect=lambda _adapter, _source, destination: destination,
+    )
     def test_applied_file_persisted_at_final_path_only(
         self,
-        storage_open_mock,
-        storage_save_mock,
+        media_move_mock,
         _storage_exists_mock,
         storage_delete_mock,
         _storage_listdir_mock,
     ):
         """The applied file must be saved to the canonical Document path,
         and the temp copy must be deleted — only the final copy persists."""
-        storage_open_mock.return_value.__enter__.return_value.read.return_value = b"file-bytes"
 
         payload = {
             "mappings": [
@@ -444,13 +460,12 @@ class TransientFileCleanupTests(TestCase):
 
         self.assertEqual(response.status_code, 200, response.content)
 
-        # The file was saved to the final Document path
-        save_calls = storage_save_mock.call_args_list
-        saved_paths = [c.args[0] for c in save_calls]
+        # The file was moved to the final Document path
+        moved_paths = [c.args[2] for c in media_move_mock.call_args_list]
         expected_final_path = f"{self.application.upload_folder}/ITK_Cleanup.pdf"
         self.assertTrue(
-            any(expected_final_path in p for p in saved_paths),
-            f"Expected final path '{expected_final_path}' among saved paths {saved_paths}",
+            any(expected_final_path in p for p in moved_paths),
+            f"Expected final path '{expected_final_path}' among moved paths {moved_paths}",
         )
 
         # The transient file was deleted
@@ -0,0 +1,179 @@
+"""Tests for resumable chunked uploads into document categorization jobs."""
+
+import base64
+import hashlib
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from core.services.chunked_upload_service import ChunkedUploadService
+from customer_applications.models import DocApplication, DocumentCategorizationItem, DocumentCategorizationJob
+from customer_applications.services.categorization_upload_progress_service import CategorizationUploadProgressService
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from products.models import Product
+
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "chunked-upload-tests",
+    }
+}
+
+
+@override_settings(CACHES=LOC_MEM_CACHES)
+class CategorizationChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        user_model = get_user_model()
+        self.user = user_model.objects.create_superuser(
+            username="chunked_uploader",
+            email="chunked.uploader@example.com",
+            password="password",
+        )
+        self.client.force_login(self.user)
+
+        customer = Customer.objects.create(customer_type="person", first_name="Chunk", last_name="Upload")
+        product = Product.objects.create(name="Chunk Product", code="CHUNK-UP", product_type="visa")
+        application = DocApplication.objects.create(
+            customer=customer,
+            product=product,
+            doc_date=timezone.now().date(),
+            created_by=self.user,
+        )
+        init_response = self.client.post(
+            reverse("api-categorize-documents-init", kwargs={"application_id": application.id}),
+            data={"totalFiles": 1},
+        )
+        self.job_id = init_response.json()["jobId"]
+
+    def _create_upload(self, payload: bytes, *, chunk_size: int = 4, upload_key: str = "scan.pdf:10"):
+        return self.client.post(
+            reverse("api-categorization-chunked-upload-create", kwargs={"job_id": self.job_id}),
+            data={"filename": "scan.pdf", "size": len(payload), "chunkSize": chunk_size, "uploadKey": upload_key},
+            content_type="application/json",
+        )
+
+    def _put_chunk(self, upload_id: str, index: int, data: bytes, *, checksum: str | None = None):
+        headers = {}
+        if checksum is not None:
+            headers["HTTP_UPLOAD_CHECKSUM"] = checksum
+        return self.client.put(
+            reverse(
+                "api-categorization-chunked-upload-chunk",
+                kwargs={"job_id": self.job_id, "upload_id": upload_id, "index": index},
+            ),
+            data=data,
+            content_type="application/offset+octet-stream",
+            **headers,
+        )
+
+    @patch("api.views_categorization.run_document_categorization_item")
+    def test_out_of_order_chunks_are_assembled_and_dispatched(self, run_task_mock):
+        payload = b"0123456789"
+        created = self._create_upload(payload)
+        self.assertEqual(created.status_code, 201, created.content)
+        upload = created.json()
+        self.assertEqual(upload["totalChunks"], 3)
+
+        self.assertEqual(self._put_chunk(upload["uploadId"], 2, b"89").status_code, 200)
+        self.assertEqual(self._put_chunk(upload["uploadId"], 0, b"0123").status_code, 200)
+        run_task_mock.delay.assert_not_called()
+
+        final = self._put_chunk(upload["uploadId"], 1, b"4567")
+
+        self.assertEqual(final.status_code, 200, final.content)
+        self.assertTrue(final.json()["complete"])
+        item = DocumentCategorizationItem.objects.get(id=upload["itemId"])
+        self.assertEqual(item.result["stage"], "uploaded")
+        with default_storage.open(item.file_path, "rb") as assembled:
+            self.assertEqual(assembled.read(), payload)
+        run_task_mock.delay.assert_called_once_with(str(item.id))
+
+        job = DocumentCategorizationJob.objects.get(id=self.job_id)
+        self.assertTrue(job.result["upload"]["complete"])
+        self.assertEqual(job.result["upload"]["uploaded_files"], 1)
+
+    @patch("api.views_categorization.run_document_categorization_item")
+    def test_status_reports_resume_offset_and_upload_key_resumes_session(self, _run_task_mock):
+        created = self._create_upload(b"0123456789").json()
+        self._put_chunk(created["uploadId"], 0, b"0123")
+        self._put_chunk(created["uploadId"], 2, b"89")
+
+        resumed = self._create_upload(b"0123456789")
+        self.assertEqual(resumed.status_code, 200, resumed.content)
+        self.assertEqual(resumed.json()["uploadId"], created["uploadId"])
+        self.assertEqual(DocumentCategorizationItem.objects.filter(job_id=self.job_id).count(), 1)
+
+        detail = self.client.get(
+            reverse(
+                "api-categorization-chunked-upload-detail",
+                kwargs={"job_id": self.job_id, "upload_id": created["uploadId"]},
+            )
+        )
+        self.assertEqual(detail.status_code, 200, detail.content)
+        self.assertEqual(detail.json()["receivedChunks"], [0, 2])
+        self.assertEqual(detail["Upload-Offset"], "4")
+
+    @patch("api.views_categorization.run_document_categorization_item")
+    def test_checksum_mismatch_is_rejected_and_duplicate_chunks_are_idempotent(self, _run_task_mock):
+        upload = self._create_upload(b"0123456789").json()
+        good_digest = base64.b64encode(hashlib.sha256(b"0123").digest()).decode("ascii")
+
+        rejected = self._put_chunk(upload["uploadId"], 0, b"0124", checksum=f"sha256 {good_digest}")
+        self.assertEqual(rejected.status_code, 400, rejected.content)
+        self.assertEqual(rejected.json()["error"]["code"], "checksum_mismatch")
+
+        first = self._put_chunk(upload["uploadId"], 0, b"0123", checksum=f"sha256 {good_digest}")
+        retry = self._put_chunk(upload["uploadId"], 0, b"0123", checksum=f"sha256 {good_digest}")
+
+        self.assertFalse(first.json()["duplicate"])
+        self.assertTrue(retry.json()["duplicate"])
+        self.assertEqual(retry.json()["receivedChunks"], 1)
+
+    def test_chunk_with_wrong_length_is_rejected(self):
+        upload = self._create_upload(b"0123456789").json()
+
+        response = self._put_chunk(upload["uploadId"], 0, b"012")
+
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(response.json()["error"]["code"], "chunk_size_mismatch")
+
+    def test_retried_chunk_replaces_an_unacknowledged_copy_only_after_it_is_stored(self):
+        service = ChunkedUploadService()
+        session = service.create_session(owner_id=self.user.id, filename="scan.pdf", size=8, chunk_size=4)
+        chunk_name = session.chunk_name(0)
+        default_storage.save(chunk_name, ContentFile(b"OLD!"))
+
+        with patch.object(default_storage, "save", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                service.accept_chunk(session, index=0, data=b"0123")
+        with default_storage.open(chunk_name, "rb") as handle:
+            self.assertEqual(handle.read(), b"OLD!")
+
+        ack = service.accept_chunk(session, index=0, data=b"0123")
+
+        self.assertFalse(ack.duplicate)
+        with default_storage.open(chunk_name, "rb") as handle:
+            self.assertEqual(handle.read(), b"0123")
+        _, files = default_storage.listdir(session.storage_prefix)
+        self.assertEqual(files, ["000000.part"])
+
+    def test_clearing_upload_progress_releases_the_completion_claim(self):
+        progress = CategorizationUploadProgressService()
+
+        self.assertTrue(progress.claim_completion(self.job_id))
+        self.assertFalse(progress.claim_completion(self.job_id))
+        progress.clear(self.job_id)
+
+        self.assertTrue(progress.claim_completion(self.job_id))
@@ -0,0 +1,173 @@
+"""Tests for background document merges, the conversion cache and ranged artifact downloads."""
+
+from datetime import date
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from api.utils.range_download import parse_byte_range
+from core.models import AsyncJob
+from core.services.document_merger import DocumentMerger
+from core.utils.pdf_converter import PDFConverter
+from customer_applications.models import DocApplication, Document
+from customer_applications.tasks import run_document_merge_job
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+from products.models import DocumentType, Product
+from pypdf import PdfReader, PdfWriter
+
+User = get_user_model()
+
+FILESYSTEM_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "document-merge-tests",
+    }
+}
+
+
+def _pdf_bytes(pages: int = 1) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _png_bytes() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (120, 80), "#3455aa").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class ParseByteRangeTests(SimpleTestCase):
+    def test_parses_open_closed_and_suffix_ranges(self):
+        self.assertEqual(parse_byte_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_byte_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_byte_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_byte_range("bytes=950-5000", 1000), (950, 999))
+
+    def test_ignores_unsupported_and_rejects_unsatisfiable_ranges(self):
+        self.assertIsNone(parse_byte_range(None, 1000))
+        self.assertIsNone(parse_byte_range("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_byte_range("items=0-1", 1000))
+        self.assertIs(parse_byte_range("bytes=1000-", 1000), False)
+        self.assertIs(parse_byte_range("bytes=5-1", 1000), False)
+
+
+@override_settings(CACHES=LOC_MEM_CACHES, STORAGES=FILESYSTEM_STORAGES)
+@patch("customer_applications.tasks.generate_document_thumbnails_task")
+class DocumentMergeJobTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self._media = TemporaryDirectory()
+        self.addCleanup(self._media.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self._media.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.user = User.objects.create_superuser("merge_admin", "merge_admin@example.com", "pass")
+        self.client.force_login(self.user)
+        customer = Customer.objects.create(first_name="Merge", last_name="User")
+        product = Product.objects.create(name="Merge Product", code="MERGE-1")
+        self.doc_type = DocumentType.objects.create(name="Merge Passport", has_file=True)
+        self.application = DocApplication.objects.create(
+            customer=customer,
+            product=product,
+            doc_date=date(2026, 3, 2),
+            created_by=self.user,
+        )
+
+    def _create_document(self, name: str, content: bytes, content_type: str) -> Document:
+        return Document.objects.create(
+            doc_application=self.application,
+            doc_type=self.doc_type,
+            file=SimpleUploadedFile(name, content, content_type=content_type),
+            required=True,
+            created_by=self.user,
+        )
+
+    def test_repeated_merge_reuses_cached_image_conversion(self, _thumbnail_task):
+        pdf_doc = self._create_document("itk.pdf", _pdf_bytes(pages=2), "application/pdf")
+        image_doc = self._create_document("passport.png", _png_bytes(), "image/png")
+        output_path = f"{self._media.name}/merged.pdf"
+
+        with patch.object(PDFConverter, "convert_to_pdf", wraps=PDFConverter.convert_to_pdf) as convert_mock:
+            first = DocumentMerger.merge_document_models_to_file([pdf_doc, image_doc], output_path)
+            second = DocumentMerger.merge_document_models_to_file([pdf_doc, image_doc], output_path)
+
+        self.assertEqual(convert_mock.call_count, 1)
+        self.assertEqual(first["cache_hits"], 0)
+        self.assertEqual(second["cache_hits"], 1)
+        self.assertEqual(second["pages"], 3)
+        self.assertEqual(len(PdfReader(output_path).pages), 3)
+
+    @patch("customer_applications.tasks.run_document_merge_job")
+    def test_start_endpoint_queues_job_with_stream_and_download_links(self, enqueue_mock, _thumbnail_task):
+        first = self._create_document("itk.pdf", _pdf_bytes(), "application/pdf")
+        second = self._create_document("visa.pdf", _pdf_bytes(), "application/pdf")
+
+        response = self.client.post(
+            "/api/documents/merge-pdf/start/",
+            {"document_ids": [second.pk, first.pk]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 202, response.content)
+        payload = response.json()
+        self.assertTrue(payload["queued"])
+        self.assertIn(f"/async-jobs/status/{payload['jobId']}/", payload["streamUrl"])
+        self.assertIn(f"/documents/merge-pdf/download/{payload['jobId']}/", payload["downloadUrl"])
+        job_id, document_ids, filename = enqueue_mock.call_args.args
+        self.assertEqual(job_id, payload["jobId"])
+        self.assertEqual(document_ids, [second.pk, first.pk])
+        self.assertTrue(filename.endswith(f"_{self.application.pk}.pdf"))
+
+    def test_job_stores_artifact_served_with_range_support(self, _thumbnail_task):
+        first = self._create_document("itk.pdf", _pdf_bytes(), "application/pdf")
+        second = self._create_document("visa.pdf", _pdf_bytes(), "application/pdf")
+        job = AsyncJob.objects.create(task_name="documents_merge_pdf", created_by=self.user)
+
+        run_document_merge_job.call_local(str(job.id), [first.pk, second.pk], "merged.pdf")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, AsyncJob.STATUS_COMPLETED, job.error_message)
+        self.assertEqual(job.result["pages"], 2)
+        with default_storage.open(job.result["file_path"], "rb") as handle:
+            artifact = handle.read()
+
+        url = f"/api/documents/merge-pdf/download/{job.id}/"
+        partial = self.client.get(url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial["Content-Range"], f"bytes 0-9/{len(artifact)}")
+        self.assertEqual(b"".join(partial.streaming_content), artifact[:10])
+
+        full = self.client.get(url)
+        self.assertEqual(full.status_code, 200)
+        self.assertEqual(full["Accept-Ranges"], "bytes")
+        self.assertEqual(b"".join(full.streaming_content), artifact)
+
+        unsatisfiable = self.client.get(url, HTTP_RANGE=f"bytes={len(artifact)}-")
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+    def test_legacy_endpoint_still_returns_merged_pdf(self, _thumbnail_task):
+        document = self._create_document("itk.pdf", _pdf_bytes(pages=2), "application/pdf")
+
+        response = self.client.post(
+            "/api/documents/merge-pdf/",
+            {"document_ids": [document.pk]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(PdfReader(BytesIO(b"".join(response.streaming_content))).pages), 2)
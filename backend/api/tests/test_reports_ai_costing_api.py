@@ -4,6 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 
 from core.models.ai_request_usage import AIRequestUsage
+from core.services.ai_usage_rollup_service import AIUsageRollupService
 from core.services.ai_usage_service import AIUsageFeature
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
@@ -56,6 +57,7 @@ class AICostingReportApiTests(TestCase):
             cost_usd=cost_usd,
         )
         AIRequestUsage.objects.filter(pk=row.pk).update(created_at=created_at)
+        AIUsageRollupService.rebuild()
 
     def test_ai_costing_report_returns_year_month_day_aggregates(self):
         tz = timezone.get_current_timezone()
@@ -45,7 +45,9 @@ class ServerManagementOpenRouterStatusApiTests(TestCase):
 
     @override_settings(OPENROUTER_API_KEY="")
     def test_openrouter_status_handles_missing_usage_table(self):
-        with patch("api.views_admin.AIRequestUsage.objects.filter", side_effect=ProgrammingError("missing table")):
+        with patch(
+            "api.views_admin.AIUsageRollupService.totals", side_effect=ProgrammingError("missing table")
+        ):
             response = self.client.get("/api/server-management/openrouter-status/")
 
         self.assertEqual(response.status_code, 200)
@@ -3,7 +3,7 @@
 from unittest.mock import patch
 
 from core.models.holiday import Holiday
-from core.models.local_resilience import LocalResilienceSettings, SyncChangeLog, SyncConflict
+from core.models.local_resilience import LocalResilienceSettings, SyncChangeLog, SyncConflict, SyncCursor
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.test import TestCase, override_settings
@@ -47,6 +47,13 @@ class SyncApiTests(TestCase):
         self.assertEqual(payload["count"], 1)
         self.assertEqual(payload["changes"][0]["modelLabel"], "core.holiday")
 
+    def test_pull_with_node_id_records_peer_acknowledgement(self):
+        response = self.client.get("/api/sync/changes/pull/?after_seq=42&limit=10&node_id=desktop-1")
+        self.assertEqual(response.status_code, 200)
+        self.client.get("/api/sync/changes/pull/?after_seq=7&limit=10&node_id=desktop-1")
+
+        self.assertEqual(SyncCursor.objects.get(node_id="desktop-1").acked_seq, 42)
+
     def test_push_changes_endpoint_applies_upsert(self):
         response = self.client.post(
             "/api/sync/changes/push/",
@@ -37,6 +37,9 @@ from .views_admin import (
 )
 from .views_categorization import (
     categorization_apply,
+    categorization_chunked_upload_chunk,
+    categorization_chunked_upload_create,
+    categorization_chunked_upload_detail,
     categorization_job_status,
     categorization_stream_sse,
     categorization_upload_files,
@@ -82,6 +85,8 @@ from .reports_views import (
     MonthlyInvoiceDetailApiView,
     ProductDemandForecastApiView,
     ProductRevenueAnalysisApiView,
+    ReportExportDownloadApiView,
+    ReportExportStartApiView,
     ReportsIndexApiView,
     RevenueReportApiView,
 )
@@ -230,6 +235,16 @@ urlpatterns = [
     path("reports/kpi-dashboard/", KPIDashboardApiView.as_view(), name="api-report-kpi-dashboard"),
     path("reports/invoice-status/", InvoiceStatusDashboardApiView.as_view(), name="api-report-invoice-status"),
     path("reports/monthly-invoices/", MonthlyInvoiceDetailApiView.as_view(), name="api-report-monthly-invoices"),
+    path(
+        "reports/exports/<str:report>/start/",
+        ReportExportStartApiView.as_view(),
+        name="api-report-export-start",
+    ),
+    path(
+        "reports/exports/download/<uuid:job_id>/",
+        ReportExportDownloadApiView.as_view(),
+        name="api-report-export-download",
+    ),
     path("reports/cash-flow/", CashFlowAnalysisApiView.as_view(), name="api-report-cash-flow"),
     path("reports/customer-ltv/", CustomerLifetimeValueApiView.as_view(), name="api-report-customer-ltv"),
     path("reports/application-pipeline/", ApplicationPipelineApiView.as_view(), name="api-report-application-pipeline"),
@@ -252,6 +267,21 @@ urlpatterns = [
         categorization_upload_files,
         name="api-categorization-upload-files",
     ),
+    path(
+        "document-categorization/<uuid:job_id>/uploads/",
+        categorization_chunked_upload_create,
+        name="api-categorization-chunked-upload-create",
+    ),
+    path(
+        "document-categorization/<uuid:job_id>/uploads/<str:upload_id>/",
+        categorization_chunked_upload_detail,
+        name="api-categorization-chunked-upload-detail",
+    ),
+    path(
+        "document-categorization/<uuid:job_id>/uploads/<str:upload_id>/chunks/<int:index>/",
+        categorization_chunked_upload_chunk,
+        name="api-categorization-chunked-upload-chunk",
+    ),
     path(
         "document-categorization/stream/<uuid:job_id>/",
         categorization_stream_sse,
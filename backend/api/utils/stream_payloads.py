@@ -314,13 +314,17 @@ def normalize_invoice_import_job_payload(payload: dict[str, Any] | None) -> dict
 
 
 def serialize_invoice_import_item_payload(item) -> dict[str, Any]:
+    result = item.result
+    if isinstance(result, dict):
+        # The stored parse of a file waiting for the batch persist step is internal to the import tasks.
+        result = camelize_payload({key: value for key, value in result.items() if key != "parsed"})
     return {
         "itemId": str(item.id),
         "jobId": str(item.job_id),
         "index": int(item.sort_index or 0),
         "filename": item.filename,
         "status": item.status,
-        "result": camelize_payload(item.result) if isinstance(item.result, dict) else item.result,
+        "result": result,
         "errorMessage": item.error_message,
     }
 
@@ -45,6 +45,8 @@ Streams.
 """
 
 import logging
+import shutil
+import tempfile
 
 from api.utils.stream_payloads import (
     build_async_job_links,
@@ -54,6 +56,7 @@ from api.utils.stream_payloads import (
     normalize_ocr_result_payload,
 )
 from api.utils.contracts import build_error_payload, build_success_payload, get_request_id
+from api.utils.range_download import build_range_file_response
 from api.utils.idempotency import build_request_idempotency_fingerprint, resolve_request_idempotent_job, store_request_idempotent_job
 
 from .views_imports import *
@@ -173,45 +176,46 @@ class CustomerApplicationViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
     ordering = ["-id"]
 
     def get_queryset(self):
-        queryset = (
-            DocApplication.objects.select_related("customer", "product")
-            .select_related(
-                "customer__nationality",
-                "product__created_by",
-                "product__updated_by",
+        if self.action == "list":
+            # DocApplicationListSerializer reads invoice links, permissions and submission windows from a
+            # page-level DocApplicationListContext, so the per-row relations are not prefetched here.
+            queryset = DocApplication.objects.select_related("customer", "product").filter(
+                product__uses_customer_app_workflow=True
             )
-            .prefetch_related(
-                "product__tasks",
-                Prefetch(
-                    "documents",
-                    queryset=Document.objects.select_related("doc_type", "created_by", "updated_by"),
-                ),
-                Prefetch(
-                    "workflows",
-                    queryset=DocWorkflow.objects.select_related("task", "created_by", "updated_by"),
-                ),
-                Prefetch(
-                    "invoice_applications",
-                    queryset=InvoiceApplication.objects.select_related("invoice"),
-                ),
+        else:
+            queryset = (
+                DocApplication.objects.select_related("customer", "product")
+                .select_related(
+                    "customer__nationality",
+                    "product__created_by",
+                    "product__updated_by",
+                )
+                .prefetch_related(
+                    "product__tasks",
+                    Prefetch(
+                        "documents",
+                        queryset=Document.objects.select_related("doc_type", "created_by", "updated_by"),
+                    ),
+                    Prefetch(
+                        "workflows",
+                        queryset=DocWorkflow.objects.select_related("task", "created_by", "updated_by"),
+                    ),
+                    Prefetch(
+                        "invoice_applications",
+                        queryset=InvoiceApplication.objects.select_related("invoice"),
+                    ),
+                )
             )
-        )
-
-        if self.action == "list":
-            queryset = queryset.filter(product__uses_customer_app_workflow=True)
 
         query = self.request.query_params.get("search") or self.request.query_params.get("q")
         if query:
             queryset = queryset.search_doc_applications(query)
 
-        # Detail responses can derive completion state from prefetched documents,
-        # so skip aggregate annotations to keep the base query lighter.
+        # Completion state comes from the denormalized progress columns, so no per-row aggregate is needed.
         if self.action != "retrieve":
             queryset = queryset.annotate(
-                total_required_documents=Count("documents", filter=Q(documents__required=True)),
-                completed_required_documents=Count(
-                    "documents", filter=Q(documents__required=True, documents__completed=True)
-                ),
+                total_required_documents=F("required_documents_total"),
+                completed_required_documents=F("required_documents_completed"),
             )
 
         return queryset
@@ -818,18 +822,14 @@ class DocumentViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
             "details": document.details,
             "fileLink": document.file_link,
             "thumbnailLink": document.thumbnail_link,
+            "thumbnailStatus": document.thumbnail_status,
             "aiValidation": document.ai_validation,
             "completed": document.completed,
         }
         return Response(data)
 
-    @extend_schema(request=DocumentMergeSerializer, responses={200: OpenApiTypes.BINARY})
-    @action(detail=False, methods=["post"], url_path="merge-pdf")
-    def merge_pdf(self, request):
-        """Merge selected documents into a single PDF.
-
-        Expects JSON: {"document_ids": [1, 2, 3]}
-        """
+    def _resolve_merge_documents(self, request):
+        """Validate a merge request and return ``(ordered_documents, filename)`` or an error response."""
         serializer = DocumentMergeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         document_ids = serializer.validated_data.get("document_ids", [])
@@ -844,40 +844,186 @@ class DocumentViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
         }
 
         if not documents_dict:
-            return self.error_response("No valid documents found.", status.HTTP_404_NOT_FOUND)
+            return None, self.error_response("No valid documents found.", status.HTTP_404_NOT_FOUND)
 
         ordered_documents = [documents_dict[doc_id] for doc_id in document_ids if doc_id in documents_dict]
         documents_with_files = [doc for doc in ordered_documents if doc.file and doc.file.name]
 
         if not documents_with_files:
-            return self.error_response("Selected documents have no uploaded files.", status.HTTP_400_BAD_REQUEST)
+            return None, self.error_response("Selected documents have no uploaded files.", status.HTTP_400_BAD_REQUEST)
 
         # Get filename info from first doc
         application = documents_with_files[0].doc_application
         customer_name = application.customer.full_name if application and application.customer else "documents"
+        safe_customer_name = slugify(customer_name, allow_unicode=False).replace("-", "_")
+        filename = f"documents_{safe_customer_name}_{application.pk if application else 'merged'}.pdf"
+        return (ordered_documents, filename[:200]), None
 
-        try:
-            merged_pdf = DocumentMerger.merge_document_models(ordered_documents)
+    @extend_schema(request=DocumentMergeSerializer, responses={200: OpenApiTypes.BINARY})
+    @action(detail=False, methods=["post"], url_path="merge-pdf")
+    def merge_pdf(self, request):
+        """Merge selected documents into a single PDF.
 
-            safe_customer_name = slugify(customer_name, allow_unicode=False).replace("-", "_")
-            filename = f"documents_{safe_customer_name}_{application.pk if application else 'merged'}.pdf"
-            filename = filename[:200]
+        Expects JSON: {"document_ids": [1, 2, 3]}
 
-            from django.http import HttpResponse
+        Synchronous variant kept for existing clients; large selections should use
+        ``merge-pdf/start`` which runs the same merge as a background job.
+        """
+        resolved, error = self._resolve_merge_documents(request)
+        if error is not None:
+            return error
+        ordered_documents, filename = resolved
 
-            response = HttpResponse(merged_pdf, content_type="application/pdf")
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
-            response["Content-Length"] = len(merged_pdf)
+        work_dir = tempfile.mkdtemp(prefix="merge_pdf_")
+        try:
+            merged_path = os.path.join(work_dir, "merged.pdf")
+            DocumentMerger.merge_document_models_to_file(ordered_documents, merged_path)
 
+            # The open handle keeps the spooled file readable after the scratch dir is removed.
+            merged_file = open(merged_path, "rb")
+            response = FileResponse(merged_file, content_type="application/pdf")
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            response["Content-Length"] = os.path.getsize(merged_path)
             return response
 
         except DocumentMergerError as e:
             return self.error_response(f"Failed to merge documents: {str(e)}", status.HTTP_500_INTERNAL_SERVER_ERROR)
         except Exception as e:
-            import logging
-
-            logging.getLogger(__name__).exception("Unexpected error merging documents")
+            logger.exception("Unexpected error merging documents")
             return self.error_response("An unexpected error occurred", status.HTTP_500_INTERNAL_SERVER_ERROR)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    @extend_schema(request=DocumentMergeSerializer, responses={202: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["post"], url_path="merge-pdf/start")
+    def merge_pdf_start(self, request):
+        """Queue a background merge; progress streams on the async-job SSE channel."""
+        from customer_applications.tasks import run_document_merge_job
+
+        resolved, error = self._resolve_merge_documents(request)
+        if error is not None:
+            return error
+        ordered_documents, filename = resolved
+        document_ids = [doc.pk for doc in ordered_documents]
+
+        namespace = "documents_merge_pdf"
+        request_fingerprint = build_request_idempotency_fingerprint(request)
+
+        def _job_links(job_id):
+            return build_async_job_links(
+                request,
+                job_id,
+                stream_route="api-async-job-status-sse",
+                download_route="documents-merge-pdf-download",
+            )
+
+        idempotency_cache_key, cached_job = resolve_request_idempotent_job(
+            request=request,
+            namespace=namespace,
+            user_id=request.user.id,
+            queryset=AsyncJob.objects.filter(task_name=namespace, created_by=request.user),
+            fingerprint=request_fingerprint,
+        )
+        if cached_job is not None:
+            return Response(
+                build_async_job_start_payload(
+                    job_id=cached_job.id,
+                    status=cached_job.status,
+                    progress=cached_job.progress,
+                    queued=False,
+                    deduplicated=True,
+                    links=_job_links(cached_job.id),
+                ),
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        guard = prepare_async_enqueue(
+            namespace=namespace,
+            user=request.user,
+            inflight_queryset=AsyncJob.objects.filter(task_name=namespace, created_by=request.user),
+            inflight_statuses=ASYNC_JOB_INFLIGHT_STATUSES,
+            busy_message="A document merge is already being processed. Please retry in a moment.",
+            deduplicated_response_builder=lambda existing_job: Response(
+                build_async_job_start_payload(
+                    job_id=existing_job.id,
+                    status=existing_job.status,
+                    progress=existing_job.progress,
+                    queued=False,
+                    deduplicated=True,
+                    links=_job_links(existing_job.id),
+                ),
+                status=status.HTTP_202_ACCEPTED,
+            ),
+            error_response_builder=self.error_response,
+        )
+        if guard.response is not None:
+            return guard.response
+
+        lock_key = guard.lock_key
+        lock_token = guard.lock_token
+        try:
+            job = AsyncJob.objects.create(
+                task_name=namespace,
+                status=AsyncJob.STATUS_PENDING,
+                progress=0,
+                message=f"Queued merge of {len(document_ids)} documents...",
+                created_by=request.user,
+            )
+
+            run_document_merge_job(str(job.id), document_ids, filename)
+            store_request_idempotent_job(
+                cache_key=idempotency_cache_key,
+                job_id=job.id,
+                fingerprint=request_fingerprint,
+            )
+        finally:
+            if lock_key and lock_token:
+                release_enqueue_guard(lock_key, lock_token)
+
+        return Response(
+            build_async_job_start_payload(
+                job_id=job.id,
+                status=AsyncJob.STATUS_PENDING,
+                progress=job.progress,
+                queued=True,
+                deduplicated=False,
+                links=_job_links(job.id),
+            ),
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("job_id", OpenApiTypes.UUID, OpenApiParameter.PATH, required=True),
+        ],
+        responses={200: OpenApiTypes.BINARY, 206: OpenApiTypes.BINARY},
+    )
+    @action(detail=False, methods=["get"], url_path=r"merge-pdf/download/(?P<job_id>[^/.]+)")
+    def merge_pdf_download(self, request, job_id=None):
+        """Download a merged PDF artifact; honours single ``Range: bytes=`` requests for resumable downloads."""
+        try:
+            job = AsyncJob.objects.get(id=job_id, created_by=request.user, task_name="documents_merge_pdf")
+        except AsyncJob.DoesNotExist:
+            return self.error_response("Job not found", status.HTTP_404_NOT_FOUND)
+
+        if job.status != AsyncJob.STATUS_COMPLETED:
+            return self.error_response("Job not completed yet", status.HTTP_400_BAD_REQUEST)
+
+        result = job.result or {}
+        file_path = result.get("file_path")
+        filename = result.get("filename") or "documents_merged.pdf"
+        if not file_path:
+            return self.error_response("Merged PDF file is not available", status.HTTP_400_BAD_REQUEST)
+        if not default_storage.exists(file_path):
+            return self.error_response("Merged PDF file not found", status.HTTP_404_NOT_FOUND)
+
+        return build_range_file_response(
+            request,
+            file_path,
+            filename=filename,
+            content_type=result.get("content_type") or "application/pdf",
+            storage=default_storage,
+        )
 
 
 class OCRViewSet(ApiErrorHandlingMixin, viewsets.ViewSet):
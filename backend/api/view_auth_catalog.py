@@ -654,36 +654,15 @@ class CustomerViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     throttle_cache_fail_open_actions = {"check_passport": False}
 
-    @staticmethod
-    def _with_case_insensitive_name_sorting(queryset):
-        return queryset.annotate(
-            sort_last_name=Coalesce(
-                NullIf(Lower("last_name"), Value("")),
-                NullIf(Lower("company_name"), Value("")),
-                NullIf(Lower("first_name"), Value("")),
-                Value(""),
-            ),
-            sort_first_name=Coalesce(
-                NullIf(Lower("first_name"), Value("")),
-                NullIf(Lower("company_name"), Value("")),
-                Value(""),
-            ),
-            sort_company_name=Coalesce(
-                NullIf(Lower("company_name"), Value("")),
-                Value(""),
-            ),
-        )
-
     def get_queryset(self):
-        queryset = self._with_case_insensitive_name_sorting(Customer.objects.select_related("nationality").all())
+        # sort_* ordering fields are indexed generated columns on Customer, so name-sorted pages avoid a full sort.
+        queryset = Customer.objects.select_related("nationality").all()
 
         # Keep list and explicit search action behavior aligned.
         if self.action in {"list", "search"}:
             query = self.request.query_params.get("q") or self.request.query_params.get("search")
             if query:
-                queryset = self._with_case_insensitive_name_sorting(
-                    Customer.objects.search_customers(query).select_related("nationality")
-                )
+                queryset = Customer.objects.search_customers(query).select_related("nationality")
 
             status_param = self.request.query_params.get("status")
             if status_param:
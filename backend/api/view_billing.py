@@ -329,14 +329,6 @@ class InvoiceViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
         invoice = self.get_object()
         invoice_service = InvoiceService(invoice)
 
-        # Logic for determining invoice document content (matches legacy view)
-        if invoice.total_paid_amount == 0 or invoice.is_payment_complete:
-            data, items = invoice_service.generate_invoice_data()
-            buf = invoice_service.generate_invoice_document(data, items)
-        else:
-            data, items, payments = invoice_service.generate_partial_invoice_data()
-            buf = invoice_service.generate_invoice_document(data, items, payments)
-
         # Build filename
         raw_name = f"{invoice.invoice_no_display}_{invoice.customer.full_name}"
         safe_name = slugify(raw_name, allow_unicode=False).replace("-", "_") or f"Invoice_{pk}"
@@ -344,15 +336,15 @@ class InvoiceViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
 
         if format_type == "docx":
             return FileResponse(
-                buf,
+                BytesIO(invoice_service.render_document("docx")),
                 as_attachment=True,
                 filename=f"{safe_name}.docx",
                 content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             )
 
-        # Convert to PDF
+        # Convert to PDF (served from the rendered-artifact cache when the invoice is unchanged)
         try:
-            pdf_bytes = PDFConverter.docx_buffer_to_pdf(buf)
+            pdf_bytes = invoice_service.render_document("pdf")
             pdf_buf = BytesIO(pdf_bytes)
             response = FileResponse(
                 pdf_buf,
@@ -1251,7 +1243,7 @@ class InvoiceViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
         """Process multiple uploaded invoice files with real-time progress streaming."""
         from django.utils.text import get_valid_filename
         from invoices.models import InvoiceImportItem, InvoiceImportJob
-        from invoices.tasks.import_jobs import run_invoice_import_item
+        from invoices.tasks.import_jobs import run_invoice_import_parse_item
 
         namespace = "invoice_import_batch"
         request_fingerprint = build_request_idempotency_fingerprint(request)
@@ -1332,7 +1324,8 @@ class InvoiceViewSet(ApiErrorHandlingMixin, viewsets.ModelViewSet):
                     is_paid=is_paid,
                     status=InvoiceImportItem.STATUS_QUEUED,
                 )
-                run_invoice_import_item(str(item.id))
+                # One parse task per file; the last parse enqueues the batch persist step for the whole upload.
+                run_invoice_import_parse_item(str(item.id))
         finally:
             if lock_key and lock_token:
                 release_enqueue_guard(lock_key, lock_token)
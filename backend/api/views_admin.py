@@ -46,8 +46,8 @@ from api.utils.redis_sse import iter_replay_and_live_events
 from api.utils.sse_auth import sse_token_auth_required
 from api.views import ApiErrorHandlingMixin
 from core.models import AppSetting
-from core.models.ai_request_usage import AIRequestUsage
 from core.services.ai_runtime_settings_service import AI_RUNTIME_SETTING_DEFINITIONS, AIRuntimeSettingsService
+from core.services.ai_usage_rollup_service import AIUsageRollupService
 from core.services.ai_usage_service import AIUsageFeature
 from core.services.app_setting_service import AppSettingScope, AppSettingService
 from core.services.local_resilience_service import LocalResilienceService
@@ -56,7 +56,6 @@ from core.services.ui_settings_service import UiSettingsService
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import caches
-from django.db.models import Count, Q, Sum
 from django.db.utils import OperationalError, ProgrammingError
 from django.http import FileResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
@@ -1316,24 +1315,10 @@ class ServerManagementViewSet(ApiErrorHandlingMixin, viewsets.ViewSet):
             if usage_tracking_unavailable:
                 return _empty_period_usage(now_dt, month=month)
 
-            filters = {
-                "provider": provider_name,
-                "created_at__year": now_dt.year,
-            }
-            if feature_name is not None:
-                filters["feature"] = feature_name
-            if model_name is not None:
-                filters["model"] = model_name
-            if month:
-                filters["created_at__month"] = now_dt.month
-
+            start, end = AIUsageRollupService.period_bounds(now_dt, month=month)
             try:
-                aggregate = AIRequestUsage.objects.filter(**filters).aggregate(
-                    request_count=Count("id"),
-                    success_count=Count("id", filter=Q(success=True)),
-                    failed_count=Count("id", filter=Q(success=False)),
-                    total_tokens=Sum("total_tokens"),
-                    total_cost=Sum("cost_usd"),
+                aggregate = AIUsageRollupService.totals(
+                    start, end, feature=feature_name, provider=provider_name, model=model_name
                 )
             except (ProgrammingError, OperationalError):
                 usage_tracking_unavailable = True
@@ -1352,27 +1337,9 @@ class ServerManagementViewSet(ApiErrorHandlingMixin, viewsets.ViewSet):
             if usage_tracking_unavailable:
                 return []
 
-            filters = {
-                "feature": feature_name,
-                "provider": provider_name,
-                "created_at__year": now_dt.year,
-            }
-            if month:
-                filters["created_at__month"] = now_dt.month
-
+            start, end = AIUsageRollupService.period_bounds(now_dt, month=month)
             try:
-                rows = (
-                    AIRequestUsage.objects.filter(**filters)
-                    .values("model")
-                    .annotate(
-                        request_count=Count("id"),
-                        success_count=Count("id", filter=Q(success=True)),
-                        failed_count=Count("id", filter=Q(success=False)),
-                        total_tokens=Sum("total_tokens"),
-                        total_cost=Sum("cost_usd"),
-                    )
-                    .order_by("-total_cost", "-request_count", "model")
-                )
+                rows = AIUsageRollupService.breakdown("model", start, end, feature=feature_name, provider=provider_name)
             except (ProgrammingError, OperationalError):
                 usage_tracking_unavailable = True
                 return []
@@ -3,18 +3,24 @@ Document Categorization API Views
 
 Endpoints for AI-powered document classification:
 - POST /api/customer-applications/{id}/categorize-documents/ — upload & categorize multiple files
+- POST /api/document-categorization/{job_id}/uploads/ — open a resumable chunked upload for one file
+- GET|DELETE /api/document-categorization/{job_id}/uploads/{upload_id}/ — resume offset / abort
+- PUT /api/document-categorization/{job_id}/uploads/{upload_id}/chunks/{index}/ — send one chunk
 - GET /api/document-categorization/stream/{job_id}/ — SSE progress streaming
 - POST /api/document-categorization/{job_id}/apply/ — apply confirmed mappings
 - POST /api/documents/{id}/validate-category/ — single-file pre-upload AI validation
 
 Transient file lifecycle:
-    Uploaded files are saved to ``tmp/categorization/{job_id}/`` via ``default_storage``.
-    When the user applies matched files, each mapped file is copied to its final
+    Uploaded files are saved to ``tmp/categorization/{job_id}/`` via ``default_storage``
+    (chunked uploads stage their chunks under ``tmp/uploads/{upload_id}/`` first).
+    Each file's categorization task is dispatched as soon as that file has landed.
+    When the user applies matched files, each mapped file is moved to its final
     Document location and then **all** transient files (applied, unapplied, "No Slot",
     and errored) are deleted together with the temp directory.  This guarantees that
     only persisted Document files remain in storage.
 """
 
+import hashlib
 import os
 import time
 import traceback as tb_module
@@ -33,14 +39,26 @@ from core.services.ai_document_categorizer import (
     extract_validation_doc_number,
     extract_validation_expiration_date,
 )
+from core.services.chunked_upload_service import (
+    CHUNKED_UPLOAD_STORAGE_PREFIX,
+    ChunkedUploadError,
+    ChunkedUploadService,
+)
 from core.services.logger_service import Logger
 from core.services.redis_streams import format_sse_event, resolve_last_event_id, stream_file_key, stream_job_key
+from core.storage import get_media_store_adapter
 from core.tasks.document_categorization import (
     categorization_item_has_terminal_validation,
     categorization_item_is_terminal,
+    refresh_categorization_job_counts,
     run_document_categorization_item,
 )
 from customer_applications.models import DocApplication, Document, DocumentCategorizationItem, DocumentCategorizationJob
+from customer_applications.services.categorization_upload_progress_service import (
+    UPLOAD_PROGRESS_STREAM_EVENT,
+    CategorizationUploadProgressService,
+)
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import status
@@ -154,36 +172,40 @@ def _cleanup_categorization_job_files(job: DocumentCategorizationJob) -> None:
     This removes every file tracked by the job's items and then removes
     the ``tmp/categorization/{job_id}/`` directory itself.  It is called
     after ``categorization_apply`` so that only files that were already
-    copied into their final :class:`~customer_applications.models.Document`
+    moved into their final :class:`~customer_applications.models.Document`
     location survive — every unapplied, "no slot", or errored file is
     cleaned up.
     """
-    # 1) Delete individual item files tracked in the DB.
-    for item in job.items.all().only("file_path"):
-        file_path = (item.file_path or "").strip()
+    media_store = get_media_store_adapter(default_storage)
+
+    # 1) Collect individual item files tracked in the DB, plus the chunks of
+    #    resumable uploads that never completed.
+    transient_paths: list[str] = []
+    for file_path, item_result in job.items.all().values_list("file_path", "result"):
+        file_path = (file_path or "").strip()
         if file_path:
-            try:
-                if default_storage.exists(file_path):
-                    default_storage.delete(file_path)
-            except Exception as exc:
-                logger.warning("Failed to delete transient file %s: %s", file_path, exc)
+            transient_paths.append(file_path)
+            continue
+        upload_id = item_result.get("upload_id") if isinstance(item_result, dict) else None
+        if upload_id:
+            transient_paths.extend(media_store.iter_files(f"{CHUNKED_UPLOAD_STORAGE_PREFIX}/{upload_id}"))
 
-    # 2) Remove the entire temp folder for this job (catches any files
+    # 2) Add every file left in the temp folder for this job (catches any files
     #    not tracked by an item, e.g. partial uploads or retries).
     temp_dir = f"tmp/categorization/{job.id}"
     try:
-        dirs, files = default_storage.listdir(temp_dir)
-        for fname in files:
-            fpath = f"{temp_dir}/{fname}"
-            try:
-                default_storage.delete(fpath)
-            except Exception as exc:
-                logger.warning("Failed to delete leftover temp file %s: %s", fpath, exc)
+        _dirs, files = default_storage.listdir(temp_dir)
+        transient_paths.extend(f"{temp_dir}/{fname}" for fname in files)
     except FileNotFoundError:
         pass
     except Exception as exc:
         logger.warning("Failed to list temp folder %s for cleanup: %s", temp_dir, exc)
 
+    # 3) Delete them in one pass (a single DeleteObjects batch on S3).
+    failures = media_store.bulk_delete(path for path in transient_paths if path)
+    for file_path, error in failures.items():
+        logger.warning("Failed to delete transient file %s: %s", file_path, error)
+
     # Try to remove the now-empty temp directory.
     try:
         if default_storage.exists(temp_dir):
@@ -286,10 +308,32 @@ def _update_upload_progress(
     job.save(update_fields=["result", "total_files", "updated_at"])
 
 
+def _mark_job_upload_complete(
+    job: DocumentCategorizationJob,
+    *,
+    uploaded_files: int,
+    total_files: int,
+    uploaded_bytes: int,
+    total_bytes: int,
+) -> None:
+    _update_upload_progress(
+        job,
+        uploaded_files=uploaded_files,
+        total_files=total_files,
+        uploaded_bytes=uploaded_bytes,
+        total_bytes=total_bytes,
+        current_file=None,
+        complete=True,
+    )
+    # Items are dispatched while the batch is still uploading, so every item may already be done;
+    # recount now that the item set is final so the job status can settle.
+    refresh_categorization_job_counts(job.id)
+
+
 def _upload_files_to_job(*, job: DocumentCategorizationJob, files: list) -> tuple[int, int]:
     temp_dir = f"tmp/categorization/{job.id}"
     dispatched_tasks = 0
-    item_ids_to_dispatch: list[str] = []
+    upload_progress = CategorizationUploadProgressService()
 
     total_files = max(job.total_files, len(files))
     total_bytes = sum(int(getattr(uploaded_file, "size", 0) or 0) for uploaded_file in files)
@@ -306,30 +350,29 @@ def _upload_files_to_job(*, job: DocumentCategorizationJob, files: list) -> tupl
         current_file=None,
         complete=False,
     )
+    upload_progress.reset(job.id, total_bytes=total_bytes)
 
-    last_saved_bytes = 0
-    last_saved_at = 0.0
+    last_recorded_bytes = 0
+    last_recorded_at = 0.0
 
-    def persist_progress(*, current_file: str | None, force: bool = False) -> None:
-        nonlocal last_saved_bytes, last_saved_at
+    def record_progress(*, current_file: str | None, files_delta: int = 0, force: bool = False) -> None:
+        # Byte-level progress goes to the live cache counters (and the job stream), not the job row.
+        nonlocal last_recorded_bytes, last_recorded_at
         now = time.monotonic()
-        bytes_delta = uploaded_bytes - last_saved_bytes
-        time_delta = now - last_saved_at
-        should_save = force or bytes_delta >= 256 * 1024 or time_delta >= 0.35
-        if not should_save:
+        bytes_delta = uploaded_bytes - last_recorded_bytes
+        time_delta = now - last_recorded_at
+        should_record = force or bytes_delta >= 256 * 1024 or time_delta >= 0.35
+        if not should_record:
             return
 
-        _update_upload_progress(
-            job,
-            uploaded_files=uploaded_files,
-            total_files=total_files,
-            uploaded_bytes=uploaded_bytes,
-            total_bytes=total_bytes,
+        upload_progress.record(
+            job.id,
+            uploaded_bytes=bytes_delta,
+            uploaded_files=files_delta,
             current_file=current_file,
-            complete=False,
         )
-        last_saved_bytes = uploaded_bytes
-        last_saved_at = now
+        last_recorded_bytes = uploaded_bytes
+        last_recorded_at = now
 
     for idx, uploaded_file in enumerate(files):
         safe_filename = os.path.basename(uploaded_file.name)
@@ -347,7 +390,7 @@ def _upload_files_to_job(*, job: DocumentCategorizationJob, files: list) -> tupl
         def on_bytes_read(byte_count: int) -> None:
             nonlocal uploaded_bytes
             uploaded_bytes += int(byte_count or 0)
-            persist_progress(current_file=safe_filename)
+            record_progress(current_file=safe_filename)
 
         tracked_file = _ProgressTrackedUploadedFile(uploaded_file, on_bytes_read)
         saved_path = default_storage.save(file_path, tracked_file)
@@ -362,26 +405,23 @@ def _upload_files_to_job(*, job: DocumentCategorizationJob, files: list) -> tupl
         item.file_path = saved_path
         item.result = {"stage": "uploaded", "ai_validation_enabled": None}
         item.save(update_fields=["file_path", "result", "updated_at"])
-        item_ids_to_dispatch.append(str(item.id))
+
+        # Dispatch each file's independent worker task as soon as it has landed instead of
+        # waiting for the whole batch, so processing overlaps the remaining uploads.
+        run_document_categorization_item.delay(str(item.id))
+        dispatched_tasks += 1
 
         uploaded_files += 1
-        persist_progress(current_file=safe_filename, force=True)
+        record_progress(current_file=safe_filename, files_delta=1, force=True)
 
-    _update_upload_progress(
+    _mark_job_upload_complete(
         job,
         uploaded_files=uploaded_files,
         total_files=total_files,
         uploaded_bytes=total_bytes if total_bytes > 0 else uploaded_bytes,
         total_bytes=total_bytes,
-        current_file=None,
-        complete=True,
     )
-
-    # Enqueue one independent worker task per file after upload has completed.
-    # This ensures multi-upload processing starts in parallel with isolated item workflows.
-    for item_id in item_ids_to_dispatch:
-        run_document_categorization_item.delay(item_id)
-        dispatched_tasks += 1
+    upload_progress.clear(job.id)
 
     return uploaded_files, dispatched_tasks
 
@@ -543,6 +583,273 @@ def categorization_upload_files(request, job_id):
     )
 
 
+_CHUNKED_UPLOAD_ERROR_STATUS = {
+    "not_found": status.HTTP_404_NOT_FOUND,
+    "conflict": status.HTTP_409_CONFLICT,
+}
+
+
+def _chunked_upload_error_response(exc: ChunkedUploadError, request) -> Response:
+    return _error_response(
+        str(exc),
+        _CHUNKED_UPLOAD_ERROR_STATUS.get(exc.code, status.HTTP_400_BAD_REQUEST),
+        code=exc.code,
+        request=request,
+    )
+
+
+def _get_upload_job(request, job_id) -> tuple[DocumentCategorizationJob | None, Response | None]:
+    try:
+        job = DocumentCategorizationJob.objects.get(id=job_id)
+    except DocumentCategorizationJob.DoesNotExist:
+        return None, _error_response("Job not found.", status.HTTP_404_NOT_FOUND, code="not_found", request=request)
+
+    if not request.user.is_staff and job.created_by_id != request.user.id:
+        return None, _error_response(
+            "Permission denied.", status.HTTP_403_FORBIDDEN, code="forbidden", request=request
+        )
+    return job, None
+
+
+def _get_job_upload_session(job: DocumentCategorizationJob, upload_id: str, request):
+    session = ChunkedUploadService().get_session(upload_id)
+    if session is None or session.context.get("job_id") != str(job.id):
+        return None, _error_response(
+            "Upload not found or expired.", status.HTTP_404_NOT_FOUND, code="not_found", request=request
+        )
+    return session, None
+
+
+def _read_request_bytes(request, *, limit: int) -> bytes:
+    """Read up to ``limit`` raw body bytes; request.body would be capped by DATA_UPLOAD_MAX_MEMORY_SIZE."""
+    stream = request.stream
+    if stream is None:
+        return b""
+    parts: list[bytes] = []
+    remaining = limit
+    while remaining > 0:
+        data = stream.read(min(remaining, 1024 * 1024))
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+def _chunked_upload_key_cache_key(job_id, upload_key: str) -> str:
+    digest = hashlib.sha256(upload_key.encode("utf-8")).hexdigest()
+    return f"chunked_upload:job:{job_id}:key:{digest}"
+
+
+def _serialize_upload_status(service: ChunkedUploadService, session) -> dict[str, Any]:
+    upload_status = service.status(session)
+    return {
+        "uploadId": session.upload_id,
+        "itemId": session.context.get("item_id"),
+        "filename": session.filename,
+        "size": session.size,
+        "chunkSize": session.chunk_size,
+        "totalChunks": session.total_chunks,
+        "receivedChunks": upload_status["received_chunks"],
+        "offset": upload_status["offset"],
+        "complete": upload_status["complete"],
+        "filePath": upload_status["file_path"],
+    }
+
+
+def _finish_chunked_file(job: DocumentCategorizationJob, session, service: ChunkedUploadService) -> str:
+    """Assemble a fully acknowledged upload, dispatch its item and close the job upload when it was the last."""
+    item = DocumentCategorizationItem.objects.get(id=session.context["item_id"], job=job)
+    saved_path = service.assemble(session, f"tmp/categorization/{job.id}/{item.filename}")
+
+    item.file_path = saved_path
+    item.result = {"stage": "uploaded", "ai_validation_enabled": None}
+    item.save(update_fields=["file_path", "result", "updated_at"])
+    run_document_categorization_item.delay(str(item.id))
+
+    upload_progress = CategorizationUploadProgressService()
+    snapshot = upload_progress.record(job.id, uploaded_files=1, current_file=item.filename)
+
+    uploaded_files = DocumentCategorizationItem.objects.filter(job=job).exclude(file_path="").count()
+    if uploaded_files >= max(1, int(job.total_files or 0)) and upload_progress.claim_completion(job.id):
+        total_bytes = int(snapshot.get("total_bytes") or 0)
+        _mark_job_upload_complete(
+            job,
+            uploaded_files=uploaded_files,
+            total_files=max(uploaded_files, int(job.total_files or 0)),
+            uploaded_bytes=total_bytes or int(snapshot.get("uploaded_bytes") or 0),
+            total_bytes=total_bytes,
+        )
+        upload_progress.clear(job.id)
+    return saved_path
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def categorization_chunked_upload_create(request, job_id):
+    """Open a resumable upload session for one file of a categorization job.
+
+    Clients send an ``uploadKey`` (e.g. name + size + lastModified) so that re-posting after a dropped
+    connection resumes the existing session instead of creating a duplicate item.
+    """
+    job, error_response = _get_upload_job(request, job_id)
+    if error_response is not None:
+        return error_response
+
+    filename = os.path.basename(str(request.data.get("filename") or "").strip())
+    if not filename:
+        return _error_response(
+            "Filename is required.",
+            status.HTTP_400_BAD_REQUEST,
+            code="validation_error",
+            details={"filename": ["Filename is required."]},
+            request=request,
+        )
+    try:
+        size = int(request.data.get("size"))
+        raw_chunk_size = request.data.get("chunkSize", request.data.get("chunk_size"))
+        chunk_size = int(raw_chunk_size) if raw_chunk_size not in (None, "") else None
+    except (TypeError, ValueError):
+        return _error_response(
+            "Size and chunk size must be integers.",
+            status.HTTP_400_BAD_REQUEST,
+            code="validation_error",
+            request=request,
+        )
+
+    service = ChunkedUploadService()
+    upload_key = str(request.data.get("uploadKey", request.data.get("upload_key")) or "").strip()
+    upload_key_cache_key = _chunked_upload_key_cache_key(job.id, upload_key) if upload_key else None
+    if upload_key_cache_key:
+        existing = service.get_session(cache.get(upload_key_cache_key) or "")
+        if existing is not None and existing.size == size:
+            return Response(_serialize_upload_status(service, existing), status=status.HTTP_200_OK)
+
+    try:
+        session = service.create_session(
+            owner_id=request.user.id,
+            filename=filename,
+            size=size,
+            chunk_size=chunk_size,
+            context={"job_id": str(job.id)},
+        )
+    except ChunkedUploadError as exc:
+        return _chunked_upload_error_response(exc, request)
+
+    next_index = DocumentCategorizationItem.objects.filter(job=job).count()
+    item = DocumentCategorizationItem.objects.create(
+        job=job,
+        sort_index=next_index,
+        filename=filename,
+        file_path="",
+        result={"stage": "uploading", "ai_validation_enabled": None, "upload_id": session.upload_id},
+    )
+    service.update_context(session, item_id=str(item.id))
+    if upload_key_cache_key:
+        cache.set(upload_key_cache_key, session.upload_id, service.session_ttl_seconds())
+    CategorizationUploadProgressService().record(job.id, total_bytes=size, current_file=filename)
+
+    return Response(_serialize_upload_status(service, session), status=status.HTTP_201_CREATED)
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAuthenticated])
+def categorization_chunked_upload_detail(request, job_id, upload_id):
+    """Report which chunks were acknowledged (resume point), or abort the upload."""
+    job, error_response = _get_upload_job(request, job_id)
+    if error_response is not None:
+        return error_response
+    session, error_response = _get_job_upload_session(job, upload_id, request)
+    if error_response is not None:
+        return error_response
+
+    service = ChunkedUploadService()
+    if request.method == "DELETE":
+        upload_status = service.status(session)
+        if upload_status["complete"]:
+            return _error_response(
+                "Upload already completed.", status.HTTP_409_CONFLICT, code="conflict", request=request
+            )
+        service.abort(session)
+        DocumentCategorizationItem.objects.filter(id=session.context.get("item_id"), job=job, file_path="").delete()
+        CategorizationUploadProgressService().record(
+            job.id,
+            uploaded_bytes=-upload_status["received_bytes"],
+            total_bytes=-session.size,
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    payload = _serialize_upload_status(service, session)
+    response = Response(payload)
+    response["Upload-Offset"] = str(payload["offset"])
+    response["Upload-Length"] = str(session.size)
+    return response
+
+
+@api_view(["PUT"])
+@permission_classes([IsAuthenticated])
+def categorization_chunked_upload_chunk(request, job_id, upload_id, index):
+    """Accept one raw chunk (``application/offset+octet-stream``); chunks may arrive in parallel and in any order.
+
+    An optional ``Upload-Checksum: <algorithm> <base64 digest>`` header is verified before the chunk is stored.
+    The request that delivers the last missing chunk assembles the file and dispatches its categorization.
+    """
+    job, error_response = _get_upload_job(request, job_id)
+    if error_response is not None:
+        return error_response
+    session, error_response = _get_job_upload_session(job, upload_id, request)
+    if error_response is not None:
+        return error_response
+
+    expected_size = session.expected_chunk_size(index) if 0 <= index < session.total_chunks else 0
+    data = _read_request_bytes(request, limit=expected_size + 1) if expected_size else b""
+
+    service = ChunkedUploadService()
+    try:
+        ack = service.accept_chunk(
+            session,
+            index=index,
+            data=data,
+            checksum=request.headers.get("Upload-Checksum"),
+        )
+    except ChunkedUploadError as exc:
+        return _chunked_upload_error_response(exc, request)
+
+    if not ack.duplicate:
+        CategorizationUploadProgressService().record(job.id, uploaded_bytes=ack.size, current_file=session.filename)
+
+    file_path = session.context.get("file_path")
+    if ack.ready and not file_path:
+        # Normally the request carrying the last chunk gets here; a retry also does when a previous
+        # assembly attempt failed. The service lock lets exactly one request assemble.
+        try:
+            file_path = _finish_chunked_file(job, session, service)
+        except ChunkedUploadError as exc:
+            if exc.code != "conflict":
+                return _chunked_upload_error_response(exc, request)
+        except Exception as exc:
+            logger.error("Failed to assemble chunked upload %s: %s", session.upload_id, exc, exc_info=True)
+            return _error_response(
+                "Failed to assemble uploaded file.",
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                code="assembly_failed",
+                request=request,
+            )
+
+    return Response(
+        {
+            "uploadId": session.upload_id,
+            "itemId": session.context.get("item_id"),
+            "index": index,
+            "receivedChunks": ack.received_chunks,
+            "totalChunks": session.total_chunks,
+            "duplicate": ack.duplicate,
+            "complete": bool(file_path),
+            "filePath": file_path,
+        }
+    )
+
+
 @sse_token_auth_required
 def categorization_stream_sse(request, job_id):
     """SSE endpoint for real-time categorization progress."""
@@ -565,6 +872,7 @@ def categorization_stream_sse(request, job_id):
         sent_states = {}
         total_files = job.total_files
 
+        upload_progress = CategorizationUploadProgressService()
         upload_state = {
             "uploaded_bytes": -1,
             "uploaded_files": -1,
@@ -613,8 +921,20 @@ def categorization_stream_sse(request, job_id):
             total_bytes = int(upload_info.get("total_bytes") or 0)
             current_file = upload_info.get("current_file")
             upload_complete = bool(upload_info.get("complete"))
-
-            processing_complete = total_files > 0 and int(job.processed_files or 0) >= total_files
+            if not upload_complete:
+                # While uploading, byte/file progress lives in the cache counters fed by
+                # file and chunk acknowledgements; the job row only records start and completion.
+                live_upload = upload_progress.snapshot(job.id) or {}
+                uploaded_files = max(uploaded_files, int(live_upload.get("uploaded_files") or 0))
+                uploaded_bytes = max(uploaded_bytes, int(live_upload.get("uploaded_bytes") or 0))
+                total_bytes = max(total_bytes, int(live_upload.get("total_bytes") or 0))
+                current_file = live_upload.get("current_file") or current_file
+
+            # Jobs without upload bookkeeping (legacy rows) count as fully uploaded.
+            upload_settled = upload_info.get("complete", True) is not False
+            processing_complete = (
+                upload_settled and total_files > 0 and int(job.processed_files or 0) >= total_files
+            )
             overall_percent = _compute_overall_progress_percent(
                 total_files=upload_total_files,
                 uploaded_files=uploaded_files,
@@ -719,6 +1039,7 @@ def categorization_stream_sse(request, job_id):
                         "categorized_sent": False,
                         "validating_sent": False,
                         "validated_sent": False,
+                        "capacity_wait_sent": None,
                         "done": False,
                     },
                 )
@@ -768,6 +1089,27 @@ def categorization_stream_sse(request, job_id):
                     )
                     state["processing"] = True
 
+                # Waiting for shared AI provider capacity (rate limits / concurrency slots)
+                capacity_wait = result.get("ai_capacity_wait")
+                if isinstance(capacity_wait, dict) and capacity_wait.get("waited_seconds") != state.get(
+                    "capacity_wait_sent"
+                ):
+                    wait_message = capacity_wait.get("message") or "Waiting for AI capacity"
+                    messages.append(
+                        _send_event(
+                            "file_waiting_for_ai",
+                            {
+                                "index": item.sort_index,
+                                "filename": item.filename,
+                                "waitedSeconds": capacity_wait.get("waited_seconds"),
+                                "retryInSeconds": capacity_wait.get("retry_in_seconds"),
+                                "message": f"⏳ {item.filename}: {wait_message}",
+                            },
+                            event_id=event_id,
+                        )
+                    )
+                    state["capacity_wait_sent"] = capacity_wait.get("waited_seconds")
+
                 # Pass 2 fallback triggered
                 if stage == "categorizing_pass_2" and not state["pass2_sent"]:
                     messages.append(
@@ -888,7 +1230,7 @@ def categorization_stream_sse(request, job_id):
                 and all(s.get("done", False) for s in sent_states.values())
             )
 
-            if total_files > 0 and job.processed_files >= total_files and all_done:
+            if upload_settled and total_files > 0 and job.processed_files >= total_files and all_done:
                 summary_items = items if changed_item_ids is None else list(job.items.all().order_by("sort_index"))
                 # Build final results
                 results = []
@@ -989,7 +1331,7 @@ def categorization_stream_sse(request, job_id):
             changed_item_id = _parse_changed_item_id(stream_event)
             if changed_item_id is not None:
                 pending_item_ids.add(changed_item_id)
-            elif stream_event.event != "categorization_job_changed":
+            elif stream_event.event not in ("categorization_job_changed", UPLOAD_PROGRESS_STREAM_EVENT):
                 force_full_refresh = True
             now = time.monotonic()
             if (
@@ -1074,6 +1416,7 @@ def categorization_apply(request, job_id):
             request=request,
         )
 
+    media_store = get_media_store_adapter(default_storage)
     for mapping in mappings:
         item_id = mapping["item_id"]
         document_id = mapping["document_id"]
@@ -1094,10 +1437,6 @@ def categorization_apply(request, job_id):
             continue
 
         try:
-            # Read the temp file
-            with default_storage.open(item.file_path, "rb") as f:
-                file_content = f.read()
-
             # Determine the final path
             _, extension = os.path.splitext(item.filename)
             from core.utils.helpers import whitespaces_to_underscores
@@ -1106,10 +1445,9 @@ def categorization_apply(request, job_id):
             doc_application_folder = document.doc_application.upload_folder
             final_path = f"{doc_application_folder}/{final_filename}"
 
-            # Save to final location
-            from django.core.files.base import ContentFile
-
-            saved_path = default_storage.save(final_path, ContentFile(file_content))
+            # Move the temp file into place server-side (rename on local storage,
+            # CopyObject on S3) instead of streaming its bytes through the worker.
+            saved_path = media_store.move(item.file_path, final_path)
 
             # Update the Document
             document.file.name = saved_path
@@ -20,13 +20,15 @@ import secrets
 from api.permissions import is_superuser_or_admin_group
 from api.utils.contracts import build_error_payload, build_success_payload
 from api.utils.stream_payloads import camelize_payload
-from core.models.local_resilience import LocalResilienceSettings, SyncChangeLog, SyncConflict, SyncCursor
+from core.models.local_resilience import LocalResilienceSettings, SyncConflict, SyncCursor
 from core.services.sync_service import (
+    change_log_stats,
     fetch_media_entries,
     get_local_node_id,
     get_media_manifest,
     ingest_remote_changes,
     pull_changes,
+    record_peer_ack,
     refresh_media_manifest,
 )
 from django.conf import settings
@@ -130,7 +132,8 @@ class SyncViewSet(viewsets.ViewSet):
         if auth_error is not None:
             return auth_error
 
-        last_seq = SyncChangeLog.objects.order_by("-seq").values_list("seq", flat=True).first() or 0
+        log_stats = change_log_stats()
+        last_seq = log_stats["lastSeq"]
         pending_conflicts = SyncConflict.objects.filter(status=SyncConflict.STATUS_PENDING).count()
         settings_obj = LocalResilienceSettings.get_solo()
         remote_cursor = SyncCursor.objects.filter(node_id="remote").first()
@@ -141,6 +144,11 @@ class SyncViewSet(viewsets.ViewSet):
                     "nodeId": get_local_node_id(),
                     "lastSeq": int(last_seq),
                     "pendingConflicts": int(pending_conflicts),
+                    "changeLog": {
+                        "rows": log_stats["rows"],
+                        "compactionWatermark": log_stats["watermark"],
+                        "peerLag": log_stats["peerLag"],
+                    },
                     "syncEnabled": bool(getattr(settings, "LOCAL_SYNC_ENABLED", False) and settings_obj.enabled),
                     "remoteCursor": {
                         "lastPulledSeq": int(remote_cursor.last_pulled_seq) if remote_cursor else 0,
@@ -193,6 +201,7 @@ class SyncViewSet(viewsets.ViewSet):
         parameters=[
             OpenApiParameter("after_seq", OpenApiTypes.INT, OpenApiParameter.QUERY, required=False),
             OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY, required=False),
+            OpenApiParameter("node_id", OpenApiTypes.STR, OpenApiParameter.QUERY, required=False),
         ],
         responses={200: OpenApiTypes.OBJECT},
     )
@@ -211,6 +220,11 @@ class SyncViewSet(viewsets.ViewSet):
         except ValueError:
             limit = 200
 
+        # Pulling from after_seq acknowledges everything up to it; that bounds change-log compaction.
+        peer_node_id = str(request.query_params.get("node_id") or "").strip()
+        if peer_node_id:
+            record_peer_ack(peer_node_id, after_seq)
+
         changes = pull_changes(after_seq=after_seq, limit=min(max(1, limit), 1000))
         next_seq = max((int(item.get("seq") or 0) for item in changes), default=after_seq)
         return Response(
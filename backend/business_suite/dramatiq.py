@@ -26,6 +26,7 @@ from urllib.parse import urlparse, urlunparse
 
 import django
 import dramatiq
+from core.telemetry.dramatiq_metrics import DramatiqMetricsMiddleware
 from core.telemetry.dramatiq_tracing import DramatiqTracingMiddleware
 from django.apps import apps
 from django.conf import settings
@@ -134,10 +135,17 @@ def setup() -> RedisBroker:
         url=_build_redis_url(),
         namespace=str(getattr(settings, "DRAMATIQ_NAMESPACE", "dramatiq:queue") or "dramatiq:queue"),
     )
+    from core.middleware.dramatiq_admission import ActorConcurrencyMiddleware
+    from core.middleware.dramatiq_audit_trail import AuditTrailFlushMiddleware
     from core.middleware.dramatiq_realtime import RealtimeJobMiddleware
 
+    # Admission runs first so a deferred message never reports "processing" to realtime listeners.
+    broker.add_middleware(ActorConcurrencyMiddleware())
     broker.add_middleware(RealtimeJobMiddleware())
+    broker.add_middleware(AuditTrailFlushMiddleware())
     broker.add_middleware(DramatiqTracingMiddleware())
+    if bool(getattr(settings, "METRICS_ENABLED", True)):
+        broker.add_middleware(DramatiqMetricsMiddleware())
     if bool(getattr(settings, "DRAMATIQ_RESULTS_ENABLED", True)):
         broker.add_middleware(
             Results(
@@ -170,6 +178,7 @@ def setup() -> RedisBroker:
     from customers import tasks as customer_tasks  # noqa: F401
     from invoices.tasks import document_jobs, download_jobs, import_jobs  # noqa: F401
     from products.tasks import price_list_jobs, product_excel_jobs  # noqa: F401
+    from reports import tasks as report_tasks  # noqa: F401
 
     # `core.signals_calendar` imports `core.tasks.calendar_sync` during `django.setup()`,
     # which can happen before the Redis broker is created above. If that occurs, those
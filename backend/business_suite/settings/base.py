@@ -640,6 +640,7 @@ REST_FRAMEWORK = {
         "products_export_start": "6/minute",
         "products_import_start": "6/minute",
         "products_price_list_print_start": "6/minute",
+        "reports_export_start": "6/minute",
         "invoice_download_async": "10/minute",
         "invoice_import_batch": "4/minute",
         "server_management_openrouter_status": "6/minute",
@@ -842,6 +843,64 @@ if TESTING:
     # Disable cacheops Redis I/O during tests.
     CACHEOPS_ENABLED = False
 
+# Per-user cache namespace state (global flag, user flag, user version) is read with one MGET per
+# request and memoized in a short-TTL in-process L1. Version bumps and enable/disable toggles are
+# broadcast through Redis pub/sub; the TTL bounds staleness when a message is missed.
+CACHE_NAMESPACE_L1_ENABLED = _parse_bool(os.getenv("CACHE_NAMESPACE_L1_ENABLED", "True"))
+CACHE_NAMESPACE_PUBSUB_ENABLED = _parse_bool(os.getenv("CACHE_NAMESPACE_PUBSUB_ENABLED", "True"))
+CACHE_NAMESPACE_L1_TTL_SECONDS = float(os.getenv("CACHE_NAMESPACE_L1_TTL_SECONDS", "5"))
+CACHE_NAMESPACE_L1_MAX_ENTRIES = int(os.getenv("CACHE_NAMESPACE_L1_MAX_ENTRIES", "10000"))
+if TESTING:
+    CACHE_NAMESPACE_L1_ENABLED = False
+
+# In-process (L1) cache for reference catalogs (document types, products, tasks, country codes,
+# holidays, app settings) layered over the Django Redis cache (L2). Invalidation is broadcast
+# through Redis pub/sub; the TTL is only a safety net for missed messages.
+REFERENCE_CATALOG_CACHE_ENABLED = _parse_bool(os.getenv("REFERENCE_CATALOG_CACHE_ENABLED", "True"))
+REFERENCE_CATALOG_PUBSUB_ENABLED = _parse_bool(os.getenv("REFERENCE_CATALOG_PUBSUB_ENABLED", "True"))
+REFERENCE_CATALOG_L1_MAX_BYTES = int(os.getenv("REFERENCE_CATALOG_L1_MAX_BYTES", str(16 * 1024 * 1024)))
+REFERENCE_CATALOG_L1_TTL_SECONDS = int(os.getenv("REFERENCE_CATALOG_L1_TTL_SECONDS", "300"))
+
+# Resumable chunked uploads (document categorization). Upload sessions live in the Django cache;
+# chunks of at least 5 MiB let S3 assemble the final object server-side with UploadPartCopy.
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+CHUNKED_UPLOAD_MAX_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_CHUNK_SIZE", str(32 * 1024 * 1024)))
+CHUNKED_UPLOAD_MAX_FILE_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_FILE_SIZE", str(500 * 1024 * 1024)))
+CHUNKED_UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("CHUNKED_UPLOAD_SESSION_TTL_SECONDS", str(24 * 60 * 60)))
+
+# Content-keyed artifact caches under TMPFILES_FOLDER (PDF conversions, invoice artifacts, report exports) are
+# pruned by the daily clear-cache job once their files are older than this many days; 0 disables pruning.
+ARTIFACT_CACHE_MAX_AGE_DAYS = int(os.getenv("ARTIFACT_CACHE_MAX_AGE_DAYS", "30"))
+# One-off background job outputs under TMPFILES_FOLDER (merged document PDFs) are only kept for download and
+# are pruned by the same job once older than this many hours; 0 disables pruning.
+JOB_OUTPUT_MAX_AGE_HOURS = int(os.getenv("JOB_OUTPUT_MAX_AGE_HOURS", "24"))
+
+# Rendered invoices (DOCX/PDF) are stored under TMPFILES_FOLDER/invoice_artifacts keyed by a hash of the
+# template and merge data, so downloading an unchanged invoice skips MailMerge and LibreOffice.
+INVOICE_ARTIFACT_CACHE_ENABLED = _parse_bool(os.getenv("INVOICE_ARTIFACT_CACHE_ENABLED", "True"))
+if TESTING:
+    INVOICE_ARTIFACT_CACHE_ENABLED = False
+
+# Report Excel exports of closed periods are stored under TMPFILES_FOLDER/report_exports/cache keyed by the
+# report parameters and a fingerprint of the source rows, so repeated exports are served without rebuilding.
+REPORT_EXPORT_CACHE_ENABLED = _parse_bool(os.getenv("REPORT_EXPORT_CACHE_ENABLED", "True"))
+
+# AI usage dashboards read hourly rollups; the compaction task rebuilds this many trailing hours
+# from raw AIRequestUsage rows every hour to repair any missed incremental updates.
+AI_USAGE_ROLLUP_COMPACTION_HOURS = int(os.getenv("AI_USAGE_ROLLUP_COMPACTION_HOURS", "24"))
+
+# Prometheus metrics (/metrics). Each process aggregates fixed-bucket histograms in memory and flushes
+# deltas to Redis every METRICS_FLUSH_INTERVAL_SECONDS so the endpoint reports every web/worker process.
+# Scrapers authenticate with "Authorization: Bearer <METRICS_AUTH_TOKEN>"; staff sessions are also accepted.
+METRICS_ENABLED = _parse_bool(os.getenv("METRICS_ENABLED", "True"))
+METRICS_REDIS_ENABLED = _parse_bool(os.getenv("METRICS_REDIS_ENABLED", "True"))
+METRICS_REDIS_KEY_PREFIX = os.getenv("METRICS_REDIS_KEY_PREFIX", "metrics")
+METRICS_FLUSH_INTERVAL_SECONDS = int(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "10"))
+METRICS_AUTH_TOKEN = os.getenv("METRICS_AUTH_TOKEN", "")
+if TESTING:
+    # Keep metrics process-local during tests (no flusher thread, no Redis I/O).
+    METRICS_REDIS_ENABLED = False
+
 # Content Security Policy support: generate per-request nonces and expose mode
 CSP_ENABLED = _parse_bool(os.getenv("CSP_ENABLED", "False"))
 CSP_MODE = os.getenv("CSP_MODE", "report-only")  # report-only|enforce
@@ -902,6 +961,37 @@ DRAMATIQ_PROCESSES = int(os.getenv("DRAMATIQ_PROCESSES", "1"))
 DRAMATIQ_INVOICE_DOC_QUEUE = os.getenv("DRAMATIQ_INVOICE_DOC_QUEUE", "doc_conversion").strip() or "doc_conversion"
 DRAMATIQ_SCHEDULER_LOCK_KEY = os.getenv("DRAMATIQ_SCHEDULER_LOCK_KEY", "dramatiq:scheduler:lock")
 DRAMATIQ_SCHEDULER_LOCK_TTL_SECONDS = int(os.getenv("DRAMATIQ_SCHEDULER_LOCK_TTL_SECONDS", "30"))
+# Per-task "last fired" watermarks let the scheduler replay fire times missed while it was down.
+DRAMATIQ_SCHEDULER_WATERMARK_KEY = os.getenv("DRAMATIQ_SCHEDULER_WATERMARK_KEY", "dramatiq:scheduler:watermarks")
+DRAMATIQ_SCHEDULER_CATCHUP_SECONDS = int(os.getenv("DRAMATIQ_SCHEDULER_CATCHUP_SECONDS", str(6 * 60 * 60)))
+DRAMATIQ_SCHEDULER_MAX_REPLAYS = int(os.getenv("DRAMATIQ_SCHEDULER_MAX_REPLAYS", "60"))
+# Upper bound of the dispatch delay spreading heavy nightly jobs (backup, cache clear, audit prune).
+DRAMATIQ_SCHEDULER_HEAVY_JITTER_SECONDS = float(os.getenv("DRAMATIQ_SCHEDULER_HEAVY_JITTER_SECONDS", "300"))
+# Worker pools: "name=queue+queue:threads:min_processes:max_processes" entries. min_processes is the pool's
+# reserved floor; the supervisor adds processes up to max_processes while its queues back up.
+DRAMATIQ_WORKER_POOLS = os.getenv(
+    "DRAMATIQ_WORKER_POOLS",
+    "realtime=realtime:4:1:3,default=default:2:1:3,background=scheduled+low:2:1:1,doc_conversion=doc_conversion:1:1:1",
+)
+DRAMATIQ_POOL_SCALE_INTERVAL_SECONDS = float(os.getenv("DRAMATIQ_POOL_SCALE_INTERVAL_SECONDS", "5"))
+DRAMATIQ_POOL_TARGET_WAIT_SECONDS = float(os.getenv("DRAMATIQ_POOL_TARGET_WAIT_SECONDS", "5"))
+DRAMATIQ_POOL_BACKLOG_PER_THREAD = int(os.getenv("DRAMATIQ_POOL_BACKLOG_PER_THREAD", "2"))
+DRAMATIQ_POOL_SCALE_DOWN_COOLDOWN_SECONDS = float(os.getenv("DRAMATIQ_POOL_SCALE_DOWN_COOLDOWN_SECONDS", "60"))
+# Crashed workers are respawned after an exponential backoff (base doubling up to the max). The supervisor exits
+# non-zero once a pool crashes this many times in a row, so the container restart policy takes over.
+DRAMATIQ_POOL_RESPAWN_BACKOFF_SECONDS = float(os.getenv("DRAMATIQ_POOL_RESPAWN_BACKOFF_SECONDS", "1"))
+DRAMATIQ_POOL_RESPAWN_BACKOFF_MAX_SECONDS = float(os.getenv("DRAMATIQ_POOL_RESPAWN_BACKOFF_MAX_SECONDS", "60"))
+DRAMATIQ_POOL_MAX_CONSECUTIVE_CRASHES = int(os.getenv("DRAMATIQ_POOL_MAX_CONSECUTIVE_CRASHES", "5"))
+# "actor_name:limit" entries overriding db_task(max_concurrency=...); a limit of 0 lifts the cap.
+DRAMATIQ_ACTOR_CONCURRENCY_LIMITS = {
+    actor.strip(): int(limit)
+    for actor, _, limit in (
+        entry.rpartition(":") for entry in _parse_list(os.getenv("DRAMATIQ_ACTOR_CONCURRENCY_LIMITS", ""))
+    )
+    if actor.strip() and limit.strip().isdigit()
+}
+DRAMATIQ_ADMISSION_RETRY_DELAY_MS = int(os.getenv("DRAMATIQ_ADMISSION_RETRY_DELAY_MS", "2000"))
+DRAMATIQ_ADMISSION_MAX_DELAY_MS = int(os.getenv("DRAMATIQ_ADMISSION_MAX_DELAY_MS", "30000"))
 
 # Redis Streams controls for replayable SSE/event persistence.
 STREAM_MAXLEN = int(os.getenv("STREAM_MAXLEN", "10000"))
@@ -967,6 +1057,17 @@ DBBACKUP_STORAGE_OPTIONS = {"location": AWS_DBBACKUP_LOCATION}
 
 # Folders to exclude from media backup
 DBBACKUP_EXCLUDE_MEDIA_FODERS = ["tmpfiles"]
+# Media backups are an incremental mirror: a local SQLite manifest (path, size, mtime, sha256) per destination
+# lets the nightly run upload only new or changed files, in parallel, with multipart for large files.
+MEDIA_BACKUP_PREFIX = os.getenv("MEDIA_BACKUP_PREFIX", "media_mirror")
+# The mirror keeps one overwritten copy per file, so every N days the backup also writes a full dated
+# media_YYYYMMDD snapshot. Set 0 only when the backup bucket has object versioning enabled.
+MEDIA_BACKUP_SNAPSHOT_INTERVAL_DAYS = int(os.getenv("MEDIA_BACKUP_SNAPSHOT_INTERVAL_DAYS", "7"))
+MEDIA_MIRROR_STATE_DIR = os.getenv("MEDIA_MIRROR_STATE_DIR", os.path.join(BACKUPS_ROOT, "media_mirror"))
+MEDIA_MIRROR_CONCURRENCY = int(os.getenv("MEDIA_MIRROR_CONCURRENCY", "8"))
+MEDIA_MIRROR_MULTIPART_THRESHOLD = int(os.getenv("MEDIA_MIRROR_MULTIPART_THRESHOLD", str(16 * 1024 * 1024)))
+MEDIA_MIRROR_MULTIPART_CHUNK_SIZE = int(os.getenv("MEDIA_MIRROR_MULTIPART_CHUNK_SIZE", str(16 * 1024 * 1024)))
+MEDIA_MIRROR_PART_CONCURRENCY = int(os.getenv("MEDIA_MIRROR_PART_CONCURRENCY", "4"))
 # Force dbbackup to use a compatible PostgreSQL client wrapper by default.
 # This avoids pg_dump major-version mismatches on developer machines where the
 # database server (e.g., in Docker) is newer than the local Homebrew client.
@@ -985,6 +1086,10 @@ DBBACKUP_CONNECTORS = {
 }
 
 FULL_BACKUP_SCHEDULE = "02:00"
+# Admin-tools backups dump each table in pk-ordered chunks (ADMIN_BACKUP_CHUNK_SIZE rows per JSON member) from
+# ADMIN_BACKUP_DUMP_WORKERS parallel connections sharing one exported PostgreSQL snapshot, streamed into the tar.
+ADMIN_BACKUP_CHUNK_SIZE = int(os.getenv("ADMIN_BACKUP_CHUNK_SIZE", "5000"))
+ADMIN_BACKUP_DUMP_WORKERS = int(os.getenv("ADMIN_BACKUP_DUMP_WORKERS", "4"))
 CLEAR_CACHE_SCHEDULE = ["03:00"]
 
 # Database retention for audit log DB `LogEntry` objects.
@@ -992,6 +1097,14 @@ CLEAR_CACHE_SCHEDULE = ["03:00"]
 AUDITLOG_RETENTION_DAYS = int(os.getenv("AUDITLOG_RETENTION_DAYS", "14"))
 # Daily schedule for audit log pruning (HH:MM 24h). Set to empty string to disable scheduling.
 AUDITLOG_RETENTION_SCHEDULE = os.getenv("AUDITLOG_RETENTION_SCHEDULE", "04:00")
+# CRUD audit entries for LOGGING_MODELS apps are captured in memory, written in bulk after commit to
+# core_audittrailentry (monthly range partitions on PostgreSQL) and expired by dropping old partitions.
+# Set AUDIT_TRAIL_BUFFERED=False to fall back to django-auditlog's synchronous LogEntry writes.
+AUDIT_TRAIL_BUFFERED = _parse_bool(os.getenv("AUDIT_TRAIL_BUFFERED", "True"))
+AUDIT_TRAIL_BATCH_SIZE = int(os.getenv("AUDIT_TRAIL_BATCH_SIZE", "200"))
+AUDIT_TRAIL_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_TRAIL_PARTITION_MONTHS_AHEAD", "2"))
+# Daily schedule (HH:MM 24h) for creating upcoming audit trail partitions; runs even when retention is disabled.
+AUDIT_TRAIL_PARTITION_SCHEDULE = os.getenv("AUDIT_TRAIL_PARTITION_SCHEDULE", "00:30")
 
 # Daily customer reminder notification schedule (GMT+8 project timezone).
 CUSTOMER_NOTIFICATIONS_DAILY_HOUR = int(os.getenv("CUSTOMER_NOTIFICATIONS_DAILY_HOUR", "8"))
@@ -1009,6 +1122,11 @@ LOCAL_SYNC_REMOTE_TOKEN = os.getenv("LOCAL_SYNC_REMOTE_TOKEN", "").strip()
 LOCAL_SYNC_PUSH_LIMIT = int(os.getenv("LOCAL_SYNC_PUSH_LIMIT", "200"))
 LOCAL_SYNC_PULL_LIMIT = int(os.getenv("LOCAL_SYNC_PULL_LIMIT", "200"))
 LOCAL_SYNC_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LOCAL_SYNC_REQUEST_TIMEOUT_SECONDS", "10"))
+# Superseded upserts at or below the lowest cursor acknowledged by active peers are compacted hourly.
+LOCAL_SYNC_COMPACTION_ENABLED = _parse_bool(os.getenv("LOCAL_SYNC_COMPACTION_ENABLED", "True"))
+LOCAL_SYNC_COMPACTION_BATCH_SIZE = int(os.getenv("LOCAL_SYNC_COMPACTION_BATCH_SIZE", "5000"))
+# Peers silent for longer than this no longer hold back compaction.
+LOCAL_SYNC_PEER_STALE_DAYS = int(os.getenv("LOCAL_SYNC_PEER_STALE_DAYS", "30"))
 
 # Conditionally enable the `auditlog` app and its middleware (so the feature can be fully toggled at startup)
 if AUDIT_ENABLED:
@@ -1233,12 +1351,60 @@ LLM_FALLBACK_PROVIDER_ORDER = [
 LLM_FALLBACK_STICKY_SECONDS = int(os.getenv("LLM_FALLBACK_STICKY_SECONDS", "3600"))
 LLM_FALLBACK_STICKY_CACHE_KEY = os.getenv("LLM_FALLBACK_STICKY_CACHE_KEY", "ai:router:sticky_provider")
 
+# Shared per-route health registry (core.services.ai_route_health): rolling latency/error counters,
+# circuit breakers and per-provider rate limits, stored in the default cache so every process agrees.
+AI_ROUTER_HEALTH_ENABLED = _parse_bool(os.getenv("AI_ROUTER_HEALTH_ENABLED", "True"))
+AI_ROUTER_HEALTH_WINDOW_SECONDS = int(os.getenv("AI_ROUTER_HEALTH_WINDOW_SECONDS", "300"))
+AI_ROUTER_HEALTH_SLICE_SECONDS = int(os.getenv("AI_ROUTER_HEALTH_SLICE_SECONDS", "60"))
+AI_ROUTER_MIN_SAMPLES = int(os.getenv("AI_ROUTER_MIN_SAMPLES", "5"))
+AI_ROUTER_PREFER_FASTEST = _parse_bool(os.getenv("AI_ROUTER_PREFER_FASTEST", "True"))
+AI_ROUTER_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("AI_ROUTER_CIRCUIT_FAILURE_THRESHOLD", "5"))
+AI_ROUTER_CIRCUIT_ERROR_RATE = float(os.getenv("AI_ROUTER_CIRCUIT_ERROR_RATE", "0.5"))
+AI_ROUTER_CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("AI_ROUTER_CIRCUIT_COOLDOWN_SECONDS", "30"))
+# "provider:requests_per_second:burst" entries, e.g. "openrouter:5:20,groq:1:5".
+AI_ROUTER_PROVIDER_RATE_LIMITS = {
+    parts[0].strip().lower(): (float(parts[1]), int(parts[2]))
+    for parts in (entry.split(":") for entry in _parse_list(os.getenv("AI_ROUTER_PROVIDER_RATE_LIMITS", "")))
+    if len(parts) == 3
+}
+# Hedging starts the next fallback route once the current one outlives its p95 latency.
+AI_ROUTER_HEDGE_ENABLED = _parse_bool(os.getenv("AI_ROUTER_HEDGE_ENABLED", "False"))
+AI_ROUTER_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("AI_ROUTER_HEDGE_MIN_DELAY_SECONDS", "1.0"))
+AI_ROUTER_HEDGE_MAX_WORKERS = int(os.getenv("AI_ROUTER_HEDGE_MAX_WORKERS", "8"))
+
+# Cluster-wide AI admission control (core.services.ai_rate_limiter), shared by web and worker processes.
+# "provider[/model]:requests_per_minute:tokens_per_minute:max_concurrency" entries; 0 disables a dimension and
+# a provider/model entry overrides its provider entry, e.g. "openrouter:60:200000:8,groq/llama-3.3-70b:30:0:2".
+AI_RATE_LIMIT_ENABLED = _parse_bool(os.getenv("AI_RATE_LIMIT_ENABLED", "True"))
+AI_RATE_LIMITS = {
+    parts[0].strip(): (int(parts[1]), int(parts[2]), int(parts[3]))
+    for parts in (entry.rsplit(":", 3) for entry in _parse_list(os.getenv("AI_RATE_LIMITS", "")))
+    if len(parts) == 4
+}
+# Share of each window and number of concurrency slots only interactive (web request) callers may use.
+AI_RATE_LIMIT_BATCH_RESERVE = float(os.getenv("AI_RATE_LIMIT_BATCH_RESERVE", "0.2"))
+AI_RATE_LIMIT_INTERACTIVE_SLOTS = int(os.getenv("AI_RATE_LIMIT_INTERACTIVE_SLOTS", "1"))
+AI_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS = float(os.getenv("AI_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS", "15"))
+AI_RATE_LIMIT_BATCH_MAX_WAIT_SECONDS = float(os.getenv("AI_RATE_LIMIT_BATCH_MAX_WAIT_SECONDS", "60"))
+# Unset keeps the provider SDK default (2 internal retries with blocking backoff).
+_ai_provider_sdk_max_retries = (os.getenv("AI_PROVIDER_SDK_MAX_RETRIES") or "").strip()
+AI_PROVIDER_SDK_MAX_RETRIES = int(_ai_provider_sdk_max_retries) if _ai_provider_sdk_max_retries else None
+
 # Provider timeout defaults in seconds.
 OPENROUTER_TIMEOUT = float(os.getenv("OPENROUTER_TIMEOUT", "120.0"))
 OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "120.0"))
 GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "120.0"))
 # Per-request timeout (seconds) for document categorization AI calls.
 DOCUMENT_CATEGORIZATION_TIMEOUT = float(os.getenv("DOCUMENT_CATEGORIZATION_TIMEOUT", "30"))
+# Bulk categorization packs up to this many queued files of a job into one vision request (1 disables batching).
+# Only files up to the byte limit are batched, as thumbnails of at most IMAGE_MAX_SIDE pixels; batch answers below
+# MIN_CONFIDENCE (or without a match) are redone with the regular single-file two-pass call.
+DOCUMENT_CATEGORIZATION_BATCH_SIZE = int(os.getenv("DOCUMENT_CATEGORIZATION_BATCH_SIZE", "4"))
+DOCUMENT_CATEGORIZATION_BATCH_MAX_FILE_BYTES = int(
+    os.getenv("DOCUMENT_CATEGORIZATION_BATCH_MAX_FILE_BYTES", str(4 * 1024 * 1024))
+)
+DOCUMENT_CATEGORIZATION_BATCH_IMAGE_MAX_SIDE = int(os.getenv("DOCUMENT_CATEGORIZATION_BATCH_IMAGE_MAX_SIDE", "1024"))
+DOCUMENT_CATEGORIZATION_BATCH_MIN_CONFIDENCE = float(os.getenv("DOCUMENT_CATEGORIZATION_BATCH_MIN_CONFIDENCE", "0.8"))
 # Per-request timeout (seconds) for document validation AI calls.
 DOCUMENT_VALIDATION_TIMEOUT = float(os.getenv("DOCUMENT_VALIDATION_TIMEOUT", "30"))
 
@@ -2,9 +2,10 @@
 URL configuration for business_suite project.
 
 All legacy Django template views have been removed. Only the DRF API, Django admin,
-and auth (login/logout) routes remain.
+auth (login/logout) and the Prometheus /metrics routes remain.
 """
 
+from core.views_metrics import prometheus_metrics
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
@@ -14,6 +15,8 @@ from django.views.generic import RedirectView
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("nested_admin/", include("nested_admin.urls")),
+    # Prometheus scrape endpoint (bearer token or staff session)
+    path("metrics", prometheus_metrics, name="metrics"),
     # Login / logout for Django admin access
     path("", include("landing.urls")),
     # Root redirects to admin
@@ -7,14 +7,18 @@ This module provides utilities for collecting and tracking cache metrics:
 - Cache operation counts
 
 Metrics can be integrated with Django metrics frameworks or exported for
-monitoring systems like Prometheus, Datadog, etc.
+monitoring systems like Prometheus, Datadog, etc. Every event is also fed into
+the shared registry in core.telemetry.metrics (served on /metrics), so only
+running sums and counts are kept here - never raw latency samples.
 """
 
 import logging
 import time
 from collections import defaultdict
 from contextlib import contextmanager
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from core.telemetry.metrics import cacheops_events_total, cacheops_operation_duration_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -48,11 +52,12 @@ class CacheMetrics:
         # Per-user metrics
         self._user_hits: Dict[int, int] = defaultdict(int)
         self._user_misses: Dict[int, int] = defaultdict(int)
-        self._user_latencies: Dict[int, list] = defaultdict(list)
+        # Latency aggregates are [total_ms, samples] pairs so memory stays bounded
+        self._user_latencies: Dict[int, List[float]] = defaultdict(lambda: [0.0, 0])
         
         # Global metrics
         self._operation_counts: Dict[str, int] = defaultdict(int)
-        self._operation_latencies: Dict[str, list] = defaultdict(list)
+        self._operation_latencies: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
         
         # Error tracking
         self._error_counts: Dict[str, int] = defaultdict(int)
@@ -71,6 +76,7 @@ class CacheMetrics:
             self._user_hits[user_id] += 1
         
         self._operation_counts['cache_hit'] += 1
+        cacheops_events_total.inc(event='cache_hit')
         
         logger.debug(f"Metric recorded - operation=cache_hit, user_id={user_id}")
     
@@ -88,6 +94,7 @@ class CacheMetrics:
             self._user_misses[user_id] += 1
         
         self._operation_counts['cache_miss'] += 1
+        cacheops_events_total.inc(event='cache_miss')
         
         logger.debug(f"Metric recorded - operation=cache_miss, user_id={user_id}")
     
@@ -102,6 +109,7 @@ class CacheMetrics:
             >>> metrics.record_invalidation(user_id=123)
         """
         self._operation_counts['invalidation'] += 1
+        cacheops_events_total.inc(event='invalidation')
         
         logger.debug(f"Metric recorded - operation=invalidation, user_id={user_id}")
     
@@ -116,6 +124,7 @@ class CacheMetrics:
             >>> metrics.record_error('connection')
         """
         self._error_counts[error_type] += 1
+        cacheops_events_total.inc(event='error')
         
         logger.debug(f"Metric recorded - operation=error, error_type={error_type}")
     
@@ -144,16 +153,28 @@ class CacheMetrics:
             latency_ms = (time.time() - start_time) * 1000  # Convert to milliseconds
             
             # Record latency
-            self._operation_latencies[operation].append(latency_ms)
+            self._add_latency(self._operation_latencies[operation], latency_ms)
+            cacheops_operation_duration_seconds.observe(latency_ms / 1000, operation=operation)
             
             if user_id is not None:
-                self._user_latencies[user_id].append(latency_ms)
+                self._add_latency(self._user_latencies[user_id], latency_ms)
             
             logger.debug(
                 f"Metric recorded - operation=latency, type={operation}, "
                 f"user_id={user_id}, latency_ms={latency_ms:.2f}"
             )
     
+    @staticmethod
+    def _add_latency(aggregate: List[float], latency_ms: float) -> None:
+        aggregate[0] += latency_ms
+        aggregate[1] += 1
+    
+    @staticmethod
+    def _average_latency(aggregate: Optional[List[float]]) -> float:
+        if not aggregate or not aggregate[1]:
+            return 0.0
+        return aggregate[0] / aggregate[1]
+    
     def get_user_stats(self, user_id: int) -> Dict[str, float]:
         """
         Get cache statistics for a specific user.
@@ -179,8 +200,7 @@ class CacheMetrics:
         
         hit_rate = hits / total if total > 0 else 0.0
         
-        latencies = self._user_latencies.get(user_id, [])
-        avg_latency = sum(latencies) / len(latencies) if latencies else 0.0
+        avg_latency = self._average_latency(self._user_latencies.get(user_id))
         
         return {
             'hit_rate': hit_rate,
@@ -207,8 +227,8 @@ class CacheMetrics:
         """
         # Calculate average latencies per operation
         avg_latencies = {}
-        for operation, latencies in self._operation_latencies.items():
-            avg_latencies[operation] = sum(latencies) / len(latencies) if latencies else 0.0
+        for operation, aggregate in self._operation_latencies.items():
+            avg_latencies[operation] = self._average_latency(aggregate)
         
         # Count unique users
         unique_users = set(self._user_hits.keys()) | set(self._user_misses.keys())
@@ -266,9 +286,9 @@ class CacheMetrics:
         # Average latencies
         lines.append("# HELP cache_operation_latency_ms Average operation latency in milliseconds")
         lines.append("# TYPE cache_operation_latency_ms gauge")
-        for operation, latencies in self._operation_latencies.items():
-            if latencies:
-                avg = sum(latencies) / len(latencies)
+        for operation, aggregate in self._operation_latencies.items():
+            if aggregate[1]:
+                avg = self._average_latency(aggregate)
                 lines.append(f'cache_operation_latency_ms{{operation="{operation}"}} {avg:.2f}')
         
         # Per-user hit rates
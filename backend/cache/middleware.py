@@ -10,6 +10,11 @@ This middleware intercepts requests to:
 
 The middleware must be positioned after AuthenticationMiddleware in the
 MIDDLEWARE list to ensure request.user is available.
+
+Each request runs inside a namespace request scope (cache.namespace_state), so
+the version and enabled flags are fetched with a single MGET and every later
+namespace lookup in the same request (e.g. from the cacheops wrapper) is served
+from memory.
 """
 
 import logging
@@ -17,6 +22,7 @@ import logging
 from django.utils.deprecation import MiddlewareMixin
 
 from .namespace import namespace_manager
+from .namespace_state import request_scope
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +64,18 @@ class CacheMiddleware(MiddlewareMixin):
                 # Bypass cache
                 pass
     """
+
+    def __call__(self, request):
+        """Run the request inside a namespace request scope (sync path)."""
+        if self.async_mode:
+            return self.__acall__(request)
+        with request_scope():
+            return super().__call__(request)
+
+    async def __acall__(self, request):
+        """Run the request inside a namespace request scope (async path)."""
+        with request_scope():
+            return await super().__acall__(request)
     
     def process_request(self, request):
         """
@@ -81,12 +99,12 @@ class CacheMiddleware(MiddlewareMixin):
             try:
                 user_id = request.user.id
                 
-                # Get user's cache version
-                version = namespace_manager.get_user_version(user_id)
+                # Version and enabled flags in one round trip, memoized for the request
+                state = namespace_manager.get_namespace_state(user_id)
+                version = state.version
                 request.cache_version = version
                 
-                # Get user's cache enabled status
-                enabled = namespace_manager.is_cache_enabled(user_id)
+                enabled = state.enabled
                 request.cache_enabled = enabled
                 
                 logger.debug(
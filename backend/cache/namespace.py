@@ -10,6 +10,8 @@ Key Features:
 - Input validation and sanitization for security
 - Separate namespace prefix to avoid conflicts with existing cache usage
 - Atomic version increments using Redis INCR
+- One MGET per request for the namespace state, memoized per request and in a
+  short-TTL in-process L1 (see cache.namespace_state)
 """
 
 import logging
@@ -19,6 +21,7 @@ from typing import Optional
 from django.core.cache import cache
 
 from cache.metrics import cache_metrics
+from cache.namespace_state import NamespaceState, current_scope, namespace_state_cache
 
 logger = logging.getLogger(__name__)
 
@@ -62,9 +65,87 @@ class NamespaceManager:
     # Validation patterns
     QUERY_HASH_PATTERN = re.compile(r'^[a-f0-9]+$')
     
-    def __init__(self):
+    def __init__(self, state_cache=None):
         """Initialize the namespace manager."""
         self.cache = cache
+        self.state_cache = state_cache if state_cache is not None else namespace_state_cache
+
+    def get_namespace_state(self, user_id: int) -> NamespaceState:
+        """
+        Get the global flag, user flag and user version in one round trip.
+
+        Lookups are served from the active request scope first, then from the
+        in-process L1. On a miss, the three keys are read with a single
+        ``get_many`` (Redis MGET); a missing version is initialized exactly as
+        ``get_user_version`` does. The snapshot is memoized in the request scope
+        and the L1 so the middleware and the cacheops wrapper share it.
+
+        Args:
+            user_id: Positive integer user ID
+
+        Returns:
+            NamespaceState snapshot for the user
+
+        Raises:
+            ValueError: If user_id is not a positive integer
+
+        Example:
+            >>> ns = NamespaceManager()
+            >>> state = ns.get_namespace_state(123)
+            >>> state.version, state.enabled  # (5, True)
+        """
+        self._validate_user_id(user_id)
+
+        state = self._memoized_state(user_id)
+        if state is not None:
+            return state
+
+        generation = self.state_cache.generation
+        version_key = self._get_version_key(user_id)
+        enabled_key = self._get_enabled_key(user_id)
+        try:
+            values = self.cache.get_many([self.GLOBAL_ENABLED_KEY, enabled_key, version_key])
+        except Exception as e:
+            logger.error(
+                f"Cache error - user_id={user_id}, operation=state_get, "
+                f"error={str(e)}",
+                exc_info=True
+            )
+            # Same defaults as the individual getters: version 1, enabled
+            return NamespaceState(user_id=user_id, version=1)
+
+        global_enabled = values.get(self.GLOBAL_ENABLED_KEY)
+        user_enabled = values.get(enabled_key)
+        version = values.get(version_key)
+        if version is None:
+            version = self._read_user_version(user_id)
+
+        state = NamespaceState(
+            user_id=user_id,
+            version=int(version),
+            global_enabled=True if global_enabled is None else bool(global_enabled),
+            user_enabled=True if user_enabled is None else bool(user_enabled),
+        )
+        scope = current_scope()
+        if scope is not None:
+            scope[user_id] = state
+        self.state_cache.store(state, generation)
+
+        logger.debug(
+            f"Cache namespace state loaded - user_id={user_id}, operation=state_get, "
+            f"version={state.version}, enabled={state.enabled}"
+        )
+        return state
+
+    def _memoized_state(self, user_id: int) -> Optional[NamespaceState]:
+        """Return the user's state from the request scope or the L1, without I/O."""
+        scope = current_scope()
+        if scope is not None and user_id in scope:
+            return scope[user_id]
+        state = self.state_cache.get(user_id)
+        if state is not None and scope is not None:
+            scope[user_id] = state
+        return state
     
     def get_user_version(self, user_id: int) -> int:
         """
@@ -89,7 +170,15 @@ class NamespaceManager:
         """
         # Validate user_id
         self._validate_user_id(user_id)
-        
+
+        state = self._memoized_state(user_id)
+        if state is not None:
+            return state.version
+
+        return self._read_user_version(user_id)
+
+    def _read_user_version(self, user_id: int) -> int:
+        """Read (and initialize if missing) the user's version from the cache backend."""
         version_key = self._get_version_key(user_id)
         
         try:
@@ -161,7 +250,7 @@ class NamespaceManager:
             # Measure latency
             with cache_metrics.measure_latency('invalidate', user_id=user_id):
                 # Ensure version exists before incrementing
-                current_version = self.get_user_version(user_id)
+                current_version = self._read_user_version(user_id)
                 
                 # Use incr() for atomic increment
                 # Django's cache.incr() maps to Redis INCR command
@@ -169,6 +258,7 @@ class NamespaceManager:
             
             # Record invalidation metric
             cache_metrics.record_invalidation(user_id=user_id)
+            self.state_cache.invalidate_user(user_id, version=new_version)
             
             logger.info(
                 f"Cache invalidated - user_id={user_id}, operation=invalidate, "
@@ -187,9 +277,10 @@ class NamespaceManager:
             )
             # On error, try to get current version + 1
             try:
-                current = self.get_user_version(user_id)
+                current = self._read_user_version(user_id)
                 new_version = current + 1
                 self.cache.set(version_key, new_version, timeout=None)
+                self.state_cache.invalidate_user(user_id, version=new_version)
                 logger.warning(
                     f"Cache invalidation fallback - user_id={user_id}, "
                     f"operation=invalidate_fallback, old_version={current}, "
@@ -265,7 +356,11 @@ class NamespaceManager:
         """
         # Validate user_id
         self._validate_user_id(user_id)
-        
+
+        state = self._memoized_state(user_id)
+        if state is not None:
+            return state.enabled
+
         if not self.is_global_cache_enabled():
             return False
 
@@ -278,6 +373,10 @@ class NamespaceManager:
         # Validate user_id
         self._validate_user_id(user_id)
 
+        state = self._memoized_state(user_id)
+        if state is not None:
+            return state.user_enabled
+
         enabled_key = self._get_enabled_key(user_id)
 
         try:
@@ -302,6 +401,13 @@ class NamespaceManager:
         """
         Check if caching is enabled globally across the application.
         """
+        scope = current_scope()
+        if scope:
+            return next(iter(scope.values())).global_enabled
+        memoized = self.state_cache.get_global_enabled()
+        if memoized is not None:
+            return memoized
+
         try:
             enabled = self.cache.get(self.GLOBAL_ENABLED_KEY)
             if enabled is None:
@@ -321,6 +427,7 @@ class NamespaceManager:
         """
         try:
             self.cache.set(self.GLOBAL_ENABLED_KEY, enabled, timeout=None)
+            self.state_cache.invalidate_global(global_enabled=enabled)
             logger.info(
                 "Global cache status changed - operation=set_global_enabled, enabled=%s",
                 enabled,
@@ -360,6 +467,7 @@ class NamespaceManager:
         try:
             # Store enabled status (no expiration)
             self.cache.set(enabled_key, enabled, timeout=None)
+            self.state_cache.invalidate_user(user_id, user_enabled=enabled)
             
             logger.info(
                 f"Cache status changed - user_id={user_id}, operation=set_enabled, "
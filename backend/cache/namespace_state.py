@@ -0,0 +1,301 @@
+"""
+Request-scoped and in-process memoization of per-user cache namespace state.
+
+Every authenticated request needs three namespace values: the global enabled flag,
+the per-user enabled flag and the per-user version. Reading them one by one costs
+three Redis round trips in the middleware, and the cacheops wrapper used to read
+them again for every cached query. This module keeps them close to the caller:
+
+- Request scope: ``CacheMiddleware`` opens a scope (a ContextVar holding a dict)
+  around each request. The first lookup for a user fetches all three keys with one
+  MGET and every later lookup in the same request is served from the scope.
+- L1: a small per-process LRU with a short TTL, so back-to-back requests from the
+  same user do not touch Redis at all.
+- Invalidation: writers (version increments, enable/disable toggles) evict their
+  local L1 entries, update the active request scope and publish on
+  ``INVALIDATION_CHANNEL``; every process runs a subscriber thread that evicts the
+  matching entries. The TTL only bounds staleness when a message is missed.
+
+The L1 is disabled when ``TESTING`` is set so tests that write namespace keys
+directly through ``django.core.cache`` keep seeing their writes immediately.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache_namespace:invalidate"
+GLOBAL_INVALIDATION_MESSAGE = "global"
+
+_request_scope: ContextVar[Optional[Dict[int, "NamespaceState"]]] = ContextVar(
+    "cache_namespace_request_scope", default=None
+)
+
+
+@dataclass(frozen=True)
+class NamespaceState:
+    """
+    Snapshot of the namespace values a request needs for one user.
+
+    Attributes:
+        user_id: User the snapshot belongs to
+        version: Current cache version for the user
+        global_enabled: Whether caching is enabled application-wide
+        user_enabled: Whether caching is enabled for the user
+    """
+
+    user_id: int
+    version: int
+    global_enabled: bool = True
+    user_enabled: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is effectively enabled (global and user flag)."""
+        return self.global_enabled and self.user_enabled
+
+
+@contextmanager
+def request_scope() -> Iterator[Dict[int, NamespaceState]]:
+    """
+    Open a request-scoped namespace memo for the duration of the block.
+
+    The scope is a plain dict stored in a ContextVar, so it follows the request
+    across ``sync_to_async`` boundaries and is dropped when the block exits even
+    if the view raised.
+    """
+    scope: Dict[int, NamespaceState] = {}
+    token = _request_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _request_scope.reset(token)
+
+
+def current_scope() -> Optional[Dict[int, NamespaceState]]:
+    """Return the active request scope, or None outside a request."""
+    return _request_scope.get()
+
+
+@dataclass
+class _L1Entry:
+    state: NamespaceState
+    loaded_at: float
+
+
+class NamespaceStateCache:
+    """
+    Per-process LRU of ``NamespaceState`` snapshots with pub/sub invalidation.
+
+    Instances are cheap; the module-level ``namespace_state_cache`` singleton is
+    shared by ``NamespaceManager``. ``l1_enabled`` and ``pubsub_enabled`` override
+    the settings, which the benchmark uses to compare configurations side by side.
+    """
+
+    def __init__(self, l1_enabled: Optional[bool] = None, pubsub_enabled: Optional[bool] = None):
+        self._l1_enabled_override = l1_enabled
+        self._pubsub_enabled_override = pubsub_enabled
+        self._entries: "OrderedDict[int, _L1Entry]" = OrderedDict()
+        # Bumped on every invalidation so loads that raced an invalidation are not stored.
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._listener_pid: Optional[int] = None
+        self._listener_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    def is_enabled(self) -> bool:
+        if self._l1_enabled_override is not None:
+            return self._l1_enabled_override
+        if bool(getattr(settings, "TESTING", False)):
+            return False
+        return bool(getattr(settings, "CACHE_NAMESPACE_L1_ENABLED", True))
+
+    def _pubsub_enabled(self) -> bool:
+        if self._pubsub_enabled_override is not None:
+            return self._pubsub_enabled_override
+        return bool(getattr(settings, "CACHE_NAMESPACE_PUBSUB_ENABLED", True))
+
+    @staticmethod
+    def _ttl() -> float:
+        return float(getattr(settings, "CACHE_NAMESPACE_L1_TTL_SECONDS", 5))
+
+    @staticmethod
+    def _max_entries() -> int:
+        return max(1, int(getattr(settings, "CACHE_NAMESPACE_L1_MAX_ENTRIES", 10000)))
+
+    # ------------------------------------------------------------------
+    # Reads and writes
+    # ------------------------------------------------------------------
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> Optional[NamespaceState]:
+        """Return a fresh L1 snapshot for the user, or None."""
+        if not self.is_enabled():
+            return None
+        self._ensure_listener()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.loaded_at >= self._ttl():
+                self._entries.pop(user_id, None)
+                return None
+            self._entries.move_to_end(user_id)
+            return entry.state
+
+    def get_global_enabled(self) -> Optional[bool]:
+        """Return the global flag from the most recent fresh snapshot, or None."""
+        if not self.is_enabled():
+            return None
+        now = time.monotonic()
+        ttl = self._ttl()
+        with self._lock:
+            for entry in reversed(self._entries.values()):
+                if now - entry.loaded_at < ttl:
+                    return entry.state.global_enabled
+        return None
+
+    def store(self, state: NamespaceState, generation: int) -> None:
+        """Store a snapshot loaded while ``generation`` was current."""
+        if not self.is_enabled():
+            return
+        with self._lock:
+            if generation != self._generation:
+                # An invalidation arrived while the snapshot was being read.
+                return
+            self._entries[state.user_id] = _L1Entry(state=state, loaded_at=time.monotonic())
+            self._entries.move_to_end(state.user_id)
+            while len(self._entries) > self._max_entries():
+                self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def invalidate_user(self, user_id: int, *, version: Optional[int] = None, user_enabled: Optional[bool] = None):
+        """Evict a user locally, update the request scope and notify peers."""
+        self.evict_user(user_id)
+        scope = current_scope()
+        if scope is not None and user_id in scope:
+            changes = {}
+            if version is not None:
+                changes["version"] = int(version)
+            if user_enabled is not None:
+                changes["user_enabled"] = bool(user_enabled)
+            if changes:
+                scope[user_id] = replace(scope[user_id], **changes)
+            else:
+                scope.pop(user_id, None)
+        self._publish(str(user_id))
+
+    def invalidate_global(self, *, global_enabled: Optional[bool] = None) -> None:
+        """Drop every L1 snapshot, update the request scope and notify peers."""
+        self.clear_local()
+        scope = current_scope()
+        if scope is not None:
+            if global_enabled is None:
+                scope.clear()
+            else:
+                for user_id, state in list(scope.items()):
+                    scope[user_id] = replace(state, global_enabled=bool(global_enabled))
+        self._publish(GLOBAL_INVALIDATION_MESSAGE)
+
+    def evict_user(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def handle_invalidation_message(self, data) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="ignore")
+        message = str(data or "").strip()
+        if message == GLOBAL_INVALIDATION_MESSAGE:
+            self.clear_local()
+            return
+        try:
+            self.evict_user(int(message))
+        except ValueError:
+            logger.debug(f"Ignoring namespace invalidation message - operation=l1_invalidate, message={message!r}")
+
+    def _publish(self, message: str) -> None:
+        if not self.is_enabled() or not self._pubsub_enabled():
+            return
+        try:
+            from core.services.redis_client import get_redis_client
+
+            get_redis_client(socket_timeout=1, socket_connect_timeout=1).publish(INVALIDATION_CHANNEL, message)
+        except Exception as e:
+            logger.warning(f"Namespace invalidation publish failed - operation=l1_publish, error={str(e)}")
+
+    # ------------------------------------------------------------------
+    # Pub/sub listener
+    # ------------------------------------------------------------------
+    def _ensure_listener(self) -> None:
+        if not self._pubsub_enabled():
+            return
+        pid = os.getpid()
+        thread = self._listener_thread
+        if self._listener_pid == pid and thread is not None and thread.is_alive():
+            return
+        with self._lock:
+            thread = self._listener_thread
+            if self._listener_pid == pid and thread is not None and thread.is_alive():
+                return
+            if self._listener_pid != pid:
+                # Forked workers inherit the parent's entries but not its subscriber.
+                self._entries.clear()
+            self._listener_pid = pid
+            self._stop_event = threading.Event()
+            self._listener_thread = threading.Thread(
+                target=self._listen,
+                args=(self._stop_event,),
+                name="cache-namespace-invalidation",
+                daemon=True,
+            )
+            self._listener_thread.start()
+
+    def _listen(self, stop_event: threading.Event) -> None:
+        backoff = 1.0
+        while not stop_event.is_set():
+            try:
+                from core.services.redis_client import get_redis_client
+
+                pubsub = get_redis_client(socket_timeout=None).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                backoff = 1.0
+                # Messages published while disconnected are lost: start from an empty L1.
+                self.clear_local()
+                while not stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_invalidation_message(message.get("data"))
+            except Exception as e:
+                logger.debug(f"Namespace invalidation listener disconnected - operation=l1_listen, error={str(e)}")
+                stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def stop_listener(self) -> None:
+        self._stop_event.set()
+
+
+# Singleton instance shared by the namespace manager
+namespace_state_cache = NamespaceStateCache()
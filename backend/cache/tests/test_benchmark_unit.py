@@ -429,3 +429,34 @@ class BenchmarkIntegrationTests(TestCase):
         # Verify both models listed
         self.assertIn("auth.User", output)
         self.assertIn("auth.Permission", output)
+
+
+class BenchmarkNamespaceRoundTripTests(TestCase):
+    """Test the per-request namespace round-trip scenario."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+    
+    def test_request_scope_and_l1_reduce_round_trips(self):
+        """Legacy lookups hit the cache per key; scoped requests use one MGET; a warm L1 uses none."""
+        from core.management.commands.benchmark_cache import Command
+        
+        results = Command()._measure_namespace_round_trips(user_id=321, lookups=3)
+        
+        self.assertEqual(results["request_scoped"], 1)
+        self.assertEqual(results["l1_warm"], 0)
+        self.assertGreater(results["legacy"], results["request_scoped"])
+    
+    def test_round_trips_are_reported(self):
+        """Test that averages per scenario appear in the report."""
+        from core.management.commands.benchmark_cache import BenchmarkMetrics
+        
+        metrics = BenchmarkMetrics()
+        metrics.namespace_round_trips = {"legacy": [15, 17], "request_scoped": [1, 1], "l1_warm": [0, 0]}
+        
+        report = metrics.to_dict()
+        self.assertEqual(
+            report["namespace_round_trips_per_request"],
+            {"legacy": 16.0, "request_scoped": 1.0, "l1_warm": 0.0},
+        )
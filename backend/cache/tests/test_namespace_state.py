@@ -0,0 +1,180 @@
+"""
+Unit tests for request-scoped and in-process namespace state memoization.
+
+These tests verify that:
+- The namespace state is fetched with one round trip and reused within a request
+- Writes update the active request scope and evict the in-process L1
+- Pub/sub invalidation messages evict the matching L1 entries
+- The middleware opens and closes a request scope around each request
+"""
+
+from unittest.mock import MagicMock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from cache.middleware import CacheMiddleware
+from cache.namespace import NamespaceManager, namespace_manager
+from cache.namespace_state import NamespaceState, NamespaceStateCache, current_scope, request_scope
+
+
+def _counting_manager(l1_enabled=False):
+    """Build a manager whose cache calls are recorded on a wrapping mock."""
+    manager = NamespaceManager(state_cache=NamespaceStateCache(l1_enabled=l1_enabled, pubsub_enabled=False))
+    manager.cache = MagicMock(wraps=cache)
+    return manager
+
+
+class NamespaceRequestScopeTests(TestCase):
+    """Tests for request-scoped namespace state."""
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_state_is_fetched_with_one_mget_per_request(self):
+        """Test that repeated lookups inside a request do not hit the cache again."""
+        manager = _counting_manager()
+        cache.set(manager._get_version_key(7), 4, timeout=None)
+
+        with request_scope():
+            state = manager.get_namespace_state(7)
+            for _ in range(5):
+                self.assertTrue(manager.is_cache_enabled(7))
+                self.assertEqual(manager.get_cache_key_prefix(7), "cache:7:v4:cacheops:")
+
+        self.assertEqual(state, NamespaceState(user_id=7, version=4))
+        self.assertEqual([call[0] for call in manager.cache.method_calls], ["get_many"])
+
+    def test_writes_update_the_active_request_scope(self):
+        """Test that invalidation and toggles inside a request are visible to later lookups."""
+        manager = _counting_manager()
+
+        with request_scope():
+            self.assertEqual(manager.get_namespace_state(8).version, 1)
+            new_version = manager.increment_user_version(8)
+            self.assertEqual(manager.get_user_version(8), new_version)
+
+            manager.set_cache_enabled(8, False)
+            self.assertFalse(manager.is_cache_enabled(8))
+
+            manager.set_global_cache_enabled(False)
+            self.assertFalse(manager.is_global_cache_enabled())
+
+    def test_outside_a_request_lookups_read_the_cache(self):
+        """Test that without a scope or L1 every lookup reflects the cache directly."""
+        manager = _counting_manager()
+        manager.get_namespace_state(9)
+
+        cache.set(manager._get_enabled_key(9), False, timeout=None)
+
+        self.assertIsNone(current_scope())
+        self.assertFalse(manager.is_cache_enabled(9))
+
+
+class NamespaceStateL1Tests(TestCase):
+    """Tests for the in-process L1."""
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_second_request_is_served_from_l1(self):
+        """Test that a warm L1 answers without any cache round trip."""
+        manager = _counting_manager(l1_enabled=True)
+        with request_scope():
+            manager.get_namespace_state(11)
+        manager.cache.reset_mock()
+
+        with request_scope():
+            manager.get_namespace_state(11)
+            manager.get_cache_key_prefix(11)
+
+        self.assertEqual(manager.cache.method_calls, [])
+
+    def test_writes_evict_l1(self):
+        """Test that version increments and toggles are not hidden by the L1."""
+        manager = _counting_manager(l1_enabled=True)
+        manager.get_namespace_state(12)
+
+        manager.increment_user_version(12)
+        self.assertEqual(manager.get_namespace_state(12).version, 2)
+
+        manager.set_cache_enabled(12, False)
+        self.assertFalse(manager.get_namespace_state(12).enabled)
+
+    def test_invalidation_messages_evict_entries(self):
+        """Test that pub/sub messages from other processes evict local entries."""
+        state_cache = NamespaceStateCache(l1_enabled=True, pubsub_enabled=False)
+        state_cache.store(NamespaceState(user_id=1, version=1), state_cache.generation)
+        state_cache.store(NamespaceState(user_id=2, version=1), state_cache.generation)
+
+        state_cache.handle_invalidation_message(b"1")
+        self.assertIsNone(state_cache.get(1))
+        self.assertIsNotNone(state_cache.get(2))
+
+        state_cache.handle_invalidation_message(b"global")
+        self.assertIsNone(state_cache.get(2))
+
+    def test_loads_racing_an_invalidation_are_not_stored(self):
+        """Test that a snapshot read before an invalidation is dropped."""
+        state_cache = NamespaceStateCache(l1_enabled=True, pubsub_enabled=False)
+        generation = state_cache.generation
+        state_cache.handle_invalidation_message("3")
+
+        state_cache.store(NamespaceState(user_id=3, version=1), generation)
+
+        self.assertIsNone(state_cache.get(3))
+
+    @override_settings(CACHE_NAMESPACE_L1_TTL_SECONDS=0)
+    def test_entries_expire_after_ttl(self):
+        """Test that the TTL bounds how long a snapshot is served."""
+        state_cache = NamespaceStateCache(l1_enabled=True, pubsub_enabled=False)
+        state_cache.store(NamespaceState(user_id=4, version=1), state_cache.generation)
+
+        self.assertIsNone(state_cache.get(4))
+
+
+class NamespaceStateSettingsTests(SimpleTestCase):
+    """Tests for L1 configuration."""
+
+    def test_l1_is_disabled_while_testing(self):
+        """Test that the shared L1 stays off under TESTING so tests see direct cache writes."""
+        self.assertFalse(NamespaceStateCache().is_enabled())
+
+
+class CacheMiddlewareRequestScopeTests(TestCase):
+    """Tests for the middleware request scope."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+        User.objects.all().delete()
+
+    def test_middleware_shares_one_state_for_the_whole_request(self):
+        """Test that namespace lookups in the view reuse the middleware's state."""
+        user = User.objects.create_user(username="scope-user", password="testpass123")
+        seen = {}
+
+        def view(request):
+            seen["scope"] = dict(current_scope())
+            seen["enabled"] = namespace_manager.is_cache_enabled(user.id)
+            return HttpResponse("ok")
+
+        request = self.factory.get("/api/test/")
+        request.user = user
+        response = CacheMiddleware(get_response=view)(request)
+
+        self.assertEqual(seen["scope"], {user.id: NamespaceState(user_id=user.id, version=1)})
+        self.assertTrue(seen["enabled"])
+        self.assertEqual(response["X-Cache-Version"], "1")
+        self.assertIsNone(current_scope())
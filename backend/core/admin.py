@@ -6,6 +6,7 @@ KEY_COMPONENTS:
 - RbacMenuRuleAdmin: Module symbol.
 - RbacFieldRuleAdmin: Module symbol.
 - AIRequestUsageAdmin: Module symbol.
+- AuditTrailEntryAdmin: Module symbol.
 
 INTERACTIONS:
 - Depends on: core.models, core.services, Django signal machinery, or middleware hooks as appropriate.
@@ -19,6 +20,7 @@ from django.contrib import admin
 
 from .models.ai_request_usage import AIRequestUsage
 from .models.app_setting import AppSetting
+from .models.audit_trail import AuditTrailEntry
 from .models.calendar_reminder import CalendarReminder
 from .models.country_code import CountryCode
 from .models.holiday import Holiday
@@ -73,3 +75,18 @@ class AIRequestUsageAdmin(admin.ModelAdmin):
     )
     list_filter = ("feature", "provider", "success", "created_at")
     search_fields = ("feature", "model", "request_id")
+
+
+@admin.register(AuditTrailEntry)
+class AuditTrailEntryAdmin(admin.ModelAdmin):
+    list_display = ("timestamp", "action", "content_type", "object_repr", "actor", "remote_addr")
+    list_filter = ("action", "content_type")
+    search_fields = ("object_pk", "object_repr", "actor_email", "cid")
+    date_hierarchy = "timestamp"
+    list_select_related = ("content_type", "actor")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -40,12 +40,15 @@ class CoreConfig(AppConfig):
         import core.signals_app_setting  # noqa: F401
         import core.signals_calendar  # noqa: F401
         import core.signals_calendar_reminder  # noqa: F401
+        import core.signals_reference_catalog  # noqa: F401
         import core.signals_streams  # noqa: F401
         import core.sync_signals  # noqa: F401
 
-        # Register models with django-auditlog automatically for apps listed in LOGGING_MODE
+        # Register models with django-auditlog automatically for apps listed in LOGGING_MODE.
+        # AuditTrailService swaps auditlog's per-save INSERTs for after-commit bulk writes.
         try:
-            from auditlog.registry import auditlog
+            import auditlog.registry  # noqa: F401
+            from core.services.audit_trail_service import AuditTrailService
             from django.apps import apps as django_apps
             from django.conf import settings
 
@@ -58,7 +61,7 @@ class CoreConfig(AppConfig):
                     continue
                 for model in app_config.get_models():
                     try:
-                        auditlog.register(model)
+                        AuditTrailService.register(model)
                     except Exception:
                         # ignore duplicate registrations or missing auditlog
                         continue
@@ -0,0 +1,32 @@
+"""
+FILE_ROLE: Signal emitted after set-based inserts that bypass per-row post_save handlers.
+
+KEY_COMPONENTS:
+- post_bulk_create: Signal sent once per ``bulk_create`` batch with the saved instances.
+- send_post_bulk_create: Module symbol.
+
+INTERACTIONS:
+- Receivers: core.sync_signals (one SyncChangeLog insert per batch) and AuditTrailService (one buffered capture).
+- Senders: services that bulk-create tracked models, such as the invoice importer.
+
+AI_GUIDELINES:
+- Keep this module focused on framework integration and small hook functions.
+- Only send after the rows exist (primary keys populated); receivers must treat ``instances`` as created rows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.dispatch import Signal
+
+# Sent with ``sender=<model class>`` and ``instances=<list of created instances>``.
+post_bulk_create = Signal()
+
+
+def send_post_bulk_create(model, instances: Iterable) -> list:
+    """Notify receivers once for every saved instance in ``instances``; returns the instances that were sent."""
+    created = [instance for instance in instances if getattr(instance, "pk", None) is not None]
+    if created:
+        post_bulk_create.send(sender=model, instances=created)
+    return created
@@ -0,0 +1,100 @@
+"""
+FILE_ROLE: Django management command for the core app.
+
+KEY_COMPONENTS:
+- Command: Benchmarks AIClient construction and fallback-route resolution with and without the compiled runtime snapshot.
+
+INTERACTIONS:
+- Depends on: core.services.ai_client, core.services.ai_runtime_settings_service and core.services.reference_catalog_cache.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Clients are built with a placeholder API key and no completion is requested, so no provider is contacted.
+
+Usage:
+    python manage.py benchmark_ai_runtime
+    python manage.py benchmark_ai_runtime --iterations 500 --report ai_runtime.json
+"""
+
+import json
+import statistics
+import time
+
+from core.services.ai_client import AIClient
+from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
+from core.services.reference_catalog_cache import AI_MODELS, AI_RUNTIME_SETTINGS, reference_catalog_cache
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+_PLACEHOLDER_API_KEY = "benchmark-placeholder-key"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark AIClient construction plus fallback-route resolution: per-lookup settings/catalog reads "
+        "(snapshot bypassed) versus the compiled, in-process AI runtime snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200, help="Timed constructions per mode (default: 200).")
+        parser.add_argument("--report", help="Write the results as JSON to this path.")
+
+    @staticmethod
+    def _construct_and_route() -> int:
+        client = AIClient(api_key=_PLACEHOLDER_API_KEY, feature_name="benchmark")
+        routes = client._fallback_candidates(client.provider_key, client.model)
+        AIRuntimeSettingsService.get_fallback_model_chain()
+        return len(routes)
+
+    def _measure(self, iterations: int, *, bypass: bool) -> dict:
+        timings = []
+        routes = 0
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                if bypass:
+                    with AIRuntimeSettingsService.bypass_snapshot():
+                        routes = self._construct_and_route()
+                else:
+                    routes = self._construct_and_route()
+                timings.append((time.perf_counter() - started) * 1000.0)
+        reset_queries()
+        timings.sort()
+        return {
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+            "queries_per_construction": round(len(queries.captured_queries) / iterations, 2),
+            "routes": routes,
+        }
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+        if not reference_catalog_cache.is_enabled():
+            self.stdout.write(
+                self.style.WARNING("Reference catalog cache is disabled; the snapshot mode rebuilds on every read.")
+            )
+
+        reference_catalog_cache.invalidate(AI_MODELS.name, AI_RUNTIME_SETTINGS.name)
+        self._construct_and_route()  # warm the snapshot and provider SDK imports
+
+        results = {
+            "iterations": iterations,
+            "uncached": self._measure(iterations, bypass=True),
+            "snapshot": self._measure(iterations, bypass=False),
+        }
+        uncached_ms = results["uncached"]["median_ms"]
+        snapshot_ms = results["snapshot"]["median_ms"]
+        results["speedup"] = round(uncached_ms / snapshot_ms, 2) if snapshot_ms else None
+
+        for mode in ("uncached", "snapshot"):
+            row = results[mode]
+            self.stdout.write(
+                f"{mode}: median={row['median_ms']}ms p95={row['p95_ms']}ms "
+                f"queries={row['queries_per_construction']} routes={row['routes']}"
+            )
+        self.stdout.write(f"speedup: x{results['speedup']}")
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['report']}"))
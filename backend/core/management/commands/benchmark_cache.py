@@ -7,6 +7,8 @@ This command provides production-safe cache performance measurement with the fol
 - Measures cache invalidation time (O(1) verification)
 - Measures memory usage per user
 - Measures Redis operation latency
+- Measures per-request Redis round trips for cache namespace lookups
+  (legacy per-key reads vs. request-scoped MGET vs. warm in-process L1)
 - Generates JSON reports with all metrics
 
 Safety Guarantees (Requirement 10.4):
@@ -45,7 +47,8 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import connection, transaction
 from django.db.models import Model, QuerySet
 
-from cache.namespace import namespace_manager
+from cache.namespace import NamespaceManager, namespace_manager
+from cache.namespace_state import NamespaceStateCache, request_scope
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +62,30 @@ MAX_USERS = int(os.getenv("BENCHMARK_MAX_USERS", "1000"))
 MAX_QUERIES_PER_USER = int(os.getenv("BENCHMARK_MAX_QUERIES", "10000"))
 MAX_RECORDS_PER_QUERY = 10  # Limit records fetched per query
 
+# Namespace round-trip scenarios, in report order
+NAMESPACE_SCENARIOS = ("legacy", "request_scoped", "l1_warm")
+
+
+class _CountingCache:
+    """Proxy around the Django cache that counts backend round trips."""
+
+    COUNTED_METHODS = ("get", "get_many", "set", "add", "incr")
+
+    def __init__(self, backend):
+        self._backend = backend
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if name not in self.COUNTED_METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self.round_trips += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
 
 class BenchmarkMetrics:
     """Container for benchmark metrics."""
@@ -71,6 +98,7 @@ class BenchmarkMetrics:
         self.invalidation_times: List[float] = []
         self.redis_operation_times: List[float] = []
         self.memory_usage_per_user: Dict[int, int] = {}
+        self.namespace_round_trips: Dict[str, List[int]] = {name: [] for name in NAMESPACE_SCENARIOS}
         self.errors: List[str] = []
     
     @property
@@ -121,6 +149,14 @@ class BenchmarkMetrics:
             return 0.0
         return (self.total_memory_usage / len(self.memory_usage_per_user)) / 1024
     
+    @property
+    def avg_namespace_round_trips(self) -> Dict[str, float]:
+        """Average cache round trips per request for each namespace scenario."""
+        return {
+            name: (sum(samples) / len(samples) if samples else 0.0)
+            for name, samples in self.namespace_round_trips.items()
+        }
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert metrics to dictionary for JSON serialization."""
         return {
@@ -136,6 +172,9 @@ class BenchmarkMetrics:
             "avg_memory_per_user_kb": round(self.avg_memory_per_user, 2),
             "users_benchmarked": len(self.memory_usage_per_user),
             "total_queries": self.cache_hits + self.cache_misses,
+            "namespace_round_trips_per_request": {
+                name: round(value, 2) for name, value in self.avg_namespace_round_trips.items()
+            },
             "errors": self.errors,
         }
 
@@ -225,6 +264,12 @@ class Command(BaseCommand):
             default=None,
             help="Comma-separated list of models to benchmark (default: all cacheable models)",
         )
+        parser.add_argument(
+            "--namespace-lookups",
+            type=int,
+            default=5,
+            help="Cached queries per simulated request in the namespace round-trip scenario (default: 5)",
+        )
     
     def handle(self, *args, **options):
         """Execute the benchmark command."""
@@ -236,12 +281,15 @@ class Command(BaseCommand):
         report_file = options["report"]
         dry_run = options["dry_run"]
         models_str = options["models"]
+        namespace_lookups = options["namespace_lookups"]
         
         # Validate options with safety limits
         if num_users < 1:
             raise CommandError("--users must be at least 1")
         if num_queries < 1:
             raise CommandError("--queries must be at least 1")
+        if namespace_lookups < 0:
+            raise CommandError("--namespace-lookups must be zero or more")
         
         # Apply safety limits (Requirement 10.4)
         if num_users > MAX_USERS:
@@ -264,6 +312,9 @@ class Command(BaseCommand):
             for model in models_to_benchmark:
                 self.stdout.write(f"  - {model._meta.label}")
             self.stdout.write(f"Would simulate {num_users} users with {num_queries} queries each")
+            self.stdout.write(
+                f"Would measure namespace round trips with {namespace_lookups} cached queries per request"
+            )
             self.stdout.write(f"Safety: Using Redis DB {BENCHMARK_REDIS_DB} (isolated from production)")
             self.stdout.write(f"Safety: All queries limited to {MAX_RECORDS_PER_QUERY} records")
             self.stdout.write(f"Safety: All writes will be rolled back")
@@ -282,7 +333,7 @@ class Command(BaseCommand):
         
         # Run benchmark
         try:
-            metrics = self._run_benchmark(num_users, num_queries, models_to_benchmark)
+            metrics = self._run_benchmark(num_users, num_queries, models_to_benchmark, namespace_lookups)
             
             # Generate report
             report = self._generate_report(metrics, num_users, num_queries, models_to_benchmark)
@@ -378,7 +429,7 @@ class Command(BaseCommand):
             return models
     
     def _run_benchmark(
-        self, num_users: int, num_queries: int, models: List[type]
+        self, num_users: int, num_queries: int, models: List[type], namespace_lookups: int = 5
     ) -> BenchmarkMetrics:
         """
         Run the benchmark with specified parameters.
@@ -387,6 +438,7 @@ class Command(BaseCommand):
             num_users: Number of users to simulate
             num_queries: Number of queries per user
             models: List of models to benchmark
+            namespace_lookups: Cached queries per simulated request (namespace scenario)
             
         Returns:
             BenchmarkMetrics object with collected metrics
@@ -430,6 +482,10 @@ class Command(BaseCommand):
             # Measure invalidation time (O(1) verification)
             invalidation_time = self._measure_invalidation(user.id)
             metrics.invalidation_times.append(invalidation_time)
+
+            # Measure namespace round trips per request (read-only)
+            for name, round_trips in self._measure_namespace_round_trips(user.id, namespace_lookups).items():
+                metrics.namespace_round_trips[name].append(round_trips)
         
         return metrics
     
@@ -559,6 +615,63 @@ class Command(BaseCommand):
         
         return time.time() - start_time
     
+    def _measure_namespace_round_trips(self, user_id: int, lookups: int) -> Dict[str, int]:
+        """
+        Count cache round trips one simulated request spends on namespace state.
+
+        A request reads the version and enabled flags in the middleware, then the
+        cacheops wrapper checks the enabled flag and builds the key prefix twice
+        per cached query. The scenarios run that sequence:
+
+        - legacy: no request scope and no L1 (one backend read per lookup)
+        - request_scoped: inside a request scope (one MGET per request)
+        - l1_warm: second request with the in-process L1 enabled (no I/O)
+
+        Safety: Only reads namespace keys (a missing version key is initialized
+        to 1, as the middleware would do). Pub/sub is disabled for these managers.
+
+        Args:
+            user_id: User ID for namespace
+            lookups: Cached queries per simulated request
+
+        Returns:
+            Round trips per scenario
+        """
+
+        def simulate_request(manager: NamespaceManager, scoped: bool) -> None:
+            if scoped:
+                with request_scope():
+                    manager.get_namespace_state(user_id)
+                    run_lookups(manager)
+            else:
+                manager.get_user_version(user_id)
+                manager.is_cache_enabled(user_id)
+                run_lookups(manager)
+
+        def run_lookups(manager: NamespaceManager) -> None:
+            for _ in range(lookups):
+                manager.is_cache_enabled(user_id)
+                manager.get_cache_key_prefix(user_id)
+                manager.get_cache_key_prefix(user_id)
+
+        results: Dict[str, int] = {}
+        try:
+            for name in NAMESPACE_SCENARIOS:
+                l1_enabled = name == "l1_warm"
+                manager = NamespaceManager(
+                    state_cache=NamespaceStateCache(l1_enabled=l1_enabled, pubsub_enabled=False)
+                )
+                counting_cache = _CountingCache(cache)
+                manager.cache = counting_cache
+                if l1_enabled:
+                    simulate_request(manager, scoped=True)
+                    counting_cache.round_trips = 0
+                simulate_request(manager, scoped=name != "legacy")
+                results[name] = counting_cache.round_trips
+        except Exception as e:
+            logger.warning(f"Namespace round-trip measurement failed: {e}")
+        return results
+
     def _estimate_user_cache_memory(self, user_id: int) -> int:
         """
         Estimate memory usage for a user's cache entries.
@@ -669,6 +782,10 @@ class Command(BaseCommand):
         
         self.stdout.write(f"\nAvg Invalidation Time: {metrics.avg_invalidation_time:.3f} ms (O(1) verification)")
         self.stdout.write(f"Avg Redis Operation Time: {metrics.avg_redis_operation_time:.3f} ms")
+
+        self.stdout.write("\nNamespace Round Trips Per Request:")
+        for name, value in metrics.avg_namespace_round_trips.items():
+            self.stdout.write(f"  {name}: {value:.2f}")
         
         self.stdout.write(f"\nTotal Memory Usage: {metrics.total_memory_usage / 1024:.2f} KB")
         self.stdout.write(f"Avg Memory Per User: {metrics.avg_memory_per_user:.2f} KB")
@@ -0,0 +1,142 @@
+"""
+FILE_ROLE: Django management command for the core app.
+
+KEY_COMPONENTS:
+- Command: Benchmarks the shared, single-decode passport image pipeline against per-stage full decodes.
+
+INTERACTIONS:
+- Depends on: core.services.image_analysis_context, core.services.image_quality_service and core.utils.passport_ocr.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Only the decode/quality/OCR-preprocessing stages are timed; no AI provider or Tesseract call is made.
+
+Usage:
+    python manage.py benchmark_image_analysis
+    python manage.py benchmark_image_analysis path/to/passports/ scan.jpg --repeat 5 --report image_analysis.json
+"""
+
+import json
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from core.services.image_analysis_context import ImageAnalysisContext
+from core.services.image_quality_service import ImageQualityService
+from core.utils import passport_ocr
+from django.core.management.base import BaseCommand, CommandError
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff", ".bmp"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the passport image pipeline (quality gate + OCR quality probe + OCR working image): legacy "
+        "decode per stage versus one shared decode, and check that the verdicts match."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Images or directories; a synthetic 12MP scan is used if empty.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per image (default: 3).")
+        parser.add_argument("--report", help="Write the results as JSON to this path.")
+
+    @staticmethod
+    def _collect_images(paths: list[str]) -> list[Path]:
+        images: list[Path] = []
+        for raw in paths:
+            path = Path(raw)
+            if path.is_dir():
+                images.extend(sorted(p for p in path.rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS))
+            elif path.is_file():
+                images.append(path)
+            else:
+                raise CommandError(f"Not found: {raw}")
+        return images
+
+    @staticmethod
+    def _synthetic_scan(workdir: str) -> Path:
+        """A 4000x3000 phone-photo-like passport page with printed text and a two-line MRZ."""
+        import cv2
+        import numpy as np
+
+        rng = np.random.default_rng(7)
+        image = np.full((3000, 4000, 3), 196, dtype=np.uint8)
+        image = cv2.add(image, rng.integers(0, 18, image.shape, dtype=np.uint8))
+        cv2.rectangle(image, (240, 240), (3760, 2760), (40, 40, 40), 10)
+        for row, text in enumerate(("PASSPORT", "SURNAME: ROSSI", "GIVEN NAMES: MARIO", "NATIONALITY: ITALIANA")):
+            cv2.putText(image, text, (420, 620 + row * 260), cv2.FONT_HERSHEY_SIMPLEX, 4.0, (15, 15, 15), 9)
+        for row, text in enumerate(("P<ITAROSSI<<MARIO<<<<<<<<<<<<<<<<<<<<", "YA1234567ITA850315M300109<<<<<<<<<<<<")):
+            cv2.putText(image, text, (320, 2380 + row * 200), cv2.FONT_HERSHEY_SIMPLEX, 3.0, (5, 5, 5), 7)
+        path = Path(workdir) / "synthetic_passport_12mp.jpg"
+        cv2.imwrite(str(path), image, [cv2.IMWRITE_JPEG_QUALITY, 92])
+        return path
+
+    @staticmethod
+    def _legacy_pipeline(service: ImageQualityService, path: Path, content: bytes):
+        # Before the shared context every stage decoded the upload itself.
+        result = service.evaluate(content)
+        passport_ocr._assess_image_quality(str(path))
+        from PIL import Image
+
+        with Image.open(path) as original:
+            original.convert("RGB").load()
+        return result
+
+    @staticmethod
+    def _shared_pipeline(service: ImageQualityService, path: Path, content: bytes):
+        context = ImageAnalysisContext(content)
+        result = service.evaluate(content, context=context)
+        passport_ocr._assess_image_quality(str(path), context=context)
+        context.rgb_image()
+        return result
+
+    def _time(self, runner, service, path: Path, content: bytes, repeat: int):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = runner(service, path, content)
+            timings.append((time.perf_counter() - started) * 1000.0)
+        return result, round(statistics.median(timings), 2)
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        service = ImageQualityService()
+        results = []
+
+        with tempfile.TemporaryDirectory(prefix="image-analysis-bench-") as workdir:
+            images = self._collect_images(options["paths"]) or [self._synthetic_scan(workdir)]
+            for path in images:
+                content = path.read_bytes()
+                legacy, legacy_ms = self._time(self._legacy_pipeline, service, path, content, repeat)
+                shared, shared_ms = self._time(self._shared_pipeline, service, path, content, repeat)
+                results.append(
+                    {
+                        "image": os.fspath(path),
+                        "size": f"{shared.width}x{shared.height}",
+                        "legacy_ms": legacy_ms,
+                        "shared_ms": shared_ms,
+                        "speedup": round(legacy_ms / shared_ms, 2) if shared_ms else None,
+                        "legacy_verdict": legacy.rejection_code or "ok",
+                        "shared_verdict": shared.rejection_code or "ok",
+                        "verdict_match": legacy.is_good_quality == shared.is_good_quality
+                        and legacy.rejection_code == shared.rejection_code,
+                        "legacy_quality_score": round(legacy.quality_score, 3),
+                        "shared_quality_score": round(shared.quality_score, 3),
+                    }
+                )
+
+        for row in results:
+            self.stdout.write(
+                f"{Path(row['image']).name} ({row['size']}): legacy={row['legacy_ms']}ms shared={row['shared_ms']}ms "
+                f"x{row['speedup']} verdict {row['legacy_verdict']} -> {row['shared_verdict']}"
+            )
+        mismatches = [row for row in results if not row["verdict_match"]]
+        if mismatches:
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} image(s) changed verdict with the shared decode."))
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['report']}"))
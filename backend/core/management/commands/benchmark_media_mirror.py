@@ -0,0 +1,112 @@
+"""
+FILE_ROLE: Django management command for the core app.
+
+KEY_COMPONENTS:
+- Command: Benchmarks the incremental media mirror against a full sequential re-upload.
+
+INTERACTIONS:
+- Depends on: core.services.media_mirror_service and django-storages (for S3-compatible endpoints).
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Never point the benchmark at production buckets: it writes synthetic files under a throwaway prefix.
+
+Usage:
+    python manage.py benchmark_media_mirror --files 2000 --changed 20
+    python manage.py benchmark_media_mirror --endpoint-url http://localhost:9000 --bucket bench \\
+        --access-key minioadmin --secret-key minioadmin --report mirror.json
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from core.services.media_mirror_service import MediaMirrorService
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark incremental media mirroring (cold run, no-change run, run after N changes) against the "
+        "legacy full sequential upload, using a local directory or an S3-compatible endpoint such as MinIO."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--files", type=int, default=2000, help="Synthetic files to create (default: 2000).")
+        parser.add_argument("--size-kb", type=int, default=64, help="Size of each synthetic file (default: 64).")
+        parser.add_argument("--changed", type=int, default=20, help="Files modified and added before the last run.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Mirror upload workers (default: 8).")
+        parser.add_argument("--endpoint-url", help="S3-compatible endpoint; a local directory is used when omitted.")
+        parser.add_argument("--bucket", default="media-mirror-benchmark", help="Bucket for --endpoint-url runs.")
+        parser.add_argument("--access-key", default=os.getenv("AWS_ACCESS_KEY_ID", ""))
+        parser.add_argument("--secret-key", default=os.getenv("AWS_SECRET_ACCESS_KEY", ""))
+        parser.add_argument("--report", help="Write the results as JSON to this path.")
+
+    def _build_storage(self, options, workdir: Path):
+        if not options["endpoint_url"]:
+            return FileSystemStorage(location=str(workdir / "destination"))
+
+        from storages.backends.s3boto3 import S3Boto3Storage
+
+        return S3Boto3Storage(
+            bucket_name=options["bucket"],
+            endpoint_url=options["endpoint_url"],
+            access_key=options["access_key"],
+            secret_key=options["secret_key"],
+            location=f"media-mirror-benchmark-{int(time.time())}",
+            file_overwrite=True,
+        )
+
+    @staticmethod
+    def _write_files(source: Path, names: list[str], size: int) -> None:
+        for name in names:
+            path = source / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(os.urandom(size))
+
+    def handle(self, *args, **options):
+        file_count = max(1, options["files"])
+        changed = max(0, min(options["changed"], file_count))
+        size = max(1, options["size_kb"]) * 1024
+        workdir = Path(tempfile.mkdtemp(prefix="media-mirror-bench-"))
+        source = workdir / "source"
+        names = [f"documents/customer_{index // 100:04d}/file_{index:06d}.bin" for index in range(file_count)]
+        results: dict[str, dict] = {}
+
+        try:
+            self._write_files(source, names, size)
+            storage = self._build_storage(options, workdir)
+
+            started = time.monotonic()
+            for name in names:
+                with (source / name).open("rb") as handle:
+                    storage.save(f"legacy/{name}", File(handle))
+            results["legacy_full_upload"] = {"uploaded": file_count, "seconds": round(time.monotonic() - started, 3)}
+
+            service = MediaMirrorService(
+                storage,
+                prefix="mirror",
+                source_root=source,
+                concurrency=options["concurrency"],
+                manifest_path=str(workdir / "manifest.sqlite3"),
+            )
+            results["mirror_cold"] = service.run().as_dict()
+            results["mirror_no_changes"] = service.run().as_dict()
+
+            self._write_files(source, names[:changed], size)
+            self._write_files(source, [f"documents/new/file_{index:06d}.bin" for index in range(changed)], size)
+            results["mirror_after_changes"] = service.run().as_dict()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        for label, values in results.items():
+            self.stdout.write(f"{label:>22}: uploaded={values.get('uploaded')} seconds={values.get('seconds')}")
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8") as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['report']}"))
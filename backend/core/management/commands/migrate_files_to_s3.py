@@ -12,11 +12,11 @@ AI_GUIDELINES:
 - Keep migrations schema-only and reversible; do not add runtime business logic here.
 """
 
-import shutil
 import tempfile
 from pathlib import Path
 
 from core.models import DocumentOCRJob, OCRJob
+from core.services.media_mirror_service import build_mirror_destination, file_sha256
 from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import SuspiciousFileOperation
@@ -104,6 +104,14 @@ class Command(BaseCommand):
         self.stdout.write(f"Including extra directories: {', '.join(extra_dirs) if extra_dirs else '(none)'}")
         self.stdout.write(f"Error log file: {error_log_path}")
 
+        # One paginated listing instead of a HEAD request per key.
+        destination = build_mirror_destination(default_storage, "")
+        try:
+            destination_objects = destination.list_objects()
+        except Exception as exc:
+            raise CommandError(f"Could not list destination storage: {exc}") from exc
+        self.stdout.write(f"Destination already holds {len(destination_objects)} object(s).")
+
         def _record_error(message: str):
             counters["errors"] += 1
             self.stderr.write(message)
@@ -146,13 +154,7 @@ class Command(BaseCommand):
                 counters["missing_local"] += 1
                 return False
 
-            try:
-                object_exists = default_storage.exists(storage_key)
-            except Exception as exc:
-                _record_error(f"[ERROR] Could not check destination object for {storage_key}: {exc}")
-                return False
-
-            if object_exists:
+            if destination_objects.get(storage_key) == local_file.stat().st_size:
                 counters["already_present"] += 1
                 path_mappings[storage_key] = storage_key
                 return True
@@ -164,8 +166,7 @@ class Command(BaseCommand):
                 return True
 
             try:
-                with local_file.open("rb") as source_handle, default_storage.open(storage_key, "wb") as target_handle:
-                    shutil.copyfileobj(source_handle, target_handle, length=1024 * 1024)
+                destination.upload(str(local_file), storage_key, sha256=file_sha256(str(local_file)))
             except Exception as exc:
                 _record_error(f"[ERROR] Failed to upload {storage_key}: {exc}")
                 return False
@@ -0,0 +1,56 @@
+"""
+FILE_ROLE: Django management command for the core app.
+
+KEY_COMPONENTS:
+- Command: Reconciles hourly AI usage rollups with the raw AIRequestUsage rows.
+
+INTERACTIONS:
+- Depends on: core.services.ai_usage_rollup_service.AIUsageRollupService.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- A full rebuild rewrites every bucket in one transaction; prefer --days for routine repairs on large tables.
+"""
+
+from datetime import datetime, timedelta
+
+from core.services.ai_usage_rollup_service import AIUsageRollupService
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Rebuild hourly AI usage rollups from raw AI request usage rows (all history unless limited)."
+
+    def add_arguments(self, parser):
+        window = parser.add_mutually_exclusive_group()
+        window.add_argument(
+            "--days",
+            type=int,
+            help="Only rebuild buckets from the last N days.",
+        )
+        window.add_argument(
+            "--since",
+            help="Only rebuild buckets from this date (YYYY-MM-DD, local time) onwards.",
+        )
+
+    def handle(self, *args, **options):
+        start = None
+        if options["days"] is not None:
+            if options["days"] <= 0:
+                raise CommandError("--days must be a positive integer.")
+            start = timezone.now() - timedelta(days=options["days"])
+        elif options["since"]:
+            try:
+                start = timezone.make_aware(datetime.strptime(options["since"], "%Y-%m-%d"))
+            except ValueError as exc:
+                raise CommandError("--since must use the YYYY-MM-DD format.") from exc
+
+        result = AIUsageRollupService.rebuild(start=start)
+        scope = f"since {start:%Y-%m-%d %H:00}" if start else "for all history"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {result['buckets']} AI usage rollup bucket(s) {scope} "
+                f"(replaced {result['replaced']})."
+            )
+        )
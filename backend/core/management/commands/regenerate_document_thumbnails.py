@@ -0,0 +1,110 @@
+"""
+FILE_ROLE: Django management command for the core app.
+
+KEY_COMPONENTS:
+- Command: Backfills or regenerates document thumbnails with bounded concurrency.
+
+INTERACTIONS:
+- Depends on: customer_applications.models.Document and customer_applications.services.thumbnail_service.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Keep concurrency bounded: every worker thread holds a database connection and a decoded image in memory.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from customer_applications.models import Document
+from customer_applications.services.thumbnail_service import DocumentThumbnailService
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate missing or failed document thumbnails (or regenerate all with --all), either inline "
+        "with bounded concurrency or by queueing them for the thumbnail worker with --enqueue."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate every document with a file, including ones that already have a thumbnail.",
+        )
+        parser.add_argument(
+            "--application-id",
+            type=int,
+            action="append",
+            dest="application_ids",
+            help="Limit to documents of this application (repeatable).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=2,
+            help="Parallel render workers when running inline (default: 2).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=25,
+            help="Documents handled per worker batch (default: 25).",
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Mark documents pending and let the Dramatiq thumbnail worker render them.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many documents would be processed.",
+        )
+
+    def handle(self, *args, **options):
+        regenerate_all = bool(options["all"])
+        concurrency = max(1, int(options["concurrency"] or 1))
+        batch_size = max(1, int(options["batch_size"] or 25))
+
+        queryset = Document.objects.exclude(file="")
+        if options["application_ids"]:
+            queryset = queryset.filter(doc_application_id__in=options["application_ids"])
+        if not regenerate_all:
+            queryset = queryset.exclude(thumbnail_status=Document.THUMBNAIL_READY, thumbnail__gt="")
+        document_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+
+        if options["dry_run"]:
+            self.stdout.write(f"[DRY RUN] Would process {len(document_ids)} document thumbnail(s).")
+            return
+
+        service = DocumentThumbnailService()
+        if options["enqueue"]:
+            Document.objects.filter(pk__in=document_ids).update(thumbnail_status=Document.THUMBNAIL_PENDING)
+            if document_ids:
+                service.dispatch_pending()
+            self.stdout.write(self.style.SUCCESS(f"Queued {len(document_ids)} document thumbnail(s)."))
+            return
+
+        batches = [document_ids[index : index + batch_size] for index in range(0, len(document_ids), batch_size)]
+
+        def _run_batch(batch: list[int]) -> dict[str, int]:
+            try:
+                return service.generate_for_documents(batch, force=regenerate_all)
+            finally:
+                connections.close_all()
+
+        totals: dict[str, int] = {}
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="thumbnails") as executor:
+            for counts in executor.map(_run_batch, batches):
+                for outcome, count in counts.items():
+                    totals[outcome] = totals.get(outcome, 0) + count
+                processed = sum(totals.values())
+                self.stdout.write(f"Processed {processed}/{len(document_ids)} document thumbnail(s)...")
+
+        details = ", ".join(f"{outcome}={count}" for outcome, count in sorted(totals.items())) or "nothing to do"
+        summary = f"Thumbnail regeneration summary: {details}"
+        if totals.get("failed"):
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,224 @@
+"""
+FILE_ROLE: Django management command for the core app.
+
+KEY_COMPONENTS:
+- PoolProcess: Module symbol.
+- Command: Supervises queue-isolated Dramatiq worker pools and scales them between floor and ceiling.
+  Crashed workers are respawned with exponential backoff; repeated crashes stop the supervisor non-zero.
+
+INTERACTIONS:
+- Depends on: core.services.worker_pools for pool layout, queue stats and the scaling policy, and
+  core.telemetry.metrics for the queue depth / head age / pool size gauges.
+- Used by: scripts/run_dramatiq_workers.sh.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Worker processes run the stock `dramatiq` CLI; this command only starts, restarts and stops them.
+- The heartbeat file is only touched while every pool has its floor processes alive, so the container
+  healthcheck sees a crash-looping pool.
+"""
+
+from __future__ import annotations
+
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.services.logger_service import Logger
+from core.services.redis_client import get_redis_client
+from core.services.worker_pools import (
+    PoolScaler,
+    WorkerPool,
+    load_worker_pools,
+    queue_concurrency_bounds,
+    read_queue_stats,
+)
+from core.telemetry.metrics import (
+    dramatiq_pool_processes,
+    dramatiq_queue_depth,
+    dramatiq_queue_oldest_message_age_seconds,
+)
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from redis.exceptions import RedisError
+
+logger = Logger.get_logger(__name__)
+
+HEARTBEAT_PATH = Path("/tmp/dramatiq_heartbeat")
+SHUTDOWN_GRACE_SECONDS = 60
+# A worker that stayed up this long before exiting starts a fresh run of consecutive crashes.
+STABLE_RUN_SECONDS = 60
+
+
+@dataclass
+class PoolProcess:
+    pool: WorkerPool
+    process: subprocess.Popen
+    started_at: float = 0.0
+
+
+class Command(BaseCommand):
+    help = "Run queue-isolated Dramatiq worker pools and scale them from queue depth and wait time."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dramatiq-bin",
+            type=str,
+            default=str(getattr(settings, "DRAMATIQ_BIN", "dramatiq") or "dramatiq"),
+        )
+        parser.add_argument(
+            "--interval-seconds",
+            type=float,
+            default=float(getattr(settings, "DRAMATIQ_POOL_SCALE_INTERVAL_SECONDS", 5)),
+            help="How often queue stats are sampled and pools are resized.",
+        )
+
+    def handle(self, *args, **options):
+        self._dramatiq_bin = str(options["dramatiq_bin"])
+        interval_seconds = max(1.0, float(options["interval_seconds"]))
+        pools = load_worker_pools()
+        self._init_supervision(pools)
+        scaler = PoolScaler(
+            target_wait_seconds=float(getattr(settings, "DRAMATIQ_POOL_TARGET_WAIT_SECONDS", 5)),
+            backlog_per_thread=int(getattr(settings, "DRAMATIQ_POOL_BACKLOG_PER_THREAD", 2)),
+            scale_down_cooldown_seconds=float(getattr(settings, "DRAMATIQ_POOL_SCALE_DOWN_COOLDOWN_SECONDS", 60)),
+        )
+        queues = sorted({queue for pool in pools for queue in pool.queues})
+
+        self._stop_event = threading.Event()
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        for queue, (floor, ceiling) in sorted(queue_concurrency_bounds(pools).items()):
+            logger.info("Queue %s: reserved threads=%s burst ceiling=%s", queue, floor, ceiling)
+
+        running: dict[str, list[PoolProcess]] = {pool.name: [] for pool in pools}
+        redis_client = get_redis_client(socket_timeout=5, socket_connect_timeout=5)
+        try:
+            while not self._stop_event.is_set():
+                self._reap(running, now=time.monotonic())
+
+                stats = None
+                try:
+                    stats = read_queue_stats(redis_client, queues, now=time.time())
+                except RedisError as exc:
+                    logger.warning("Queue stats unavailable, keeping pool sizes: %s", exc)
+                if stats is not None:
+                    for queue_stats in stats.values():
+                        dramatiq_queue_depth.set(queue_stats.depth, queue=queue_stats.queue)
+                        dramatiq_queue_oldest_message_age_seconds.set(
+                            queue_stats.oldest_age_seconds, queue=queue_stats.queue
+                        )
+
+                for pool in pools:
+                    current = len(running[pool.name])
+                    desired = pool.min_processes
+                    if pool.scalable and stats is not None:
+                        desired = scaler.desired_processes(pool, current, stats, now=time.monotonic())
+                    elif pool.scalable:
+                        desired = max(current, pool.min_processes)
+                    self._resize(pool, running[pool.name], desired, now=time.monotonic())
+                    dramatiq_pool_processes.set(len(running[pool.name]), pool=pool.name)
+
+                if self._floors_alive(pools, running):
+                    self._touch_heartbeat()
+                self._stop_event.wait(interval_seconds)
+        finally:
+            self._shutdown([member for members in running.values() for member in members] + self._retiring)
+        logger.info("Dramatiq worker pools stopped")
+
+    def _init_supervision(self, pools: list[WorkerPool]) -> None:
+        self._retiring: list[PoolProcess] = []
+        self._consecutive_crashes = {pool.name: 0 for pool in pools}
+        self._respawn_at = {pool.name: 0.0 for pool in pools}
+        self._backoff_seconds = max(0.0, float(getattr(settings, "DRAMATIQ_POOL_RESPAWN_BACKOFF_SECONDS", 1)))
+        self._backoff_max_seconds = float(getattr(settings, "DRAMATIQ_POOL_RESPAWN_BACKOFF_MAX_SECONDS", 60))
+        self._max_consecutive_crashes = max(1, int(getattr(settings, "DRAMATIQ_POOL_MAX_CONSECUTIVE_CRASHES", 5)))
+
+    @staticmethod
+    def _floors_alive(pools: list[WorkerPool], running: dict[str, list[PoolProcess]]) -> bool:
+        return all(
+            sum(1 for member in running[pool.name] if member.process.poll() is None) >= pool.min_processes
+            for pool in pools
+        )
+
+    def _touch_heartbeat(self) -> None:
+        # Read by scripts/healthcheck_worker.sh inside the worker container.
+        try:
+            HEARTBEAT_PATH.touch(exist_ok=True)
+        except OSError:
+            pass
+
+    def _spawn(self, pool: WorkerPool) -> PoolProcess:
+        command = [
+            self._dramatiq_bin,
+            "business_suite.dramatiq",
+            "--queues",
+            *pool.queues,
+            "--processes",
+            "1",
+            "--threads",
+            str(pool.threads),
+        ]
+        logger.info("Starting %s worker: %s", pool.name, " ".join(command))
+        return PoolProcess(pool=pool, process=subprocess.Popen(command), started_at=time.monotonic())
+
+    def _resize(self, pool: WorkerPool, members: list[PoolProcess], desired: int, *, now: float) -> None:
+        if len(members) < desired and now < self._respawn_at[pool.name]:
+            # Still backing off after a crash; the heartbeat stays stale while the floor is missing.
+            return
+        while len(members) < desired:
+            members.append(self._spawn(pool))
+        while len(members) > desired:
+            # Newest first; SIGTERM lets Dramatiq finish in-flight messages and requeue prefetched ones.
+            member = members.pop()
+            logger.info("Scaling down %s pool to %s processes (pid %s)", pool.name, desired, member.process.pid)
+            member.process.terminate()
+            self._retiring.append(member)
+
+    def _reap(self, running: dict[str, list[PoolProcess]], *, now: float) -> None:
+        """Forget exited workers and schedule their respawn after an exponential backoff."""
+        self._retiring = [member for member in self._retiring if member.process.poll() is None]
+        for name, members in running.items():
+            for member in list(members):
+                exit_code = member.process.poll()
+                if exit_code is None:
+                    continue
+                members.remove(member)
+                if now - member.started_at >= STABLE_RUN_SECONDS:
+                    self._consecutive_crashes[name] = 0
+                self._consecutive_crashes[name] += 1
+                crashes = self._consecutive_crashes[name]
+                if crashes >= self._max_consecutive_crashes:
+                    raise CommandError(
+                        f"{name} worker pid {member.process.pid} exited with {exit_code}; "
+                        f"{crashes} consecutive crashes, stopping the worker pools."
+                    )
+                delay = min(self._backoff_max_seconds, self._backoff_seconds * 2 ** (crashes - 1))
+                self._respawn_at[name] = max(self._respawn_at[name], now + delay)
+                logger.warning(
+                    "%s worker pid %s exited with %s (crash %s/%s); respawning in %.1fs",
+                    name,
+                    member.process.pid,
+                    exit_code,
+                    crashes,
+                    self._max_consecutive_crashes,
+                    delay,
+                )
+
+    def _shutdown(self, members: list[PoolProcess]) -> None:
+        for member in members:
+            if member.process.poll() is None:
+                member.process.terminate()
+        deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+        for member in members:
+            try:
+                member.process.wait(timeout=max(0.1, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                member.process.kill()
+
+    def _stop(self, signum, frame):
+        self._stop_event.set()
@@ -6,7 +6,7 @@ KEY_COMPONENTS:
 - Command: Module symbol.
 
 INTERACTIONS:
-- Depends on: core app schema/runtime machinery and adjacent services imported by this module.
+- Depends on: core.services.periodic_scheduler for watermark-based dispatch and misfire replay.
 
 AI_GUIDELINES:
 - Keep command logic thin and delegate real work to services when possible.
@@ -16,13 +16,13 @@ AI_GUIDELINES:
 from __future__ import annotations
 
 import signal
-import time
+import threading
 import uuid
 from dataclasses import dataclass
 
 from core.services.logger_service import Logger
+from core.services.periodic_scheduler import PeriodicScheduler
 from core.services.redis_client import get_redis_client
-from core.tasks.runtime import iter_periodic_tasks
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
@@ -30,6 +30,8 @@ from redis.exceptions import RedisError
 
 logger = Logger.get_logger(__name__)
 
+MIN_SLEEP_SECONDS = 0.2
+
 
 @dataclass
 class SchedulerLock:
@@ -42,7 +44,12 @@ class Command(BaseCommand):
     help = "Run periodic task scheduler for Dramatiq actors."
 
     def add_arguments(self, parser):
-        parser.add_argument("--tick-seconds", type=float, default=1.0)
+        parser.add_argument(
+            "--tick-seconds",
+            type=float,
+            default=1.0,
+            help="Poll interval while waiting for scheduler leadership.",
+        )
         parser.add_argument(
             "--lock-key",
             type=str,
@@ -57,41 +64,44 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         from business_suite import dramatiq as _dramatiq  # noqa: F401
 
-        tick_seconds = max(0.2, float(options["tick_seconds"]))
+        tick_seconds = max(MIN_SLEEP_SECONDS, float(options["tick_seconds"]))
         lock = SchedulerLock(
             key=str(options["lock_key"]),
             token=uuid.uuid4().hex,
             ttl_seconds=max(5, int(options["lock_ttl_seconds"])),
         )
+        # The leader sleeps until the next fire time but must wake up in time to refresh its lock.
+        max_sleep_seconds = max(tick_seconds, lock.ttl_seconds / 3)
 
-        self._running = True
+        self._stop_event = threading.Event()
         signal.signal(signal.SIGINT, self._stop)
         signal.signal(signal.SIGTERM, self._stop)
 
         logger.info("Starting Dramatiq scheduler loop")
 
         redis_client = self._new_redis_client()
-        last_minute = None
+        scheduler = PeriodicScheduler(redis_client)
 
-        while self._running:
+        while not self._stop_event.is_set():
             try:
                 if not self._acquire_or_refresh_lock(redis_client, lock):
-                    time.sleep(tick_seconds)
+                    self._stop_event.wait(tick_seconds)
                     continue
 
-                current_time = timezone.localtime(timezone.now()).replace(second=0, microsecond=0)
-                if current_time != last_minute:
-                    self._run_due_tasks(redis_client, now=current_time)
-                    last_minute = current_time
-
-                time.sleep(tick_seconds)
+                next_fire_at = scheduler.tick(timezone.localtime(timezone.now()))
+                sleep_seconds = max_sleep_seconds
+                if next_fire_at is not None:
+                    remaining = (next_fire_at - timezone.localtime(timezone.now())).total_seconds()
+                    sleep_seconds = min(max_sleep_seconds, max(MIN_SLEEP_SECONDS, remaining))
+                self._stop_event.wait(sleep_seconds)
             except RedisError as exc:
                 logger.warning("Scheduler Redis error, retrying: %s", exc)
-                time.sleep(max(1.0, tick_seconds))
+                self._stop_event.wait(max(1.0, tick_seconds))
                 redis_client = self._new_redis_client()
+                scheduler = PeriodicScheduler(redis_client)
             except Exception:
                 logger.exception("Unhandled scheduler loop error")
-                time.sleep(max(1.0, tick_seconds))
+                self._stop_event.wait(max(1.0, tick_seconds))
 
         try:
             self._release_lock(redis_client, lock)
@@ -104,24 +114,6 @@ class Command(BaseCommand):
         # unnecessary exits on transient Redis/network stalls.
         return get_redis_client(socket_timeout=10, socket_connect_timeout=5)
 
-    def _run_due_tasks(self, redis_client, *, now):
-        periodic_tasks = iter_periodic_tasks()
-        if not periodic_tasks:
-            return
-
-        logger.debug("Evaluating %s periodic tasks at %s", len(periodic_tasks), now.isoformat())
-
-        for entry in periodic_tasks:
-            if not entry.schedule.is_due(now):
-                continue
-
-            dedupe_key = f"dramatiq:scheduler:dedupe:{entry.name}:{now.isoformat()}"
-            if not redis_client.set(dedupe_key, "1", nx=True, ex=120):
-                continue
-
-            entry.task.delay()
-            logger.info("Scheduled periodic task %s", entry.name)
-
     def _acquire_or_refresh_lock(self, redis_client, lock: SchedulerLock) -> bool:
         if redis_client.set(lock.key, lock.token, nx=True, ex=lock.ttl_seconds):
             return True
@@ -143,4 +135,4 @@ class Command(BaseCommand):
             redis_client.delete(lock.key)
 
     def _stop(self, signum, frame):
-        self._running = False
+        self._stop_event.set()
@@ -2,23 +2,21 @@
 FILE_ROLE: Django management command for the core app.
 
 KEY_COMPONENTS:
-- Command: Module symbol.
+- Command: Incrementally mirrors MEDIA_ROOT to a prefix of the backup storage.
 
 INTERACTIONS:
-- Depends on: core app schema/runtime machinery and adjacent services imported by this module.
+- Depends on: core.services.media_mirror_service.MediaMirrorService and the "dbbackup" storage.
 
 AI_GUIDELINES:
 - Keep command logic thin and delegate real work to services when possible.
-- Keep migrations schema-only and reversible; do not add runtime business logic here.
+- Only new or changed files are sent; the per-destination manifest lives under MEDIA_MIRROR_STATE_DIR.
 """
 
-import os
-import posixpath
 from pathlib import Path
 
 from core.services.logger_service import Logger
+from core.services.media_mirror_service import MediaMirrorManifest, MediaMirrorService
 from django.conf import settings
-from django.core.files import File
 from django.core.files.storage import storages
 from django.core.management.base import BaseCommand, CommandError
 
@@ -26,13 +24,34 @@ logger = Logger.get_logger(__name__)
 
 
 class Command(BaseCommand):
-    help = "Uploads media files to the configured S3 backup storage."
+    help = "Mirrors media files to the configured S3 backup storage, uploading only new or changed files."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "backup_dir",
             type=str,
-            help="Destination directory under the backup storage location (e.g. media_YYYYMMDD).",
+            help="Destination directory under the backup storage location (e.g. media_mirror).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Parallel upload workers (default: MEDIA_MIRROR_CONCURRENCY).",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Re-hash every file instead of trusting size and mtime recorded in the manifest.",
+        )
+        parser.add_argument(
+            "--snapshot",
+            action="store_true",
+            help="Write a full point-in-time copy to a one-off prefix without keeping a manifest for it.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many files would be uploaded.",
         )
 
     def handle(self, *args, **kwargs):
@@ -44,26 +63,44 @@ class Command(BaseCommand):
         if not media_root.is_dir():
             raise CommandError(f"Media root is not a directory: {media_root}")
 
-        backup_storage = storages["dbbackup"]
-        deleted_count = self._delete_prefix_tree(backup_storage, backup_dir)
-        uploaded_count = self._upload_media_tree(
-            backup_storage,
-            media_root=media_root,
-            destination_prefix=backup_dir,
+        service = MediaMirrorService(
+            storages["dbbackup"],
+            prefix=backup_dir,
+            source_root=media_root,
             exclude_folders=set(getattr(settings, "DBBACKUP_EXCLUDE_MEDIA_FODERS", [])),
+            concurrency=kwargs["concurrency"],
+            manifest_path=MediaMirrorManifest.IN_MEMORY if kwargs["snapshot"] else None,
+        )
+        stats = service.run(
+            dry_run=bool(kwargs["dry_run"]),
+            verify=bool(kwargs["verify"]),
+            on_progress=lambda progress: self.stdout.write(
+                f"Mirrored {progress.uploaded} file(s), {progress.rehashed_unchanged} unchanged after hashing..."
+            ),
         )
 
+        if kwargs["dry_run"]:
+            self.stdout.write(
+                f"[DRY RUN] Would upload {stats.would_upload} of {stats.scanned} media files to '{backup_dir}'."
+            )
+            return
+
         logger.info(
-            "Uploaded %s media files to backup directory '%s' (deleted %s existing files first).",
-            uploaded_count,
+            "Mirrored media to backup directory '%s': uploaded=%s unchanged=%s failed=%s bytes=%s seconds=%s",
             backup_dir,
-            deleted_count,
+            stats.uploaded,
+            stats.unchanged + stats.rehashed_unchanged,
+            stats.failed,
+            stats.bytes_uploaded,
+            stats.seconds,
         )
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"Uploaded {uploaded_count} media files to backup directory '{backup_dir}' (deleted {deleted_count})."
-            )
+        summary = (
+            f"Uploaded {stats.uploaded} of {stats.scanned} media files to backup directory '{backup_dir}' "
+            f"({stats.unchanged + stats.rehashed_unchanged} unchanged, {stats.failed} failed, {stats.seconds}s)."
         )
+        if stats.failed:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
 
     @staticmethod
     def _normalize_prefix(value: str) -> str:
@@ -71,44 +108,3 @@ class Command(BaseCommand):
         if not normalized:
             raise CommandError("backup_dir cannot be empty.")
         return normalized
-
-    def _delete_prefix_tree(self, storage, prefix: str) -> int:
-        deleted_count = 0
-        pending_paths = [prefix]
-
-        while pending_paths:
-            current = pending_paths.pop()
-            try:
-                directories, files = storage.listdir(current)
-            except (FileNotFoundError, NotADirectoryError, OSError):
-                continue
-
-            for file_name in files:
-                storage_path = posixpath.join(current, file_name) if current else file_name
-                storage.delete(storage_path)
-                deleted_count += 1
-
-            for directory_name in directories:
-                storage_path = posixpath.join(current, directory_name) if current else directory_name
-                pending_paths.append(storage_path)
-
-        return deleted_count
-
-    def _upload_media_tree(
-        self, storage, *, media_root: Path, destination_prefix: str, exclude_folders: set[str]
-    ) -> int:
-        file_count = 0
-        for root, dirs, files in os.walk(media_root):
-            dirs[:] = [directory for directory in dirs if directory not in exclude_folders]
-            root_path = Path(root)
-
-            for file_name in files:
-                local_file_path = root_path / file_name
-                relative_path = local_file_path.relative_to(media_root).as_posix()
-                storage_path = posixpath.join(destination_prefix, relative_path)
-
-                with local_file_path.open("rb") as file_handle:
-                    storage.save(storage_path, File(file_handle))
-                file_count += 1
-
-        return file_count
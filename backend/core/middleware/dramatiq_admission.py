@@ -0,0 +1,110 @@
+"""
+FILE_ROLE: Middleware that enforces per-actor concurrency limits in Dramatiq workers.
+
+KEY_COMPONENTS:
+- ActorConcurrencyMiddleware: Leases a cluster-wide slot per message and defers messages over the limit.
+
+INTERACTIONS:
+- Depends on: core.tasks.runtime.actor_concurrency_limit, core.services.distributed_semaphore and
+  core.telemetry.metrics.dramatiq_admission_deferrals_total.
+
+AI_GUIDELINES:
+- Keep this module focused on framework integration and small hook functions.
+- A deferral re-enqueues the same message id with a delay and skips the current delivery; it must never consume
+  one of the message's retries or mark a realtime job as finished.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+
+from core.services.distributed_semaphore import DistributedSemaphore
+from core.services.logger_service import Logger
+from core.tasks.runtime import actor_concurrency_limit, actor_task_policy
+from core.telemetry.metrics import dramatiq_admission_deferrals_total
+from django.conf import settings
+from dramatiq.middleware import Middleware, SkipMessage
+
+logger = Logger.get_logger(__name__)
+
+ADMISSION_DEFERRALS_OPTION = "admission_deferrals"
+
+# Leases outlive the actor time limit by this margin so a killed worker cannot hold a slot forever.
+_LEASE_MARGIN_MS = 30_000
+_DEFAULT_LEASE_MS = 15 * 60 * 1000
+
+
+def admission_delay_ms(deferrals: int) -> int:
+    """Exponential deferral delay with jitter, bounded by DRAMATIQ_ADMISSION_MAX_DELAY_MS."""
+    base_ms = max(100, int(getattr(settings, "DRAMATIQ_ADMISSION_RETRY_DELAY_MS", 2000) or 2000))
+    max_ms = max(base_ms, int(getattr(settings, "DRAMATIQ_ADMISSION_MAX_DELAY_MS", 30_000) or 30_000))
+    delay_ms = min(max_ms, base_ms * 2 ** min(max(0, deferrals - 1), 8))
+    return delay_ms + random.randint(0, base_ms)
+
+
+class ActorConcurrencyMiddleware(Middleware):
+    """Cap concurrent executions of limited actors across every worker process sharing the broker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._semaphores: dict[tuple[str, int], DistributedSemaphore] = {}
+        self._leases: dict[str, tuple[DistributedSemaphore, str]] = {}
+
+    def _semaphore(self, actor_name: str, limit: int) -> DistributedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get((actor_name, limit))
+            if semaphore is None:
+                policy = actor_task_policy(actor_name)
+                time_limit_ms = policy.time_limit_ms if policy is not None and policy.time_limit_ms else None
+                lease_ms = (time_limit_ms or _DEFAULT_LEASE_MS) + _LEASE_MARGIN_MS
+                semaphore = self._semaphores[(actor_name, limit)] = DistributedSemaphore(
+                    f"dramatiq:actor:{actor_name}", limit, lease_seconds=lease_ms / 1000
+                )
+            return semaphore
+
+    @staticmethod
+    def _delivery_key(message) -> str:  # noqa: ANN001
+        options = getattr(message, "options", None) or {}
+        return str(options.get("redis_message_id") or message.message_id)
+
+    def before_process_message(self, broker, message):  # noqa: ANN001
+        limit = actor_concurrency_limit(message.actor_name)
+        if limit is None:
+            return
+        semaphore = self._semaphore(message.actor_name, limit)
+        token = semaphore.acquire()
+        if token is not None:
+            with self._lock:
+                self._leases[self._delivery_key(message)] = (semaphore, token)
+            return
+
+        deferrals = int((message.options or {}).get(ADMISSION_DEFERRALS_OPTION, 0) or 0) + 1
+        delay_ms = admission_delay_ms(deferrals)
+        broker.enqueue(
+            message.copy(options={ADMISSION_DEFERRALS_OPTION: deferrals}),
+            delay=delay_ms,
+        )
+        dramatiq_admission_deferrals_total.inc(queue=message.queue_name, actor=message.actor_name)
+        logger.info(
+            "Deferred actor=%s message_id=%s limit=%s deferrals=%s delay_ms=%s",
+            message.actor_name,
+            message.message_id,
+            limit,
+            deferrals,
+            delay_ms,
+        )
+        raise SkipMessage(f"{message.actor_name} is at its concurrency limit of {limit}")
+
+    def after_process_message(self, broker, message, *, result=None, exception=None):  # noqa: ANN001
+        self._release(message)
+
+    def after_skip_message(self, broker, message):  # noqa: ANN001
+        self._release(message)
+
+    def _release(self, message) -> None:  # noqa: ANN001
+        with self._lock:
+            lease = self._leases.pop(self._delivery_key(message), None)
+        if lease is not None:
+            semaphore, token = lease
+            semaphore.release(token)
@@ -0,0 +1,26 @@
+"""
+FILE_ROLE: Middleware that flushes buffered audit trail entries in Dramatiq workers.
+
+KEY_COMPONENTS:
+- AuditTrailFlushMiddleware: Module symbol.
+
+INTERACTIONS:
+- Depends on: core.services.audit_trail_service.AuditTrailService.
+
+AI_GUIDELINES:
+- Keep this module focused on framework integration and small hook functions.
+- Do not move domain orchestration here when a service already owns the workflow.
+"""
+
+from core.services.audit_trail_service import AuditTrailService
+from dramatiq.middleware import Middleware
+
+
+class AuditTrailFlushMiddleware(Middleware):
+    """Write audit entries buffered by an actor once its message finishes (workers never see request_finished)."""
+
+    def after_process_message(self, broker, message, *, result=None, exception=None):
+        AuditTrailService.flush()
+
+    def after_skip_message(self, broker, message):
+        AuditTrailService.flush()
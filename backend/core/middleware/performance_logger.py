@@ -6,6 +6,7 @@ KEY_COMPONENTS:
 
 INTERACTIONS:
 - Depends on: core.models, core.services, Django signal machinery, or middleware hooks as appropriate.
+- Feeds the http_* families in core.telemetry.metrics (labelled by resolved URL name, never by raw path).
 
 AI_GUIDELINES:
 - Keep this module focused on framework integration and small hook functions.
@@ -16,6 +17,12 @@ import logging
 import time
 
 from core.services.logger_service import Logger
+from core.telemetry.metrics import (
+    QueryCounter,
+    http_request_db_queries,
+    http_request_duration_seconds,
+    http_requests_total,
+)
 from core.telemetry.otlp_exporter import current_unix_nano, trace_exporter
 from django.conf import settings
 from django.db import connection
@@ -37,7 +44,7 @@ class PerformanceLoggingMiddleware:
     def __call__(self, request):
         start_time = time.perf_counter()
         start_unix_nano = current_unix_nano()
-        num_queries_before = len(connection.queries)
+        query_counter = QueryCounter()
         request_path = request.path or "/"
         request_query = request.META.get("QUERY_STRING", "")
         request_host = request.get_host() if hasattr(request, "get_host") else ""
@@ -46,11 +53,12 @@ class PerformanceLoggingMiddleware:
         span_context = self.trace_exporter.start_server_span(request.headers.get("traceparent"))
 
         try:
-            response = self.get_response(request)
+            with connection.execute_wrapper(query_counter):
+                response = self.get_response(request)
         except Exception as exc:
             duration = (time.perf_counter() - start_time) * 1000  # ms
-            num_queries_after = len(connection.queries)
-            num_queries = num_queries_after - num_queries_before
+            num_queries = query_counter.count
+            self._record_metrics(request, status_code=500, duration_ms=duration, num_queries=num_queries)
             self._export_trace_span(
                 request=request,
                 span_context=span_context,
@@ -68,8 +76,8 @@ class PerformanceLoggingMiddleware:
             raise
 
         duration = (time.perf_counter() - start_time) * 1000  # ms
-        num_queries_after = len(connection.queries)
-        num_queries = num_queries_after - num_queries_before
+        num_queries = query_counter.count
+        self._record_metrics(request, status_code=response.status_code, duration_ms=duration, num_queries=num_queries)
 
         logger.info(
             f"{request.method} {request.path} | "
@@ -105,6 +113,8 @@ class PerformanceLoggingMiddleware:
         duration = (time.perf_counter() - start_time) * 1000
         num_queries_after = len(connection.queries)
         num_queries = num_queries_after - num_queries_before
+        # Sync views run on other threads under ASGI, so the query count is not recorded as a metric here.
+        self._record_metrics(request, status_code=response.status_code, duration_ms=duration)
 
         logger.info(
             f"{request.method} {request.path} | "
@@ -118,6 +128,20 @@ class PerformanceLoggingMiddleware:
 
         return response
 
+    @staticmethod
+    def _route_label(request) -> str:
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return "unresolved"
+        return resolver_match.view_name or resolver_match.route or "unresolved"
+
+    def _record_metrics(self, request, *, status_code: int, duration_ms: float, num_queries: int | None = None) -> None:
+        route = self._route_label(request)
+        http_requests_total.inc(route=route, method=request.method, status=status_code)
+        http_request_duration_seconds.observe(duration_ms / 1000, route=route, method=request.method)
+        if num_queries is not None:
+            http_request_db_queries.observe(num_queries, route=route)
+
     def _export_trace_span(
         self,
         *,
@@ -0,0 +1,96 @@
+"""
+FILE_ROLE: Django migration for the core app.
+
+KEY_COMPONENTS:
+- backfill_rollups: Module symbol.
+- Migration: Module symbol.
+
+INTERACTIONS:
+- Depends on: core app schema/runtime machinery and adjacent services imported by this module.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Keep migrations schema-only and reversible; do not add runtime business logic here.
+"""
+
+import datetime
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncHour
+
+
+def backfill_rollups(apps, schema_editor):
+    AIRequestUsage = apps.get_model("core", "AIRequestUsage")
+    AIUsageRollup = apps.get_model("core", "AIUsageRollup")
+
+    rows = (
+        AIRequestUsage.objects.annotate(bucket=TruncHour("created_at", tzinfo=datetime.timezone.utc))
+        .values("bucket", "feature", "provider", "model")
+        .annotate(
+            request_count=Count("id"),
+            success_count=Count("id", filter=Q(success=True)),
+            failed_count=Count("id", filter=Q(success=False)),
+            total_tokens=Coalesce(Sum("total_tokens"), 0),
+            total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
+        )
+        .order_by()
+    )
+    AIUsageRollup.objects.bulk_create(
+        [
+            AIUsageRollup(
+                bucket_start=row["bucket"],
+                feature=row["feature"],
+                provider=row["provider"],
+                model=row["model"],
+                request_count=row["request_count"],
+                success_count=row["success_count"],
+                failed_count=row["failed_count"],
+                total_tokens=row["total_tokens"],
+                total_cost=row["total_cost"],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0037_rbac_menu_seed_admin_roles"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AIUsageRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("bucket_start", models.DateTimeField(db_index=True)),
+                ("feature", models.CharField(max_length=120)),
+                ("provider", models.CharField(max_length=32)),
+                ("model", models.CharField(max_length=160)),
+                ("request_count", models.PositiveIntegerField(default=0)),
+                ("success_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                ("total_tokens", models.BigIntegerField(default=0)),
+                ("total_cost", models.DecimalField(decimal_places=6, default=0, max_digits=14)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-bucket_start"],
+                "indexes": [
+                    models.Index(fields=["provider", "bucket_start"], name="core_airoll_provider_idx"),
+                    models.Index(fields=["feature", "provider", "bucket_start"], name="core_airoll_feature_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bucket_start", "feature", "provider", "model"),
+                        name="core_aiusagerollup_bucket_key",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
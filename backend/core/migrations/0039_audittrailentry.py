@@ -0,0 +1,121 @@
+"""
+FILE_ROLE: Django migration for the core app.
+
+KEY_COMPONENTS:
+- partition_audit_trail: Module symbol.
+- Migration: Module symbol.
+
+INTERACTIONS:
+- Depends on: core app schema/runtime machinery and adjacent services imported by this module.
+
+AI_GUIDELINES:
+- partition_audit_trail is a PostgreSQL-only RunPython step that recreates the new, still empty table as a
+  monthly range-partitioned table; its reverse is a no-op.
+- Later partitions are created by the daily core.audit_trail_partitions_daily job, not by migrations.
+"""
+
+import datetime
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+PARTITIONED_TABLE_SQL = """
+DROP TABLE core_audittrailentry;
+CREATE SEQUENCE IF NOT EXISTS core_audittrailentry_id_seq;
+CREATE TABLE core_audittrailentry (
+    id bigint NOT NULL DEFAULT nextval('core_audittrailentry_id_seq'),
+    "timestamp" timestamp with time zone NOT NULL,
+    content_type_id integer NOT NULL,
+    object_pk varchar(255) NOT NULL,
+    object_id bigint NULL,
+    object_repr text NOT NULL,
+    action smallint NOT NULL CHECK (action >= 0),
+    changes jsonb NULL,
+    actor_id integer NULL,
+    actor_email varchar(254) NOT NULL,
+    remote_addr inet NULL,
+    cid varchar(255) NOT NULL,
+    PRIMARY KEY (id, "timestamp")
+) PARTITION BY RANGE ("timestamp");
+ALTER SEQUENCE core_audittrailentry_id_seq OWNED BY core_audittrailentry.id;
+CREATE TABLE core_audittrailentry_default PARTITION OF core_audittrailentry DEFAULT;
+CREATE INDEX core_audit_object_idx ON core_audittrailentry (content_type_id, object_pk, "timestamp");
+CREATE INDEX core_audit_actor_idx ON core_audittrailentry (actor_id, "timestamp");
+"""
+
+
+def partition_audit_trail(apps, schema_editor):
+    """On PostgreSQL, recreate the (still empty) table range-partitioned by month on ``timestamp``."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(PARTITIONED_TABLE_SQL)
+    month = datetime.datetime.now(datetime.timezone.utc).date().replace(day=1)
+    for _ in range(3):
+        upper = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        schema_editor.execute(
+            f'CREATE TABLE IF NOT EXISTS "core_audittrailentry_p{month:%Y%m}" PARTITION OF core_audittrailentry '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0038_aiusagerollup"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditTrailEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("timestamp", models.DateTimeField()),
+                ("object_pk", models.CharField(max_length=255)),
+                ("object_id", models.BigIntegerField(blank=True, null=True)),
+                ("object_repr", models.TextField()),
+                (
+                    "action",
+                    models.PositiveSmallIntegerField(choices=[(0, "create"), (1, "update"), (2, "delete")]),
+                ),
+                ("changes", models.JSONField(blank=True, null=True)),
+                ("actor_email", models.CharField(blank=True, default="", max_length=254)),
+                ("remote_addr", models.GenericIPAddressField(blank=True, null=True)),
+                ("cid", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-timestamp"],
+                "indexes": [
+                    models.Index(fields=["content_type", "object_pk", "timestamp"], name="core_audit_object_idx"),
+                    models.Index(fields=["actor", "timestamp"], name="core_audit_actor_idx"),
+                ],
+            },
+        ),
+        migrations.RunPython(partition_audit_trail, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+"""
+FILE_ROLE: Django migration for the core app.
+
+KEY_COMPONENTS:
+- backfill_acked_seq: Module symbol.
+- Migration: Module symbol.
+
+INTERACTIONS:
+- Depends on: core app schema/runtime machinery and adjacent services imported by this module.
+
+AI_GUIDELINES:
+- Keep command logic thin and delegate real work to services when possible.
+- Keep migrations schema-only and reversible; do not add runtime business logic here.
+"""
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_acked_seq(apps, schema_editor):
+    # The upstream cursor has already acknowledged everything this node pushed.
+    SyncCursor = apps.get_model("core", "SyncCursor")
+    SyncCursor.objects.update(acked_seq=F("last_pushed_seq"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0039_audittrailentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="synccursor",
+            name="acked_seq",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_acked_seq, migrations.RunPython.noop),
+    ]
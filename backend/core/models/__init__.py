@@ -6,8 +6,10 @@ Use explicit imports so import errors are not silently converted to `None`.
 
 from .ai_model import AiModel
 from .ai_request_usage import AIRequestUsage
+from .ai_usage_rollup import AIUsageRollup
 from .app_setting import AppSetting
 from .async_job import AsyncJob
+from .audit_trail import AuditTrailEntry
 from .calendar_event import CalendarEvent
 from .calendar_reminder import CalendarReminder
 from .country_code import CountryCode
@@ -28,6 +30,7 @@ __all__ = [
     "DocumentOCRJob",
     "OCRJob",
     "AsyncJob",
+    "AuditTrailEntry",
     "Holiday",
     "UserProfile",
     "UserSettings",
@@ -36,6 +39,7 @@ __all__ = [
     "CalendarReminder",
     "AiModel",
     "AIRequestUsage",
+    "AIUsageRollup",
     "LocalResilienceSettings",
     "SyncChangeLog",
     "SyncCursor",
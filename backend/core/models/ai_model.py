@@ -83,4 +83,6 @@ from django.dispatch import receiver
 def _repair_ai_settings_after_model_delete(sender, instance: AiModel, **kwargs):
     from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
 
-    AIRuntimeSettingsService.replace_deleted_model_references(instance.model_id)
+    # The shared snapshots are only refreshed on commit; read this transaction's rows directly.
+    with AIRuntimeSettingsService.bypass_snapshot():
+        AIRuntimeSettingsService.replace_deleted_model_references(instance.model_id)
@@ -0,0 +1,54 @@
+"""
+FILE_ROLE: Primary data models for the core app.
+
+KEY_COMPONENTS:
+- AIUsageRollup: Hourly AI usage totals per (bucket, feature, provider, model).
+
+INTERACTIONS:
+- Depends on: core.models.ai_request_usage (the raw rows these totals are derived from).
+- Used by: core.services.ai_usage_rollup_service (writers) and the AI usage dashboards (readers).
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Rows are derived data: AIRequestUsage stays the source of truth and rollups can always be rebuilt from it.
+"""
+
+from django.db import models
+
+
+class AIUsageRollup(models.Model):
+    """
+    Pre-aggregated AI usage for one UTC hour.
+
+    Dashboards filter on ``bucket_start`` ranges instead of running ``EXTRACT`` aggregates
+    over the full request log; day, month and year totals are sums of hourly buckets.
+    """
+
+    bucket_start = models.DateTimeField(db_index=True)
+    feature = models.CharField(max_length=120)
+    provider = models.CharField(max_length=32)
+    model = models.CharField(max_length=160)
+
+    request_count = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    total_tokens = models.BigIntegerField(default=0)
+    total_cost = models.DecimalField(max_digits=14, decimal_places=6, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-bucket_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["bucket_start", "feature", "provider", "model"],
+                name="core_aiusagerollup_bucket_key",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["provider", "bucket_start"], name="core_airoll_provider_idx"),
+            models.Index(fields=["feature", "provider", "bucket_start"], name="core_airoll_feature_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.bucket_start:%Y-%m-%d %H:00} {self.feature} [{self.provider}/{self.model}]"
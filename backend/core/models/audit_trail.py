@@ -0,0 +1,65 @@
+"""
+FILE_ROLE: Primary data models for the core app.
+
+KEY_COMPONENTS:
+- AuditTrailEntry: Append-only CRUD audit row written in batches after commit.
+
+INTERACTIONS:
+- Depends on: django.contrib.contenttypes and the configured user model.
+- Used by: core.services.audit_trail_service (writer, retention) and the Django admin (reader).
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- On PostgreSQL the table is range-partitioned by month on ``timestamp`` (see migration 0039); the real
+  primary key is ``(id, timestamp)``, so never add unique constraints that omit ``timestamp``.
+- Foreign keys are declared without DB constraints because partition drops must not cascade.
+"""
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class AuditTrailEntry(models.Model):
+    """One create/update/delete change of an audited model instance."""
+
+    class Action(models.IntegerChoices):
+        CREATE = 0, "create"
+        UPDATE = 1, "update"
+        DELETE = 2, "delete"
+
+    timestamp = models.DateTimeField()
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    object_pk = models.CharField(max_length=255)
+    object_id = models.BigIntegerField(null=True, blank=True)
+    object_repr = models.TextField()
+    action = models.PositiveSmallIntegerField(choices=Action.choices)
+    changes = models.JSONField(null=True, blank=True)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    actor_email = models.CharField(max_length=254, blank=True, default="")
+    remote_addr = models.GenericIPAddressField(null=True, blank=True)
+    cid = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["content_type", "object_pk", "timestamp"], name="core_audit_object_idx"),
+            models.Index(fields=["actor", "timestamp"], name="core_audit_actor_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_action_display()} {self.object_repr} @ {self.timestamp:%Y-%m-%d %H:%M:%S}"
@@ -94,6 +94,8 @@ class SyncCursor(models.Model):
     node_id = models.CharField(max_length=64, unique=True)
     last_pulled_seq = models.BigIntegerField(default=0)
     last_pushed_seq = models.BigIntegerField(default=0)
+    # Highest local change-log seq this peer has consumed; the minimum across peers bounds compaction.
+    acked_seq = models.BigIntegerField(default=0)
     last_pulled_at = models.DateTimeField(null=True, blank=True)
     last_pushed_at = models.DateTimeField(null=True, blank=True)
     last_error = models.TextField(blank=True, default="")
@@ -5,20 +5,29 @@ All AI-powered services should use this base client for consistency.
 """
 
 import base64
+import contextvars
+import copy
 import json
 import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional, Union
 
 import openai
+from core.services.ai_rate_limiter import AIRateLimitRejection, ai_rate_limiter, estimate_request_tokens
+from core.services.ai_route_health import REJECTED_CIRCUIT_OPEN, ai_route_health
 from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
 from core.services.ai_usage_service import AIUsageFeature, AIUsageService
 from core.services.logger_service import Logger
+from core.tasks.runtime import current_task_defers_retries
+from core.telemetry.metrics import ai_provider_request_duration_seconds
 from django.conf import settings
 from django.core.cache import cache
 from django.core.files.uploadedfile import UploadedFile
+from django.db import connections
 from openai import OpenAI
 
 try:  # pragma: no cover - import optional for environments without groq SDK
@@ -34,6 +43,20 @@ logger = Logger.get_logger(__name__)
 GENERIC_AI_PROVIDER_ERROR = "AI provider error"
 GENERIC_AI_SLOW_RESPONSE = "AI slow response"
 
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=max(2, int(getattr(settings, "AI_ROUTER_HEDGE_MAX_WORKERS", 8))),
+                thread_name_prefix="ai-hedge",
+            )
+        return _hedge_executor
+
 
 class AIConnectionError(Exception):
     """Exception raised when a connection/provider error occurs with the AI provider."""
@@ -48,6 +71,8 @@ class AIConnectionError(Exception):
         super().__init__(message)
         self.error_code = error_code
         self.is_timeout = is_timeout
+        # Set when the caller should reschedule rather than retry now (read by core.tasks.runtime.db_task).
+        self.retry_after_ms = 0
 
 
 def is_ai_timeout_exception(exc: BaseException) -> bool:
@@ -332,6 +357,15 @@ class AIClient:
             return False
         return bool(self._api_key_for_provider(provider))
 
+    @staticmethod
+    def _sdk_client_options() -> dict[str, Any]:
+        # The SDKs retry internally with blocking sleeps; deployments relying on the route health
+        # registry and task-level retries can set AI_PROVIDER_SDK_MAX_RETRIES=0.
+        max_retries = getattr(settings, "AI_PROVIDER_SDK_MAX_RETRIES", None)
+        if max_retries is None:
+            return {}
+        return {"max_retries": max(0, int(max_retries))}
+
     def _create_provider_context(self, provider: str, *, timeout_override: float | None = None) -> _ProviderContext:
         if provider == "openrouter":
             return self._create_openrouter_context(timeout_override=timeout_override)
@@ -374,6 +408,7 @@ class AIClient:
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
+            **self._sdk_client_options(),
         )
         logger.info("Initialized AI client with OpenRouter (model: %s, timeout: %ss)", model, timeout)
         return _ProviderContext(
@@ -403,6 +438,7 @@ class AIClient:
         client = OpenAI(
             api_key=api_key,
             timeout=timeout,
+            **self._sdk_client_options(),
         )
         logger.info("Initialized AI client with OpenAI (model: %s, timeout: %ss)", model, timeout)
         return _ProviderContext(
@@ -425,7 +461,7 @@ class AIClient:
         default_model = AIRuntimeSettingsService.get_groq_default_model()
         model = self._model_override_for_provider("groq") or default_model
         timeout = timeout_override or self._timeout_override or float(getattr(settings, "GROQ_TIMEOUT", 120.0))
-        client = Groq(api_key=api_key, timeout=timeout)
+        client = Groq(api_key=api_key, timeout=timeout, **self._sdk_client_options())
         logger.info("Initialized AI client with Groq (model: %s, timeout: %ss)", model, timeout)
         return _ProviderContext(
             provider_key="groq",
@@ -468,29 +504,61 @@ class AIClient:
 
         router_enabled = self._router_enabled()
         if router_enabled:
-            # Failover enabled: try primary once, then follow the fallback chain immediately on error
-            attempted_routes = [primary_route] + self._fallback_candidates(self.provider_key, self.model)
+            # Failover enabled: fastest healthy route first, then the rest of the chain immediately on error
+            attempted_routes = self._rank_routes(
+                [primary_route] + self._fallback_candidates(self.provider_key, self.model)
+            )
         else:
             # Failover disabled: retry same model up to 3 times (no cross-provider failover)
             attempted_routes = [primary_route, primary_route, primary_route]
 
         last_error: Optional[AIConnectionError] = None
+        index = 0
+        while index < len(attempted_routes):
+            route = attempted_routes[index]
+            rejection = ai_route_health.acquire(
+                route.provider_key,
+                route.model,
+                probe_timeout=route.timeout or self.timeout,
+            )
+            if rejection:
+                last_error = self._route_rejected_error(route, rejection)
+                logger.warning(
+                    "Skipping AI provider '%s' model '%s': %s.",
+                    route.provider_key,
+                    route.model,
+                    rejection,
+                )
+                if not router_enabled:
+                    # Every remaining attempt targets the same route.
+                    break
+                index += 1
+                continue
 
-        for index, route in enumerate(attempted_routes):
-            if route.provider_key != self.provider_key or (route.timeout is not None and route.timeout != self.timeout):
-                self._activate_provider(route.provider_key, timeout_override=route.timeout)
-            self.model = route.model
-
+            launched_routes: list[_AttemptRoute] = [route]
             try:
-                result = self._chat_completion_single_attempt(
-                    feature_name=feature_name,
-                    request_kwargs=request_kwargs,
-                )
-                if index > 0:
+                hedge = self._hedge_plan(attempted_routes, index) if router_enabled else None
+                if hedge is not None:
+                    winner, result = self._hedged_attempt(
+                        route,
+                        *hedge,
+                        feature_name=feature_name,
+                        request_kwargs=request_kwargs,
+                        launched_routes=launched_routes,
+                    )
+                else:
+                    winner = route
+                    self._activate_route(route)
+                    result = self._chat_completion_single_attempt(
+                        feature_name=feature_name,
+                        request_kwargs=request_kwargs,
+                    )
+                if (winner.provider_key, winner.model) != (primary_route.provider_key, primary_route.model):
                     self._set_sticky_provider(self.provider_key)
                 return result
             except AIConnectionError as exc:
                 last_error = exc
+                index += len(launched_routes) - 1
                 is_last_attempt = index >= len(attempted_routes) - 1
                 should_retry = exc.error_code in self.RETRIABLE_ERROR_CODES and not is_last_attempt
                 if not should_retry:
@@ -498,8 +566,22 @@ class AIClient:
 
                 next_route = attempted_routes[index + 1]
                 if not router_enabled:
-                    # Same-provider retry: brief exponential backoff (2s, 4s)
-                    backoff = 2.0 * (2 ** index)
+                    # Same-provider retry: exponential backoff (2s, 4s)
+                    backoff = 2.0 * (2**index)
+                    if current_task_defers_retries():
+                        # The running task opted in (defer_transient_retries) and has retries left: let the
+                        # task runtime redeliver the message after the backoff instead of parking this thread.
+                        exc.retry_after_ms = max(int(exc.retry_after_ms or 0), int(backoff * 1000))
+                        logger.warning(
+                            "AI provider '%s' model '%s' failed with %s (attempt %d/3). "
+                            "Deferring retry to the task queue in %.0fs.",
+                            self.provider_key,
+                            self.model,
+                            exc.error_code,
+                            index + 1,
+                            backoff,
+                        )
+                        raise
                     logger.warning(
                         "AI provider '%s' model '%s' failed with %s (attempt %d/3). "
                         "Retrying same model in %.0fs.",
@@ -521,13 +603,110 @@ class AIClient:
                         next_route.model,
                         next_route.timeout or self.timeout,
                     )
+            index += 1
 
         if last_error is not None:
             raise last_error
         raise AIConnectionError(GENERIC_AI_PROVIDER_ERROR, error_code="unexpected_error")
 
+    def _activate_route(self, route: _AttemptRoute) -> None:
+        if route.provider_key != self.provider_key or (route.timeout is not None and route.timeout != self.timeout):
+            self._activate_provider(route.provider_key, timeout_override=route.timeout)
+        self.model = route.model
+
+    def _rank_routes(self, routes: list[_AttemptRoute]) -> list[_AttemptRoute]:
+        # An explicitly requested model/provider keeps its place unless its circuit is open.
+        prefer_fastest = bool(getattr(settings, "AI_ROUTER_PREFER_FASTEST", True)) and not (
+            self._model_override or self._explicit_provider_requested
+        )
+        return ai_route_health.rank(routes, prefer_fastest=prefer_fastest)
+
+    @staticmethod
+    def _route_rejected_error(route: _AttemptRoute, rejection: str) -> AIConnectionError:
+        error = AIConnectionError(GENERIC_AI_PROVIDER_ERROR, error_code=rejection)
+        if rejection == REJECTED_CIRCUIT_OPEN:
+            error.retry_after_ms = int(ai_route_health.retry_after(route.provider_key, route.model) * 1000)
+        return error
+
+    def _hedge_plan(self, routes: list[_AttemptRoute], index: int) -> tuple[_AttemptRoute, float] | None:
+        if not bool(getattr(settings, "AI_ROUTER_HEDGE_ENABLED", False)) or index + 1 >= len(routes):
+            return None
+        route = routes[index]
+        delay = ai_route_health.hedge_delay(route.provider_key, route.model)
+        if delay is None or delay >= float(route.timeout or self.timeout or 0):
+            return None
+        return routes[index + 1], delay
+
+    def _attempt_on_clone(
+        self, route: _AttemptRoute, *, feature_name: str, request_kwargs: dict[str, Any]
+    ) -> tuple["AIClient", str]:
+        # Hedged attempts run concurrently, so each one mutates its own shallow copy of the client.
+        clone = copy.copy(self)
+        try:
+            clone._activate_route(route)
+            result = clone._chat_completion_single_attempt(feature_name=feature_name, request_kwargs=request_kwargs)
+            return clone, result
+        finally:
+            connections.close_all()
+
+    def _hedged_attempt(
+        self,
+        route: _AttemptRoute,
+        hedge_route: _AttemptRoute,
+        delay: float,
+        *,
+        feature_name: str,
+        request_kwargs: dict[str, Any],
+        launched_routes: list[_AttemptRoute],
+    ) -> tuple[_AttemptRoute, str]:
+        """Run ``route`` and, once it outlives its p95 deadline, race ``hedge_route`` against it."""
+        executor = _get_hedge_executor()
+        # Pool threads do not inherit contextvars; copy them so the AI priority class and wait listener follow.
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run,
+                self._attempt_on_clone,
+                route,
+                feature_name=feature_name,
+                request_kwargs=request_kwargs,
+            ): route
+        }
+        done, _pending = wait(futures, timeout=delay, return_when=FIRST_COMPLETED)
+        if not done and ai_route_health.acquire(hedge_route.provider_key, hedge_route.model) is None:
+            logger.info(
+                "AI provider '%s' model '%s' exceeded its p95 deadline (%.1fs); hedging with '%s' model '%s'.",
+                route.provider_key,
+                route.model,
+                delay,
+                hedge_route.provider_key,
+                hedge_route.model,
+            )
+            launched_routes.append(hedge_route)
+            futures[
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._attempt_on_clone,
+                    hedge_route,
+                    feature_name=feature_name,
+                    request_kwargs=request_kwargs,
+                )
+            ] = hedge_route
+
+        last_error: Optional[AIConnectionError] = None
+        for future in as_completed(futures):
+            try:
+                _clone, result = future.result()
+            except AIConnectionError as exc:
+                last_error = exc
+                continue
+            # The slower attempt keeps running in the pool; its outcome still feeds usage and health.
+            winner = futures[future]
+            self._activate_route(winner)
+            return winner, result
+
+        raise last_error or AIConnectionError(GENERIC_AI_PROVIDER_ERROR, error_code="unexpected_error")
+
     def _chat_completion_single_attempt(self, *, feature_name: str, request_kwargs: dict[str, Any]) -> str:
-        started_at = time.perf_counter()
         attempt_kwargs = {"model": self.model, **request_kwargs}
 
         # OpenRouter-specific hints (plugins, provider sorting) should not be
@@ -547,8 +726,27 @@ class AIClient:
             if extra_body:
                 attempt_kwargs["extra_body"] = extra_body
 
+        admission = ai_rate_limiter.acquire(
+            self.provider_key,
+            self.model,
+            estimated_tokens=estimate_request_tokens(attempt_kwargs),
+            lease_seconds=float(self.timeout or 0) or 120.0,
+        )
+        if isinstance(admission, AIRateLimitRejection):
+            # Local back-pressure, not a provider fault: leave route health untouched and skip failover; a
+            # db_task caller is redelivered once retry_after_ms has passed.
+            error = AIConnectionError(GENERIC_AI_PROVIDER_ERROR, error_code=admission.reason)
+            error.retry_after_ms = int(admission.retry_after_seconds * 1000)
+            raise error
+        started_at = time.perf_counter()
+
+        actual_tokens = None
         try:
             response = self.client.chat.completions.create(**attempt_kwargs)
+            actual_tokens = getattr(getattr(response, "usage", None), "total_tokens", None)
+            ai_route_health.record(
+                self.provider_key, self.model, latency_seconds=time.perf_counter() - started_at
+            )
             self._record_usage(
                 feature_name=feature_name,
                 response=response,
@@ -561,6 +759,12 @@ class AIClient:
             return response.choices[0].message.content
         except Exception as exc:
             mapped_error = self._map_provider_exception(exc)
+            ai_route_health.record(
+                self.provider_key,
+                self.model,
+                latency_seconds=time.perf_counter() - started_at,
+                error_code=mapped_error.error_code,
+            )
             self._record_usage(
                 feature_name=feature_name,
                 response=None,
@@ -572,6 +776,8 @@ class AIClient:
             )
             self._log_provider_exception(exc, mapped_error)
             raise mapped_error from exc
+        finally:
+            ai_rate_limiter.release(admission, actual_tokens=actual_tokens)
 
     def _provider_exception_type(self, name: str, fallback: type[BaseException]) -> type[BaseException]:
         if self.provider_key == "groq" and groq is not None:
@@ -709,11 +915,20 @@ class AIClient:
         provider_key: Optional[str] = None,
         model: Optional[str] = None,
     ) -> None:
-        elapsed_ms = int((time.perf_counter() - started_at) * 1000)
+        elapsed_seconds = time.perf_counter() - started_at
+        elapsed_ms = int(elapsed_seconds * 1000)
+        provider = (provider_key or self.provider_key or "unknown").lower()
+        model = model or self.model or "unknown"
+        ai_provider_request_duration_seconds.observe(
+            elapsed_seconds,
+            provider=provider,
+            model=model,
+            outcome="success" if success else "error",
+        )
         AIUsageService.enqueue_request_capture(
             feature=feature_name or self.feature_name or AIUsageFeature.UNKNOWN,
-            provider=(provider_key or self.provider_key or "unknown").lower(),
-            model=model or self.model or "unknown",
+            provider=provider,
+            model=model,
             response=response,
             success=success,
             error_type=error_type,
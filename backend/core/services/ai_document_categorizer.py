@@ -19,9 +19,9 @@ from core.services.ai_client import (
 from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
 from core.services.ai_usage_service import AIUsageFeature
 from core.services.logger_service import Logger
+from core.services.reference_catalog_cache import get_document_types
 from core.utils.document_type_ai_fields import format_fields_for_prompt, parse_structured_output_fields
 from django.conf import settings
-from products.models.document_type import DocumentType
 
 logger = Logger.get_logger(__name__)
 
@@ -46,6 +46,30 @@ CATEGORIZATION_SCHEMA = {
     "additionalProperties": False,
 }
 
+# JSON schema for batched structured output: one entry per numbered document in the request.
+BATCH_CATEGORIZATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {
+                        "type": "integer",
+                        "description": "The number of the document this entry classifies, as labelled in the request.",
+                    },
+                    **CATEGORIZATION_SCHEMA["properties"],
+                },
+                "required": ["index", "document_type", "confidence", "reasoning"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
+
 _VALIDATION_REASONING_STRUCTURED_SCHEMA = {
     "type": "object",
     "properties": {
@@ -494,6 +518,42 @@ def _build_user_prompt(filename: str) -> str:
     )
 
 
+def _build_batch_user_prompt(filenames: list[str]) -> list[dict]:
+    """Build the user message parts introducing each numbered document of a batch (images are appended)."""
+    listing = "\n".join(f"{index}. '{filename}'" for index, filename in enumerate(filenames, start=1))
+    return [
+        {
+            "type": "text",
+            "text": (
+                f"Classify each of the following {len(filenames)} documents independently. "
+                "Every image is preceded by its document number. Return exactly one result per document, "
+                "with its number in 'index'. The original filenames are:\n"
+                f"{listing}"
+            ),
+        }
+    ]
+
+
+def _resolve_document_type_id(result: dict, document_types: list[dict]) -> dict:
+    """Map the returned document type name to its id; unknown names are cleared."""
+    doc_type_name = result.get("document_type")
+    doc_type_id = None
+    if doc_type_name:
+        for dt in document_types:
+            if dt["name"] == doc_type_name:
+                doc_type_id = dt["id"]
+                break
+        if doc_type_id is None:
+            logger.warning(
+                "AI returned document_type '%s' which doesn't match any known type. " "Setting to null.",
+                doc_type_name,
+            )
+            result["document_type"] = None
+
+    result["document_type_id"] = doc_type_id
+    return result
+
+
 def build_document_validation_prompts(
     *,
     filename: str,
@@ -582,18 +642,19 @@ def build_document_validation_prompts(
     return system_prompt, user_prompt
 
 
+_PROMPT_DOCUMENT_TYPE_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "validation_rule_ai_positive",
+    "validation_rule_ai_negative",
+    "ai_structured_output",
+)
+
+
 def get_document_types_for_prompt() -> list[dict]:
-    """Fetch all DocumentType records formatted for the prompt."""
-    return list(
-        DocumentType.objects.values(
-            "id",
-            "name",
-            "description",
-            "validation_rule_ai_positive",
-            "validation_rule_ai_negative",
-            "ai_structured_output",
-        ).order_by("name")
-    )
+    """Return all DocumentType records formatted for the prompt (served from the reference catalog)."""
+    return [{field: row.get(field) for field in _PROMPT_DOCUMENT_TYPE_FIELDS} for row in get_document_types()]
 
 
 class AIDocumentCategorizer:
@@ -721,22 +782,7 @@ class AIDocumentCategorizer:
             **extra_kwargs,
         )
 
-        # Resolve document_type name to ID
-        doc_type_name = result.get("document_type")
-        doc_type_id = None
-        if doc_type_name:
-            for dt in document_types:
-                if dt["name"] == doc_type_name:
-                    doc_type_id = dt["id"]
-                    break
-            if doc_type_id is None:
-                logger.warning(
-                    "AI returned document_type '%s' which doesn't match any known type. " "Setting to null.",
-                    doc_type_name,
-                )
-                result["document_type"] = None
-
-        result["document_type_id"] = doc_type_id
+        result = _resolve_document_type_id(result, document_types)
 
         logger.info(
             "Document categorized: %s -> %s (confidence: %.2f)",
@@ -747,6 +793,104 @@ class AIDocumentCategorizer:
 
         return result
 
+    @staticmethod
+    def _downscale_image(image_bytes: bytes, filename: str, max_side: int) -> tuple[bytes, str]:
+        """Shrink an image to ``max_side`` pixels on its longest edge; batched classification needs no detail."""
+        try:
+            from PIL import Image
+
+            with Image.open(io.BytesIO(image_bytes)) as image:
+                if max(image.size) <= max_side:
+                    return image_bytes, filename
+                image.thumbnail((max_side, max_side))
+                buf = io.BytesIO()
+                image.convert("RGB").save(buf, format="JPEG", quality=80)
+                return buf.getvalue(), filename.rsplit(".", 1)[0] + ".jpg"
+        except Exception as exc:
+            logger.debug("Could not downscale %s for batch categorization: %s", filename, exc)
+            return image_bytes, filename
+
+    def categorize_files_batch(
+        self,
+        files: list[tuple[bytes, str]],
+        document_types: Optional[list[dict]] = None,
+    ) -> list[Optional[dict]]:
+        """
+        Classify several small files with one vision request.
+
+        The system prompt is byte-identical to the single-file call, so providers with prefix caching reuse it
+        across single and batched requests; the per-batch listing and the thumbnails follow it.
+
+        Args:
+            files: ``(file_bytes, filename)`` pairs.
+            document_types: Pre-fetched document types list; fetched from DB if None.
+
+        Returns:
+            One result per input file, in order (same shape as ``categorize_file``), or None where the model
+            returned no entry for that file.
+        """
+        if document_types is None:
+            document_types = get_document_types_for_prompt()
+
+        client = self._get_client()
+        max_side = int(getattr(settings, "DOCUMENT_CATEGORIZATION_BATCH_IMAGE_MAX_SIDE", 1024))
+        content = _build_batch_user_prompt([filename for _file_bytes, filename in files])
+        for index, (file_bytes, filename) in enumerate(files, start=1):
+            vision_bytes, vision_filename = self._prepare_vision_bytes(file_bytes, filename)
+            vision_bytes, vision_filename = self._downscale_image(vision_bytes, vision_filename, max_side)
+            content.append({"type": "text", "text": f"Document {index}:"})
+            content.append(
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": (
+                            f"data:{client.get_mime_type(vision_filename)};base64,"
+                            f"{client.encode_image_base64(vision_bytes)}"
+                        )
+                    },
+                }
+            )
+        messages = [
+            {"role": "system", "content": _build_system_prompt(document_types)},
+            {"role": "user", "content": content},
+        ]
+
+        extra_kwargs = {}
+        if self.provider_order:
+            extra_kwargs["extra_body"] = {"provider": {"order": self.provider_order}}
+
+        response = client.chat_completion_json(
+            messages=messages,
+            json_schema=BATCH_CATEGORIZATION_SCHEMA,
+            schema_name="document_categorization_batch",
+            temperature=0.1,
+            strict=True,
+            retry_on_invalid_json=False,
+            **extra_kwargs,
+        )
+
+        results: list[Optional[dict]] = [None] * len(files)
+        for entry in response.get("results") or []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                position = int(entry.get("index")) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= position < len(files) and results[position] is None:
+                entry = {key: value for key, value in entry.items() if key != "index"}
+                results[position] = _resolve_document_type_id(entry, document_types)
+
+        logger.info(
+            "Batch categorized %d documents: %s",
+            len(files),
+            ", ".join(
+                f"{filename} -> {(result or {}).get('document_type') or 'UNKNOWN'}"
+                for (_file_bytes, filename), result in zip(files, results)
+            ),
+        )
+        return results
+
     def validate_file_matches_type(
         self,
         file_bytes: bytes,
@@ -0,0 +1,395 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- AIRateLimiter: Cluster-wide requests/tokens-per-minute buckets and concurrency slots per provider/model.
+- AIAdmission: Lease returned for one admitted provider call; released with the actual token usage.
+- ai_request_priority / on_ai_capacity_wait: Context managers for the caller's priority class and wait reporting.
+- ai_rate_limiter: Process-wide limiter singleton.
+
+INTERACTIONS:
+- Depends on: django.core.cache (Redis in every deployed environment) and core.tasks.runtime.current_task_actor_name.
+- Used by: core.services.ai_client.AIClient._chat_completion_single_attempt and AI-driven Dramatiq tasks that
+  surface capacity waits in their job progress.
+
+AI_GUIDELINES:
+- Web and worker processes share the same counters, so only use atomic cache primitives (add/incr/get_many).
+- Interactive callers may use the whole budget; batch callers stop at the share left after the interactive reserve.
+- Fail open on cache errors: the limiter protects the provider quota, it must never take AI features down.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from core.services.logger_service import Logger
+from core.tasks.runtime import current_task_actor_name
+from core.telemetry.metrics import ai_rate_limit_rejections_total, ai_rate_limit_wait_seconds
+from django.conf import settings
+from django.core.cache import cache
+
+logger = Logger.get_logger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+# Deliberately not an AIClient retriable code: every route shares the budget, so failover or an in-place
+# sleep cannot help. Tasks are redelivered after retry_after_ms instead (core.tasks.runtime).
+REJECTED_LOCAL_RATE_LIMIT = "local_rate_limit"
+
+_KEY_PREFIX = "ai:ratelimit"
+_WINDOW_SECONDS = 60
+_SLOT_LEASE_MARGIN_SECONDS = 30
+_WAIT_NOTIFY_INTERVAL_SECONDS = 5.0
+# Rough prompt sizing: ~4 characters per token, a flat allowance per image part and for the completion.
+_CHARS_PER_TOKEN = 4
+_IMAGE_TOKEN_ESTIMATE = 1_000
+_DEFAULT_COMPLETION_TOKENS = 1_000
+
+_REQUEST_PRIORITY: ContextVar[str | None] = ContextVar("ai_request_priority", default=None)
+_WAIT_LISTENER: ContextVar[Callable[["AICapacityWait"], None] | None] = ContextVar(
+    "ai_capacity_wait_listener", default=None
+)
+
+
+@dataclass(frozen=True)
+class RouteLimits:
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    max_concurrency: int = 0
+
+
+@dataclass(frozen=True)
+class AICapacityWait:
+    provider: str
+    model: str
+    priority: str
+    waited_seconds: float
+    retry_in_seconds: float
+
+
+@dataclass
+class AIAdmission:
+    provider: str
+    model: str
+    priority: str
+    window_index: int
+    estimated_tokens: int
+    slot_key: str | None = None
+    slot_token: str | None = None
+    waited_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class AIRateLimitRejection:
+    reason: str
+    retry_after_seconds: float
+
+
+@contextmanager
+def ai_request_priority(priority: str) -> Iterator[None]:
+    """Run AI calls inside the block with ``priority`` (``interactive`` or ``batch``)."""
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+@contextmanager
+def on_ai_capacity_wait(listener: Callable[[AICapacityWait], None]) -> Iterator[None]:
+    """Call ``listener`` when an AI call inside the block waits for provider capacity."""
+    token = _WAIT_LISTENER.set(listener)
+    try:
+        yield
+    finally:
+        _WAIT_LISTENER.reset(token)
+
+
+def current_priority() -> str:
+    """Explicit priority, else ``batch`` inside Dramatiq tasks and ``interactive`` in web requests."""
+    explicit = _REQUEST_PRIORITY.get()
+    if explicit in (PRIORITY_INTERACTIVE, PRIORITY_BATCH):
+        return explicit
+    return PRIORITY_BATCH if current_task_actor_name() else PRIORITY_INTERACTIVE
+
+
+def estimate_request_tokens(request_kwargs: dict) -> int:
+    """Upper-bound token estimate for a chat completion request (prompt plus expected completion)."""
+    characters = 0
+    images = 0
+    for message in request_kwargs.get("messages") or ():
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            characters += len(content)
+            continue
+        for part in content or ():
+            if not isinstance(part, dict):
+                continue
+            if part.get("type") == "text":
+                characters += len(str(part.get("text") or ""))
+            else:
+                images += 1
+    completion = request_kwargs.get("max_tokens") or request_kwargs.get("max_completion_tokens")
+    return (
+        math.ceil(characters / _CHARS_PER_TOKEN)
+        + images * _IMAGE_TOKEN_ESTIMATE
+        + int(completion or _DEFAULT_COMPLETION_TOKENS)
+    )
+
+
+class AIRateLimiter:
+    """Admission control in front of every provider call.
+
+    Each provider/model route configured in ``AI_RATE_LIMITS`` gets fixed one-minute request and token
+    windows plus ``max_concurrency`` lease slots. Batch callers may only use ``1 - AI_RATE_LIMIT_BATCH_RESERVE``
+    of each window and leave the first ``AI_RATE_LIMIT_INTERACTIVE_SLOTS`` slots free, so a large categorization
+    batch can never starve a passport check in a web request. Callers wait (polling) up to their priority's
+    budget and are then rejected with a retry-after so Dramatiq can redeliver instead of parking a thread.
+    """
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    @staticmethod
+    def is_enabled() -> bool:
+        if bool(getattr(settings, "TESTING", False)):
+            return False
+        return bool(getattr(settings, "AI_RATE_LIMIT_ENABLED", True))
+
+    @staticmethod
+    def limits_for(provider: str, model: str) -> RouteLimits | None:
+        configured = getattr(settings, "AI_RATE_LIMITS", {}) or {}
+        entry = configured.get(f"{provider}/{model}") or configured.get(provider)
+        if not entry:
+            return None
+        try:
+            requests_per_minute, tokens_per_minute, max_concurrency = (max(0, int(value)) for value in entry)
+        except (TypeError, ValueError):
+            return None
+        limits = RouteLimits(requests_per_minute, tokens_per_minute, max_concurrency)
+        if not any((limits.requests_per_minute, limits.tokens_per_minute, limits.max_concurrency)):
+            return None
+        return limits
+
+    @staticmethod
+    def _batch_share() -> float:
+        reserve = float(getattr(settings, "AI_RATE_LIMIT_BATCH_RESERVE", 0.2))
+        return min(1.0, max(0.0, 1.0 - reserve))
+
+    @staticmethod
+    def _interactive_slots() -> int:
+        return max(0, int(getattr(settings, "AI_RATE_LIMIT_INTERACTIVE_SLOTS", 1)))
+
+    @staticmethod
+    def _max_wait_seconds(priority: str) -> float:
+        if priority == PRIORITY_BATCH:
+            return max(0.0, float(getattr(settings, "AI_RATE_LIMIT_BATCH_MAX_WAIT_SECONDS", 60)))
+        return max(0.0, float(getattr(settings, "AI_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS", 15)))
+
+    @staticmethod
+    def _poll_seconds(priority: str) -> float:
+        # Interactive callers re-check more often, so they win freed slots first.
+        return 0.5 if priority == PRIORITY_BATCH else 0.1
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _route_id(provider: str, model: str) -> str:
+        return f"{provider}|{str(model or '').strip().replace(' ', '_')}"
+
+    @staticmethod
+    def _window_key(route_id: str, window_index: int, field: str) -> str:
+        return f"{_KEY_PREFIX}:{route_id}:{window_index}:{field}"
+
+    @staticmethod
+    def _slot_key(route_id: str, slot: int) -> str:
+        return f"{_KEY_PREFIX}:{route_id}:slot:{slot}"
+
+    @staticmethod
+    def _incr(key: str, delta: int) -> int:
+        cache.add(key, 0, timeout=_WINDOW_SECONDS * 2)
+        try:
+            return int(cache.incr(key, delta))
+        except ValueError:
+            cache.set(key, delta, timeout=_WINDOW_SECONDS * 2)
+            return delta
+
+    @staticmethod
+    def _decr(key: str, delta: int) -> None:
+        try:
+            cache.decr(key, delta)
+        except ValueError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        *,
+        estimated_tokens: int,
+        lease_seconds: float,
+        priority: str | None = None,
+        max_wait_seconds: float | None = None,
+    ) -> AIAdmission | AIRateLimitRejection | None:
+        """Wait for capacity on a route; ``None`` means the route is not limited."""
+        if not self.is_enabled():
+            return None
+        limits = self.limits_for(provider, model)
+        if limits is None:
+            return None
+
+        priority = priority or current_priority()
+        budget = self._max_wait_seconds(priority) if max_wait_seconds is None else max(0.0, max_wait_seconds)
+        started_at = time.monotonic()
+        notified_at: float | None = None
+        listener = _WAIT_LISTENER.get()
+        while True:
+            try:
+                admission, retry_in = self._try_admit(
+                    provider, model, limits, priority=priority, estimated_tokens=estimated_tokens, lease=lease_seconds
+                )
+            except Exception as exc:
+                logger.debug("AI rate limiter failed open (%s/%s): %s", provider, model, exc)
+                return None
+            waited = time.monotonic() - started_at
+            if admission is not None:
+                admission.waited_seconds = waited
+                if waited > 0.05:
+                    ai_rate_limit_wait_seconds.observe(waited, provider=provider, priority=priority)
+                return admission
+
+            if waited + retry_in > budget:
+                ai_rate_limit_wait_seconds.observe(waited, provider=provider, priority=priority)
+                ai_rate_limit_rejections_total.inc(provider=provider, priority=priority)
+                logger.warning(
+                    "AI capacity for %s/%s exhausted (%s); rejecting after %.1fs, retry in %.1fs.",
+                    provider,
+                    model,
+                    priority,
+                    waited,
+                    retry_in,
+                )
+                return AIRateLimitRejection(reason=REJECTED_LOCAL_RATE_LIMIT, retry_after_seconds=retry_in)
+            if listener is not None and (
+                notified_at is None or time.monotonic() - notified_at >= _WAIT_NOTIFY_INTERVAL_SECONDS
+            ):
+                notified_at = time.monotonic()
+                try:
+                    listener(AICapacityWait(provider, model, priority, waited, retry_in))
+                except Exception as exc:
+                    logger.debug("AI capacity wait listener failed: %s", exc)
+            time.sleep(min(retry_in, max(0.0, budget - waited), 1.0))
+
+    def _try_admit(
+        self,
+        provider: str,
+        model: str,
+        limits: RouteLimits,
+        *,
+        priority: str,
+        estimated_tokens: int,
+        lease: float,
+    ) -> tuple[AIAdmission | None, float]:
+        """One non-blocking admission attempt; returns ``(admission, 0)`` or ``(None, seconds_to_retry)``."""
+        route_id = self._route_id(provider, model)
+        share = 1.0 if priority == PRIORITY_INTERACTIVE else self._batch_share()
+        now = time.time()
+        window_index = int(now // _WINDOW_SECONDS)
+        until_next_window = (window_index + 1) * _WINDOW_SECONDS - now
+
+        slot_key = slot_token = None
+        if limits.max_concurrency:
+            first_slot = 0
+            if priority == PRIORITY_BATCH:
+                first_slot = min(self._interactive_slots(), limits.max_concurrency - 1)
+            slot_key, slot_token = self._take_slot(route_id, first_slot, limits.max_concurrency, lease)
+            if slot_key is None:
+                return None, self._poll_seconds(priority)
+
+        request_key = self._window_key(route_id, window_index, "req")
+        token_key = self._window_key(route_id, window_index, "tok")
+        taken: list[tuple[str, int]] = []
+        try:
+            if limits.requests_per_minute:
+                allowed = max(1, int(limits.requests_per_minute * share))
+                taken.append((request_key, 1))
+                if self._incr(request_key, 1) > allowed:
+                    raise _WindowFull
+            if limits.tokens_per_minute:
+                allowed = max(1, int(limits.tokens_per_minute * share))
+                taken.append((token_key, estimated_tokens))
+                used = self._incr(token_key, estimated_tokens)
+                # A single request larger than the budget is still admitted into an empty window.
+                if used > allowed and used - estimated_tokens > 0:
+                    raise _WindowFull
+        except _WindowFull:
+            for key, delta in taken:
+                self._decr(key, delta)
+            self._release_slot(slot_key, slot_token)
+            return None, max(self._poll_seconds(priority), until_next_window)
+
+        return (
+            AIAdmission(
+                provider=provider,
+                model=model,
+                priority=priority,
+                window_index=window_index,
+                estimated_tokens=estimated_tokens,
+                slot_key=slot_key,
+                slot_token=slot_token,
+            ),
+            0.0,
+        )
+
+    def _take_slot(self, route_id: str, first_slot: int, slots: int, lease: float) -> tuple[str | None, str | None]:
+        keys = [self._slot_key(route_id, slot) for slot in range(first_slot, slots)]
+        held = cache.get_many(keys)
+        token = uuid.uuid4().hex
+        timeout = max(1, int(lease + _SLOT_LEASE_MARGIN_SECONDS))
+        for key in keys:
+            if key not in held and cache.add(key, token, timeout=timeout):
+                return key, token
+        return None, None
+
+    @staticmethod
+    def _release_slot(slot_key: str | None, slot_token: str | None) -> None:
+        if slot_key and cache.get(slot_key) == slot_token:
+            cache.delete(slot_key)
+
+    def release(self, admission: AIAdmission | None, *, actual_tokens: int | None = None) -> None:
+        """Free the concurrency slot and correct the token window with the provider-reported usage."""
+        if admission is None:
+            return
+        try:
+            self._release_slot(admission.slot_key, admission.slot_token)
+            limits = self.limits_for(admission.provider, admission.model)
+            if actual_tokens is None or limits is None or not limits.tokens_per_minute:
+                return
+            token_key = self._window_key(
+                self._route_id(admission.provider, admission.model), admission.window_index, "tok"
+            )
+            delta = int(actual_tokens) - admission.estimated_tokens
+            if delta > 0:
+                self._incr(token_key, delta)
+            elif delta < 0:
+                self._decr(token_key, -delta)
+        except Exception as exc:
+            logger.debug("AI rate limiter release failed (%s/%s): %s", admission.provider, admission.model, exc)
+
+
+class _WindowFull(Exception):
+    pass
+
+
+ai_rate_limiter = AIRateLimiter()
@@ -0,0 +1,391 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- RouteHealth: Point-in-time health of one provider/model route.
+- AIRouteHealthRegistry: Shared latency/error registry with circuit breakers and per-provider rate limits.
+- ai_route_health: Process-wide registry singleton.
+
+INTERACTIONS:
+- Depends on: django.core.cache (Redis in every deployed environment) and core.telemetry.metrics.AI_LATENCY_BUCKETS.
+- Used by: core.services.ai_client.AIClient for route ranking, admission, hedging deadlines and outcome recording.
+
+AI_GUIDELINES:
+- Every web and worker process shares the same counters, so only use atomic cache primitives (add/incr/get_many).
+- Keep the per-attempt write path to a handful of cache operations; reads are batched into one get_many.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+from core.services.logger_service import Logger
+from core.telemetry.metrics import AI_LATENCY_BUCKETS
+from django.conf import settings
+from django.core.cache import cache
+
+logger = Logger.get_logger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+REJECTED_CIRCUIT_OPEN = "circuit_open"
+REJECTED_RATE_LIMITED = "rate_limit"
+
+# Provider-side failures count against a route; request-specific errors (bad_request, schema
+# validation) only contribute a latency sample because another route would fail the same way.
+HEALTH_FAILURE_CODES = frozenset(
+    {"timeout", "connection_error", "rate_limit", "internal_server", "status_error", "not_found", "auth_error"}
+)
+
+_KEY_PREFIX = "ai:router:health"
+_BUCKET_FIELDS = tuple(f"b{index}" for index in range(len(AI_LATENCY_BUCKETS) + 1))
+_FIELDS = _BUCKET_FIELDS + ("ok", "err")
+
+
+@dataclass(frozen=True)
+class RouteHealth:
+    provider: str
+    model: str
+    state: str
+    samples: int
+    errors: int
+    p50_seconds: float | None
+    p95_seconds: float | None
+    retry_after_seconds: float = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        total = self.samples + self.errors
+        return self.errors / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "state": self.state,
+            "samples": self.samples,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "p50_seconds": self.p50_seconds,
+            "p95_seconds": self.p95_seconds,
+            "retry_after_seconds": round(self.retry_after_seconds, 3),
+        }
+
+
+def _percentile(bucket_counts: Sequence[int], quantile: float) -> float | None:
+    """Estimate a quantile from fixed-bucket counts, interpolating linearly inside the matching bucket."""
+    total = sum(bucket_counts)
+    if total <= 0:
+        return None
+    rank = quantile * total
+    cumulative = 0
+    for index, count in enumerate(bucket_counts):
+        if count <= 0:
+            continue
+        if cumulative + count >= rank:
+            lower = AI_LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+            upper = AI_LATENCY_BUCKETS[index] if index < len(AI_LATENCY_BUCKETS) else lower * 2
+            fraction = (rank - cumulative) / count
+            return round(lower + (upper - lower) * fraction, 3)
+        cumulative += count
+    return float(AI_LATENCY_BUCKETS[-1])
+
+
+def _bucket_index(latency_seconds: float) -> int:
+    for index, bound in enumerate(AI_LATENCY_BUCKETS):
+        if latency_seconds <= bound:
+            return index
+    return len(AI_LATENCY_BUCKETS)
+
+
+class AIRouteHealthRegistry:
+    """Rolling per-route health shared by every process through the Django cache.
+
+    Latency and outcomes land in time-sliced counters (``AI_ROUTER_HEALTH_SLICE_SECONDS`` wide, kept for
+    ``AI_ROUTER_HEALTH_WINDOW_SECONDS``) holding fixed-bucket histograms, so percentiles never need raw
+    samples. A route's circuit opens after ``AI_ROUTER_CIRCUIT_FAILURE_THRESHOLD`` consecutive failures or
+    when the windowed error rate crosses ``AI_ROUTER_CIRCUIT_ERROR_RATE``; after the cooldown a single
+    half-open probe is admitted and its outcome closes or re-opens the circuit. Providers listed in
+    ``AI_ROUTER_PROVIDER_RATE_LIMITS`` are admitted through a windowed token bucket.
+    """
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    @staticmethod
+    def is_enabled() -> bool:
+        if bool(getattr(settings, "TESTING", False)):
+            return False
+        return bool(getattr(settings, "AI_ROUTER_HEALTH_ENABLED", True))
+
+    @staticmethod
+    def _slice_seconds() -> int:
+        return max(1, int(getattr(settings, "AI_ROUTER_HEALTH_SLICE_SECONDS", 60)))
+
+    @classmethod
+    def _slice_count(cls) -> int:
+        window = int(getattr(settings, "AI_ROUTER_HEALTH_WINDOW_SECONDS", 300))
+        return max(1, math.ceil(window / cls._slice_seconds()))
+
+    @staticmethod
+    def min_samples() -> int:
+        return max(1, int(getattr(settings, "AI_ROUTER_MIN_SAMPLES", 5)))
+
+    @staticmethod
+    def _failure_threshold() -> int:
+        return max(1, int(getattr(settings, "AI_ROUTER_CIRCUIT_FAILURE_THRESHOLD", 5)))
+
+    @staticmethod
+    def _error_rate_threshold() -> float:
+        return float(getattr(settings, "AI_ROUTER_CIRCUIT_ERROR_RATE", 0.5))
+
+    @staticmethod
+    def _cooldown_seconds() -> float:
+        return max(1.0, float(getattr(settings, "AI_ROUTER_CIRCUIT_COOLDOWN_SECONDS", 30)))
+
+    @staticmethod
+    def _rate_limit(provider: str) -> tuple[int, float] | None:
+        """Return ``(burst, refill_per_second)`` for a provider, or None when it is not rate limited."""
+        limits = getattr(settings, "AI_ROUTER_PROVIDER_RATE_LIMITS", {}) or {}
+        configured = limits.get(provider)
+        if not configured:
+            return None
+        try:
+            rate, burst = configured
+            rate = float(rate)
+            burst = int(burst)
+        except (TypeError, ValueError):
+            return None
+        if rate <= 0 or burst <= 0:
+            return None
+        return burst, rate
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _route_id(provider: str, model: str) -> str:
+        return f"{provider}|{str(model or '').strip().replace(' ', '_')}"
+
+    def _slice_key(self, route_id: str, slice_index: int, field: str) -> str:
+        return f"{_KEY_PREFIX}:{route_id}:{slice_index}:{field}"
+
+    @staticmethod
+    def _state_key(route_id: str, name: str) -> str:
+        return f"{_KEY_PREFIX}:{route_id}:{name}"
+
+    def _current_slice(self, now: float | None = None) -> int:
+        return int((now if now is not None else time.time()) // self._slice_seconds())
+
+    def _window_keys(self, route_id: str, now: float) -> list[str]:
+        current = self._current_slice(now)
+        return [
+            self._slice_key(route_id, slice_index, field)
+            for slice_index in range(current - self._slice_count() + 1, current + 1)
+            for field in _FIELDS
+        ]
+
+    @staticmethod
+    def _incr(key: str, timeout: int) -> int:
+        cache.add(key, 0, timeout=timeout)
+        try:
+            return int(cache.incr(key))
+        except ValueError:
+            # Expired between add and incr.
+            cache.set(key, 1, timeout=timeout)
+            return 1
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def snapshot(self, routes: Iterable[tuple[str, str]]) -> dict[tuple[str, str], RouteHealth]:
+        """Health for each ``(provider, model)`` route, read in one cache round trip."""
+        route_list = list(dict.fromkeys((str(p), str(m or "")) for p, m in routes))
+        if not route_list:
+            return {}
+        now = time.time()
+        keys_by_route: dict[tuple[str, str], tuple[list[str], str]] = {}
+        all_keys: list[str] = []
+        for provider, model in route_list:
+            route_id = self._route_id(provider, model)
+            window_keys = self._window_keys(route_id, now)
+            open_until_key = self._state_key(route_id, "open_until")
+            keys_by_route[(provider, model)] = (window_keys, open_until_key)
+            all_keys.extend(window_keys)
+            all_keys.append(open_until_key)
+
+        try:
+            values = cache.get_many(all_keys)
+        except Exception as exc:
+            logger.debug("AI route health read failed: %s", exc)
+            values = {}
+
+        result: dict[tuple[str, str], RouteHealth] = {}
+        for (provider, model), (window_keys, open_until_key) in keys_by_route.items():
+            totals = dict.fromkeys(_FIELDS, 0)
+            for key in window_keys:
+                raw = values.get(key)
+                if raw:
+                    totals[key.rsplit(":", 1)[1]] += int(raw)
+            bucket_counts = [totals[field] for field in _BUCKET_FIELDS]
+            open_until = float(values.get(open_until_key) or 0)
+            if not open_until:
+                state, retry_after = CIRCUIT_CLOSED, 0.0
+            elif now < open_until:
+                state, retry_after = CIRCUIT_OPEN, open_until - now
+            else:
+                state, retry_after = CIRCUIT_HALF_OPEN, 0.0
+            result[(provider, model)] = RouteHealth(
+                provider=provider,
+                model=model,
+                state=state,
+                samples=totals["ok"],
+                errors=totals["err"],
+                p50_seconds=_percentile(bucket_counts, 0.5),
+                p95_seconds=_percentile(bucket_counts, 0.95),
+                retry_after_seconds=retry_after,
+            )
+        return result
+
+    def rank(self, routes: Sequence, *, prefer_fastest: bool = True) -> list:
+        """Order route objects (``provider_key``/``model`` attributes) healthiest and fastest first.
+
+        Closed and half-open circuits come first (a half-open route still needs its probe request), open
+        ones last (kept so callers can report why a route was skipped). Within a group, routes without
+        ``AI_ROUTER_MIN_SAMPLES`` measurements keep their configured position ahead of measured ones so
+        they get explored; measured routes sort by p95.
+        """
+        if not self.is_enabled() or len(routes) < 2:
+            return list(routes)
+        health = self.snapshot((route.provider_key, route.model) for route in routes)
+        state_rank = {CIRCUIT_CLOSED: 0, CIRCUIT_HALF_OPEN: 0, CIRCUIT_OPEN: 1}
+        min_samples = self.min_samples()
+
+        def sort_key(item):
+            index, route = item
+            route_health = health.get((route.provider_key, route.model))
+            if route_health is None:
+                return (0, 0.0, index)
+            latency = 0.0
+            if prefer_fastest and route_health.samples >= min_samples and route_health.p95_seconds is not None:
+                latency = route_health.p95_seconds
+            return (state_rank[route_health.state], latency, index)
+
+        return [route for _index, route in sorted(enumerate(routes), key=sort_key)]
+
+    def hedge_delay(self, provider: str, model: str) -> float | None:
+        """The p95 deadline after which a hedge request may start, or None without enough samples."""
+        route_health = self.snapshot([(provider, model)]).get((provider, model))
+        if route_health is None or route_health.samples < self.min_samples() or route_health.p95_seconds is None:
+            return None
+        floor = float(getattr(settings, "AI_ROUTER_HEDGE_MIN_DELAY_SECONDS", 1.0))
+        return max(floor, route_health.p95_seconds)
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+    def acquire(self, provider: str, model: str, *, probe_timeout: float | None = None) -> str | None:
+        """Admit one attempt on a route; returns None when admitted or the rejection reason."""
+        if not self.is_enabled():
+            return None
+        route_id = self._route_id(provider, model)
+        try:
+            open_until = float(cache.get(self._state_key(route_id, "open_until")) or 0)
+            if open_until:
+                if time.time() < open_until:
+                    return REJECTED_CIRCUIT_OPEN
+                probe_ttl = max(1, int(probe_timeout or self._cooldown_seconds()))
+                if not cache.add(self._state_key(route_id, "probe"), 1, timeout=probe_ttl):
+                    return REJECTED_CIRCUIT_OPEN
+                logger.info("AI route %s/%s half-open: admitting probe request", provider, model)
+            if not self._take_token(provider):
+                return REJECTED_RATE_LIMITED
+        except Exception as exc:
+            logger.debug("AI route admission check failed open (route=%s): %s", route_id, exc)
+        return None
+
+    def _take_token(self, provider: str) -> bool:
+        limit = self._rate_limit(provider)
+        if limit is None:
+            return True
+        burst, rate = limit
+        # Windowed token bucket: ``burst`` tokens are refilled every ``burst / rate`` seconds.
+        window = max(1.0, burst / rate)
+        window_index = int(time.time() // window)
+        key = f"{_KEY_PREFIX}:tokens:{provider}:{window_index}"
+        return self._incr(key, timeout=int(window) + 1) <= burst
+
+    def retry_after(self, provider: str, model: str) -> float:
+        route_health = self.snapshot([(provider, model)]).get((provider, model))
+        return route_health.retry_after_seconds if route_health else 0.0
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def record(self, provider: str, model: str, *, latency_seconds: float, error_code: str | None = None) -> None:
+        """Record one attempt outcome and move the route's circuit accordingly."""
+        if not self.is_enabled():
+            return
+        route_id = self._route_id(provider, model)
+        now = time.time()
+        current = self._current_slice(now)
+        ttl = (self._slice_count() + 1) * self._slice_seconds()
+        failed = bool(error_code) and error_code in HEALTH_FAILURE_CODES
+        try:
+            if failed:
+                self._incr(self._slice_key(route_id, current, "err"), ttl)
+                self._on_failure(provider, model, route_id, now)
+                return
+            self._incr(self._slice_key(route_id, current, _BUCKET_FIELDS[_bucket_index(latency_seconds)]), ttl)
+            self._incr(self._slice_key(route_id, current, "ok"), ttl)
+            if not error_code:
+                self._on_success(route_id)
+            else:
+                # A finished probe frees the half-open slot even when its error says nothing about route health.
+                cache.delete(self._state_key(route_id, "probe"))
+        except Exception as exc:
+            logger.debug("AI route health write failed (route=%s): %s", route_id, exc)
+
+    def _on_success(self, route_id: str) -> None:
+        keys = [self._state_key(route_id, name) for name in ("consecutive_failures", "open_until", "probe")]
+        if any(cache.get_many(keys).values()):
+            cache.delete_many(keys)
+
+    def _on_failure(self, provider: str, model: str, route_id: str, now: float) -> None:
+        cooldown = self._cooldown_seconds()
+        consecutive = self._incr(self._state_key(route_id, "consecutive_failures"), timeout=int(cooldown * 10))
+        open_until_key = self._state_key(route_id, "open_until")
+        half_open_probe_failed = bool(cache.get(open_until_key))
+
+        should_open = half_open_probe_failed or consecutive >= self._failure_threshold()
+        if not should_open:
+            route_health = self.snapshot([(provider, model)]).get((provider, model))
+            should_open = bool(
+                route_health
+                and route_health.samples + route_health.errors >= self.min_samples()
+                and route_health.error_rate >= self._error_rate_threshold()
+            )
+        if not should_open:
+            return
+
+        cache.set(open_until_key, now + cooldown, timeout=int(cooldown * 10))
+        cache.delete(self._state_key(route_id, "probe"))
+        logger.warning(
+            "AI route %s/%s circuit opened for %.0fs (consecutive_failures=%s)", provider, model, cooldown, consecutive
+        )
+
+    def reset(self, provider: str, model: str) -> None:
+        route_id = self._route_id(provider, model)
+        now = time.time()
+        cache.delete_many(
+            self._window_keys(route_id, now)
+            + [self._state_key(route_id, name) for name in ("consecutive_failures", "open_until", "probe")]
+        )
+
+
+ai_route_health = AIRouteHealthRegistry()
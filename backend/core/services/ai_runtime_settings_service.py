@@ -4,10 +4,14 @@ FILE_ROLE: Service-layer logic for the core app.
 KEY_COMPONENTS:
 - RuntimeSettingDefinition: Module symbol.
 - FallbackModelChainStep: Module symbol.
+- AIModelIndex: Immutable provider/model index compiled from the AiModel catalog.
+- AIRuntimeSnapshot: Immutable compiled runtime settings (defaults, effective values, fallback chain).
 - AIRuntimeSettingsService: Service class.
 
 INTERACTIONS:
 - Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
+- Snapshots are held by core.services.reference_catalog_cache (catalogs ``ai_models`` and ``ai_runtime_settings``),
+  so AiModel/AppSetting writes bump their version and evict them in every process.
 
 AI_GUIDELINES:
 - Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
@@ -16,9 +20,13 @@ AI_GUIDELINES:
 
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import Any
 from urllib.parse import urlparse, urlunparse
@@ -31,6 +39,7 @@ from django.conf import settings
 logger = logging.getLogger(__name__)
 _OPENROUTER_ALLOWED_BASE_URL_HOSTS = {"openrouter.ai", "api.openrouter.ai"}
 _OPENROUTER_DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+_BYPASS_SNAPSHOT: ContextVar[bool] = ContextVar("ai_runtime_bypass_snapshot", default=False)
 
 
 @dataclass(frozen=True)
@@ -48,6 +57,46 @@ class FallbackModelChainStep:
     timeout_seconds: float
 
 
+@dataclass(frozen=True)
+class AIModelIndex:
+    """Provider/model lookups compiled once per AiModel catalog version. Treat every field as read-only."""
+
+    catalog: dict[str, Any]
+    model_ids: frozenset[str]
+    model_ids_by_provider: dict[str, frozenset[str]]
+    providers_by_model: dict[str, tuple[str, ...]]
+    first_model_by_provider: dict[str, str]
+
+    def providers_for_model(self, model_id: str | None) -> list[str]:
+        return list(self.providers_by_model.get(str(model_id or "").strip(), ()))
+
+    def provider_for_model(self, model_id: str | None, *, fallback: str | None = None) -> str | None:
+        providers = self.providers_by_model.get(str(model_id or "").strip(), ())
+        if not providers:
+            candidate = str(fallback or "").strip().lower()
+            return candidate if candidate in _PROVIDER_OPTIONS else None
+
+        preferred = str(fallback or "").strip().lower()
+        if preferred and preferred in providers:
+            return preferred
+        return providers[0]
+
+
+@dataclass(frozen=True)
+class AIRuntimeSnapshot:
+    """Effective runtime settings compiled once per settings/catalog version. Treat every field as read-only."""
+
+    defaults: dict[str, Any]
+    values: dict[str, Any]
+    fallback_model_chain: tuple[FallbackModelChainStep, ...]
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, (list, dict, set)):
+        return copy.deepcopy(value)
+    return value
+
+
 AI_RUNTIME_SETTING_DEFINITIONS: dict[str, RuntimeSettingDefinition] = {
     "LLM_PROVIDER": RuntimeSettingDefinition(
         name="LLM_PROVIDER",
@@ -543,6 +592,7 @@ class AIRuntimeSettingsService:
         raw_value: Any,
         *,
         strict: bool = False,
+        index: AIModelIndex | None = None,
     ) -> list[dict[str, Any]]:
         parsed = AppSettingService.parse_json_like(raw_value)
         if isinstance(parsed, dict):
@@ -552,7 +602,8 @@ class AIRuntimeSettingsService:
         if not isinstance(parsed, (list, tuple)):
             parsed = []
 
-        model_ids = cls._all_model_ids()
+        index = index or cls._model_index()
+        model_ids = index.model_ids
         normalized_steps: list[dict[str, Any]] = []
         seen: set[tuple[str, str]] = set()
 
@@ -585,7 +636,7 @@ class AIRuntimeSettingsService:
                     raise ValueError(f"LLM_FALLBACK_MODEL_CHAIN contains unknown model '{step_model}'.")
                 continue
 
-            provider = cls.get_provider_for_model(step_model)
+            provider = index.provider_for_model(step_model)
             if not provider:
                 if strict:
                     raise ValueError(f"Unable to resolve provider for fallback model '{step_model}'.")
@@ -622,11 +673,132 @@ class AIRuntimeSettingsService:
         return normalized_steps
 
     @classmethod
-    def _fallback_chain_from_model_order(cls, model_ids: list[str]) -> list[dict[str, Any]]:
-        return cls._normalize_fallback_model_chain(model_ids, strict=False)
+    def _fallback_chain_from_model_order(
+        cls, model_ids: list[str], *, index: AIModelIndex | None = None
+    ) -> list[dict[str, Any]]:
+        return cls._normalize_fallback_model_chain(model_ids, strict=False, index=index)
+
+    # ------------------------------------------------------------------
+    # Compiled snapshots
+    # ------------------------------------------------------------------
+    @staticmethod
+    @contextmanager
+    def bypass_snapshot() -> Iterator[None]:
+        """Read AiModel and AppSetting rows directly instead of the shared snapshots inside the block.
+
+        Used when the caller must see uncommitted writes from its own transaction (e.g. repairing
+        settings from an AiModel ``post_delete`` handler), and by benchmarks to measure the uncached path.
+        """
+        token = _BYPASS_SNAPSHOT.set(True)
+        try:
+            yield
+        finally:
+            _BYPASS_SNAPSHOT.reset(token)
+
+    @classmethod
+    def _model_index(cls) -> AIModelIndex:
+        if _BYPASS_SNAPSHOT.get():
+            return cls.build_model_index()
+        from core.services.reference_catalog_cache import AI_MODELS, reference_catalog_cache
+
+        return reference_catalog_cache.get(AI_MODELS.name)
+
+    @classmethod
+    def _runtime_snapshot(cls) -> AIRuntimeSnapshot:
+        if _BYPASS_SNAPSHOT.get():
+            return cls.build_runtime_snapshot()
+        from core.services.reference_catalog_cache import AI_RUNTIME_SETTINGS, reference_catalog_cache
+
+        return reference_catalog_cache.get(AI_RUNTIME_SETTINGS.name)
+
+    @classmethod
+    def build_model_index(cls) -> AIModelIndex:
+        """Compile the provider/model index from one AiModel query."""
+        catalog = cls._load_llm_models_config()
+        model_ids_by_provider: dict[str, frozenset[str]] = {}
+        first_model_by_provider: dict[str, str] = {}
+        providers_by_model: dict[str, list[str]] = {}
+        for provider_name, provider_data in catalog.get("providers", {}).items():
+            models = provider_data.get("models", []) if isinstance(provider_data, dict) else []
+            ids = [str(model.get("id") or "").strip() for model in models]
+            ids = [model_id for model_id in ids if model_id]
+            model_ids_by_provider[str(provider_name)] = frozenset(ids)
+            first_model_by_provider[str(provider_name)] = ids[0] if ids else ""
+            for model_id in ids:
+                providers_by_model.setdefault(model_id, [])
+                if str(provider_name) not in providers_by_model[model_id]:
+                    providers_by_model[model_id].append(str(provider_name))
+
+        ordered_providers_by_model: dict[str, tuple[str, ...]] = {}
+        for model_id, matches in providers_by_model.items():
+            ordered = [provider for provider in _PROVIDER_PRIORITY if provider in matches]
+            ordered.extend(provider for provider in sorted(matches) if provider not in ordered)
+            ordered_providers_by_model[model_id] = tuple(ordered)
+
+        return AIModelIndex(
+            catalog=catalog,
+            model_ids=frozenset(ordered_providers_by_model),
+            model_ids_by_provider=model_ids_by_provider,
+            providers_by_model=ordered_providers_by_model,
+            first_model_by_provider=first_model_by_provider,
+        )
+
+    @classmethod
+    def build_runtime_snapshot(cls) -> AIRuntimeSnapshot:
+        """Compile defaults, effective values and the fallback chain against one model index."""
+        index = cls._model_index()
+        defaults = cls._compute_defaults(index=index)
+        raw_values = AppSettingService.get_raw_values(AI_RUNTIME_SETTING_DEFINITIONS, require_override=True)
+        values: dict[str, Any] = {}
+        for name in AI_RUNTIME_SETTING_DEFINITIONS:
+            if name not in defaults:
+                continue
+            raw_value = raw_values.get(name)
+            if raw_value is None:
+                values[name] = defaults[name]
+            else:
+                values[name] = cls._coerce_value(name, raw_value, defaults[name], index=index)
+        return AIRuntimeSnapshot(
+            defaults=defaults,
+            values=values,
+            fallback_model_chain=tuple(cls._compile_fallback_model_chain(values, index)),
+        )
+
+    @classmethod
+    def _compile_fallback_model_chain(
+        cls, values: dict[str, Any], index: AIModelIndex
+    ) -> list[FallbackModelChainStep]:
+        normalized_chain = cls._normalize_fallback_model_chain(
+            values.get("LLM_FALLBACK_MODEL_CHAIN"), strict=False, index=index
+        )
+        if not normalized_chain:
+            normalized_chain = cls._fallback_chain_from_model_order(
+                AppSettingService.parse_list(values.get("LLM_FALLBACK_MODEL_ORDER"), []),
+                index=index,
+            )
+
+        result: list[FallbackModelChainStep] = []
+        for step in normalized_chain:
+            model = str(step.get("model") or "").strip()
+            provider = index.provider_for_model(model)
+            timeout_seconds = float(step.get("timeoutSeconds") or 0)
+            if not model or not provider or timeout_seconds <= 0:
+                continue
+            result.append(
+                FallbackModelChainStep(
+                    provider=provider,
+                    model=model,
+                    timeout_seconds=timeout_seconds,
+                )
+            )
+        return result
 
     @classmethod
     def defaults(cls) -> dict[str, Any]:
+        return {name: _copy_value(value) for name, value in cls._runtime_snapshot().defaults.items()}
+
+    @classmethod
+    def _compute_defaults(cls, *, index: AIModelIndex | None = None) -> dict[str, Any]:
         llm_provider = (
             str(cls._default_from_settings_and_env("LLM_PROVIDER", "openrouter") or "openrouter").strip().lower()
         )
@@ -656,9 +828,9 @@ class AIRuntimeSettingsService:
         )
         raw_fallback_chain = cls._default_from_settings_and_env("LLM_FALLBACK_MODEL_CHAIN", None)
         fallback_model_chain = (
-            cls._normalize_fallback_model_chain(raw_fallback_chain, strict=False)
+            cls._normalize_fallback_model_chain(raw_fallback_chain, strict=False, index=index)
             if raw_fallback_chain not in (None, "")
-            else cls._fallback_chain_from_model_order(fallback_model_order)
+            else cls._fallback_chain_from_model_order(fallback_model_order, index=index)
         )
         fallback_model_order = [step["model"] for step in fallback_model_chain] or fallback_model_order
         return {
@@ -853,7 +1025,9 @@ class AIRuntimeSettingsService:
         }
 
     @classmethod
-    def _coerce_value(cls, name: str, raw_value: Any, default_value: Any) -> Any:
+    def _coerce_value(
+        cls, name: str, raw_value: Any, default_value: Any, *, index: AIModelIndex | None = None
+    ) -> Any:
         definition = AI_RUNTIME_SETTING_DEFINITIONS[name]
         if name == "OPENROUTER_API_BASE_URL":
             return cls._normalize_openrouter_api_base_url(raw_value, strict=False)
@@ -867,46 +1041,32 @@ class AIRuntimeSettingsService:
             return AppSettingService.parse_list(raw_value, list(default_value or []))
         if definition.value_type == "json":
             if name == "LLM_FALLBACK_MODEL_CHAIN":
-                return cls._normalize_fallback_model_chain(raw_value, strict=False)
+                return cls._normalize_fallback_model_chain(raw_value, strict=False, index=index)
             return AppSettingService.parse_json_like(raw_value)
         return str(raw_value if raw_value is not None else default_value).strip()
 
     @classmethod
     def get(cls, name: str) -> Any:
-        defaults = cls.defaults()
-        if name not in defaults or name not in AI_RUNTIME_SETTING_DEFINITIONS:
+        values = cls._runtime_snapshot().values
+        if name not in values:
             raise KeyError(f"Unsupported runtime setting '{name}'.")
-        default_value = defaults[name]
-        raw_value = AppSettingService.get_raw(name, default=None, require_override=True)
-        if raw_value is None:
-            return default_value
-        return cls._coerce_value(name, raw_value, default_value)
+        return _copy_value(values[name])
 
     @classmethod
     def get_many(cls) -> dict[str, Any]:
-        defaults = cls.defaults()
-        values: dict[str, Any] = {}
-        for name in AI_RUNTIME_SETTING_DEFINITIONS:
-            values[name] = cls.get(name)
-        for key, default_value in defaults.items():
-            values.setdefault(key, default_value)
+        snapshot = cls._runtime_snapshot()
+        values: dict[str, Any] = {name: _copy_value(value) for name, value in snapshot.values.items()}
+        for key, default_value in snapshot.defaults.items():
+            values.setdefault(key, _copy_value(default_value))
         return values
 
     @classmethod
     def _first_available_model_for_provider(cls, provider: str) -> str:
-        catalog = cls.get_model_catalog()
-        providers = catalog.get("providers", {}) if isinstance(catalog, dict) else {}
-        provider_data = providers.get(provider, {}) if isinstance(providers, dict) else {}
-        models = provider_data.get("models", []) if isinstance(provider_data, dict) else []
-        for model in models:
-            model_id = str(model.get("id") or "").strip()
-            if model_id:
-                return model_id
-        return ""
+        return cls._model_index().first_model_by_provider.get(provider, "")
 
     @classmethod
     def _pick_available_model_for_provider(cls, provider: str, *candidates: Any) -> str:
-        available_ids = cls._model_ids_by_provider().get(provider, set())
+        available_ids = cls._model_index().model_ids_by_provider.get(provider, frozenset())
         for candidate in candidates:
             normalized = str(candidate or "").strip()
             if normalized and normalized in available_ids:
@@ -1025,28 +1185,7 @@ class AIRuntimeSettingsService:
 
     @classmethod
     def get_fallback_model_chain(cls) -> list[FallbackModelChainStep]:
-        raw_chain = cls.get("LLM_FALLBACK_MODEL_CHAIN")
-        normalized_chain = cls._normalize_fallback_model_chain(raw_chain, strict=False)
-        if not normalized_chain:
-            normalized_chain = cls._fallback_chain_from_model_order(
-                AppSettingService.parse_list(cls.get("LLM_FALLBACK_MODEL_ORDER"), [])
-            )
-
-        result: list[FallbackModelChainStep] = []
-        for step in normalized_chain:
-            model = str(step.get("model") or "").strip()
-            provider = cls.get_provider_for_model(model)
-            timeout_seconds = float(step.get("timeoutSeconds") or 0)
-            if not model or not provider or timeout_seconds <= 0:
-                continue
-            result.append(
-                FallbackModelChainStep(
-                    provider=provider,
-                    model=model,
-                    timeout_seconds=timeout_seconds,
-                )
-            )
-        return result
+        return list(cls._runtime_snapshot().fallback_model_chain)
 
     @classmethod
     def get_fallback_model_order(cls) -> list[str]:
@@ -1106,67 +1245,23 @@ class AIRuntimeSettingsService:
 
     @classmethod
     def get_model_catalog(cls) -> dict[str, Any]:
-        return cls._load_llm_models_config()
+        return copy.deepcopy(cls._model_index().catalog)
 
     @classmethod
     def _all_model_ids(cls) -> set[str]:
-        catalog = cls.get_model_catalog()
-        providers = catalog.get("providers", {})
-        model_ids: set[str] = set()
-        for provider_data in providers.values():
-            models = provider_data.get("models", []) if isinstance(provider_data, dict) else []
-            for model in models:
-                model_id = str(model.get("id") or "").strip()
-                if model_id:
-                    model_ids.add(model_id)
-        return model_ids
+        return set(cls._model_index().model_ids)
 
     @classmethod
     def _model_ids_by_provider(cls) -> dict[str, set[str]]:
-        catalog = cls.get_model_catalog()
-        providers = catalog.get("providers", {})
-        provider_map: dict[str, set[str]] = {}
-        for provider_name, provider_data in providers.items():
-            models = provider_data.get("models", []) if isinstance(provider_data, dict) else []
-            values: set[str] = set()
-            for model in models:
-                model_id = str(model.get("id") or "").strip()
-                if model_id:
-                    values.add(model_id)
-            provider_map[str(provider_name)] = values
-        return provider_map
+        return {provider: set(model_ids) for provider, model_ids in cls._model_index().model_ids_by_provider.items()}
 
     @classmethod
     def get_providers_for_model(cls, model_id: str | None) -> list[str]:
-        normalized_model_id = str(model_id or "").strip()
-        if not normalized_model_id:
-            return []
-
-        by_provider = cls._model_ids_by_provider()
-        matches = [provider for provider, model_ids in by_provider.items() if normalized_model_id in model_ids]
-        if not matches:
-            return []
-
-        ordered: list[str] = []
-        for provider in _PROVIDER_PRIORITY:
-            if provider in matches:
-                ordered.append(provider)
-        for provider in sorted(matches):
-            if provider not in ordered:
-                ordered.append(provider)
-        return ordered
+        return cls._model_index().providers_for_model(model_id)
 
     @classmethod
     def get_provider_for_model(cls, model_id: str | None, *, fallback: str | None = None) -> str | None:
-        providers = cls.get_providers_for_model(model_id)
-        if not providers:
-            candidate = str(fallback or "").strip().lower()
-            return candidate if candidate in _PROVIDER_OPTIONS else None
-
-        preferred = str(fallback or "").strip().lower()
-        if preferred and preferred in providers:
-            return preferred
-        return providers[0]
+        return cls._model_index().provider_for_model(model_id, fallback=fallback)
 
     @classmethod
     def workflow_bindings(cls) -> list[dict[str, Any]]:
@@ -0,0 +1,201 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- AIUsageRollupService: Maintains and queries hourly AI usage rollups.
+
+INTERACTIONS:
+- Depends on: core.models.AIRequestUsage (raw rows) and core.models.AIUsageRollup (hourly totals).
+- Used by: AIUsageService.record_request (incremental writes), the rollup compaction task and rebuild
+  command (reconciliation), and the OpenRouter status / AI costing dashboards (reads).
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Incremental updates are best effort; rebuild() recomputes a window from raw rows and is the source of truth.
+- Dashboard reads must filter on bucket_start ranges so the (provider, bucket_start) indexes are usable.
+"""
+
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+from typing import Any
+
+from core.models.ai_request_usage import AIRequestUsage
+from core.models.ai_usage_rollup import AIUsageRollup
+from core.services.logger_service import Logger
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncHour
+from django.utils import timezone
+
+logger = Logger.get_logger(__name__)
+
+_ROLLUP_COUNTERS = ("request_count", "success_count", "failed_count", "total_tokens", "total_cost")
+
+
+class AIUsageRollupService:
+    """Hourly usage totals keyed by (bucket_start, feature, provider, model)."""
+
+    @staticmethod
+    def bucket_for(moment: datetime.datetime) -> datetime.datetime:
+        """Return the UTC hour that contains ``moment``."""
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def period_bounds(now: datetime.datetime, *, month: bool) -> tuple[datetime.datetime, datetime.datetime]:
+        """Return ``[start, end)`` of the current local month or year as aware datetimes."""
+        local_now = timezone.localtime(now)
+        if month:
+            start = local_now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            if start.month == 12:
+                end = start.replace(year=start.year + 1, month=1)
+            else:
+                end = start.replace(month=start.month + 1)
+        else:
+            start = local_now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+            end = start.replace(year=start.year + 1)
+        return start, end
+
+    @classmethod
+    def record(cls, usage: AIRequestUsage) -> None:
+        """Add one persisted usage row to its hourly bucket."""
+        key = {
+            "bucket_start": cls.bucket_for(usage.created_at or timezone.now()),
+            "feature": usage.feature,
+            "provider": usage.provider,
+            "model": usage.model,
+        }
+        deltas = {
+            "request_count": 1,
+            "success_count": 1 if usage.success else 0,
+            "failed_count": 0 if usage.success else 1,
+            "total_tokens": int(usage.total_tokens or 0),
+            "total_cost": usage.cost_usd or Decimal("0"),
+        }
+        increments = {name: F(name) + value for name, value in deltas.items()}
+
+        if AIUsageRollup.objects.filter(**key).update(**increments, updated_at=timezone.now()):
+            return
+        try:
+            with transaction.atomic():
+                AIUsageRollup.objects.create(**key, **deltas)
+        except IntegrityError:
+            # Another writer created the bucket between our update and insert.
+            AIUsageRollup.objects.filter(**key).update(**increments, updated_at=timezone.now())
+
+    @staticmethod
+    def _aggregate_raw(queryset):
+        return (
+            queryset.annotate(bucket=TruncHour("created_at", tzinfo=datetime.timezone.utc))
+            .values("bucket", "feature", "provider", "model")
+            .annotate(
+                request_count=Count("id"),
+                success_count=Count("id", filter=Q(success=True)),
+                failed_count=Count("id", filter=Q(success=False)),
+                total_tokens=Coalesce(Sum("total_tokens"), 0),
+                total_cost=Coalesce(Sum("cost_usd"), Value(Decimal("0"))),
+            )
+            .order_by()
+        )
+
+    @classmethod
+    def rebuild(
+        cls,
+        *,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> dict[str, int]:
+        """Recompute rollups for ``[start, end)`` (whole hours) from raw rows; ``None`` bounds are open."""
+        raw_rows = AIRequestUsage.objects.all()
+        rollups = AIUsageRollup.objects.all()
+        if start is not None:
+            start = cls.bucket_for(start)
+            raw_rows = raw_rows.filter(created_at__gte=start)
+            rollups = rollups.filter(bucket_start__gte=start)
+        if end is not None:
+            end_bucket = cls.bucket_for(end)
+            end = end_bucket if end_bucket == end else end_bucket + datetime.timedelta(hours=1)
+            raw_rows = raw_rows.filter(created_at__lt=end)
+            rollups = rollups.filter(bucket_start__lt=end)
+
+        with transaction.atomic():
+            # Lock existing buckets so concurrent record() calls wait instead of being overwritten.
+            list(rollups.select_for_update().values_list("pk", flat=True))
+            fresh = [
+                AIUsageRollup(
+                    bucket_start=row["bucket"],
+                    feature=row["feature"],
+                    provider=row["provider"],
+                    model=row["model"],
+                    **{name: row[name] for name in _ROLLUP_COUNTERS},
+                )
+                for row in cls._aggregate_raw(raw_rows)
+            ]
+            deleted, _ = rollups.delete()
+            AIUsageRollup.objects.bulk_create(fresh, batch_size=1000)
+
+        logger.info("Rebuilt AI usage rollups: buckets=%s replaced=%s start=%s end=%s", len(fresh), deleted, start, end)
+        return {"buckets": len(fresh), "replaced": deleted}
+
+    @staticmethod
+    def _filtered(
+        start: datetime.datetime,
+        end: datetime.datetime,
+        *,
+        feature: str | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+    ):
+        queryset = AIUsageRollup.objects.filter(bucket_start__gte=start, bucket_start__lt=end)
+        if feature is not None:
+            queryset = queryset.filter(feature=feature)
+        if provider is not None:
+            queryset = queryset.filter(provider=provider)
+        if model is not None:
+            queryset = queryset.filter(model=model)
+        return queryset
+
+    @staticmethod
+    def _sums() -> dict[str, Any]:
+        return {
+            "request_count": Coalesce(Sum("request_count"), 0),
+            "success_count": Coalesce(Sum("success_count"), 0),
+            "failed_count": Coalesce(Sum("failed_count"), 0),
+            "total_tokens": Coalesce(Sum("total_tokens"), 0),
+            "total_cost": Coalesce(Sum("total_cost"), Value(Decimal("0"))),
+        }
+
+    @classmethod
+    def totals(cls, start: datetime.datetime, end: datetime.datetime, **filters) -> dict[str, Any]:
+        """Summed counters for ``[start, end)`` (optionally narrowed by feature/provider/model)."""
+        return cls._filtered(start, end, **filters).aggregate(**cls._sums())
+
+    @classmethod
+    def breakdown(
+        cls,
+        group_field: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        **filters,
+    ) -> list[dict[str, Any]]:
+        """Summed counters grouped by ``group_field`` (feature, provider or model), costliest first."""
+        return list(
+            cls._filtered(start, end, **filters)
+            .values(group_field)
+            .annotate(**cls._sums())
+            .order_by("-total_cost", "-request_count", group_field)
+        )
+
+    @classmethod
+    def series(cls, trunc, start: datetime.datetime, end: datetime.datetime, **filters) -> list[dict[str, Any]]:
+        """Summed counters per ``trunc`` period (e.g. ``TruncDate("bucket_start")``) as ``period`` rows."""
+        return list(
+            cls._filtered(start, end, **filters)
+            .annotate(period=trunc)
+            .values("period")
+            .annotate(**cls._sums())
+            .order_by("period")
+        )
@@ -164,7 +164,7 @@ class AIUsageService:
 
         try:
             ai_request_usage_model = apps.get_model("core", "AIRequestUsage")
-            ai_request_usage_model.objects.create(
+            usage = ai_request_usage_model.objects.create(
                 feature=feature or AIUsageFeature.UNKNOWN,
                 provider=provider or "unknown",
                 model=model or "unknown",
@@ -177,3 +177,12 @@ class AIUsageService:
             )
         except Exception as exc:
             logger.warning("Failed to persist AI request usage record: %s", str(exc))
+            return
+
+        try:
+            from core.services.ai_usage_rollup_service import AIUsageRollupService
+
+            AIUsageRollupService.record(usage)
+        except Exception as exc:
+            # The periodic compaction rebuilds recent buckets from raw rows, so a miss here self-heals.
+            logger.warning("Failed to update AI usage rollup: %s", str(exc))
@@ -24,7 +24,6 @@ from typing import Any
 
 from core.models import AppSetting
 from django.conf import settings
-from django.core.cache import cache
 
 
 class AppSettingScope:
@@ -39,7 +38,6 @@ logger = logging.getLogger(__name__)
 
 
 class AppSettingService:
-    _CACHE_ALL_ROWS_KEY = "app_settings:rows:v1"
     _RUNTIME_OVERRIDE_MARKER = "__runtime_override__"
 
     @staticmethod
@@ -51,20 +49,26 @@ class AppSettingService:
         if not cls._cache_enabled():
             return
         try:
-            cache.delete(cls._CACHE_ALL_ROWS_KEY)
+            from core.services.reference_catalog_cache import APP_SETTINGS, reference_catalog_cache
+
+            # Also drops catalogs compiled from settings rows (e.g. the AI runtime snapshot).
+            reference_catalog_cache.invalidate_for_model(APP_SETTINGS.model_labels[0])
         except Exception:
             return
 
     @classmethod
     def _load_all_rows(cls) -> dict[str, dict[str, Any]]:
-        if cls._cache_enabled():
-            try:
-                cached = cache.get(cls._CACHE_ALL_ROWS_KEY)
-                if isinstance(cached, dict):
-                    return cached
-            except Exception:
-                cached = None
+        if not cls._cache_enabled():
+            return cls._query_all_rows()
+        try:
+            from core.services.reference_catalog_cache import APP_SETTINGS, reference_catalog_cache
+
+            return reference_catalog_cache.get(APP_SETTINGS.name)
+        except Exception:
+            return cls._query_all_rows()
 
+    @classmethod
+    def _query_all_rows(cls, *, raise_errors: bool = False) -> dict[str, dict[str, Any]]:
         if not cls._model_available():
             return {}
 
@@ -82,9 +86,11 @@ class AppSettingService:
                 )
             )
         except Exception:
+            if raise_errors:
+                raise
             return {}
 
-        mapped = {
+        return {
             str(row["name"]): {
                 "value": row.get("value"),
                 "updated_by_id": row.get("updated_by_id"),
@@ -96,12 +102,6 @@ class AppSettingService:
             }
             for row in rows
         }
-        if cls._cache_enabled():
-            try:
-                cache.set(cls._CACHE_ALL_ROWS_KEY, mapped, timeout=None)
-            except Exception:
-                return mapped
-        return mapped
 
     @classmethod
     def get_effective_raw(cls, name: str, hardcoded_default: Any = None) -> Any:
@@ -167,6 +167,20 @@ class AppSettingService:
             return default
         return row.get("value")
 
+    @classmethod
+    def get_raw_values(cls, names: Iterable[str], *, require_override: bool = False) -> dict[str, Any]:
+        """Bulk variant of ``get_raw`` that reads the settings rows once; names without a value are omitted."""
+        rows = cls._load_all_rows()
+        values: dict[str, Any] = {}
+        for name in names:
+            row = rows.get(name)
+            if row is None:
+                continue
+            if require_override and not cls._is_runtime_override(row):
+                continue
+            values[name] = row.get("value")
+        return values
+
     @classmethod
     def set_raw(
         cls,
@@ -0,0 +1,95 @@
+"""
+FILE_ROLE: Age-based pruning of the artifact caches and job outputs kept under TMPFILES_FOLDER.
+
+KEY_COMPONENTS:
+- ARTIFACT_CACHE_FOLDERS: Cache sub-folders (relative to TMPFILES_FOLDER) pruned by age.
+- JOB_OUTPUT_FOLDERS: Sub-folders holding one-off background job outputs kept only for download.
+- prune_storage_folder: Delete the files under one storage prefix last modified before a cutoff.
+- prune_artifact_caches: Prune every registered cache folder older than ARTIFACT_CACHE_MAX_AGE_DAYS.
+- prune_job_outputs: Prune every registered job output folder older than JOB_OUTPUT_MAX_AGE_HOURS.
+
+INTERACTIONS:
+- Depends on: core.storage.get_media_store_adapter and django.core.files.storage.default_storage.
+- Used by: core.tasks.cron_jobs (daily clear-cache job).
+
+AI_GUIDELINES:
+- Cache entries are keyed by their content, so deleting one only costs a rebuild on the next request.
+- Register new content-keyed caches in ARTIFACT_CACHE_FOLDERS instead of adding another cleanup job.
+- Job outputs cannot be rebuilt on demand; keep JOB_OUTPUT_MAX_AGE_HOURS longer than a download takes.
+"""
+
+from __future__ import annotations
+
+import datetime
+
+from core.services.logger_service import Logger
+from core.storage import get_media_store_adapter
+from django.conf import settings
+from django.core.files.storage import Storage, default_storage
+from django.utils import timezone
+
+logger = Logger.get_logger(__name__)
+
+ARTIFACT_CACHE_FOLDERS = (
+    # core.services.document_merger.DocumentMerger.CONVERSION_CACHE_FOLDER
+    "pdf_conversion_cache",
+    # invoices.services.invoice_document_cache.ARTIFACT_CACHE_FOLDER
+    "invoice_artifacts",
+    # reports.services.excel_export.ARTIFACT_CACHE_FOLDER
+    "report_exports/cache",
+)
+
+JOB_OUTPUT_FOLDERS = (
+    # customer_applications.tasks.run_document_merge_job
+    "document_merges",
+)
+
+
+def prune_storage_folder(prefix: str, *, before: datetime.datetime, storage: Storage | None = None) -> int:
+    """Delete files under ``prefix`` last modified before ``before``; return how many were deleted."""
+    storage = storage or default_storage
+    adapter = get_media_store_adapter(storage)
+    expired = []
+    for key in adapter.iter_files(prefix):
+        try:
+            modified = storage.get_modified_time(key)
+        except Exception as exc:
+            logger.debug("Artifact cache entry skipped (%s): %s", key, exc)
+            continue
+        if timezone.is_naive(modified):
+            modified = timezone.make_aware(modified, datetime.timezone.utc)
+        if modified < before:
+            expired.append(key)
+
+    if not expired:
+        return 0
+    failures = adapter.bulk_delete(expired)
+    for key, error in failures.items():
+        logger.warning("Artifact cache entry delete failed (%s): %s", key, error)
+    return len(expired) - len(failures)
+
+
+def prune_artifact_caches(*, now: datetime.datetime | None = None, storage: Storage | None = None) -> dict[str, int]:
+    """Prune every artifact cache folder; returns deleted file counts keyed by folder."""
+    max_age_days = int(getattr(settings, "ARTIFACT_CACHE_MAX_AGE_DAYS", 30))
+    if max_age_days <= 0:
+        return {}
+    before = (now or timezone.now()) - datetime.timedelta(days=max_age_days)
+    tmp_folder = getattr(settings, "TMPFILES_FOLDER", "tmpfiles")
+    deleted = {}
+    for folder in ARTIFACT_CACHE_FOLDERS:
+        deleted[folder] = prune_storage_folder(f"{tmp_folder}/{folder}", before=before, storage=storage)
+    return deleted
+
+
+def prune_job_outputs(*, now: datetime.datetime | None = None, storage: Storage | None = None) -> dict[str, int]:
+    """Prune every job output folder; returns deleted file counts keyed by folder."""
+    max_age_hours = int(getattr(settings, "JOB_OUTPUT_MAX_AGE_HOURS", 24))
+    if max_age_hours <= 0:
+        return {}
+    before = (now or timezone.now()) - datetime.timedelta(hours=max_age_hours)
+    tmp_folder = getattr(settings, "TMPFILES_FOLDER", "tmpfiles")
+    deleted = {}
+    for folder in JOB_OUTPUT_FOLDERS:
+        deleted[folder] = prune_storage_folder(f"{tmp_folder}/{folder}", before=before, storage=storage)
+    return deleted
@@ -0,0 +1,284 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- AuditTrailService: Buffered CRUD audit capture, monthly partition management and retention.
+
+INTERACTIONS:
+- Depends on: django-auditlog (registry, diffing, actor context), core.models.AuditTrailEntry.
+- Used by: CoreConfig.ready (model registration), request_finished / Dramatiq middleware (flushes),
+  and core.tasks.cron_jobs (partition upkeep and retention).
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Entries reach the write buffer only from transaction.on_commit, so rolled-back work is never audited.
+- The buffer is process-wide and flushed in bulk; never write AuditTrailEntry rows one by one from receivers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import datetime
+import re
+import threading
+from functools import partial
+
+from core.bulk_signals import post_bulk_create
+from core.models.audit_trail import AuditTrailEntry
+from core.services.logger_service import Logger
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.signals import request_finished
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from django.utils.encoding import smart_str
+
+logger = Logger.get_logger(__name__)
+
+AUDIT_TABLE = AuditTrailEntry._meta.db_table
+_PARTITION_RE = re.compile(rf"^{AUDIT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+_pending: list[AuditTrailEntry] = []
+_pending_lock = threading.Lock()
+
+
+def _month_start(value: datetime.date) -> datetime.date:
+    return value.replace(day=1)
+
+
+def _next_month(value: datetime.date) -> datetime.date:
+    return (value.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+class AuditTrailService:
+    """Capture audited model changes in memory and persist them in bulk after commit."""
+
+    @staticmethod
+    def buffered() -> bool:
+        return bool(getattr(settings, "AUDIT_TRAIL_BUFFERED", True))
+
+    @staticmethod
+    def batch_size() -> int:
+        return max(1, int(getattr(settings, "AUDIT_TRAIL_BATCH_SIZE", 200)))
+
+    # -- registration -------------------------------------------------------------------------
+
+    @classmethod
+    def register(cls, model) -> None:
+        """Register ``model`` with auditlog, replacing its synchronous CRUD receivers with buffered ones."""
+        from auditlog.registry import auditlog
+
+        auditlog.register(model)
+        label = model._meta.label_lower
+        if not cls.buffered():
+            post_bulk_create.connect(_log_bulk_create, sender=model, dispatch_uid=f"audit_trail_bulk_create:{label}")
+            return
+
+        # Keep the registry entry (field filters, masking) for diffing but drop auditlog's per-save INSERTs.
+        auditlog._disconnect_signals(model)
+        pre_save.connect(_capture_update, sender=model, dispatch_uid=f"audit_trail_update:{label}")
+        post_save.connect(_capture_create, sender=model, dispatch_uid=f"audit_trail_create:{label}")
+        post_delete.connect(_capture_delete, sender=model, dispatch_uid=f"audit_trail_delete:{label}")
+        post_bulk_create.connect(_capture_bulk_create, sender=model, dispatch_uid=f"audit_trail_bulk_create:{label}")
+
+    # -- capture ------------------------------------------------------------------------------
+
+    @classmethod
+    def capture(cls, instance, action: int, changes: dict | None) -> None:
+        """Queue an entry that is buffered once the surrounding transaction commits."""
+        entry = cls._build_entry(instance, action, changes)
+        transaction.on_commit(partial(cls._buffer, entry))
+
+    @classmethod
+    def capture_many(cls, captured: list[tuple[object, dict | None]], action: int) -> None:
+        """Queue one entry per ``(instance, changes)`` pair behind a single on-commit callback."""
+        entries = [cls._build_entry(instance, action, changes) for instance, changes in captured]
+        if entries:
+            transaction.on_commit(partial(cls._buffer_many, entries))
+
+    @staticmethod
+    def _build_entry(instance, action: int, changes: dict | None) -> AuditTrailEntry:
+        from auditlog.cid import get_cid
+        from auditlog.context import auditlog_value
+
+        pk = instance.pk
+        try:
+            object_repr = smart_str(instance)
+        except ObjectDoesNotExist:
+            object_repr = "<error forming object repr>"
+
+        context = auditlog_value.get(None) or {}
+        actor = context.get("actor")
+        if not isinstance(actor, get_user_model()):
+            actor = None
+
+        return AuditTrailEntry(
+            timestamp=timezone.now(),
+            content_type=ContentType.objects.get_for_model(instance),
+            object_pk=smart_str(pk),
+            object_id=pk if isinstance(pk, int) else None,
+            object_repr=object_repr,
+            action=action,
+            changes=changes,
+            actor=actor,
+            actor_email=(getattr(actor, "email", "") or "") if actor else "",
+            remote_addr=context.get("remote_addr"),
+            cid=get_cid() or "",
+        )
+
+    @classmethod
+    def _buffer(cls, entry: AuditTrailEntry) -> None:
+        cls._buffer_many([entry])
+
+    @classmethod
+    def _buffer_many(cls, entries: list[AuditTrailEntry]) -> None:
+        with _pending_lock:
+            _pending.extend(entries)
+            should_flush = len(_pending) >= cls.batch_size()
+        if should_flush:
+            cls.flush()
+
+    @classmethod
+    def flush(cls, **kwargs) -> int:
+        """Write every buffered entry in one bulk insert; safe to call from any thread or signal."""
+        with _pending_lock:
+            if not _pending:
+                return 0
+            batch = list(_pending)
+            _pending.clear()
+        try:
+            AuditTrailEntry.objects.bulk_create(batch, batch_size=cls.batch_size())
+        except Exception as exc:
+            logger.error("Failed to persist %s audit trail entries: %s", len(batch), exc, exc_info=True)
+            return 0
+        return len(batch)
+
+    @staticmethod
+    def pending_count() -> int:
+        with _pending_lock:
+            return len(_pending)
+
+    # -- partitions and retention -------------------------------------------------------------
+
+    @staticmethod
+    def partitioned() -> bool:
+        return connection.vendor == "postgresql"
+
+    @classmethod
+    def ensure_partitions(cls, *, months_ahead: int | None = None, today: datetime.date | None = None) -> list[str]:
+        """Create UTC monthly partitions from this month through ``months_ahead`` months (PostgreSQL only)."""
+        if not cls.partitioned():
+            return []
+        if months_ahead is None:
+            months_ahead = int(getattr(settings, "AUDIT_TRAIL_PARTITION_MONTHS_AHEAD", 2))
+        month = _month_start(today or timezone.now().date())
+        created = []
+        with connection.cursor() as cursor:
+            for _ in range(max(0, months_ahead) + 1):
+                upper = _next_month(month)
+                name = f"{AUDIT_TABLE}_p{month:%Y%m}"
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{AUDIT_TABLE}" '
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                )
+                created.append(name)
+                month = upper
+        return created
+
+    @classmethod
+    def prune(cls, before: datetime.date) -> dict[str, int]:
+        """Drop whole monthly partitions older than ``before`` and delete the remaining older rows."""
+        dropped = 0
+        if cls.partitioned():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE parent.relname = %s",
+                    [AUDIT_TABLE],
+                )
+                for (name,) in cursor.fetchall():
+                    match = _PARTITION_RE.match(name)
+                    if not match:
+                        continue
+                    upper = _next_month(datetime.date(int(match.group(1)), int(match.group(2)), 1))
+                    if upper <= before:
+                        cursor.execute(f'DROP TABLE IF EXISTS "{name}"')
+                        dropped += 1
+
+        cutoff = timezone.make_aware(datetime.datetime.combine(before, datetime.time.min))
+        deleted, _ = AuditTrailEntry.objects.filter(timestamp__lt=cutoff).delete()
+        logger.info("Pruned audit trail before %s: dropped_partitions=%s deleted_rows=%s", before, dropped, deleted)
+        return {"dropped_partitions": dropped, "deleted_rows": deleted}
+
+
+def _auditing_suppressed(kwargs) -> bool:
+    """Mirror auditlog's ``check_disable``: honour ``disable_auditlog()`` and raw fixture loads."""
+    from auditlog.context import auditlog_disabled
+
+    if auditlog_disabled.get():
+        return True
+    return bool(kwargs.get("raw")) and bool(getattr(settings, "AUDITLOG_DISABLE_ON_RAW_SAVE", False))
+
+
+def _diff(old, new, fields_to_check=None):
+    from auditlog.diff import model_instance_diff
+
+    return model_instance_diff(
+        old,
+        new,
+        fields_to_check=fields_to_check,
+        use_json_for_changes=bool(getattr(settings, "AUDITLOG_STORE_JSON_CHANGES", False)),
+    )
+
+
+def _capture_create(sender, instance, created, **kwargs):
+    if not created or _auditing_suppressed(kwargs):
+        return
+    changes = _diff(None, instance)
+    if changes:
+        AuditTrailService.capture(instance, AuditTrailEntry.Action.CREATE, changes)
+
+
+def _capture_bulk_create(sender, instances, **kwargs):
+    if _auditing_suppressed(kwargs):
+        return
+    captured = [(instance, _diff(None, instance)) for instance in instances]
+    AuditTrailService.capture_many(
+        [(instance, changes) for instance, changes in captured if changes], AuditTrailEntry.Action.CREATE
+    )
+
+
+def _log_bulk_create(sender, instances, **kwargs):
+    """Unbuffered mode: hand each bulk-created row to auditlog's own create receiver."""
+    from auditlog.receivers import log_create
+
+    for instance in instances:
+        log_create(sender, instance=instance, created=True)
+
+
+def _capture_update(sender, instance, **kwargs):
+    if instance._state.adding or instance.pk is None or _auditing_suppressed(kwargs):
+        return
+    use_base_manager = bool(getattr(settings, "AUDITLOG_USE_BASE_MANAGER", False))
+    manager = sender._base_manager if use_base_manager else sender._default_manager
+    old = manager.filter(pk=instance.pk).first()
+    changes = _diff(old, instance, fields_to_check=kwargs.get("update_fields"))
+    if changes:
+        AuditTrailService.capture(instance, AuditTrailEntry.Action.UPDATE, changes)
+
+
+def _capture_delete(sender, instance, **kwargs):
+    if instance.pk is None or _auditing_suppressed(kwargs):
+        return
+    changes = _diff(instance, None)
+    if changes:
+        AuditTrailService.capture(instance, AuditTrailEntry.Action.DELETE, changes)
+
+
+request_finished.connect(AuditTrailService.flush, dispatch_uid="audit_trail_flush_on_request_finished")
+atexit.register(AuditTrailService.flush)
@@ -0,0 +1,338 @@
+"""
+FILE_ROLE: Resumable, chunked upload sessions assembled into media storage.
+
+KEY_COMPONENTS:
+- ChunkedUploadError: Validation/state error carrying a machine-readable code.
+- ChunkedUploadSession: Serializable session metadata (size, chunk layout, caller context).
+- ChunkAck: Result of accepting one chunk.
+- ChunkedUploadService: Creates sessions, accepts chunks in any order, reports offsets, assembles and aborts.
+- parse_upload_checksum: Parses tus-style ``Upload-Checksum`` headers.
+
+INTERACTIONS:
+- Depends on: Django cache (session + per-chunk acknowledgement keys), default_storage via
+  core.storage.get_media_store_adapter (chunk persistence, server-side compose, bulk delete).
+- Used by: api.views_categorization chunked upload endpoints.
+
+AI_GUIDELINES:
+- Keep this module HTTP-agnostic; views map ChunkedUploadError.code to status codes.
+- Chunk acknowledgement must stay atomic (cache.add + cache.incr) so parallel chunk requests never
+  double-count or assemble a file twice.
+- Chunk bytes are staged under a unique name and moved into place, so a failed write never removes the
+  copy a previous attempt already stored.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import math
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from core.services.logger_service import Logger
+from core.storage import get_media_store_adapter
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = Logger.get_logger(__name__)
+
+CHUNKED_UPLOAD_CACHE_PREFIX = "chunked_upload"
+CHUNKED_UPLOAD_STORAGE_PREFIX = "tmp/uploads"
+# S3 multipart uploads are limited to 10,000 parts.
+MAX_TOTAL_CHUNKS = 10_000
+SUPPORTED_CHECKSUM_ALGORITHMS = ("sha256", "sha1", "md5")
+
+
+class ChunkedUploadError(ValueError):
+    """Raised when a chunked upload request is invalid for the current session state."""
+
+    def __init__(self, message: str, *, code: str = "validation_error"):
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass
+class ChunkedUploadSession:
+    upload_id: str
+    owner_id: int | None
+    filename: str
+    size: int
+    chunk_size: int
+    context: dict[str, Any] = field(default_factory=dict)
+    created_at: float = 0.0
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, math.ceil(self.size / self.chunk_size))
+
+    @property
+    def storage_prefix(self) -> str:
+        return f"{CHUNKED_UPLOAD_STORAGE_PREFIX}/{self.upload_id}"
+
+    def chunk_name(self, index: int) -> str:
+        return f"{self.storage_prefix}/{index:06d}.part"
+
+    def chunk_names(self) -> list[str]:
+        return [self.chunk_name(index) for index in range(self.total_chunks)]
+
+    def expected_chunk_size(self, index: int) -> int:
+        if index < self.total_chunks - 1:
+            return self.chunk_size
+        return self.size - self.chunk_size * (self.total_chunks - 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ChunkedUploadSession":
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class ChunkAck:
+    session: ChunkedUploadSession
+    index: int
+    size: int
+    received_chunks: int
+    duplicate: bool
+
+    @property
+    def ready(self) -> bool:
+        """True once every chunk has been acknowledged and the file can be assembled."""
+        return self.received_chunks >= self.session.total_chunks
+
+
+def parse_upload_checksum(header_value: str | None) -> tuple[str, bytes] | None:
+    """Parse ``"<algorithm> <base64 digest>"`` (tus checksum extension); hex digests are accepted too."""
+    raw = str(header_value or "").strip()
+    if not raw:
+        return None
+    algorithm, _, encoded = raw.partition(" ")
+    algorithm = algorithm.strip().lower()
+    encoded = encoded.strip()
+    if algorithm not in SUPPORTED_CHECKSUM_ALGORITHMS or not encoded:
+        raise ChunkedUploadError(
+            f"Unsupported checksum '{raw}'. Use one of: {', '.join(SUPPORTED_CHECKSUM_ALGORITHMS)}.",
+            code="checksum_unsupported",
+        )
+    digest_size = hashlib.new(algorithm).digest_size
+    try:
+        digest = bytes.fromhex(encoded)
+        if len(digest) == digest_size:
+            return algorithm, digest
+    except ValueError:
+        pass
+    try:
+        digest = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        digest = b""
+    if len(digest) != digest_size:
+        raise ChunkedUploadError("Malformed checksum digest.", code="checksum_unsupported")
+    return algorithm, digest
+
+
+class ChunkedUploadService:
+    """Resumable uploads: the client sends fixed-size chunks (in parallel, in any order, retrying freely)
+    and the file is assembled in storage once every chunk has been acknowledged."""
+
+    def __init__(self, storage=None):
+        self.storage = storage or default_storage
+
+    @staticmethod
+    def session_ttl_seconds() -> int:
+        return int(getattr(settings, "CHUNKED_UPLOAD_SESSION_TTL_SECONDS", 24 * 60 * 60) or 24 * 60 * 60)
+
+    @staticmethod
+    def _session_key(upload_id: str) -> str:
+        return f"{CHUNKED_UPLOAD_CACHE_PREFIX}:{upload_id}:session"
+
+    @staticmethod
+    def _chunk_key(upload_id: str, index: int) -> str:
+        return f"{CHUNKED_UPLOAD_CACHE_PREFIX}:{upload_id}:chunk:{index}"
+
+    @staticmethod
+    def _received_key(upload_id: str) -> str:
+        return f"{CHUNKED_UPLOAD_CACHE_PREFIX}:{upload_id}:received"
+
+    @staticmethod
+    def _assembled_key(upload_id: str) -> str:
+        return f"{CHUNKED_UPLOAD_CACHE_PREFIX}:{upload_id}:assembled"
+
+    def create_session(
+        self,
+        *,
+        owner_id: int | None,
+        filename: str,
+        size: int,
+        chunk_size: int | None = None,
+        context: dict[str, Any] | None = None,
+    ) -> ChunkedUploadSession:
+        max_file_size = int(getattr(settings, "CHUNKED_UPLOAD_MAX_FILE_SIZE", 500 * 1024 * 1024))
+        max_chunk_size = int(getattr(settings, "CHUNKED_UPLOAD_MAX_CHUNK_SIZE", 32 * 1024 * 1024))
+        default_chunk_size = int(getattr(settings, "CHUNKED_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024))
+
+        if size <= 0:
+            raise ChunkedUploadError("File size must be greater than zero.")
+        if size > max_file_size:
+            raise ChunkedUploadError(f"File exceeds the maximum upload size of {max_file_size} bytes.")
+        resolved_chunk_size = int(chunk_size or default_chunk_size)
+        if resolved_chunk_size <= 0 or resolved_chunk_size > max_chunk_size:
+            raise ChunkedUploadError(f"Chunk size must be between 1 and {max_chunk_size} bytes.")
+
+        session = ChunkedUploadSession(
+            upload_id=uuid.uuid4().hex,
+            owner_id=owner_id,
+            filename=filename,
+            size=int(size),
+            chunk_size=resolved_chunk_size,
+            context=dict(context or {}),
+            created_at=time.time(),
+        )
+        if session.total_chunks > MAX_TOTAL_CHUNKS:
+            raise ChunkedUploadError(f"Chunk size too small: a file may not exceed {MAX_TOTAL_CHUNKS} chunks.")
+
+        ttl = self.session_ttl_seconds()
+        cache.set(self._received_key(session.upload_id), 0, ttl)
+        cache.set(self._session_key(session.upload_id), session.to_dict(), ttl)
+        return session
+
+    def get_session(self, upload_id: str) -> ChunkedUploadSession | None:
+        data = cache.get(self._session_key(str(upload_id)))
+        if not isinstance(data, dict):
+            return None
+        return ChunkedUploadSession.from_dict(data)
+
+    def update_context(self, session: ChunkedUploadSession, **values: Any) -> None:
+        session.context.update(values)
+        cache.set(self._session_key(session.upload_id), session.to_dict(), self.session_ttl_seconds())
+
+    def received_chunk_indexes(self, session: ChunkedUploadSession) -> list[int]:
+        keys = {self._chunk_key(session.upload_id, index): index for index in range(session.total_chunks)}
+        found = cache.get_many(list(keys))
+        return sorted(keys[key] for key in found)
+
+    def status(self, session: ChunkedUploadSession) -> dict[str, Any]:
+        received = self.received_chunk_indexes(session)
+        received_set = set(received)
+        offset = 0
+        for index in range(session.total_chunks):
+            if index not in received_set:
+                break
+            offset += session.expected_chunk_size(index)
+        return {
+            "upload_id": session.upload_id,
+            "filename": session.filename,
+            "size": session.size,
+            "chunk_size": session.chunk_size,
+            "total_chunks": session.total_chunks,
+            "received_chunks": received,
+            "received_bytes": sum(session.expected_chunk_size(index) for index in received),
+            "offset": offset,
+            "file_path": session.context.get("file_path"),
+            "complete": bool(session.context.get("file_path")),
+        }
+
+    def accept_chunk(
+        self,
+        session: ChunkedUploadSession,
+        *,
+        index: int,
+        data: bytes,
+        checksum: str | None = None,
+    ) -> ChunkAck:
+        """Persist one chunk. Re-sending an acknowledged chunk is a no-op so clients can retry blindly."""
+        if index < 0 or index >= session.total_chunks:
+            raise ChunkedUploadError(f"Chunk index must be between 0 and {session.total_chunks - 1}.")
+        expected_size = session.expected_chunk_size(index)
+        if len(data) != expected_size:
+            raise ChunkedUploadError(
+                f"Chunk {index} must be exactly {expected_size} bytes (got {len(data)}).",
+                code="chunk_size_mismatch",
+            )
+        parsed_checksum = parse_upload_checksum(checksum)
+        if parsed_checksum is not None:
+            algorithm, expected_digest = parsed_checksum
+            if hashlib.new(algorithm, data).digest() != expected_digest:
+                raise ChunkedUploadError(f"Checksum mismatch for chunk {index}.", code="checksum_mismatch")
+
+        chunk_key = self._chunk_key(session.upload_id, index)
+        if session.context.get("file_path") or cache.get(chunk_key) is not None:
+            return ChunkAck(
+                session=session,
+                index=index,
+                size=expected_size,
+                received_chunks=int(cache.get(self._received_key(session.upload_id)) or 0),
+                duplicate=True,
+            )
+
+        self._write_chunk(session.chunk_name(index), data)
+
+        ttl = self.session_ttl_seconds()
+        if not cache.add(chunk_key, expected_size, ttl):
+            return ChunkAck(
+                session=session,
+                index=index,
+                size=expected_size,
+                received_chunks=int(cache.get(self._received_key(session.upload_id)) or 0),
+                duplicate=True,
+            )
+        try:
+            received = int(cache.incr(self._received_key(session.upload_id)))
+        except ValueError as exc:
+            cache.delete(chunk_key)
+            raise ChunkedUploadError("Upload session expired.", code="not_found") from exc
+        return ChunkAck(session=session, index=index, size=expected_size, received_chunks=received, duplicate=False)
+
+    def _write_chunk(self, chunk_name: str, data: bytes) -> None:
+        """Write a chunk under a unique name first, so an unacknowledged earlier copy (a retry after a lost
+        response) is only replaced once the new bytes are fully stored."""
+        staged_name = self.storage.save(f"{chunk_name}.{uuid.uuid4().hex}.tmp", ContentFile(data))
+        try:
+            if self.storage.exists(chunk_name):
+                self.storage.delete(chunk_name)
+            saved_name = get_media_store_adapter(self.storage).move(staged_name, chunk_name)
+        except Exception:
+            self.storage.delete(staged_name)
+            raise
+        if saved_name != chunk_name:
+            # A concurrent retry of the same chunk won the name; keep a single copy.
+            self.storage.delete(saved_name)
+
+    def assemble(self, session: ChunkedUploadSession, destination: str) -> str:
+        """Compose all chunks into ``destination`` (server-side where the backend allows) and drop the chunks.
+
+        The session itself is kept until it expires, recording the stored name, so late retries of any
+        chunk are answered as duplicates of a completed upload.
+        """
+        if not cache.add(self._assembled_key(session.upload_id), True, self.session_ttl_seconds()):
+            raise ChunkedUploadError("Upload is already being assembled.", code="conflict")
+        media_store = get_media_store_adapter(self.storage)
+        try:
+            saved_name = media_store.compose(session.chunk_names(), destination)
+        except Exception:
+            cache.delete(self._assembled_key(session.upload_id))
+            raise
+        self.update_context(session, file_path=saved_name)
+        self._delete_chunks(session, media_store=media_store)
+        return saved_name
+
+    def abort(self, session: ChunkedUploadSession) -> None:
+        self._delete_chunks(session, media_store=get_media_store_adapter(self.storage))
+        cache.delete_many(
+            [
+                self._session_key(session.upload_id),
+                self._received_key(session.upload_id),
+                *(self._chunk_key(session.upload_id, index) for index in range(session.total_chunks)),
+            ]
+        )
+
+    @staticmethod
+    def _delete_chunks(session: ChunkedUploadSession, *, media_store) -> None:
+        failures = media_store.bulk_delete(session.chunk_names())
+        for name, error in failures.items():
+            logger.warning("Failed to delete upload chunk %s: %s", name, error)
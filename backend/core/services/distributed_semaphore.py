@@ -0,0 +1,107 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- DistributedSemaphore: Redis-backed counting semaphore with expiring leases.
+
+INTERACTIONS:
+- Depends on: core.services.redis_client.get_redis_client.
+- Used by: core.middleware.dramatiq_admission for per-actor concurrency limits across worker processes.
+
+AI_GUIDELINES:
+- Every slot is a lease scored by its expiry, so a crashed holder frees its slot once the lease runs out.
+- Fail open on Redis errors: a limiter outage must not stall task processing.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+from core.services.logger_service import Logger
+from redis.exceptions import RedisError
+
+logger = Logger.get_logger(__name__)
+
+DEFAULT_KEY_PREFIX = "semaphore"
+
+# Token handed out when Redis is unreachable: the caller proceeds, release() ignores it.
+UNTRACKED_LEASE = ""
+
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local now_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local lease_ms = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms)
+if redis.call('ZCARD', key) >= limit then
+    return 0
+end
+redis.call('ZADD', key, now_ms + lease_ms, ARGV[4])
+redis.call('PEXPIRE', key, lease_ms)
+return 1
+"""
+
+_client_lock = threading.Lock()
+_client = None
+_acquire_script = None
+
+
+def _get_client_and_script():
+    global _client, _acquire_script
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from core.services.redis_client import get_redis_client
+
+                client = get_redis_client(socket_timeout=2, socket_connect_timeout=2)
+                _acquire_script = client.register_script(_ACQUIRE_SCRIPT)
+                _client = client
+    return _client, _acquire_script
+
+
+class DistributedSemaphore:
+    """At most ``limit`` concurrent holders of ``name`` across every process sharing the Redis instance."""
+
+    def __init__(self, name: str, limit: int, *, lease_seconds: float, key_prefix: str = DEFAULT_KEY_PREFIX):
+        self.name = name
+        self.limit = max(1, int(limit))
+        self.lease_ms = max(1000, int(float(lease_seconds) * 1000))
+        self.key = f"{key_prefix}:{name}"
+
+    def acquire(self, *, timeout_seconds: float = 0.0, poll_interval_seconds: float = 0.1) -> str | None:
+        """Return a lease token, or ``None`` when every slot stayed taken for ``timeout_seconds``."""
+        deadline = time.monotonic() + max(0.0, float(timeout_seconds))
+        token = uuid.uuid4().hex
+        while True:
+            try:
+                client, script = _get_client_and_script()
+                now_ms = int(time.time() * 1000)
+                if script(keys=[self.key], args=[now_ms, self.limit, self.lease_ms, token], client=client):
+                    return token
+            except RedisError as exc:
+                logger.warning("Semaphore %s unavailable, admitting without a lease: %s", self.name, exc)
+                return UNTRACKED_LEASE
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(poll_interval_seconds, remaining))
+
+    def release(self, token: str | None) -> None:
+        if not token:
+            return
+        try:
+            client, _ = _get_client_and_script()
+            client.zrem(self.key, token)
+        except RedisError as exc:
+            # The lease expires on its own; only the slot's availability is delayed.
+            logger.warning("Semaphore %s release failed: %s", self.name, exc)
+
+    def in_use(self) -> int:
+        """Live leases right now (0 when Redis is unreachable)."""
+        try:
+            client, _ = _get_client_and_script()
+            return int(client.zcount(self.key, int(time.time() * 1000), "+inf"))
+        except RedisError:
+            return 0
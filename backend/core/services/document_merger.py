@@ -16,15 +16,33 @@ Usage Example
     from customer_applications.models import Document
     documents = Document.objects.filter(pk__in=[1, 2, 3])
     pdf_bytes = DocumentMerger.merge_document_models(documents)
+
+    # Merge straight to disk (used by the background merge job)
+    summary = DocumentMerger.merge_document_models_to_file(documents, "/tmp/merged.pdf")
+
+Conversion cache
+----------------
+Non-PDF documents are converted once and the resulting PDF is stored under
+``<TMPFILES_FOLDER>/pdf_conversion_cache/<sha256>.pdf`` keyed by the hash of
+the source bytes, so merging the same passport scan again skips Pillow and
+LibreOffice entirely. Entries older than ``ARTIFACT_CACHE_MAX_AGE_DAYS`` are
+removed by the daily clear-cache job (core.services.artifact_cache_cleanup).
+
+Merged job outputs under ``<TMPFILES_FOLDER>/document_merges/`` are pruned by the
+same job once older than ``JOB_OUTPUT_MAX_AGE_HOURS``.
 """
 
+import hashlib
 import logging
 import os
+import shutil
 import tempfile
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Union
 
+from django.conf import settings
+from django.core.files import File
 from django.core.files.storage import default_storage
 
 from core.services.logger_service import Logger
@@ -55,6 +73,12 @@ class DocumentMerger:
     # All supported extensions
     SUPPORTED_EXTENSIONS = PDFConverter.IMAGE_EXTENSIONS | PDFConverter.DOCX_EXTENSIONS | PDF_EXTENSIONS
 
+    # Storage sub-folder (under TMPFILES_FOLDER) holding converted PDFs keyed by source hash
+    CONVERSION_CACHE_FOLDER = "pdf_conversion_cache"
+
+    # Chunk size used when spooling storage files to local disk
+    SPOOL_CHUNK_SIZE = 1024 * 1024
+
     @classmethod
     def merge_documents(
         cls,
@@ -146,74 +170,166 @@ class DocumentMerger:
         if not documents:
             raise ValueError("No documents provided for merging.")
 
-        pdf_pages = []
-        temp_files = []
-
+        work_dir = tempfile.mkdtemp(prefix="merge_out_")
         try:
-            for doc in documents:
-                # Skip documents without files
-                if not doc.file or not doc.file.name:
-                    logger.warning(f"Document {doc.pk} has no file, skipping.")
-                    continue
+            merged_path = Path(output_path) if output_path else Path(work_dir) / "merged.pdf"
+            cls.merge_document_models_to_file(documents, merged_path)
+            return merged_path.read_bytes()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-                try:
-                    # Get the file extension
-                    ext = os.path.splitext(doc.file.name)[1].lower()
-
-                    if ext not in cls.SUPPORTED_EXTENSIONS:
-                        logger.warning(f"Unsupported file format for document {doc.pk}: {ext}")
-                        continue
-
-                    # Read file content from storage
-                    file_content = default_storage.open(doc.file.name, "rb").read()
-
-                    if ext in cls.PDF_EXTENSIONS:
-                        # PDF - use directly
-                        pdf_bytes = file_content
-                    elif ext in PDFConverter.IMAGE_EXTENSIONS:
-                        # Image - convert to PDF
-                        buffer = BytesIO(file_content)
-                        pdf_bytes = PDFConverter.image_buffer_to_pdf(buffer)
-                    elif ext in PDFConverter.DOCX_EXTENSIONS:
-                        # DOCX - need to write to temp file for LibreOffice
-                        temp_file = tempfile.NamedTemporaryFile(suffix=ext, delete=False, prefix="merge_doc_")
-                        temp_file.write(file_content)
-                        temp_file.close()
-                        temp_files.append(temp_file.name)
-                        pdf_bytes = PDFConverter.docx_to_pdf(temp_file.name)
-                    else:
-                        logger.warning(f"Cannot process document {doc.pk} with extension {ext}")
-                        continue
-
-                    pdf_pages.append(pdf_bytes)
-                    logger.debug(f"Added document {doc.pk} ({doc.doc_type.name}) to merge")
+    @classmethod
+    def merge_document_models_to_file(
+        cls,
+        documents,
+        output_path: Union[str, Path],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        use_cache: bool = True,
+    ) -> dict:
+        """
+        Merge Document model instances into a PDF file on local disk.
+
+        Each stored file is spooled to a scratch directory in chunks and non-PDF files are
+        converted (or fetched from the conversion cache), so source bytes never sit in
+        memory. pypdf still keeps the parsed page objects of every source until the merged
+        file is written, so peak memory grows with the combined size of the sources; the
+        result itself goes to ``output_path`` instead of a bytes buffer.
 
+        Args:
+            documents: QuerySet or list of Document model instances, in merge order.
+            output_path: Local path the merged PDF is written to.
+            on_progress: Optional callback invoked as ``on_progress(processed, total)``.
+            use_cache: Whether to read/write the converted-PDF cache.
+
+        Returns:
+            Summary dict with ``documents``, ``pages``, ``cache_hits`` and ``skipped``.
+
+        Raises:
+            DocumentMergerError: If merging fails.
+            ValueError: If no valid documents provided.
+        """
+        documents = list(documents or [])
+        if not documents:
+            raise ValueError("No documents provided for merging.")
+
+        output_path = Path(output_path)
+        work_dir = Path(tempfile.mkdtemp(prefix="merge_doc_"))
+        pdf_paths: List[Path] = []
+        cache_hits = 0
+        skipped = 0
+        total = len(documents)
+
+        try:
+            for index, doc in enumerate(documents):
+                try:
+                    pdf_path, cache_hit = cls._prepare_document_pdf(doc, work_dir, index, use_cache=use_cache)
                 except Exception as e:
                     logger.error(f"Failed to process document {doc.pk}: {e}")
-                    # Continue with other documents
-                    continue
+                    pdf_path, cache_hit = None, False
 
-            if not pdf_pages:
+                if pdf_path is None:
+                    skipped += 1
+                else:
+                    pdf_paths.append(pdf_path)
+                    cache_hits += int(cache_hit)
+                if on_progress:
+                    on_progress(index + 1, total)
+
+            if not pdf_paths:
                 raise DocumentMergerError("No valid documents could be processed for merging.")
 
-            # Merge all PDFs
-            merged_pdf = cls._merge_pdfs(pdf_pages)
+            pages = cls._merge_pdf_files(pdf_paths, output_path)
+            logger.info(
+                f"Merged {len(pdf_paths)} documents into {pages} pages "
+                f"({cache_hits} conversion cache hits): {output_path}"
+            )
+            return {"documents": len(pdf_paths), "pages": pages, "cache_hits": cache_hits, "skipped": skipped}
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-            # Write to output file if specified
-            if output_path:
-                output_path = Path(output_path)
-                output_path.write_bytes(merged_pdf)
-                logger.info(f"Merged PDF saved to: {output_path}")
+    @classmethod
+    def _prepare_document_pdf(cls, doc, work_dir: Path, index: int, use_cache: bool = True):
+        """Spool one document to ``work_dir`` as a PDF; returns ``(path, cache_hit)`` or ``(None, False)``."""
+        if not doc.file or not doc.file.name:
+            logger.warning(f"Document {doc.pk} has no file, skipping.")
+            return None, False
+
+        ext = os.path.splitext(doc.file.name)[1].lower()
+        if ext not in cls.SUPPORTED_EXTENSIONS:
+            logger.warning(f"Unsupported file format for document {doc.pk}: {ext}")
+            return None, False
+
+        source_path = work_dir / f"{index:04d}_source{ext}"
+        digest = cls._spool_storage_file(doc.file.name, source_path)
+        if ext in cls.PDF_EXTENSIONS:
+            return source_path, False
+
+        pdf_path = work_dir / f"{index:04d}.pdf"
+        cache_name = cls.conversion_cache_path(digest)
+        if use_cache:
+            try:
+                if default_storage.exists(cache_name):
+                    cls._spool_storage_file(cache_name, pdf_path)
+                    logger.debug(f"Conversion cache hit for document {doc.pk}")
+                    return pdf_path, True
+            except Exception as e:
+                logger.warning(f"Conversion cache read failed for document {doc.pk}: {e}")
 
-            return merged_pdf
+        PDFConverter.convert_to_pdf(source_path, pdf_path)
+        source_path.unlink(missing_ok=True)
 
-        finally:
-            # Cleanup temp files
-            for temp_file in temp_files:
-                try:
-                    os.unlink(temp_file)
-                except Exception:
-                    pass
+        if use_cache:
+            try:
+                if not default_storage.exists(cache_name):
+                    with pdf_path.open("rb") as handle:
+                        default_storage.save(cache_name, File(handle, name=os.path.basename(cache_name)))
+            except Exception as e:
+                logger.warning(f"Conversion cache write failed for document {doc.pk}: {e}")
+        return pdf_path, False
+
+    @classmethod
+    def conversion_cache_path(cls, digest: str) -> str:
+        """Return the storage path of the cached PDF conversion for a source hash."""
+        tmp_folder = getattr(settings, "TMPFILES_FOLDER", "tmpfiles")
+        return f"{tmp_folder}/{cls.CONVERSION_CACHE_FOLDER}/{digest}.pdf"
+
+    @classmethod
+    def _spool_storage_file(cls, storage_name: str, target_path: Path) -> str:
+        """Copy a storage file to local disk in chunks and return its sha256 hex digest."""
+        hasher = hashlib.sha256()
+        with default_storage.open(storage_name, "rb") as source, target_path.open("wb") as target:
+            for chunk in iter(lambda: source.read(cls.SPOOL_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                target.write(chunk)
+        return hasher.hexdigest()
+
+    @classmethod
+    def _merge_pdf_files(cls, pdf_paths: List[Path], output_path: Path) -> int:
+        """Merge PDF files into ``output_path`` and return the page count."""
+        from pypdf import PdfReader, PdfWriter
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if len(pdf_paths) == 1:
+            shutil.copyfile(pdf_paths[0], output_path)
+            try:
+                return len(PdfReader(str(output_path)).pages)
+            except Exception:
+                return 0
+
+        writer = PdfWriter()
+        for pdf_path in pdf_paths:
+            try:
+                writer.append(str(pdf_path))
+            except Exception as e:
+                logger.error(f"Failed to read PDF for merging: {e}")
+                continue
+
+        if len(writer.pages) == 0:
+            raise DocumentMergerError("No pages could be extracted from the provided PDFs.")
+
+        with output_path.open("wb") as handle:
+            writer.write(handle)
+        return len(writer.pages)
 
     @classmethod
     def _merge_pdfs(cls, pdf_bytes_list: List[bytes]) -> bytes:
@@ -0,0 +1,156 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- ImageAnalysisContext: Decode-once holder for an uploaded image with memoized analysis planes.
+
+INTERACTIONS:
+- Depends on: numpy and OpenCV (optional); Pillow for the OCR hand-off.
+- Used by: ImageQualityService, PassportUploadabilityService and core.utils.passport_ocr.
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Planes are computed lazily and memoized; never mutate a returned array in place, other stages share it.
+- Create one context per request/call and pass it along; there is deliberately no process-wide cache of
+  decoded images.
+- Planes stay at native resolution: the ImageQualityService thresholds (Laplacian variance, gradient, edge
+  density) were calibrated on full-size uploads and are not scale-invariant.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import cached_property
+from importlib import import_module
+from typing import Any
+
+import numpy as np
+from core.services.logger_service import Logger
+
+logger = Logger.get_logger(__name__)
+
+
+def histogram_percentile(histogram: np.ndarray, percentile: float) -> float:
+    """``np.percentile`` (linear interpolation) of the pixels summarized by a 256-bin gray-level histogram."""
+    cumulative = np.cumsum(histogram)
+    total = int(cumulative[-1])
+    if total <= 0:
+        return 0.0
+    rank = percentile / 100.0 * (total - 1)
+    lower = int(math.floor(rank))
+    upper = min(lower + 1, total - 1)
+    lower_value = int(np.searchsorted(cumulative, lower, side="right"))
+    upper_value = int(np.searchsorted(cumulative, upper, side="right"))
+    return float(lower_value + (rank - lower) * (upper_value - lower_value))
+
+
+class ImageAnalysisContext:
+    """
+    Decode an uploaded image once and share the derived planes between the stages of one request.
+
+    Build it where the upload enters (quality gate, uploadability check, OCR run) and pass it to the later stages
+    of the same call; it is dropped with the call, so decoded planes never outlive the request.
+    """
+
+    def __init__(self, file_content: bytes):
+        self.file_content = bytes(file_content or b"")
+        self._roi_cache: dict[float, np.ndarray] = {}
+
+    @cached_property
+    def cv2(self) -> Any:
+        try:
+            return import_module("cv2")
+        except Exception as exc:
+            logger.warning("OpenCV unavailable for image analysis: %s", exc)
+            return None
+
+    @cached_property
+    def image(self) -> np.ndarray | None:
+        """BGR pixels at native resolution, or None when the bytes cannot be decoded."""
+        cv2 = self.cv2
+        if cv2 is None or not self.file_content:
+            return None
+        return cv2.imdecode(np.frombuffer(self.file_content, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    @cached_property
+    def original_size(self) -> tuple[int, int]:
+        """``(width, height)`` of the decoded upload, ``(0, 0)`` when undecodable."""
+        image = self.image
+        if image is None:
+            return 0, 0
+        height, width = image.shape[:2]
+        return width, height
+
+    @cached_property
+    def gray(self) -> np.ndarray | None:
+        image = self.image
+        if image is None:
+            return None
+        return self.cv2.cvtColor(image, self.cv2.COLOR_BGR2GRAY)
+
+    @cached_property
+    def histogram(self) -> np.ndarray:
+        """256-bin gray-level histogram; every intensity statistic below is derived from it in O(256)."""
+        gray = self.gray
+        if gray is None:
+            return np.zeros(256, dtype=np.float64)
+        return np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+
+    @cached_property
+    def intensity_stats(self) -> dict[str, float]:
+        histogram = self.histogram
+        total = float(histogram.sum())
+        if total <= 0:
+            return {
+                "mean": 0.0,
+                "std": 0.0,
+                "p5": 0.0,
+                "p95": 0.0,
+                "clipped_dark_ratio": 0.0,
+                "clipped_bright_ratio": 0.0,
+            }
+
+        levels = np.arange(256, dtype=np.float64)
+        mean = float((histogram * levels).sum() / total)
+        variance = float((histogram * (levels - mean) ** 2).sum() / total)
+        return {
+            "mean": mean,
+            "std": math.sqrt(max(variance, 0.0)),
+            "p5": histogram_percentile(histogram, 5),
+            "p95": histogram_percentile(histogram, 95),
+            "clipped_dark_ratio": float(histogram[:11].sum() / total),
+            "clipped_bright_ratio": float(histogram[245:].sum() / total),
+        }
+
+    @cached_property
+    def laplacian_variance(self) -> float:
+        return float(self.cv2.Laplacian(self.gray, self.cv2.CV_64F).var())
+
+    @cached_property
+    def mean_gradient_magnitude(self) -> float:
+        cv2 = self.cv2
+        sobel_x = cv2.Sobel(self.gray, cv2.CV_32F, 1, 0, ksize=3)
+        sobel_y = cv2.Sobel(self.gray, cv2.CV_32F, 0, 1, ksize=3)
+        return float(np.mean(cv2.magnitude(sobel_x, sobel_y)))
+
+    @cached_property
+    def edges(self) -> np.ndarray:
+        return self.cv2.Canny(self.gray, 80, 160)
+
+    def mrz_roi(self, top_ratio: float = 0.72) -> np.ndarray:
+        """Lower band of the gray plane where the passport MRZ sits (a view, not a copy)."""
+        roi = self._roi_cache.get(top_ratio)
+        if roi is None:
+            height = self.gray.shape[0]
+            roi = self.gray[int(height * top_ratio) : height, :]
+            self._roi_cache[top_ratio] = roi
+        return roi
+
+    def rgb_image(self):
+        """Pillow RGB image for the OCR preprocessing stage, or None when undecodable."""
+        image = self.image
+        if image is None:
+            return None
+        from PIL import Image
+
+        return Image.fromarray(self.cv2.cvtColor(image, self.cv2.COLOR_BGR2RGB))
@@ -7,6 +7,7 @@ KEY_COMPONENTS:
 
 INTERACTIONS:
 - Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
+- Reads decoded planes from ImageAnalysisContext instead of decoding the upload itself.
 
 AI_GUIDELINES:
 - Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
@@ -20,6 +21,7 @@ from importlib import import_module
 from typing import Any, Optional
 
 import numpy as np
+from core.services.image_analysis_context import ImageAnalysisContext
 from core.services.logger_service import Logger
 
 logger = Logger.get_logger(__name__)
@@ -123,7 +125,13 @@ class ImageQualityService:
         self.max_clipped_dark_ratio = max_clipped_dark_ratio
         self.max_clipped_bright_ratio = max_clipped_bright_ratio
 
-    def evaluate(self, file_content: bytes) -> ImageQualityResult:
+    def evaluate(self, file_content: bytes, context: ImageAnalysisContext | None = None) -> ImageQualityResult:
+        """
+        Score an uploaded document photo.
+
+        Pass ``context`` to reuse planes already decoded by another stage of the same call; otherwise the
+        upload is decoded into a context scoped to this evaluation.
+        """
         cv2 = self._load_cv2()
         if cv2 is None:
             return ImageQualityResult(
@@ -134,8 +142,9 @@ class ImageQualityService:
                 notes=["OpenCV not installed; skipped deterministic quality checks."],
             )
 
-        image = self._decode_image(cv2, file_content)
-        if image is None:
+        context = context or ImageAnalysisContext(file_content)
+        gray = context.gray
+        if gray is None:
             return ImageQualityResult(
                 is_good_quality=False,
                 analyzer_available=True,
@@ -144,24 +153,21 @@ class ImageQualityService:
                 notes=["cv2.imdecode returned None"],
             )
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        height, width = gray.shape[:2]
+        # Metrics run on the native-resolution plane the thresholds below were calibrated on.
+        height = gray.shape[0]
+        original_width, original_height = context.original_size
 
-        laplacian_variance = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+        laplacian_variance = context.laplacian_variance
 
         # Passport MRZ zone is typically in the lower area; ensure this region is sharp enough.
-        mrz_top = int(height * 0.72)
-        mrz_roi = gray[mrz_top:height, :]
+        mrz_roi = context.mrz_roi(0.72)
         mrz_roi_laplacian_variance = (
             float(cv2.Laplacian(mrz_roi, cv2.CV_64F).var()) if mrz_roi.size else laplacian_variance
         )
 
-        sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
-        sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
-        grad_mag = cv2.magnitude(sobel_x, sobel_y)
-        mean_gradient_magnitude = float(np.mean(grad_mag))
+        mean_gradient_magnitude = context.mean_gradient_magnitude
 
-        edges = cv2.Canny(gray, 80, 160)
+        edges = context.edges
         edge_density = float(np.count_nonzero(edges)) / float(edges.size)
 
         # Cropped-MRZ heuristic: if the last MRZ line is cut, bottom-most rows contain dense
@@ -175,29 +181,29 @@ class ImageQualityService:
             bottom_edge_dark_ratio > self.max_bottom_edge_dark_ratio
             and bottom_edge_edge_density > self.max_bottom_edge_edge_density
         )
-        mrz_detected_line_count, mrz_bottom_touch_ratio = self._analyze_mrz_zone_structure(cv2, gray)
+        mrz_detected_line_count, mrz_bottom_touch_ratio = self._analyze_mrz_zone_structure(
+            cv2, gray, mrz_zone=context.mrz_roi(0.80)
+        )
         mrz_zone_incomplete_suspected = (
             mrz_cutoff_suspected and mrz_bottom_touch_ratio > 0.15 and mrz_detected_line_count <= 2
         ) or (mrz_bottom_touch_ratio > 0.20 and mrz_detected_line_count <= 1)
 
-        mean_arr, std_arr = cv2.meanStdDev(gray)
-        brightness_mean = float(mean_arr[0][0])
-        contrast_std = float(std_arr[0][0])
-
-        p5, p95 = np.percentile(gray, [5, 95])
-        dynamic_range_p95_p5 = float(p95 - p5)
-
-        clipped_dark_ratio = float(np.mean(gray <= 10))
-        clipped_bright_ratio = float(np.mean(gray >= 245))
+        stats = context.intensity_stats
+        brightness_mean = stats["mean"]
+        contrast_std = stats["std"]
+        dynamic_range_p95_p5 = float(stats["p95"] - stats["p5"])
+        clipped_dark_ratio = stats["clipped_dark_ratio"]
+        clipped_bright_ratio = stats["clipped_bright_ratio"]
 
         reasons: list[str] = []
         advisories: list[str] = []
         rejection_code: Optional[str] = None
 
-        if min(width, height) < self.min_short_side_px:
+        if min(original_width, original_height) < self.min_short_side_px:
             rejection_code = "image_low_resolution"
             reasons.append(
-                f"Image resolution is too low ({width}x{height}). Minimum short side is {self.min_short_side_px}px."
+                f"Image resolution is too low ({original_width}x{original_height}). "
+                f"Minimum short side is {self.min_short_side_px}px."
             )
 
         if mrz_cutoff_suspected:
@@ -272,8 +278,8 @@ class ImageQualityService:
             analyzer_available=True,
             rejection_code=rejection_code,
             rejection_reason=" ".join(reasons) if reasons else None,
-            width=width,
-            height=height,
+            width=original_width,
+            height=original_height,
             laplacian_variance=laplacian_variance,
             mean_gradient_magnitude=mean_gradient_magnitude,
             edge_density=edge_density,
@@ -302,14 +308,9 @@ class ImageQualityService:
             return None
 
     @staticmethod
-    def _decode_image(cv2: Any, file_content: bytes):
-        np_buffer = np.frombuffer(file_content, dtype=np.uint8)
-        if np_buffer.size == 0:
-            return None
-        return cv2.imdecode(np_buffer, cv2.IMREAD_COLOR)
-
-    @staticmethod
-    def _analyze_mrz_zone_structure(cv2: Any, gray: np.ndarray) -> tuple[int, float]:
+    def _analyze_mrz_zone_structure(
+        cv2: Any, gray: np.ndarray, mrz_zone: np.ndarray | None = None
+    ) -> tuple[int, float]:
         """
         Estimate MRZ line structure in the lower passport zone.
         Returns (detected_line_count, bottom_touch_ratio).
@@ -318,8 +319,8 @@ class ImageQualityService:
         if height <= 0:
             return 0, 0.0
 
-        mrz_top = int(height * 0.80)
-        mrz_zone = gray[mrz_top:height, :]
+        if mrz_zone is None:
+            mrz_zone = gray[int(height * 0.80) : height, :]
         if mrz_zone.size == 0:
             return 0, 0.0
 
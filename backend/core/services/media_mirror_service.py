@@ -0,0 +1,318 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- MediaMirrorManifest: SQLite manifest of mirrored files (path, size, mtime, sha256).
+- S3MirrorDestination / StorageMirrorDestination: Batch listing and uploads for S3 or any Django storage.
+- MediaMirrorService: Incremental, parallel mirror of a local directory tree to a storage prefix.
+
+INTERACTIONS:
+- Depends on: Django storages (S3Boto3Storage via boto3 when available) and BACKUPS_ROOT for manifests.
+- Used by: the uploadmediatos3 / benchmark_media_mirror commands and the nightly full backup.
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- The manifest is only a hint: a file is skipped only when it matches the manifest AND the destination
+  listing reports an object of the same size, so deleting remote objects or the manifest is always safe.
+- Manifest writes stay on the calling thread (sqlite3 connections are not shared across workers).
+- S3 uploads bypass storage.save() for managed multipart transfers, so they must carry the backend's
+  object parameters (encryption, ACL) explicitly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import posixpath
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from core.services.logger_service import Logger
+from django.conf import settings
+from django.core.files import File
+
+logger = Logger.get_logger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+MANIFEST_COMMIT_EVERY = 100
+
+
+@dataclass
+class ManifestRow:
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class MirrorStats:
+    scanned: int = 0
+    unchanged: int = 0
+    rehashed_unchanged: int = 0
+    uploaded: int = 0
+    would_upload: int = 0
+    failed: int = 0
+    bytes_uploaded: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaMirrorManifest:
+    """Per-destination manifest committed in small batches so an interrupted run resumes where it stopped."""
+
+    # One-off destinations (dated snapshots) would only leave orphaned manifest files behind.
+    IN_MEMORY = ":memory:"
+
+    def __init__(self, path: str):
+        if path != self.IN_MEMORY:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "sha256 TEXT NOT NULL, mirrored_at REAL NOT NULL)"
+        )
+        self._pending = 0
+
+    def load(self) -> dict[str, ManifestRow]:
+        rows = self._conn.execute("SELECT path, size, mtime_ns, sha256 FROM files")
+        return {path: ManifestRow(size, mtime_ns, sha256) for path, size, mtime_ns, sha256 in rows}
+
+    def record(self, path: str, row: ManifestRow) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, mirrored_at) VALUES (?, ?, ?, ?, ?)",
+            (path, row.size, row.mtime_ns, row.sha256, time.time()),
+        )
+        self._pending += 1
+        if self._pending >= MANIFEST_COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        self._conn.close()
+
+
+class StorageMirrorDestination:
+    """Generic Django storage destination: recursive listdir once, overwrite by delete + save."""
+
+    def __init__(self, storage, prefix: str):
+        self.storage = storage
+        self.prefix = prefix.strip("/")
+
+    @property
+    def identity(self) -> str:
+        return f"{type(self.storage).__name__}:{getattr(self.storage, 'location', '')}:{self.prefix}"
+
+    def _key(self, relative_path: str) -> str:
+        return posixpath.join(self.prefix, relative_path) if self.prefix else relative_path
+
+    def list_objects(self) -> dict[str, int]:
+        objects: dict[str, int] = {}
+        pending = [""]
+        while pending:
+            current = pending.pop()
+            try:
+                directories, files = self.storage.listdir(self._key(current) if current else self.prefix)
+            except (FileNotFoundError, NotADirectoryError, OSError):
+                continue
+            for name in files:
+                relative = posixpath.join(current, name) if current else name
+                try:
+                    objects[relative] = self.storage.size(self._key(relative))
+                except OSError:
+                    continue
+            pending.extend(posixpath.join(current, name) if current else name for name in directories)
+        return objects
+
+    def upload(self, local_path: str, relative_path: str, *, sha256: str) -> None:
+        key = self._key(relative_path)
+        if self.storage.exists(key):
+            self.storage.delete(key)
+        with open(local_path, "rb") as handle:
+            self.storage.save(key, File(handle))
+
+
+class S3MirrorDestination(StorageMirrorDestination):
+    """S3-compatible destination: paginated ListObjectsV2 plus managed (multipart) transfers."""
+
+    def __init__(self, storage, prefix: str):
+        super().__init__(storage, prefix)
+        from boto3.s3.transfer import TransferConfig
+
+        self.client = storage.connection.meta.client
+        self.bucket = storage.bucket_name
+        location = str(getattr(storage, "location", "") or "").strip("/")
+        self.root = "/".join(part for part in (location, self.prefix) if part)
+        chunk_size = int(getattr(settings, "MEDIA_MIRROR_MULTIPART_CHUNK_SIZE", 16 * 1024 * 1024))
+        self.transfer_config = TransferConfig(
+            multipart_threshold=int(getattr(settings, "MEDIA_MIRROR_MULTIPART_THRESHOLD", 16 * 1024 * 1024)),
+            multipart_chunksize=chunk_size,
+            max_concurrency=int(getattr(settings, "MEDIA_MIRROR_PART_CONCURRENCY", 4)),
+        )
+
+    @property
+    def identity(self) -> str:
+        endpoint = getattr(self.client.meta, "endpoint_url", "")
+        return f"s3:{endpoint}:{self.bucket}:{self.root}"
+
+    def list_objects(self) -> dict[str, int]:
+        objects: dict[str, int] = {}
+        list_prefix = f"{self.root}/" if self.root else ""
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=list_prefix):
+            for item in page.get("Contents", []):
+                objects[item["Key"][len(list_prefix) :]] = int(item["Size"])
+        return objects
+
+    def upload(self, local_path: str, relative_path: str, *, sha256: str) -> None:
+        key = f"{self.root}/{relative_path}" if self.root else relative_path
+        self.client.upload_file(
+            local_path,
+            self.bucket,
+            key,
+            ExtraArgs=self.object_parameters(relative_path, sha256=sha256),
+            Config=self.transfer_config,
+        )
+
+    def object_parameters(self, relative_path: str, *, sha256: str) -> dict:
+        """Write parameters the storage backend would use for this object (encryption, ACL, cache headers)."""
+        params = dict(self.storage.get_object_parameters(self._key(relative_path)))
+        default_acl = getattr(self.storage, "default_acl", None)
+        if default_acl and "ACL" not in params:
+            params["ACL"] = default_acl
+        params.setdefault("ContentType", mimetypes.guess_type(relative_path)[0] or "application/octet-stream")
+        params["Metadata"] = {**(params.get("Metadata") or {}), "sha256": sha256}
+        return params
+
+
+def build_mirror_destination(storage, prefix: str) -> StorageMirrorDestination:
+    if hasattr(storage, "bucket_name") and hasattr(storage, "connection"):
+        return S3MirrorDestination(storage, prefix)
+    return StorageMirrorDestination(storage, prefix)
+
+
+class MediaMirrorService:
+    """Mirror ``source_root`` to a storage prefix, sending only new or changed files."""
+
+    def __init__(
+        self,
+        storage,
+        *,
+        prefix: str,
+        source_root: str | Path,
+        exclude_folders: set[str] | None = None,
+        concurrency: int | None = None,
+        manifest_path: str | None = None,
+        destination: StorageMirrorDestination | None = None,
+    ):
+        self.source_root = Path(source_root)
+        self.exclude_folders = set(exclude_folders or ())
+        self.concurrency = max(1, int(concurrency or getattr(settings, "MEDIA_MIRROR_CONCURRENCY", 8)))
+        self.destination = destination or build_mirror_destination(storage, prefix)
+        self.manifest_path = manifest_path or self.default_manifest_path(self.destination.identity)
+
+    @staticmethod
+    def default_manifest_path(identity: str) -> str:
+        state_dir = getattr(settings, "MEDIA_MIRROR_STATE_DIR", "") or os.path.join(
+            settings.BACKUPS_ROOT, "media_mirror"
+        )
+        return os.path.join(state_dir, f"{hashlib.sha1(identity.encode('utf-8')).hexdigest()}.sqlite3")
+
+    def _iter_local_files(self) -> Iterator[tuple[str, str, os.stat_result]]:
+        for root, dirs, files in os.walk(self.source_root):
+            dirs[:] = [directory for directory in dirs if directory not in self.exclude_folders]
+            root_path = Path(root)
+            for file_name in files:
+                local_path = root_path / file_name
+                try:
+                    stat = local_path.stat()
+                except OSError:
+                    continue
+                yield str(local_path), local_path.relative_to(self.source_root).as_posix(), stat
+
+    def _sync_one(self, job: tuple) -> tuple[str, str, ManifestRow | None, str]:
+        local_path, relative_path, size, mtime_ns, previous, remote_size = job
+        try:
+            sha256 = file_sha256(local_path)
+            row = ManifestRow(size=size, mtime_ns=mtime_ns, sha256=sha256)
+            if previous is not None and previous.sha256 == sha256 and remote_size == size:
+                return "rehashed_unchanged", relative_path, row, ""
+            self.destination.upload(local_path, relative_path, sha256=sha256)
+            return "uploaded", relative_path, row, ""
+        except Exception as exc:
+            return "failed", relative_path, None, str(exc)
+
+    def run(
+        self,
+        *,
+        dry_run: bool = False,
+        verify: bool = False,
+        on_progress: Callable[[MirrorStats], None] | None = None,
+    ) -> MirrorStats:
+        """Mirror the tree; ``verify`` re-hashes files even when size and mtime match the manifest."""
+        started = time.monotonic()
+        stats = MirrorStats()
+        remote = self.destination.list_objects()
+        manifest = MediaMirrorManifest(self.manifest_path)
+        try:
+            known = manifest.load()
+            jobs = []
+            for local_path, relative_path, stat in self._iter_local_files():
+                stats.scanned += 1
+                previous = known.get(relative_path)
+                remote_size = remote.get(relative_path)
+                if (
+                    not verify
+                    and previous is not None
+                    and previous.size == stat.st_size
+                    and previous.mtime_ns == stat.st_mtime_ns
+                    and remote_size == stat.st_size
+                ):
+                    stats.unchanged += 1
+                    continue
+                jobs.append((local_path, relative_path, stat.st_size, stat.st_mtime_ns, previous, remote_size))
+
+            if dry_run:
+                stats.would_upload = len(jobs)
+                return stats
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="media-mirror") as executor:
+                for outcome, relative_path, row, error in executor.map(self._sync_one, jobs):
+                    if outcome == "failed":
+                        stats.failed += 1
+                        logger.error("Media mirror failed for %s: %s", relative_path, error)
+                        continue
+                    manifest.record(relative_path, row)
+                    if outcome == "uploaded":
+                        stats.uploaded += 1
+                        stats.bytes_uploaded += row.size
+                    else:
+                        stats.rehashed_unchanged += 1
+                    if on_progress is not None and (stats.uploaded + stats.rehashed_unchanged) % 100 == 0:
+                        on_progress(stats)
+        finally:
+            manifest.close()
+            stats.seconds = round(time.monotonic() - started, 3)
+
+        logger.info("Media mirror finished: %s", stats.as_dict())
+        return stats
@@ -21,6 +21,7 @@ from typing import Any, Callable, Optional
 from core.services.ai_passport_parser import AIPassportParser
 from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
 from core.services.ai_usage_service import AIUsageFeature
+from core.services.image_analysis_context import ImageAnalysisContext
 from core.services.image_quality_service import ImageQualityService
 from core.services.logger_service import Logger
 from core.utils.icao_validation import validate_passport_number_icao
@@ -85,7 +86,9 @@ class PassportUploadabilityService:
         normalized_method = "ai" if selected_method in {"internal", "ai"} else "hybrid"
 
         self._emit_progress(progress_callback, 15, "Step 1/4: Running deterministic OpenCV quality checks...")
-        quality_result = self.image_quality_service.evaluate(file_content)
+        # Decoded once for this check; later steps of the same call reuse its planes.
+        image_context = ImageAnalysisContext(file_content)
+        quality_result = self.image_quality_service.evaluate(file_content, context=image_context)
         if quality_result.analyzer_available and not quality_result.is_good_quality:
             return UploadabilityResult(
                 is_valid=False,
@@ -0,0 +1,158 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- PeriodicScheduler: Watermark-driven dispatcher for registered periodic tasks.
+- plan_fire_times: Pure misfire-policy evaluation for one periodic task.
+
+INTERACTIONS:
+- Depends on: core.tasks.runtime periodic registry (precompiled CrontabSchedule) and a Redis client.
+- Used by: the run_dramatiq_scheduler management command.
+
+AI_GUIDELINES:
+- The per-task "last fired" watermark is the only dedupe state; advance it only after a successful dispatch.
+- Keep Redis traffic to one HGETALL per tick plus one HSET when something fired.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from core.services.logger_service import Logger
+from core.tasks.runtime import MISFIRE_ALL, MISFIRE_SKIP, PeriodicTaskEntry, iter_periodic_tasks
+from django.conf import settings
+
+logger = Logger.get_logger(__name__)
+
+DEFAULT_WATERMARK_KEY = "dramatiq:scheduler:watermarks"
+
+
+def plan_fire_times(
+    entry: PeriodicTaskEntry,
+    *,
+    last_fired: datetime | None,
+    now: datetime,
+    catchup_seconds: int,
+    max_replays: int,
+) -> tuple[list[datetime], datetime]:
+    """Return ``(fire_times, new_watermark)`` for ``entry`` at minute-aligned ``now``.
+
+    Missed fire times older than ``catchup_seconds`` are dropped; ``once`` collapses the
+    remaining backlog into its latest fire time, ``all`` replays up to ``max_replays`` of them
+    and ``skip`` only fires when ``now`` itself is a fire time.
+    """
+    if last_fired is None:
+        # First sighting of a task: only the current minute is eligible, never history.
+        last_fired = now - timedelta(minutes=1)
+    elif now.tzinfo is not None and last_fired.tzinfo is not None:
+        # Stored watermarks carry a fixed offset; walk the schedule in the scheduler's wall clock.
+        last_fired = last_fired.astimezone(now.tzinfo)
+    window_start = max(last_fired, now - timedelta(seconds=max(60, catchup_seconds)))
+    missed = list(entry.schedule.fire_times_between(window_start, now))
+    if not missed:
+        return [], last_fired
+
+    if entry.misfire_policy == MISFIRE_ALL:
+        fires = missed[-max(1, max_replays) :]
+    elif entry.misfire_policy == MISFIRE_SKIP:
+        fires = [now] if missed[-1] == now else []
+    else:
+        fires = [missed[-1]]
+    return fires, missed[-1]
+
+
+def jitter_delay_seconds(entry: PeriodicTaskEntry, fire_at: datetime) -> float:
+    """Deterministic per-task offset inside ``[0, jitter_seconds)`` so co-scheduled jobs spread out."""
+    if entry.jitter_seconds <= 0:
+        return 0.0
+    digest = zlib.crc32(f"{entry.name}:{fire_at.isoformat()}".encode("utf-8"))
+    return entry.jitter_seconds * (digest / 2**32)
+
+
+class PeriodicScheduler:
+    def __init__(
+        self,
+        redis_client,
+        *,
+        watermark_key: str | None = None,
+        catchup_seconds: int | None = None,
+        max_replays: int | None = None,
+    ):
+        self.redis_client = redis_client
+        self.watermark_key = watermark_key or str(
+            getattr(settings, "DRAMATIQ_SCHEDULER_WATERMARK_KEY", DEFAULT_WATERMARK_KEY)
+        )
+        self.catchup_seconds = int(
+            catchup_seconds
+            if catchup_seconds is not None
+            else getattr(settings, "DRAMATIQ_SCHEDULER_CATCHUP_SECONDS", 6 * 60 * 60)
+        )
+        self.max_replays = int(
+            max_replays if max_replays is not None else getattr(settings, "DRAMATIQ_SCHEDULER_MAX_REPLAYS", 60)
+        )
+
+    def tick(self, now: datetime, entries: Iterable[PeriodicTaskEntry] | None = None) -> datetime | None:
+        """Dispatch everything due up to ``now`` and return the next fire time across all tasks."""
+        entries = tuple(entries if entries is not None else iter_periodic_tasks())
+        if not entries:
+            return None
+
+        now = now.replace(second=0, microsecond=0)
+        watermarks = self._load_watermarks()
+        updates: dict[str, str] = {}
+        for entry in entries:
+            last_fired = watermarks.get(entry.name)
+            fires, watermark = plan_fire_times(
+                entry,
+                last_fired=last_fired,
+                now=now,
+                catchup_seconds=self.catchup_seconds,
+                max_replays=self.max_replays,
+            )
+            try:
+                for fire_at in fires:
+                    self._dispatch(entry, fire_at, now=now)
+            except Exception:
+                # Hold the watermark at the last dispatched fire time so the next tick retries the rest.
+                logger.exception("Failed to dispatch periodic task %s", entry.name)
+                dispatched = fires[: fires.index(fire_at)]
+                if dispatched:
+                    updates[entry.name] = dispatched[-1].isoformat()
+                continue
+            if watermark != last_fired:
+                updates[entry.name] = watermark.isoformat()
+
+        if updates:
+            self.redis_client.hset(self.watermark_key, mapping=updates)
+        return self.next_fire_time(now, entries)
+
+    def next_fire_time(self, now: datetime, entries: Iterable[PeriodicTaskEntry]) -> datetime | None:
+        upcoming = [fire_at for entry in entries if (fire_at := entry.schedule.next_fire_after(now)) is not None]
+        return min(upcoming) if upcoming else None
+
+    def _dispatch(self, entry: PeriodicTaskEntry, fire_at: datetime, *, now: datetime) -> None:
+        delay_seconds = jitter_delay_seconds(entry, fire_at)
+        if delay_seconds > 0:
+            entry.task.schedule(delay=timedelta(seconds=delay_seconds))
+        else:
+            entry.task.delay()
+        if fire_at < now:
+            logger.info("Replayed missed periodic task %s for %s", entry.name, fire_at.isoformat())
+        else:
+            logger.info("Scheduled periodic task %s (jitter %.1fs)", entry.name, delay_seconds)
+
+    def _load_watermarks(self) -> dict[str, datetime]:
+        raw = self.redis_client.hgetall(self.watermark_key) or {}
+        watermarks: dict[str, datetime] = {}
+        for name, value in raw.items():
+            if isinstance(name, bytes):
+                name = name.decode("utf-8")
+            if isinstance(value, bytes):
+                value = value.decode("utf-8")
+            try:
+                watermarks[name] = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                logger.warning("Ignoring malformed scheduler watermark for %s: %r", name, value)
+        return watermarks
@@ -10,6 +10,7 @@ KEY_COMPONENTS:
 - _build_redis_url: Private helper.
 - build_redis_url: Module symbol.
 - get_redis_client: Module symbol.
+- InstrumentedRedis: Redis client that records per-command latency in core.telemetry.metrics.
 
 INTERACTIONS:
 - Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
@@ -22,10 +23,12 @@ AI_GUIDELINES:
 from __future__ import annotations
 
 import os
+import time
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse, urlunparse
 
 import redis
+from core.telemetry.metrics import redis_command_duration_seconds, redis_command_errors_total
 from django.conf import settings
 
 if TYPE_CHECKING:
@@ -122,6 +125,21 @@ def build_redis_url(*, db: int | None = None) -> str:
     return _replace_db(base_url, db)
 
 
+class InstrumentedRedis(redis.Redis):
+    """Sync Redis client whose commands feed the redis_command_* metric families."""
+
+    def execute_command(self, *args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        started_at = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        except redis.RedisError:
+            redis_command_errors_total.inc(command=command)
+            raise
+        finally:
+            redis_command_duration_seconds.observe(time.perf_counter() - started_at, command=command)
+
+
 def get_redis_client(
     *,
     db: int | None = None,
@@ -129,7 +147,7 @@ def get_redis_client(
     socket_timeout: float = 5,
     socket_connect_timeout: float = 5,
 ) -> redis.Redis:
-    return redis.Redis.from_url(
+    return InstrumentedRedis.from_url(
         build_redis_url(db=db),
         decode_responses=decode_responses,
         socket_timeout=socket_timeout,
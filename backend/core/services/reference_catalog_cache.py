@@ -0,0 +1,520 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- ReferenceCatalog: Module symbol.
+- ReferenceCatalogCache: Service class.
+- reference_catalog_cache: Module symbol.
+- invalidate_catalogs_for_model: Module symbol.
+
+INTERACTIONS:
+- Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Preserve the existing API/model contract because other modules import these symbols directly.
+"""
+
+from __future__ import annotations
+
+import datetime
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.services.logger_service import Logger
+from django.conf import settings
+from django.core.cache import cache
+
+logger = Logger.get_logger(__name__)
+
+INVALIDATION_CHANNEL = "reference_catalog:invalidate"
+_VERSION_KEY = "reference_catalog:{name}:version"
+_PAYLOAD_KEY = "reference_catalog:{name}:v{version}"
+
+
+@dataclass(frozen=True)
+class ReferenceCatalog:
+    """A read-mostly dataset derived from one or more reference models."""
+
+    name: str
+    loader: Callable[[], Any]
+    model_labels: tuple[str, ...]
+    l2_timeout: int | None = 60 * 60
+
+
+@dataclass
+class _L1Entry:
+    version: int
+    payload: Any
+    size: int
+    loaded_at: float
+
+
+@dataclass
+class _CatalogCounters:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+@dataclass
+class _ListenerState:
+    pid: int | None = None
+    thread: threading.Thread | None = None
+    stop_event: threading.Event = field(default_factory=threading.Event)
+
+
+class ReferenceCatalogCache:
+    """Two-tier cache for reference catalogs.
+
+    L1 is a per-process, byte-bounded LRU holding fully materialized catalog payloads,
+    so hot lookups (serializers, prompt builders, settings reads) do no I/O at all.
+    L2 is the shared Django cache (Redis) keyed by a per-catalog version counter.
+    Writers bump the version and publish it on ``INVALIDATION_CHANNEL``; every process
+    runs a small subscriber thread that evicts stale L1 entries. ``L1_TTL`` is only a
+    safety net for processes that miss a pub/sub message while Redis is unavailable.
+    """
+
+    def __init__(self) -> None:
+        self._catalogs: dict[str, ReferenceCatalog] = {}
+        self._l1: OrderedDict[str, _L1Entry] = OrderedDict()
+        self._l1_bytes = 0
+        self._counters: dict[str, _CatalogCounters] = {}
+        self._published_versions: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._listener = _ListenerState()
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    @staticmethod
+    def is_enabled() -> bool:
+        if bool(getattr(settings, "TESTING", False)):
+            return False
+        return bool(getattr(settings, "REFERENCE_CATALOG_CACHE_ENABLED", True))
+
+    @staticmethod
+    def _pubsub_enabled() -> bool:
+        return bool(getattr(settings, "REFERENCE_CATALOG_PUBSUB_ENABLED", True))
+
+    @staticmethod
+    def _max_bytes() -> int:
+        return int(getattr(settings, "REFERENCE_CATALOG_L1_MAX_BYTES", 16 * 1024 * 1024))
+
+    @staticmethod
+    def _l1_ttl() -> float:
+        return float(getattr(settings, "REFERENCE_CATALOG_L1_TTL_SECONDS", 300))
+
+    def register(self, catalog: ReferenceCatalog) -> ReferenceCatalog:
+        with self._lock:
+            self._catalogs[catalog.name] = catalog
+            self._counters.setdefault(catalog.name, _CatalogCounters())
+        return catalog
+
+    def catalog_names_for_model(self, model_label: str) -> list[str]:
+        normalized = str(model_label or "").lower()
+        return [name for name, catalog in self._catalogs.items() if normalized in catalog.model_labels]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get(self, name: str) -> Any:
+        catalog = self._catalogs.get(name)
+        if catalog is None:
+            raise KeyError(f"Unknown reference catalog '{name}'")
+        if not self.is_enabled():
+            return catalog.loader()
+
+        self._ensure_listener()
+        counters = self._counters[name]
+        now = time.monotonic()
+        with self._lock:
+            entry = self._l1.get(name)
+            if entry is not None and now - entry.loaded_at < self._l1_ttl():
+                self._l1.move_to_end(name)
+                counters.l1_hits += 1
+                return entry.payload
+
+        version = self._read_version(name)
+        payload = self._read_l2(name, version)
+        if payload is not None:
+            counters.l2_hits += 1
+        else:
+            counters.misses += 1
+            payload = catalog.loader()
+            self._write_l2(catalog, version, payload)
+
+        self._store_l1(name, version, payload)
+        return payload
+
+    def _read_version(self, name: str) -> int:
+        try:
+            version = cache.get(_VERSION_KEY.format(name=name))
+        except Exception:
+            return 0
+        try:
+            return int(version or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def _read_l2(self, name: str, version: int) -> Any:
+        try:
+            return cache.get(_PAYLOAD_KEY.format(name=name, version=version))
+        except Exception as exc:
+            logger.debug("Reference catalog L2 read failed (catalog=%s): %s", name, exc)
+            return None
+
+    def _write_l2(self, catalog: ReferenceCatalog, version: int, payload: Any) -> None:
+        try:
+            cache.set(_PAYLOAD_KEY.format(name=catalog.name, version=version), payload, timeout=catalog.l2_timeout)
+        except Exception as exc:
+            logger.debug("Reference catalog L2 write failed (catalog=%s): %s", catalog.name, exc)
+
+    @staticmethod
+    def _estimate_size(payload: Any) -> int:
+        try:
+            return len(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return 0
+
+    def _store_l1(self, name: str, version: int, payload: Any) -> None:
+        size = self._estimate_size(payload)
+        budget = self._max_bytes()
+        if size > budget:
+            logger.warning("Reference catalog '%s' (%s bytes) exceeds the L1 budget (%s bytes)", name, size, budget)
+            return
+        with self._lock:
+            if version < self._published_versions.get(name, 0):
+                # A newer version was announced while this payload was loading.
+                return
+            previous = self._l1.pop(name, None)
+            if previous is not None:
+                self._l1_bytes -= previous.size
+            self._l1[name] = _L1Entry(version=version, payload=payload, size=size, loaded_at=time.monotonic())
+            self._l1_bytes += size
+            while self._l1_bytes > budget and len(self._l1) > 1:
+                evicted_name, evicted = self._l1.popitem(last=False)
+                self._l1_bytes -= evicted.size
+                self._counters[evicted_name].evictions += 1
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def invalidate(self, *names: str, publish: bool = True) -> None:
+        """Drop the given catalogs locally, bump their shared version and notify peers."""
+        for name in names:
+            if name not in self._catalogs:
+                continue
+            self._evict_local(name)
+            if not self.is_enabled():
+                continue
+            version = self._bump_version(name)
+            self._note_version(name, version)
+            if publish and self._pubsub_enabled():
+                self._publish(name, version)
+
+    def invalidate_for_model(self, model_label: str) -> None:
+        names = self.catalog_names_for_model(model_label)
+        if names:
+            self.invalidate(*names)
+
+    def _evict_local(self, name: str, *, below_version: int | None = None) -> None:
+        with self._lock:
+            entry = self._l1.get(name)
+            if entry is None:
+                return
+            if below_version is not None and entry.version >= below_version:
+                return
+            self._l1.pop(name, None)
+            self._l1_bytes -= entry.size
+            self._counters[name].invalidations += 1
+
+    @staticmethod
+    def _bump_version(name: str) -> int:
+        key = _VERSION_KEY.format(name=name)
+        try:
+            cache.add(key, 0, timeout=None)
+            return int(cache.incr(key))
+        except Exception as exc:
+            logger.debug("Reference catalog version bump failed (catalog=%s): %s", name, exc)
+            return 0
+
+    @staticmethod
+    def _publish(name: str, version: int) -> None:
+        try:
+            from core.services.redis_client import get_redis_client
+
+            get_redis_client(socket_timeout=1, socket_connect_timeout=1).publish(
+                INVALIDATION_CHANNEL, f"{name}:{version}"
+            )
+        except Exception as exc:
+            logger.debug("Reference catalog invalidation publish failed (catalog=%s): %s", name, exc)
+
+    def handle_invalidation_message(self, data: Any) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="ignore")
+        name, _, raw_version = str(data or "").partition(":")
+        if name not in self._catalogs:
+            return
+        try:
+            version = int(raw_version)
+        except (TypeError, ValueError):
+            version = None
+        if version is not None:
+            self._note_version(name, version)
+        self._evict_local(name, below_version=version)
+
+    def _note_version(self, name: str, version: int) -> None:
+        with self._lock:
+            if version > self._published_versions.get(name, 0):
+                self._published_versions[name] = version
+
+    # ------------------------------------------------------------------
+    # Pub/sub listener
+    # ------------------------------------------------------------------
+    def _ensure_listener(self) -> None:
+        if not self._pubsub_enabled():
+            return
+        state = self._listener
+        pid = os.getpid()
+        if state.pid == pid and state.thread is not None and state.thread.is_alive():
+            return
+        with self._lock:
+            if state.pid == pid and state.thread is not None and state.thread.is_alive():
+                return
+            # Forked workers inherit the parent's L1 but not its thread; start fresh.
+            if state.pid != pid:
+                self._l1.clear()
+                self._l1_bytes = 0
+            state.pid = pid
+            state.stop_event = threading.Event()
+            state.thread = threading.Thread(
+                target=self._listen,
+                args=(state.stop_event,),
+                name="reference-catalog-invalidation",
+                daemon=True,
+            )
+            state.thread.start()
+
+    def _listen(self, stop_event: threading.Event) -> None:
+        backoff = 1.0
+        while not stop_event.is_set():
+            try:
+                from core.services.redis_client import get_redis_client
+
+                pubsub = get_redis_client(socket_timeout=None).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                backoff = 1.0
+                # Anything published while we were disconnected is lost: start from a clean L1.
+                self.clear_local()
+                while not stop_event.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.handle_invalidation_message(message.get("data"))
+            except Exception as exc:
+                logger.debug("Reference catalog listener disconnected: %s", exc)
+                stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def stop_listener(self) -> None:
+        self._listener.stop_event.set()
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def clear_local(self) -> None:
+        with self._lock:
+            self._l1.clear()
+            self._l1_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "l1_bytes": self._l1_bytes,
+                "l1_max_bytes": self._max_bytes(),
+                "catalogs": {
+                    name: {
+                        **self._counters[name].as_dict(),
+                        "cached": name in self._l1,
+                        "version": self._l1[name].version if name in self._l1 else None,
+                        "size": self._l1[name].size if name in self._l1 else 0,
+                    }
+                    for name in self._catalogs
+                },
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = _CatalogCounters()
+
+
+reference_catalog_cache = ReferenceCatalogCache()
+
+
+# ----------------------------------------------------------------------
+# Catalog loaders
+# ----------------------------------------------------------------------
+def _load_document_types() -> tuple[dict[str, Any], ...]:
+    from products.models.document_type import DocumentType
+
+    return tuple(
+        DocumentType.objects.values(
+            "id",
+            "name",
+            "description",
+            "deprecated",
+            "is_stay_permit",
+            "has_expiration_date",
+            "validation_rule_ai_positive",
+            "validation_rule_ai_negative",
+            "ai_structured_output",
+        ).order_by("name")
+    )
+
+
+def _load_products() -> dict[int, dict[str, Any]]:
+    from products.models.product import Product
+
+    rows = Product.objects.values(
+        "id",
+        "code",
+        "name",
+        "deprecated",
+        "required_documents",
+        "optional_documents",
+        "application_window_days",
+        "product_category_id",
+        "product_category__product_type",
+    )
+    products: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        row["product_type"] = row.pop("product_category__product_type")
+        products[int(row["id"])] = row
+    return products
+
+
+def _load_holidays() -> frozenset[tuple[str, str]]:
+    from core.models.holiday import Holiday
+
+    rows = Holiday.objects.values_list("date", "country")
+    return frozenset((str(country), holiday_date.isoformat()) for holiday_date, country in rows)
+
+
+def _load_app_settings() -> dict[str, dict[str, Any]]:
+    from core.services.app_setting_service import AppSettingService
+
+    return AppSettingService._query_all_rows(raise_errors=True)
+
+
+def _load_ai_models():
+    from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
+
+    return AIRuntimeSettingsService.build_model_index()
+
+
+def _load_ai_runtime_settings():
+    from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
+
+    return AIRuntimeSettingsService.build_runtime_snapshot()
+
+
+DOCUMENT_TYPES = reference_catalog_cache.register(
+    ReferenceCatalog(name="document_types", loader=_load_document_types, model_labels=("products.documenttype",))
+)
+PRODUCTS = reference_catalog_cache.register(
+    ReferenceCatalog(
+        name="products",
+        loader=_load_products,
+        model_labels=("products.product", "products.productcategory"),
+    )
+)
+HOLIDAYS = reference_catalog_cache.register(
+    ReferenceCatalog(name="holidays", loader=_load_holidays, model_labels=("core.holiday",), l2_timeout=60 * 60 * 24)
+)
+APP_SETTINGS = reference_catalog_cache.register(
+    ReferenceCatalog(name="app_settings", loader=_load_app_settings, model_labels=("core.appsetting",), l2_timeout=None)
+)
+AI_MODELS = reference_catalog_cache.register(
+    ReferenceCatalog(name="ai_models", loader=_load_ai_models, model_labels=("core.aimodel",))
+)
+# Compiled from both the model catalog and the settings rows, so either write invalidates it.
+AI_RUNTIME_SETTINGS = reference_catalog_cache.register(
+    ReferenceCatalog(
+        name="ai_runtime_settings",
+        loader=_load_ai_runtime_settings,
+        model_labels=("core.aimodel", "core.appsetting"),
+    )
+)
+
+CATALOG_MODEL_LABELS = frozenset(
+    label
+    for catalog in (
+        DOCUMENT_TYPES,
+        PRODUCTS,
+        HOLIDAYS,
+        APP_SETTINGS,
+        AI_MODELS,
+        AI_RUNTIME_SETTINGS,
+    )
+    for label in catalog.model_labels
+)
+
+
+# ----------------------------------------------------------------------
+# Convenience accessors
+# ----------------------------------------------------------------------
+def invalidate_catalogs_for_model(model_label: str) -> None:
+    reference_catalog_cache.invalidate_for_model(model_label)
+
+
+def get_document_types() -> tuple[dict[str, Any], ...]:
+    return reference_catalog_cache.get(DOCUMENT_TYPES.name)
+
+
+def get_stay_permit_document_type_names() -> frozenset[str]:
+    return frozenset(str(row["name"]) for row in get_document_types() if row.get("is_stay_permit"))
+
+
+def get_product(product_id: int | None) -> dict[str, Any] | None:
+    if product_id is None:
+        return None
+    return reference_catalog_cache.get(PRODUCTS.name).get(int(product_id))
+
+
+def get_product_type(product) -> str | None:
+    """Resolve a product's category type without touching the ORM relation when the catalog is warm."""
+    if product is None:
+        return None
+    if reference_catalog_cache.is_enabled():
+        row = get_product(getattr(product, "pk", None))
+        if row is not None:
+            return row.get("product_type")
+    category = getattr(product, "product_category", None)
+    return getattr(category, "product_type", None)
+
+
+def is_holiday(day, country: str) -> bool:
+    # Due-date helpers pass datetimes; holidays are keyed by calendar date.
+    if isinstance(day, datetime.datetime):
+        day = day.date()
+    if day.weekday() >= 5:
+        return True
+    return (str(country), day.isoformat()) in reference_catalog_cache.get(HOLIDAYS.name)
@@ -18,26 +18,32 @@ from __future__ import annotations
 import base64
 import contextlib
 import contextvars
+import functools
 import hashlib
 import json
 import logging
 import os
 import socket
-from datetime import date, datetime, time
+import threading
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 from pathlib import PurePosixPath
 from typing import Any
 from uuid import UUID
 
-from core.models.local_resilience import MediaManifestEntry, SyncChangeLog, SyncConflict
+from core.models.local_resilience import MediaManifestEntry, SyncChangeLog, SyncConflict, SyncCursor
 from django.apps import apps
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, Max, Min, OuterRef
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime, parse_time
 
 _SYNC_APPLY_IN_PROGRESS = contextvars.ContextVar("sync_apply_in_progress", default=False)
+# Django connections are per thread, so are the per-transaction capture buffers.
+_CAPTURE_BUFFERS = threading.local()
 
 
 def get_local_node_id() -> str:
@@ -112,6 +118,9 @@ def _payload_checksum(payload: dict[str, Any]) -> str:
 def _serialize_instance(instance: models.Model) -> dict[str, Any]:
     payload: dict[str, Any] = {}
     for field in instance._meta.concrete_fields:
+        # Generated columns are recomputed by the receiving database.
+        if getattr(field, "generated", False):
+            continue
         key = field.attname if field.many_to_one else field.name
         payload[key] = _json_safe(getattr(instance, key))
     return payload
@@ -169,12 +178,8 @@ def _coerce_field_value(field: models.Field, raw_value: Any) -> Any:
     return raw_value
 
 
-def capture_model_upsert(instance: models.Model, *, source_node: str | None = None) -> SyncChangeLog | None:
-    if not getattr(instance, "pk", None):
-        return None
-
+def _build_upsert_record(instance: models.Model, source: str) -> SyncChangeLog:
     payload = _serialize_instance(instance)
-    source = source_node or get_local_node_id()
     timestamp_raw = payload.get("updated_at")
     timestamp = parse_datetime(str(timestamp_raw)) if isinstance(timestamp_raw, str) else None
     if timestamp is None:
@@ -198,11 +203,28 @@ def capture_model_upsert(instance: models.Model, *, source_node: str | None = No
             "source_node": source,
         }
     )
-    return SyncChangeLog.objects.create(**record)
+    return SyncChangeLog(**record)
 
 
-def capture_model_delete(model_label: str, object_pk: Any, *, source_node: str | None = None) -> SyncChangeLog:
+def capture_model_upsert(instance: models.Model, *, source_node: str | None = None) -> SyncChangeLog | None:
+    if not getattr(instance, "pk", None):
+        return None
+
+    record = _build_upsert_record(instance, source_node or get_local_node_id())
+    record.save(force_insert=True)
+    return record
+
+
+def capture_model_upserts(instances, *, source_node: str | None = None) -> list[SyncChangeLog]:
+    """Capture upserts for a batch of saved instances with a single changelog insert."""
     source = source_node or get_local_node_id()
+    records = [_build_upsert_record(instance, source) for instance in instances if getattr(instance, "pk", None)]
+    if not records:
+        return []
+    return SyncChangeLog.objects.bulk_create(records, batch_size=500)
+
+
+def _build_delete_record(model_label: str, object_pk: Any, source: str) -> SyncChangeLog:
     payload = {
         "deleted": True,
         "model_label": model_label,
@@ -219,7 +241,7 @@ def capture_model_delete(model_label: str, object_pk: Any, *, source_node: str |
             "source_node": source,
         }
     )
-    return SyncChangeLog.objects.create(
+    return SyncChangeLog(
         source_node=source,
         model_label=model_label,
         object_pk=str(object_pk),
@@ -230,6 +252,167 @@ def capture_model_delete(model_label: str, object_pk: Any, *, source_node: str |
     )
 
 
+def capture_model_delete(model_label: str, object_pk: Any, *, source_node: str | None = None) -> SyncChangeLog:
+    record = _build_delete_record(model_label, object_pk, source_node or get_local_node_id())
+    record.save(force_insert=True)
+    return record
+
+
+class _PendingCaptures:
+    """Objects touched by the current transaction on one connection, in first-touch order."""
+
+    def __init__(self, alias: str):
+        self.alias = alias
+        self.changes: dict[tuple[str, str], tuple[type[models.Model], Any, str]] = {}
+        self.flush = functools.partial(_flush_pending_captures, self)
+
+
+def _pending_captures_for(connection) -> _PendingCaptures:
+    buffers = getattr(_CAPTURE_BUFFERS, "by_alias", None)
+    if buffers is None:
+        buffers = _CAPTURE_BUFFERS.by_alias = {}
+    pending = buffers.get(connection.alias)
+    if pending is None:
+        pending = buffers[connection.alias] = _PendingCaptures(connection.alias)
+        transaction.on_commit(pending.flush, using=connection.alias, robust=True)
+    elif not any(hook[1] is pending.flush for hook in connection.run_on_commit):
+        # A rollback discarded the commit hook but not the buffer; re-arm it for this transaction.
+        # Keys left over from the rolled-back work are harmless because the flush re-reads rows.
+        transaction.on_commit(pending.flush, using=connection.alias, robust=True)
+    return pending
+
+
+def capture_model_upserts_on_commit(instances, *, using: str | None = None) -> None:
+    """Record upserts once the surrounding transaction commits.
+
+    Outside a transaction the rows are captured immediately. Inside one, repeated saves of the
+    same object collapse into a single change-log row written by one bulk insert on commit.
+    """
+    instances = [instance for instance in instances if getattr(instance, "pk", None)]
+    if not instances:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        capture_model_upserts(instances)
+        return
+    pending = _pending_captures_for(connection)
+    for instance in instances:
+        model = type(instance)
+        pending.changes[(model._meta.label_lower, str(instance.pk))] = (model, instance.pk, SyncChangeLog.OP_UPSERT)
+
+
+def capture_model_delete_on_commit(model: type[models.Model], object_pk: Any, *, using: str | None = None) -> None:
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        capture_model_delete(model._meta.label_lower, object_pk)
+        return
+    pending = _pending_captures_for(connection)
+    pending.changes[(model._meta.label_lower, str(object_pk))] = (model, object_pk, SyncChangeLog.OP_DELETE)
+
+
+def _flush_pending_captures(pending: _PendingCaptures) -> None:
+    """Write the committed state of every touched object with one bulk insert.
+
+    Rows are re-read after commit, so savepoint rollbacks can never leak uncommitted payloads:
+    a rolled-back create is simply missing, and a rolled-back delete is captured as an upsert.
+    """
+    buffers = getattr(_CAPTURE_BUFFERS, "by_alias", {})
+    if buffers.get(pending.alias) is pending:
+        del buffers[pending.alias]
+    changes, pending.changes = pending.changes, {}
+    if not changes:
+        return
+
+    pks_by_model: dict[type[models.Model], list[Any]] = {}
+    for model, object_pk, _operation in changes.values():
+        pks_by_model.setdefault(model, []).append(object_pk)
+    committed: dict[tuple[str, str], models.Model] = {}
+    for model, pks in pks_by_model.items():
+        queryset = model._base_manager.using(pending.alias).filter(pk__in=pks)
+        if hasattr(queryset, "nocache"):
+            queryset = queryset.nocache()
+        for instance in queryset:
+            committed[(model._meta.label_lower, str(instance.pk))] = instance
+
+    source = get_local_node_id()
+    records: list[SyncChangeLog] = []
+    for key, (_model, object_pk, operation) in changes.items():
+        instance = committed.get(key)
+        if instance is not None:
+            records.append(_build_upsert_record(instance, source))
+        elif operation == SyncChangeLog.OP_DELETE:
+            records.append(_build_delete_record(key[0], object_pk, source))
+    if records:
+        SyncChangeLog.objects.bulk_create(records, batch_size=500)
+
+
+def record_peer_ack(node_id: str, acked_seq: int) -> None:
+    """Remember that ``node_id`` has consumed this node's change log up to ``acked_seq``."""
+    node_id = str(node_id or "").strip()[:64]
+    if not node_id:
+        return
+    SyncCursor.objects.get_or_create(node_id=node_id)
+    SyncCursor.objects.filter(node_id=node_id).update(
+        acked_seq=Greatest(F("acked_seq"), max(0, int(acked_seq))),
+        updated_at=timezone.now(),
+    )
+
+
+def compaction_watermark() -> int:
+    """Lowest sequence acknowledged by every active peer; 0 while no peer is known."""
+    stale_after = timedelta(days=max(1, int(getattr(settings, "LOCAL_SYNC_PEER_STALE_DAYS", 30))))
+    active = SyncCursor.objects.filter(updated_at__gte=timezone.now() - stale_after)
+    return int(active.aggregate(watermark=Min("acked_seq"))["watermark"] or 0)
+
+
+def compact_change_log(*, watermark: int | None = None, batch_size: int = 5000) -> dict[str, int]:
+    """Delete upserts superseded by a newer row for the same object, at or below ``watermark``.
+
+    Every active peer has already consumed that prefix, so only the latest row per object is
+    kept there; the tail above the watermark is left untouched to preserve replay order.
+    """
+    watermark = compaction_watermark() if watermark is None else int(watermark)
+    if watermark <= 0:
+        return {"deleted": 0, "watermark": 0}
+
+    newer = SyncChangeLog.objects.filter(
+        model_label=OuterRef("model_label"),
+        object_pk=OuterRef("object_pk"),
+        seq__gt=OuterRef("seq"),
+        seq__lte=watermark,
+    )
+    superseded = SyncChangeLog.objects.filter(seq__lte=watermark, operation=SyncChangeLog.OP_UPSERT).filter(
+        Exists(newer)
+    )
+    deleted = 0
+    after_seq = 0
+    while True:
+        batch = list(
+            superseded.filter(seq__gt=after_seq).order_by("seq").values_list("seq", flat=True)[: max(1, batch_size)]
+        )
+        if not batch:
+            break
+        deleted += SyncChangeLog.objects.filter(seq__in=batch).delete()[0]
+        after_seq = batch[-1]
+    return {"deleted": deleted, "watermark": watermark}
+
+
+def change_log_stats() -> dict[str, Any]:
+    """Change-log size and how far each active peer trails the head of the log."""
+    aggregates = SyncChangeLog.objects.aggregate(rows=Count("seq"), last_seq=Max("seq"))
+    last_seq = int(aggregates["last_seq"] or 0)
+    peers = {
+        node_id: max(0, last_seq - int(acked_seq))
+        for node_id, acked_seq in SyncCursor.objects.values_list("node_id", "acked_seq")
+    }
+    return {
+        "rows": int(aggregates["rows"] or 0),
+        "lastSeq": last_seq,
+        "watermark": compaction_watermark(),
+        "peerLag": peers,
+    }
+
+
 # Models that are allowed to be synced via the remote sync endpoint.
 # Explicitly excludes auth, admin, session, and other sensitive models
 # to prevent privilege-escalation via arbitrary model writes.
@@ -335,7 +518,7 @@ def apply_change(raw_change: dict[str, Any], *, source_node: str) -> dict[str, A
             setattr(instance, pk_field.attname, _coerce_field_value(pk_field, object_pk))
 
         for field in model._meta.concrete_fields:
-            if getattr(field, "auto_created", False):
+            if getattr(field, "auto_created", False) or getattr(field, "generated", False):
                 continue
 
             storage_key = field.attname if field.many_to_one else field.name
@@ -0,0 +1,199 @@
+"""
+FILE_ROLE: Service-layer logic for the core app.
+
+KEY_COMPONENTS:
+- WorkerPool: One group of identical Dramatiq worker processes consuming a fixed set of queues.
+- parse_worker_pools: Parses the DRAMATIQ_WORKER_POOLS spec into WorkerPool definitions.
+- queue_concurrency_bounds: Reserved thread floor and burst ceiling per queue for a pool layout.
+- read_queue_stats: Ready depth and head-of-line age per queue, read straight from the Redis broker keys.
+- PoolScaler: Hysteresis-based process count policy between a pool's reserved floor and burst ceiling.
+
+INTERACTIONS:
+- Depends on: django.conf.settings and a Redis client pointing at the Dramatiq broker database.
+- Used by: the run_dramatiq_pools management command and core.tests.test_worker_pools.
+
+AI_GUIDELINES:
+- Never let latency-sensitive queues share a pool with long-running ones: a Dramatiq process prefetches from every
+  queue it consumes, so a shared pool would park realtime messages behind busy threads.
+- Keep the scaling policy a pure function of observed stats and timestamps so it stays unit-testable.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+
+from core.services.logger_service import Logger
+from django.conf import settings
+
+logger = Logger.get_logger(__name__)
+
+DEFAULT_WORKER_POOLS = (
+    "realtime=realtime:4:1:3,"
+    "default=default:2:1:3,"
+    "background=scheduled+low:2:1:1,"
+    "doc_conversion=doc_conversion:1:1:1"
+)
+
+
+@dataclass(frozen=True)
+class WorkerPool:
+    name: str
+    queues: tuple[str, ...]
+    threads: int
+    min_processes: int = 1
+    max_processes: int = 1
+
+    @property
+    def scalable(self) -> bool:
+        return self.max_processes > self.min_processes
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    queue: str
+    depth: int
+    oldest_age_seconds: float
+
+
+def parse_worker_pools(spec: str) -> tuple[WorkerPool, ...]:
+    """Parse ``name=queue+queue:threads:min_processes:max_processes`` entries separated by commas."""
+    pools: list[WorkerPool] = []
+    for entry in (part.strip() for part in str(spec or "").split(",")):
+        if not entry:
+            continue
+        try:
+            name, definition = entry.split("=", 1)
+            queues, threads, min_processes, max_processes = definition.split(":")
+            pool = WorkerPool(
+                name=name.strip(),
+                queues=tuple(queue.strip() for queue in queues.split("+") if queue.strip()),
+                threads=max(1, int(threads)),
+                min_processes=max(0, int(min_processes)),
+                max_processes=max(0, int(max_processes)),
+            )
+        except ValueError as exc:
+            raise ValueError(f"Invalid worker pool entry '{entry}': expected name=queues:threads:min:max.") from exc
+        if not pool.name or not pool.queues or pool.max_processes < max(1, pool.min_processes):
+            raise ValueError(f"Invalid worker pool entry '{entry}'.")
+        pools.append(pool)
+    if len({pool.name for pool in pools}) != len(pools):
+        raise ValueError("Worker pool names must be unique.")
+    return tuple(pools)
+
+
+def load_worker_pools() -> tuple[WorkerPool, ...]:
+    return parse_worker_pools(str(getattr(settings, "DRAMATIQ_WORKER_POOLS", "") or DEFAULT_WORKER_POOLS))
+
+
+def queue_concurrency_bounds(pools: Iterable[WorkerPool]) -> dict[str, tuple[int, int]]:
+    """Return ``{queue: (floor_threads, ceiling_threads)}`` with every pool at its minimum / maximum size."""
+    bounds: dict[str, tuple[int, int]] = {}
+    for pool in pools:
+        for queue in pool.queues:
+            floor, ceiling = bounds.get(queue, (0, 0))
+            bounds[queue] = (floor + pool.threads * pool.min_processes, ceiling + pool.threads * pool.max_processes)
+    return bounds
+
+
+def _message_due_at_ms(raw_message) -> int:  # noqa: ANN001
+    if not raw_message:
+        return 0
+    try:
+        payload = json.loads(raw_message)
+    except (TypeError, ValueError):
+        return 0
+    options = payload.get("options") or {}
+    return max(int(payload.get("message_timestamp") or 0), int(options.get("eta") or 0))
+
+
+def read_queue_stats(
+    redis_client,
+    queues: Sequence[str],
+    *,
+    namespace: str | None = None,
+    now: float,
+) -> dict[str, QueueStats]:
+    """Read ready depth and head message age for ``queues`` with two pipelined round trips."""
+    namespace = namespace or str(getattr(settings, "DRAMATIQ_NAMESPACE", "dramatiq:queue") or "dramatiq:queue")
+    pipe = redis_client.pipeline(transaction=False)
+    for queue in queues:
+        pipe.llen(f"{namespace}:{queue}")
+        pipe.lindex(f"{namespace}:{queue}", 0)
+    replies = pipe.execute()
+
+    heads: list[tuple[str, object]] = []
+    depths: dict[str, int] = {}
+    for index, queue in enumerate(queues):
+        depths[queue] = int(replies[index * 2] or 0)
+        head_id = replies[index * 2 + 1]
+        if head_id:
+            heads.append((queue, head_id))
+
+    ages: dict[str, float] = {}
+    if heads:
+        pipe = redis_client.pipeline(transaction=False)
+        for queue, head_id in heads:
+            pipe.hget(f"{namespace}:{queue}.msgs", head_id)
+        for (queue, _), raw_message in zip(heads, pipe.execute()):
+            due_at_ms = _message_due_at_ms(raw_message)
+            if due_at_ms:
+                ages[queue] = max(0.0, now - due_at_ms / 1000)
+
+    return {
+        queue: QueueStats(queue=queue, depth=depths[queue], oldest_age_seconds=ages.get(queue, 0.0))
+        for queue in queues
+    }
+
+
+@dataclass
+class _PoolScalingState:
+    last_pressure_at: float | None = None
+    last_change_at: float | None = None
+
+
+@dataclass
+class PoolScaler:
+    """Grow a pool by one process per decision while its queues are backed up; shrink after a calm cooldown."""
+
+    target_wait_seconds: float = 5.0
+    backlog_per_thread: int = 2
+    scale_down_cooldown_seconds: float = 60.0
+    _states: dict[str, _PoolScalingState] = field(default_factory=dict, repr=False)
+
+    def under_pressure(self, pool: WorkerPool, running: int, stats: Mapping[str, QueueStats]) -> bool:
+        backlog_limit = self.backlog_per_thread * pool.threads * max(1, running)
+        for queue in pool.queues:
+            queue_stats = stats.get(queue)
+            if queue_stats is None:
+                continue
+            if queue_stats.oldest_age_seconds > self.target_wait_seconds or queue_stats.depth > backlog_limit:
+                return True
+        return False
+
+    def desired_processes(
+        self,
+        pool: WorkerPool,
+        running: int,
+        stats: Mapping[str, QueueStats],
+        *,
+        now: float,
+    ) -> int:
+        if not pool.scalable:
+            return pool.min_processes
+        state = self._states.setdefault(pool.name, _PoolScalingState())
+        target = min(pool.max_processes, max(pool.min_processes, running))
+
+        if self.under_pressure(pool, running, stats):
+            state.last_pressure_at = now
+            if target < pool.max_processes:
+                state.last_change_at = now
+                return target + 1
+            return target
+
+        calm_since = max(state.last_pressure_at or 0.0, state.last_change_at or 0.0)
+        if target > pool.min_processes and now - calm_since >= self.scale_down_cooldown_seconds:
+            state.last_change_at = now
+            return target - 1
+        return target
@@ -0,0 +1,63 @@
+"""
+FILE_ROLE: Signal handlers that invalidate in-process reference catalogs.
+
+KEY_COMPONENTS:
+- _invalidate_reference_catalogs: Module symbol.
+- reference_catalog_post_save: Module symbol.
+- reference_catalog_post_delete: Module symbol.
+
+INTERACTIONS:
+- Depends on: core.models, core.services, Django signal machinery, or middleware hooks as appropriate.
+
+AI_GUIDELINES:
+- Keep this module focused on framework integration and small hook functions.
+- Do not move domain orchestration here when a service already owns the workflow.
+"""
+
+from __future__ import annotations
+
+from core.models import AiModel, CountryCode, Holiday
+from core.services.logger_service import Logger
+from core.services.reference_catalog_cache import reference_catalog_cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from products.models import DocumentType, Product, ProductCategory, Task
+
+logger = Logger.get_logger(__name__)
+
+# AppSetting is handled by `core.signals_app_setting` through `AppSettingService.invalidate_cache`.
+REFERENCE_CATALOG_SENDERS = (DocumentType, Product, ProductCategory, Task, CountryCode, Holiday, AiModel)
+
+
+def _invalidate_reference_catalogs(model_label: str) -> None:
+    def _invalidate() -> None:
+        try:
+            reference_catalog_cache.invalidate_for_model(model_label)
+        except Exception as exc:
+            logger.warning("Reference catalog invalidation skipped (model=%s): %s", model_label, exc)
+
+    try:
+        transaction.on_commit(_invalidate)
+    except Exception:
+        _invalidate()
+
+
+def reference_catalog_post_save(sender, instance, **kwargs):
+    _invalidate_reference_catalogs(sender._meta.label_lower)
+
+
+def reference_catalog_post_delete(sender, instance, **kwargs):
+    _invalidate_reference_catalogs(sender._meta.label_lower)
+
+
+for _sender in REFERENCE_CATALOG_SENDERS:
+    post_save.connect(
+        reference_catalog_post_save,
+        sender=_sender,
+        dispatch_uid=f"reference_catalog_post_save:{_sender._meta.label_lower}",
+    )
+    post_delete.connect(
+        reference_catalog_post_delete,
+        sender=_sender,
+        dispatch_uid=f"reference_catalog_post_delete:{_sender._meta.label_lower}",
+    )
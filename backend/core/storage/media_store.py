@@ -4,9 +4,11 @@ FILE_ROLE: Provides storage adapters for iterating and deleting media files acro
 KEY_COMPONENTS:
 - _normalize_prefix: Normalizes storage prefixes before traversal or deletion.
 - _iter_storage_files_via_listdir: Recursively yields file keys from storage.listdir().
-- BaseMediaStoreAdapter: Abstract adapter interface for media store operations.
-- FileSystemMediaStoreAdapter: Adapter for FileSystemStorage-backed media.
-- ObjectMediaStoreAdapter: Adapter for object-storage buckets with list/delete support.
+- BaseMediaStoreAdapter: Abstract adapter interface for media store operations (iterate, move, copy, compose,
+  bulk delete).
+- FileSystemMediaStoreAdapter: Adapter for FileSystemStorage-backed media; moves are same-volume renames.
+- ObjectMediaStoreAdapter: Adapter for object-storage buckets; copies are server-side CopyObject calls and
+  bulk deletes are batched DeleteObjects requests; compose uses multipart UploadPartCopy.
 - get_media_store_adapter: Chooses the correct adapter for the configured storage backend.
 
 INTERACTIONS:
@@ -15,15 +17,32 @@ INTERACTIONS:
 AI_GUIDELINES:
 - Use default_storage-compatible APIs and keep traversal logic backend-agnostic.
 - Do not hardcode filesystem paths for persisted media operations when storage abstractions are available.
+- move/copy resolve destination collisions with storage.get_available_name() and return the stored name,
+  mirroring Storage.save(); callers must persist the returned name rather than the requested one.
 """
 
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
 from abc import ABC, abstractmethod
 from collections.abc import Iterable, Iterator
 
+from core.services.logger_service import Logger
+from django.core.files.base import File
 from django.core.files.storage import FileSystemStorage, Storage, default_storage
 
+logger = Logger.get_logger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys per request.
+OBJECT_DELETE_BATCH_SIZE = 1000
+# S3 multipart parts (other than the last one) must be at least 5 MiB.
+OBJECT_MULTIPART_MIN_PART_SIZE = 5 * 1024 * 1024
+# compose() keeps small results in memory and spills larger ones to a temporary file.
+COMPOSE_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+COMPOSE_COPY_CHUNK_SIZE = 1024 * 1024
+
 
 def _normalize_prefix(prefix: str | None) -> str:
     return str(prefix or "").strip().strip("/")
@@ -61,11 +80,138 @@ class BaseMediaStoreAdapter(ABC):
         except Exception:
             return None
 
+    def copy(self, source: str, destination: str) -> str:
+        """Copy ``source`` to ``destination`` and return the stored destination name.
+
+        The generic implementation streams the file through the storage API; concrete
+        adapters override it with a backend-native copy.
+        """
+        with self.storage.open(_normalize_prefix(source), "rb") as source_file:
+            return self.storage.save(_normalize_prefix(destination), source_file)
+
+    def move(self, source: str, destination: str) -> str:
+        """Move ``source`` to ``destination`` and return the stored destination name."""
+        saved_name = self.copy(source, destination)
+        self.delete(source)
+        return saved_name
+
+    def compose(self, sources: list[str], destination: str) -> str:
+        """Concatenate ``sources`` in order into ``destination`` and return the stored name.
+
+        Sources are left in place; callers delete them once the composed file is persisted. The parts are
+        spooled into one seekable temporary file because backends such as S3 seek and size the content.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=COMPOSE_SPOOL_MAX_MEMORY) as spool:
+            for source in sources:
+                with self.storage.open(_normalize_prefix(source), "rb") as source_file:
+                    shutil.copyfileobj(source_file, spool, COMPOSE_COPY_CHUNK_SIZE)
+            spool.seek(0)
+            return self.storage.save(_normalize_prefix(destination), File(spool, name=destination))
+
+    def bulk_delete(self, keys: Iterable[str]) -> dict[str, str]:
+        """Delete every key, continuing past failures. Return ``{key: error}`` for keys that failed."""
+        failures: dict[str, str] = {}
+        for key in _unique_keys(keys):
+            try:
+                self.storage.delete(key)
+            except Exception as exc:
+                failures[key] = str(exc)
+        return failures
+
+
+def _unique_keys(keys: Iterable[str]) -> list[str]:
+    unique: list[str] = []
+    seen: set[str] = set()
+    for key in keys:
+        normalized = _normalize_prefix(key)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            unique.append(normalized)
+    return unique
+
 
 class FileSystemMediaStoreAdapter(BaseMediaStoreAdapter):
+    """Filesystem adapter; also covers EncryptedLocalStorage, whose per-file nonce keeps
+    ciphertext valid regardless of the file's name, so blobs can be renamed as-is."""
+
     def iter_files(self, prefix: str) -> Iterable[str]:
         return _iter_storage_files_via_listdir(self.storage, prefix)
 
+    def _prepare_destination(self, destination: str) -> tuple[str, str]:
+        name = self.storage.get_available_name(_normalize_prefix(destination))
+        path = self.storage.path(name)
+        directory = os.path.dirname(path)
+        directory_mode = getattr(self.storage, "directory_permissions_mode", None)
+        if directory_mode is not None:
+            # Match FileSystemStorage._save(): os.makedirs applies the mode after the umask.
+            old_umask = os.umask(0o777 & ~directory_mode)
+            try:
+                os.makedirs(directory, directory_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+        return name, path
+
+    def _apply_file_permissions(self, path: str) -> None:
+        file_mode = getattr(self.storage, "file_permissions_mode", None)
+        if file_mode is not None:
+            os.chmod(path, file_mode)
+
+    def copy(self, source: str, destination: str) -> str:
+        source_path = self.storage.path(_normalize_prefix(source))
+        name, path = self._prepare_destination(destination)
+        shutil.copyfile(source_path, path)
+        self._apply_file_permissions(path)
+        return name
+
+    def move(self, source: str, destination: str) -> str:
+        source_path = self.storage.path(_normalize_prefix(source))
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(source_path)
+        while True:
+            name, path = self._prepare_destination(destination)
+            try:
+                # A hard link never clobbers a file created after get_available_name() ran.
+                os.link(source_path, path)
+            except FileExistsError:
+                continue
+            except OSError:
+                # Filesystems without hard-link support fall back to shutil.move(), which is an
+                # atomic os.rename() on a single volume.
+                shutil.move(source_path, path)
+                break
+            os.unlink(source_path)
+            break
+        self._apply_file_permissions(path)
+        return name
+
+    def compose(self, sources: list[str], destination: str) -> str:
+        from core.storage.encrypted_local import EncryptedLocalStorage
+
+        if isinstance(self.storage, EncryptedLocalStorage):
+            # Each encrypted blob carries its own header and nonce, so blobs cannot be concatenated raw.
+            return super().compose(sources, destination)
+
+        source_paths = [self.storage.path(_normalize_prefix(source)) for source in sources]
+        while True:
+            name, path = self._prepare_destination(destination)
+            try:
+                target = open(path, "xb")
+            except FileExistsError:
+                continue
+            break
+        try:
+            with target:
+                for source_path in source_paths:
+                    with open(source_path, "rb") as source_file:
+                        shutil.copyfileobj(source_file, target)
+        except Exception:
+            os.unlink(path)
+            raise
+        self._apply_file_permissions(path)
+        return name
+
 
 class ObjectMediaStoreAdapter(BaseMediaStoreAdapter):
     def iter_files(self, prefix: str) -> Iterable[str]:
@@ -86,6 +232,94 @@ class ObjectMediaStoreAdapter(BaseMediaStoreAdapter):
 
         yield from _iter_storage_files_via_listdir(self.storage, normalized_prefix)
 
+    def _object_key(self, name: str) -> str:
+        normalize = getattr(self.storage, "_normalize_name", None)
+        normalized = _normalize_prefix(name)
+        if callable(normalize):
+            return normalize(normalized)
+        return normalized
+
+    def copy(self, source: str, destination: str) -> str:
+        bucket = getattr(self.storage, "bucket", None)
+        if bucket is None:
+            return super().copy(source, destination)
+
+        name = self.storage.get_available_name(_normalize_prefix(destination))
+        extra_args = {}
+        default_acl = getattr(self.storage, "default_acl", None)
+        if default_acl:
+            extra_args["ACL"] = default_acl
+        # Server-side CopyObject: bytes never leave the bucket.
+        bucket.Object(self._object_key(name)).copy_from(
+            CopySource={"Bucket": bucket.name, "Key": self._object_key(source)},
+            **extra_args,
+        )
+        return name
+
+    def compose(self, sources: list[str], destination: str) -> str:
+        bucket = getattr(self.storage, "bucket", None)
+        if bucket is None or not sources:
+            return super().compose(sources, destination)
+        leading_sizes = [self.size(source) for source in sources[:-1]]
+        if any(size is None or size < OBJECT_MULTIPART_MIN_PART_SIZE for size in leading_sizes):
+            return super().compose(sources, destination)
+
+        name = self.storage.get_available_name(_normalize_prefix(destination))
+        object_key = self._object_key(name)
+        client = bucket.meta.client
+        extra_args = {}
+        default_acl = getattr(self.storage, "default_acl", None)
+        if default_acl:
+            extra_args["ACL"] = default_acl
+        upload = client.create_multipart_upload(Bucket=bucket.name, Key=object_key, **extra_args)
+        upload_id = upload["UploadId"]
+        try:
+            parts = []
+            for part_number, source in enumerate(sources, start=1):
+                # Server-side UploadPartCopy: each part is copied inside the bucket.
+                response = client.upload_part_copy(
+                    Bucket=bucket.name,
+                    Key=object_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    CopySource={"Bucket": bucket.name, "Key": self._object_key(source)},
+                )
+                parts.append({"PartNumber": part_number, "ETag": response["CopyPartResult"]["ETag"]})
+            client.complete_multipart_upload(
+                Bucket=bucket.name,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            client.abort_multipart_upload(Bucket=bucket.name, Key=object_key, UploadId=upload_id)
+            raise
+        return name
+
+    def bulk_delete(self, keys: Iterable[str]) -> dict[str, str]:
+        bucket = getattr(self.storage, "bucket", None)
+        if bucket is None:
+            return super().bulk_delete(keys)
+
+        failures: dict[str, str] = {}
+        names = _unique_keys(keys)
+        for start in range(0, len(names), OBJECT_DELETE_BATCH_SIZE):
+            batch = names[start : start + OBJECT_DELETE_BATCH_SIZE]
+            names_by_object_key = {self._object_key(name): name for name in batch}
+            try:
+                response = bucket.delete_objects(
+                    Delete={"Objects": [{"Key": key} for key in names_by_object_key], "Quiet": True}
+                )
+            except Exception as exc:
+                logger.warning("Batch delete of %s object(s) failed: %s", len(batch), exc)
+                failures.update(super().bulk_delete(batch))
+                continue
+            for error in response.get("Errors", []) or []:
+                object_key = error.get("Key", "")
+                message = error.get("Message") or error.get("Code", "")
+                failures[names_by_object_key.get(object_key, object_key)] = message
+        return failures
+
 
 def get_media_store_adapter(storage: Storage | None = None) -> BaseMediaStoreAdapter:
     concrete_storage = storage or default_storage
@@ -4,6 +4,7 @@ FILE_ROLE: Signal handlers that sync core data into related subsystems.
 KEY_COMPONENTS:
 - _on_tracked_save: Module symbol.
 - _on_tracked_delete: Module symbol.
+- _on_tracked_bulk_create: Module symbol.
 - register_sync_signals: Module symbol.
 
 INTERACTIONS:
@@ -16,7 +17,12 @@ AI_GUIDELINES:
 
 from __future__ import annotations
 
-from core.services.sync_service import capture_model_delete, capture_model_upsert, is_sync_apply_in_progress
+from core.bulk_signals import post_bulk_create
+from core.services.sync_service import (
+    capture_model_delete_on_commit,
+    capture_model_upserts_on_commit,
+    is_sync_apply_in_progress,
+)
 from django.apps import apps
 from django.db.models.signals import post_delete, post_save
 
@@ -39,18 +45,27 @@ TRACKED_MODELS: list[tuple[str, str]] = [
 ]
 
 
-def _on_tracked_save(sender, instance, **kwargs):
+# Captures are buffered per transaction and written on commit, one change-log row per object.
+def _on_tracked_save(sender, instance, using=None, **kwargs):
     if is_sync_apply_in_progress():
         return
     if getattr(instance, "_sync_skip_capture", False):
         return
-    capture_model_upsert(instance)
+    capture_model_upserts_on_commit([instance], using=using)
 
 
-def _on_tracked_delete(sender, instance, **kwargs):
+def _on_tracked_bulk_create(sender, instances, **kwargs):
     if is_sync_apply_in_progress():
         return
-    capture_model_delete(sender._meta.label_lower, instance.pk)
+    capture_model_upserts_on_commit(
+        [instance for instance in instances if not getattr(instance, "_sync_skip_capture", False)]
+    )
+
+
+def _on_tracked_delete(sender, instance, using=None, **kwargs):
+    if is_sync_apply_in_progress():
+        return
+    capture_model_delete_on_commit(sender, instance.pk, using=using)
 
 
 def register_sync_signals() -> None:
@@ -64,6 +79,12 @@ def register_sync_signals() -> None:
         dispatch_delete_uid = f"sync_capture_delete_{model._meta.label_lower}"
         post_save.connect(_on_tracked_save, sender=model, weak=False, dispatch_uid=dispatch_save_uid)
         post_delete.connect(_on_tracked_delete, sender=model, weak=False, dispatch_uid=dispatch_delete_uid)
+        post_bulk_create.connect(
+            _on_tracked_bulk_create,
+            sender=model,
+            weak=False,
+            dispatch_uid=f"sync_capture_bulk_create_{model._meta.label_lower}",
+        )
 
 
 register_sync_signals()
@@ -6,6 +6,7 @@ KEY_COMPONENTS:
 - _process_ai_usage_for_generation: Private helper.
 - _create_ai_usage_from_generation: Private helper.
 - _process_ai_usage_message: Private helper.
+- compact_ai_usage_rollups_task: Periodic reconciliation of recent hourly AI usage rollups.
 
 INTERACTIONS:
 - Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
@@ -18,15 +19,18 @@ AI_GUIDELINES:
 from __future__ import annotations
 
 import time
+from datetime import timedelta
 from decimal import Decimal
 from typing import Any
 
 import requests
 from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
+from core.services.ai_usage_rollup_service import AIUsageRollupService
 from core.services.ai_usage_service import AIUsageService
 from core.services.logger_service import Logger
-from core.tasks.runtime import QUEUE_DEFAULT, db_task
+from core.tasks.runtime import QUEUE_DEFAULT, QUEUE_SCHEDULED, crontab, db_periodic_task, db_task
 from django.conf import settings
+from django.utils import timezone
 
 logger = Logger.get_logger(__name__)
 
@@ -217,3 +221,10 @@ def capture_ai_usage_task(
             str(exc),
         )
         return {"status": "failed", "error": str(exc)}
+
+
+@db_periodic_task(crontab(minute="5"), name="core.compact_ai_usage_rollups", queue=QUEUE_SCHEDULED)
+def compact_ai_usage_rollups_task() -> dict[str, int]:
+    """Rebuild the last few hours of rollups from raw rows to repair any missed incremental updates."""
+    hours = max(1, int(getattr(settings, "AI_USAGE_ROLLUP_COMPACTION_HOURS", 24)))
+    return AIUsageRollupService.rebuild(start=timezone.now() - timedelta(hours=hours))
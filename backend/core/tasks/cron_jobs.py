@@ -20,8 +20,10 @@ from typing import Iterable, Tuple
 import requests
 from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
 from core.services.app_setting_service import AppSettingService
+from core.services.artifact_cache_cleanup import prune_artifact_caches, prune_job_outputs
+from core.services.audit_trail_service import AuditTrailService
 from core.services.logger_service import Logger
-from core.tasks.runtime import QUEUE_LOW, QUEUE_SCHEDULED, crontab, db_periodic_task, db_task
+from core.tasks.runtime import MISFIRE_SKIP, QUEUE_LOW, QUEUE_SCHEDULED, crontab, db_periodic_task, db_task
 from django.conf import settings
 from django.core.cache import cache
 from django.core.management import call_command
@@ -129,18 +131,36 @@ def _run_locked_task(
             cache.delete(enqueue_lock_key)
 
 
+def _media_snapshot_due(today: datetime.date) -> bool:
+    interval_days = int(getattr(settings, "MEDIA_BACKUP_SNAPSHOT_INTERVAL_DAYS", 7) or 0)
+    return interval_days > 0 and today.toordinal() % interval_days == 0
+
+
 def _perform_full_backup() -> None:
     call_command("dbbackup")
     logger.info("DB Backup created successfully")
-    dir_name = "media_" + datetime.date.today().strftime("%Y%m%d")
-    call_command("uploadmediatos3", dir_name)
-    logger.info("Media files uploaded successfully")
+    # Mirror into a stable prefix so each night only uploads files that changed since the last run.
+    call_command("uploadmediatos3", getattr(settings, "MEDIA_BACKUP_PREFIX", "media_mirror"))
+    logger.info("Media files mirrored successfully")
+    # The mirror is overwritten in place, so a corrupted local file replaces its only remote copy;
+    # periodic dated snapshots keep point-in-time copies to restore from.
+    today = datetime.date.today()
+    if _media_snapshot_due(today):
+        call_command("uploadmediatos3", "media_" + today.strftime("%Y%m%d"), snapshot=True)
+        logger.info("Media snapshot uploaded successfully")
 
 
 def _perform_clear_cache() -> None:
     call_command("clear_cache")
     logger.info("Cache cleared successfully")
 
+    try:
+        deleted = {**prune_artifact_caches(), **prune_job_outputs()}
+        if any(deleted.values()):
+            logger.info("Pruned expired artifact cache files: %s", deleted)
+    except Exception as exc:
+        logger.error("Failed to prune artifact caches: %s", str(exc), exc_info=True)
+
 
 def _perform_full_backup_locked() -> bool:
     return _run_locked_task(
@@ -202,6 +222,10 @@ def run_openrouter_health_check_now() -> None:
     _perform_openrouter_health_check()
 
 
+def _heavy_job_jitter_seconds() -> float:
+    return max(0.0, float(getattr(settings, "DRAMATIQ_SCHEDULER_HEAVY_JITTER_SECONDS", 300)))
+
+
 def _register_full_backup() -> None:
     schedule = getattr(settings, "FULL_BACKUP_SCHEDULE", "02:00")
     try:
@@ -210,7 +234,12 @@ def _register_full_backup() -> None:
         logger.error(str(exc))
         return
 
-    @db_periodic_task(crontab(hour=hour, minute=minute), name="core.full_backup_daily", queue=QUEUE_SCHEDULED)
+    @db_periodic_task(
+        crontab(hour=hour, minute=minute),
+        name="core.full_backup_daily",
+        queue=QUEUE_SCHEDULED,
+        jitter_seconds=_heavy_job_jitter_seconds(),
+    )
     def _full_backup_daily() -> None:
         _perform_full_backup_locked()
 
@@ -228,7 +257,12 @@ def _register_clear_cache() -> None:
 
         task_name = f"core.clear_cache_{hour:02d}{minute:02d}"
 
-        @db_periodic_task(crontab(hour=hour, minute=minute), name=task_name, queue=QUEUE_SCHEDULED)
+        @db_periodic_task(
+            crontab(hour=hour, minute=minute),
+            name=task_name,
+            queue=QUEUE_SCHEDULED,
+            jitter_seconds=_heavy_job_jitter_seconds(),
+        )
         def _clear_cache_scheduled() -> None:
             _perform_clear_cache_locked()
 
@@ -236,10 +270,12 @@ def _register_clear_cache() -> None:
 
 
 def _perform_prune_auditlog() -> None:
-    """Prune `auditlog.LogEntry` rows older than `AUDITLOG_RETENTION_DAYS`.
+    """Prune audit rows older than `AUDITLOG_RETENTION_DAYS`.
 
     This uses the built-in management command `auditlogflush --before-date` to delete
-    old log entries. If `AUDITLOG_RETENTION_DAYS` is <= 0 the pruning is skipped.
+    old `LogEntry` rows (login/access events), then drops expired audit trail partitions.
+    If `AUDITLOG_RETENTION_DAYS` is <= 0 the pruning is skipped. Upcoming partitions are
+    created by the separate daily partition upkeep job.
     """
     retention_days = AppSettingService.parse_int(AppSettingService.get_effective_raw("AUDITLOG_RETENTION_DAYS", 14), 14)
     if retention_days <= 0:
@@ -253,6 +289,25 @@ def _perform_prune_auditlog() -> None:
     except Exception as exc:
         logger.error("Failed to prune auditlog entries: %s", str(exc), exc_info=True)
 
+    try:
+        AuditTrailService.prune(cutoff_date)
+    except Exception as exc:
+        logger.error("Failed to prune audit trail partitions: %s", str(exc), exc_info=True)
+
+
+def _perform_audit_trail_partition_upkeep() -> None:
+    """Create the upcoming monthly audit trail partitions.
+
+    Independent of retention: rows for a month without a partition land in the default
+    partition, after which that month's partition can no longer be attached.
+    """
+    try:
+        created = AuditTrailService.ensure_partitions()
+        if created:
+            logger.info("Audit trail partitions ensured: %s", ", ".join(created))
+    except Exception as exc:
+        logger.error("Failed to create audit trail partitions: %s", str(exc), exc_info=True)
+
 
 def _register_auditlog_prune() -> None:
     schedule = str(AppSettingService.get_effective_raw("AUDITLOG_RETENTION_SCHEDULE", "04:00") or "").strip()
@@ -266,13 +321,37 @@ def _register_auditlog_prune() -> None:
         logger.error(str(exc))
         return
 
-    @db_periodic_task(crontab(hour=hour, minute=minute), name="core.auditlog_prune_daily", queue=QUEUE_SCHEDULED)
+    @db_periodic_task(
+        crontab(hour=hour, minute=minute),
+        name="core.auditlog_prune_daily",
+        queue=QUEUE_SCHEDULED,
+        jitter_seconds=_heavy_job_jitter_seconds(),
+    )
     def _auditlog_prune_daily() -> None:
         _perform_prune_auditlog()
 
     globals()["_auditlog_prune_daily"] = _auditlog_prune_daily
 
 
+def _register_audit_trail_partitions() -> None:
+    schedule = str(getattr(settings, "AUDIT_TRAIL_PARTITION_SCHEDULE", "00:30") or "").strip() or "00:30"
+    try:
+        hour, minute = _parse_time(schedule)
+    except ValueError as exc:
+        logger.error(str(exc))
+        hour, minute = 0, 30
+
+    @db_periodic_task(
+        crontab(hour=hour, minute=minute),
+        name="core.audit_trail_partitions_daily",
+        queue=QUEUE_SCHEDULED,
+    )
+    def _audit_trail_partitions_daily() -> None:
+        _perform_audit_trail_partition_upkeep()
+
+    globals()["_audit_trail_partitions_daily"] = _audit_trail_partitions_daily
+
+
 def _perform_openrouter_health_check() -> bool:
     """
     Check OpenRouter API health using GET /api/v1/key.
@@ -372,7 +451,8 @@ def _register_openrouter_health_check() -> None:
         logger.error("Invalid OPENROUTER_HEALTHCHECK_CRON_MINUTE '%s': %s", minute_expr, str(exc))
         return
 
-    @db_periodic_task(schedule, name="core.openrouter_health_check", queue=QUEUE_SCHEDULED)
+    # A health check for a past slot says nothing about now; only run on time.
+    @db_periodic_task(schedule, name="core.openrouter_health_check", queue=QUEUE_SCHEDULED, misfire_policy=MISFIRE_SKIP)
     def _openrouter_health_check_periodic() -> None:
         _perform_openrouter_health_check()
 
@@ -382,4 +462,5 @@ def _register_openrouter_health_check() -> None:
 _register_full_backup()
 _register_clear_cache()
 _register_auditlog_prune()
+_register_audit_trail_partitions()
 _register_openrouter_health_check()
@@ -7,9 +7,14 @@ KEY_COMPONENTS:
 - categorization_item_has_terminal_validation: Module symbol.
 - categorization_item_is_terminal: Module symbol.
 - run_document_categorization_item: Task/helper entry point.
+- _reporting_ai_capacity_waits: Private helper.
+- _claim_batch_siblings / _hand_back_batch_sibling / _categorize_with_batch_siblings: Private helpers that pack
+  queued files of the same job into one batched categorization request.
+- _defer_if_claimed_by_batch_leader: Private helper that re-schedules a batch-claimed item past the leader's lock.
 - _run_validation_step: Private helper.
 - _try_match_document: Private helper.
 - _update_categorization_job_counts: Private helper.
+- refresh_categorization_job_counts: Module symbol.
 
 INTERACTIONS:
 - Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
@@ -20,6 +25,9 @@ AI_GUIDELINES:
 """
 
 import traceback as tb_module
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 
 from core.services.ai_client import get_ai_user_message, is_ai_timeout_exception
 from core.services.ai_document_categorizer import (
@@ -27,10 +35,22 @@ from core.services.ai_document_categorizer import (
     build_document_validation_prompts,
     get_document_types_for_prompt,
 )
+from core.services.ai_rate_limiter import AICapacityWait, on_ai_capacity_wait
 from core.services.logger_service import Logger
-from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
-from core.tasks.runtime import QUEUE_REALTIME, db_task, retry_on_transient_external_failure
+from core.tasks.idempotency import (
+    acquire_task_lock,
+    build_task_lock_key,
+    release_task_lock,
+    task_lock_ttl_seconds,
+)
+from core.tasks.runtime import (
+    QUEUE_REALTIME,
+    db_task,
+    defer_transient_retries,
+    retry_on_transient_external_failure,
+)
 from customer_applications.models import DocumentCategorizationItem, DocumentCategorizationJob
+from django.conf import settings
 from django.core.files.storage import default_storage
 from django.db import transaction
 from django.utils import timezone
@@ -62,18 +82,176 @@ def categorization_item_is_terminal(item: DocumentCategorizationItem) -> bool:
     return categorization_item_has_terminal_validation(item)
 
 
+@contextmanager
+def _reporting_ai_capacity_waits(item: DocumentCategorizationItem) -> Iterator[None]:
+    """Persist shared AI capacity waits on ``item.result`` so the SSE stream can show them."""
+
+    def on_wait(wait: AICapacityWait) -> None:
+        current_result = _get_categorization_item_result(item)
+        current_result["ai_capacity_wait"] = {
+            "priority": wait.priority,
+            "waited_seconds": round(wait.waited_seconds, 1),
+            "retry_in_seconds": round(wait.retry_in_seconds, 1),
+            "message": f"Waiting for AI capacity ({wait.provider}), retrying in {wait.retry_in_seconds:.0f}s",
+        }
+        item.result = current_result
+        item.save(update_fields=["result", "updated_at"])
+
+    try:
+        with on_ai_capacity_wait(on_wait):
+            yield
+    finally:
+        # The next result save drops the marker; no extra write once capacity was granted.
+        _get_categorization_item_result(item).pop("ai_capacity_wait", None)
+
+
+@dataclass
+class _BatchClaim:
+    item: DocumentCategorizationItem
+    lock_key: str
+    lock_token: str
+    file_bytes: bytes = b""
+
+
+def _batch_max_file_bytes() -> int:
+    return int(getattr(settings, "DOCUMENT_CATEGORIZATION_BATCH_MAX_FILE_BYTES", 4 * 1024 * 1024))
+
+
+def _claim_batch_siblings(item: DocumentCategorizationItem, *, limit: int) -> list[_BatchClaim]:
+    """Take over queued, already uploaded files of the same job (their own task lock plus a queued->processing flip)."""
+    claims: list[_BatchClaim] = []
+    candidates = (
+        DocumentCategorizationItem.objects.filter(job_id=item.job_id, status=DocumentCategorizationItem.STATUS_QUEUED)
+        .exclude(id=item.id)
+        .exclude(file_path="")
+        .order_by("sort_index")[: limit * 2]
+    )
+    max_bytes = _batch_max_file_bytes()
+    for candidate in candidates:
+        if len(claims) >= limit:
+            break
+        lock_key = build_task_lock_key(namespace="doc_categorization_item", item_id=str(candidate.id))
+        lock_token = acquire_task_lock(lock_key)
+        if not lock_token:
+            continue
+        # The leader id tells the sibling's own message to wait for the hand-back instead of being dropped.
+        claimed_result = {**_get_categorization_item_result(candidate), "batch_leader_id": str(item.id)}
+        claimed = DocumentCategorizationItem.objects.filter(
+            id=candidate.id, status=DocumentCategorizationItem.STATUS_QUEUED
+        ).update(status=DocumentCategorizationItem.STATUS_PROCESSING, result=claimed_result, updated_at=timezone.now())
+        if not claimed:
+            release_task_lock(lock_key, lock_token)
+            continue
+        candidate.status = DocumentCategorizationItem.STATUS_PROCESSING
+        candidate.result = claimed_result
+        claim = _BatchClaim(item=candidate, lock_key=lock_key, lock_token=lock_token)
+        try:
+            with default_storage.open(candidate.file_path, "rb") as handle:
+                claim.file_bytes = handle.read(max_bytes + 1)
+        except Exception as exc:
+            logger.warning("Could not read %s for batch categorization: %s", candidate.file_path, exc)
+        if not claim.file_bytes or len(claim.file_bytes) > max_bytes:
+            _hand_back_batch_sibling(claim, {"stage": "categorizing_pass_1", "batch_single": True})
+            continue
+        claims.append(claim)
+    return claims
+
+
+def _hand_back_batch_sibling(claim: _BatchClaim, result: dict) -> None:
+    """Merge the batch outcome into the sibling's result and re-dispatch it; its own task finishes (or redoes) it."""
+    merged = dict(_get_categorization_item_result(claim.item))
+    merged.pop("batch_leader_id", None)
+    merged.update(result)
+    claim.item.result = merged
+    claim.item.save(update_fields=["result", "updated_at"])
+    release_task_lock(claim.lock_key, claim.lock_token)
+    # The sibling's original message may have been skipped while the lock was held.
+    run_document_categorization_item.delay(str(claim.item.id))
+
+
+def _categorize_with_batch_siblings(
+    item: DocumentCategorizationItem,
+    file_bytes: bytes,
+    categorizer: AIDocumentCategorizer,
+    document_types: list[dict],
+) -> dict | None:
+    """Categorize ``item`` together with queued siblings in one request; None means use the single-file path."""
+    batch_size = int(getattr(settings, "DOCUMENT_CATEGORIZATION_BATCH_SIZE", 4))
+    if batch_size < 2 or len(file_bytes) > _batch_max_file_bytes():
+        return None
+    claims = _claim_batch_siblings(item, limit=batch_size - 1)
+    if not claims:
+        return None
+
+    min_confidence = float(getattr(settings, "DOCUMENT_CATEGORIZATION_BATCH_MIN_CONFIDENCE", 0.8))
+
+    def is_confident(result: dict | None) -> bool:
+        if not result or not result.get("document_type_id"):
+            return False
+        return float(result.get("confidence") or 0) >= min_confidence
+
+    outcomes = {claim.item.id: {"stage": "categorizing_pass_1", "batch_single": True} for claim in claims}
+    leader_result = None
+    try:
+        with _reporting_ai_capacity_waits(item):
+            results = categorizer.categorize_files_batch(
+                [(file_bytes, item.filename)] + [(claim.file_bytes, claim.item.filename) for claim in claims],
+                document_types,
+            )
+        for claim, result in zip(claims, results[1:]):
+            if is_confident(result):
+                outcomes[claim.item.id] = {
+                    "stage": "categorizing_pass_1",
+                    "batch_categorization": {**result, "pass_used": 1},
+                }
+        if is_confident(results[0]):
+            leader_result = {**results[0], "pass_used": 1}
+    except Exception as exc:
+        # Every file in the batch falls back to its own single-file call.
+        logger.warning(
+            "Batch categorization of %d files failed for job %s; falling back to single-file calls: %s",
+            len(claims) + 1,
+            item.job_id,
+            exc,
+        )
+    finally:
+        for claim in claims:
+            _hand_back_batch_sibling(claim, outcomes[claim.item.id])
+    return leader_result
+
+
+def _defer_if_claimed_by_batch_leader(item_id: str) -> None:
+    """Re-check a batch-claimed item once the leader's lock expires, so a killed leader cannot strand it."""
+    item = DocumentCategorizationItem.objects.filter(id=item_id).only("status", "result").first()
+    claimed = item is not None and (
+        item.status == DocumentCategorizationItem.STATUS_QUEUED
+        or "batch_leader_id" in _get_categorization_item_result(item)
+    )
+    if not claimed:
+        logger.warning("Document categorization task skipped (lock contention): item_id=%s", item_id)
+        return
+    # A live leader re-dispatches the item on hand-back and this message then finds it terminal.
+    delay_seconds = task_lock_ttl_seconds() + 30
+    logger.info(
+        "Document categorization item held by a batch leader; re-checking in %ss: item_id=%s", delay_seconds, item_id
+    )
+    run_document_categorization_item.schedule(args=(str(item_id),), delay=delay_seconds)
+
+
 @db_task(
     context=True,
     queue=QUEUE_REALTIME,
     queue_defaults=True,
     retry_when=retry_on_transient_external_failure,
+    # Bulk uploads fan out one message per file; cap them so passport imports and OCR keep realtime threads.
+    max_concurrency=2,
 )
 def run_document_categorization_item(item_id: str, task=None) -> None:
     """Categorize a single uploaded file using AI vision (two-pass) and validate."""
     lock_key = build_task_lock_key(namespace="doc_categorization_item", item_id=str(item_id))
     lock_token = acquire_task_lock(lock_key)
     if not lock_token:
-        logger.warning("Document categorization task skipped (lock contention): item_id=%s", item_id)
+        _defer_if_claimed_by_batch_leader(item_id)
         return
 
     try:
@@ -83,6 +261,11 @@ def run_document_categorization_item(item_id: str, task=None) -> None:
             logger.error("DocumentCategorizationItem %s not found", item_id)
             return
 
+        if categorization_item_is_terminal(item):
+            # Already finished through a batch led by a sibling item (or a duplicate delivery).
+            logger.info("Document categorization task skipped (item already terminal): item_id=%s", item_id)
+            return
+
         job = item.job
 
         # Mark job as processing on first item
@@ -93,6 +276,8 @@ def run_document_categorization_item(item_id: str, task=None) -> None:
 
         item.status = DocumentCategorizationItem.STATUS_PROCESSING
         current_result = item.result if isinstance(item.result, dict) else {}
+        batch_result = current_result.pop("batch_categorization", None)
+        current_result.pop("batch_leader_id", None)
         current_result.update({"stage": "categorizing_pass_1"})
         item.result = current_result
         item.save(update_fields=["status", "result", "updated_at"])
@@ -119,12 +304,21 @@ def run_document_categorization_item(item_id: str, task=None) -> None:
                 item.save(update_fields=["result", "updated_at"])
 
             # --- Two-pass categorization ---
-            result = categorizer.categorize_file_two_pass(
-                file_bytes=file_bytes,
-                filename=item.filename,
-                document_types=document_types,
-                on_pass_update=on_pass_update,
-            )
+            # --- Batched categorization with queued siblings, when a sibling has not already done it ---
+            result = batch_result if isinstance(batch_result, dict) else None
+            if result is None and not current_result.get("batch_single"):
+                result = _categorize_with_batch_siblings(item, file_bytes, categorizer, document_types)
+
+            # --- Two-pass categorization (files that were not batched or came back unsure) ---
+            if result is None:
+                # Transient provider failures re-raise to db_task below, so it can redeliver instead of sleeping.
+                with _reporting_ai_capacity_waits(item), defer_transient_retries():
+                    result = categorizer.categorize_file_two_pass(
+                        file_bytes=file_bytes,
+                        filename=item.filename,
+                        document_types=document_types,
+                        on_pass_update=on_pass_update,
+                    )
 
             doc_type_id = result.get("document_type_id")
             doc_type_name = result.get("document_type")
@@ -285,18 +479,19 @@ def _run_validation_step(
     )
 
     try:
-        validation = AIDocumentCategorizer.validate_document(
-            file_bytes=file_bytes,
-            filename=item.filename,
-            doc_type_name=doc_type.name,
-            positive_prompt=positive_prompt,
-            negative_prompt=negative_prompt,
-            product_prompt=product_prompt,
-            require_expiration_date=bool(doc_type.has_expiration_date),
-            require_doc_number=bool(doc_type.has_doc_number),
-            require_details=bool(doc_type.has_details),
-            provider_order=provider_order,
-        )
+        with _reporting_ai_capacity_waits(item):
+            validation = AIDocumentCategorizer.validate_document(
+                file_bytes=file_bytes,
+                filename=item.filename,
+                doc_type_name=doc_type.name,
+                positive_prompt=positive_prompt,
+                negative_prompt=negative_prompt,
+                product_prompt=product_prompt,
+                require_expiration_date=bool(doc_type.has_expiration_date),
+                require_doc_number=bool(doc_type.has_doc_number),
+                require_details=bool(doc_type.has_details),
+                provider_order=provider_order,
+            )
 
         item.validation_status = "valid" if validation.get("valid") else "invalid"
         item.validation_result = validation
@@ -388,7 +583,13 @@ def _update_categorization_job_counts(job_id) -> None:
     else:
         job.progress = 100
 
-    if job.total_files == 0 or job.processed_files >= job.total_files:
+    # Items are dispatched as soon as each file lands, so while the upload is still running the
+    # item count is only a lower bound; completion is decided once the upload is marked complete.
+    job_result = job.result if isinstance(job.result, dict) else {}
+    upload_info = job_result.get("upload") if isinstance(job_result.get("upload"), dict) else {}
+    upload_complete = upload_info.get("complete", True) is not False
+
+    if upload_complete and (job.total_files == 0 or job.processed_files >= job.total_files):
         if job.total_files > 0 and job.error_count == job.total_files:
             job.status = DocumentCategorizationJob.STATUS_FAILED
         else:
@@ -406,3 +607,9 @@ def _update_categorization_job_counts(job_id) -> None:
             "updated_at",
         ]
     )
+
+
+def refresh_categorization_job_counts(job_id) -> None:
+    """Recompute job counters outside a worker, e.g. when the upload finishes after every item did."""
+    with transaction.atomic():
+        _update_categorization_job_counts(job_id)
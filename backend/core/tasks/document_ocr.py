@@ -22,7 +22,12 @@ from core.services.ai_document_ocr_service import extract_document_structured_ou
 from core.services.logger_service import Logger
 from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
 from core.tasks.progress import persist_progress
-from core.tasks.runtime import QUEUE_DOC_CONVERSION, db_task, retry_on_transient_external_failure
+from core.tasks.runtime import (
+    QUEUE_DOC_CONVERSION,
+    db_task,
+    defer_transient_retries,
+    retry_on_transient_external_failure,
+)
 from core.utils.document_type_ai_fields import parse_structured_output_fields
 from core.utils.storage_helpers import get_local_file_path
 from invoices.services.document_parser import DocumentParser
@@ -133,12 +138,14 @@ def run_document_ocr_job(job_id: str, task=None) -> None:
                             file_bytes = source.read()
 
                         persist_progress(job, progress=60, force=True)
-                        structured_data = extract_document_structured_output(
-                            file_bytes=file_bytes,
-                            filename=os.path.basename(job.file_path),
-                            doc_type_name=doc_type_name,
-                            fields=structured_fields,
-                        )
+                        # Transient provider failures re-raise below, so db_task redelivers instead of sleeping.
+                        with defer_transient_retries():
+                            structured_data = extract_document_structured_output(
+                                file_bytes=file_bytes,
+                                filename=os.path.basename(job.file_path),
+                                doc_type_name=doc_type_name,
+                                fields=structured_fields,
+                            )
                         extracted_text = json.dumps(structured_data, indent=2, ensure_ascii=False)
                     except Exception as extraction_error:
                         if retry_on_transient_external_failure(0, extraction_error):
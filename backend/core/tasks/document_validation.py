@@ -20,7 +20,12 @@ from core.services.ai_document_categorizer import (
 )
 from core.services.logger_service import Logger
 from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
-from core.tasks.runtime import QUEUE_REALTIME, db_task, retry_on_transient_external_failure
+from core.tasks.runtime import (
+    QUEUE_REALTIME,
+    db_task,
+    defer_transient_retries,
+    retry_on_transient_external_failure,
+)
 from customer_applications.models import Document
 from customer_applications.services.document_expiration_state_service import DocumentExpirationStateService
 from django.core.files.storage import default_storage
@@ -63,6 +68,8 @@ def _apply_expiration_metadata(document: Document, validation: dict) -> tuple[di
     queue=QUEUE_REALTIME,
     queue_defaults=True,
     retry_when=retry_on_transient_external_failure,
+    # Bulk uploads fan out one message per file; cap them so passport imports and OCR keep realtime threads.
+    max_concurrency=2,
 )
 def run_document_validation(document_id: int, task=None) -> None:
     """Validate a single document file against its document-type and product prompts."""
@@ -175,17 +182,19 @@ def run_document_validation(document_id: int, task=None) -> None:
         )
 
         try:
-            validation = AIDocumentCategorizer.validate_document(
-                file_bytes=file_bytes,
-                filename=filename,
-                doc_type_name=doc_type.name,
-                positive_prompt=positive_prompt,
-                negative_prompt=negative_prompt,
-                product_prompt=product_prompt,
-                require_expiration_date=bool(doc_type.has_expiration_date),
-                require_doc_number=bool(doc_type.has_doc_number),
-                require_details=bool(doc_type.has_details),
-            )
+            # Transient provider failures re-raise to db_task below, so it can redeliver instead of sleeping.
+            with defer_transient_retries():
+                validation = AIDocumentCategorizer.validate_document(
+                    file_bytes=file_bytes,
+                    filename=filename,
+                    doc_type_name=doc_type.name,
+                    positive_prompt=positive_prompt,
+                    negative_prompt=negative_prompt,
+                    product_prompt=product_prompt,
+                    require_expiration_date=bool(doc_type.has_expiration_date),
+                    require_doc_number=bool(doc_type.has_doc_number),
+                    require_details=bool(doc_type.has_details),
+                )
 
             update_fields = {"updated_at"}
 
@@ -18,7 +18,17 @@ import logging
 
 import requests
 from core.models.local_resilience import LocalResilienceSettings, SyncChangeLog, SyncCursor
-from core.services.sync_service import get_local_node_id, ingest_remote_changes
+from core.services.sync_service import (
+    change_log_stats,
+    compact_change_log,
+    get_local_node_id,
+    ingest_remote_changes,
+)
+from core.telemetry.metrics import (
+    sync_changelog_compacted_rows_total,
+    sync_changelog_peer_lag_rows,
+    sync_changelog_rows,
+)
 from core.tasks.runtime import QUEUE_LOW, QUEUE_SCHEDULED, crontab, db_periodic_task, db_task
 from django.conf import settings
 from django.utils import timezone
@@ -98,9 +108,10 @@ def _push_once(*, limit: int) -> dict[str, int]:
 
     max_seq = max(int(row.seq) for row in rows)
     cursor.last_pushed_seq = max_seq
+    cursor.acked_seq = max(int(cursor.acked_seq), max_seq)
     cursor.last_pushed_at = timezone.now()
     cursor.last_error = ""
-    cursor.save(update_fields=["last_pushed_seq", "last_pushed_at", "last_error", "updated_at"])
+    cursor.save(update_fields=["last_pushed_seq", "acked_seq", "last_pushed_at", "last_error", "updated_at"])
 
     return {"pushed": len(rows), "skipped": 0}
 
@@ -119,7 +130,8 @@ def _pull_once(*, limit: int) -> dict[str, int]:
     timeout = float(getattr(settings, "LOCAL_SYNC_REQUEST_TIMEOUT_SECONDS", 10))
     response = requests.get(
         f"{base_url}/api/sync/changes/pull/",
-        params={"after_seq": int(cursor.last_pulled_seq), "limit": int(limit)},
+        # node_id lets the remote record our acknowledged cursor for its change-log compaction.
+        params={"after_seq": int(cursor.last_pulled_seq), "limit": int(limit), "node_id": get_local_node_id()},
         headers=_request_headers(),
         timeout=timeout,
     )
@@ -195,3 +207,23 @@ def sync_pull_periodic_task() -> None:
         cursor.last_error = f"pull:{type(exc).__name__}:{exc}"
         cursor.save(update_fields=["last_error", "updated_at"])
         logger.warning("Local sync periodic pull failed: %s", exc)
+
+
+def _compact_change_log() -> dict[str, int]:
+    if not bool(getattr(settings, "LOCAL_SYNC_COMPACTION_ENABLED", True)):
+        return {"deleted": 0, "watermark": 0}
+
+    result = compact_change_log(batch_size=int(getattr(settings, "LOCAL_SYNC_COMPACTION_BATCH_SIZE", 5000)))
+    if result["deleted"]:
+        sync_changelog_compacted_rows_total.inc(result["deleted"])
+    stats = change_log_stats()
+    sync_changelog_rows.observe(stats["rows"])
+    for node_id, lag_rows in stats["peerLag"].items():
+        sync_changelog_peer_lag_rows.observe(lag_rows, peer=node_id)
+    logger.info("Sync change log compaction completed: %s (rows=%s)", result, stats["rows"])
+    return result
+
+
+@db_periodic_task(crontab(minute="17"), name="core.sync_changelog_compaction", queue=QUEUE_LOW)
+def sync_changelog_compaction_periodic_task() -> None:
+    _compact_change_log()
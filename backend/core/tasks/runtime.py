@@ -3,7 +3,10 @@ FILE_ROLE: Async task entry points for the core app.
 
 KEY_COMPONENTS:
 - QUEUE_LOW: Module symbol.
+- QUEUE_PRIORITY_DEFAULTS: Actor priority per queue so workers serving several queues prefer realtime work.
 - db_task: Module symbol.
+- actor_concurrency_limit: Cluster-wide concurrency cap for an actor (declared in db_task, overridable in settings).
+- defer_transient_retries: Opt-in block letting callees hand transient failures to the task queue.
 
 INTERACTIONS:
 - Depends on: core task runtime infrastructure and Django/queue backends.
@@ -17,13 +20,17 @@ from __future__ import annotations
 
 import logging
 import random
-from dataclasses import dataclass
+from contextlib import contextmanager
+from contextvars import ContextVar
+from bisect import bisect_left
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from functools import wraps
 from types import SimpleNamespace
-from typing import Any, Callable, cast
+from typing import Any, Callable, Iterator, cast
 
 import dramatiq
+from django.conf import settings
 from django.utils import timezone
 from dramatiq.middleware import CurrentMessage, TimeLimitExceeded
 
@@ -34,6 +41,9 @@ QUEUE_LOW = "low"
 QUEUE_DOC_CONVERSION = "doc_conversion"
 
 logger = logging.getLogger(__name__)
+_TASK_RETRIES_REMAINING: ContextVar[int] = ContextVar("task_retries_remaining", default=0)
+_TASK_ACTOR_NAME: ContextVar[str | None] = ContextVar("task_actor_name", default=None)
+_TASK_DEFERS_RETRIES: ContextVar[bool] = ContextVar("task_defers_retries", default=False)
 
 
 @dataclass(frozen=True)
@@ -43,6 +53,7 @@ class TaskPolicy:
     max_backoff_ms: int | None = None
     retry_jitter_ms: int | None = None
     time_limit_ms: int | None = None
+    max_concurrency: int | None = None
 
 
 QUEUE_TASK_POLICY_DEFAULTS: dict[str, TaskPolicy] = {
@@ -76,6 +87,25 @@ QUEUE_TASK_POLICY_DEFAULTS: dict[str, TaskPolicy] = {
     ),
 }
 
+# Dramatiq runs lower values first when one worker process consumes several queues.
+QUEUE_PRIORITY_DEFAULTS: dict[str, int] = {
+    QUEUE_REALTIME: 0,
+    QUEUE_DEFAULT: 10,
+    QUEUE_DOC_CONVERSION: 10,
+    QUEUE_SCHEDULED: 20,
+    QUEUE_LOW: 30,
+}
+
+_ACTOR_POLICIES: dict[str, TaskPolicy] = {}
+
+MISFIRE_ONCE = "once"
+MISFIRE_ALL = "all"
+MISFIRE_SKIP = "skip"
+MISFIRE_POLICIES = frozenset({MISFIRE_ONCE, MISFIRE_ALL, MISFIRE_SKIP})
+
+# Upper bound for next-fire searches; covers leap-day-only expressions.
+_NEXT_FIRE_HORIZON = timedelta(days=366 * 5)
+
 
 @dataclass(frozen=True)
 class CrontabSchedule:
@@ -84,22 +114,67 @@ class CrontabSchedule:
     day: str | int = "*"
     month: str | int = "*"
     day_of_week: str | int = "*"
+    _minutes: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _hours: frozenset[int] = field(init=False, repr=False, compare=False)
+    _days: frozenset[int] = field(init=False, repr=False, compare=False)
+    _months: frozenset[int] = field(init=False, repr=False, compare=False)
+    _weekdays: frozenset[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Expressions are parsed once here; the scheduler loop only does set lookups afterwards.
+        object.__setattr__(self, "_minutes", tuple(sorted(_compile_field(self.minute, minimum=0, maximum=59))))
+        object.__setattr__(self, "_hours", _compile_field(self.hour, minimum=0, maximum=23))
+        object.__setattr__(self, "_days", _compile_field(self.day, minimum=1, maximum=31))
+        object.__setattr__(self, "_months", _compile_field(self.month, minimum=1, maximum=12))
+        weekdays = _compile_field(self.day_of_week, minimum=0, maximum=7)
+        object.__setattr__(self, "_weekdays", frozenset(0 if value == 7 else value for value in weekdays))
 
     def is_due(self, at: datetime) -> bool:
         return (
-            _match_field(at.minute, self.minute, minimum=0, maximum=59)
-            and _match_field(at.hour, self.hour, minimum=0, maximum=23)
-            and _match_field(at.day, self.day, minimum=1, maximum=31)
-            and _match_field(at.month, self.month, minimum=1, maximum=12)
-            and _match_field(_cron_weekday(at), self.day_of_week, minimum=0, maximum=7)
+            at.minute in self._minutes
+            and at.hour in self._hours
+            and at.day in self._days
+            and at.month in self._months
+            and _cron_weekday(at) in self._weekdays
         )
 
+    def next_fire_after(self, after: datetime) -> datetime | None:
+        """Return the first minute strictly after ``after`` matching the schedule, or ``None`` if it never fires."""
+        candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        horizon = candidate + _NEXT_FIRE_HORIZON
+        while candidate < horizon:
+            if candidate.month not in self._months:
+                year, month = divmod(candidate.year * 12 + candidate.month, 12)
+                candidate = candidate.replace(year=year, month=month + 1, day=1, hour=0, minute=0)
+                continue
+            if candidate.day not in self._days or _cron_weekday(candidate) not in self._weekdays:
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if candidate.hour not in self._hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            index = bisect_left(self._minutes, candidate.minute)
+            if index == len(self._minutes):
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            return candidate.replace(minute=self._minutes[index])
+        return None
+
+    def fire_times_between(self, after: datetime, until: datetime) -> Iterator[datetime]:
+        """Yield fire times in the half-open window ``(after, until]``."""
+        fire_at = self.next_fire_after(after)
+        while fire_at is not None and fire_at <= until:
+            yield fire_at
+            fire_at = self.next_fire_after(fire_at)
+
 
 @dataclass(frozen=True)
 class PeriodicTaskEntry:
     name: str
     schedule: CrontabSchedule
     task: "TaskCompat"
+    misfire_policy: str = MISFIRE_ONCE
+    jitter_seconds: float = 0.0
 
 
 _PERIODIC_TASKS: dict[str, PeriodicTaskEntry] = {}
@@ -111,6 +186,14 @@ def _cron_weekday(value: datetime) -> int:
     return 0 if py == 6 else py + 1
 
 
+def _compile_field(expression: str | int, *, minimum: int, maximum: int) -> frozenset[int]:
+    return frozenset(
+        value
+        for value in range(minimum, maximum + 1)
+        if _match_field(value, expression, minimum=minimum, maximum=maximum)
+    )
+
+
 def _match_field(value: int, expression: str | int, *, minimum: int, maximum: int) -> bool:
     if isinstance(expression, int):
         return value == expression
@@ -263,6 +346,55 @@ def _current_retries_used() -> int:
     return retries_used
 
 
+def current_task_retries_remaining() -> int:
+    """Retries left for the db_task message running in this context (0 outside Dramatiq workers)."""
+    return _TASK_RETRIES_REMAINING.get()
+
+
+@contextmanager
+def defer_transient_retries() -> Iterator[None]:
+    """Let callees in this block hand transient failures back to Dramatiq for a delayed redelivery.
+
+    Only wrap calls whose exceptions reach db_task: a caller that swallows the error would turn the
+    deferred retry into no retry at all.
+    """
+    token = _TASK_DEFERS_RETRIES.set(True)
+    try:
+        yield
+    finally:
+        _TASK_DEFERS_RETRIES.reset(token)
+
+
+def current_task_defers_retries() -> bool:
+    """True inside defer_transient_retries() while the running db_task message still has retries left."""
+    return _TASK_DEFERS_RETRIES.get() and _TASK_RETRIES_REMAINING.get() > 0
+
+
+def current_task_actor_name() -> str | None:
+    """Actor name of the db_task running in this context, or None in web requests and scripts."""
+    return _TASK_ACTOR_NAME.get()
+
+
+def actor_task_policy(actor_name: str) -> TaskPolicy | None:
+    return _ACTOR_POLICIES.get(actor_name)
+
+
+def actor_concurrency_limit(actor_name: str) -> int | None:
+    """Concurrent executions allowed for ``actor_name`` across all workers (``None`` means unlimited).
+
+    ``DRAMATIQ_ACTOR_CONCURRENCY_LIMITS`` overrides the value declared on ``db_task``; 0 lifts the limit.
+    """
+    overrides = getattr(settings, "DRAMATIQ_ACTOR_CONCURRENCY_LIMITS", None) or {}
+    if actor_name in overrides:
+        limit = overrides[actor_name]
+    else:
+        policy = _ACTOR_POLICIES.get(actor_name)
+        limit = policy.max_concurrency if policy is not None else None
+    if limit is None or int(limit) <= 0:
+        return None
+    return int(limit)
+
+
 def _build_task_context(
     *,
     actor_name: str,
@@ -295,6 +427,7 @@ def _resolve_policy(
     max_backoff_ms: int | None,
     retry_jitter_ms: int | None,
     time_limit_ms: int | None,
+    max_concurrency: int | None = None,
 ) -> TaskPolicy:
     defaults = QUEUE_TASK_POLICY_DEFAULTS.get(queue, TaskPolicy()) if queue_defaults else TaskPolicy()
     return TaskPolicy(
@@ -303,6 +436,7 @@ def _resolve_policy(
         max_backoff_ms=defaults.max_backoff_ms if max_backoff_ms is None else max(0, int(max_backoff_ms)),
         retry_jitter_ms=defaults.retry_jitter_ms if retry_jitter_ms is None else max(0, int(retry_jitter_ms)),
         time_limit_ms=defaults.time_limit_ms if time_limit_ms is None else max(0, int(time_limit_ms)),
+        max_concurrency=None if max_concurrency is None else max(1, int(max_concurrency)),
     )
 
 
@@ -323,7 +457,15 @@ def _is_transient_external_failure(exc: BaseException) -> bool:
         return True
 
     error_code = str(getattr(exc, "error_code", "") or "").strip().lower()
-    if error_code in {"timeout", "connection_error", "rate_limit", "internal_server", "status_error"}:
+    if error_code in {
+        "timeout",
+        "connection_error",
+        "rate_limit",
+        "local_rate_limit",
+        "internal_server",
+        "status_error",
+        "circuit_open",
+    }:
         return True
 
     status_code = getattr(exc, "status_code", None)
@@ -408,6 +550,7 @@ def db_task(
     context: bool = False,
     queue: str = QUEUE_DEFAULT,
     priority: int | None = None,
+    max_concurrency: int | None = None,
     **kwargs,
 ):
     if dargs and callable(dargs[0]):
@@ -425,6 +568,7 @@ def db_task(
             context=context,
             queue=queue,
             priority=priority,
+            max_concurrency=max_concurrency,
             **kwargs,
         )
         return cast(TaskCompat, decorator(direct_func))
@@ -439,7 +583,9 @@ def db_task(
             max_backoff_ms=max_backoff_ms,
             retry_jitter_ms=retry_jitter_ms,
             time_limit_ms=time_limit_ms,
+            max_concurrency=max_concurrency,
         )
+        _ACTOR_POLICIES[actor_name] = policy
         throws_tuple = _normalize_throws(throws)
         actor_retry_when = _build_actor_retry_when(
             max_retries=policy.retries,
@@ -470,6 +616,8 @@ def db_task(
                     policy.retry_jitter_ms,
                 )
 
+            retries_token = _TASK_RETRIES_REMAINING.set(max(0, int(policy.retries) - _current_retries_used()))
+            actor_token = _TASK_ACTOR_NAME.set(actor_name)
             try:
                 return func(*args, **inner_kwargs)
             except dramatiq.Retry:
@@ -484,6 +632,12 @@ def db_task(
                     exc=exc,
                 ):
                     retry_delay_ms = _compute_retry_delay_ms(retries_used=retries_used, policy=policy)
+                    retry_after_ms = int(getattr(exc, "retry_after_ms", 0) or 0)
+                    if retry_after_ms > retry_delay_ms:
+                        # The failing dependency knows when it will accept work again (e.g. an open AI circuit).
+                        retry_delay_ms = retry_after_ms
+                        if policy.max_backoff_ms is not None:
+                            retry_delay_ms = min(retry_delay_ms, policy.max_backoff_ms)
                     logger.warning(
                         "Retryable task failure actor=%s queue=%s attempt=%s/%s retry_in_ms=%s error_type=%s error=%s",
                         actor_name,
@@ -506,6 +660,9 @@ def db_task(
                         policy.time_limit_ms,
                     )
                 raise
+            finally:
+                _TASK_RETRIES_REMAINING.reset(retries_token)
+                _TASK_ACTOR_NAME.reset(actor_token)
 
         actor_options: dict[str, Any] = {
             "actor_name": actor_name,
@@ -521,8 +678,9 @@ def db_task(
             actor_options["time_limit"] = policy.time_limit_ms
         if throws_tuple:
             actor_options["throws"] = throws_tuple
-        if priority is not None:
-            actor_options["priority"] = int(priority)
+        actor_priority = QUEUE_PRIORITY_DEFAULTS.get(queue) if priority is None else priority
+        if actor_priority is not None:
+            actor_options["priority"] = int(actor_priority)
 
         actor = dramatiq.actor(**actor_options)(_execute)
         return TaskCompat(actor=actor, func=func, context_enabled=context)
@@ -545,7 +703,12 @@ def db_periodic_task(
     throws: type[BaseException] | tuple[type[BaseException], ...] | None = None,
     context: bool = False,
     priority: int | None = None,
+    misfire_policy: str = MISFIRE_ONCE,
+    jitter_seconds: float = 0.0,
 ):
+    if misfire_policy not in MISFIRE_POLICIES:
+        raise ValueError(f"Unknown misfire policy '{misfire_policy}'. Expected one of {sorted(MISFIRE_POLICIES)}.")
+
     def decorator(func: Callable[..., Any]) -> TaskCompat:
         task = cast(
             TaskCompat,
@@ -565,7 +728,13 @@ def db_periodic_task(
             )(func),
         )
         task_name = name or f"{func.__module__}.{func.__name__}"
-        _PERIODIC_TASKS[task_name] = PeriodicTaskEntry(name=task_name, schedule=schedule, task=task)
+        _PERIODIC_TASKS[task_name] = PeriodicTaskEntry(
+            name=task_name,
+            schedule=schedule,
+            task=task,
+            misfire_policy=misfire_policy,
+            jitter_seconds=max(0.0, float(jitter_seconds or 0.0)),
+        )
         return task
 
     return decorator
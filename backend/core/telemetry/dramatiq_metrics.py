@@ -0,0 +1,77 @@
+"""
+FILE_ROLE: Records Dramatiq queue wait, run time, retries and query counts into the shared metrics registry.
+
+KEY_COMPONENTS:
+- DramatiqMetricsMiddleware: Observes message processing and feeds the dramatiq_* metric families.
+
+INTERACTIONS:
+- Depends on: core.telemetry.metrics, django.db.connection, dramatiq.middleware.Middleware.
+
+AI_GUIDELINES:
+- Keep the middleware observational; it must never change message outcomes or raise into the worker.
+- Label only by queue and actor name so the metric cardinality stays bounded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from core.telemetry.metrics import (
+    QueryCounter,
+    dramatiq_message_db_queries,
+    dramatiq_message_duration_seconds,
+    dramatiq_message_queue_wait_seconds,
+    dramatiq_message_retries_total,
+    dramatiq_messages_total,
+)
+from django.db import connection
+from dramatiq.middleware import Middleware
+
+_active_messages: dict[str, tuple[float, QueryCounter]] = {}
+_lock = threading.Lock()
+
+
+def _labels(message) -> dict[str, str]:  # noqa: ANN001
+    return {
+        "queue": str(getattr(message, "queue_name", "") or "unknown"),
+        "actor": str(getattr(message, "actor_name", "") or "unknown"),
+    }
+
+
+class DramatiqMetricsMiddleware(Middleware):
+    def before_process_message(self, broker, message) -> None:  # noqa: ANN001
+        labels = _labels(message)
+        options = getattr(message, "options", None) or {}
+
+        # Delayed messages and retries only become due at their eta, so wait is measured from there.
+        due_at_ms = max(int(getattr(message, "message_timestamp", 0) or 0), int(options.get("eta", 0) or 0))
+        if due_at_ms:
+            dramatiq_message_queue_wait_seconds.observe(max(0.0, time.time() - due_at_ms / 1000), **labels)
+        if int(options.get("retries", 0) or 0) > 0:
+            dramatiq_message_retries_total.inc(**labels)
+
+        query_counter = QueryCounter()
+        connection.execute_wrappers.append(query_counter)
+        with _lock:
+            _active_messages[str(getattr(message, "message_id", "unknown"))] = (time.perf_counter(), query_counter)
+
+    def after_process_message(self, broker, message, *, result=None, exception=None) -> None:  # noqa: ANN001
+        self._finish(message, outcome="failure" if exception is not None else "success")
+
+    def after_skip_message(self, broker, message) -> None:  # noqa: ANN001
+        self._finish(message, outcome="skipped")
+
+    def _finish(self, message, *, outcome: str) -> None:  # noqa: ANN001
+        with _lock:
+            state = _active_messages.pop(str(getattr(message, "message_id", "unknown")), None)
+        if state is None:
+            return
+        started_at, query_counter = state
+        if query_counter in connection.execute_wrappers:
+            connection.execute_wrappers.remove(query_counter)
+
+        labels = _labels(message)
+        dramatiq_message_duration_seconds.observe(time.perf_counter() - started_at, **labels)
+        dramatiq_messages_total.inc(outcome=outcome, **labels)
+        dramatiq_message_db_queries.observe(query_counter.count, actor=labels["actor"])
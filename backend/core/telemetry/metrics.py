@@ -0,0 +1,518 @@
+"""
+FILE_ROLE: Shared metrics registry with fixed-bucket histograms, counters and gauges, exposed in Prometheus text format.
+
+KEY_COMPONENTS:
+- Counter: Labelled monotonic counter family.
+- Gauge: Labelled last-value family for sampled state (queue depth, pool size); the latest writer wins.
+- Histogram: Labelled fixed-bucket histogram family (bucket counts, sum and count; no raw samples).
+- QueryCounter: Database execute wrapper used to count queries per request or message.
+- MetricsRegistry: Owns the families, ships per-process deltas to Redis and renders the merged exposition.
+- metrics_registry: Process-wide registry singleton.
+- http_* / dramatiq_* / redis_* / ai_provider_* / cacheops_* / sync_changelog_*: Metric families recorded by
+  middleware, clients and periodic jobs.
+
+INTERACTIONS:
+- Depends on: redis, core.services.redis_client.build_redis_url, core.services.logger_service.Logger and
+  django.conf.settings.
+- Used by: core.middleware.performance_logger, core.telemetry.dramatiq_metrics, core.services.redis_client,
+  core.services.ai_client, cache.metrics and the /metrics endpoint in core.views.
+
+AI_GUIDELINES:
+- Recording must stay O(1) and in-memory; Redis I/O only happens on the background flush thread or on scrape.
+- Keep label values bounded (route names, actors, commands, providers); never label by path, id or free text.
+- Gunicorn and Dramatiq run several processes, so the exposition is always read from the Redis aggregate
+  when METRICS_REDIS_ENABLED is on; the in-process totals are only a fallback.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+
+import redis
+from core.services.logger_service import Logger
+from django.conf import settings
+
+logger = Logger.get_logger(__name__)
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+REDIS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+AI_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+TASK_DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+QUEUE_WAIT_BUCKETS = (0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+ROW_COUNT_BUCKETS = (0, 100, 1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+
+_FIELD_SEPARATOR = "\x1f"
+_ERROR_LOG_INTERVAL_SECONDS = 60.0
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], label_values: Sequence[str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(labelnames, label_values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class QueryCounter:
+    """Django execute wrapper that counts queries regardless of DEBUG (``connection.queries`` is DEBUG-only)."""
+
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):  # noqa: ANN001
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class _MetricFamily:
+    type_name = ""
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Totals since process start (local fallback) and deltas not yet shipped to Redis.
+        self._totals: dict[tuple[str, ...], list[float]] = {}
+        self._pending: dict[tuple[str, ...], list[float]] = {}
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return ()
+
+    def _row_size(self) -> int:
+        return 1
+
+    def _label_values(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _add(self, label_values: tuple[str, ...], updates: Sequence[tuple[int, float]]) -> None:
+        registry = self._registry
+        registry._ensure_process_state()
+        with registry._lock:
+            for store in (self._totals, self._pending):
+                row = store.get(label_values)
+                if row is None:
+                    row = store[label_values] = [0.0] * self._row_size()
+                for index, amount in updates:
+                    row[index] += amount
+
+    def describe(self) -> dict[str, object]:
+        return {
+            "type": self.type_name,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "buckets": list(self.buckets),
+        }
+
+
+class Counter(_MetricFamily):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        if not self._registry.enabled:
+            return
+        self._add(self._label_values(labels), ((0, amount),))
+
+
+class Gauge(_MetricFamily):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        if not self._registry.enabled:
+            return
+        label_values = self._label_values(labels)
+        registry = self._registry
+        registry._ensure_process_state()
+        with registry._lock:
+            self._totals[label_values] = [float(value)]
+            self._pending[label_values] = [float(value)]
+
+
+class Histogram(_MetricFamily):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(registry, name, documentation, labelnames)
+        self._buckets = tuple(sorted(float(bound) for bound in buckets))
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        return self._buckets
+
+    def _row_size(self) -> int:
+        # One slot per finite bucket, one for +Inf, then sum and count.
+        return len(self._buckets) + 3
+
+    def observe(self, value: float, **labels: object) -> None:
+        if not self._registry.enabled:
+            return
+        value = float(value)
+        bucket_index = bisect.bisect_left(self._buckets, value)
+        self._add(
+            self._label_values(labels),
+            ((bucket_index, 1.0), (len(self._buckets) + 1, value), (len(self._buckets) + 2, 1.0)),
+        )
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, **labels)
+
+
+class MetricsRegistry:
+    """Process-local metric families whose deltas are merged across processes through Redis hashes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._families: dict[str, _MetricFamily] = {}
+        self._pid: int | None = None
+        self._client = None
+        self._flusher: threading.Thread | None = None
+        self._last_error_logged_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "METRICS_ENABLED", True))
+
+    @property
+    def shared(self) -> bool:
+        return bool(getattr(settings, "METRICS_REDIS_ENABLED", True))
+
+    @staticmethod
+    def _key_prefix() -> str:
+        return str(getattr(settings, "METRICS_REDIS_KEY_PREFIX", "metrics") or "metrics")
+
+    @staticmethod
+    def _flush_interval_seconds() -> float:
+        return max(1.0, float(getattr(settings, "METRICS_FLUSH_INTERVAL_SECONDS", 10) or 10))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, family):
+        with self._lock:
+            existing = self._families.get(family.name)
+            if existing is not None:
+                if type(existing) is not type(family) or existing.labelnames != family.labelnames:
+                    raise ValueError(f"Metric {family.name} is already registered with a different definition.")
+                return existing
+            self._families[family.name] = family
+            return family
+
+    def _ensure_process_state(self) -> None:
+        """Start the flusher once per process; forked children drop the parent's unflushed deltas."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._state_lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                # Forked child: the lock may have been held at fork time and the parent flushes its own deltas.
+                self._lock = threading.Lock()
+                self._client = None
+                for family in self._families.values():
+                    family._totals = {}
+                    family._pending = {}
+            else:
+                atexit.register(self.flush)
+            self._pid = pid
+            if self.shared:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, args=(pid,), name="metrics-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self, pid: int) -> None:
+        while self._pid == pid:
+            time.sleep(self._flush_interval_seconds())
+            self.flush()
+
+    def _get_client(self):
+        if self._client is None:
+            # Imported lazily: redis_client instruments its clients with this module's families.
+            from core.services.redis_client import build_redis_url
+
+            self._client = redis.Redis.from_url(
+                build_redis_url(),
+                decode_responses=True,
+                socket_timeout=1,
+                socket_connect_timeout=1,
+            )
+        return self._client
+
+    def _log_error(self, message: str, exc: Exception) -> None:
+        now = time.monotonic()
+        if now - self._last_error_logged_at < _ERROR_LOG_INTERVAL_SECONDS:
+            return
+        self._last_error_logged_at = now
+        logger.warning("%s: %s", message, exc)
+
+    def flush(self) -> bool:
+        """Ship pending deltas to Redis; on failure they are kept for the next attempt."""
+        if not self.shared:
+            return True
+        with self._lock:
+            pending = {name: family._pending for name, family in self._families.items() if family._pending}
+            for name in pending:
+                self._families[name]._pending = {}
+        if not pending:
+            return True
+
+        prefix = self._key_prefix()
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            for name, rows in pending.items():
+                is_gauge = isinstance(self._families[name], Gauge)
+                pipe.hset(f"{prefix}:families", name, json.dumps(self._families[name].describe()))
+                for label_values, row in rows.items():
+                    labels_json = json.dumps(list(label_values))
+                    for index, amount in enumerate(row):
+                        field = _FIELD_SEPARATOR.join((name, labels_json, str(index)))
+                        if is_gauge:
+                            # Gauges ship absolute values (zero included) instead of deltas.
+                            pipe.hset(f"{prefix}:samples", field, amount)
+                        elif amount:
+                            pipe.hincrbyfloat(f"{prefix}:samples", field, amount)
+            pipe.execute()
+        except Exception as exc:
+            with self._lock:
+                for name, rows in pending.items():
+                    current = self._families[name]._pending
+                    if isinstance(self._families[name], Gauge):
+                        # A value set after the failed flush is newer; only restore untouched labels.
+                        for label_values, row in rows.items():
+                            current.setdefault(label_values, row)
+                        continue
+                    for label_values, row in rows.items():
+                        target = current.setdefault(label_values, [0.0] * len(row))
+                        for index, amount in enumerate(row):
+                            target[index] += amount
+            self._log_error("Metrics flush to Redis failed", exc)
+            return False
+        return True
+
+    def _local_snapshot(self) -> dict[str, tuple[dict[str, object], dict[tuple[str, ...], list[float]]]]:
+        with self._lock:
+            return {
+                name: (family.describe(), {labels: list(row) for labels, row in family._totals.items()})
+                for name, family in self._families.items()
+            }
+
+    def _shared_snapshot(self) -> dict[str, tuple[dict[str, object], dict[tuple[str, ...], list[float]]]]:
+        prefix = self._key_prefix()
+        client = self._get_client()
+        descriptions = client.hgetall(f"{prefix}:families")
+        samples = client.hgetall(f"{prefix}:samples")
+
+        snapshot: dict[str, tuple[dict[str, object], dict[tuple[str, ...], list[float]]]] = {}
+        for name, family in self._families.items():
+            snapshot[name] = (family.describe(), {})
+        for name, raw_description in descriptions.items():
+            if name not in snapshot:
+                snapshot[name] = (json.loads(raw_description), {})
+
+        for field, raw_value in samples.items():
+            try:
+                name, labels_json, raw_index = field.split(_FIELD_SEPARATOR)
+                description, rows = snapshot[name]
+                index = int(raw_index)
+            except (KeyError, ValueError):
+                continue
+            row_size = len(description["buckets"]) + 3 if description["type"] == "histogram" else 1
+            if index >= row_size:
+                continue
+            row = rows.setdefault(tuple(json.loads(labels_json)), [0.0] * row_size)
+            row[index] = float(raw_value)
+        return snapshot
+
+    def render(self) -> str:
+        """Return the Prometheus text exposition (cluster-wide when Redis aggregation is enabled)."""
+        snapshot = None
+        if self.shared:
+            self.flush()
+            try:
+                snapshot = self._shared_snapshot()
+            except Exception as exc:
+                self._log_error("Reading shared metrics from Redis failed; serving process-local values", exc)
+        if snapshot is None:
+            snapshot = self._local_snapshot()
+
+        lines: list[str] = []
+        for name in sorted(snapshot):
+            description, rows = snapshot[name]
+            labelnames = description["labelnames"]
+            lines.append(f"# HELP {name} {description['help']}")
+            lines.append(f"# TYPE {name} {description['type']}")
+            for label_values in sorted(rows):
+                row = rows[label_values]
+                if description["type"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labelnames, label_values)} {_format_number(row[0])}")
+                    continue
+                cumulative = 0.0
+                bounds = [*description["buckets"], float("inf")]
+                for bound, bucket_count in zip(bounds, row):
+                    cumulative += bucket_count
+                    labels = _format_labels(labelnames, label_values, ("le", _format_number(bound)))
+                    lines.append(f"{name}_bucket{labels} {_format_number(cumulative)}")
+                labels = _format_labels(labelnames, label_values)
+                lines.append(f"{name}_sum{labels} {_format_number(row[-2])}")
+                lines.append(f"{name}_count{labels} {_format_number(row[-1])}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear in-process values (tests); the Redis aggregate is left untouched."""
+        with self._lock:
+            for family in self._families.values():
+                family._totals = {}
+                family._pending = {}
+
+
+metrics_registry = MetricsRegistry()
+
+http_requests_total = metrics_registry.counter(
+    "http_requests_total", "HTTP requests by resolved URL name, method and status code.", ("route", "method", "status")
+)
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request duration by resolved URL name.", ("route", "method")
+)
+http_request_db_queries = metrics_registry.histogram(
+    "http_request_db_queries", "Database queries issued per HTTP request.", ("route",), buckets=QUERY_COUNT_BUCKETS
+)
+
+dramatiq_messages_total = metrics_registry.counter(
+    "dramatiq_messages_total", "Dramatiq messages processed by outcome.", ("queue", "actor", "outcome")
+)
+dramatiq_message_queue_wait_seconds = metrics_registry.histogram(
+    "dramatiq_message_queue_wait_seconds",
+    "Time between a message becoming due and a worker picking it up.",
+    ("queue", "actor"),
+    buckets=QUEUE_WAIT_BUCKETS,
+)
+dramatiq_message_duration_seconds = metrics_registry.histogram(
+    "dramatiq_message_duration_seconds", "Dramatiq actor run time.", ("queue", "actor"), buckets=TASK_DURATION_BUCKETS
+)
+dramatiq_message_retries_total = metrics_registry.counter(
+    "dramatiq_message_retries_total", "Dramatiq retry attempts picked up by workers.", ("queue", "actor")
+)
+dramatiq_message_db_queries = metrics_registry.histogram(
+    "dramatiq_message_db_queries",
+    "Database queries issued per Dramatiq message.",
+    ("actor",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+dramatiq_admission_deferrals_total = metrics_registry.counter(
+    "dramatiq_admission_deferrals_total",
+    "Dramatiq messages re-enqueued because their actor was at its concurrency limit.",
+    ("queue", "actor"),
+)
+dramatiq_queue_depth = metrics_registry.gauge(
+    "dramatiq_queue_depth", "Ready messages waiting in each Dramatiq queue, sampled by the pool supervisor.", ("queue",)
+)
+dramatiq_queue_oldest_message_age_seconds = metrics_registry.gauge(
+    "dramatiq_queue_oldest_message_age_seconds",
+    "Age of the message at the head of each Dramatiq queue, sampled by the pool supervisor.",
+    ("queue",),
+)
+dramatiq_pool_processes = metrics_registry.gauge(
+    "dramatiq_pool_processes", "Worker processes currently running in each Dramatiq pool.", ("pool",)
+)
+
+redis_command_duration_seconds = metrics_registry.histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency for application clients.",
+    ("command",),
+    buckets=REDIS_LATENCY_BUCKETS,
+)
+redis_command_errors_total = metrics_registry.counter(
+    "redis_command_errors_total", "Redis commands that raised an error.", ("command",)
+)
+
+ai_provider_request_duration_seconds = metrics_registry.histogram(
+    "ai_provider_request_duration_seconds",
+    "AI provider chat completion latency per attempt.",
+    ("provider", "model", "outcome"),
+    buckets=AI_LATENCY_BUCKETS,
+)
+ai_rate_limit_wait_seconds = metrics_registry.histogram(
+    "ai_rate_limit_wait_seconds",
+    "Time AI calls waited for shared provider capacity (rate limits and concurrency slots).",
+    ("provider", "priority"),
+    buckets=AI_LATENCY_BUCKETS,
+)
+ai_rate_limit_rejections_total = metrics_registry.counter(
+    "ai_rate_limit_rejections_total",
+    "AI calls rejected after waiting their full budget for shared provider capacity.",
+    ("provider", "priority"),
+)
+
+cacheops_events_total = metrics_registry.counter(
+    "cacheops_events_total", "Cacheops hits, misses, invalidations and errors.", ("event",)
+)
+cacheops_operation_duration_seconds = metrics_registry.histogram(
+    "cacheops_operation_duration_seconds", "Cacheops operation latency.", ("operation",)
+)
+
+sync_changelog_rows = metrics_registry.histogram(
+    "sync_changelog_rows",
+    "Sync change-log size sampled after each compaction run.",
+    buckets=ROW_COUNT_BUCKETS,
+)
+sync_changelog_peer_lag_rows = metrics_registry.histogram(
+    "sync_changelog_peer_lag_rows",
+    "Change-log rows a sync peer has not acknowledged yet, sampled after each compaction run.",
+    ("peer",),
+    buckets=ROW_COUNT_BUCKETS,
+)
+sync_changelog_compacted_rows_total = metrics_registry.counter(
+    "sync_changelog_compacted_rows_total", "Superseded sync change-log rows removed by compaction."
+)
@@ -0,0 +1,100 @@
+"""Local OpenAI-compatible chat completions server with scripted latency and errors, for router tests."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass(frozen=True)
+class StubReply:
+    status: int = 200
+    delay_seconds: float = 0.0
+    content: str = "ok"
+
+
+class StubOpenAIServer:
+    """Serve ``POST /v1/chat/completions``; replies are scripted per model and fall back to ``default``."""
+
+    def __init__(self, default: StubReply | None = None):
+        self.default = default or StubReply()
+        self.requests: list[dict] = []
+        self._scripts: dict[str, deque[StubReply]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def script(self, model: str, *replies: StubReply) -> None:
+        with self._lock:
+            self._scripts[model].extend(replies)
+
+    def requested_models(self) -> list[str]:
+        with self._lock:
+            return [str(payload.get("model")) for payload in self.requests]
+
+    def _next_reply(self, payload: dict) -> StubReply:
+        with self._lock:
+            self.requests.append(payload)
+            queue = self._scripts.get(str(payload.get("model")))
+            return queue.popleft() if queue else self.default
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - silence test output
+                return
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                reply = stub._next_reply(payload)
+                if reply.delay_seconds:
+                    time.sleep(reply.delay_seconds)
+                if reply.status == 200:
+                    body = {
+                        "id": f"stub-{time.monotonic_ns()}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": payload.get("model"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": reply.content},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    }
+                else:
+                    body = {"error": {"message": "stub failure", "type": "server_error", "code": str(reply.status)}}
+                encoded = json.dumps(body).encode("utf-8")
+                try:
+                    self.send_response(reply.status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(encoded)))
+                    self.end_headers()
+                    self.wfile.write(encoded)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (timeout or a hedge winning); nothing left to deliver.
+                    return
+
+        return Handler
+
+    def __enter__(self) -> "StubOpenAIServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,240 @@
+"""Tests for cluster-wide AI admission control (rate windows, concurrency slots and priority classes)."""
+
+from unittest.mock import patch
+
+import dramatiq
+from core.models import AiModel
+from core.services.ai_client import AIClient, AIConnectionError
+from core.services.ai_rate_limiter import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    REJECTED_LOCAL_RATE_LIMIT,
+    AIAdmission,
+    AIRateLimitRejection,
+    ai_rate_limiter,
+    ai_request_priority,
+    current_priority,
+    estimate_request_tokens,
+    on_ai_capacity_wait,
+)
+from core.services.reference_catalog_cache import reference_catalog_cache
+from core.tasks import runtime as task_runtime
+from core.tasks.runtime import db_task, retry_on_transient_external_failure
+from core.tests.ai_stub_server import StubOpenAIServer
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from openai import OpenAI
+
+OPENAI_PATCH_TARGET = "core.services.ai_client.OpenAI"
+ENQUEUE_PATCH_TARGET = "core.services.ai_client.AIUsageService.enqueue_request_capture"
+
+MODEL = "stub/primary"
+FALLBACK_MODEL = "stub/fallback"
+
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-rate-limiter-tests",
+    },
+    "select2": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-rate-limiter-tests-select2",
+    },
+}
+
+
+class TokenEstimateTests(SimpleTestCase):
+    def test_estimate_counts_text_images_and_completion_budget(self):
+        request_kwargs = {
+            "messages": [
+                {"role": "system", "content": "x" * 400},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "y" * 40},
+                        {"type": "image_url", "image_url": {"url": "data:image/png;base64,AAAA"}},
+                    ],
+                },
+            ],
+            "max_tokens": 200,
+        }
+
+        self.assertEqual(estimate_request_tokens(request_kwargs), 100 + 10 + 1_000 + 200)
+
+    def test_priority_defaults_to_batch_inside_tasks(self):
+        self.assertEqual(current_priority(), PRIORITY_INTERACTIVE)
+
+        token = task_runtime._TASK_ACTOR_NAME.set("core.tasks.document_categorization.run")
+        self.addCleanup(task_runtime._TASK_ACTOR_NAME.reset, token)
+        self.assertEqual(current_priority(), PRIORITY_BATCH)
+        with ai_request_priority(PRIORITY_INTERACTIVE):
+            self.assertEqual(current_priority(), PRIORITY_INTERACTIVE)
+
+
+@override_settings(
+    TESTING=False,
+    CACHES=LOC_MEM_CACHES,
+    AI_RATE_LIMIT_ENABLED=True,
+    AI_RATE_LIMIT_BATCH_RESERVE=0.2,
+    AI_RATE_LIMIT_INTERACTIVE_SLOTS=1,
+)
+class AIRateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def _acquire(self, priority: str, **kwargs):
+        return ai_rate_limiter.acquire(
+            "openai",
+            MODEL,
+            estimated_tokens=kwargs.pop("estimated_tokens", 10),
+            lease_seconds=30,
+            priority=priority,
+            max_wait_seconds=kwargs.pop("max_wait_seconds", 0),
+        )
+
+    def test_unconfigured_route_is_not_limited(self):
+        self.assertIsNone(self._acquire(PRIORITY_BATCH))
+
+    @override_settings(AI_RATE_LIMITS={"openai": (5, 0, 0)})
+    def test_batch_work_leaves_the_interactive_reserve_free(self):
+        for _ in range(4):
+            self.assertIsInstance(self._acquire(PRIORITY_BATCH), AIAdmission)
+
+        rejection = self._acquire(PRIORITY_BATCH)
+        self.assertIsInstance(rejection, AIRateLimitRejection)
+        self.assertGreater(rejection.retry_after_seconds, 0)
+        self.assertIsInstance(self._acquire(PRIORITY_INTERACTIVE), AIAdmission)
+        self.assertIsInstance(self._acquire(PRIORITY_INTERACTIVE), AIRateLimitRejection)
+
+    @override_settings(AI_RATE_LIMITS={"openai": (0, 0, 1), f"openai/{MODEL}": (0, 0, 2)})
+    def test_model_entry_overrides_provider_and_reserves_interactive_slots(self):
+        batch = self._acquire(PRIORITY_BATCH)
+        self.assertIsInstance(batch, AIAdmission)
+        self.assertIsInstance(self._acquire(PRIORITY_BATCH), AIRateLimitRejection)
+
+        interactive = self._acquire(PRIORITY_INTERACTIVE)
+        self.assertIsInstance(interactive, AIAdmission)
+        self.assertIsInstance(self._acquire(PRIORITY_INTERACTIVE), AIRateLimitRejection)
+
+        ai_rate_limiter.release(batch)
+        self.assertIsInstance(self._acquire(PRIORITY_BATCH), AIAdmission)
+
+    @override_settings(AI_RATE_LIMITS={"openai": (0, 1_000, 0)})
+    def test_release_reconciles_tokens_with_reported_usage(self):
+        first = self._acquire(PRIORITY_INTERACTIVE, estimated_tokens=900)
+        self.assertIsInstance(self._acquire(PRIORITY_INTERACTIVE, estimated_tokens=900), AIRateLimitRejection)
+
+        ai_rate_limiter.release(first, actual_tokens=50)
+
+        self.assertIsInstance(self._acquire(PRIORITY_INTERACTIVE, estimated_tokens=900), AIAdmission)
+
+    @override_settings(AI_RATE_LIMITS={"openai": (0, 0, 1)})
+    def test_waiting_caller_reports_progress_then_gets_a_free_slot(self):
+        held = self._acquire(PRIORITY_INTERACTIVE)
+        waits = []
+
+        def on_wait(wait):
+            waits.append(wait)
+            ai_rate_limiter.release(held)
+
+        with on_ai_capacity_wait(on_wait):
+            admission = self._acquire(PRIORITY_INTERACTIVE, max_wait_seconds=2)
+
+        self.assertIsInstance(admission, AIAdmission)
+        self.assertEqual(len(waits), 1)
+        self.assertEqual((waits[0].provider, waits[0].priority), ("openai", PRIORITY_INTERACTIVE))
+
+    @override_settings(AI_RATE_LIMITS={"openai": (0, 0, 1)})
+    def test_cache_failures_fail_open(self):
+        with patch("core.services.ai_rate_limiter.cache.get_many", side_effect=ConnectionError("down")):
+            self.assertIsNone(self._acquire(PRIORITY_BATCH))
+
+
+@override_settings(
+    TESTING=False,
+    CACHES=LOC_MEM_CACHES,
+    REFERENCE_CATALOG_PUBSUB_ENABLED=False,
+    OPENAI_API_KEY="stub-key",
+    OPENROUTER_API_KEY="",
+    LLM_PROVIDER="openai",
+    LLM_DEFAULT_MODEL=MODEL,
+    OPENAI_DEFAULT_MODEL=MODEL,
+    LLM_AUTO_FALLBACK_ENABLED=False,
+    LLM_FALLBACK_STICKY_CACHE_KEY="tests:ai_rate_limiter:sticky",
+    AI_PROVIDER_SDK_MAX_RETRIES=0,
+    AI_RATE_LIMIT_ENABLED=True,
+    AI_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS=0,
+    AI_RATE_LIMITS={"openai": (2, 0, 0)},
+)
+class AIClientRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+        AiModel.objects.create(provider="openai", model_id=MODEL, name="Stub primary")
+        self.stub = StubOpenAIServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+
+        def _openai_against_stub(**kwargs):
+            return OpenAI(**{**kwargs, "base_url": self.stub.base_url})
+
+        for target, kwargs in (
+            (OPENAI_PATCH_TARGET, {"side_effect": _openai_against_stub}),
+            (ENQUEUE_PATCH_TARGET, {}),
+            ("core.services.ai_client.time.sleep", {}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+
+    def _complete(self) -> str:
+        return AIClient().chat_completion(messages=[{"role": "user", "content": "ping"}])
+
+    def test_requests_over_the_shared_window_never_reach_the_provider(self):
+        self.assertEqual(self._complete(), "ok")
+        self.assertEqual(self._complete(), "ok")
+
+        with self.assertRaises(AIConnectionError) as context:
+            self._complete()
+
+        self.assertEqual(context.exception.error_code, REJECTED_LOCAL_RATE_LIMIT)
+        self.assertGreater(context.exception.retry_after_ms, 0)
+        self.assertEqual(self.stub.requested_models(), [MODEL, MODEL])
+
+    @override_settings(
+        LLM_AUTO_FALLBACK_ENABLED=True,
+        LLM_FALLBACK_MODEL_CHAIN=[{"model": FALLBACK_MODEL, "timeoutSeconds": 10}],
+    )
+    def test_local_rejection_neither_fails_over_nor_sleeps(self):
+        AiModel.objects.create(provider="openai", model_id=FALLBACK_MODEL, name="Stub fallback")
+        rejection = AIRateLimitRejection(reason=REJECTED_LOCAL_RATE_LIMIT, retry_after_seconds=12.5)
+
+        with (
+            patch.object(ai_rate_limiter, "acquire", return_value=rejection) as acquire,
+            patch("core.services.ai_client.time.sleep") as mock_sleep,
+        ):
+            with self.assertRaises(AIConnectionError) as context:
+                self._complete()
+
+        acquire.assert_called_once()
+        mock_sleep.assert_not_called()
+        self.assertEqual(context.exception.retry_after_ms, 12_500)
+        self.assertEqual(self.stub.requested_models(), [])
+
+    def test_local_rejection_inside_a_task_is_redelivered_after_retry_after(self):
+        @db_task(retries=2, retry_delay=1, max_backoff_ms=60_000, retry_when=retry_on_transient_external_failure)
+        def ai_task() -> str:
+            return self._complete()
+
+        rejection = AIRateLimitRejection(reason=REJECTED_LOCAL_RATE_LIMIT, retry_after_seconds=30)
+        with patch.object(ai_rate_limiter, "acquire", return_value=rejection):
+            with self.assertRaises(dramatiq.Retry) as raised:
+                ai_task.actor.fn()
+
+        self.assertEqual(raised.exception.delay, 30_000)
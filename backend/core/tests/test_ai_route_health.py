@@ -0,0 +1,249 @@
+"""Tests for the shared AI route health registry and the latency-aware AIClient router."""
+
+import time
+from unittest.mock import patch
+
+import dramatiq
+from core.models import AiModel
+from core.services.ai_client import AIClient, AIConnectionError
+from core.services.ai_route_health import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    REJECTED_CIRCUIT_OPEN,
+    REJECTED_RATE_LIMITED,
+    _percentile,
+    ai_route_health,
+)
+from core.services.reference_catalog_cache import reference_catalog_cache
+from core.tasks import runtime as task_runtime
+from core.tests.ai_stub_server import StubOpenAIServer, StubReply
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openai import OpenAI
+
+OPENAI_PATCH_TARGET = "core.services.ai_client.OpenAI"
+ENQUEUE_PATCH_TARGET = "core.services.ai_client.AIUsageService.enqueue_request_capture"
+
+PRIMARY = "stub/primary"
+FALLBACK = "stub/fallback"
+
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-route-health-tests",
+    },
+    "select2": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-route-health-tests-select2",
+    },
+}
+
+
+class PercentileTests(TestCase):
+    def test_percentile_interpolates_inside_fixed_buckets(self):
+        # 10 samples in (0, 0.25], 10 in (0.25, 0.5]
+        counts = [10, 10] + [0] * 10
+
+        self.assertEqual(_percentile(counts, 0.5), 0.25)
+        self.assertAlmostEqual(_percentile(counts, 0.95), 0.475, places=3)
+        self.assertIsNone(_percentile([0] * 12, 0.95))
+
+
+@override_settings(
+    TESTING=False,
+    CACHES=LOC_MEM_CACHES,
+    REFERENCE_CATALOG_PUBSUB_ENABLED=False,
+    OPENAI_API_KEY="stub-key",
+    OPENROUTER_API_KEY="",
+    LLM_PROVIDER="openai",
+    LLM_DEFAULT_MODEL=PRIMARY,
+    OPENAI_DEFAULT_MODEL=PRIMARY,
+    LLM_AUTO_FALLBACK_ENABLED=True,
+    LLM_FALLBACK_MODEL_CHAIN=[{"model": FALLBACK, "timeoutSeconds": 10}],
+    LLM_FALLBACK_STICKY_CACHE_KEY="tests:ai_route_health:sticky",
+    AI_PROVIDER_SDK_MAX_RETRIES=0,
+    AI_ROUTER_MIN_SAMPLES=3,
+    AI_ROUTER_CIRCUIT_FAILURE_THRESHOLD=2,
+    AI_ROUTER_CIRCUIT_COOLDOWN_SECONDS=60,
+)
+class AIRouterStubServerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+        AiModel.objects.create(provider="openai", model_id=PRIMARY, name="Stub primary")
+        AiModel.objects.create(provider="openai", model_id=FALLBACK, name="Stub fallback")
+        self.stub = StubOpenAIServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+
+        def _openai_against_stub(**kwargs):
+            return OpenAI(**{**kwargs, "base_url": self.stub.base_url})
+
+        for target, kwargs in (
+            (OPENAI_PATCH_TARGET, {"side_effect": _openai_against_stub}),
+            (ENQUEUE_PATCH_TARGET, {}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+
+    def _complete(self) -> str:
+        return AIClient().chat_completion(messages=[{"role": "user", "content": "ping"}])
+
+    def _seed_latency(self, model: str, seconds: float, samples: int = 3) -> None:
+        for _ in range(samples):
+            ai_route_health.record("openai", model, latency_seconds=seconds)
+
+    def test_failures_open_circuit_and_route_is_skipped(self):
+        self.stub.script(PRIMARY, StubReply(status=500), StubReply(status=500))
+        self.stub.script(FALLBACK, StubReply(content="fallback-1"), StubReply(content="fallback-2"))
+
+        self.assertEqual(self._complete(), "fallback-1")
+        self.assertEqual(self._complete(), "fallback-2")
+        health = ai_route_health.snapshot([("openai", PRIMARY)])[("openai", PRIMARY)]
+        self.assertEqual(health.state, CIRCUIT_OPEN)
+
+        self.assertEqual(self._complete(), "ok")
+        self.assertEqual(self.stub.requested_models(), [PRIMARY, FALLBACK, PRIMARY, FALLBACK, FALLBACK])
+
+    def test_success_after_cooldown_closes_circuit(self):
+        for _ in range(2):
+            ai_route_health.record("openai", PRIMARY, latency_seconds=1.0, error_code="internal_server")
+        route_id = ai_route_health._route_id("openai", PRIMARY)
+        cache.set(ai_route_health._state_key(route_id, "open_until"), time.time())
+
+        self.assertEqual(self._complete(), "ok")
+
+        self.assertEqual(self.stub.requested_models(), [PRIMARY])
+        health = ai_route_health.snapshot([("openai", PRIMARY)])[("openai", PRIMARY)]
+        self.assertEqual(health.state, CIRCUIT_CLOSED)
+
+    def test_fastest_healthy_route_is_tried_first(self):
+        self._seed_latency(PRIMARY, 20.0)
+        self._seed_latency(FALLBACK, 0.3)
+
+        self._complete()
+
+        self.assertEqual(self.stub.requested_models(), [FALLBACK])
+
+    def test_explicit_model_keeps_its_position(self):
+        self._seed_latency(PRIMARY, 20.0)
+        self._seed_latency(FALLBACK, 0.3)
+
+        AIClient(model=PRIMARY).chat_completion(messages=[{"role": "user", "content": "ping"}])
+
+        self.assertEqual(self.stub.requested_models(), [PRIMARY])
+
+    @override_settings(
+        AI_ROUTER_HEDGE_ENABLED=True,
+        AI_ROUTER_HEDGE_MIN_DELAY_SECONDS=0.2,
+        AI_ROUTER_PREFER_FASTEST=False,
+    )
+    def test_slow_request_is_hedged_after_p95_deadline(self):
+        self._seed_latency(PRIMARY, 0.2)
+        self.stub.script(PRIMARY, StubReply(delay_seconds=3.0, content="slow"))
+        self.stub.script(FALLBACK, StubReply(content="hedged"))
+
+        client = AIClient()
+        started = time.perf_counter()
+        result = client.chat_completion(messages=[{"role": "user", "content": "ping"}])
+
+        self.assertEqual(result, "hedged")
+        self.assertLess(time.perf_counter() - started, 2.0)
+        self.assertEqual(client.model, FALLBACK)
+
+    @override_settings(LLM_AUTO_FALLBACK_ENABLED=False)
+    def test_retry_is_deferred_to_task_queue_when_task_opts_in(self):
+        self.stub.script(PRIMARY, StubReply(status=503))
+        token = task_runtime._TASK_RETRIES_REMAINING.set(2)
+        self.addCleanup(task_runtime._TASK_RETRIES_REMAINING.reset, token)
+
+        with patch("core.services.ai_client.time.sleep") as mock_sleep, task_runtime.defer_transient_retries():
+            with self.assertRaises(AIConnectionError) as context:
+                self._complete()
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(context.exception.retry_after_ms, 2000)
+        self.assertEqual(self.stub.requested_models(), [PRIMARY])
+
+    @override_settings(LLM_AUTO_FALLBACK_ENABLED=False)
+    def test_task_without_opt_in_keeps_in_place_backoff(self):
+        # Callers such as AIInvoiceParser swallow AIConnectionError, so a deferred retry would never happen.
+        self.stub.script(PRIMARY, StubReply(status=503), StubReply(content="recovered"))
+        token = task_runtime._TASK_RETRIES_REMAINING.set(2)
+        self.addCleanup(task_runtime._TASK_RETRIES_REMAINING.reset, token)
+
+        with patch("core.services.ai_client.time.sleep") as mock_sleep:
+            self.assertEqual(self._complete(), "recovered")
+
+        mock_sleep.assert_called_once_with(2.0)
+        self.assertEqual(self.stub.requested_models(), [PRIMARY, PRIMARY])
+
+    @override_settings(LLM_AUTO_FALLBACK_ENABLED=False)
+    def test_validation_actor_hands_transient_failure_to_the_queue_instead_of_sleeping(self):
+        from core.tasks.document_validation import run_document_validation
+        from customer_applications.models import DocApplication, Document
+        from customers.models import Customer
+        from django.contrib.auth import get_user_model
+        from products.models import Product
+        from products.models.document_type import DocumentType
+
+        doc_type = DocumentType.objects.create(
+            name="Deferred Validation",
+            ai_validation=True,
+            validation_rule_ai_positive="Must be a permit.",
+        )
+        user = get_user_model().objects.create_user(username="deferred-validator", password="pw")
+        application = DocApplication.objects.create(
+            customer=Customer.objects.create(customer_type="person", first_name="Defer", last_name="Retry"),
+            product=Product.objects.create(name="Deferred", code="DEFER-1", product_type="visa"),
+            doc_date=timezone.now().date(),
+            created_by=user,
+        )
+        document = Document.objects.create(
+            doc_application=application, doc_type=doc_type, file="tmp/permit.pdf", created_by=user
+        )
+        self.stub.script(PRIMARY, StubReply(status=503))
+
+        with (
+            patch("core.tasks.document_validation.acquire_task_lock", return_value="token"),
+            patch("core.tasks.document_validation.release_task_lock"),
+            patch("core.tasks.document_validation.default_storage.open") as storage_open,
+            patch(
+                "core.tasks.document_validation.AIDocumentCategorizer.validate_document",
+                side_effect=lambda **_kwargs: self._complete(),
+            ),
+            patch("core.services.ai_client.time.sleep") as mock_sleep,
+        ):
+            storage_open.return_value.__enter__.return_value.read.return_value = b"permit-bytes"
+            with self.assertRaises(dramatiq.Retry) as raised:
+                run_document_validation.actor.fn(document_id=document.id)
+
+        mock_sleep.assert_not_called()
+        self.assertGreaterEqual(raised.exception.delay, 2000)
+        self.assertEqual(self.stub.requested_models(), [PRIMARY])
+        document.refresh_from_db()
+        self.assertEqual(document.ai_validation_status, Document.AI_VALIDATION_VALIDATING)
+        self.assertEqual(document.ai_validation_result["status"], "retrying")
+
+    def test_probe_finished_with_request_error_frees_the_half_open_slot(self):
+        route_id = ai_route_health._route_id("openai", PRIMARY)
+        cache.set(ai_route_health._state_key(route_id, "open_until"), time.time() - 1)
+
+        self.assertIsNone(ai_route_health.acquire("openai", PRIMARY))
+        self.assertEqual(ai_route_health.acquire("openai", PRIMARY), REJECTED_CIRCUIT_OPEN)
+
+        ai_route_health.record("openai", PRIMARY, latency_seconds=0.5, error_code="bad_request")
+
+        self.assertIsNone(ai_route_health.acquire("openai", PRIMARY))
+
+    @override_settings(AI_ROUTER_PROVIDER_RATE_LIMITS={"openai": (0.01, 2)})
+    def test_provider_token_bucket_rejects_over_burst(self):
+        self.assertIsNone(ai_route_health.acquire("openai", PRIMARY))
+        self.assertIsNone(ai_route_health.acquire("openai", FALLBACK))
+
+        self.assertEqual(ai_route_health.acquire("openai", PRIMARY), REJECTED_RATE_LIMITED)
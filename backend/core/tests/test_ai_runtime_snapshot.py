@@ -0,0 +1,88 @@
+"""Tests for the compiled AI runtime snapshot and its invalidation."""
+
+from core.models import AiModel, AppSetting
+from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
+from core.services.app_setting_service import AppSettingService
+from core.services.reference_catalog_cache import AI_MODELS, AI_RUNTIME_SETTINGS, reference_catalog_cache
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-runtime-snapshot-tests",
+    },
+    "select2": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ai-runtime-snapshot-tests-select2",
+    },
+}
+
+
+@override_settings(
+    TESTING=False,
+    CACHES=LOC_MEM_CACHES,
+    REFERENCE_CATALOG_PUBSUB_ENABLED=False,
+    LLM_PROVIDER="openrouter",
+)
+class AIRuntimeSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+        reference_catalog_cache.reset_stats()
+        AppSetting.objects.all().delete()
+        AppSettingService.invalidate_cache()
+
+    def tearDown(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+
+    def test_warm_snapshot_serves_route_lookups_without_queries(self):
+        AIRuntimeSettingsService.get_many()
+
+        with self.assertNumQueries(0):
+            AIRuntimeSettingsService.get_llm_provider()
+            AIRuntimeSettingsService.get_llm_default_model()
+            AIRuntimeSettingsService.get_fallback_model_chain()
+            AIRuntimeSettingsService.get_providers_for_model("gpt-5-mini")
+            AIRuntimeSettingsService.get_model_catalog()
+
+        self.assertTrue(reference_catalog_cache.stats()["catalogs"][AI_RUNTIME_SETTINGS.name]["cached"])
+
+    def test_returned_values_do_not_alias_the_snapshot(self):
+        catalog = AIRuntimeSettingsService.get_model_catalog()
+        catalog["providers"].clear()
+        order = AIRuntimeSettingsService.get("LLM_FALLBACK_MODEL_ORDER")
+        order.append("tampered/model")
+
+        self.assertTrue(AIRuntimeSettingsService.get_model_catalog()["providers"])
+        self.assertNotIn("tampered/model", AIRuntimeSettingsService.get("LLM_FALLBACK_MODEL_ORDER"))
+
+    def test_update_runtime_settings_invalidates_snapshot(self):
+        self.assertEqual(AIRuntimeSettingsService.get_llm_provider(), "openrouter")
+
+        AIRuntimeSettingsService.update_runtime_settings({"LLM_PROVIDER": "openai", "LLM_DEFAULT_MODEL": "gpt-5-mini"})
+
+        self.assertEqual(AIRuntimeSettingsService.get_llm_provider(), "openai")
+        self.assertEqual(AIRuntimeSettingsService.get_llm_default_model(), "gpt-5-mini")
+
+    def test_ai_model_save_bumps_catalog_version(self):
+        self.assertNotIn("acme/snapshot-model", AIRuntimeSettingsService._all_model_ids())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AiModel.objects.create(provider="openrouter", model_id="acme/snapshot-model", name="Snapshot Model")
+
+        self.assertIn("acme/snapshot-model", AIRuntimeSettingsService._all_model_ids())
+        self.assertEqual(AIRuntimeSettingsService.get_provider_for_model("acme/snapshot-model"), "openrouter")
+        stats = reference_catalog_cache.stats()["catalogs"]
+        self.assertEqual(stats[AI_MODELS.name]["version"], 1)
+        self.assertEqual(stats[AI_RUNTIME_SETTINGS.name]["version"], 1)
+
+    def test_deleting_referenced_model_repairs_settings_before_commit(self):
+        AiModel.objects.create(provider="openrouter", model_id="acme/doomed-model", name="Doomed Model")
+        reference_catalog_cache.invalidate(AI_MODELS.name, AI_RUNTIME_SETTINGS.name)
+        AIRuntimeSettingsService.update_runtime_settings({"INVOICE_IMPORT_MODEL": "acme/doomed-model"})
+
+        AiModel.objects.filter(model_id="acme/doomed-model").delete()
+
+        self.assertNotEqual(AIRuntimeSettingsService.get("INVOICE_IMPORT_MODEL"), "acme/doomed-model")
@@ -0,0 +1,91 @@
+"""Tests for hourly AI usage rollups: incremental writes, rebuilds and period bounds."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from core.models import AIRequestUsage, AIUsageRollup
+from core.services.ai_usage_rollup_service import AIUsageRollupService
+from core.services.ai_usage_service import AIUsageFeature, AIUsageService
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+
+class AIUsageRollupServiceTests(TestCase):
+    def _record(self, *, model: str = "google/gemini-2.5-flash-lite", success: bool = True, cost: str = "0.010000"):
+        AIUsageService.record_request(
+            feature=AIUsageFeature.INVOICE_IMPORT_AI_PARSER,
+            provider="openrouter",
+            model=model,
+            usage_data={"total_tokens": 10, "cost_usd": cost},
+            success=success,
+        )
+
+    def test_record_request_increments_the_hourly_bucket(self):
+        self._record()
+        self._record(success=False, cost="0.020000")
+        self._record(model="openai/gpt-4o-mini")
+
+        bucket = AIUsageRollup.objects.get(model="google/gemini-2.5-flash-lite")
+        self.assertEqual(bucket.request_count, 2)
+        self.assertEqual(bucket.success_count, 1)
+        self.assertEqual(bucket.failed_count, 1)
+        self.assertEqual(bucket.total_tokens, 20)
+        self.assertEqual(bucket.total_cost, Decimal("0.030000"))
+        self.assertEqual(bucket.bucket_start, AIUsageRollupService.bucket_for(timezone.now()))
+        self.assertEqual(AIUsageRollup.objects.count(), 2)
+
+    def test_rebuild_reconciles_rollups_with_raw_rows(self):
+        self._record()
+        self._record()
+        backdated = timezone.now() - timedelta(days=3)
+        AIRequestUsage.objects.filter(pk=AIRequestUsage.objects.order_by("pk").first().pk).update(
+            created_at=backdated
+        )
+        AIUsageRollup.objects.update(request_count=99)
+
+        result = AIUsageRollupService.rebuild()
+
+        self.assertEqual(result["buckets"], 2)
+        self.assertEqual(
+            sorted(AIUsageRollup.objects.values_list("request_count", flat=True)),
+            [1, 1],
+        )
+        self.assertTrue(AIUsageRollup.objects.filter(bucket_start=AIUsageRollupService.bucket_for(backdated)).exists())
+
+    def test_partial_rebuild_leaves_older_buckets_untouched(self):
+        old_bucket = AIUsageRollup.objects.create(
+            bucket_start=AIUsageRollupService.bucket_for(timezone.now() - timedelta(days=10)),
+            feature=AIUsageFeature.INVOICE_IMPORT_AI_PARSER,
+            provider="openrouter",
+            model="legacy-model",
+            request_count=5,
+        )
+        self._record()
+
+        call_command("rebuild_ai_usage_rollups", "--days", "1", verbosity=0)
+
+        old_bucket.refresh_from_db()
+        self.assertEqual(old_bucket.request_count, 5)
+        self.assertEqual(AIUsageRollup.objects.count(), 2)
+
+    def test_totals_sum_buckets_inside_the_period_only(self):
+        self._record()
+        now = timezone.now()
+        start, end = AIUsageRollupService.period_bounds(now, month=True)
+
+        self.assertEqual(AIUsageRollupService.totals(start, end, provider="openrouter")["request_count"], 1)
+        self.assertEqual(AIUsageRollupService.totals(end, end + timedelta(days=31))["request_count"], 0)
+
+
+class AIUsageRollupPeriodBoundsTests(SimpleTestCase):
+    def test_month_and_year_bounds_use_local_calendar(self):
+        now = timezone.make_aware(datetime(2026, 12, 15, 10, 30))
+
+        month_start, month_end = AIUsageRollupService.period_bounds(now, month=True)
+        year_start, year_end = AIUsageRollupService.period_bounds(now, month=False)
+
+        self.assertEqual(timezone.localtime(month_start).replace(tzinfo=None), datetime(2026, 12, 1))
+        self.assertEqual(timezone.localtime(month_end).replace(tzinfo=None), datetime(2027, 1, 1))
+        self.assertEqual(timezone.localtime(year_start).replace(tzinfo=None), datetime(2026, 1, 1))
+        self.assertEqual(timezone.localtime(year_end).replace(tzinfo=None), datetime(2027, 1, 1))
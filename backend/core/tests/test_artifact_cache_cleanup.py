@@ -0,0 +1,68 @@
+"""Tests for age-based pruning of the artifact caches under TMPFILES_FOLDER."""
+
+import datetime
+import os
+import tempfile
+
+from core.services.artifact_cache_cleanup import prune_artifact_caches, prune_job_outputs
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+
+@override_settings(TMPFILES_FOLDER="tmpfiles", ARTIFACT_CACHE_MAX_AGE_DAYS=30, JOB_OUTPUT_MAX_AGE_HOURS=24)
+class ArtifactCacheCleanupTests(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.storage = FileSystemStorage(location=self._tmp.name)
+        self.now = timezone.now()
+
+    def _save(self, name: str, *, age_days: int) -> str:
+        saved = self.storage.save(name, ContentFile(b"cached"))
+        modified = (self.now - datetime.timedelta(days=age_days)).timestamp()
+        os.utime(self.storage.path(saved), (modified, modified))
+        return saved
+
+    def test_only_expired_cache_files_are_deleted(self):
+        expired = self._save("tmpfiles/pdf_conversion_cache/old.pdf", age_days=45)
+        fresh = self._save("tmpfiles/pdf_conversion_cache/new.pdf", age_days=2)
+        unrelated = self._save("tmpfiles/document_merges/job/merged.pdf", age_days=45)
+
+        deleted = prune_artifact_caches(now=self.now, storage=self.storage)
+
+        self.assertEqual(deleted["pdf_conversion_cache"], 1)
+        self.assertFalse(self.storage.exists(expired))
+        self.assertTrue(self.storage.exists(fresh))
+        self.assertTrue(self.storage.exists(unrelated))
+
+    def test_invoice_and_report_artifact_caches_are_pruned(self):
+        invoice_artifact = self._save("tmpfiles/invoice_artifacts/abc.pdf", age_days=31)
+        report_artifact = self._save("tmpfiles/report_exports/cache/monthly_invoices/abc.xlsx", age_days=31)
+        report_job_output = self._save("tmpfiles/report_exports/job-1/invoices.xlsx", age_days=31)
+
+        deleted = prune_artifact_caches(now=self.now, storage=self.storage)
+
+        self.assertEqual(deleted["invoice_artifacts"], 1)
+        self.assertEqual(deleted["report_exports/cache"], 1)
+        self.assertFalse(self.storage.exists(invoice_artifact))
+        self.assertFalse(self.storage.exists(report_artifact))
+        self.assertTrue(self.storage.exists(report_job_output))
+
+    @override_settings(ARTIFACT_CACHE_MAX_AGE_DAYS=0)
+    def test_pruning_can_be_disabled(self):
+        expired = self._save("tmpfiles/pdf_conversion_cache/old.pdf", age_days=45)
+
+        self.assertEqual(prune_artifact_caches(now=self.now, storage=self.storage), {})
+        self.assertTrue(self.storage.exists(expired))
+
+    def test_expired_document_merge_outputs_are_pruned(self):
+        expired = self._save("tmpfiles/document_merges/old-job/merged.pdf", age_days=2)
+        fresh = self._save("tmpfiles/document_merges/new-job/merged.pdf", age_days=0)
+
+        deleted = prune_job_outputs(now=self.now, storage=self.storage)
+
+        self.assertEqual(deleted, {"document_merges": 1})
+        self.assertFalse(self.storage.exists(expired))
+        self.assertTrue(self.storage.exists(fresh))
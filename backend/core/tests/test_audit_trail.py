@@ -0,0 +1,78 @@
+"""Tests for the buffered, after-commit audit trail writer and its retention."""
+
+import datetime
+
+from core.models import AuditTrailEntry
+from core.services.audit_trail_service import AuditTrailService
+from customers.models import Customer
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+
+class AuditTrailServiceTests(TestCase):
+    def setUp(self):
+        AuditTrailService.flush()
+        AuditTrailEntry.objects.all().delete()
+
+    def tearDown(self):
+        AuditTrailService.flush()
+
+    def test_changes_are_written_after_commit_in_one_batch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            customer = Customer.objects.create(first_name="Audit", last_name="Trail")
+            customer.first_name = "Audited"
+            customer.save()
+            self.assertEqual(AuditTrailService.pending_count(), 0)
+
+        self.assertEqual(AuditTrailEntry.objects.count(), 0)
+        self.assertEqual(AuditTrailService.pending_count(), 2)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(AuditTrailService.flush(), 2)
+
+        entries = list(AuditTrailEntry.objects.order_by("action"))
+        self.assertEqual(
+            [entry.action for entry in entries], [AuditTrailEntry.Action.CREATE, AuditTrailEntry.Action.UPDATE]
+        )
+        self.assertEqual(entries[1].object_pk, str(customer.pk))
+        self.assertEqual(entries[1].content_type, ContentType.objects.get_for_model(Customer))
+        self.assertEqual(entries[1].changes["first_name"], ["Audit", "Audited"])
+
+    def test_rolled_back_changes_are_not_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Customer.objects.create(first_name="Rolled", last_name="Back")
+                    raise RuntimeError("abort")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(AuditTrailService.pending_count(), 0)
+
+    @override_settings(AUDIT_TRAIL_BATCH_SIZE=2)
+    def test_buffer_flushes_itself_when_batch_size_is_reached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(3):
+                Customer.objects.create(first_name=f"Bulk {index}", last_name="Import")
+
+        self.assertEqual(AuditTrailEntry.objects.count(), 2)
+        self.assertEqual(AuditTrailService.pending_count(), 1)
+
+    def test_prune_removes_entries_older_than_cutoff(self):
+        content_type = ContentType.objects.get_for_model(Customer)
+        now = timezone.now()
+        for days_ago in (40, 1):
+            AuditTrailEntry.objects.create(
+                timestamp=now - datetime.timedelta(days=days_ago),
+                content_type=content_type,
+                object_pk="1",
+                object_repr="Customer",
+                action=AuditTrailEntry.Action.UPDATE,
+            )
+
+        result = AuditTrailService.prune(timezone.localdate() - datetime.timedelta(days=14))
+
+        self.assertEqual(result["deleted_rows"], 1)
+        self.assertEqual(AuditTrailEntry.objects.count(), 1)
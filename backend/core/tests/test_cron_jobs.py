@@ -23,6 +23,26 @@ class AuditLogPruneTests(TestCase):
             assert kwargs.get("yes") is True
 
 
+class AuditTrailPartitionUpkeepTests(TestCase):
+    @override_settings(AUDITLOG_RETENTION_DAYS=0)
+    def test_partitions_are_created_even_when_retention_is_disabled(self):
+        with (
+            patch("core.tasks.cron_jobs.AppSettingService.get_effective_raw", return_value=0),
+            patch("core.tasks.cron_jobs.AuditTrailService.ensure_partitions", return_value=[]) as ensure_mock,
+            patch("core.tasks.cron_jobs.AuditTrailService.prune") as prune_mock,
+        ):
+            cron_jobs._perform_prune_auditlog()
+            prune_mock.assert_not_called()
+            ensure_mock.assert_not_called()
+
+            cron_jobs._perform_audit_trail_partition_upkeep()
+
+        ensure_mock.assert_called_once_with()
+
+    def test_partition_upkeep_is_scheduled_independently_of_retention(self):
+        self.assertTrue(callable(getattr(cron_jobs, "_audit_trail_partitions_daily", None)))
+
+
 class OpenRouterHealthCheckTests(TestCase):
     @override_settings(
         OPENROUTER_HEALTHCHECK_ENABLED=True,
@@ -168,16 +188,44 @@ class PrivilegedCronTaskLockingTests(TestCase):
         self.assertFalse(executed)
         perform_clear_cache_mock.assert_not_called()
 
+    @override_settings(MEDIA_BACKUP_PREFIX="media_mirror")
+    @patch("core.tasks.cron_jobs._media_snapshot_due", return_value=False)
     @patch("core.tasks.cron_jobs.call_command")
-    def test_full_backup_calls_dbbackup_and_uploadmediatos3(self, mock_call_command):
+    def test_full_backup_calls_dbbackup_and_mirrors_media_to_stable_prefix(self, mock_call_command, _snapshot_due):
+        cron_jobs._perform_full_backup()
+
+        self.assertEqual(
+            mock_call_command.call_args_list,
+            [call("dbbackup"), call("uploadmediatos3", "media_mirror")],
+        )
+
+    @override_settings(MEDIA_BACKUP_PREFIX="media_mirror")
+    @patch("core.tasks.cron_jobs._media_snapshot_due", return_value=True)
+    @patch("core.tasks.cron_jobs.call_command")
+    def test_full_backup_adds_dated_media_snapshot_when_due(self, mock_call_command, _snapshot_due):
         cron_jobs._perform_full_backup()
 
         expected_dir_name = "media_" + datetime.date.today().strftime("%Y%m%d")
         self.assertEqual(
             mock_call_command.call_args_list,
-            [call("dbbackup"), call("uploadmediatos3", expected_dir_name)],
+            [
+                call("dbbackup"),
+                call("uploadmediatos3", "media_mirror"),
+                call("uploadmediatos3", expected_dir_name, snapshot=True),
+            ],
         )
 
+    def test_media_snapshot_interval(self):
+        day = datetime.date(2026, 10, 18)
+        with override_settings(MEDIA_BACKUP_SNAPSHOT_INTERVAL_DAYS=7):
+            due_days = [
+                offset for offset in range(14) if cron_jobs._media_snapshot_due(day + datetime.timedelta(days=offset))
+            ]
+        self.assertEqual(len(due_days), 2)
+        self.assertEqual(due_days[1] - due_days[0], 7)
+        with override_settings(MEDIA_BACKUP_SNAPSHOT_INTERVAL_DAYS=0):
+            self.assertFalse(cron_jobs._media_snapshot_due(day))
+
     @patch("core.tasks.cron_jobs._perform_full_backup")
     def test_full_backup_execution_releases_enqueue_lock_after_run(self, perform_full_backup_mock):
         cache.set(cron_jobs.FULL_BACKUP_ENQUEUE_LOCK_KEY, "queued-token", timeout=300)
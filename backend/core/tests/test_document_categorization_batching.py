@@ -0,0 +1,308 @@
+"""Tests for batched multi-document categorization and its fallback to single-file calls."""
+
+import io
+import json
+import time
+from unittest.mock import patch
+
+from core.models import AiModel
+from core.services.ai_document_categorizer import AIDocumentCategorizer
+from core.services.reference_catalog_cache import reference_catalog_cache
+from core.tasks.document_categorization import run_document_categorization_item
+from core.tests.ai_stub_server import StubOpenAIServer, StubReply
+from customer_applications.models import DocApplication, DocumentCategorizationItem, DocumentCategorizationJob
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openai import OpenAI
+from PIL import Image
+from products.models import Product
+from products.models.document_type import DocumentType
+
+MODEL = "stub/vision"
+
+DOCUMENT_TYPES = [
+    {"id": 1, "name": "Passport", "description": "Passport bio-data page"},
+    {"id": 2, "name": "Bank Statement", "description": "Bank account statement"},
+    {"id": 3, "name": "Flight Ticket", "description": "Airline ticket or itinerary"},
+    {"id": 4, "name": "KTP Sponsor", "description": "Indonesian national ID card of a sponsor"},
+]
+
+# Illustrative per-unit prices, only used to compare the two request shapes.
+PROMPT_PRICE_PER_TOKEN = 0.30 / 1_000_000
+IMAGE_PRICE_PER_KB = 0.02 / 1_000
+REQUEST_PRICE = 0.0001
+
+
+def _scan(width=1400, height=1000) -> bytes:
+    # Noise keeps the PNG from compressing to nothing, like a real phone scan.
+    buf = io.BytesIO()
+    Image.effect_noise((width, height), 24).convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _request_footprint(payloads: list[dict]) -> dict:
+    """Text tokens (~4 chars each), image payload size and an illustrative cost for recorded requests."""
+    text_chars = 0
+    image_bytes = 0
+    for payload in payloads:
+        for message in payload.get("messages") or []:
+            content = message.get("content")
+            parts = [{"type": "text", "text": content}] if isinstance(content, str) else content or []
+            for part in parts:
+                if part.get("type") == "text":
+                    text_chars += len(part.get("text") or "")
+                else:
+                    image_bytes += len(part["image_url"]["url"]) * 3 // 4
+    text_tokens = text_chars // 4
+    cost = (
+        text_tokens * PROMPT_PRICE_PER_TOKEN
+        + image_bytes / 1024 * IMAGE_PRICE_PER_KB
+        + len(payloads) * REQUEST_PRICE
+    )
+    return {"requests": len(payloads), "text_tokens": text_tokens, "image_bytes": image_bytes, "cost": cost}
+
+
+@override_settings(
+    REFERENCE_CATALOG_PUBSUB_ENABLED=False,
+    OPENAI_API_KEY="stub-key",
+    OPENROUTER_API_KEY="",
+    LLM_PROVIDER="openai",
+    LLM_DEFAULT_MODEL=MODEL,
+    OPENAI_DEFAULT_MODEL=MODEL,
+    LLM_AUTO_FALLBACK_ENABLED=False,
+    AI_PROVIDER_SDK_MAX_RETRIES=0,
+    DOCUMENT_CATEGORIZATION_BATCH_IMAGE_MAX_SIDE=512,
+)
+class BatchCategorizationStubProviderTests(TestCase):
+    """Compare the per-file path and one batched request against a local OpenAI-compatible stub."""
+
+    FILES = 4
+    PROVIDER_LATENCY_SECONDS = 0.1
+
+    def setUp(self):
+        reference_catalog_cache.clear_local()
+        AiModel.objects.create(provider="openai", model_id=MODEL, name="Stub vision")
+        self.stub = StubOpenAIServer().__enter__()
+        self.addCleanup(self.stub.__exit__, None, None, None)
+
+        def _openai_against_stub(**kwargs):
+            return OpenAI(**{**kwargs, "base_url": self.stub.base_url})
+
+        for target, kwargs in (
+            ("core.services.ai_client.OpenAI", {"side_effect": _openai_against_stub}),
+            ("core.services.ai_client.AIUsageService.enqueue_request_capture", {}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.files = [(_scan(), f"scan-{index}.png") for index in range(self.FILES)]
+
+    def _single_reply(self, name: str) -> StubReply:
+        content = json.dumps({"document_type": name, "confidence": 0.95, "reasoning": "clear match"})
+        return StubReply(delay_seconds=self.PROVIDER_LATENCY_SECONDS, content=content)
+
+    def test_batch_request_is_cheaper_and_faster_than_per_file_requests(self):
+        names = [DOCUMENT_TYPES[index % len(DOCUMENT_TYPES)]["name"] for index in range(self.FILES)]
+        categorizer = AIDocumentCategorizer(model=MODEL, timeout=10)
+
+        self.stub.script(MODEL, *(self._single_reply(name) for name in names))
+        started = time.perf_counter()
+        single_results = [
+            categorizer.categorize_file(data, filename, DOCUMENT_TYPES) for data, filename in self.files
+        ]
+        single_seconds = time.perf_counter() - started
+        single = _request_footprint(self.stub.requests)
+        single_system_message = self.stub.requests[0]["messages"][0]
+
+        self.stub.requests.clear()
+        batch_content = json.dumps(
+            {
+                "results": [
+                    {"index": index + 1, "document_type": name, "confidence": 0.95, "reasoning": "clear match"}
+                    for index, name in reversed(list(enumerate(names)))
+                ]
+            }
+        )
+        self.stub.script(MODEL, StubReply(delay_seconds=self.PROVIDER_LATENCY_SECONDS, content=batch_content))
+        started = time.perf_counter()
+        batch_results = categorizer.categorize_files_batch(self.files, DOCUMENT_TYPES)
+        batch_seconds = time.perf_counter() - started
+        batch = _request_footprint(self.stub.requests)
+
+        self.assertEqual(
+            [result["document_type_id"] for result in batch_results],
+            [result["document_type_id"] for result in single_results],
+        )
+        # The system prompt with the document-type list is the shared, cacheable prefix of both request shapes.
+        self.assertEqual(self.stub.requests[0]["messages"][0], single_system_message)
+        self.assertEqual((single["requests"], batch["requests"]), (self.FILES, 1))
+        self.assertLess(batch["text_tokens"], single["text_tokens"] / 2)
+        self.assertLess(batch["image_bytes"], single["image_bytes"])
+        self.assertLess(batch["cost"], single["cost"])
+        self.assertLess(batch_seconds, single_seconds)
+
+    def test_missing_entries_come_back_as_none(self):
+        content = json.dumps(
+            {"results": [{"index": 2, "document_type": "Passport", "confidence": 0.9, "reasoning": "bio page"}]}
+        )
+        self.stub.script(MODEL, StubReply(content=content))
+
+        results = AIDocumentCategorizer(model=MODEL, timeout=10).categorize_files_batch(
+            self.files[:2], DOCUMENT_TYPES
+        )
+
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1]["document_type_id"], 1)
+
+
+@override_settings(DOCUMENT_CATEGORIZATION_BATCH_SIZE=4, DOCUMENT_CATEGORIZATION_BATCH_MIN_CONFIDENCE=0.8)
+class BatchCategorizationTaskTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._publish_stream_event_patcher = patch("core.signals_streams.publish_stream_event", return_value=None)
+        cls._publish_stream_event_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._publish_stream_event_patcher.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="cat-batch-user", password="testpass")
+        customer = Customer.objects.create(customer_type="person", first_name="Cat", last_name="Batch")
+        product = Product.objects.create(name="Batch Product", code="CAT-BATCH", product_type="visa")
+        application = DocApplication.objects.create(
+            customer=customer, product=product, doc_date=timezone.now().date(), created_by=user
+        )
+        self.doc_type = DocumentType.objects.create(name="Passport Batch Test", has_file=True)
+        self.job = DocumentCategorizationJob.objects.create(
+            doc_application=application, total_files=3, created_by=user
+        )
+        self.items = [
+            DocumentCategorizationItem.objects.create(
+                job=self.job,
+                sort_index=index,
+                filename=f"file-{index}.jpg",
+                file_path=f"tmp/categorization/file-{index}.jpg",
+                status=DocumentCategorizationItem.STATUS_QUEUED,
+                result={"stage": "uploaded"},
+            )
+            for index in range(3)
+        ]
+        for target, kwargs in (
+            ("core.tasks.document_categorization.acquire_task_lock", {"return_value": "lock-token"}),
+            ("core.tasks.document_categorization.release_task_lock", {}),
+            ("core.tasks.document_categorization.get_document_types_for_prompt", {"return_value": []}),
+            ("core.tasks.document_categorization.AIDocumentCategorizer._get_client", {}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        storage_patcher = patch("core.tasks.document_categorization.default_storage.open")
+        storage_open = storage_patcher.start()
+        self.addCleanup(storage_patcher.stop)
+        storage_open.return_value.__enter__.return_value.read.return_value = b"small-file"
+        delay_patcher = patch.object(run_document_categorization_item, "delay")
+        self.delay = delay_patcher.start()
+        self.addCleanup(delay_patcher.stop)
+
+    def _result(self, confidence: float) -> dict:
+        return {
+            "document_type": self.doc_type.name,
+            "document_type_id": self.doc_type.id,
+            "confidence": confidence,
+            "reasoning": "looks right",
+        }
+
+    def _run(self, item: DocumentCategorizationItem) -> None:
+        run_document_categorization_item.call_local(item_id=str(item.id))
+        item.refresh_from_db()
+
+    def test_leader_batches_queued_siblings_and_hands_unsure_ones_back(self):
+        leader, confident, unsure = self.items
+
+        with (
+            patch(
+                "core.tasks.document_categorization.AIDocumentCategorizer.categorize_files_batch",
+                return_value=[self._result(0.95), self._result(0.9), self._result(0.4)],
+            ) as batch,
+            patch("core.tasks.document_categorization.AIDocumentCategorizer.categorize_file_two_pass") as two_pass,
+        ):
+            self._run(leader)
+            confident.refresh_from_db()
+            unsure.refresh_from_db()
+
+            self.assertEqual(len(batch.call_args.args[0]), 3)
+            two_pass.assert_not_called()
+            self.assertEqual(leader.status, DocumentCategorizationItem.STATUS_CATEGORIZED)
+            self.assertEqual(confident.result["batch_categorization"]["document_type_id"], self.doc_type.id)
+            self.assertTrue(unsure.result["batch_single"])
+            self.assertEqual(unsure.result["stage"], "categorizing_pass_1")
+            self.assertNotIn("batch_leader_id", unsure.result)
+            redispatched = sorted(call.args[0] for call in self.delay.call_args_list)
+            self.assertEqual(redispatched, sorted([str(confident.id), str(unsure.id)]))
+
+            two_pass.return_value = {**self._result(0.99), "pass_used": 2}
+            self._run(confident)
+            two_pass.assert_not_called()
+            self._run(unsure)
+            two_pass.assert_called_once()
+
+        self.assertEqual(batch.call_count, 1)
+        self.assertEqual(confident.status, DocumentCategorizationItem.STATUS_CATEGORIZED)
+        self.assertEqual(unsure.status, DocumentCategorizationItem.STATUS_CATEGORIZED)
+        self.assertEqual(unsure.result["pass_used"], 2)
+
+    def test_failed_batch_falls_back_to_single_file_calls(self):
+        leader = self.items[0]
+
+        with (
+            patch(
+                "core.tasks.document_categorization.AIDocumentCategorizer.categorize_files_batch",
+                side_effect=RuntimeError("provider down"),
+            ),
+            patch(
+                "core.tasks.document_categorization.AIDocumentCategorizer.categorize_file_two_pass",
+                return_value={**self._result(0.95), "pass_used": 1},
+            ) as two_pass,
+        ):
+            self._run(leader)
+
+        two_pass.assert_called_once()
+        self.assertEqual(leader.status, DocumentCategorizationItem.STATUS_CATEGORIZED)
+        for sibling in self.items[1:]:
+            sibling.refresh_from_db()
+            self.assertTrue(sibling.result["batch_single"])
+        self.assertEqual(self.delay.call_count, 2)
+
+    def test_sibling_message_waits_for_the_batch_leader_instead_of_being_dropped(self):
+        sibling = self.items[1]
+        sibling.status = DocumentCategorizationItem.STATUS_PROCESSING
+        sibling.result = {"stage": "uploaded", "batch_leader_id": str(self.items[0].id)}
+        sibling.save(update_fields=["status", "result", "updated_at"])
+
+        with (
+            patch("core.tasks.document_categorization.acquire_task_lock", return_value=None),
+            patch.object(run_document_categorization_item, "schedule") as schedule,
+            override_settings(TASK_IDEMPOTENCY_LOCK_TTL_SECONDS=600),
+        ):
+            self._run(sibling)
+
+        schedule.assert_called_once_with(args=(str(sibling.id),), delay=630)
+        self.assertEqual(sibling.status, DocumentCategorizationItem.STATUS_PROCESSING)
+
+    def test_duplicate_delivery_of_a_running_item_is_still_skipped(self):
+        running = self.items[1]
+        running.status = DocumentCategorizationItem.STATUS_PROCESSING
+        running.save(update_fields=["status", "updated_at"])
+
+        with (
+            patch("core.tasks.document_categorization.acquire_task_lock", return_value=None),
+            patch.object(run_document_categorization_item, "schedule") as schedule,
+        ):
+            self._run(running)
+
+        schedule.assert_not_called()
@@ -0,0 +1,92 @@
+"""Tests for the shared, decode-once image analysis context."""
+
+import importlib.util
+
+import numpy as np
+from core.services.image_analysis_context import ImageAnalysisContext, histogram_percentile
+from core.services.image_quality_service import ImageQualityService
+from django.test import SimpleTestCase
+
+CV2_AVAILABLE = importlib.util.find_spec("cv2") is not None
+
+
+class HistogramPercentileTests(SimpleTestCase):
+    def test_matches_numpy_linear_percentile(self):
+        rng = np.random.default_rng(3)
+        for size in (1, 2, 7, 1000, 12345):
+            values = rng.integers(0, 256, size=size, dtype=np.uint8)
+            histogram = np.bincount(values, minlength=256)
+            for percentile in (0, 5, 50, 95, 100):
+                self.assertAlmostEqual(
+                    histogram_percentile(histogram, percentile), float(np.percentile(values, percentile)), places=6
+                )
+
+
+class ImageAnalysisContextTests(SimpleTestCase):
+    def setUp(self):
+        if not CV2_AVAILABLE:
+            self.skipTest("OpenCV (cv2) is not installed in this environment")
+        self.cv2 = __import__("cv2")
+
+    def _document_jpeg(self, width: int, height: int) -> bytes:
+        cv2 = self.cv2
+        image = np.full((height, width, 3), 185, dtype=np.uint8)
+        cv2.rectangle(image, (width // 20, height // 20), (width - width // 20, height - height // 20), (30, 30, 30), 6)
+        for row in range(6):
+            y = int(height * (0.2 + row * 0.12))
+            cv2.putText(image, "P<ITAROSSI<<MARIO<<<<", (width // 10, y), cv2.FONT_HERSHEY_SIMPLEX, 3.0, (5, 5, 5), 6)
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 92])
+        self.assertTrue(ok)
+        return encoded.tobytes()
+
+    def test_large_photo_scores_match_the_native_resolution_calibration(self):
+        # The quality thresholds were calibrated on full-size uploads; the shared planes must not be downscaled.
+        cv2 = self.cv2
+        content = self._document_jpeg(4000, 3000)
+        gray = cv2.cvtColor(cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_COLOR), cv2.COLOR_BGR2GRAY)
+        sobel_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
+        sobel_y = cv2.Sobel(gray, cv2.CV_32F, 0, 1, ksize=3)
+        mrz_roi = gray[int(gray.shape[0] * 0.72) :, :]
+
+        result = ImageQualityService().evaluate(content)
+
+        self.assertEqual((result.width, result.height), (4000, 3000))
+        self.assertAlmostEqual(result.laplacian_variance, float(cv2.Laplacian(gray, cv2.CV_64F).var()), places=6)
+        self.assertAlmostEqual(
+            result.mrz_roi_laplacian_variance, float(cv2.Laplacian(mrz_roi, cv2.CV_64F).var()), places=6
+        )
+        self.assertAlmostEqual(
+            result.mean_gradient_magnitude, float(np.mean(cv2.magnitude(sobel_x, sobel_y))), places=4
+        )
+        self.assertAlmostEqual(
+            result.edge_density, float(np.count_nonzero(cv2.Canny(gray, 80, 160))) / float(gray.size), places=9
+        )
+        self.assertAlmostEqual(result.contrast_std, float(gray.std()), places=6)
+
+    def test_intensity_stats_match_direct_numpy_computation(self):
+        context = ImageAnalysisContext(self._document_jpeg(900, 700))
+        gray = context.gray
+        stats = context.intensity_stats
+
+        self.assertAlmostEqual(stats["mean"], float(gray.mean()), places=6)
+        self.assertAlmostEqual(stats["std"], float(gray.std()), places=6)
+        self.assertAlmostEqual(stats["p5"], float(np.percentile(gray, 5)), places=6)
+        self.assertAlmostEqual(stats["p95"], float(np.percentile(gray, 95)), places=6)
+        self.assertAlmostEqual(stats["clipped_dark_ratio"], float(np.mean(gray <= 10)), places=9)
+        self.assertAlmostEqual(stats["clipped_bright_ratio"], float(np.mean(gray >= 245)), places=9)
+
+    def test_planes_are_memoized_per_context(self):
+        context = ImageAnalysisContext(self._document_jpeg(900, 700))
+
+        self.assertIs(context.gray, context.gray)
+        self.assertIs(context.edges, context.edges)
+        self.assertIs(context.mrz_roi(0.72), context.mrz_roi(0.72))
+        self.assertEqual(context.rgb_image().size, (900, 700))
+
+    def test_undecodable_bytes_have_no_planes(self):
+        context = ImageAnalysisContext(b"not an image")
+
+        self.assertIsNone(context.image)
+        self.assertIsNone(context.gray)
+        self.assertIsNone(context.rgb_image())
+        self.assertEqual(ImageQualityService().evaluate(b"not an image").rejection_code, "invalid_image")
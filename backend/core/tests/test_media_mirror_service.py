@@ -0,0 +1,121 @@
+"""Tests for the incremental, manifest-backed media mirror."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from core.services.media_mirror_service import MediaMirrorManifest, MediaMirrorService, S3MirrorDestination
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+
+class MediaMirrorServiceTests(SimpleTestCase):
+    def setUp(self):
+        self.workdir = Path(tempfile.mkdtemp(prefix="media-mirror-test-"))
+        self.source = self.workdir / "source"
+        self.storage = FileSystemStorage(location=str(self.workdir / "destination"))
+        for name in ("documents/a.pdf", "documents/b.pdf", "invoices/c.pdf", "tmpfiles/skip.bin"):
+            self._write(name, name.encode("utf-8"))
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _write(self, name: str, content: bytes) -> Path:
+        path = self.source / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return path
+
+    def _service(self) -> MediaMirrorService:
+        return MediaMirrorService(
+            self.storage,
+            prefix="mirror",
+            source_root=self.source,
+            exclude_folders={"tmpfiles"},
+            concurrency=2,
+            manifest_path=str(self.workdir / "manifest.sqlite3"),
+        )
+
+    def test_second_run_only_uploads_changed_files(self):
+        first = self._service().run()
+        self.assertEqual((first.scanned, first.uploaded), (3, 3))
+        self.assertTrue(self.storage.exists("mirror/invoices/c.pdf"))
+        self.assertFalse(self.storage.exists("mirror/tmpfiles/skip.bin"))
+
+        second = self._service().run()
+        self.assertEqual((second.unchanged, second.uploaded), (3, 0))
+
+        self._write("documents/a.pdf", b"changed contents")
+        third = self._service().run()
+        self.assertEqual((third.unchanged, third.uploaded), (2, 1))
+        with self.storage.open("mirror/documents/a.pdf") as handle:
+            self.assertEqual(handle.read(), b"changed contents")
+
+    def test_touched_file_with_same_content_is_rehashed_but_not_uploaded(self):
+        self._service().run()
+        path = self.source / "documents/b.pdf"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+        stats = self._service().run()
+
+        self.assertEqual((stats.rehashed_unchanged, stats.uploaded), (1, 0))
+        self.assertEqual(self._service().run().unchanged, 3)
+
+    def test_missing_remote_object_is_uploaded_again(self):
+        self._service().run()
+        self.storage.delete("mirror/documents/a.pdf")
+
+        stats = self._service().run()
+
+        self.assertEqual(stats.uploaded, 1)
+        self.assertTrue(self.storage.exists("mirror/documents/a.pdf"))
+
+    def test_snapshot_run_keeps_no_manifest_file(self):
+        stats = MediaMirrorService(
+            self.storage,
+            prefix="media_20261018",
+            source_root=self.source,
+            exclude_folders={"tmpfiles"},
+            manifest_path=MediaMirrorManifest.IN_MEMORY,
+        ).run()
+
+        self.assertEqual(stats.uploaded, 3)
+        self.assertTrue(self.storage.exists("media_20261018/documents/a.pdf"))
+        self.assertEqual(list(self.workdir.rglob("*.sqlite3")), [])
+
+    def test_dry_run_reports_pending_uploads_without_writing(self):
+        stats = self._service().run(dry_run=True)
+
+        self.assertEqual((stats.would_upload, stats.uploaded), (3, 0))
+        self.assertFalse(self.storage.exists("mirror/documents/a.pdf"))
+
+
+class S3MirrorDestinationTests(SimpleTestCase):
+    def test_upload_uses_the_storage_backend_object_parameters(self):
+        storage = SimpleNamespace(
+            bucket_name="backups",
+            location="dbbackup",
+            connection=MagicMock(),
+            default_acl="private",
+            get_object_parameters=lambda name: {"ServerSideEncryption": "aws:kms", "Metadata": {"origin": "media"}},
+        )
+        destination = S3MirrorDestination(storage, "media_mirror")
+
+        destination.upload("/tmp/a.pdf", "documents/a.pdf", sha256="abc123")
+
+        storage.connection.meta.client.upload_file.assert_called_once_with(
+            "/tmp/a.pdf",
+            "backups",
+            "dbbackup/media_mirror/documents/a.pdf",
+            ExtraArgs={
+                "ServerSideEncryption": "aws:kms",
+                "ACL": "private",
+                "ContentType": "application/pdf",
+                "Metadata": {"origin": "media", "sha256": "abc123"},
+            },
+            Config=destination.transfer_config,
+        )
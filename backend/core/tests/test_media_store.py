@@ -0,0 +1,146 @@
+"""Tests for server-side move/copy/bulk-delete on media store adapters."""
+
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+from core.storage import FileSystemMediaStoreAdapter, ObjectMediaStoreAdapter
+from core.storage.media_store import OBJECT_DELETE_BATCH_SIZE
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+
+class FileSystemMediaStoreAdapterTransferTests(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = FileSystemStorage(location=self._tmp.name)
+        self.adapter = FileSystemMediaStoreAdapter(self.storage)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_move_renames_file_without_reading_it(self):
+        self.storage.save("tmp/categorization/job/itk.pdf", ContentFile(b"pdf-bytes"))
+        self.storage.open = MagicMock(side_effect=AssertionError("move must not stream file bytes"))
+
+        saved_name = self.adapter.move("tmp/categorization/job/itk.pdf", "documents/app-1/ITK.pdf")
+
+        self.assertEqual(saved_name, "documents/app-1/ITK.pdf")
+        self.assertFalse(os.path.exists(self.storage.path("tmp/categorization/job/itk.pdf")))
+        with open(self.storage.path(saved_name), "rb") as handle:
+            self.assertEqual(handle.read(), b"pdf-bytes")
+
+    def test_move_and_copy_do_not_overwrite_existing_destination(self):
+        self.storage.save("documents/app-1/ITK.pdf", ContentFile(b"existing"))
+        self.storage.save("tmp/source.pdf", ContentFile(b"new"))
+
+        copied_name = self.adapter.copy("tmp/source.pdf", "documents/app-1/ITK.pdf")
+        moved_name = self.adapter.move("tmp/source.pdf", "documents/app-1/ITK.pdf")
+
+        self.assertNotEqual(copied_name, "documents/app-1/ITK.pdf")
+        self.assertNotIn(moved_name, {"documents/app-1/ITK.pdf", copied_name})
+        with self.storage.open("documents/app-1/ITK.pdf", "rb") as handle:
+            self.assertEqual(handle.read(), b"existing")
+        self.assertTrue(self.storage.exists(moved_name))
+
+    def test_compose_concatenates_sources_in_order(self):
+        self.storage.save("tmp/uploads/u1/000000.part", ContentFile(b"abc"))
+        self.storage.save("tmp/uploads/u1/000001.part", ContentFile(b"def"))
+
+        saved_name = self.adapter.compose(
+            ["tmp/uploads/u1/000000.part", "tmp/uploads/u1/000001.part"], "documents/app-1/scan.pdf"
+        )
+
+        with self.storage.open(saved_name, "rb") as handle:
+            self.assertEqual(handle.read(), b"abcdef")
+        self.assertTrue(self.storage.exists("tmp/uploads/u1/000000.part"))
+
+    def test_bulk_delete_continues_past_failures(self):
+        self.storage.save("tmp/a.pdf", ContentFile(b"a"))
+        self.storage.save("tmp/b.pdf", ContentFile(b"b"))
+        original_delete = self.storage.delete
+
+        def flaky_delete(name):
+            if name == "tmp/a.pdf":
+                raise OSError("locked")
+            original_delete(name)
+
+        self.storage.delete = flaky_delete
+
+        failures = self.adapter.bulk_delete(["tmp/a.pdf", "tmp/b.pdf", "/tmp/b.pdf", ""])
+
+        self.assertEqual(failures, {"tmp/a.pdf": "locked"})
+        self.assertFalse(self.storage.exists("tmp/b.pdf"))
+
+
+class _SeekCheckingStorage(FileSystemStorage):
+    """Mirrors django-storages S3Storage._save, which checks ``closed``, seeks to 0 and reads the size."""
+
+    def _save(self, name, content):
+        if content.closed:
+            raise AssertionError("content must be open")
+        content.seek(0, os.SEEK_SET)
+        self.saved_sizes.append(content.size)
+        return super()._save(name, content)
+
+
+class GenericComposeFallbackTests(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = _SeekCheckingStorage(location=self._tmp.name)
+        self.storage.saved_sizes = []
+        # Without a bucket the object adapter composes through the generic streaming path.
+        self.adapter = ObjectMediaStoreAdapter(self.storage)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_compose_fallback_passes_seekable_content_to_storage(self):
+        self.storage.save("tmp/uploads/u1/000000.part", ContentFile(b"abc"))
+        self.storage.save("tmp/uploads/u1/000001.part", ContentFile(b"defg"))
+        self.storage.saved_sizes.clear()
+
+        saved_name = self.adapter.compose(
+            ["tmp/uploads/u1/000000.part", "tmp/uploads/u1/000001.part"], "documents/app-1/scan.pdf"
+        )
+
+        self.assertEqual(self.storage.saved_sizes, [7])
+        with self.storage.open(saved_name, "rb") as handle:
+            self.assertEqual(handle.read(), b"abcdefg")
+
+
+class ObjectMediaStoreAdapterTransferTests(SimpleTestCase):
+    def setUp(self):
+        self.storage = MagicMock()
+        self.storage.bucket.name = "media-bucket"
+        self.storage.default_acl = None
+        self.storage._normalize_name.side_effect = lambda name: f"media/{name}"
+        self.storage.get_available_name.side_effect = lambda name: name
+        self.adapter = ObjectMediaStoreAdapter(self.storage)
+
+    def test_move_uses_server_side_copy_then_delete(self):
+        saved_name = self.adapter.move("tmp/itk.pdf", "documents/ITK.pdf")
+
+        self.assertEqual(saved_name, "documents/ITK.pdf")
+        self.storage.bucket.Object.assert_called_once_with("media/documents/ITK.pdf")
+        self.storage.bucket.Object.return_value.copy_from.assert_called_once_with(
+            CopySource={"Bucket": "media-bucket", "Key": "media/tmp/itk.pdf"}
+        )
+        self.storage.open.assert_not_called()
+        self.storage.delete.assert_called_once_with("tmp/itk.pdf")
+
+    def test_bulk_delete_batches_delete_objects_and_maps_errors(self):
+        self.storage.bucket.delete_objects.side_effect = [
+            {"Errors": [{"Key": "media/tmp/0.pdf", "Code": "AccessDenied", "Message": "Access Denied"}]},
+            {},
+        ]
+        keys = [f"tmp/{index}.pdf" for index in range(OBJECT_DELETE_BATCH_SIZE + 5)]
+
+        failures = self.adapter.bulk_delete(keys)
+
+        self.assertEqual(self.storage.bucket.delete_objects.call_count, 2)
+        first_batch = self.storage.bucket.delete_objects.call_args_list[0].kwargs["Delete"]["Objects"]
+        self.assertEqual(len(first_batch), OBJECT_DELETE_BATCH_SIZE)
+        self.assertEqual(failures, {"tmp/0.pdf": "Access Denied"})
+        self.storage.delete.assert_not_called()
@@ -0,0 +1,159 @@
+"""Tests for the shared Prometheus metrics registry, its integrations and the /metrics endpoint."""
+
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core.telemetry.dramatiq_metrics import DramatiqMetricsMiddleware
+from core.telemetry.metrics import MetricsRegistry, metrics_registry
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+
+class _FakeRedisPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def hset(self, key, field, value):
+        self._commands.append(("hset", key, field, value))
+
+    def hincrbyfloat(self, key, field, amount):
+        self._commands.append(("hincrbyfloat", key, field, amount))
+
+    def execute(self):
+        if self._client.fail:
+            raise ConnectionError("redis down")
+        for command, key, field, value in self._commands:
+            bucket = self._client.hashes.setdefault(key, {})
+            if command == "hset":
+                bucket[field] = value
+            else:
+                bucket[field] = str(float(bucket.get(field, 0)) + value)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.fail = False
+
+    def pipeline(self, transaction=True):
+        return _FakeRedisPipeline(self)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_REDIS_ENABLED=False)
+class MetricsRegistryTests(SimpleTestCase):
+    def test_histogram_keeps_fixed_buckets_and_renders_cumulative_counts(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("job_seconds", "Job time.", ("actor",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, actor="ocr")
+
+        output = registry.render()
+
+        self.assertIn('job_seconds_bucket{actor="ocr",le="0.1"} 2', output)
+        self.assertIn('job_seconds_bucket{actor="ocr",le="1"} 3', output)
+        self.assertIn('job_seconds_bucket{actor="ocr",le="+Inf"} 4', output)
+        self.assertIn('job_seconds_count{actor="ocr"} 4', output)
+        self.assertIn('job_seconds_sum{actor="ocr"} 3.65', output)
+
+    def test_label_names_are_enforced(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events.", ("kind",))
+
+        with self.assertRaises(ValueError):
+            counter.inc(other="x")
+
+    @override_settings(METRICS_REDIS_ENABLED=True)
+    def test_processes_are_merged_through_redis_and_failed_flushes_are_retried(self):
+        fake_redis = _FakeRedis()
+        web, worker = MetricsRegistry(), MetricsRegistry()
+        for registry in (web, worker):
+            registry._client = fake_redis
+            # Pretend the flusher is already running for this process.
+            registry._pid = os.getpid()
+        web.counter("events_total", "Events.", ("kind",)).inc(kind="a")
+        worker.counter("events_total", "Events.", ("kind",)).inc(2, kind="a")
+
+        fake_redis.fail = True
+        self.assertFalse(worker.flush())
+        fake_redis.fail = False
+        self.assertTrue(worker.flush())
+
+        self.assertIn('events_total{kind="a"} 3', web.render())
+
+    @override_settings(METRICS_REDIS_ENABLED=True)
+    def test_gauges_ship_absolute_values_and_keep_newer_value_after_failed_flush(self):
+        fake_redis = _FakeRedis()
+        registry = MetricsRegistry()
+        registry._client = fake_redis
+        registry._pid = os.getpid()
+        depth = registry.gauge("queue_depth", "Queue depth.", ("queue",))
+        depth.set(5, queue="realtime")
+        self.assertTrue(registry.flush())
+
+        depth.set(0, queue="realtime")
+        fake_redis.fail = True
+        self.assertFalse(registry.flush())
+        depth.set(2, queue="default")
+        fake_redis.fail = False
+        self.assertTrue(registry.flush())
+
+        output = registry.render()
+        self.assertIn("# TYPE queue_depth gauge", output)
+        self.assertIn('queue_depth{queue="realtime"} 0', output)
+        self.assertIn('queue_depth{queue="default"} 2', output)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_REDIS_ENABLED=False, METRICS_AUTH_TOKEN="scrape-token")
+class PrometheusEndpointTests(TestCase):
+    def setUp(self):
+        metrics_registry.reset()
+
+    def test_requires_token_or_staff_session(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+
+        staff = get_user_model().objects.create_user(username="metrics-staff", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
+
+    def test_http_requests_are_labelled_by_resolved_url_name(self):
+        self.client.get(reverse("api-public-app-config"))
+
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-token")
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('http_requests_total{route="api-public-app-config",method="GET",status="200"} 1', body)
+        self.assertIn('http_request_db_queries_count{route="api-public-app-config"} 1', body)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_REDIS_ENABLED=False)
+class DramatiqMetricsMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        metrics_registry.reset()
+
+    def test_records_queue_wait_run_time_and_retries(self):
+        middleware = DramatiqMetricsMiddleware()
+        message = SimpleNamespace(
+            message_id="m-1",
+            queue_name="realtime",
+            actor_name="run_ocr",
+            message_timestamp=int((time.time() - 2) * 1000),
+            options={"retries": 1},
+        )
+
+        with patch("core.telemetry.dramatiq_metrics.dramatiq_message_queue_wait_seconds.observe") as wait_observe:
+            middleware.before_process_message(None, message)
+        middleware.after_process_message(None, message, exception=RuntimeError("boom"))
+
+        self.assertGreaterEqual(wait_observe.call_args.args[0], 2.0)
+        output = metrics_registry.render()
+        self.assertIn('dramatiq_message_retries_total{queue="realtime",actor="run_ocr"} 1', output)
+        self.assertIn('dramatiq_messages_total{queue="realtime",actor="run_ocr",outcome="failure"} 1', output)
+        self.assertIn('dramatiq_message_duration_seconds_count{queue="realtime",actor="run_ocr"} 1', output)
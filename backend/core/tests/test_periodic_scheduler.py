@@ -0,0 +1,139 @@
+"""Tests for precompiled crontab schedules and the watermark-based periodic scheduler."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from core.services.periodic_scheduler import PeriodicScheduler, jitter_delay_seconds, plan_fire_times
+from core.tasks.runtime import MISFIRE_ALL, MISFIRE_ONCE, MISFIRE_SKIP, PeriodicTaskEntry, crontab
+from django.test import SimpleTestCase
+
+
+class _HashOnlyRedis:
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.hset_calls = 0
+
+    def hgetall(self, key):
+        return {name.encode(): value.encode() for name, value in self.hashes.get(key, {}).items()}
+
+    def hset(self, key, mapping):
+        self.hset_calls += 1
+        self.hashes.setdefault(key, {}).update(mapping)
+
+
+def _entry(name="tests.job", schedule=None, *, misfire_policy=MISFIRE_ONCE, jitter_seconds=0.0):
+    return PeriodicTaskEntry(
+        name=name,
+        schedule=schedule or crontab(minute="*/15"),
+        task=MagicMock(),
+        misfire_policy=misfire_policy,
+        jitter_seconds=jitter_seconds,
+    )
+
+
+class CrontabScheduleTests(SimpleTestCase):
+    def test_next_fire_after_skips_to_matching_minute_hour_and_day(self):
+        self.assertEqual(
+            crontab(minute="*/15").next_fire_after(datetime(2026, 1, 1, 4, 46, 30)),
+            datetime(2026, 1, 1, 5, 0),
+        )
+        self.assertEqual(crontab(hour=4, minute=0).next_fire_after(datetime(2026, 1, 1, 4, 0)), datetime(2026, 1, 2, 4))
+        self.assertEqual(crontab(day=29, month=2).next_fire_after(datetime(2026, 3, 1)), datetime(2028, 2, 29))
+
+    def test_day_of_week_seven_means_sunday(self):
+        schedule = crontab(day_of_week="6-7", hour=0, minute=0)
+
+        self.assertTrue(schedule.is_due(datetime(2026, 10, 18)))  # Sunday
+        self.assertFalse(schedule.is_due(datetime(2026, 10, 19)))  # Monday
+
+    def test_impossible_schedule_never_fires(self):
+        self.assertIsNone(crontab(day=31, month=2).next_fire_after(datetime(2026, 1, 1)))
+
+
+class PlanFireTimesTests(SimpleTestCase):
+    now = datetime(2026, 1, 1, 4, 0)
+
+    def _plan(self, entry, last_fired, **kwargs):
+        options = {"catchup_seconds": 6 * 3600, "max_replays": 60, **kwargs}
+        return plan_fire_times(entry, last_fired=last_fired, now=self.now, **options)
+
+    def test_first_run_does_not_replay_history(self):
+        fires, watermark = self._plan(_entry(), None)
+
+        self.assertEqual(fires, [self.now])
+        self.assertEqual(watermark, self.now)
+
+    def test_misfire_policies_after_one_hour_outage(self):
+        last_fired = self.now - timedelta(hours=1)
+
+        self.assertEqual(self._plan(_entry(misfire_policy=MISFIRE_ONCE), last_fired)[0], [self.now])
+        self.assertEqual(
+            self._plan(_entry(misfire_policy=MISFIRE_ALL), last_fired)[0],
+            [self.now - timedelta(minutes=minutes) for minutes in (45, 30, 15, 0)],
+        )
+        fires, watermark = self._plan(_entry(misfire_policy=MISFIRE_SKIP), last_fired - timedelta(minutes=1))
+        self.assertEqual(fires, [self.now])
+        self.assertEqual(watermark, self.now)
+
+    def test_skip_policy_drops_stale_fire_times(self):
+        entry = _entry(schedule=crontab(hour=3, minute=0), misfire_policy=MISFIRE_SKIP)
+
+        fires, watermark = self._plan(entry, self.now - timedelta(days=1))
+
+        self.assertEqual(fires, [])
+        self.assertEqual(watermark, datetime(2026, 1, 1, 3, 0))
+
+    def test_catchup_window_and_replay_cap_bound_the_backlog(self):
+        fires, _ = self._plan(
+            _entry(misfire_policy=MISFIRE_ALL), self.now - timedelta(days=2), catchup_seconds=3600, max_replays=2
+        )
+
+        self.assertEqual(fires, [self.now - timedelta(minutes=15), self.now])
+
+
+class PeriodicSchedulerTests(SimpleTestCase):
+    def test_tick_replays_missed_runs_and_advances_watermark_once(self):
+        redis_client = _HashOnlyRedis()
+        scheduler = PeriodicScheduler(redis_client, watermark_key="wm", catchup_seconds=3600, max_replays=10)
+        entry = _entry(misfire_policy=MISFIRE_ALL)
+        redis_client.hashes["wm"] = {entry.name: (datetime(2026, 1, 1, 3, 30)).isoformat()}
+
+        next_fire_at = scheduler.tick(datetime(2026, 1, 1, 4, 0, 5), entries=[entry])
+
+        self.assertEqual(entry.task.delay.call_count, 2)
+        self.assertEqual(redis_client.hashes["wm"][entry.name], datetime(2026, 1, 1, 4, 0).isoformat())
+        self.assertEqual(next_fire_at, datetime(2026, 1, 1, 4, 15))
+
+        scheduler.tick(datetime(2026, 1, 1, 4, 0, 30), entries=[entry])
+
+        self.assertEqual(entry.task.delay.call_count, 2)
+        self.assertEqual(redis_client.hset_calls, 1)
+
+    def test_failed_dispatch_keeps_watermark_for_retry(self):
+        redis_client = _HashOnlyRedis()
+        scheduler = PeriodicScheduler(redis_client, watermark_key="wm")
+        entry = _entry()
+        redis_client.hashes["wm"] = {entry.name: datetime(2026, 1, 1, 3, 45).isoformat()}
+        entry.task.delay.side_effect = ConnectionError("broker down")
+
+        scheduler.tick(datetime(2026, 1, 1, 4, 0), entries=[entry])
+
+        self.assertEqual(redis_client.hashes["wm"][entry.name], datetime(2026, 1, 1, 3, 45).isoformat())
+
+    def test_heavy_jobs_are_spread_with_deterministic_jitter(self):
+        redis_client = _HashOnlyRedis()
+        scheduler = PeriodicScheduler(redis_client, watermark_key="wm")
+        daily = crontab(hour=4, minute=0)
+        entries = [_entry(name, daily, jitter_seconds=300) for name in ("core.backup", "core.prune", "core.cleanup")]
+
+        scheduler.tick(datetime(2026, 1, 1, 4, 0), entries=entries)
+
+        delays = []
+        for entry in entries:
+            entry.task.delay.assert_not_called()
+            delay = entry.task.schedule.call_args.kwargs["delay"].total_seconds()
+            self.assertGreaterEqual(delay, 0)
+            self.assertLess(delay, 300)
+            self.assertEqual(delay, jitter_delay_seconds(entry, datetime(2026, 1, 1, 4, 0)))
+            delays.append(delay)
+        self.assertEqual(len(set(delays)), 3)
@@ -0,0 +1,131 @@
+"""Tests for the two-tier reference catalog cache."""
+
+from datetime import date, datetime
+from unittest.mock import patch
+
+from core.models import Holiday
+from core.services.reference_catalog_cache import (
+    DOCUMENT_TYPES,
+    HOLIDAYS,
+    ReferenceCatalog,
+    ReferenceCatalogCache,
+    get_document_types,
+    get_stay_permit_document_type_names,
+    is_holiday,
+    reference_catalog_cache,
+)
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from products.models import DocumentType
+
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "reference-catalog-cache-tests",
+    },
+    "select2": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "reference-catalog-cache-tests-select2",
+    },
+}
+
+
+@override_settings(TESTING=False, CACHES=LOC_MEM_CACHES, REFERENCE_CATALOG_PUBSUB_ENABLED=False)
+class ReferenceCatalogCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+        reference_catalog_cache.reset_stats()
+
+    def tearDown(self):
+        cache.clear()
+        reference_catalog_cache.clear_local()
+
+    def test_second_read_is_served_from_l1_without_queries(self):
+        DocumentType.objects.create(name="ITAS", is_stay_permit=True)
+        DocumentType.objects.create(name="Passport")
+
+        with self.assertNumQueries(1):
+            first = get_document_types()
+        with self.assertNumQueries(0):
+            second = get_document_types()
+
+        self.assertIs(first, second)
+        self.assertEqual(get_stay_permit_document_type_names(), frozenset({"ITAS"}))
+        stats = reference_catalog_cache.stats()["catalogs"][DOCUMENT_TYPES.name]
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreaterEqual(stats["l1_hits"], 2)
+
+    def test_l1_miss_falls_back_to_shared_l2_before_database(self):
+        DocumentType.objects.create(name="KITAS", is_stay_permit=True)
+        get_document_types()
+        reference_catalog_cache.clear_local()
+
+        with self.assertNumQueries(0):
+            rows = get_document_types()
+
+        self.assertEqual([row["name"] for row in rows], ["KITAS"])
+        self.assertEqual(reference_catalog_cache.stats()["catalogs"][DOCUMENT_TYPES.name]["l2_hits"], 1)
+
+    def test_model_save_invalidates_catalog_and_bumps_version(self):
+        get_document_types()
+        with self.captureOnCommitCallbacks(execute=True):
+            DocumentType.objects.create(name="Sponsor Letter")
+
+        names = [row["name"] for row in get_document_types()]
+
+        self.assertIn("Sponsor Letter", names)
+        self.assertEqual(reference_catalog_cache.stats()["catalogs"][DOCUMENT_TYPES.name]["version"], 1)
+
+    def test_invalidation_message_only_evicts_older_versions(self):
+        get_document_types()
+
+        reference_catalog_cache.handle_invalidation_message(b"document_types:0")
+        self.assertTrue(reference_catalog_cache.stats()["catalogs"][DOCUMENT_TYPES.name]["cached"])
+
+        reference_catalog_cache.handle_invalidation_message(b"document_types:3")
+        self.assertFalse(reference_catalog_cache.stats()["catalogs"][DOCUMENT_TYPES.name]["cached"])
+
+    def test_holiday_lookup_uses_catalog(self):
+        Holiday.objects.create(name="Nyepi", date=date(2026, 3, 19), country="ID")
+
+        self.assertTrue(is_holiday(date(2026, 3, 19), "ID"))
+        with self.assertNumQueries(0):
+            self.assertFalse(is_holiday(date(2026, 3, 18), "ID"))
+            self.assertTrue(is_holiday(date(2026, 3, 21), "ID"))
+        self.assertTrue(reference_catalog_cache.stats()["catalogs"][HOLIDAYS.name]["cached"])
+
+    def test_holiday_lookup_accepts_datetimes(self):
+        Holiday.objects.create(name="Nyepi", date=date(2026, 3, 19), country="ID")
+
+        self.assertTrue(is_holiday(datetime(2026, 3, 19, 9, 30), "ID"))
+        self.assertFalse(is_holiday(datetime(2026, 3, 18, 9, 30), "ID"))
+
+
+@override_settings(TESTING=False, CACHES=LOC_MEM_CACHES, REFERENCE_CATALOG_PUBSUB_ENABLED=False)
+class ReferenceCatalogBudgetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_least_recently_used_catalog_is_evicted_over_budget(self):
+        registry = ReferenceCatalogCache()
+        registry.register(ReferenceCatalog(name="alpha", loader=lambda: "a" * 600, model_labels=("tests.alpha",)))
+        registry.register(ReferenceCatalog(name="beta", loader=lambda: "b" * 600, model_labels=("tests.beta",)))
+
+        with override_settings(REFERENCE_CATALOG_L1_MAX_BYTES=1000):
+            registry.get("alpha")
+            registry.get("beta")
+
+        stats = registry.stats()["catalogs"]
+        self.assertFalse(stats["alpha"]["cached"])
+        self.assertEqual(stats["alpha"]["evictions"], 1)
+        self.assertTrue(stats["beta"]["cached"])
+
+    def test_cache_is_bypassed_while_testing(self):
+        registry = ReferenceCatalogCache()
+        registry.register(ReferenceCatalog(name="gamma", loader=lambda: object(), model_labels=("tests.gamma",)))
+
+        with override_settings(TESTING=True), patch.object(registry, "_store_l1") as store_l1:
+            self.assertIsNot(registry.get("gamma"), registry.get("gamma"))
+
+        store_l1.assert_not_called()
@@ -0,0 +1,99 @@
+"""Tests for transaction-coalesced sync change capture and change-log compaction."""
+
+import datetime
+from datetime import timedelta
+
+from core.models.holiday import Holiday
+from core.models.local_resilience import SyncChangeLog, SyncCursor
+from core.services.sync_service import change_log_stats, compact_change_log, compaction_watermark, record_peer_ack
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+
+def _holiday_rows():
+    return SyncChangeLog.objects.filter(model_label="core.holiday").order_by("seq")
+
+
+class TransactionCoalescedCaptureTests(TestCase):
+    def test_repeated_saves_in_one_transaction_write_one_row_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday = Holiday.objects.create(name="Nyepi", date=datetime.date(2026, 3, 19))
+            for suffix in ("I", "II", "III", "IV"):
+                holiday.name = f"Nyepi {suffix}"
+                holiday.save()
+            self.assertFalse(_holiday_rows().exists())
+
+        rows = list(_holiday_rows())
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].operation, SyncChangeLog.OP_UPSERT)
+        self.assertEqual(rows[0].payload["name"], "Nyepi IV")
+
+    def test_rolled_back_savepoint_is_not_captured(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            kept = Holiday.objects.create(name="Galungan", date=datetime.date(2026, 4, 15))
+            try:
+                with transaction.atomic():
+                    Holiday.objects.create(name="Rolled back", date=datetime.date(2026, 4, 16))
+                    raise RuntimeError("abort savepoint")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(list(_holiday_rows().values_list("object_pk", flat=True)), [str(kept.pk)])
+
+    def test_create_then_delete_in_one_transaction_writes_only_the_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            holiday = Holiday.objects.create(name="Kuningan", date=datetime.date(2026, 4, 25))
+            holiday_pk = holiday.pk
+            holiday.delete()
+
+        rows = list(_holiday_rows())
+        self.assertEqual([(row.object_pk, row.operation) for row in rows], [(str(holiday_pk), SyncChangeLog.OP_DELETE)])
+
+
+class ChangeLogCompactionTests(TestCase):
+    def _log(self, object_pk, name):
+        return SyncChangeLog.objects.create(
+            source_node="node-a",
+            model_label="core.holiday",
+            object_pk=str(object_pk),
+            operation=SyncChangeLog.OP_UPSERT,
+            payload={"id": object_pk, "name": name},
+        )
+
+    def test_superseded_upserts_below_min_peer_ack_are_collapsed(self):
+        first = self._log(1, "v1")
+        second = self._log(1, "v2")
+        other = self._log(2, "only")
+        third = self._log(1, "v3")
+        tail = self._log(1, "v4")
+        record_peer_ack("desktop-1", third.seq)
+        record_peer_ack("desktop-2", tail.seq)
+
+        self.assertEqual(compaction_watermark(), third.seq)
+        result = compact_change_log()
+
+        self.assertEqual(result, {"deleted": 2, "watermark": third.seq})
+        remaining = set(SyncChangeLog.objects.values_list("seq", flat=True))
+        self.assertEqual(remaining, {other.seq, third.seq, tail.seq})
+        self.assertNotIn(first.seq, remaining)
+        self.assertNotIn(second.seq, remaining)
+
+    def test_no_known_peer_means_no_compaction(self):
+        self._log(1, "v1")
+        self._log(1, "v2")
+
+        self.assertEqual(compact_change_log(), {"deleted": 0, "watermark": 0})
+        self.assertEqual(SyncChangeLog.objects.count(), 2)
+
+    def test_stale_peers_do_not_pin_the_watermark(self):
+        self._log(1, "v1")
+        latest = self._log(1, "v2")
+        record_peer_ack("desktop-1", latest.seq)
+        record_peer_ack("abandoned", 0)
+        SyncCursor.objects.filter(node_id="abandoned").update(updated_at=timezone.now() - timedelta(days=90))
+
+        self.assertEqual(compact_change_log()["deleted"], 1)
+        stats = change_log_stats()
+        self.assertEqual(stats["rows"], 1)
+        self.assertEqual(stats["peerLag"]["desktop-1"], 0)
@@ -3,8 +3,15 @@
 from unittest.mock import patch
 
 import dramatiq
-from core.tasks.runtime import QUEUE_DOC_CONVERSION, QUEUE_REALTIME, db_task, retry_on_transient_external_failure
-from django.test import SimpleTestCase
+from core.tasks.runtime import (
+    QUEUE_DEFAULT,
+    QUEUE_DOC_CONVERSION,
+    QUEUE_REALTIME,
+    actor_concurrency_limit,
+    db_task,
+    retry_on_transient_external_failure,
+)
+from django.test import SimpleTestCase, override_settings
 
 
 class TaskRuntimePolicyTests(SimpleTestCase):
@@ -60,3 +67,31 @@ class TaskRuntimePolicyTests(SimpleTestCase):
 
         with self.assertRaises(ValueError):
             invalid_task.actor.fn()
+
+    def test_realtime_actors_outrank_default_actors_in_shared_workers(self):
+        @db_task(queue=QUEUE_REALTIME)
+        def realtime_task() -> None:
+            return None
+
+        @db_task(queue=QUEUE_DEFAULT)
+        def default_task() -> None:
+            return None
+
+        @db_task(queue=QUEUE_DEFAULT, priority=-5)
+        def urgent_default_task() -> None:
+            return None
+
+        self.assertLess(realtime_task.actor.priority, default_task.actor.priority)
+        self.assertEqual(urgent_default_task.actor.priority, -5)
+
+    def test_max_concurrency_is_declared_on_the_task_and_overridable_in_settings(self):
+        @db_task(name="tests.limited_task", max_concurrency=3)
+        def limited_task() -> None:
+            return None
+
+        self.assertEqual(actor_concurrency_limit("tests.limited_task"), 3)
+        self.assertIsNone(actor_concurrency_limit("tests.unknown_task"))
+        with override_settings(DRAMATIQ_ACTOR_CONCURRENCY_LIMITS={"tests.limited_task": 1}):
+            self.assertEqual(actor_concurrency_limit("tests.limited_task"), 1)
+        with override_settings(DRAMATIQ_ACTOR_CONCURRENCY_LIMITS={"tests.limited_task": 0}):
+            self.assertIsNone(actor_concurrency_limit("tests.limited_task"))
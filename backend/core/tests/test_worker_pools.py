@@ -0,0 +1,231 @@
+"""Tests for queue-isolated worker pools, their scaling policy, supervision and per-actor admission control."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from core.management.commands.run_dramatiq_pools import Command, PoolProcess
+from core.middleware.dramatiq_admission import ADMISSION_DEFERRALS_OPTION, ActorConcurrencyMiddleware
+from core.services.worker_pools import (
+    DEFAULT_WORKER_POOLS,
+    PoolScaler,
+    QueueStats,
+    WorkerPool,
+    parse_worker_pools,
+    queue_concurrency_bounds,
+    read_queue_stats,
+)
+from core.tasks.runtime import QUEUE_REALTIME
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from dramatiq.middleware import SkipMessage
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._commands = []
+
+    def llen(self, key):
+        self._commands.append(len(self._client.lists.get(key, [])))
+
+    def lindex(self, key, index):
+        items = self._client.lists.get(key, [])
+        self._commands.append(items[index] if items else None)
+
+    def hget(self, key, field):
+        self._commands.append(self._client.hashes.get(key, {}).get(field))
+
+    def execute(self):
+        return self._commands
+
+
+class _FakeBrokerRedis:
+    def __init__(self):
+        self.lists = {}
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class WorkerPoolLayoutTests(SimpleTestCase):
+    def test_default_layout_isolates_realtime_from_default(self):
+        pools = parse_worker_pools(DEFAULT_WORKER_POOLS)
+
+        realtime_pools = [pool for pool in pools if QUEUE_REALTIME in pool.queues]
+        self.assertEqual([pool.queues for pool in realtime_pools], [(QUEUE_REALTIME,)])
+        self.assertEqual(queue_concurrency_bounds(pools)[QUEUE_REALTIME], (4, 12))
+
+    def test_invalid_entries_are_rejected(self):
+        for spec in ("realtime=realtime:4:1", "realtime=:4:1:1", "a=realtime:1:2:1", "a=low:1:1:1,a=low:1:1:1"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                parse_worker_pools(spec)
+
+    def test_queue_stats_report_depth_and_head_age(self):
+        redis_client = _FakeBrokerRedis()
+        redis_client.lists["ns:realtime"] = [b"r-1", b"r-2"]
+        redis_client.hashes["ns:realtime.msgs"] = {
+            b"r-1": json.dumps({"message_timestamp": 90_000, "options": {}}).encode(),
+        }
+
+        stats = read_queue_stats(redis_client, ["realtime", "default"], namespace="ns", now=100.0)
+
+        self.assertEqual(stats["realtime"], QueueStats(queue="realtime", depth=2, oldest_age_seconds=10.0))
+        self.assertEqual(stats["default"], QueueStats(queue="default", depth=0, oldest_age_seconds=0.0))
+
+
+class PoolScalerTests(SimpleTestCase):
+    pool = WorkerPool(name="realtime", queues=("realtime",), threads=4, min_processes=1, max_processes=3)
+
+    def _stats(self, *, depth=0, age=0.0):
+        return {"realtime": QueueStats(queue="realtime", depth=depth, oldest_age_seconds=age)}
+
+    def test_scales_up_one_step_per_decision_up_to_the_ceiling(self):
+        scaler = PoolScaler(target_wait_seconds=5)
+
+        self.assertEqual(scaler.desired_processes(self.pool, 1, self._stats(age=8), now=0), 2)
+        self.assertEqual(scaler.desired_processes(self.pool, 2, self._stats(depth=50), now=5), 3)
+        self.assertEqual(scaler.desired_processes(self.pool, 3, self._stats(depth=50), now=10), 3)
+
+    def test_scales_down_only_after_a_calm_cooldown(self):
+        scaler = PoolScaler(target_wait_seconds=5, scale_down_cooldown_seconds=60)
+        scaler.desired_processes(self.pool, 1, self._stats(age=8), now=0)
+
+        self.assertEqual(scaler.desired_processes(self.pool, 2, self._stats(), now=30), 2)
+        self.assertEqual(scaler.desired_processes(self.pool, 2, self._stats(), now=61), 1)
+        self.assertEqual(scaler.desired_processes(self.pool, 1, self._stats(), now=200), 1)
+
+
+@override_settings(METRICS_ENABLED=False)
+class ActorConcurrencyMiddlewareTests(SimpleTestCase):
+    def _message(self, **options):
+        message = MagicMock()
+        message.actor_name = "tests.limited"
+        message.queue_name = QUEUE_REALTIME
+        message.message_id = "m-1"
+        message.options = {"retries": 1, "redis_message_id": "r-1", **options}
+        return message
+
+    @patch("core.middleware.dramatiq_admission.actor_concurrency_limit", return_value=2)
+    def test_message_over_the_limit_is_deferred_without_consuming_a_retry(self, _limit):
+        middleware = ActorConcurrencyMiddleware()
+        broker = MagicMock()
+        message = self._message(**{ADMISSION_DEFERRALS_OPTION: 1})
+
+        with patch("core.middleware.dramatiq_admission.DistributedSemaphore.acquire", return_value=None):
+            with self.assertRaises(SkipMessage):
+                middleware.before_process_message(broker, message)
+
+        message.copy.assert_called_once_with(options={ADMISSION_DEFERRALS_OPTION: 2})
+        self.assertGreater(broker.enqueue.call_args.kwargs["delay"], 0)
+        self.assertEqual(message.options["retries"], 1)
+
+    @patch("core.middleware.dramatiq_admission.actor_concurrency_limit", return_value=2)
+    def test_admitted_message_releases_its_lease_when_done(self, _limit):
+        middleware = ActorConcurrencyMiddleware()
+        message = self._message()
+
+        with (
+            patch("core.middleware.dramatiq_admission.DistributedSemaphore.acquire", return_value="lease-1"),
+            patch("core.middleware.dramatiq_admission.DistributedSemaphore.release") as release,
+        ):
+            middleware.before_process_message(MagicMock(), message)
+            middleware.after_process_message(MagicMock(), message, result=None)
+            middleware.after_skip_message(MagicMock(), message)
+
+        release.assert_called_once_with("lease-1")
+
+
+class _FakeProcess:
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.exit_code = None
+
+    def poll(self):
+        return self.exit_code
+
+    def terminate(self):
+        self.exit_code = -15
+
+
+@override_settings(
+    DRAMATIQ_POOL_RESPAWN_BACKOFF_SECONDS=1,
+    DRAMATIQ_POOL_RESPAWN_BACKOFF_MAX_SECONDS=60,
+    DRAMATIQ_POOL_MAX_CONSECUTIVE_CRASHES=3,
+)
+class PoolSupervisorTests(SimpleTestCase):
+    pool = WorkerPool(name="realtime", queues=("realtime",), threads=4, min_processes=1, max_processes=3)
+
+    def setUp(self):
+        self.command = Command()
+        self.command._init_supervision([self.pool])
+        self.clock = 0.0
+        self.spawned: list[PoolProcess] = []
+
+        def spawn(pool):
+            member = PoolProcess(pool=pool, process=_FakeProcess(pid=len(self.spawned) + 1), started_at=self.clock)
+            self.spawned.append(member)
+            return member
+
+        patcher = patch.object(self.command, "_spawn", side_effect=spawn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.running = {self.pool.name: []}
+
+    def _tick(self, now: float, desired: int = 1) -> bool:
+        self.clock = now
+        self.command._reap(self.running, now=now)
+        self.command._resize(self.pool, self.running[self.pool.name], desired, now=now)
+        return self.command._floors_alive([self.pool], self.running)
+
+    def _crash_latest(self) -> None:
+        self.spawned[-1].process.exit_code = 1
+
+    def test_crashed_worker_is_respawned_after_exponential_backoff(self):
+        self.assertTrue(self._tick(0))
+
+        self._crash_latest()
+        self.assertFalse(self._tick(5))
+        self.assertFalse(self._tick(5.9))
+        self.assertTrue(self._tick(6))
+
+        self._crash_latest()
+        self.assertFalse(self._tick(7))
+        self.assertFalse(self._tick(8.9))
+        self.assertTrue(self._tick(9))
+        self.assertEqual(len(self.spawned), 3)
+
+    def test_supervisor_gives_up_after_consecutive_crashes(self):
+        self._tick(0)
+        self._crash_latest()
+        self._tick(1)
+        self._tick(2)
+        self._crash_latest()
+        self._tick(3)
+        self._tick(5)
+        self.assertEqual(len(self.spawned), 3)
+
+        self._crash_latest()
+        with self.assertRaises(CommandError):
+            self._tick(6)
+
+    def test_crash_after_a_stable_run_starts_a_new_crash_count(self):
+        self._tick(0)
+        self._crash_latest()
+        self._tick(1)
+        self._tick(2)
+
+        self._crash_latest()
+        self._tick(500)
+
+        self.assertEqual(self.command._consecutive_crashes[self.pool.name], 1)
+        self.assertTrue(self._tick(501))
+
+    def test_scaled_down_workers_are_not_counted_as_crashes(self):
+        self._tick(0, desired=3)
+        self._tick(1, desired=1)
+        self._tick(2, desired=1)
+
+        self.assertEqual(self.command._consecutive_crashes[self.pool.name], 0)
+        self.assertEqual(len(self.running[self.pool.name]), 1)
+        self.assertEqual(self.command._retiring, [])
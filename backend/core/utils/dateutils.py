@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from core.models.holiday import Holiday
+from core.services.reference_catalog_cache import is_holiday as is_catalog_holiday
 from django.utils import timezone
 
 
@@ -52,7 +52,7 @@ def calculate_due_date(start_date, days_to_complete, business_days_only=False, c
 
     while added_days < days_to_complete:
         due_date = due_date + timezone.timedelta(days=1)
-        is_holiday = Holiday.objects.is_holiday(due_date, country)
+        is_holiday = is_catalog_holiday(due_date, country)
         if not business_days_only or not is_holiday:
             added_days += 1
 
@@ -10,6 +10,7 @@ from typing import List, Optional, Tuple
 
 import numpy as np
 import pytesseract
+from core.services.image_analysis_context import ImageAnalysisContext
 from core.services.logger_service import Logger
 from core.utils.check_country import check_country_by_code
 from core.utils.imgutils import convert_and_resize_image
@@ -107,7 +108,8 @@ def _extract_mrz_data_from_file_path(
     # image_path: if converted_file_name exists, use it, otherwise use file_path
     image_path = converted_file_name if converted_file_name != "" and os.path.exists(converted_file_name) else file_path
 
-    quality_info = _assess_image_quality(image_path)
+    image_context = _load_image_context(image_path)
+    quality_info = _assess_image_quality(image_path, context=image_context)
     if quality_info:
         logger.debug(
             "Passport image quality - width: %s height: %s contrast: %.2f brightness: %.2f",
@@ -139,7 +141,7 @@ def _extract_mrz_data_from_file_path(
         return parsed_mrz
 
     try:
-        preprocessed_variants, temp_variants = _build_preprocessed_variants(image_path)
+        preprocessed_variants, temp_variants = _build_preprocessed_variants(image_path, context=image_context)
         try:
             parsed_mrz = _run_mrz_pipeline(preprocessed_variants, logger)
         finally:
@@ -574,18 +576,31 @@ def _run_mrz_pipeline(candidate_images: List[Tuple[str, str]], logger: logging.L
     )
 
 
-def _build_preprocessed_variants(image_path: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+def _load_image_context(image_path: str) -> Optional[ImageAnalysisContext]:
+    """Decoded image shared by the quality probe and the preprocessing variants of this OCR run."""
+    try:
+        with open(image_path, "rb") as handle:
+            return ImageAnalysisContext(handle.read())
+    except OSError:
+        return None
+
+
+def _build_preprocessed_variants(
+    image_path: str, context: Optional[ImageAnalysisContext] = None
+) -> Tuple[List[Tuple[str, str]], List[str]]:
     """Create additional preprocessed images to increase OCR robustness."""
 
     candidate_images: List[Tuple[str, str]] = [("original", image_path)]
     temp_files: List[str] = []
 
-    try:
-        with Image.open(image_path) as original_image:
-            working_image = original_image.convert("RGB")
-            working_image.load()
-    except Exception:
-        return candidate_images, temp_files
+    working_image = context.rgb_image() if context is not None else None
+    if working_image is None:
+        try:
+            with Image.open(image_path) as original_image:
+                working_image = original_image.convert("RGB")
+                working_image.load()
+        except Exception:
+            return candidate_images, temp_files
 
     variant_specs = [
         ("deskewed", _deskew_image(working_image)),
@@ -666,7 +681,12 @@ def _apply_sharpen(image: Image.Image) -> Image.Image:
     return image.convert("L").filter(ImageFilter.UnsharpMask(radius=2, percent=175, threshold=3))
 
 
-def _assess_image_quality(image_path: str):
+def _assess_image_quality(image_path: str, context: Optional[ImageAnalysisContext] = None):
+    if context is not None and context.gray is not None:
+        width, height = context.original_size
+        stats = context.intensity_stats
+        return {"width": width, "height": height, "brightness": stats["mean"], "contrast": stats["std"]}
+
     try:
         with Image.open(image_path) as img:
             gray = img.convert("L")
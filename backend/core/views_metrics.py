@@ -0,0 +1,42 @@
+"""
+FILE_ROLE: Serves the Prometheus scrape endpoint for the shared metrics registry.
+
+KEY_COMPONENTS:
+- prometheus_metrics: Renders HTTP, Dramatiq, Redis, AI provider and cacheops metrics in Prometheus text format.
+
+INTERACTIONS:
+- Depends on: core.telemetry.metrics.metrics_registry, django.conf.settings.
+- Consumed by: Prometheus (bearer token) and staff users inspecting metrics from a browser session.
+
+AI_GUIDELINES:
+- Keep this endpoint plain Django, outside DRF and the /api/ prefix, so scrapers get text/plain without
+  content negotiation.
+- Never expose metrics anonymously; require METRICS_AUTH_TOKEN or a staff session.
+"""
+
+from core.telemetry.metrics import metrics_registry
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _is_authorized(request) -> bool:
+    token = str(getattr(settings, "METRICS_AUTH_TOKEN", "") or "")
+    authorization = request.headers.get("Authorization", "")
+    if token and constant_time_compare(authorization, f"Bearer {token}"):
+        return True
+    user = getattr(request, "user", None)
+    return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+@require_GET
+def prometheus_metrics(request):
+    """Return the cluster-wide metrics exposition (merged across processes through Redis)."""
+    if not bool(getattr(settings, "METRICS_ENABLED", True)):
+        raise Http404("Metrics are disabled.")
+    if not _is_authorized(request):
+        return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+    return HttpResponse(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
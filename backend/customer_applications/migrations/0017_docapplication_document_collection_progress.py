@@ -0,0 +1,74 @@
+"""Denormalize document-collection progress and the current workflow pointer on DocApplication."""
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_document_collection_progress(apps, schema_editor):
+    DocApplication = apps.get_model("customer_applications", "DocApplication")
+    Document = apps.get_model("customer_applications", "Document")
+    DocWorkflow = apps.get_model("customer_applications", "DocWorkflow")
+
+    required_documents = (
+        Document.objects.filter(doc_application=OuterRef("pk"), required=True).order_by().values("doc_application")
+    )
+    current_workflow = (
+        DocWorkflow.objects.filter(doc_application=OuterRef("pk")).order_by("-task__step", "-created_at", "-id")
+    )
+    DocApplication.objects.update(
+        required_documents_total=Coalesce(
+            Subquery(required_documents.annotate(count=Count("id")).values("count")), Value(0)
+        ),
+        required_documents_completed=Coalesce(
+            Subquery(required_documents.filter(completed=True).annotate(count=Count("id")).values("count")),
+            Value(0),
+        ),
+        current_workflow_pointer_id=Subquery(current_workflow.values("id")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customer_applications", "0016_document_thumbnail"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="docapplication",
+            name="required_documents_total",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="docapplication",
+            name="required_documents_completed",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="docapplication",
+            name="current_workflow_pointer",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="customer_applications.docworkflow",
+            ),
+        ),
+        migrations.RunPython(backfill_document_collection_progress, reverse_code=migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="docapplication",
+            name="document_collection_completed",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=models.Case(
+                    models.When(required_documents_completed__gte=F("required_documents_total"), then=Value(True)),
+                    default=Value(False),
+                ),
+                output_field=models.BooleanField(),
+            ),
+        ),
+    ]
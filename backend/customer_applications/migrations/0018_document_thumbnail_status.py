@@ -0,0 +1,35 @@
+"""Track background thumbnail generation state and the source hash used for deduplication."""
+
+from django.db import migrations, models
+
+
+def mark_existing_thumbnails_ready(apps, schema_editor):
+    Document = apps.get_model("customer_applications", "Document")
+    Document.objects.exclude(thumbnail="").update(thumbnail_status="ready")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customer_applications", "0017_docapplication_document_collection_progress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="thumbnail_status",
+            field=models.CharField(
+                blank=True,
+                choices=[("", "None"), ("pending", "Pending"), ("ready", "Ready"), ("failed", "Failed")],
+                db_index=True,
+                default="",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="thumbnail_source_hash",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64),
+        ),
+        migrations.RunPython(mark_existing_thumbnails_ready, migrations.RunPython.noop),
+    ]
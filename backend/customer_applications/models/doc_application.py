@@ -20,7 +20,7 @@ from core.utils.dateutils import calculate_due_date
 from customers.models import Customer
 from django.conf import settings
 from django.db import models, transaction
-from django.db.models import Count, F, Q
+from django.db.models import F
 from django.db.models.signals import post_delete, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
@@ -58,17 +58,9 @@ class DocApplicationQuerySet(models.QuerySet):
         )
 
     def filter_by_document_collection_completed(self):
-        # First, we annotate each DocApplication with the count of required documents
-        # and the count of required, completed documents
-        doc_applications_with_counts = self.annotate(
-            total_required_documents=Count("documents", filter=Q(documents__required=True)),
-            completed_required_documents=Count(
-                "documents", filter=Q(documents__required=True, documents__completed=True)
-            ),
-        )
-
-        # Then, we filter to only include DocApplications where the counts are equal
-        return doc_applications_with_counts.filter(total_required_documents=F("completed_required_documents"))
+        # Served by the indexed, database-generated flag derived from the denormalized counters
+        # maintained by DocumentCollectionProgressService.
+        return self.filter(document_collection_completed=True)
 
     def exclude_already_invoiced(self, current_invoice_to_include=None):
         """
@@ -120,6 +112,12 @@ class DocApplication(models.Model):
         (STATUS_REJECTED, "Rejected"),
     ]
 
+    DENORMALIZED_PROGRESS_FIELDS = (
+        "required_documents_total",
+        "required_documents_completed",
+        "current_workflow_pointer",
+    )
+
     NOTIFY_CHANNEL_EMAIL = "email"
     NOTIFY_CHANNEL_WHATSAPP = "whatsapp"
     NOTIFY_CHANNEL_CHOICES = [
@@ -141,6 +139,25 @@ class DocApplication(models.Model):
         null=True,
     )
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    # Denormalized document-collection progress, maintained by DocumentCollectionProgressService.
+    required_documents_total = models.IntegerField(default=0)
+    required_documents_completed = models.IntegerField(default=0)
+    document_collection_completed = models.GeneratedField(
+        expression=models.Case(
+            models.When(required_documents_completed__gte=F("required_documents_total"), then=models.Value(True)),
+            default=models.Value(False),
+        ),
+        output_field=models.BooleanField(),
+        db_persist=True,
+        db_index=True,
+    )
+    current_workflow_pointer = models.ForeignKey(
+        "customer_applications.DocWorkflow",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
     notes = models.TextField(blank=True, null=True)  # Person-specific details from invoice import
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
@@ -236,9 +253,9 @@ class DocApplication(models.Model):
             completed_documents = [document for document in required_documents if document.completed]
             return len(required_documents) == len(completed_documents)
 
-        return (
-            self.documents.filter(required=True).count() == self.documents.filter(completed=True, required=True).count()
-        )
+        if not self.pk:
+            return True
+        return self.required_documents_completed >= self.required_documents_total
 
     @property
     def all_workflow_completed(self):
@@ -255,6 +272,8 @@ class DocApplication(models.Model):
         has_prefetch, prefetched = self._get_current_workflow_from_prefetch()
         if has_prefetch:
             return prefetched
+        if self.current_workflow_pointer_id:
+            return self.current_workflow_pointer
         return self.workflows.order_by("-task__step", "-created_at", "-id").first()
 
     @property
@@ -374,6 +393,21 @@ class DocApplication(models.Model):
             skip_status_calculation: If True, skip automatic status calculation.
                                    Useful when status is set explicitly (e.g., from invoice payment or re-open).
         """
+        self.apply_save_defaults(skip_status_calculation=skip_status_calculation)
+
+        # Denormalized counters/pointers are only written through atomic updates; never overwrite
+        # them with (possibly stale) in-memory values on a regular save.
+        if self.pk and not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = self._regular_save_fields()
+
+        super().save(*args, **kwargs)
+
+    def apply_save_defaults(self, *, skip_status_calculation=False) -> None:
+        """
+        Derive due date and status exactly as ``save()`` does.
+
+        Also called on unsaved instances before ``bulk_create`` so bulk-inserted rows match regular saves.
+        """
         self.updated_at = timezone.now()
         if not self.has_configured_tasks:
             self.due_date = None
@@ -387,12 +421,28 @@ class DocApplication(models.Model):
             # For brand-new applications, auto-complete only for truly taskless/documentless products.
             elif not self.has_configured_documents and not self.has_configured_tasks:
                 self.status = self.STATUS_COMPLETED
-        super().save(*args, **kwargs)
+
+    def _regular_save_fields(self) -> list[str]:
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if not field.primary_key
+            and not getattr(field, "generated", False)
+            and field.name not in self.DENORMALIZED_PROGRESS_FIELDS
+        ]
+
+    def refresh_document_collection_progress(self) -> None:
+        """Reload the denormalized progress columns without touching the rest of the instance."""
+        if not self.pk:
+            return
+        self.refresh_from_db(fields=[*self.DENORMALIZED_PROGRESS_FIELDS, "document_collection_completed"])
 
     def _get_application_status(self):
         """
         Gets the application status based on the workflows and documents.
         """
+        if getattr(self, "total_required_documents", None) is None and self._get_prefetched_list("documents") is None:
+            self.refresh_document_collection_progress()
         if self.workflows.filter(status=self.STATUS_REJECTED).exists():
             return self.STATUS_REJECTED
 
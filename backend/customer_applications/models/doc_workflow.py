@@ -13,9 +13,12 @@ AI_GUIDELINES:
 """
 
 from core.utils.dateutils import calculate_due_date
+from customer_applications.services.document_collection_progress_service import DocumentCollectionProgressService
 from django.conf import settings
 from django.db import models
 from django.db.models import Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from products.models import Task
 
@@ -157,3 +160,25 @@ class DocWorkflow(models.Model):
             self.completion_date = None
 
         super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=DocWorkflow, dispatch_uid="doc_workflow_current_pointer_post_save")
+def refresh_current_workflow_pointer_on_save(sender, instance, created, **kwargs):
+    # Ordering only depends on (task step, created_at, id), so status updates cannot move the pointer.
+    if not created or kwargs.get("raw"):
+        return
+    DocumentCollectionProgressService().refresh_current_workflow(
+        instance.doc_application_id,
+        application=instance._state.fields_cache.get("doc_application"),
+    )
+
+
+@receiver(post_delete, sender=DocWorkflow, dispatch_uid="doc_workflow_current_pointer_post_delete")
+def refresh_current_workflow_pointer_on_delete(sender, instance, **kwargs):
+    origin = kwargs.get("origin")
+    if origin is not None and not isinstance(origin, DocWorkflow) and getattr(origin, "model", None) is not DocWorkflow:
+        return
+    DocumentCollectionProgressService().refresh_current_workflow(
+        instance.doc_application_id,
+        application=instance._state.fields_cache.get("doc_application"),
+    )
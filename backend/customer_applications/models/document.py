@@ -16,6 +16,10 @@ import os
 from logging import getLogger
 
 from core.utils.helpers import whitespaces_to_underscores
+from customer_applications.services.document_collection_progress_service import (
+    DocumentCollectionProgressService,
+    DocumentCollectionSnapshot,
+)
 from customer_applications.services.document_expiration_state_service import DocumentExpirationStateService
 from django.conf import settings
 from django.core.files.storage import default_storage
@@ -71,6 +75,23 @@ class Document(models.Model):
     file_link = models.CharField(max_length=1024, blank=True)
     thumbnail = models.FileField(upload_to=get_thumbnail_upload_to, blank=True)
     thumbnail_link = models.CharField(max_length=1024, blank=True)
+
+    # Thumbnails are rendered by a background worker; the UI polls thumbnail_status while pending.
+    THUMBNAIL_NONE = ""
+    THUMBNAIL_PENDING = "pending"
+    THUMBNAIL_READY = "ready"
+    THUMBNAIL_FAILED = "failed"
+    THUMBNAIL_STATUS_CHOICES = [
+        (THUMBNAIL_NONE, "None"),
+        (THUMBNAIL_PENDING, "Pending"),
+        (THUMBNAIL_READY, "Ready"),
+        (THUMBNAIL_FAILED, "Failed"),
+    ]
+    thumbnail_status = models.CharField(
+        max_length=20, blank=True, default="", choices=THUMBNAIL_STATUS_CHOICES, db_index=True
+    )
+    # SHA-256 of the source file the thumbnail was rendered from (reused across identical uploads).
+    thumbnail_source_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
     # True when AI validation has been requested/performed for this document
     ai_validation = models.BooleanField(default=False)
     details = models.TextField(blank=True)
@@ -176,23 +197,28 @@ class Document(models.Model):
             self.completed = is_details_filled
 
         old_file_name = ""
-        old_thumbnail_name = ""
         _files_to_delete: list[str] = []
+        self._collection_progress_before = None
+        self._stay_permit_fields_changed = is_create
 
         # In case of an update operation, handle file replacement or removal.
         # Use select_for_update to prevent concurrent saves from racing on
         # the same old file reference.
         if self.pk is not None:
             orig = Document.objects.select_for_update().get(pk=self.pk)
+            self._collection_progress_before = DocumentCollectionSnapshot.of(orig)
+            self._stay_permit_fields_changed = (
+                orig.expiration_date != self.expiration_date
+                or orig.doc_type_id != self.doc_type_id
+                or orig.doc_application_id != self.doc_application_id
+            )
             old_file_name = getattr(orig.file, "name", "") or ""
-            old_thumbnail_name = getattr(orig.thumbnail, "name", "") or ""
             new_file_name = getattr(self.file, "name", "") or ""
             file_changed = old_file_name != new_file_name
 
             if old_file_name and file_changed:
                 _files_to_delete.append(old_file_name)
-            if old_thumbnail_name and file_changed:
-                _files_to_delete.append(old_thumbnail_name)
+            # The old thumbnail stays until the worker renders (or clears) its replacement.
 
         if self.file:
             self.file_link = self.file.url
@@ -236,16 +262,14 @@ class Document(models.Model):
             should_sync_thumbnail = bool(new_file_name)
         elif old_file_name != new_file_name:
             should_sync_thumbnail = True
-        elif new_file_name and not old_thumbnail_name:
-            should_sync_thumbnail = True
 
         if should_sync_thumbnail:
             try:
                 from customer_applications.services.thumbnail_service import DocumentThumbnailService
 
-                DocumentThumbnailService().sync_for_document(self)
+                DocumentThumbnailService().schedule_for_document(self)
             except Exception as exc:
-                logger.warning("Failed to sync thumbnail for document #%s: %s", self.pk, exc)
+                logger.warning("Failed to schedule thumbnail for document #%s: %s", self.pk, exc)
 
 
 def _queue_visa_submission_window_sync(document: Document, *, operation: str) -> None:
@@ -362,18 +386,40 @@ def post_delete_document_storage_signal(sender, instance, **kwargs):
         logger.warning("Failed registering storage cleanup on_commit for document #%s: %s", document_id, exc)
 
 
+def _apply_document_collection_progress(instance: Document, *, before, after) -> None:
+    """Adjust the parent counters and recompute status only when collection completion flips."""
+    cached_application = instance._state.fields_cache.get("doc_application")
+    crossed = DocumentCollectionProgressService().apply(before=before, after=after, application=cached_application)
+    if not crossed or bool(getattr(instance, "_skip_application_status_sync", False)):
+        return
+    if not instance.doc_application_id:
+        return
+    doc_application = cached_application or DocApplication.objects.filter(pk=instance.doc_application_id).first()
+    if doc_application and doc_application.status != DocApplication.STATUS_COMPLETED:
+        # Recalculate status when the collection threshold is crossed so the application leaves pending.
+        doc_application.save()
+
+
 @receiver(post_save, sender=Document)
-def update_doc_application_status_on_document_save(sender, instance, **kwargs):
-    skip_application_status_sync = bool(getattr(instance, "_skip_application_status_sync", False))
-    # Only load the FK relation when we actually need to check/update its status.
-    if not skip_application_status_sync and instance.doc_application_id:
-        doc_application = instance.doc_application
-        if doc_application and doc_application.status != DocApplication.STATUS_COMPLETED:
-            # Recalculate status when documents change so the application leaves pending once requirements are met.
-            doc_application.save()
-    _queue_visa_submission_window_sync(instance, operation="save")
+def update_doc_application_status_on_document_save(sender, instance, created, **kwargs):
+    if kwargs.get("raw"):
+        return
+    before = None if created else getattr(instance, "_collection_progress_before", None)
+    if not created and before is None:
+        # Saved outside of Document.save (no pre-state captured): resync from source rows.
+        DocumentCollectionProgressService().rebuild([instance.doc_application_id])
+    else:
+        _apply_document_collection_progress(instance, before=before, after=DocumentCollectionSnapshot.of(instance))
+    instance._collection_progress_before = None
+    if getattr(instance, "_stay_permit_fields_changed", True):
+        _queue_visa_submission_window_sync(instance, operation="save")
 
 
 @receiver(post_delete, sender=Document)
 def queue_visa_submission_window_sync_on_document_delete(sender, instance, **kwargs):
+    origin = kwargs.get("origin")
+    deleted_directly = origin is None or isinstance(origin, Document) or getattr(origin, "model", None) is Document
+    # Cascades from the application/customer remove the counters' owner anyway.
+    if deleted_directly:
+        _apply_document_collection_progress(instance, before=DocumentCollectionSnapshot.of(instance), after=None)
     _queue_visa_submission_window_sync(instance, operation="delete")
@@ -24,6 +24,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from customer_applications.models import DocApplication
+from customer_applications.services.document_collection_progress_service import DocumentCollectionProgressService
 from django.core.files.storage import default_storage
 from django.db import transaction
 from django.utils import timezone
@@ -112,6 +113,7 @@ class CustomerApplicationCreationService:
 
         if placeholder_documents:
             Document.objects.bulk_create(placeholder_documents)
+            DocumentCollectionProgressService().add_bulk(application, placeholder_documents)
 
         task = Task.objects.filter(product=application.product, step=1).first()
         if task:
@@ -0,0 +1,85 @@
+"""
+FILE_ROLE: Page-level precomputation of derived DocApplication list fields.
+
+KEY_COMPONENTS:
+- DocApplicationRowFields: Invoice link, force-close and submission-window values for one application.
+- DocApplicationListContext: Builds those values for a whole page in a fixed number of queries.
+
+INTERACTIONS:
+- Depends on: InvoiceApplication, StayPermitSubmissionWindowService and Django auth permissions.
+- Used by: api.serializers.doc_application_serializer.DocApplicationListSerializer.
+
+AI_GUIDELINES:
+- Query cost must not grow with the page size: one invoice-link query, one permission check and
+  one document-type/window computation per distinct product.
+- Keep row values identical to the single-instance model helpers (has_invoice/get_invoice, get_submission_window).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from customer_applications.models import DocApplication
+from customer_applications.services.stay_permit_submission_window_service import StayPermitSubmissionWindowService
+from invoices.models.invoice import InvoiceApplication
+
+FORCE_CLOSE_PERMISSION = "customer_applications.change_docapplication"
+CLOSED_STATUSES = (DocApplication.STATUS_COMPLETED, DocApplication.STATUS_REJECTED)
+
+
+@dataclass(frozen=True)
+class DocApplicationRowFields:
+    invoice_id: int | None
+    can_force_close: bool
+    submission_window_last_date: date | None
+
+    @property
+    def has_invoice(self) -> bool:
+        return self.invoice_id is not None
+
+
+class DocApplicationListContext:
+    """Derived per-row list fields for a page of applications, keyed by application id."""
+
+    CONTEXT_KEY = "doc_application_list_context"
+
+    def __init__(self, rows: dict[int, DocApplicationRowFields]):
+        self._rows = rows
+
+    def get(self, application) -> DocApplicationRowFields | None:
+        return self._rows.get(getattr(application, "pk", None))
+
+    @staticmethod
+    def _invoice_ids(application_ids: list[int]) -> dict[int, int]:
+        # First link per application in InvoiceApplication.Meta.ordering, matching DocApplication.get_invoice().
+        invoice_ids: dict[int, int] = {}
+        links = InvoiceApplication.objects.filter(customer_application_id__in=application_ids).values_list(
+            "customer_application_id", "invoice_id"
+        )
+        for application_id, invoice_id in links:
+            invoice_ids.setdefault(application_id, invoice_id)
+        return invoice_ids
+
+    @classmethod
+    def build(cls, applications: Iterable[DocApplication], *, user=None) -> DocApplicationListContext:
+        applications = [application for application in applications if getattr(application, "pk", None)]
+        if not applications:
+            return cls({})
+
+        invoice_ids = cls._invoice_ids([application.pk for application in applications])
+        can_change = bool(
+            user is not None and getattr(user, "is_authenticated", False) and user.has_perm(FORCE_CLOSE_PERMISSION)
+        )
+        windows = StayPermitSubmissionWindowService().get_submission_windows(applications)
+
+        rows = {}
+        for application in applications:
+            window = windows.get(application.pk)
+            rows[application.pk] = DocApplicationRowFields(
+                invoice_id=invoice_ids.get(application.pk),
+                can_force_close=can_change and application.status not in CLOSED_STATUSES,
+                submission_window_last_date=window.last_date if window else None,
+            )
+        return cls(rows)
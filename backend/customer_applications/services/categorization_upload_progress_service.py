@@ -0,0 +1,125 @@
+"""
+FILE_ROLE: Service-layer logic for the customer applications app.
+
+KEY_COMPONENTS:
+- CategorizationUploadProgressService: Live upload counters for categorization jobs.
+
+INTERACTIONS:
+- Depends on: Django cache (atomic counters) and core.services.redis_streams (job stream events).
+- Used by: api.views_categorization upload endpoints (writers) and the categorization SSE stream (reader).
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Upload progress is written here instead of DocumentCategorizationJob.result so byte-level
+  acknowledgements never hit the database; the job row only records upload start and completion.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from core.services.logger_service import Logger
+from core.services.redis_streams import publish_stream_event, stream_job_key
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = Logger.get_logger(__name__)
+
+UPLOAD_PROGRESS_CACHE_PREFIX = "categorization_upload"
+UPLOAD_PROGRESS_STREAM_EVENT = "categorization_upload_progress"
+_COUNTER_FIELDS = ("uploaded_bytes", "uploaded_files", "total_bytes")
+
+
+class CategorizationUploadProgressService:
+    """Atomic per-job upload counters (bytes, files) fed by file/chunk acknowledgements."""
+
+    @staticmethod
+    def _ttl_seconds() -> int:
+        return int(getattr(settings, "CHUNKED_UPLOAD_SESSION_TTL_SECONDS", 24 * 60 * 60) or 24 * 60 * 60)
+
+    @staticmethod
+    def _key(job_id, name: str) -> str:
+        return f"{UPLOAD_PROGRESS_CACHE_PREFIX}:{job_id}:{name}"
+
+    def reset(self, job_id, *, total_bytes: int = 0) -> None:
+        ttl = self._ttl_seconds()
+        cache.delete(self._key(job_id, "complete"))
+        cache.set_many(
+            {
+                self._key(job_id, "uploaded_bytes"): 0,
+                self._key(job_id, "uploaded_files"): 0,
+                self._key(job_id, "total_bytes"): max(0, int(total_bytes)),
+                self._key(job_id, "current_file"): None,
+            },
+            ttl,
+        )
+
+    def record(
+        self,
+        job_id,
+        *,
+        uploaded_bytes: int = 0,
+        uploaded_files: int = 0,
+        total_bytes: int = 0,
+        current_file: str | None = None,
+        publish: bool = True,
+    ) -> dict[str, Any]:
+        """Add deltas to the job counters and return the resulting snapshot."""
+        ttl = self._ttl_seconds()
+        for name, delta in (
+            ("uploaded_bytes", uploaded_bytes),
+            ("uploaded_files", uploaded_files),
+            ("total_bytes", total_bytes),
+        ):
+            key = self._key(job_id, name)
+            cache.add(key, 0, ttl)
+            if delta:
+                try:
+                    cache.incr(key, int(delta))
+                except ValueError:
+                    cache.set(key, int(delta), ttl)
+        if current_file is not None:
+            cache.set(self._key(job_id, "current_file"), current_file, ttl)
+
+        snapshot = self.snapshot(job_id) or {}
+        if publish:
+            self.publish(job_id, snapshot)
+        return snapshot
+
+    def snapshot(self, job_id) -> dict[str, Any] | None:
+        keys = {self._key(job_id, name): name for name in (*_COUNTER_FIELDS, "current_file")}
+        found = cache.get_many(list(keys))
+        if not found:
+            return None
+        snapshot: dict[str, Any] = {name: int(found.get(self._key(job_id, name)) or 0) for name in _COUNTER_FIELDS}
+        snapshot["current_file"] = found.get(self._key(job_id, "current_file"))
+        return snapshot
+
+    def claim_completion(self, job_id) -> bool:
+        """Return True for exactly one caller per upload so the job is marked complete once."""
+        return bool(cache.add(self._key(job_id, "complete"), True, self._ttl_seconds()))
+
+    def clear(self, job_id) -> None:
+        cache.delete_many([self._key(job_id, name) for name in (*_COUNTER_FIELDS, "current_file", "complete")])
+
+    @staticmethod
+    def publish(job_id, snapshot: dict[str, Any]) -> None:
+        """Wake categorization SSE listeners; failures only cost a progress tick."""
+
+        def _emit() -> None:
+            try:
+                publish_stream_event(
+                    stream_job_key(job_id),
+                    event=UPLOAD_PROGRESS_STREAM_EVENT,
+                    status="processing",
+                    payload={"job_id": str(job_id), **snapshot},
+                    job_id=str(job_id),
+                )
+            except Exception as exc:
+                logger.debug("Upload progress publish skipped (job_id=%s): %s", job_id, exc)
+
+        try:
+            transaction.on_commit(_emit)
+        except Exception:
+            _emit()
@@ -0,0 +1,159 @@
+"""
+FILE_ROLE: Service-layer logic for the customer applications app.
+
+KEY_COMPONENTS:
+- DocumentCollectionSnapshot: Module symbol.
+- DocumentCollectionProgressService: Service class.
+
+INTERACTIONS:
+- Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
+
+AI_GUIDELINES:
+- Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
+- Preserve the existing API/model contract because other modules import these symbols directly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+@dataclass(frozen=True)
+class DocumentCollectionSnapshot:
+    """Counter contribution of a single document row."""
+
+    doc_application_id: int | None
+    required: bool
+    completed: bool
+
+    @property
+    def total(self) -> int:
+        return 1 if self.doc_application_id and self.required else 0
+
+    @property
+    def done(self) -> int:
+        return 1 if self.doc_application_id and self.required and self.completed else 0
+
+    @classmethod
+    def of(cls, document) -> "DocumentCollectionSnapshot":
+        return cls(
+            doc_application_id=getattr(document, "doc_application_id", None),
+            required=bool(getattr(document, "required", False)),
+            completed=bool(getattr(document, "completed", False)),
+        )
+
+
+class DocumentCollectionProgressService:
+    """Maintain denormalized document-collection counters and the current-workflow pointer on DocApplication.
+
+    Counters are adjusted with atomic ``F()`` increments from the Document lifecycle, so a
+    document save costs one UPDATE plus one indexed read instead of a parent re-save. Callers
+    only need to recompute the application status when ``apply`` reports a threshold crossing.
+    """
+
+    def apply(
+        self,
+        *,
+        before: DocumentCollectionSnapshot | None,
+        after: DocumentCollectionSnapshot | None,
+        application=None,
+    ) -> bool:
+        """Apply the delta between two document states. Return True when collection completion flipped."""
+        deltas: dict[int, list[int]] = {}
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot is None or not snapshot.doc_application_id:
+                continue
+            entry = deltas.setdefault(int(snapshot.doc_application_id), [0, 0])
+            entry[0] += sign * snapshot.total
+            entry[1] += sign * snapshot.done
+
+        crossed = False
+        for application_id, (total_delta, done_delta) in deltas.items():
+            if not total_delta and not done_delta:
+                continue
+            crossed = self._increment(application_id, total_delta, done_delta, application=application) or crossed
+        return crossed
+
+    def _increment(self, application_id: int, total_delta: int, done_delta: int, *, application=None) -> bool:
+        from customer_applications.models.doc_application import DocApplication
+
+        DocApplication.objects.filter(pk=application_id).update(
+            required_documents_total=F("required_documents_total") + total_delta,
+            required_documents_completed=F("required_documents_completed") + done_delta,
+        )
+        row = (
+            DocApplication.objects.filter(pk=application_id)
+            .values_list("required_documents_total", "required_documents_completed")
+            .first()
+        )
+        if row is None:
+            return False
+        total_after, done_after = row
+        if application is not None and getattr(application, "pk", None) == application_id:
+            application.required_documents_total = total_after
+            application.required_documents_completed = done_after
+        completed_before = done_after - done_delta >= total_after - total_delta
+        completed_after = done_after >= total_after
+        return completed_before != completed_after
+
+    def add_bulk(self, application, documents: Iterable) -> None:
+        """Account for documents inserted with ``bulk_create`` (which bypasses post_save)."""
+        total_delta = 0
+        done_delta = 0
+        for document in documents:
+            snapshot = DocumentCollectionSnapshot.of(document)
+            total_delta += snapshot.total
+            done_delta += snapshot.done
+        if total_delta or done_delta:
+            self._increment(application.pk, total_delta, done_delta, application=application)
+
+    def refresh_current_workflow(self, application_id: int | None, *, application=None) -> int | None:
+        if not application_id:
+            return None
+        from customer_applications.models.doc_application import DocApplication
+        from customer_applications.models.doc_workflow import DocWorkflow
+
+        current_id = (
+            DocWorkflow.objects.filter(doc_application_id=application_id)
+            .order_by("-task__step", "-created_at", "-id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        DocApplication.objects.filter(pk=application_id).exclude(current_workflow_pointer_id=current_id).update(
+            current_workflow_pointer_id=current_id
+        )
+        if application is not None and getattr(application, "pk", None) == application_id:
+            application.current_workflow_pointer_id = current_id
+        return current_id
+
+    def rebuild(self, application_ids: Iterable[int] | None = None) -> int:
+        """Recompute counters and workflow pointers from source rows. Return the number of updated applications."""
+        from customer_applications.models.doc_application import DocApplication
+        from customer_applications.models.doc_workflow import DocWorkflow
+        from customer_applications.models.document import Document
+
+        queryset = DocApplication.objects.all()
+        if application_ids is not None:
+            queryset = queryset.filter(pk__in=list(application_ids))
+
+        required_documents = (
+            Document.objects.filter(doc_application=OuterRef("pk"), required=True)
+            .order_by()
+            .values("doc_application")
+        )
+        total_subquery = required_documents.annotate(count=Count("id")).values("count")
+        done_subquery = required_documents.filter(completed=True).annotate(count=Count("id")).values("count")
+        current_workflow_subquery = (
+            DocWorkflow.objects.filter(doc_application=OuterRef("pk"))
+            .order_by("-task__step", "-created_at", "-id")
+            .values("id")[:1]
+        )
+        return queryset.update(
+            required_documents_total=Coalesce(Subquery(total_subquery), Value(0)),
+            required_documents_completed=Coalesce(Subquery(done_subquery), Value(0)),
+            current_workflow_pointer_id=Subquery(current_workflow_subquery),
+        )
@@ -17,9 +17,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, timedelta
 
+from core.services.reference_catalog_cache import get_product_type, get_stay_permit_document_type_names
 from customer_applications.models.document import Document
 from django.core.exceptions import ValidationError
-from products.models.document_type import DocumentType
 from products.models.product import Product
 
 
@@ -44,29 +44,25 @@ class StayPermitSubmissionWindowService:
         return {name.strip() for name in value.split(",") if name and name.strip()}
 
     def stay_permit_document_names_for_product(self, product: Product | None) -> set[str]:
-        if not product or not getattr(product, "product_category", None):
-            return set()
-        if product.product_category.product_type != "visa":
+        if not product:
             return set()
 
         cached = getattr(product, "_stay_permit_document_names_cache", None)
         if cached is not None:
             return set(cached)
 
+        if get_product_type(product) != "visa":
+            return set()
+
         configured_doc_names = self._split_document_names(product.required_documents) | self._split_document_names(
             product.optional_documents
         )
         if not configured_doc_names:
             return set()
 
-        stay_permit_names = set(
-            DocumentType.objects.filter(name__in=configured_doc_names, is_stay_permit=True).values_list(
-                "name",
-                flat=True,
-            )
-        )
+        stay_permit_names = configured_doc_names & get_stay_permit_document_type_names()
         product._stay_permit_document_names_cache = tuple(sorted(stay_permit_names))
-        return stay_permit_names
+        return set(stay_permit_names)
 
     def product_requires_submission_window(self, product: Product | None) -> bool:
         return bool(self.stay_permit_document_names_for_product(product))
@@ -109,11 +105,73 @@ class StayPermitSubmissionWindowService:
         if not stay_permit_document or not stay_permit_document.expiration_date:
             return None
 
-        last_date = stay_permit_document.expiration_date
+        return self._window_ending(product, stay_permit_document.expiration_date)
+
+    @staticmethod
+    def _window_ending(product: Product | None, last_date: date) -> StayPermitSubmissionWindow:
         window_days = int(product.application_window_days or 0) if product else 0
         first_date = last_date - timedelta(days=max(window_days, 0))
         return StayPermitSubmissionWindow(first_date=first_date, last_date=last_date)
 
+    def get_submission_windows(self, applications) -> dict[int, StayPermitSubmissionWindow]:
+        """Batch ``get_submission_window`` for a page of applications, keyed by application id.
+
+        Stay permit document names are resolved once per distinct product, and earliest expirations come
+        from prefetched documents or from a single query covering every application that lacks them.
+        """
+        names_by_product: dict[int, set[str]] = {}
+        products: dict[int, Product] = {}
+        candidates = []
+        for application in applications:
+            product = getattr(application, "product", None)
+            if product is None or not getattr(application, "pk", None):
+                continue
+            if product.pk not in names_by_product:
+                names_by_product[product.pk] = self.stay_permit_document_names_for_product(product)
+                products[product.pk] = product
+            if names_by_product[product.pk]:
+                candidates.append(application)
+
+        earliest: dict[int, date] = {}
+        unprefetched: dict[int, int] = {}
+        for application in candidates:
+            documents = self._prefetched_documents(application)
+            if documents is None:
+                unprefetched[application.pk] = application.product_id
+                continue
+            names = names_by_product[application.product_id]
+            expirations = [
+                document.expiration_date
+                for document in documents
+                if getattr(document, "expiration_date", None)
+                and getattr(document, "doc_type", None)
+                and document.doc_type.is_stay_permit
+                and document.doc_type.name in names
+            ]
+            if expirations:
+                earliest[application.pk] = min(expirations)
+
+        if unprefetched:
+            names_union = set().union(*(names_by_product[product_id] for product_id in unprefetched.values()))
+            rows = Document.objects.filter(
+                doc_application_id__in=list(unprefetched),
+                doc_type__name__in=names_union,
+                doc_type__is_stay_permit=True,
+                expiration_date__isnull=False,
+            ).values_list("doc_application_id", "doc_type__name", "expiration_date")
+            for application_id, doc_type_name, expiration_date in rows:
+                if doc_type_name not in names_by_product[unprefetched[application_id]]:
+                    continue
+                current = earliest.get(application_id)
+                if current is None or expiration_date < current:
+                    earliest[application_id] = expiration_date
+
+        return {
+            application.pk: self._window_ending(products[application.product_id], earliest[application.pk])
+            for application in candidates
+            if application.pk in earliest
+        }
+
     def validate_doc_date(
         self,
         *,
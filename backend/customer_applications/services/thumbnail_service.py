@@ -6,28 +6,48 @@ KEY_COMPONENTS:
 
 INTERACTIONS:
 - Depends on: nearby Django models, services, serializers, and the app packages imported by this module.
+- Document.save only marks thumbnails pending when the file changes; customer_applications.tasks.
+  generate_document_thumbnails_task renders them in batches on the low-priority Dramatiq queue.
 
 AI_GUIDELINES:
 - Keep the module focused on its narrow layer boundary and avoid moving cross-cutting workflow code here.
 - Preserve the existing API/model contract because other modules import these symbols directly.
+- Never render on the request thread: storage reads and PDF rasterization belong to the worker.
+- The previous thumbnail stays in place until its replacement is written, so re-uploading identical bytes is a
+  hash match and the UI never shows an empty thumbnail while a render is pending.
 """
 
+import hashlib
 import os
 import posixpath
 from dataclasses import dataclass
 from io import BytesIO
 from logging import getLogger
-from typing import Optional
+from typing import Iterable, Optional
 
+from core.storage import get_media_store_adapter
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db import transaction
 from pdf2image import convert_from_bytes
 from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError
 from PIL import Image, ImageOps, UnidentifiedImageError
 
 logger = getLogger(__name__)
 
+THUMBNAIL_DISPATCH_LOCK_KEY = "document_thumbnails:dispatch"
+THUMBNAIL_DOCUMENT_LOCK_PREFIX = "document_thumbnails:document"
+
+OUTCOME_READY = "ready"
+OUTCOME_DEDUPLICATED = "deduplicated"
+OUTCOME_UNCHANGED = "unchanged"
+OUTCOME_FAILED = "failed"
+OUTCOME_CLEARED = "cleared"
+OUTCOME_STALE = "stale"
+OUTCOME_SKIPPED = "skipped"
+
 
 @dataclass(frozen=True)
 class ThumbnailPayload:
@@ -49,51 +69,205 @@ class DocumentThumbnailService:
             self.thumbnail_size = (480, 480)
 
         self.jpeg_quality = max(50, min(95, int(getattr(settings, "DOCUMENT_THUMBNAIL_JPEG_QUALITY", 82))))
-        self.pdf_dpi = max(72, int(getattr(settings, "DOCUMENT_THUMBNAIL_PDF_DPI", 160)))
         self.poppler_path = getattr(settings, "POPPLER_PATH", None)
+        self.batch_size = max(1, int(getattr(settings, "DOCUMENT_THUMBNAIL_BATCH_SIZE", 25)))
+        self.dispatch_delay_seconds = max(0.0, float(getattr(settings, "DOCUMENT_THUMBNAIL_DISPATCH_DELAY_SECONDS", 2)))
+        self.lock_ttl_seconds = max(30, int(getattr(settings, "DOCUMENT_THUMBNAIL_LOCK_TTL_SECONDS", 300)))
+
+    def schedule_for_document(self, document) -> None:
+        """
+        Mark a document thumbnail as pending and wake the batch worker after commit.
 
-    def sync_for_document(self, document) -> Optional[str]:
+        The current thumbnail and its source hash are kept so the worker can skip an unchanged source and
+        swap the image only once the new one is rendered. Files being removed are cleared inline because
+        that path never reads or renders the source.
+        """
+        source_path = getattr(getattr(document, "file", None), "name", "") or ""
+        if not source_path:
+            self.clear_for_document(document)
+            return
+
+        document.__class__.objects.filter(pk=document.pk).update(thumbnail_status=document.THUMBNAIL_PENDING)
+        document.thumbnail_status = document.THUMBNAIL_PENDING
+
+        try:
+            transaction.on_commit(self.dispatch_pending)
+        except Exception:
+            self.dispatch_pending()
+
+    def dispatch_pending(self) -> bool:
+        """Schedule one batch run; uploads arriving before it starts are picked up by the same run."""
+        if not cache.add(THUMBNAIL_DISPATCH_LOCK_KEY, 1, timeout=self.lock_ttl_seconds):
+            return False
+        try:
+            from customer_applications.tasks import generate_document_thumbnails_task
+
+            generate_document_thumbnails_task.schedule(delay=self.dispatch_delay_seconds)
+        except Exception as exc:
+            cache.delete(THUMBNAIL_DISPATCH_LOCK_KEY)
+            logger.warning("Failed to dispatch document thumbnail generation: %s", exc)
+            return False
+        return True
+
+    def process_pending(self, *, limit: Optional[int] = None) -> dict[str, int]:
+        """Render the oldest pending thumbnails and re-dispatch while a backlog remains."""
+        from customer_applications.models import Document
+
+        # Release the dispatch lock before reading the backlog so later uploads schedule a new run.
+        cache.delete(THUMBNAIL_DISPATCH_LOCK_KEY)
+        batch_size = max(1, int(limit or self.batch_size))
+        pending_ids = list(
+            Document.objects.filter(thumbnail_status=Document.THUMBNAIL_PENDING)
+            .order_by("updated_at", "pk")
+            .values_list("pk", flat=True)[: batch_size + 1]
+        )
+        counts = self.generate_for_documents(pending_ids[:batch_size])
+        if len(pending_ids) > batch_size:
+            self.dispatch_pending()
+        return counts
+
+    def generate_for_documents(self, document_ids: Iterable[int], *, force: bool = False) -> dict[str, int]:
+        """Render thumbnails for a batch, reusing one rendering for documents that share a source file."""
+        from customer_applications.models import Document
+
+        counts: dict[str, int] = {}
+        rendered_by_hash: dict[str, str] = {}
+        documents = Document.objects.select_related("doc_application").filter(pk__in=list(document_ids)).order_by("pk")
+        for document in documents:
+            lock_key = f"{THUMBNAIL_DOCUMENT_LOCK_PREFIX}:{document.pk}"
+            if not cache.add(lock_key, 1, timeout=self.lock_ttl_seconds):
+                outcome = OUTCOME_SKIPPED
+            else:
+                try:
+                    outcome, _ = self._sync(document, force=force, rendered_by_hash=rendered_by_hash)
+                except Exception as exc:
+                    logger.warning("Thumbnail generation crashed for document #%s: %s", document.pk, exc)
+                    self._mark_failed(document)
+                    outcome = OUTCOME_FAILED
+                finally:
+                    cache.delete(lock_key)
+            counts[outcome] = counts.get(outcome, 0) + 1
+        return counts
+
+    def sync_for_document(self, document, *, force: bool = False) -> Optional[str]:
         """
         Generate and save a thumbnail for a document file.
 
         Returns the saved storage path or None when no thumbnail was generated.
         """
+        _, saved_path = self._sync(document, force=force, rendered_by_hash=None)
+        return saved_path
+
+    def _sync(
+        self, document, *, force: bool, rendered_by_hash: Optional[dict[str, str]]
+    ) -> tuple[str, Optional[str]]:
         source_path = getattr(getattr(document, "file", None), "name", "") or ""
         if not source_path:
             self.clear_for_document(document)
-            return None
+            return OUTCOME_CLEARED, None
 
         try:
             with default_storage.open(source_path, "rb") as source_file:
                 source_bytes = source_file.read()
         except Exception as exc:
             logger.warning("Unable to read source file for thumbnail generation '%s': %s", source_path, exc)
-            self.clear_for_document(document)
-            return None
-
-        payload = self._build_thumbnail_payload(source_bytes=source_bytes, source_name=source_path)
-        if payload is None:
-            self.clear_for_document(document)
-            return None
+            self._mark_failed(document)
+            return OUTCOME_FAILED, None
 
-        target_path = self._build_storage_path(document=document, extension=payload.extension)
-        previous_thumbnail_path = getattr(getattr(document, "thumbnail", None), "name", "") or ""
-        if previous_thumbnail_path and previous_thumbnail_path != target_path:
-            self._delete_storage_object(previous_thumbnail_path)
+        source_hash = hashlib.sha256(source_bytes).hexdigest()
+        current_thumbnail_path = getattr(getattr(document, "thumbnail", None), "name", "") or ""
+        if (
+            not force
+            and current_thumbnail_path
+            and document.thumbnail_source_hash == source_hash
+            and default_storage.exists(current_thumbnail_path)
+        ):
+            self._persist(document, source_path=source_path, saved_path=current_thumbnail_path, source_hash=source_hash)
+            return OUTCOME_UNCHANGED, current_thumbnail_path
+
+        # Render (or find a reusable rendering) before touching the current thumbnail, which stays visible
+        # until the replacement is ready to be written.
+        reusable_path = self._find_existing_thumbnail(
+            document, source_hash=source_hash, rendered_by_hash=rendered_by_hash
+        )
+        payload = None
+        if not reusable_path:
+            payload = self._build_thumbnail_payload(source_bytes=source_bytes, source_name=source_path)
+            if payload is None:
+                self._mark_failed(document)
+                return OUTCOME_FAILED, None
+
+        target_path = self._build_storage_path(document=document, extension="jpg")
+        if current_thumbnail_path and current_thumbnail_path != target_path:
+            self._delete_storage_object(current_thumbnail_path)
         self._delete_storage_object(target_path)
 
-        saved_path = default_storage.save(target_path, ContentFile(payload.image_bytes))
-        thumbnail_url = self._safe_storage_url(saved_path) or ""
+        outcome = OUTCOME_READY
+        saved_path = self._copy_thumbnail(reusable_path, target_path) if reusable_path else None
+        if saved_path:
+            outcome = OUTCOME_DEDUPLICATED
+        else:
+            if payload is None:
+                payload = self._build_thumbnail_payload(source_bytes=source_bytes, source_name=source_path)
+            if payload is None:
+                self._mark_failed(document)
+                return OUTCOME_FAILED, None
+            saved_path = default_storage.save(target_path, ContentFile(payload.image_bytes))
+
+        if not self._persist(document, source_path=source_path, saved_path=saved_path, source_hash=source_hash):
+            # The file was replaced while rendering; its own pending run owns the thumbnail now.
+            self._delete_storage_object(saved_path)
+            return OUTCOME_STALE, None
+
+        if rendered_by_hash is not None:
+            rendered_by_hash[source_hash] = saved_path
+        return outcome, saved_path
+
+    def _find_existing_thumbnail(
+        self, document, *, source_hash: str, rendered_by_hash: Optional[dict[str, str]]
+    ) -> Optional[str]:
+        existing_path = (rendered_by_hash or {}).get(source_hash)
+        if not existing_path:
+            existing_path = (
+                document.__class__.objects.filter(
+                    thumbnail_source_hash=source_hash,
+                    thumbnail_status=document.THUMBNAIL_READY,
+                )
+                .exclude(pk=document.pk)
+                .exclude(thumbnail="")
+                .values_list("thumbnail", flat=True)
+                .first()
+            )
+        return existing_path or None
+
+    @staticmethod
+    def _copy_thumbnail(existing_path: str, target_path: str) -> Optional[str]:
+        try:
+            return get_media_store_adapter(default_storage).copy(existing_path, target_path)
+        except Exception as exc:
+            logger.debug("Thumbnail reuse from '%s' failed, rendering instead: %s", existing_path, exc)
+            return None
 
-        document.__class__.objects.filter(pk=document.pk).update(
+    def _persist(self, document, *, source_path: str, saved_path: str, source_hash: str) -> bool:
+        thumbnail_url = self._safe_storage_url(saved_path) or ""
+        updated = document.__class__.objects.filter(pk=document.pk, file=source_path).update(
             thumbnail=saved_path,
             thumbnail_link=thumbnail_url,
+            thumbnail_status=document.THUMBNAIL_READY,
+            thumbnail_source_hash=source_hash,
         )
+        if not updated:
+            return False
         document.thumbnail.name = saved_path
         document.thumbnail_link = thumbnail_url
-        return saved_path
+        document.thumbnail_status = document.THUMBNAIL_READY
+        document.thumbnail_source_hash = source_hash
+        return True
+
+    def _mark_failed(self, document) -> None:
+        self.clear_for_document(document, status=document.THUMBNAIL_FAILED)
 
-    def clear_for_document(self, document) -> None:
+    def clear_for_document(self, document, *, status: str = "") -> None:
         """Delete the current thumbnail object and clear persisted thumbnail fields."""
         current_thumbnail_path = getattr(getattr(document, "thumbnail", None), "name", "") or ""
         if current_thumbnail_path:
@@ -103,9 +277,13 @@ class DocumentThumbnailService:
             document.__class__.objects.filter(pk=document.pk).update(
                 thumbnail="",
                 thumbnail_link="",
+                thumbnail_status=status,
+                thumbnail_source_hash="",
             )
         document.thumbnail.name = ""
         document.thumbnail_link = ""
+        document.thumbnail_status = status
+        document.thumbnail_source_hash = ""
 
     def _build_thumbnail_payload(self, *, source_bytes: bytes, source_name: str) -> Optional[ThumbnailPayload]:
         if not source_bytes:
@@ -140,11 +318,13 @@ class DocumentThumbnailService:
 
     def _pdf_first_page_to_image(self, source_bytes: bytes) -> Optional[Image.Image]:
         try:
+            # An int size maps to pdftoppm -scale-to: poppler rasterizes straight into the thumbnail box
+            # instead of rendering the full page at a fixed DPI and downscaling it afterwards.
             images = convert_from_bytes(
                 source_bytes,
                 first_page=1,
                 last_page=1,
-                dpi=self.pdf_dpi,
+                size=max(self.thumbnail_size),
                 fmt="jpeg",
                 thread_count=1,
                 single_file=True,
@@ -163,9 +343,12 @@ class DocumentThumbnailService:
 
     def _bytes_to_image(self, source_bytes: bytes) -> Optional[Image.Image]:
         try:
-            return Image.open(BytesIO(source_bytes))
+            image = Image.open(BytesIO(source_bytes))
         except UnidentifiedImageError:
             return None
+        # JPEG sources decode at a reduced DCT scale close to the target size (no-op for other formats).
+        image.draft("RGB", self.thumbnail_size)
+        return image
 
     def _build_storage_path(self, *, document, extension: str) -> str:
         ext = extension.lower().lstrip(".") or "jpg"
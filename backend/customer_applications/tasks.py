@@ -3,10 +3,18 @@
 import logging
 import os
 import posixpath
+import shutil
+import tempfile
+import traceback
 from datetime import datetime, time, timedelta
 
+from core.models import AsyncJob
+from core.services.document_merger import DocumentMerger
+from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
+from core.tasks.progress import persist_progress
 from core.tasks.runtime import (
     QUEUE_DEFAULT,
+    QUEUE_DOC_CONVERSION,
     QUEUE_LOW,
     QUEUE_REALTIME,
     QUEUE_SCHEDULED,
@@ -14,9 +22,10 @@ from core.tasks.runtime import (
     db_periodic_task,
     db_task,
 )
-from customer_applications.models import DocApplication
+from customer_applications.models import DocApplication, Document
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files import File
 from django.core.files.storage import FileSystemStorage, default_storage
 from django.db import IntegrityError, transaction
 from django.utils import timezone
@@ -177,6 +186,107 @@ def cleanup_application_storage_folder_task(*, folder_path: str) -> None:
         )
 
 
+@db_task(queue=QUEUE_LOW)
+def generate_document_thumbnails_task(*, document_ids: list[int] | None = None, force: bool = False) -> dict:
+    """Render pending document thumbnails in one batch (or the given documents when ids are passed)."""
+    from customer_applications.services.thumbnail_service import DocumentThumbnailService
+
+    service = DocumentThumbnailService()
+    if document_ids:
+        return service.generate_for_documents(document_ids, force=force)
+    return service.process_pending()
+
+
+@db_periodic_task(
+    crontab(minute="*/15"),
+    name="customer_applications.sweep_pending_document_thumbnails",
+    queue=QUEUE_LOW,
+)
+def sweep_pending_document_thumbnails_periodic_task():
+    """Safety net for pending thumbnails whose dispatch was lost (broker outage, worker restart)."""
+    from customer_applications.models import Document
+    from customer_applications.services.thumbnail_service import DocumentThumbnailService
+
+    if Document.objects.filter(thumbnail_status=Document.THUMBNAIL_PENDING).exists():
+        DocumentThumbnailService().dispatch_pending()
+
+
+# LibreOffice conversion and merging is heavy: run on the dedicated conversion pool with its longer time limit.
+@db_task(queue=QUEUE_DOC_CONVERSION)
+def run_document_merge_job(job_id: str, document_ids: list[int], filename: str) -> None:
+    """Merge documents into one PDF artifact on disk, reporting per-document progress.
+
+    Source files are spooled to disk, but pypdf holds the parsed pages of every source until the
+    merged file is written. The output is kept under ``document_merges/`` for download and pruned
+    by the clear-cache job after ``JOB_OUTPUT_MAX_AGE_HOURS``.
+    """
+    lock_key = build_task_lock_key(namespace="documents_merge_pdf_job", item_id=str(job_id))
+    lock_token = acquire_task_lock(lock_key)
+    if not lock_token:
+        logger.warning("Document merge task skipped due to lock contention: job_id=%s", job_id)
+        return
+
+    work_dir = None
+    try:
+        try:
+            job = AsyncJob.objects.get(id=job_id)
+        except AsyncJob.DoesNotExist:
+            logger.error("AsyncJob %s not found for document merge", job_id)
+            return
+
+        try:
+            persist_progress(
+                job,
+                progress=5,
+                status=AsyncJob.STATUS_PROCESSING,
+                force=True,
+                extra_fields={"message": "Collecting documents to merge..."},
+            )
+            documents_by_id = Document.objects.select_related("doc_type").in_bulk(document_ids)
+            documents = [documents_by_id[doc_id] for doc_id in document_ids if doc_id in documents_by_id]
+
+            def _on_progress(processed: int, total: int) -> None:
+                persist_progress(
+                    job,
+                    progress=5 + int(80 * processed / max(1, total)),
+                    extra_fields={"message": f"Converted {processed} of {total} documents..."},
+                )
+
+            work_dir = tempfile.mkdtemp(prefix="merge_job_")
+            merged_path = os.path.join(work_dir, "merged.pdf")
+            summary = DocumentMerger.merge_document_models_to_file(documents, merged_path, on_progress=_on_progress)
+            persist_progress(
+                job,
+                progress=90,
+                force=True,
+                extra_fields={"message": "Saving merged PDF..."},
+            )
+
+            output_path = posixpath.join(
+                getattr(settings, "TMPFILES_FOLDER", "tmpfiles"), "document_merges", str(job.id), filename
+            )
+            with open(merged_path, "rb") as handle:
+                saved_path = default_storage.save(output_path, File(handle, name=filename))
+
+            job.complete(
+                result={
+                    "file_path": saved_path,
+                    "filename": filename,
+                    "content_type": "application/pdf",
+                    "size": os.path.getsize(merged_path),
+                    **summary,
+                },
+                message=f"Merged PDF ready ({summary['documents']} documents, {summary['pages']} pages).",
+            )
+        except Exception as exc:
+            logger.error("Document merge job %s failed: %s", job_id, str(exc), exc_info=True)
+            job.fail(str(exc), traceback.format_exc())
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        release_task_lock(lock_key, lock_token)
+
+
 def _try_auto_import_passport(*, application_id: int, user_id: int | None = None) -> dict[str, object]:
     from core.models.country_code import CountryCode
     from customer_applications.models.document import Document, get_upload_to
@@ -0,0 +1,141 @@
+"""Tests for denormalized document-collection progress on DocApplication."""
+
+from unittest.mock import patch
+
+from customer_applications.models import DocApplication, Document, DocWorkflow
+from customer_applications.services.document_collection_progress_service import DocumentCollectionProgressService
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from products.models import DocumentType, Product, Task
+
+User = get_user_model()
+
+
+class DocumentCollectionProgressTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="progress-user", password="testpass")
+        self.customer = Customer.objects.create(first_name="Progress", last_name="Tracker")
+        self.product = Product.objects.create(name="Progress Product", code="PROG-1")
+        self.doc_type = DocumentType.objects.create(name="Progress Doc", has_details=True, ai_validation=False)
+        self.application = DocApplication.objects.create(
+            customer=self.customer,
+            product=self.product,
+            doc_date=timezone.now().date(),
+            created_by=self.user,
+        )
+
+    def _create_document(self, *, required=True, details=""):
+        return Document.objects.create(
+            doc_application=self.application,
+            doc_type=self.doc_type,
+            required=required,
+            details=details,
+            created_by=self.user,
+        )
+
+    def _counters(self):
+        return DocApplication.objects.values_list(
+            "required_documents_total", "required_documents_completed", "document_collection_completed"
+        ).get(pk=self.application.pk)
+
+    def test_counters_follow_document_lifecycle(self):
+        first = self._create_document()
+        self._create_document(details="filled")
+        self._create_document(required=False, details="optional")
+        self.assertEqual(self._counters(), (2, 1, False))
+
+        first.details = "now filled"
+        first.save()
+        self.assertEqual(self._counters(), (2, 2, True))
+
+        first.required = False
+        first.save()
+        self.assertEqual(self._counters(), (1, 1, True))
+
+        first.delete()
+        self.assertEqual(self._counters(), (1, 1, True))
+
+    def test_filter_uses_generated_flag(self):
+        document = self._create_document()
+        self.assertFalse(DocApplication.objects.filter_by_document_collection_completed().exists())
+
+        document.details = "done"
+        document.save()
+
+        self.assertEqual(
+            list(DocApplication.objects.filter_by_document_collection_completed().values_list("pk", flat=True)),
+            [self.application.pk],
+        )
+
+    def test_status_is_recalculated_only_when_threshold_is_crossed(self):
+        first = self._create_document()
+        second = self._create_document()
+
+        with patch.object(DocApplication, "save", autospec=True) as application_save:
+            first.details = "filled"
+            first.save()
+            application_save.assert_not_called()
+
+            second.details = "filled"
+            second.save()
+            self.assertEqual(application_save.call_count, 1)
+
+    def test_regular_application_save_does_not_overwrite_counters(self):
+        stale_application = DocApplication.objects.get(pk=self.application.pk)
+        self._create_document()
+
+        stale_application.notes = "updated"
+        stale_application.save(skip_status_calculation=True)
+
+        self.assertEqual(self._counters(), (1, 0, False))
+
+    def test_rebuild_reconciles_counters_from_rows(self):
+        self._create_document(details="filled")
+        self._create_document()
+        DocApplication.objects.filter(pk=self.application.pk).update(
+            required_documents_total=0, required_documents_completed=0
+        )
+
+        DocumentCollectionProgressService().rebuild([self.application.pk])
+
+        self.assertEqual(self._counters(), (2, 1, False))
+
+
+class CurrentWorkflowPointerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="pointer-user", password="testpass")
+        self.customer = Customer.objects.create(first_name="Pointer", last_name="Tracker")
+        self.product = Product.objects.create(name="Pointer Product", code="PTR-1")
+        self.task_one = Task.objects.create(product=self.product, step=1, name="Submit", duration=1)
+        self.task_two = Task.objects.create(product=self.product, step=2, name="Collect", duration=1, last_step=True)
+        self.application = DocApplication.objects.create(
+            customer=self.customer,
+            product=self.product,
+            doc_date=timezone.now().date(),
+            created_by=self.user,
+        )
+
+    def _create_workflow(self, task):
+        today = timezone.now().date()
+        return DocWorkflow.objects.create(
+            doc_application=self.application,
+            task=task,
+            start_date=today,
+            due_date=today,
+            created_by=self.user,
+        )
+
+    def test_pointer_tracks_latest_step_and_survives_deletion(self):
+        first = self._create_workflow(self.task_one)
+        second = self._create_workflow(self.task_two)
+
+        application = DocApplication.objects.get(pk=self.application.pk)
+        self.assertEqual(application.current_workflow_pointer_id, second.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(application.current_workflow, second)
+
+        second.delete()
+        application.refresh_from_db()
+        self.assertEqual(application.current_workflow_pointer_id, first.pk)
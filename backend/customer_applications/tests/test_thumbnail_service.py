@@ -1,4 +1,4 @@
-"""Tests for the document thumbnail service."""
+"""Tests for the document thumbnail service and its background batch pipeline."""
 
 from datetime import date
 from io import BytesIO
@@ -6,19 +6,31 @@ from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 from customer_applications.models import DocApplication, Document
+from customer_applications.services.thumbnail_service import DocumentThumbnailService
 from customers.models import Customer
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from PIL import Image
 from products.models import DocumentType, Product
 
 User = get_user_model()
 
+LOC_MEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "document-thumbnail-tests",
+    }
+}
 
+
+@override_settings(CACHES=LOC_MEM_CACHES)
+@patch("customer_applications.tasks.generate_document_thumbnails_task")
 class DocumentThumbnailServiceIntegrationTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_superuser("thumb_admin", "thumb_admin@example.com", "pass")
         self.customer = Customer.objects.create(first_name="Thumb", last_name="User")
         self.product = Product.objects.create(name="Thumb Product", code="THUMB-1")
@@ -39,7 +51,7 @@ class DocumentThumbnailServiceIntegrationTests(TestCase):
             created_by=self.user,
         )
 
-    def test_image_upload_generates_thumbnail_and_cached_url(self):
+    def test_image_upload_is_rendered_by_batch_worker_not_on_save(self, task_mock):
         application = self._create_application()
         with TemporaryDirectory() as media_root:
             with self.settings(
@@ -49,21 +61,31 @@ class DocumentThumbnailServiceIntegrationTests(TestCase):
                     "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
                 },
             ):
-                document = Document.objects.create(
-                    doc_application=application,
-                    doc_type=self.doc_type,
-                    file=self._build_image_upload(),
-                    required=True,
-                    created_by=self.user,
-                )
+                with self.captureOnCommitCallbacks(execute=True):
+                    document = Document.objects.create(
+                        doc_application=application,
+                        doc_type=self.doc_type,
+                        file=self._build_image_upload(),
+                        required=True,
+                        created_by=self.user,
+                    )
                 document.refresh_from_db()
+                self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_PENDING)
+                self.assertEqual(document.thumbnail.name, "")
+                task_mock.schedule.assert_called_once()
 
+                counts = DocumentThumbnailService().process_pending()
+                document.refresh_from_db()
+
+                self.assertEqual(counts, {"ready": 1})
+                self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_READY)
+                self.assertEqual(len(document.thumbnail_source_hash), 64)
                 self.assertTrue(document.thumbnail.name.endswith(".jpg"))
                 self.assertIn("/thumbnails/document_", document.thumbnail.name)
                 self.assertTrue(document.thumbnail_link)
                 self.assertTrue(default_storage.exists(document.thumbnail.name))
 
-    def test_clearing_file_removes_thumbnail(self):
+    def test_clearing_file_removes_thumbnail(self, _task_mock):
         application = self._create_application()
         with TemporaryDirectory() as media_root:
             with self.settings(
@@ -80,6 +102,7 @@ class DocumentThumbnailServiceIntegrationTests(TestCase):
                     required=True,
                     created_by=self.user,
                 )
+                DocumentThumbnailService().process_pending()
                 document.refresh_from_db()
                 thumbnail_path = document.thumbnail.name
                 self.assertTrue(default_storage.exists(thumbnail_path))
@@ -90,10 +113,11 @@ class DocumentThumbnailServiceIntegrationTests(TestCase):
 
                 self.assertEqual(document.thumbnail.name, "")
                 self.assertEqual(document.thumbnail_link, "")
+                self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_NONE)
                 self.assertFalse(default_storage.exists(thumbnail_path))
 
     @patch("customer_applications.services.thumbnail_service.convert_from_bytes")
-    def test_pdf_upload_generates_thumbnail_via_pdf2image(self, convert_from_bytes_mock):
+    def test_pdf_upload_is_rasterized_at_thumbnail_size(self, convert_from_bytes_mock, _task_mock):
         convert_from_bytes_mock.return_value = [Image.new("RGB", (900, 1200), "#ffffff")]
         application = self._create_application()
 
@@ -117,8 +141,114 @@ class DocumentThumbnailServiceIntegrationTests(TestCase):
                     required=True,
                     created_by=self.user,
                 )
+                convert_from_bytes_mock.assert_not_called()
+
+                DocumentThumbnailService().process_pending()
                 document.refresh_from_db()
 
                 convert_from_bytes_mock.assert_called_once()
+                self.assertEqual(convert_from_bytes_mock.call_args.kwargs["size"], 480)
+                self.assertNotIn("dpi", convert_from_bytes_mock.call_args.kwargs)
                 self.assertTrue(document.thumbnail.name.endswith(".jpg"))
                 self.assertTrue(default_storage.exists(document.thumbnail.name))
+
+    @patch("customer_applications.services.thumbnail_service.convert_from_bytes")
+    def test_identical_sources_are_rendered_once(self, convert_from_bytes_mock, _task_mock):
+        convert_from_bytes_mock.return_value = [Image.new("RGB", (900, 1200), "#ffffff")]
+        first_application = self._create_application()
+        second_application = self._create_application()
+
+        with TemporaryDirectory() as media_root:
+            with self.settings(
+                MEDIA_ROOT=media_root,
+                STORAGES={
+                    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+                },
+            ):
+                documents = [
+                    Document.objects.create(
+                        doc_application=application,
+                        doc_type=self.doc_type,
+                        file=SimpleUploadedFile("passport.pdf", b"%PDF-1.4\n%same\n", content_type="application/pdf"),
+                        required=True,
+                        created_by=self.user,
+                    )
+                    for application in (first_application, second_application)
+                ]
+
+                counts = DocumentThumbnailService().process_pending()
+
+                self.assertEqual(counts, {"ready": 1, "deduplicated": 1})
+                convert_from_bytes_mock.assert_called_once()
+                for document in documents:
+                    document.refresh_from_db()
+                    self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_READY)
+                    self.assertTrue(default_storage.exists(document.thumbnail.name))
+                self.assertNotEqual(documents[0].thumbnail.name, documents[1].thumbnail.name)
+
+    def test_reupload_keeps_thumbnail_until_rerendered_and_skips_unchanged_source(self, task_mock):
+        application = self._create_application()
+        with TemporaryDirectory() as media_root:
+            with self.settings(
+                MEDIA_ROOT=media_root,
+                STORAGES={
+                    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+                },
+            ):
+                document = Document.objects.create(
+                    doc_application=application,
+                    doc_type=self.doc_type,
+                    file=self._build_image_upload(),
+                    required=True,
+                    created_by=self.user,
+                )
+                DocumentThumbnailService().process_pending()
+                document.refresh_from_db()
+                thumbnail_path = document.thumbnail.name
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    document.file = self._build_image_upload("passport-again.png")
+                    document.save()
+                document.refresh_from_db()
+
+                self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_PENDING)
+                self.assertEqual(document.thumbnail.name, thumbnail_path)
+                self.assertTrue(default_storage.exists(thumbnail_path))
+
+                counts = DocumentThumbnailService().process_pending()
+                document.refresh_from_db()
+
+                self.assertEqual(counts, {"unchanged": 1})
+                self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_READY)
+                self.assertEqual(document.thumbnail.name, thumbnail_path)
+
+    def test_saving_a_failed_document_without_a_file_change_does_not_reschedule(self, task_mock):
+        application = self._create_application()
+        with TemporaryDirectory() as media_root:
+            with self.settings(
+                MEDIA_ROOT=media_root,
+                STORAGES={
+                    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+                },
+            ):
+                document = Document.objects.create(
+                    doc_application=application,
+                    doc_type=self.doc_type,
+                    file=self._build_image_upload(),
+                    required=True,
+                    created_by=self.user,
+                )
+                Document.objects.filter(pk=document.pk).update(thumbnail_status=Document.THUMBNAIL_FAILED)
+                document.refresh_from_db()
+                task_mock.reset_mock()
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    document.details = "updated"
+                    document.save()
+                document.refresh_from_db()
+
+                self.assertEqual(document.thumbnail_status, Document.THUMBNAIL_FAILED)
+                task_mock.schedule.assert_not_called()
@@ -0,0 +1,61 @@
+"""Store case-insensitive customer sort keys and index the customer list orderings."""
+
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Lower, NullIf
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customers", "0013_customer_customer_first_name_trgm_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="sort_last_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=Coalesce(
+                    NullIf(Lower("last_name"), Value("")),
+                    NullIf(Lower("company_name"), Value("")),
+                    NullIf(Lower("first_name"), Value("")),
+                    Value(""),
+                ),
+                output_field=models.CharField(max_length=100),
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="sort_first_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=Coalesce(
+                    NullIf(Lower("first_name"), Value("")),
+                    NullIf(Lower("company_name"), Value("")),
+                    Value(""),
+                ),
+                output_field=models.CharField(max_length=100),
+            ),
+        ),
+        migrations.AddField(
+            model_name="customer",
+            name="sort_company_name",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=Coalesce(NullIf(Lower("company_name"), Value("")), Value("")),
+                output_field=models.CharField(max_length=100),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(fields=["-created_at"], name="customer_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="customer",
+            index=models.Index(
+                fields=["sort_last_name", "sort_first_name", "sort_company_name"], name="customer_sort_name_idx"
+            ),
+        ),
+    ]
@@ -14,6 +14,8 @@ from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.core.serializers import serialize
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Lower, NullIf
 from django.db.models.signals import post_delete, pre_delete
 from django.dispatch import receiver
 from django.utils.text import get_valid_filename
@@ -143,6 +145,31 @@ class Customer(models.Model):
     notify_by = models.CharField(choices=NOTIFY_BY_CHOICES, max_length=50, blank=True, null=True)
     notification_sent = models.BooleanField(default=False)
     active = models.BooleanField(default=True)
+    # Case-insensitive list sort keys, stored by the database so name ordering can use an index scan.
+    sort_last_name = models.GeneratedField(
+        expression=Coalesce(
+            NullIf(Lower("last_name"), Value("")),
+            NullIf(Lower("company_name"), Value("")),
+            NullIf(Lower("first_name"), Value("")),
+            Value(""),
+        ),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
+    )
+    sort_first_name = models.GeneratedField(
+        expression=Coalesce(
+            NullIf(Lower("first_name"), Value("")),
+            NullIf(Lower("company_name"), Value("")),
+            Value(""),
+        ),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
+    )
+    sort_company_name = models.GeneratedField(
+        expression=Coalesce(NullIf(Lower("company_name"), Value("")), Value("")),
+        output_field=models.CharField(max_length=100),
+        db_persist=True,
+    )
 
     objects = CustomerManager()
 
@@ -160,6 +187,11 @@ class Customer(models.Model):
         indexes = [
             GinIndex(fields=["first_name"], name="customer_first_name_trgm_idx", opclasses=["gin_trgm_ops"]),
             GinIndex(fields=["last_name"], name="customer_last_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+            # Customer list orderings: the default (-created_at) and the generated name sort keys.
+            models.Index(fields=["-created_at"], name="customer_created_at_idx"),
+            models.Index(
+                fields=["sort_last_name", "sort_first_name", "sort_company_name"], name="customer_sort_name_idx"
+            ),
         ]
 
     def __str__(self):
@@ -59,7 +59,9 @@ class InvoiceQuerySet(models.QuerySet):
             ),
         )
 
-    def for_document_generation(self):
+    @staticmethod
+    def document_generation_prefetch() -> Prefetch:
+        """Line items with product, customer and annotated paid amount, plus their payments."""
         paid_amount_field = models.DecimalField(max_digits=10, decimal_places=2)
         invoice_applications_queryset = (
             InvoiceApplication.objects.select_related(
@@ -77,10 +79,13 @@ class InvoiceQuerySet(models.QuerySet):
             .order_by("sort_order", "id")
             .prefetch_related("payments")
         )
+        return Prefetch("invoice_applications", queryset=invoice_applications_queryset)
+
+    def for_document_generation(self):
         return (
             self.select_related("customer")
             .with_payment_totals()
-            .prefetch_related(Prefetch("invoice_applications", queryset=invoice_applications_queryset))
+            .prefetch_related(self.document_generation_prefetch())
         )
 
 
@@ -603,7 +608,16 @@ class InvoiceApplication(models.Model):
         return f"{self.invoice.invoice_no_display} - {application_label}"
 
     def save(self, *args, **kwargs):
-        if self.price_history_id is None and self.product_id and self.invoice_id:
+        self.apply_save_defaults()
+        super().save(*args, **kwargs)
+
+    def apply_save_defaults(self, *, resolve_price_history=True) -> None:
+        """
+        Bind price history, sanitize notes and derive the payment status as ``save()`` does.
+
+        Bulk importers resolve price history themselves and pass ``resolve_price_history=False``.
+        """
+        if resolve_price_history and self.price_history_id is None and self.product_id and self.invoice_id:
             try:
                 history = ProductPriceHistory.resolve_for_invoice_date(
                     product_id=self.product_id, invoice_date=self.invoice.invoice_date
@@ -615,4 +629,3 @@ class InvoiceApplication(models.Model):
                 pass
         self.notes = sanitize_invoice_application_notes(self.notes)
         self.status = self.calculate_payment_status()
-        super().save(*args, **kwargs)
@@ -7,15 +7,33 @@ from io import BytesIO
 from decimal import Decimal
 
 import core.utils.formatutils as formatutils
+from core.utils.pdf_converter import PDFConverter
 from django.conf import settings
+from django.db.models import prefetch_related_objects
 from django.utils.timezone import now as datetime_now
-from invoices.models.invoice import Invoice
-from mailmerge import MailMerge
+from invoices.models.invoice import Invoice, InvoiceQuerySet
+from invoices.services.invoice_document_cache import (
+    CompiledInvoiceTemplate,
+    invoice_artifact_store,
+    invoice_template_cache,
+)
 
 
 class InvoiceService:
     def __init__(self, invoice: Invoice):
         self.invoice = invoice
+        self._ensure_document_prefetch()
+
+    def _ensure_document_prefetch(self) -> None:
+        """Load line items, products, customers, paid amounts and payments in one batched plan.
+
+        Invoices from ``Invoice.objects.for_document_generation()`` already carry the prefetch;
+        anything else (e.g. a viewset ``get_object()``) gets it here instead of per-row queries.
+        """
+        prefetched = getattr(self.invoice, "_prefetched_objects_cache", {})
+        if "invoice_applications" in prefetched or not getattr(self.invoice, "pk", None):
+            return
+        prefetch_related_objects([self.invoice], InvoiceQuerySet.document_generation_prefetch())
 
     @staticmethod
     def _template_candidates(template_name: str, *, partial: bool) -> list[str]:
@@ -110,6 +128,7 @@ class InvoiceService:
 
             quantity = max(1, int(item.quantity or 1))
             unit_price = Decimal(str(item.amount or 0)) / quantity
+            paid_amount = item.paid_amount
 
             items.append(
                 {
@@ -118,8 +137,8 @@ class InvoiceService:
                     "quantity": str(quantity),
                     "unit_price": formatutils.as_currency(unit_price),
                     "amount": formatutils.as_currency(item.amount),
-                    "paid_amount": formatutils.as_currency(item.paid_amount),
-                    "due_amount": formatutils.as_currency(item.amount - item.paid_amount),
+                    "paid_amount": formatutils.as_currency(paid_amount),
+                    "due_amount": formatutils.as_currency(item.amount - paid_amount),
                 }
             )
 
@@ -133,7 +152,7 @@ class InvoiceService:
             for payment in item.payments.all():
                 payments.append(
                     {
-                        "payment_invoice_application": str(payment.invoice_application.product),
+                        "payment_invoice_application": str(item.product),
                         "payment_date": formatutils.as_date_str(payment.payment_date),
                         "payment_type": payment.get_payment_type_display(),
                         "payment_amount": formatutils.as_currency(payment.amount),
@@ -142,32 +161,71 @@ class InvoiceService:
 
         return data, items, payments
 
-    def generate_invoice_document(self, data, items, payments=None):
+    def generate_merge_data(self):
+        """Return ``(data, items, payments)``; ``payments`` is None when the full-invoice template applies."""
+        if self.invoice.total_paid_amount == 0 or self.invoice.is_payment_complete:
+            data, items = self.generate_invoice_data()
+            return data, items, None
+        return self.generate_partial_invoice_data()
+
+    def _resolve_template(self, *, partial: bool) -> CompiledInvoiceTemplate:
         template_name = (
             getattr(settings, "DOCX_PARTIAL_INVOICE_TEMPLATE_NAME", "partial_invoice_template_with_footer.docx")
-            if payments
+            if partial
             else getattr(settings, "DOCX_INVOICE_TEMPLATE_NAME", "invoice_template_with_footer.docx")
         )
+        candidates = self._template_candidates(template_name, partial=partial)
         last_error: FileNotFoundError | None = None
 
-        for template_path in self._template_candidates(template_name, partial=bool(payments)):
+        for template_path in candidates:
             try:
-                with open(template_path, "rb") as template:
-                    doc = MailMerge(template)
-                    doc.merge(**data)
-                    doc.merge_rows("invoice_item", items)
-
-                    if payments:
-                        doc.merge_rows("payment_invoice_application", payments)
-
-                    buf = BytesIO()
-                    doc.write(buf)
-                break
+                return invoice_template_cache.get(template_path)
             except FileNotFoundError as exc:
                 last_error = exc
-        else:
-            tried = ", ".join(self._template_candidates(template_name, partial=bool(payments)))
-            raise FileNotFoundError(f"Invoice template not found. Tried: {tried}") from last_error
 
+        tried = ", ".join(candidates)
+        raise FileNotFoundError(f"Invoice template not found. Tried: {tried}") from last_error
+
+    def generate_invoice_document(self, data, items, payments=None, template: CompiledInvoiceTemplate | None = None):
+        template = template or self._resolve_template(partial=bool(payments))
+        doc = template.checkout()
+        doc.merge(**data)
+        doc.merge_rows("invoice_item", items)
+
+        if payments:
+            doc.merge_rows("payment_invoice_application", payments)
+
+        buf = BytesIO()
+        doc.write(buf)
         buf.seek(0)
         return buf
+
+    def render_document(self, file_format: str = "docx") -> bytes:
+        """Render the invoice as DOCX or PDF bytes.
+
+        Rendered artifacts are content-addressed by template and merge data, so an unchanged
+        invoice is served from storage without re-merging or re-converting to PDF.
+        """
+        data, items, payments = self.generate_merge_data()
+        template = self._resolve_template(partial=bool(payments))
+        key = invoice_artifact_store.build_key(
+            template_digest=template.digest,
+            data=data,
+            items=items,
+            payments=payments,
+        )
+
+        cached = invoice_artifact_store.get(key, file_format)
+        if cached is not None:
+            return cached
+
+        docx_bytes = invoice_artifact_store.get(key, "docx") if file_format == "pdf" else None
+        if docx_bytes is None:
+            docx_bytes = self.generate_invoice_document(data, items, payments, template=template).getvalue()
+            invoice_artifact_store.put(key, "docx", docx_bytes)
+        if file_format != "pdf":
+            return docx_bytes
+
+        pdf_bytes = PDFConverter.docx_buffer_to_pdf(BytesIO(docx_bytes))
+        invoice_artifact_store.put(key, "pdf", pdf_bytes)
+        return pdf_bytes
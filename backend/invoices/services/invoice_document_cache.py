@@ -0,0 +1,144 @@
+"""
+FILE_ROLE: Service-layer caches for invoice document rendering.
+
+KEY_COMPONENTS:
+- CompiledInvoiceTemplate: A pre-parsed MailMerge template that hands out independent copies.
+- InvoiceTemplateCache: Process-level template cache invalidated by file mtime/size.
+- InvoiceArtifactStore: Content-addressed storage of rendered DOCX/PDF invoices keyed by merge data.
+
+INTERACTIONS:
+- Depends on: docx-mailmerge, Django default_storage and TMPFILES_FOLDER.
+- Used by: invoices.services.InvoiceService.
+
+AI_GUIDELINES:
+- Keep the module focused on caching; merge data and template selection stay in InvoiceService.
+- Never close or merge into a cached prototype: checkout() copies the XML parts and shares the
+  read-only template zip, so closing it would break every later render in this process.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Any
+
+from core.services.logger_service import Logger
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from mailmerge import MailMerge
+
+logger = Logger.get_logger(__name__)
+
+ARTIFACT_CACHE_FOLDER = "invoice_artifacts"
+# Bump when the merge payload or rendering pipeline changes shape so stale artifacts are ignored.
+ARTIFACT_KEY_VERSION = 1
+
+
+@dataclass
+class CompiledInvoiceTemplate:
+    path: str
+    version: tuple[int, int]
+    digest: str
+    prototype: Any = field(repr=False)
+
+    def checkout(self):
+        """Return a MailMerge document that can be merged and written without touching the prototype."""
+        merge = copy.copy(self.prototype)
+        merge.parts = {info: copy.deepcopy(tree) for info, tree in self.prototype.parts.items()}
+        merge.settings = copy.deepcopy(self.prototype.settings)
+        return merge
+
+
+class InvoiceTemplateCache:
+    """Keeps one parsed MailMerge prototype per template path for the lifetime of the process."""
+
+    def __init__(self):
+        self._entries: dict[str, CompiledInvoiceTemplate] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> CompiledInvoiceTemplate:
+        """Return the compiled template, re-parsing only when the file changed (raises FileNotFoundError)."""
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is not None and entry.version == version:
+            return entry
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.version == version:
+                return entry
+
+            with open(path, "rb") as template:
+                raw = template.read()
+            entry = CompiledInvoiceTemplate(
+                path=path,
+                version=version,
+                digest=hashlib.sha256(raw).hexdigest(),
+                prototype=MailMerge(BytesIO(raw)),
+            )
+            self._entries[path] = entry
+            logger.info("Compiled invoice template %s", path)
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class InvoiceArtifactStore:
+    """Rendered invoices stored under ``<TMPFILES_FOLDER>/invoice_artifacts/<sha256>.<ext>``."""
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(getattr(settings, "INVOICE_ARTIFACT_CACHE_ENABLED", True))
+
+    @staticmethod
+    def build_key(*, template_digest: str, data: dict, items: list, payments: list | None) -> str:
+        payload = {
+            "version": ARTIFACT_KEY_VERSION,
+            "template": template_digest,
+            "data": data,
+            "items": items,
+            "payments": payments or [],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def path_for(key: str, extension: str) -> str:
+        tmp_folder = getattr(settings, "TMPFILES_FOLDER", "tmpfiles")
+        return f"{tmp_folder}/{ARTIFACT_CACHE_FOLDER}/{key}.{extension}"
+
+    def get(self, key: str, extension: str) -> bytes | None:
+        if not self.enabled():
+            return None
+        path = self.path_for(key, extension)
+        try:
+            if not default_storage.exists(path):
+                return None
+            with default_storage.open(path, "rb") as handle:
+                return handle.read()
+        except Exception as exc:
+            logger.warning("Invoice artifact read failed (%s): %s", path, exc)
+            return None
+
+    def put(self, key: str, extension: str, content: bytes) -> None:
+        if not self.enabled():
+            return
+        path = self.path_for(key, extension)
+        try:
+            if not default_storage.exists(path):
+                default_storage.save(path, ContentFile(content))
+        except Exception as exc:
+            logger.warning("Invoice artifact write failed (%s): %s", path, exc)
+
+
+invoice_template_cache = InvoiceTemplateCache()
+invoice_artifact_store = InvoiceArtifactStore()
@@ -1,21 +1,27 @@
 """
 Invoice Importer Service
 Orchestrates the import process: parsing, matching, and creating invoices.
+
+Batches of parsed invoices resolve duplicates, customers, products and price history with a handful of
+set-based queries, then bulk-create each invoice's applications and lines and emit one post_bulk_create
+signal per model instead of per-row post_save side effects.
 """
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, Tuple
 
+from core.bulk_signals import send_post_bulk_create
 from core.services import AIInvoiceParser, ParsedInvoiceResult
 from core.services.ai_runtime_settings_service import AIRuntimeSettingsService
 from core.services.logger_service import Logger
 from customer_applications.models import DocApplication
 from customers.models import Customer
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
+from django.db.models.functions import Lower
 from invoices.models import Invoice, InvoiceApplication
 from products.models import Product, ProductCategory
 from products.models.product_price_history import ProductPriceHistory
@@ -73,14 +79,45 @@ class InvoiceImporter:
         Returns:
             ImportResult with status and details
         """
-        filename = filename or uploaded_file.name
+        return self.import_files([(uploaded_file, filename or uploaded_file.name)])[0]
+
+    def import_files(self, files) -> list[ImportResult]:
+        """
+        Import several invoice files as one batch.
+
+        Each file is parsed on its own (one multimodal call per file); the parsed invoices are then persisted
+        together through ``import_parsed_batch``. Results are returned in input order.
+        """
+        results: list[Optional[ImportResult]] = []
+        parsed_files: list[tuple[ParsedInvoiceResult, str]] = []
+        parsed_positions: list[int] = []
+        for uploaded_file, filename in files:
+            parsed_result, error_result = self.parse_file(uploaded_file, filename)
+            if error_result is not None:
+                results.append(error_result)
+                continue
+            parsed_positions.append(len(results))
+            parsed_files.append((parsed_result, filename))
+            results.append(None)
+
+        for position, result in zip(parsed_positions, self.import_parsed_batch(parsed_files)):
+            results[position] = result
+        return results
+
+    def parse_file(self, uploaded_file, filename: str) -> Tuple[Optional[ParsedInvoiceResult], Optional[ImportResult]]:
+        """
+        Parse and validate one invoice file.
+
+        Returns:
+            (parsed result, None) on success, or (None, error ImportResult)
+        """
         logger.info(f"Starting import for file: {filename}")
 
         try:
             # Step 1: Parse invoice directly with multimodal vision
             parsed_result = self.llm_parser.parse_invoice_file(uploaded_file, filename)
             if not parsed_result:
-                return ImportResult(
+                return None, ImportResult(
                     success=False,
                     status="error",
                     message=f"Failed to parse invoice from {filename}",
@@ -90,7 +127,7 @@ class InvoiceImporter:
             # Step 2: Validate parsed data
             is_valid, validation_errors = self.llm_parser.validate_parsed_data(parsed_result)
             if not is_valid:
-                return ImportResult(
+                return None, ImportResult(
                     success=False,
                     status="error",
                     message=f"Invalid invoice data in {filename}",
@@ -100,9 +137,44 @@ class InvoiceImporter:
             logger.info(
                 f"Successfully parsed invoice {parsed_result.invoice.invoice_no} with confidence {parsed_result.confidence_score:.2f}"
             )
+            return parsed_result, None
+
+        except Exception as e:
+            logger.error(f"Error importing {filename}: {str(e)}", exc_info=True)
+            return None, self._unexpected_error(filename, e)
+
+    def import_parsed_batch(self, parsed_files: list[tuple[ParsedInvoiceResult, str]]) -> list[ImportResult]:
+        """
+        Persist already-parsed invoices.
 
+        Duplicates, customers, products and price history for the whole batch are resolved with set-based
+        queries up front; each invoice is still created in its own transaction so one bad file does not roll
+        back the others.
+        """
+        if not parsed_files:
+            return []
+
+        try:
+            lookups = self._load_batch_lookups([parsed_result for parsed_result, _ in parsed_files])
+        except Exception as e:
+            logger.error(f"Error resolving invoice import batch: {str(e)}", exc_info=True)
+            return [self._unexpected_error(filename, e) for _, filename in parsed_files]
+
+        return [self._import_parsed(parsed_result, filename, lookups) for parsed_result, filename in parsed_files]
+
+    @staticmethod
+    def _unexpected_error(filename: str, exc: Exception) -> ImportResult:
+        return ImportResult(
+            success=False,
+            status="error",
+            message=f"Unexpected error importing {filename}: {str(exc)}",
+            errors=[str(exc)],
+        )
+
+    def _import_parsed(self, parsed_result: ParsedInvoiceResult, filename: str, lookups: "_BatchLookups"):
+        try:
             # Step 3: Check for duplicate invoice
-            duplicate_invoice = self._check_duplicate_invoice(parsed_result)
+            duplicate_invoice = self._check_duplicate_invoice(parsed_result, lookups)
             if duplicate_invoice:
                 return ImportResult(
                     success=False,
@@ -112,7 +184,7 @@ class InvoiceImporter:
                 )
 
             # Step 4: Find or create customer
-            customer, created = self._find_or_create_customer(parsed_result)
+            customer, created = self._find_or_create_customer(parsed_result, lookups)
             if not customer:
                 return ImportResult(
                     success=False,
@@ -125,7 +197,7 @@ class InvoiceImporter:
             logger.info(f"Customer {customer_status}: {customer.full_name}")
 
             # Step 5: Create invoice with line items
-            invoice = self._create_invoice(parsed_result, customer, filename)
+            invoice = self._create_invoice(parsed_result, customer, filename, lookups)
             if not invoice:
                 return ImportResult(
                     success=False,
@@ -134,6 +206,7 @@ class InvoiceImporter:
                     errors=["Invoice creation failed"],
                 )
 
+            lookups.remember_invoice(invoice)
             logger.info(f"Successfully imported invoice {invoice.invoice_no_display}")
 
             return ImportResult(
@@ -146,40 +219,110 @@ class InvoiceImporter:
 
         except Exception as e:
             logger.error(f"Error importing {filename}: {str(e)}", exc_info=True)
-            return ImportResult(
-                success=False,
-                status="error",
-                message=f"Unexpected error importing {filename}: {str(e)}",
-                errors=[str(e)],
+            return self._unexpected_error(filename, e)
+
+    def _load_batch_lookups(self, parsed_results: list[ParsedInvoiceResult]) -> "_BatchLookups":
+        """Run one query per lookup kind for the whole batch (invoices, phone, email, company, name, product)."""
+        invoice_nos: set[int] = set()
+        phones: set[str] = set()
+        emails: set[str] = set()
+        company_names: set[str] = set()
+        person_names: set[tuple[str, str]] = set()
+        product_codes: set[str] = set()
+
+        for parsed_result in parsed_results:
+            invoice_no = _invoice_no_key(parsed_result.invoice.invoice_no)
+            if invoice_no is not None:
+                invoice_nos.add(invoice_no)
+            customer_data = parsed_result.customer
+            phone = customer_data.phone or customer_data.mobile_phone
+            if phone:
+                phones.add(phone)
+            if customer_data.email:
+                emails.add(customer_data.email.lower())
+            if customer_data.customer_type == "company" and customer_data.company_name:
+                company_names.add(customer_data.company_name.lower())
+            if customer_data.customer_type == "person":
+                first_name, last_name = _person_name_parts(customer_data)
+                if first_name and last_name:
+                    person_names.add((first_name.lower(), last_name.lower()))
+            product_codes.update(item.code.lower() for item in parsed_result.line_items if item.code)
+
+        lookups = _BatchLookups()
+        # Iterate in the same order ``.first()`` would use so the same row wins for every key.
+        for invoice in Invoice.objects.filter(invoice_no__in=invoice_nos).select_related("customer"):
+            lookups.invoices_by_no.setdefault(invoice.invoice_no, []).append(invoice)
+
+        if phones:
+            queryset = Customer.objects.filter(
+                Q(telephone__in=phones) | Q(whatsapp__in=phones) | Q(telegram__in=phones)
+            )
+            for customer in _ordered_like_first(queryset):
+                for value in (customer.telephone, customer.whatsapp, customer.telegram):
+                    if value in phones:
+                        lookups.customers_by_phone.setdefault(value, customer)
+
+        if emails:
+            queryset = Customer.objects.annotate(email_key=Lower("email")).filter(email_key__in=emails)
+            for customer in _ordered_like_first(queryset):
+                lookups.customers_by_email.setdefault(customer.email_key, customer)
+
+        if company_names:
+            queryset = Customer.objects.filter(customer_type="company").annotate(company_key=Lower("company_name"))
+            for customer in _ordered_like_first(queryset.filter(company_key__in=company_names)):
+                lookups.companies_by_name.setdefault(customer.company_key, customer)
+
+        if person_names:
+            queryset = (
+                Customer.objects.filter(customer_type="person")
+                .annotate(first_name_key=Lower("first_name"), last_name_key=Lower("last_name"))
+                .filter(
+                    first_name_key__in={first for first, _ in person_names},
+                    last_name_key__in={last for _, last in person_names},
+                )
             )
+            for customer in _ordered_like_first(queryset):
+                key = (customer.first_name_key, customer.last_name_key)
+                if key in person_names:
+                    lookups.persons_by_name.setdefault(key, customer)
+
+        if product_codes:
+            queryset = (
+                Product.objects.annotate(code_key=Lower("code"))
+                .filter(code_key__in=product_codes)
+                .prefetch_related("tasks")
+            )
+            for product in _ordered_like_first(queryset):
+                lookups.products_by_code.setdefault(product.code_key, product)
+
+        return lookups
 
-    def _check_duplicate_invoice(self, parsed_result: ParsedInvoiceResult) -> Optional[Invoice]:
+    def _check_duplicate_invoice(
+        self, parsed_result: ParsedInvoiceResult, lookups: "_BatchLookups"
+    ) -> Optional[Invoice]:
         """
-        Check if invoice already exists in database.
+        Check if invoice already exists in database (or earlier in this batch).
         Match by invoice_no and customer name/phone.
         """
-        invoice_no = parsed_result.invoice.invoice_no
-        customer_name = parsed_result.customer.full_name
-        customer_phone = parsed_result.customer.phone or parsed_result.customer.mobile_phone
-
-        # Try to find existing invoice
-        query = Q(invoice_no=invoice_no)
-
-        # Add customer matching
-        if customer_phone:
-            query &= Q(customer__telephone=customer_phone) | Q(customer__whatsapp=customer_phone)
-        else:
+        customer_data = parsed_result.customer
+        customer_phone = customer_data.phone or customer_data.mobile_phone
+        first_name, last_name = _person_name_parts(customer_data)
+
+        for invoice in lookups.invoices_by_no.get(_invoice_no_key(parsed_result.invoice.invoice_no), []):
+            customer = invoice.customer
+            if customer_phone:
+                if customer_phone in (customer.telephone, customer.whatsapp):
+                    return invoice
             # Match by name if no phone
-            first_name = parsed_result.customer.first_name or customer_name.split()[0]
-            last_name = parsed_result.customer.last_name or (
-                customer_name.split()[-1] if len(customer_name.split()) > 1 else ""
-            )
-            query &= Q(customer__first_name__iexact=first_name, customer__last_name__iexact=last_name)
-
-        existing_invoice = Invoice.objects.filter(query).first()
-        return existing_invoice
-
-    def _find_or_create_customer(self, parsed_result: ParsedInvoiceResult) -> Tuple[Optional[Customer], bool]:
+            elif (customer.first_name or "").lower() == first_name.lower() and (
+                customer.last_name or ""
+            ).lower() == last_name.lower():
+                return invoice
+        return None
+
+    def _find_or_create_customer(
+        self, parsed_result: ParsedInvoiceResult, lookups: "_BatchLookups"
+    ) -> Tuple[Optional[Customer], bool]:
         """
         Find existing customer or create new one.
         Matching priority: phone > email > company_name > name (exact)
@@ -192,46 +335,39 @@ class InvoiceImporter:
 
         # Try to find by phone (highest priority)
         phone = customer_data.phone or customer_data.mobile_phone
-        if phone:
-            customer = Customer.objects.filter(Q(telephone=phone) | Q(whatsapp=phone) | Q(telegram=phone)).first()
-            if customer:
-                logger.info(f"Matched customer by phone: {customer.full_name}")
-                return customer, False
+        if phone and phone in lookups.customers_by_phone:
+            customer = lookups.customers_by_phone[phone]
+            logger.info(f"Matched customer by phone: {customer.full_name}")
+            return customer, False
 
         # Try to find by email
-        if customer_data.email:
-            customer = Customer.objects.filter(email__iexact=customer_data.email).first()
-            if customer:
-                logger.info(f"Matched customer by email: {customer.full_name}")
-                return customer, False
+        if customer_data.email and customer_data.email.lower() in lookups.customers_by_email:
+            customer = lookups.customers_by_email[customer_data.email.lower()]
+            logger.info(f"Matched customer by email: {customer.full_name}")
+            return customer, False
 
         # Try to find by company name (for company customers)
         if customer_data.customer_type == "company" and customer_data.company_name:
-            customer = Customer.objects.filter(
-                customer_type="company", company_name__iexact=customer_data.company_name
-            ).first()
+            customer = lookups.companies_by_name.get(customer_data.company_name.lower())
             if customer:
                 logger.info(f"Matched company customer by company name: {customer.company_name}")
                 return customer, False
 
         # Try to find by person name (exact match) - only for person customers
         if customer_data.customer_type == "person":
-            first_name = customer_data.first_name or customer_data.full_name.split()[0]
-            last_name = customer_data.last_name or (
-                customer_data.full_name.split()[-1] if len(customer_data.full_name.split()) > 1 else ""
-            )
-
+            first_name, last_name = _person_name_parts(customer_data)
             if first_name and last_name:
-                customer = Customer.objects.filter(
-                    customer_type="person", first_name__iexact=first_name, last_name__iexact=last_name
-                ).first()
+                customer = lookups.persons_by_name.get((first_name.lower(), last_name.lower()))
                 if customer:
                     logger.info(f"Matched person customer by name: {customer.full_name}")
                     return customer, False
 
         # No match found, create new customer
         logger.info(f"Creating new customer: {customer_data.full_name} (type: {customer_data.customer_type})")
-        return self._create_customer(customer_data), True
+        customer = self._create_customer(customer_data)
+        if customer:
+            lookups.remember_customer(customer)
+        return customer, True
 
     def _create_customer(self, customer_data) -> Optional[Customer]:
         """
@@ -327,7 +463,7 @@ class InvoiceImporter:
 
     @transaction.atomic
     def _create_invoice(
-        self, parsed_result: ParsedInvoiceResult, customer: Customer, filename: str
+        self, parsed_result: ParsedInvoiceResult, customer: Customer, filename: str, lookups: "_BatchLookups"
     ) -> Optional[Invoice]:
         """
         Create invoice with DocApplications and InvoiceApplications from parsed data.
@@ -335,6 +471,7 @@ class InvoiceImporter:
         1. Create/get product from line item data
         2. Create DocApplication for the product
         3. Create InvoiceApplication linking DocApplication to invoice
+        Applications and lines are bulk-created, then announced with one post_bulk_create signal per model.
         """
         try:
             invoice_data = parsed_result.invoice
@@ -372,10 +509,11 @@ class InvoiceImporter:
             # Save invoice to get an ID for applications
             invoice.save()
 
-            # Process each line item: create/get product, create DocApplication(s), link to invoice
+            doc_applications: list[DocApplication] = []
+            invoice_applications: list[InvoiceApplication] = []
             for item_data in parsed_result.line_items:
                 # Step 1: Create or get product from line item
-                product = self._get_or_create_product(item_data)
+                product = self._product_for_item(item_data, lookups)
 
                 if not product:
                     logger.warning(f"Could not create/get product for line item: {item_data.code}")
@@ -385,10 +523,11 @@ class InvoiceImporter:
                 # This handles invoices with multiple people in the same line item
                 quantity = int(item_data.quantity) if item_data.quantity else 1
                 unit_amount = Decimal(str(item_data.unit_price))
+                price_history = self._resolve_price_history(product=product, invoice_date=invoice_date, lookups=lookups)
 
-                for i in range(quantity):
+                for _ in range(quantity):
                     # Create DocApplication with completed status
-                    doc_application = DocApplication.objects.create(
+                    doc_application = DocApplication(
                         customer=customer,
                         product=product,
                         doc_date=invoice_date,
@@ -398,14 +537,11 @@ class InvoiceImporter:
                         created_by=self.user,
                         updated_by=self.user,
                     )
-
-                    logger.info(
-                        f"Created DocApplication #{doc_application.pk} for product {product.code} (item {i+1}/{quantity})"
-                    )
+                    doc_application.apply_save_defaults()
+                    doc_applications.append(doc_application)
 
                     # Step 3: Create InvoiceApplication linking DocApplication to invoice
-                    price_history = self._resolve_price_history(product=product, invoice_date=invoice_date)
-                    InvoiceApplication.objects.create(
+                    invoice_application = InvoiceApplication(
                         invoice=invoice,
                         product=product,
                         customer_application=doc_application,
@@ -413,13 +549,21 @@ class InvoiceImporter:
                         status=InvoiceApplication.PENDING,
                         price_history=price_history,
                     )
+                    invoice_application.apply_save_defaults(resolve_price_history=False)
+                    invoice_applications.append(invoice_application)
+
+            # bulk_create fills the application primary keys, which the unsaved lines pick up on insert.
+            DocApplication.objects.bulk_create(doc_applications)
+            InvoiceApplication.objects.bulk_create(invoice_applications)
+            send_post_bulk_create(DocApplication, doc_applications)
+            send_post_bulk_create(InvoiceApplication, invoice_applications)
 
             # Recalculate and save total (this will trigger save() again)
             invoice.save()
 
             logger.info(
                 f"Created invoice {invoice.invoice_no_display} with "
-                f"{sum(int(item.quantity) for item in parsed_result.line_items)} applications, total: {invoice.total_amount}"
+                f"{len(doc_applications)} applications, total: {invoice.total_amount}"
             )
 
             return invoice
@@ -428,6 +572,21 @@ class InvoiceImporter:
             logger.error(f"Error creating invoice: {str(e)}", exc_info=True)
             return None
 
+    def _product_for_item(self, item_data, lookups: "_BatchLookups") -> Optional[Product]:
+        code_key = (item_data.code or "").lower()
+        if code_key and code_key in lookups.products_by_code:
+            product = lookups.products_by_code[code_key]
+            logger.info(f"Found existing product: {product.code}")
+            return product
+
+        product = self._get_or_create_product(item_data)
+        if product is not None:
+            # DocApplication.apply_save_defaults checks product tasks once per unit; load them once here.
+            prefetch_related_objects([product], "tasks")
+            if code_key:
+                lookups.products_by_code[code_key] = product
+        return product
+
     def _get_or_create_product(self, item_data) -> Optional[Product]:
         """
         Get or create a product from line item data.
@@ -496,7 +655,64 @@ class InvoiceImporter:
             logger.error(f"Error getting/creating product: {str(e)}", exc_info=True)
             return None
 
-    def _resolve_price_history(self, *, product: Product, invoice_date) -> ProductPriceHistory | None:
+    def _resolve_price_history(
+        self, *, product: Product, invoice_date, lookups: Optional["_BatchLookups"] = None
+    ) -> ProductPriceHistory | None:
         if not product:
             return None
-        return ProductPriceHistory.resolve_for_invoice_date(product_id=product.id, invoice_date=invoice_date)
+        if lookups is None:
+            return ProductPriceHistory.resolve_for_invoice_date(product_id=product.id, invoice_date=invoice_date)
+        key = (product.id, invoice_date)
+        if key not in lookups.price_histories:
+            lookups.price_histories[key] = ProductPriceHistory.resolve_for_invoice_date(
+                product_id=product.id, invoice_date=invoice_date
+            )
+        return lookups.price_histories[key]
+
+
+def _invoice_no_key(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _person_name_parts(customer_data) -> Tuple[str, str]:
+    """First/last name used for matching: explicit fields first, else the first/last word of the full name."""
+    name_parts = (customer_data.full_name or "").split()
+    first_name = customer_data.first_name or (name_parts[0] if name_parts else "")
+    last_name = customer_data.last_name or (name_parts[-1] if len(name_parts) > 1 else "")
+    return first_name, last_name
+
+
+def _ordered_like_first(queryset):
+    # QuerySet.first() falls back to primary-key order when the model has no default ordering.
+    return queryset if queryset.ordered else queryset.order_by("pk")
+
+
+@dataclass
+class _BatchLookups:
+    """Indexes shared by every invoice of one import batch; rows created by the batch are added as it goes."""
+
+    invoices_by_no: dict[int, list[Invoice]] = field(default_factory=dict)
+    customers_by_phone: dict[str, Customer] = field(default_factory=dict)
+    customers_by_email: dict[str, Customer] = field(default_factory=dict)
+    companies_by_name: dict[str, Customer] = field(default_factory=dict)
+    persons_by_name: dict[tuple[str, str], Customer] = field(default_factory=dict)
+    products_by_code: dict[str, Product] = field(default_factory=dict)
+    price_histories: dict[tuple, Optional[ProductPriceHistory]] = field(default_factory=dict)
+
+    def remember_customer(self, customer: Customer) -> None:
+        # Customers are ordered newest first, so a customer created by the batch wins over older matches.
+        for value in (customer.telephone, customer.whatsapp, customer.telegram):
+            if value:
+                self.customers_by_phone[value] = customer
+        if customer.email:
+            self.customers_by_email[customer.email.lower()] = customer
+        if customer.customer_type == "company" and customer.company_name:
+            self.companies_by_name[customer.company_name.lower()] = customer
+        if customer.customer_type == "person" and customer.first_name and customer.last_name:
+            self.persons_by_name[(customer.first_name.lower(), customer.last_name.lower())] = customer
+
+    def remember_invoice(self, invoice: Invoice) -> None:
+        self.invoices_by_no.setdefault(invoice.invoice_no, []).append(invoice)
@@ -11,7 +11,7 @@ from core.services.logger_service import Logger
 from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
 from core.tasks.progress import persist_progress
 from core.tasks.runtime import QUEUE_DOC_CONVERSION, db_task
-from core.utils.pdf_converter import PDFConverter, PDFConverterError
+from core.utils.pdf_converter import PDFConverterError
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
@@ -104,27 +104,16 @@ def run_invoice_document_job(job_id: str) -> None:
                             invoices_by_id[item.invoice_id] = invoice
                         service = InvoiceService(invoice)
 
-                        if invoice.total_paid_amount == 0 or invoice.is_payment_complete:
-                            data, line_items = service.generate_invoice_data()
-                            doc_buffer = service.generate_invoice_document(data, line_items)
-                        else:
-                            data, line_items, payments = service.generate_partial_invoice_data()
-                            doc_buffer = service.generate_invoice_document(data, line_items, payments)
-
                         raw_name = f"{invoice.invoice_no_display}_{invoice.customer.full_name}"
                         safe_name = slugify(raw_name, allow_unicode=False).replace("-", "_") or f"Invoice_{invoice.pk}"
                         safe_name = safe_name[:200]
 
-                        if job.format_type == InvoiceDocumentJob.FORMAT_PDF:
-                            try:
-                                pdf_bytes = PDFConverter.docx_buffer_to_pdf(doc_buffer)
-                            except PDFConverterError as exc:
-                                raise RuntimeError(str(exc)) from exc
-                            filename = f"{safe_name}.pdf"
-                            zip_file.writestr(filename, pdf_bytes)
-                        else:
-                            filename = f"{safe_name}.docx"
-                            zip_file.writestr(filename, doc_buffer.getvalue())
+                        extension = "pdf" if job.format_type == InvoiceDocumentJob.FORMAT_PDF else "docx"
+                        try:
+                            content = service.render_document(extension)
+                        except PDFConverterError as exc:
+                            raise RuntimeError(str(exc)) from exc
+                        zip_file.writestr(f"{safe_name}.{extension}", content)
 
                         item.status = InvoiceDocumentItem.STATUS_COMPLETED
                         item.error_message = ""
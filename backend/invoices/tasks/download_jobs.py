@@ -10,7 +10,7 @@ from core.services.logger_service import Logger
 from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
 from core.tasks.progress import persist_progress
 from core.tasks.runtime import QUEUE_DOC_CONVERSION, db_task
-from core.utils.pdf_converter import PDFConverter, PDFConverterError
+from core.utils.pdf_converter import PDFConverterError
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
@@ -50,30 +50,18 @@ def run_invoice_download_job(job_id: str) -> None:
             service = InvoiceService(invoice)
             started_at = perf_counter()
 
-            if invoice.total_paid_amount == 0 or invoice.is_payment_complete:
-                data, line_items = service.generate_invoice_data()
-                doc_buffer = service.generate_invoice_document(data, line_items)
-            else:
-                data, line_items, payments = service.generate_partial_invoice_data()
-                doc_buffer = service.generate_invoice_document(data, line_items, payments)
-            docx_generated_at = perf_counter()
-
-            persist_progress(job, progress=60, force=True)
+            persist_progress(job, progress=20, force=True)
 
             raw_name = f"{invoice.invoice_no_display}_{invoice.customer.full_name}"
             safe_name = slugify(raw_name, allow_unicode=False).replace("-", "_") or f"Invoice_{invoice.pk}"
             safe_name = safe_name[:200]
 
-            if job.format_type == InvoiceDownloadJob.FORMAT_PDF:
-                try:
-                    output_bytes = PDFConverter.docx_buffer_to_pdf(doc_buffer)
-                except PDFConverterError as exc:
-                    raise RuntimeError(str(exc)) from exc
-                extension = "pdf"
-            else:
-                output_bytes = doc_buffer.getvalue()
-                extension = "docx"
-            conversion_completed_at = perf_counter()
+            extension = "pdf" if job.format_type == InvoiceDownloadJob.FORMAT_PDF else "docx"
+            try:
+                output_bytes = service.render_document(extension)
+            except PDFConverterError as exc:
+                raise RuntimeError(str(exc)) from exc
+            rendered_at = perf_counter()
 
             persist_progress(job, progress=85, force=True)
 
@@ -90,12 +78,11 @@ def run_invoice_download_job(job_id: str) -> None:
             job.save(update_fields=["output_path", "status", "error_message", "traceback", "progress", "updated_at"])
 
             logger.info(
-                "Invoice download timings job_id=%s format=%s docx_ms=%.1f convert_ms=%.1f store_ms=%.1f total_ms=%.1f",
+                "Invoice download timings job_id=%s format=%s render_ms=%.1f store_ms=%.1f total_ms=%.1f",
                 job_id,
                 job.format_type,
-                (docx_generated_at - started_at) * 1000,
-                (conversion_completed_at - docx_generated_at) * 1000,
-                (saved_at - conversion_completed_at) * 1000,
+                (rendered_at - started_at) * 1000,
+                (saved_at - rendered_at) * 1000,
                 (saved_at - started_at) * 1000,
             )
 
@@ -5,19 +5,29 @@
 import logging
 import os
 import traceback
+from dataclasses import asdict
 
+from core.services.ai_invoice_parser import CustomerData, InvoiceData, InvoiceLineItemData, ParsedInvoiceResult
 from core.services.logger_service import Logger
 from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
-from core.tasks.runtime import QUEUE_REALTIME, db_task
+from core.tasks.runtime import QUEUE_DEFAULT, QUEUE_REALTIME, db_task
 from django.core.files.storage import default_storage
 from django.db import transaction
 from django.utils import timezone
 from invoices.models import InvoiceImportItem, InvoiceImportJob
-from invoices.services.invoice_importer import InvoiceImporter
+from invoices.services.invoice_importer import ImportResult, InvoiceImporter
 from payments.models import Payment
 
 logger = Logger.get_logger(__name__)
 
+ALLOWED_IMPORT_EXTENSIONS = (".pdf", ".xlsx", ".xls", ".docx", ".doc")
+PARSED_STAGE = "parsed"
+TERMINAL_ITEM_STATUSES = (
+    InvoiceImportItem.STATUS_IMPORTED,
+    InvoiceImportItem.STATUS_DUPLICATE,
+    InvoiceImportItem.STATUS_ERROR,
+)
+
 
 @db_task(queue=QUEUE_REALTIME)
 def run_invoice_import_item(item_id: str) -> None:
@@ -36,12 +46,7 @@ def run_invoice_import_item(item_id: str) -> None:
 
         job = item.job
 
-        terminal_item_statuses = {
-            InvoiceImportItem.STATUS_IMPORTED,
-            InvoiceImportItem.STATUS_DUPLICATE,
-            InvoiceImportItem.STATUS_ERROR,
-        }
-        if item.status in terminal_item_statuses:
+        if item.status in TERMINAL_ITEM_STATUSES:
             logger.info(
                 "Skipping invoice import item already in terminal state: item_id=%s status=%s", item_id, item.status
             )
@@ -62,9 +67,8 @@ def run_invoice_import_item(item_id: str) -> None:
         try:
             file_name = os.path.basename(item.file_path)
 
-            allowed_extensions = [".pdf", ".xlsx", ".xls", ".docx", ".doc"]
             file_ext = os.path.splitext(file_name.lower())[-1]
-            if file_ext not in allowed_extensions:
+            if file_ext not in ALLOWED_IMPORT_EXTENSIONS:
                 error_message = f"Unsupported file format: {file_ext}"
                 item.status = InvoiceImportItem.STATUS_ERROR
                 item.result = {
@@ -90,91 +94,253 @@ def run_invoice_import_item(item_id: str) -> None:
             importer = InvoiceImporter(user=job.created_by, llm_provider=llm_provider, llm_model=llm_model)
 
             result = importer.import_from_file(file_bytes, file_name)
+            _store_import_result(item, result, job, file_name)
 
-            if result.success and result.status == "imported" and item.is_paid and result.invoice:
-                try:
-                    payment_count = 0
-                    for invoice_app in result.invoice.invoice_applications.all():
-                        Payment.objects.create(
-                            invoice_application=invoice_app,
-                            from_customer=result.invoice.customer,
-                            payment_date=result.invoice.due_date,
-                            amount=invoice_app.amount,
-                            payment_type=Payment.CASH,
-                            notes=f"Auto-created payment for imported invoice {result.invoice.invoice_no_display}",
-                            created_by=job.created_by,
-                            updated_by=job.created_by,
-                        )
-                        payment_count += 1
-                    result.message += f" (Marked as paid with {payment_count} payment(s))"
-                except Exception as exc:
-                    logger.error(f"Error creating payments for {file_name}: {str(exc)}", exc_info=True)
-                    result.message += " (Warning: Failed to create payments)"
-
-            result_data = {
-                "success": result.success,
-                "status": result.status,
-                "message": result.message,
-                "filename": file_name,
-            }
-
-            if result.invoice:
-                result_data["invoice"] = {
-                    "id": result.invoice.pk,
-                    "invoice_no": result.invoice.invoice_no_display,
-                    "customer_name": result.invoice.customer.full_name,
-                    "total_amount": str(result.invoice.total_amount),
-                    "invoice_date": result.invoice.invoice_date.strftime("%Y-%m-%d"),
-                    "status": result.invoice.get_status_display(),
-                }
+        except Exception as exc:
+            _store_import_exception(item, exc)
 
-            if result.customer:
-                result_data["customer"] = {
-                    "id": result.customer.pk,
-                    "name": result.customer.full_name,
-                }
+        finally:
+            _update_invoice_import_job_counts(item.job_id)
+    finally:
+        release_task_lock(lock_key, lock_token)
 
-            if result.errors:
-                result_data["errors"] = result.errors
 
-            if result.status == "imported":
-                item.status = InvoiceImportItem.STATUS_IMPORTED
-            elif result.status == "duplicate":
-                item.status = InvoiceImportItem.STATUS_DUPLICATE
-            else:
-                item.status = InvoiceImportItem.STATUS_ERROR
+@db_task(queue=QUEUE_REALTIME)
+def run_invoice_import_parse_item(item_id: str) -> None:
+    """
+    Parse one file of a multi-file import job and keep the parsed invoice on its item.
+
+    Each file is its own task so parses run in parallel, fit the realtime time limit and survive retries of
+    other files. The last item to finish parsing enqueues ``finalize_invoice_import_job``, which persists the
+    parsed invoices together.
+    """
+    lock_key = build_task_lock_key(namespace="invoice_import_item", item_id=str(item_id))
+    lock_token = acquire_task_lock(lock_key)
+    if not lock_token:
+        logger.warning("Invoice import parse task skipped due to lock contention: item_id=%s", item_id)
+        return
 
-            item.result = result_data
-            item.invoice = result.invoice if result.invoice else None
-            item.customer = result.customer if result.customer else None
-            item.error_message = "" if result.success else result_data.get("message", "")
-            if item.status != InvoiceImportItem.STATUS_ERROR:
-                item.traceback = ""
-            item.save(
-                update_fields=["status", "result", "invoice", "customer", "error_message", "traceback", "updated_at"]
-            )
+    try:
+        try:
+            item = InvoiceImportItem.objects.select_related("job", "job__created_by").get(id=item_id)
+        except InvoiceImportItem.DoesNotExist:
+            logger.error(f"InvoiceImportItem {item_id} not found")
+            return
 
-        except Exception as exc:
-            full_traceback = traceback.format_exc()
-            logger.error(f"Invoice import failed for {item.filename}: {str(exc)}\n{full_traceback}")
-            item.status = InvoiceImportItem.STATUS_ERROR
-            item.error_message = str(exc)
-            item.traceback = full_traceback
-            item.result = {
-                "success": False,
-                "status": "error",
-                "message": f"Server error: {str(exc)}",
-                "filename": item.filename,
-                "errors": [str(exc)],
-            }
-            item.save(update_fields=["status", "error_message", "traceback", "result", "updated_at"])
+        job = item.job
+        if item.status in TERMINAL_ITEM_STATUSES or _is_parsed(item):
+            # A retry after the parse was stored only needs to re-check whether the job can be finalized.
+            _update_invoice_import_job_counts(job.id)
+            _enqueue_finalize_when_parsed(job.id)
+            return
 
+        if job.status == InvoiceImportJob.STATUS_QUEUED:
+            job.status = InvoiceImportJob.STATUS_PROCESSING
+            job.updated_at = timezone.now()
+            job.save(update_fields=["status", "updated_at"])
+
+        file_name = os.path.basename(item.file_path)
+        try:
+            item.status = InvoiceImportItem.STATUS_PROCESSING
+            item.result = {"stage": "parsing"}
+            item.error_message = ""
+            item.traceback = ""
+            item.save(update_fields=["status", "result", "error_message", "traceback", "updated_at"])
+
+            file_ext = os.path.splitext(file_name.lower())[-1]
+            if file_ext not in ALLOWED_IMPORT_EXTENSIONS:
+                unsupported = ImportResult(
+                    success=False,
+                    status="error",
+                    message=f"Unsupported file format: {file_ext}",
+                    errors=[f"File type {file_ext} not supported"],
+                )
+                _store_import_result(item, unsupported, job, file_name)
+            else:
+                with default_storage.open(item.file_path, "rb") as handle:
+                    file_bytes = handle.read()
+
+                importer = InvoiceImporter(
+                    user=job.created_by,
+                    llm_provider=job.request_params.get("llm_provider"),
+                    llm_model=job.request_params.get("llm_model"),
+                )
+                parsed_result, error_result = importer.parse_file(file_bytes, file_name)
+                if error_result is not None:
+                    _store_import_result(item, error_result, job, file_name)
+                else:
+                    item.result = {"stage": PARSED_STAGE, "parsed": asdict(parsed_result)}
+                    item.save(update_fields=["result", "updated_at"])
+        except Exception as exc:
+            _store_import_exception(item, exc)
         finally:
-            _update_invoice_import_job_counts(item.job_id)
+            _update_invoice_import_job_counts(job.id)
+
+        _enqueue_finalize_when_parsed(job.id)
+    finally:
+        release_task_lock(lock_key, lock_token)
+
+
+@db_task(queue=QUEUE_DEFAULT)
+def finalize_invoice_import_job(job_id: str) -> None:
+    """
+    Persist every parsed item of an import job as one batch.
+
+    Parsing is already done, so this step is database work only: customers, products and price history
+    resolve in a few set-based queries for the whole batch.
+    """
+    lock_key = build_task_lock_key(namespace="invoice_import_job", job_id=str(job_id))
+    lock_token = acquire_task_lock(lock_key)
+    if not lock_token:
+        logger.warning("Invoice import finalize task skipped due to lock contention: job_id=%s", job_id)
+        return
+
+    try:
+        try:
+            job = InvoiceImportJob.objects.select_related("created_by").get(id=job_id)
+        except InvoiceImportJob.DoesNotExist:
+            logger.error(f"InvoiceImportJob {job_id} not found")
+            return
+
+        parsed_items = []
+        for item in _parsed_items(job.id).order_by("sort_index"):
+            try:
+                parsed_items.append((item, os.path.basename(item.file_path), _parsed_from_payload(item.result)))
+            except Exception as exc:
+                _store_import_exception(item, exc)
+
+        if parsed_items:
+            importer = InvoiceImporter(
+                user=job.created_by,
+                llm_provider=job.request_params.get("llm_provider"),
+                llm_model=job.request_params.get("llm_model"),
+            )
+            results = importer.import_parsed_batch([(parsed, file_name) for _, file_name, parsed in parsed_items])
+            for (item, file_name, _), result in zip(parsed_items, results):
+                try:
+                    _store_import_result(item, result, job, file_name)
+                except Exception as exc:
+                    _store_import_exception(item, exc)
+
+        _update_invoice_import_job_counts(job.id)
     finally:
         release_task_lock(lock_key, lock_token)
 
 
+def _is_parsed(item: InvoiceImportItem) -> bool:
+    return isinstance(item.result, dict) and item.result.get("stage") == PARSED_STAGE
+
+
+def _parsed_items(job_id):
+    return InvoiceImportItem.objects.filter(
+        job_id=job_id, status=InvoiceImportItem.STATUS_PROCESSING, result__stage=PARSED_STAGE
+    )
+
+
+def _enqueue_finalize_when_parsed(job_id) -> None:
+    """Enqueue the batch persist step once no item of the job is still waiting to be parsed."""
+    items = InvoiceImportItem.objects.filter(job_id=job_id)
+    unparsed = items.filter(status=InvoiceImportItem.STATUS_QUEUED).exists() or (
+        items.filter(status=InvoiceImportItem.STATUS_PROCESSING).exclude(result__stage=PARSED_STAGE).exists()
+    )
+    if unparsed or not _parsed_items(job_id).exists():
+        return
+    finalize_invoice_import_job(str(job_id))
+
+
+def _parsed_from_payload(payload: dict) -> ParsedInvoiceResult:
+    parsed = payload["parsed"]
+    return ParsedInvoiceResult(
+        customer=CustomerData(**parsed["customer"]),
+        invoice=InvoiceData(**parsed["invoice"]),
+        line_items=[InvoiceLineItemData(**line) for line in parsed["line_items"]],
+        confidence_score=parsed["confidence_score"],
+        raw_response=parsed.get("raw_response") or {},
+    )
+
+
+def _store_import_exception(item: InvoiceImportItem, exc: Exception) -> None:
+    full_traceback = traceback.format_exc()
+    logger.error(f"Invoice import failed for {item.filename}: {str(exc)}\n{full_traceback}")
+    item.status = InvoiceImportItem.STATUS_ERROR
+    item.error_message = str(exc)
+    item.traceback = full_traceback
+    item.result = {
+        "success": False,
+        "status": "error",
+        "message": f"Server error: {str(exc)}",
+        "filename": item.filename,
+        "errors": [str(exc)],
+    }
+    item.save(update_fields=["status", "error_message", "traceback", "result", "updated_at"])
+
+
+def _store_import_result(item: InvoiceImportItem, result, job: InvoiceImportJob, file_name: str) -> None:
+    """Create payments for paid imports and persist the item's terminal status and result payload."""
+    if result.success and result.status == "imported" and item.is_paid and result.invoice:
+        try:
+            payment_count = 0
+            for invoice_app in result.invoice.invoice_applications.all():
+                Payment.objects.create(
+                    invoice_application=invoice_app,
+                    from_customer=result.invoice.customer,
+                    payment_date=result.invoice.due_date,
+                    amount=invoice_app.amount,
+                    payment_type=Payment.CASH,
+                    notes=f"Auto-created payment for imported invoice {result.invoice.invoice_no_display}",
+                    created_by=job.created_by,
+                    updated_by=job.created_by,
+                )
+                payment_count += 1
+            result.message += f" (Marked as paid with {payment_count} payment(s))"
+        except Exception as exc:
+            logger.error(f"Error creating payments for {file_name}: {str(exc)}", exc_info=True)
+            result.message += " (Warning: Failed to create payments)"
+
+    result_data = {
+        "success": result.success,
+        "status": result.status,
+        "message": result.message,
+        "filename": file_name,
+    }
+
+    if result.invoice:
+        result_data["invoice"] = {
+            "id": result.invoice.pk,
+            "invoice_no": result.invoice.invoice_no_display,
+            "customer_name": result.invoice.customer.full_name,
+            "total_amount": str(result.invoice.total_amount),
+            "invoice_date": result.invoice.invoice_date.strftime("%Y-%m-%d"),
+            "status": result.invoice.get_status_display(),
+        }
+
+    if result.customer:
+        result_data["customer"] = {
+            "id": result.customer.pk,
+            "name": result.customer.full_name,
+        }
+
+    if result.errors:
+        result_data["errors"] = result.errors
+
+    if result.status == "imported":
+        item.status = InvoiceImportItem.STATUS_IMPORTED
+    elif result.status == "duplicate":
+        item.status = InvoiceImportItem.STATUS_DUPLICATE
+    else:
+        item.status = InvoiceImportItem.STATUS_ERROR
+
+    item.result = result_data
+    item.invoice = result.invoice if result.invoice else None
+    item.customer = result.customer if result.customer else None
+    item.error_message = "" if result.success else result_data.get("message", "")
+    if item.status != InvoiceImportItem.STATUS_ERROR:
+        item.traceback = ""
+    item.save(
+        update_fields=["status", "result", "invoice", "customer", "error_message", "traceback", "updated_at"]
+    )
+
+
 @transaction.atomic
 def _update_invoice_import_job_counts(job_id):
     job = InvoiceImportJob.objects.select_for_update().get(id=job_id)
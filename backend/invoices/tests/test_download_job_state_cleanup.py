@@ -53,6 +53,10 @@ class InvoiceDownloadJobStateCleanupTest(TestCase):
             def generate_invoice_document(self, *args, **kwargs):
                 return BytesIO(b"doc-content")
 
+            def render_document(self, file_format="docx"):
+                data, line_items = self.generate_invoice_data()
+                return self.generate_invoice_document(data, line_items).getvalue()
+
             def generate_partial_invoice_data(self):
                 return ({"invoice_no": self.invoice.invoice_no_display}, [], [])
 
@@ -93,6 +97,10 @@ class InvoiceDownloadJobStateCleanupTest(TestCase):
             def generate_invoice_document(self, *args, **kwargs):
                 return BytesIO(b"unused")
 
+            def render_document(self, file_format="docx"):
+                data, line_items = self.generate_invoice_data()
+                return self.generate_invoice_document(data, line_items).getvalue()
+
             def generate_partial_invoice_data(self):
                 raise RuntimeError("simulated download failure")
 
@@ -0,0 +1,169 @@
+"""Tests for the compiled invoice template cache and content-addressed invoice artifacts."""
+
+import os
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from invoices.models import Invoice, InvoiceApplication
+from invoices.services import invoice_document_cache
+from invoices.services.invoice_document_cache import InvoiceTemplateCache
+from invoices.services.InvoiceService import InvoiceService
+from payments.models import Payment
+from products.models import Product
+
+User = get_user_model()
+
+WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MAIN_PART_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"
+
+
+def _build_template_bytes(label: str = "Invoice") -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            f'<Override PartName="/word/document.xml" ContentType="{MAIN_PART_TYPE}"/></Types>',
+        )
+        archive.writestr(
+            "word/document.xml",
+            f'<?xml version="1.0"?><w:document xmlns:w="{WORD_NS}"><w:body><w:p>'
+            f"<w:r><w:t>{label} </w:t></w:r>"
+            '<w:fldSimple w:instr=" MERGEFIELD invoice_no "><w:r><w:t>no</w:t></w:r></w:fldSimple>'
+            "</w:p></w:body></w:document>",
+        )
+    return buffer.getvalue()
+
+
+def _document_xml(docx: BytesIO) -> str:
+    with zipfile.ZipFile(docx) as archive:
+        return archive.read("word/document.xml").decode("utf-8")
+
+
+class InvoiceTemplateCacheTests(SimpleTestCase):
+    def setUp(self):
+        self._tmp = TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "invoice.docx")
+        with open(self.path, "wb") as handle:
+            handle.write(_build_template_bytes())
+        self.cache = InvoiceTemplateCache()
+
+    def test_template_is_parsed_once_and_checkouts_are_independent(self):
+        with patch.object(
+            invoice_document_cache, "MailMerge", wraps=invoice_document_cache.MailMerge
+        ) as mailmerge_mock:
+            first = self.cache.get(self.path).checkout()
+            second = self.cache.get(self.path).checkout()
+
+        self.assertEqual(mailmerge_mock.call_count, 1)
+        first.merge(invoice_no="INV-1")
+        second.merge(invoice_no="INV-2")
+        first_output, second_output = BytesIO(), BytesIO()
+        first.write(first_output)
+        second.write(second_output)
+
+        self.assertIn("INV-1", _document_xml(first_output))
+        self.assertIn("INV-2", _document_xml(second_output))
+        self.assertEqual(self.cache.get(self.path).prototype.get_merge_fields(), {"invoice_no"})
+
+    def test_template_is_recompiled_when_file_changes(self):
+        original = self.cache.get(self.path)
+        with open(self.path, "wb") as handle:
+            handle.write(_build_template_bytes(label="Updated invoice"))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        refreshed = self.cache.get(self.path)
+
+        self.assertIsNot(refreshed, original)
+        self.assertNotEqual(refreshed.digest, original.digest)
+
+    def test_missing_template_raises_file_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            self.cache.get(os.path.join(self._tmp.name, "missing.docx"))
+
+
+class InvoiceRenderDocumentTests(TestCase):
+    def setUp(self):
+        self._media = TemporaryDirectory()
+        self.addCleanup(self._media.cleanup)
+        settings_override = override_settings(
+            MEDIA_ROOT=self._media.name,
+            INVOICE_ARTIFACT_CACHE_ENABLED=True,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+            },
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username="invoice-artifact-user", password="testpass")
+        self.customer = Customer.objects.create(first_name="Artifact", last_name="Cache")
+        self.product = Product.objects.create(name="Visa Service", code="VISA-ART", product_type="visa")
+        today = timezone.localdate()
+        self.invoice = Invoice.objects.create(
+            customer=self.customer,
+            invoice_date=today,
+            due_date=today + timedelta(days=7),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+        self.line = InvoiceApplication.objects.create(
+            invoice=self.invoice, product=self.product, amount=Decimal("100.00")
+        )
+
+        self.template = MagicMock(digest="template-digest")
+        self.template.checkout.return_value.write.side_effect = lambda buf: buf.write(b"docx-bytes")
+
+    def _render(self, file_format: str) -> bytes:
+        invoice = Invoice.objects.get(pk=self.invoice.pk)
+        with patch.object(InvoiceService, "_resolve_template", return_value=self.template):
+            return InvoiceService(invoice).render_document(file_format)
+
+    @patch("invoices.services.InvoiceService.PDFConverter.docx_buffer_to_pdf", return_value=b"pdf-bytes")
+    def test_unchanged_invoice_reuses_rendered_pdf(self, convert_mock):
+        self.assertEqual(self._render("pdf"), b"pdf-bytes")
+        self.assertEqual(self._render("pdf"), b"pdf-bytes")
+        self.assertEqual(self._render("docx"), b"docx-bytes")
+
+        convert_mock.assert_called_once()
+        self.assertEqual(self.template.checkout.call_count, 1)
+
+    @patch("invoices.services.InvoiceService.PDFConverter.docx_buffer_to_pdf", return_value=b"pdf-bytes")
+    def test_payment_changes_invalidate_rendered_artifact(self, convert_mock):
+        self._render("pdf")
+        Payment.objects.create(
+            invoice_application=self.line,
+            from_customer=self.customer,
+            payment_date=timezone.localdate(),
+            amount=Decimal("40.00"),
+            created_by=self.user,
+            updated_by=self.user,
+        )
+
+        self._render("pdf")
+
+        self.assertEqual(convert_mock.call_count, 2)
+
+    def test_service_batches_line_item_loading_for_plain_invoices(self):
+        for _ in range(4):
+            InvoiceApplication.objects.create(invoice=self.invoice, product=self.product, amount=Decimal("10.00"))
+        invoice = Invoice.objects.get(pk=self.invoice.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            service = InvoiceService(invoice)
+            service.generate_merge_data()
+
+        self.assertLessEqual(len(queries), 3)
@@ -0,0 +1,119 @@
+"""Tests for the set-based invoice import batch path."""
+
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from core.bulk_signals import post_bulk_create
+from core.models.local_resilience import SyncChangeLog
+from core.services.ai_invoice_parser import CustomerData, InvoiceData, InvoiceLineItemData, ParsedInvoiceResult
+from customer_applications.models import DocApplication
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from invoices.models import Invoice, InvoiceApplication
+from invoices.services.invoice_importer import InvoiceImporter
+from products.models import Product
+
+User = get_user_model()
+
+
+def _parsed(invoice_no, *, full_name="Mario Rossi", phone=None, email=None, items=None):
+    return ParsedInvoiceResult(
+        customer=CustomerData(full_name=full_name, phone=phone, email=email),
+        invoice=InvoiceData(
+            invoice_no=str(invoice_no), invoice_date="2025-03-10", due_date="2025-03-20", total_amount=0
+        ),
+        line_items=items or [InvoiceLineItemData("VISA-B211", "Visit visa", 1, 1500000, 1500000)],
+        confidence_score=0.99,
+        raw_response={},
+    )
+
+
+class InvoiceImporterBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="testpass")
+        self.product = Product.objects.create(
+            name="Visit Visa",
+            code="VISA-B211",
+            product_type="other",
+            base_price=Decimal("1000000.00"),
+            retail_price=Decimal("1500000.00"),
+        )
+        self.existing = Customer.objects.create(
+            customer_type="person", first_name="Anna", last_name="Bianchi", email="anna@example.com"
+        )
+        with patch("invoices.services.invoice_importer.AIInvoiceParser", MagicMock()):
+            self.importer = InvoiceImporter(user=self.user, llm_model="test-model")
+
+    def test_batch_resolves_customers_once_and_bulk_creates_lines(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            results = self.importer.import_parsed_batch(
+                [
+                    (_parsed(202501001, phone="+628111"), "a.pdf"),
+                    (_parsed(202501002, phone="+628111"), "b.pdf"),
+                    (
+                        _parsed(
+                            202501003,
+                            full_name="Anna Bianchi",
+                            email="ANNA@example.com",
+                            items=[InvoiceLineItemData("visa-b211", "Visit visa", 3, 1500000, 4500000)],
+                        ),
+                        "c.pdf",
+                    ),
+                ]
+            )
+
+        self.assertEqual([result.status for result in results], ["imported", "imported", "imported"])
+        self.assertEqual(results[0].customer.pk, results[1].customer.pk)
+        self.assertEqual(results[2].customer.pk, self.existing.pk)
+        self.assertEqual(Customer.objects.count(), 2)
+
+        third = results[2].invoice
+        lines = list(third.invoice_applications.select_related("customer_application"))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(third.total_amount, Decimal("4500000.00"))
+        self.assertTrue(all(line.product_id == self.product.pk for line in lines))
+        self.assertTrue(all(line.customer_application.status == DocApplication.STATUS_COMPLETED for line in lines))
+        self.assertTrue(all(line.status == InvoiceApplication.OVERDUE for line in lines))
+        self.assertEqual(
+            SyncChangeLog.objects.filter(model_label="customer_applications.docapplication").count(),
+            DocApplication.objects.count(),
+        )
+
+    def test_repeated_invoice_in_same_batch_is_reported_as_duplicate(self):
+        results = self.importer.import_parsed_batch(
+            [(_parsed(202501010, phone="+628222"), "a.pdf"), (_parsed(202501010, phone="+628222"), "b.pdf")]
+        )
+
+        self.assertEqual([result.status for result in results], ["imported", "duplicate"])
+        self.assertEqual(results[1].invoice.pk, results[0].invoice.pk)
+        self.assertEqual(Invoice.objects.count(), 1)
+
+    def test_side_effects_are_emitted_once_per_model_per_invoice(self):
+        received = []
+
+        def receiver(sender, instances, **kwargs):
+            received.append((sender, len(instances)))
+
+        post_bulk_create.connect(receiver, dispatch_uid="test_invoice_importer_batch")
+        self.addCleanup(post_bulk_create.disconnect, dispatch_uid="test_invoice_importer_batch")
+
+        items = [InvoiceLineItemData("VISA-B211", "Visit visa", 4, 1500000, 6000000)]
+        self.importer.import_parsed_batch([(_parsed(202501020, email="anna@example.com", items=items), "a.pdf")])
+
+        self.assertEqual(received, [(DocApplication, 4), (InvoiceApplication, 4)])
+
+    def test_query_count_does_not_grow_with_line_quantity(self):
+        def import_with_quantity(invoice_no, quantity):
+            items = [InvoiceLineItemData("VISA-B211", "Visit visa", quantity, 1500000, 1500000 * quantity)]
+            with CaptureQueriesContext(connection) as queries:
+                (result,) = self.importer.import_parsed_batch(
+                    [(_parsed(invoice_no, email="anna@example.com", items=items), "a.pdf")]
+                )
+            self.assertEqual(result.status, "imported")
+            return len(queries)
+
+        import_with_quantity(202501029, 1)  # warm per-process caches (content types, sequence cache)
+        self.assertEqual(import_with_quantity(202501030, 1), import_with_quantity(202501031, 8))
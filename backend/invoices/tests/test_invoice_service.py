@@ -3,7 +3,7 @@
 from datetime import date
 from decimal import Decimal
 from io import BytesIO
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 from core.services.invoice_service import create_invoice, update_invoice
 from core.utils import formatutils
@@ -607,15 +607,17 @@ class InvoiceServiceTests(TestCase):
         data, items = service.generate_invoice_data()
         doc = MagicMock()
         doc.write.side_effect = lambda buf: buf.write(b"full-doc-output")
+        template = MagicMock()
+        template.checkout.return_value = doc
 
-        with patch("builtins.open", mock_open()) as open_mock, patch(
-            "invoices.services.InvoiceService.MailMerge", return_value=doc
-        ):
+        with patch(
+            "invoices.services.InvoiceService.invoice_template_cache.get", return_value=template
+        ) as template_get_mock:
             buffer = service.generate_invoice_document(data, items)
 
         self.assertIsInstance(buffer, BytesIO)
         self.assertEqual(buffer.getvalue(), b"full-doc-output")
-        open_mock.assert_called_once_with("/tmp/test-static/reporting/invoice-template.docx", "rb")
+        template_get_mock.assert_called_once_with("/tmp/test-static/reporting/invoice-template.docx")
         doc.merge.assert_called_once_with(**data)
         doc.merge_rows.assert_called_once_with("invoice_item", items)
 
@@ -629,15 +631,17 @@ class InvoiceServiceTests(TestCase):
         data, items, payments = service.generate_partial_invoice_data()
         doc = MagicMock()
         doc.write.side_effect = lambda buf: buf.write(b"partial-doc-output")
+        template = MagicMock()
+        template.checkout.return_value = doc
 
-        with patch("builtins.open", mock_open()) as open_mock, patch(
-            "invoices.services.InvoiceService.MailMerge", return_value=doc
-        ):
+        with patch(
+            "invoices.services.InvoiceService.invoice_template_cache.get", return_value=template
+        ) as template_get_mock:
             buffer = service.generate_invoice_document(data, items, payments)
 
         self.assertIsInstance(buffer, BytesIO)
         self.assertEqual(buffer.getvalue(), b"partial-doc-output")
-        open_mock.assert_called_once_with("/tmp/test-static/reporting/partial-template.docx", "rb")
+        template_get_mock.assert_called_once_with("/tmp/test-static/reporting/partial-template.docx")
         doc.merge.assert_called_once_with(**data)
         doc.merge_rows.assert_any_call("invoice_item", items)
         doc.merge_rows.assert_any_call("payment_invoice_application", payments)
@@ -652,24 +656,26 @@ class InvoiceServiceTests(TestCase):
         data, items = service.generate_invoice_data()
         doc = MagicMock()
         doc.write.side_effect = lambda buf: buf.write(b"fallback-doc-output")
+        template = MagicMock()
+        template.checkout.return_value = doc
 
         expected_missing = "/tmp/test-static/reporting/missing-branded-template.docx"
         expected_fallback = "/tmp/test-static/reporting/invoice_template_with_footer_revisbali.docx"
 
-        def open_side_effect(path, mode):
+        def template_get_side_effect(path):
             if path == expected_missing:
                 raise FileNotFoundError(path)
             if path == expected_fallback:
-                return mock_open(read_data=b"template-bytes")()
+                return template
             raise AssertionError(f"Unexpected template path: {path}")
 
-        with patch("builtins.open", side_effect=open_side_effect) as open_mock, patch(
-            "invoices.services.InvoiceService.MailMerge", return_value=doc
-        ):
+        with patch(
+            "invoices.services.InvoiceService.invoice_template_cache.get", side_effect=template_get_side_effect
+        ) as template_get_mock:
             buffer = service.generate_invoice_document(data, items)
 
         self.assertEqual(buffer.getvalue(), b"fallback-doc-output")
-        self.assertEqual(open_mock.call_args_list[0].args, (expected_missing, "rb"))
-        self.assertEqual(open_mock.call_args_list[1].args, (expected_fallback, "rb"))
+        self.assertEqual(template_get_mock.call_args_list[0].args, (expected_missing,))
+        self.assertEqual(template_get_mock.call_args_list[1].args, (expected_fallback,))
         doc.merge.assert_called_once_with(**data)
         doc.merge_rows.assert_called_once_with("invoice_item", items)
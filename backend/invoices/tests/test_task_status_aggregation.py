@@ -7,13 +7,19 @@ from io import BytesIO
 from types import SimpleNamespace
 from unittest.mock import patch
 
+from core.services.ai_invoice_parser import CustomerData, InvoiceData, InvoiceLineItemData, ParsedInvoiceResult
 from customers.models import Customer
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.utils import timezone
 from invoices.models import Invoice, InvoiceDocumentItem, InvoiceDocumentJob, InvoiceImportItem, InvoiceImportJob
 from invoices.tasks.document_jobs import run_invoice_document_job
-from invoices.tasks.import_jobs import _update_invoice_import_job_counts, run_invoice_import_item
+from invoices.tasks.import_jobs import (
+    _update_invoice_import_job_counts,
+    finalize_invoice_import_job,
+    run_invoice_import_item,
+    run_invoice_import_parse_item,
+)
 
 User = get_user_model()
 
@@ -209,6 +215,10 @@ class InvoiceDocumentJobStatusAggregationTest(TestCase):
             def generate_invoice_document(self, *args, **kwargs):
                 return BytesIO(b"unused")
 
+            def render_document(self, file_format="docx"):
+                data, line_items = self.generate_invoice_data()
+                return self.generate_invoice_document(data, line_items).getvalue()
+
             def generate_partial_invoice_data(self):
                 raise RuntimeError("simulated generation failure")
 
@@ -270,6 +280,10 @@ class InvoiceDocumentJobStatusAggregationTest(TestCase):
             def generate_invoice_document(self, *args, **kwargs):
                 return BytesIO(b"doc-content")
 
+            def render_document(self, file_format="docx"):
+                data, line_items = self.generate_invoice_data()
+                return self.generate_invoice_document(data, line_items).getvalue()
+
             def generate_partial_invoice_data(self):
                 if self.invoice.id == failing_invoice_id:
                     raise RuntimeError("simulated generation failure")
@@ -346,6 +360,10 @@ class InvoiceDocumentJobStatusAggregationTest(TestCase):
             def generate_invoice_document(self, *args, **kwargs):
                 return BytesIO(b"doc-content")
 
+            def render_document(self, file_format="docx"):
+                data, line_items = self.generate_invoice_data()
+                return self.generate_invoice_document(data, line_items).getvalue()
+
             def generate_partial_invoice_data(self):
                 return ({"invoice_no": self.invoice.invoice_no_display}, [], [])
 
@@ -390,6 +408,10 @@ class InvoiceDocumentJobStatusAggregationTest(TestCase):
             def generate_invoice_document(self, *args, **kwargs):
                 return BytesIO(b"doc-content")
 
+            def render_document(self, file_format="docx"):
+                data, line_items = self.generate_invoice_data()
+                return self.generate_invoice_document(data, line_items).getvalue()
+
             def generate_partial_invoice_data(self):
                 return ({"invoice_no": self.invoice.invoice_no_display}, [], [])
 
@@ -461,3 +483,90 @@ class InvoiceImportItemStateCleanupTest(TestCase):
         self.assertEqual(item.status, InvoiceImportItem.STATUS_IMPORTED)
         self.assertEqual(item.error_message, "")
         self.assertEqual(item.traceback, "")
+
+
+class InvoiceImportParseAndFinalizeTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="import-batch-user", password="testpass")
+        self.job = InvoiceImportJob.objects.create(
+            status=InvoiceImportJob.STATUS_QUEUED,
+            total_files=2,
+            created_by=self.user,
+        )
+        self.items = [
+            InvoiceImportItem.objects.create(
+                job=self.job,
+                sort_index=index,
+                filename=f"invoice-{index}.pdf",
+                file_path=f"tmp/invoice-{index}.pdf",
+                status=InvoiceImportItem.STATUS_QUEUED,
+            )
+            for index in range(2)
+        ]
+
+    @staticmethod
+    def _parsed(invoice_no):
+        return ParsedInvoiceResult(
+            customer=CustomerData(full_name="Mario Rossi"),
+            invoice=InvoiceData(
+                invoice_no=invoice_no, invoice_date="2025-03-10", due_date="2025-03-20", total_amount=10
+            ),
+            line_items=[InvoiceLineItemData("VISA", "Visit visa", 1, 10, 10)],
+            confidence_score=0.9,
+            raw_response={"invoice_no": invoice_no},
+        )
+
+    def test_each_file_is_parsed_separately_and_the_last_parse_finalizes_the_batch(self):
+        @contextmanager
+        def fake_open(path, *args, **kwargs):
+            yield BytesIO(path.encode())
+
+        parsed_calls = []
+        batches = []
+        build_parsed = self._parsed
+
+        class FakeImporter:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def parse_file(self, file_bytes, file_name):
+                parsed_calls.append(file_name)
+                return build_parsed(f"A-{len(parsed_calls)}"), None
+
+            def import_parsed_batch(self, parsed_files):
+                batches.append(parsed_files)
+                return [
+                    SimpleNamespace(
+                        success=True, status="imported", message="Imported", invoice=None, customer=None, errors=[]
+                    )
+                    for _ in parsed_files
+                ]
+
+        with (
+            patch("invoices.tasks.import_jobs.acquire_task_lock", return_value="token-import-batch"),
+            patch("invoices.tasks.import_jobs.release_task_lock"),
+            patch("invoices.tasks.import_jobs.default_storage.open", fake_open),
+            patch("invoices.tasks.import_jobs.InvoiceImporter", FakeImporter),
+            patch("invoices.tasks.import_jobs.finalize_invoice_import_job") as finalize_mock,
+        ):
+            _run_huey_task(run_invoice_import_parse_item, item_id=str(self.items[0].id))
+            finalize_mock.assert_not_called()
+            self.items[0].refresh_from_db()
+            self.assertEqual(self.items[0].status, InvoiceImportItem.STATUS_PROCESSING)
+            self.assertEqual(self.items[0].result["parsed"]["invoice"]["invoice_no"], "A-1")
+
+            _run_huey_task(run_invoice_import_parse_item, item_id=str(self.items[1].id))
+            finalize_mock.assert_called_once_with(str(self.job.id))
+
+            # A retried parse task does not call the parser again.
+            _run_huey_task(run_invoice_import_parse_item, item_id=str(self.items[0].id))
+            self.assertEqual(parsed_calls, ["invoice-0.pdf", "invoice-1.pdf"])
+
+            _run_huey_task(finalize_invoice_import_job, job_id=str(self.job.id))
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([parsed.invoice.invoice_no for parsed, _ in batches[0]], ["A-1", "A-2"])
+        self.assertEqual(batches[0][0][0].line_items[0].code, "VISA")
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, InvoiceImportJob.STATUS_COMPLETED)
+        self.assertEqual(self.job.imported_count, 2)
@@ -1 +1,3 @@
+from .excel_export import ExcelColumn, ReportArtifactStore, StreamingWorkbookWriter, report_artifact_store
 from .invoice_status_dashboard import build_invoice_status_dashboard_context
+from .report_exports import REPORT_EXPORTS, MonthlyInvoiceReportExport, ReportExport, get_report_export
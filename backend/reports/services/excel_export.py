@@ -0,0 +1,207 @@
+"""
+FILE_ROLE: Streaming Excel workbook writer and artifact cache for report exports.
+
+KEY_COMPONENTS:
+- ExcelColumn: Header label, number format and width cap for one report column.
+- StreamingWorkbookWriter: Spools rows to disk while measuring column widths, then writes a write-only workbook.
+- ReportArtifactStore: Stores finished exports under a key built from report parameters and source data version.
+
+INTERACTIONS:
+- Depends on: openpyxl (write-only mode), Django default_storage and TMPFILES_FOLDER.
+- Used by: reports.services.report_exports and reports.tasks.
+
+AI_GUIDELINES:
+- Write-only worksheets emit <cols> before the first row, so widths must be final before rows are written;
+  that is why rows are spooled and measured first instead of being appended straight to the sheet.
+- Keep row values to plain scalars (str, numbers, dates); rows are pickled to the spool file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+import tempfile
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO, Any
+
+from core.services.logger_service import Logger
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+logger = Logger.get_logger(__name__)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+ARTIFACT_CACHE_FOLDER = "report_exports/cache"
+# Bump when a report's layout changes so cached artifacts built with the old layout are ignored.
+ARTIFACT_KEY_VERSION = 1
+
+HEADER_FILL = PatternFill(start_color="0d6efd", end_color="0d6efd", fill_type="solid")
+HEADER_FONT = Font(color="FFFFFF", bold=True)
+TITLE_FONT = Font(size=16, bold=True)
+BOLD_FONT = Font(bold=True)
+CENTER = Alignment(horizontal="center", vertical="center")
+
+
+@dataclass(frozen=True)
+class ExcelColumn:
+    header: str
+    number_format: str | None = None
+    max_width: int = 50
+
+
+def _display_length(value: Any) -> int:
+    if value is None or value == "":
+        return 0
+    if isinstance(value, datetime):
+        return len(value.strftime("%Y-%m-%d %H:%M:%S"))
+    if isinstance(value, date):
+        return len(value.strftime("%Y-%m-%d"))
+    return len(str(value))
+
+
+class StreamingWorkbookWriter:
+    """Single-sheet report workbook written with bounded memory.
+
+    ``append`` pickles each row to a temporary spool file and updates the running maximum
+    display length per column; ``save`` then sets the column widths and streams the spooled
+    rows through an openpyxl write-only worksheet.
+    """
+
+    def __init__(self, *, sheet_title: str, columns: Sequence[ExcelColumn], title: str | None = None):
+        self.sheet_title = sheet_title[:31]
+        self.columns = list(columns)
+        self.title = title
+        self.row_count = 0
+        self._widths = [_display_length(column.header) for column in self.columns]
+        self._spool: IO[bytes] = tempfile.TemporaryFile()
+
+    def append(self, values: Sequence[Any], *, bold: bool = False) -> None:
+        row = list(values)[: len(self.columns)]
+        row.extend([None] * (len(self.columns) - len(row)))
+        for index, value in enumerate(row):
+            length = _display_length(value)
+            if length > self._widths[index]:
+                self._widths[index] = length
+        pickle.dump((row, bold), self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+        self.row_count += 1
+
+    def column_widths(self) -> list[int]:
+        return [min(width + 2, column.max_width) for width, column in zip(self._widths, self.columns)]
+
+    def _spooled_rows(self) -> Iterable[tuple[list[Any], bool]]:
+        self._spool.seek(0)
+        while True:
+            try:
+                yield pickle.load(self._spool)
+            except EOFError:
+                return
+
+    def _cell(self, ws, value: Any, *, font: Font | None = None, number_format: str | None = None):
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if number_format and isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            cell.number_format = number_format
+        return cell
+
+    def save(self, fileobj: IO[bytes]) -> None:
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=self.sheet_title)
+        for index, width in enumerate(self.column_widths(), 1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+
+        if self.title:
+            ws.merged_cells.add(CellRange(min_col=1, min_row=1, max_col=len(self.columns), max_row=1))
+            ws.row_dimensions[1].height = 30
+            title_cell = self._cell(ws, self.title, font=TITLE_FONT)
+            title_cell.alignment = CENTER
+            ws.append([title_cell])
+            ws.append([])
+
+        header_cells = []
+        for column in self.columns:
+            cell = self._cell(ws, column.header, font=HEADER_FONT)
+            cell.fill = HEADER_FILL
+            cell.alignment = CENTER
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        for row, bold in self._spooled_rows():
+            ws.append(
+                [
+                    self._cell(ws, value, font=BOLD_FONT if bold else None, number_format=column.number_format)
+                    for value, column in zip(row, self.columns)
+                ]
+            )
+        wb.save(fileobj)
+
+    def close(self) -> None:
+        self._spool.close()
+
+    def __enter__(self) -> StreamingWorkbookWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ReportArtifactStore:
+    """Finished exports stored under ``<TMPFILES_FOLDER>/report_exports/cache/<report>/<sha256>.xlsx``."""
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(getattr(settings, "REPORT_EXPORT_CACHE_ENABLED", True))
+
+    @staticmethod
+    def build_key(*, report: str, params: dict, source_version: str) -> str:
+        payload = {
+            "version": ARTIFACT_KEY_VERSION,
+            "report": report,
+            "params": params,
+            "source": source_version,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def path_for(report: str, key: str) -> str:
+        tmp_folder = getattr(settings, "TMPFILES_FOLDER", "tmpfiles")
+        return f"{tmp_folder}/{ARTIFACT_CACHE_FOLDER}/{report}/{key}.xlsx"
+
+    def get(self, report: str, key: str) -> str | None:
+        """Return the storage path of a cached artifact, or None when it is missing."""
+        if not self.enabled():
+            return None
+        path = self.path_for(report, key)
+        try:
+            return path if default_storage.exists(path) else None
+        except Exception as exc:
+            logger.warning("Report artifact lookup failed (%s): %s", path, exc)
+            return None
+
+    def put(self, report: str, key: str, fileobj: IO[bytes]) -> str | None:
+        """Store a finished export and return its path, or None when caching is off or the write failed."""
+        if not self.enabled():
+            return None
+        path = self.path_for(report, key)
+        try:
+            if default_storage.exists(path):
+                return path
+            fileobj.seek(0)
+            return default_storage.save(path, File(fileobj, name=f"{key}.xlsx"))
+        except Exception as exc:
+            logger.warning("Report artifact write failed (%s): %s", path, exc)
+            return None
+
+
+report_artifact_store = ReportArtifactStore()
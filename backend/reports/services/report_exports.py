@@ -0,0 +1,200 @@
+"""
+FILE_ROLE: Report export definitions built by the background export job.
+
+KEY_COMPONENTS:
+- ReportExport: Base class describing parameters, file name, source data version and rows of one export.
+- MonthlyInvoiceReportExport: Monthly invoice listing with paid/due totals.
+- REPORT_EXPORTS / get_report_export: Registry of exports keyed by report name.
+
+INTERACTIONS:
+- Depends on: reports.services.excel_export and the invoices models.
+- Used by: reports.tasks.run_report_export_job and api.reports_views.
+
+AI_GUIDELINES:
+- source_version() must change whenever any row of the export could change; it keys the artifact cache.
+- Read rows with annotated totals and .iterator() so exports never trigger per-row queries.
+"""
+
+from __future__ import annotations
+
+import calendar
+import hashlib
+from collections.abc import Callable, Mapping
+from datetime import date
+from decimal import Decimal
+from typing import IO, Any
+
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from invoices.models import Invoice
+
+from .excel_export import ExcelColumn, StreamingWorkbookWriter
+
+ProgressCallback = Callable[[int, int], None]
+
+PROGRESS_EVERY_ROWS = 200
+
+
+class ReportExport:
+    """One exportable report; subclasses provide parameters, rows and the source data version."""
+
+    name: str = ""
+    columns: list[ExcelColumn] = []
+
+    def clean_params(self, raw: Mapping[str, Any]) -> dict[str, Any]:
+        """Validate request parameters into a JSON-serialisable dict (raises ValueError)."""
+        raise NotImplementedError
+
+    def filename(self, params: dict[str, Any]) -> str:
+        return f"{self.name}.xlsx"
+
+    def sheet_title(self, params: dict[str, Any]) -> str:
+        return "Report"
+
+    def title(self, params: dict[str, Any]) -> str | None:
+        return None
+
+    def is_closed_period(self, params: dict[str, Any], *, today: date | None = None) -> bool:
+        """True when the reported period has ended, so the export can be served from the artifact cache."""
+        return False
+
+    def source_version(self, params: dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def write_rows(
+        self, writer: StreamingWorkbookWriter, params: dict[str, Any], on_progress: ProgressCallback
+    ) -> int:
+        """Append the report rows and return how many data rows (excluding totals) were written."""
+        raise NotImplementedError
+
+    def build(self, params: dict[str, Any], fileobj: IO[bytes], on_progress: ProgressCallback | None = None) -> int:
+        """Write the workbook to ``fileobj`` and return the number of data rows."""
+        with StreamingWorkbookWriter(
+            sheet_title=self.sheet_title(params), columns=self.columns, title=self.title(params)
+        ) as writer:
+            row_count = self.write_rows(writer, params, on_progress or (lambda done, total: None))
+            writer.save(fileobj)
+            return row_count
+
+
+def _month_bounds(year: int, month: int) -> tuple[date, date]:
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def _format_date(value: date | None) -> str:
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+class MonthlyInvoiceReportExport(ReportExport):
+    name = "monthly_invoices"
+    columns = [
+        ExcelColumn("Invoice Number"),
+        ExcelColumn("Invoice Date"),
+        ExcelColumn("Due Date"),
+        ExcelColumn("Customer"),
+        ExcelColumn("Passport Number"),
+        ExcelColumn("Passport Expiration"),
+        ExcelColumn("Status"),
+        ExcelColumn("Total Amount", number_format="#,##0"),
+        ExcelColumn("Total Paid", number_format="#,##0"),
+        ExcelColumn("Total Due", number_format="#,##0"),
+    ]
+
+    def clean_params(self, raw: Mapping[str, Any]) -> dict[str, Any]:
+        now = timezone.localdate()
+        try:
+            month = int(raw.get("month") or now.month)
+            year = int(raw.get("year") or now.year)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("month and year must be integers") from exc
+        if not 1 <= month <= 12:
+            raise ValueError("month must be between 1 and 12")
+        if not 1900 <= year <= 9999:
+            raise ValueError("year is out of range")
+        return {"year": year, "month": month}
+
+    def _month_name(self, params: dict[str, Any]) -> str:
+        return calendar.month_name[params["month"]]
+
+    def filename(self, params: dict[str, Any]) -> str:
+        return f"invoices_{self._month_name(params)}_{params['year']}.xlsx"
+
+    def title(self, params: dict[str, Any]) -> str:
+        return f"Invoice Report - {self._month_name(params)} {params['year']}"
+
+    def sheet_title(self, params: dict[str, Any]) -> str:
+        return f"{self._month_name(params)} {params['year']}"
+
+    def is_closed_period(self, params: dict[str, Any], *, today: date | None = None) -> bool:
+        _, end = _month_bounds(params["year"], params["month"])
+        return end <= (today or timezone.localdate())
+
+    def _invoices(self, params: dict[str, Any]):
+        start, end = _month_bounds(params["year"], params["month"])
+        return Invoice.objects.filter(invoice_date__gte=start, invoice_date__lt=end)
+
+    def source_version(self, params: dict[str, Any]) -> str:
+        # Payment saves and deletes touch their invoice, so invoice updated_at also covers payment changes;
+        # the payment maximum is kept for rows edited outside those signals.
+        stats = self._invoices(params).aggregate(
+            invoice_count=Count("id", distinct=True),
+            amount_sum=Sum("total_amount"),
+            invoice_updated=Max("updated_at"),
+            customer_updated=Max("customer__updated_at"),
+            payment_updated=Max("invoice_applications__payments__updated_at"),
+        )
+        encoded = "|".join(f"{key}={stats[key]}" for key in sorted(stats))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def write_rows(
+        self, writer: StreamingWorkbookWriter, params: dict[str, Any], on_progress: ProgressCallback
+    ) -> int:
+        invoices = self._invoices(params)
+        total = invoices.count()
+        rows = (
+            invoices.with_computed_totals()
+            .select_related("customer")
+            .order_by("invoice_date", "invoice_no")
+            .iterator(chunk_size=500)
+        )
+
+        total_amount = total_paid = total_due = Decimal("0")
+        for index, invoice in enumerate(rows, 1):
+            paid = invoice.total_paid or Decimal("0")
+            due = invoice.total_due or Decimal("0")
+            total_amount += invoice.total_amount
+            total_paid += paid
+            total_due += due
+            customer = invoice.customer
+            writer.append(
+                [
+                    invoice.invoice_no,
+                    _format_date(invoice.invoice_date),
+                    _format_date(invoice.due_date),
+                    customer.full_name,
+                    customer.passport_number or "",
+                    _format_date(customer.passport_expiration_date),
+                    invoice.get_status_display(),
+                    float(invoice.total_amount),
+                    float(paid),
+                    float(due),
+                ]
+            )
+            if index % PROGRESS_EVERY_ROWS == 0:
+                on_progress(index, total)
+
+        on_progress(total, total)
+        writer.append([None] * 6 + ["TOTAL", total_amount, total_paid, total_due], bold=True)
+        return total
+
+
+REPORT_EXPORTS: dict[str, ReportExport] = {export.name: export for export in (MonthlyInvoiceReportExport(),)}
+
+
+def get_report_export(name: str) -> ReportExport:
+    try:
+        return REPORT_EXPORTS[name]
+    except KeyError as exc:
+        raise ValueError(f"Unknown report export: {name}") from exc
@@ -0,0 +1,96 @@
+"""Async jobs for building report Excel exports."""
+
+import os
+import tempfile
+import traceback
+
+from core.models import AsyncJob
+from core.services.logger_service import Logger
+from core.tasks.idempotency import acquire_task_lock, build_task_lock_key, release_task_lock
+from core.tasks.runtime import QUEUE_DEFAULT, db_task
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from reports.services.excel_export import report_artifact_store
+from reports.services.report_exports import get_report_export
+
+logger = Logger.get_logger(__name__)
+
+
+def _progress_reporter(job: AsyncJob):
+    last = {"progress": job.progress}
+
+    def on_progress(done: int, total: int) -> None:
+        progress = 10 + int((done / total) * 75) if total else 85
+        if progress <= last["progress"]:
+            return
+        last["progress"] = progress
+        job.update_progress(progress, f"Exporting rows... ({done}/{total})")
+
+    return on_progress
+
+
+@db_task(queue=QUEUE_DEFAULT, max_concurrency=2)
+def run_report_export_job(job_id: str, report: str, params: dict) -> None:
+    lock_key = build_task_lock_key(namespace="reports_export_job", item_id=str(job_id))
+    lock_token = acquire_task_lock(lock_key)
+    if not lock_token:
+        logger.warning("Report export task skipped due to lock contention: job_id=%s", job_id)
+        return
+
+    try:
+        try:
+            job = AsyncJob.objects.get(id=job_id)
+        except AsyncJob.DoesNotExist:
+            logger.error("AsyncJob %s not found for report export", job_id)
+            return
+
+        if job.status in {AsyncJob.STATUS_COMPLETED, AsyncJob.STATUS_FAILED}:
+            logger.info("Skipping report export job already finalized: job_id=%s status=%s", job_id, job.status)
+            return
+
+        try:
+            export = get_report_export(report)
+            filename = export.filename(params)
+            result = {"filename": filename, "report": report, "params": params, "cached": False}
+            job.update_progress(5, "Preparing report export...", AsyncJob.STATUS_PROCESSING)
+
+            # Closed periods no longer change under normal use, so the artifact is reusable for as long as
+            # the source data version stays the same.
+            cache_key = None
+            if export.is_closed_period(params) and report_artifact_store.enabled():
+                source_version = export.source_version(params)
+                cache_key = report_artifact_store.build_key(
+                    report=report, params=params, source_version=source_version
+                )
+                cached_path = report_artifact_store.get(report, cache_key)
+                if cached_path:
+                    job.complete(
+                        result={**result, "file_path": cached_path, "cached": True},
+                        message="Report export ready (cached).",
+                    )
+                    return
+
+            with tempfile.TemporaryFile() as output:
+                row_count = export.build(params, output, _progress_reporter(job))
+                job.update_progress(90, "Saving report export...")
+
+                saved_path = None
+                # Skip caching when rows changed while the workbook was being written.
+                if cache_key and export.source_version(params) == source_version:
+                    saved_path = report_artifact_store.put(report, cache_key, output)
+                if saved_path is None:
+                    output.seek(0)
+                    tmp_folder = getattr(settings, "TMPFILES_FOLDER", "tmpfiles")
+                    output_path = os.path.join(tmp_folder, "report_exports", str(job.id), filename)
+                    saved_path = default_storage.save(output_path, File(output, name=filename))
+
+            job.complete(
+                result={**result, "file_path": saved_path, "total_records": row_count},
+                message=f"Report export completed ({row_count} record(s)).",
+            )
+        except Exception as exc:
+            logger.error("Report export job %s failed: %s", job_id, str(exc), exc_info=True)
+            job.fail(str(exc), traceback.format_exc())
+    finally:
+        release_task_lock(lock_key, lock_token)
@@ -0,0 +1,118 @@
+"""Tests for streaming report exports, their background job and the closed-period artifact cache."""
+
+from datetime import date
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from core.models import AsyncJob
+from customers.models import Customer
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, TestCase, override_settings
+from invoices.models import Invoice
+from openpyxl import load_workbook
+from reports.services.excel_export import ExcelColumn, StreamingWorkbookWriter
+from reports.services.report_exports import MonthlyInvoiceReportExport
+from reports.tasks import run_report_export_job
+
+
+class StreamingWorkbookWriterTests(SimpleTestCase):
+    def test_widths_follow_running_max_and_rows_keep_formats(self):
+        columns = [ExcelColumn("Name", max_width=12), ExcelColumn("Amount", number_format="#,##0")]
+        output = BytesIO()
+
+        with StreamingWorkbookWriter(sheet_title="Sheet", columns=columns, title="Report title") as writer:
+            writer.append(["Alice", 1500000.0])
+            writer.append(["A much longer customer name", 2.0])
+            writer.append(["TOTAL", 1500002.0], bold=True)
+            self.assertEqual(writer.column_widths(), [12, len("1500000.0") + 2])
+            writer.save(output)
+
+        output.seek(0)
+        sheet = load_workbook(output)["Sheet"]
+        self.assertEqual(sheet.column_dimensions["A"].width, 12)
+        self.assertEqual(sheet.column_dimensions["B"].width, len("1500000.0") + 2)
+        self.assertEqual(sheet["A1"].value, "Report title")
+        self.assertIn("A1:B1", {str(cell_range) for cell_range in sheet.merged_cells.ranges})
+        self.assertEqual([sheet["A3"].value, sheet["B3"].value], ["Name", "Amount"])
+        self.assertEqual(sheet["B4"].number_format, "#,##0")
+        self.assertTrue(sheet["A6"].font.bold)
+
+
+@override_settings(REPORT_EXPORT_CACHE_ENABLED=True)
+class MonthlyInvoiceExportJobTests(TestCase):
+    PARAMS = {"year": 2024, "month": 3}
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="report-export-user", password="testpass")
+        self.customer = Customer.objects.create(customer_type="person", first_name="Rina", last_name="Report")
+        self.invoice = Invoice.objects.create(
+            customer=self.customer,
+            invoice_no=202403001,
+            invoice_date=date(2024, 3, 10),
+            due_date=date(2024, 3, 24),
+            created_by=self.user,
+        )
+        self.temp_dir = TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        storage = FileSystemStorage(location=self.temp_dir.name, base_url="/media/")
+        for target, kwargs in (
+            ("reports.tasks.default_storage", {"new": storage}),
+            ("reports.services.excel_export.default_storage", {"new": storage}),
+            ("reports.tasks.acquire_task_lock", {"return_value": "token-report"}),
+            ("reports.tasks.release_task_lock", {}),
+        ):
+            patcher = patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.storage = storage
+
+    def _run(self) -> AsyncJob:
+        job = AsyncJob.objects.create(
+            task_name="reports_export_excel:monthly_invoices:month=3:year=2024",
+            status=AsyncJob.STATUS_PENDING,
+            created_by=self.user,
+        )
+        run_report_export_job(str(job.id), "monthly_invoices", dict(self.PARAMS))
+        job.refresh_from_db()
+        return job
+
+    def test_export_streams_rows_and_reuses_the_cached_artifact_for_closed_periods(self):
+        first = self._run()
+
+        self.assertEqual(first.status, AsyncJob.STATUS_COMPLETED)
+        self.assertFalse(first.result["cached"])
+        self.assertEqual(first.result["total_records"], 1)
+        self.assertEqual(first.result["filename"], "invoices_March_2024.xlsx")
+        with self.storage.open(first.result["file_path"], "rb") as fh:
+            sheet = load_workbook(fh)["March 2024"]
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(rows[3][0], self.invoice.invoice_no)
+        self.assertEqual(rows[3][3], self.customer.full_name)
+        self.assertEqual(rows[4][6], "TOTAL")
+
+        with patch.object(MonthlyInvoiceReportExport, "build") as build:
+            second = self._run()
+        build.assert_not_called()
+        self.assertTrue(second.result["cached"])
+        self.assertEqual(second.result["file_path"], first.result["file_path"])
+
+    def test_source_change_invalidates_the_cached_artifact(self):
+        export = MonthlyInvoiceReportExport()
+        before = export.source_version(self.PARAMS)
+        first = self._run()
+
+        self.customer.first_name = "Renamed"
+        self.customer.save()
+
+        self.assertNotEqual(export.source_version(self.PARAMS), before)
+        second = self._run()
+        self.assertFalse(second.result["cached"])
+        self.assertNotEqual(second.result["file_path"], first.result["file_path"])
+
+    def test_open_period_is_never_cached(self):
+        export = MonthlyInvoiceReportExport()
+
+        self.assertTrue(export.is_closed_period(self.PARAMS, today=date(2024, 4, 1)))
+        self.assertFalse(export.is_closed_period(self.PARAMS, today=date(2024, 3, 31)))
@@ -4,15 +4,13 @@ from datetime import datetime
 from decimal import Decimal
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Sum
-from django.http import HttpResponse
 from django.views.generic import TemplateView
 from invoices.models import Invoice
 from reports.utils import format_currency
 
 
 class MonthlyInvoiceDetailView(LoginRequiredMixin, TemplateView):
-    """Detailed invoice listing by month with Excel export."""
+    """Detailed invoice listing by month; Excel exports run as reports.tasks.run_report_export_job."""
 
     template_name = "reports/monthly_invoice_detail.html"
 
@@ -44,7 +42,8 @@ class MonthlyInvoiceDetailView(LoginRequiredMixin, TemplateView):
 
         # Filter invoices by month and year
         invoices = (
-            Invoice.objects.filter(
+            Invoice.objects.with_computed_totals()
+            .filter(
                 invoice_date__year=year,
                 invoice_date__month=month,
             )
@@ -110,115 +109,3 @@ class MonthlyInvoiceDetailView(LoginRequiredMixin, TemplateView):
         )
 
         return context
-
-    def get(self, request, *args, **kwargs):
-        # Check if Excel export is requested
-        if request.GET.get("export") == "excel":
-            return self.export_excel()
-        return super().get(request, *args, **kwargs)
-
-    def export_excel(self):
-        """Export invoice data to Excel."""
-        import openpyxl
-        from openpyxl.styles import Alignment, Font, PatternFill
-        from openpyxl.utils import get_column_letter
-
-        # Get the same data as the view
-        context = self.get_context_data()
-        invoices = context["invoices"]
-        month_name = context["month_name"]
-        year = context["selected_year"]
-
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        if ws is None:
-            ws = wb.create_sheet()
-        ws.title = f"{month_name} {year}"
-
-        # Add title
-        ws.merge_cells("A1:J1")
-        title_cell = ws["A1"]
-        title_cell.value = f"Invoice Report - {month_name} {year}"
-        title_cell.font = Font(size=16, bold=True)
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-        ws.row_dimensions[1].height = 30
-
-        # Add headers
-        headers = [
-            "Invoice Number",
-            "Invoice Date",
-            "Due Date",
-            "Customer",
-            "Passport Number",
-            "Passport Expiration",
-            "Status",
-            "Total Amount",
-            "Total Paid",
-            "Total Due",
-        ]
-
-        header_fill = PatternFill(start_color="0d6efd", end_color="0d6efd", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True)
-
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Add data
-        for row_num, invoice in enumerate(invoices, 4):
-            ws.cell(row=row_num, column=1, value=invoice["invoice_number"])
-            ws.cell(row=row_num, column=2, value=invoice["invoice_date"].strftime("%Y-%m-%d"))
-            ws.cell(
-                row=row_num, column=3, value=invoice["due_date"].strftime("%Y-%m-%d") if invoice["due_date"] else ""
-            )
-            ws.cell(row=row_num, column=4, value=invoice["customer_name"])
-            ws.cell(row=row_num, column=5, value=invoice.get("customer_passport_number", ""))
-            ws.cell(
-                row=row_num,
-                column=6,
-                value=(
-                    invoice["customer_passport_expiration_date"].strftime("%Y-%m-%d")
-                    if invoice.get("customer_passport_expiration_date")
-                    else ""
-                ),
-            )
-            ws.cell(row=row_num, column=7, value=invoice["status"])
-            ws.cell(row=row_num, column=8, value=invoice["total_amount"])
-            ws.cell(row=row_num, column=9, value=invoice["total_paid"])
-            ws.cell(row=row_num, column=10, value=invoice["total_due"])
-
-            # Format currency columns
-            for col in [8, 9, 10]:
-                ws.cell(row=row_num, column=col).number_format = "#,##0"
-
-        # Add totals row
-        total_row = len(invoices) + 4
-        ws.cell(row=total_row, column=7, value="TOTAL").font = Font(bold=True)
-        ws.cell(row=total_row, column=8, value=context["total_amount"]).font = Font(bold=True)
-        ws.cell(row=total_row, column=9, value=context["total_paid"]).font = Font(bold=True)
-        ws.cell(row=total_row, column=10, value=context["total_due"]).font = Font(bold=True)
-
-        # Format total currency columns
-        for col in [8, 9, 10]:
-            ws.cell(row=total_row, column=col).number_format = "#,##0"
-
-        # Auto-adjust column widths
-        for col_num in range(1, 11):
-            column_letter = get_column_letter(col_num)
-            max_length = 0
-            for cell in ws[column_letter]:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-        # Create HTTP response
-        response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        response["Content-Disposition"] = f'attachment; filename="invoices_{month_name}_{year}.xlsx"'
-
-        wb.save(response)
-        return response
@@ -9,11 +9,22 @@ DOC_PROCESSES="${DRAMATIQ_DOC_PROCESSES:-1}"
 DOC_THREADS="${DRAMATIQ_DOC_THREADS:-1}"
 DRAMATIQ_BIN="${DRAMATIQ_BIN:-/opt/venv/bin/dramatiq}"
 
+PYTHON_BIN="${PYTHON_BIN:-/opt/venv/bin/python}"
+POOL_SUPERVISOR="${DRAMATIQ_POOL_SUPERVISOR:-true}"
+
 if [ ! -x "${DRAMATIQ_BIN}" ]; then
   echo "Dramatiq binary not found or not executable: ${DRAMATIQ_BIN}" >&2
   exit 127
 fi
 
+# Queue-isolated pools (DRAMATIQ_WORKER_POOLS) with burst scaling; set
+# DRAMATIQ_POOL_SUPERVISOR=false to fall back to the fixed three-process layout below.
+case "${POOL_SUPERVISOR}" in
+  1|true|TRUE|True|yes|on)
+    exec "${PYTHON_BIN}" manage.py run_dramatiq_pools --dramatiq-bin "${DRAMATIQ_BIN}"
+    ;;
+esac
+
 "${DRAMATIQ_BIN}" business_suite.dramatiq \
   --queues realtime default \
   --processes "${HIGH_PROCESSES}" \
@@ -484,6 +484,16 @@ export class ApplicationCategorizationHandler {
         break;
       }
 
+      case 'file_waiting_for_ai': {
+        if (event.data['filename']) {
+          const waitFilename = `"${truncateFilename(event.data['filename'])}"`;
+          const retryIn = Math.max(0, Math.round(Number(event.data['retryInSeconds'] ?? 0)));
+          this.lastActivitySummary.set(`Waiting for AI capacity: ${waitFilename} (retry in ${retryIn}s)`);
+        }
+        this.refreshStatusMessage();
+        break;
+      }
+
       case 'file_validating': {
         const results = [...this.results()];
         const idx = results.findIndex((r) => r.filename === event.data['filename']);